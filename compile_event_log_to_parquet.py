@@ -16,6 +16,15 @@ Canonicalization scope:
 Idempotency:
 - Each output parquet is content-hashed (sha256) and recorded in manifest.
 - If an identical content hash already exists for the same output path, skip rewrite.
+- Each partition also records an input_hash over its input files; if it matches
+  the last manifest entry, the partition is skipped without parsing (--force overrides).
+
+Performance:
+- Partitions compile in a process pool (--workers); rows are converted to Arrow
+  in bounded batches and written in bounded row groups (--row-group-size).
+- Memory: output is sorted by event_id, so each partition's Arrow table is held
+  in memory in full before it is written (one chat-day per worker at a time).
+  Python row objects are bounded by --batch-rows; the Arrow table is not.
 """
 
 from __future__ import annotations
@@ -27,9 +36,11 @@ import hashlib
 import json
 import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
     import zstandard as zstd  # type: ignore
@@ -38,6 +49,7 @@ except Exception:
 
 try:
     import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
     import pyarrow.parquet as pq  # type: ignore
 except Exception as e:
     raise SystemExit("pyarrow is required for Parquet compilation. Install pyarrow.") from e
@@ -48,6 +60,15 @@ ISO_FMT = "%Y-%m-%dT%H:%M:%SZ"
 BASE58_RE = re.compile(r"\b[1-9A-HJ-NP-Za-km-z]{32,44}\b")
 EVM_RE = re.compile(r"\b0x[a-fA-F0-9]{40}\b")
 
+# Layout written by telegram_json_to_event_log.py
+PARTITION_PATH_RE = re.compile(r"chat_id=(-?\d+)/events_(\d{4}-\d{2}-\d{2})\.jsonl(?:\.zst)?$")
+
+# Bump when canonicalization changes so unchanged inputs are recompiled
+CANON_VERSION = "canon.telegram_events/1"
+
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+DEFAULT_BATCH_ROWS = 10_000
+
 
 def _sha256_file(path: Path) -> str:
     h = hashlib.sha256()
@@ -271,11 +292,8 @@ def _rows_from_event_file(path: Path) -> Iterable[Row]:
         links_from_parts = _extract_links_from_parts(parts)
         links_from_entities, cashtags, hashtags, mentions = _extract_from_entities(evt.get("raw_text_entities"))
 
-        # merge links
-        links = []
-        for x in links_from_parts + links_from_entities:
-            if x not in links:
-                links.append(x)
+        # merge links (dedupe preserving order)
+        links = list(dict.fromkeys(links_from_parts + links_from_entities))
 
         toks = _token_like_strings(text_plain)
 
@@ -307,11 +325,8 @@ def _pa_list_str(xs: List[List[str]]) -> pa.Array:
     return pa.array(xs, type=pa.list_(pa.string()))
 
 
-def _write_parquet(rows: List[Row], out_path: Path) -> Tuple[int, Optional[str], Optional[str]]:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Build columns
-    tbl = pa.table(
+def _row_batch(rows: List[Row]) -> pa.RecordBatch:
+    return pa.RecordBatch.from_pydict(
         {
             "event_id": pa.array([r.event_id for r in rows], type=pa.string()),
             "event_type": pa.array([r.event_type for r in rows], type=pa.string()),
@@ -340,18 +355,167 @@ def _write_parquet(rows: List[Row], out_path: Path) -> Tuple[int, Optional[str],
         }
     )
 
-    pq.write_table(tbl, out_path, compression="zstd")
+
+def _write_parquet(
+    batches: List[pa.RecordBatch],
+    out_path: Path,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> Tuple[int, Optional[str], Optional[str]]:
+    """
+    Sort one partition by event_id and write it.
+
+    The sort needs every row, so the whole partition is materialized as one
+    Arrow table here (peak memory ~ the partition's Arrow size, per worker).
+    Row groups bound the writer's buffers, not this table.
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # deterministic ordering: event_id stable
+    tbl = pa.Table.from_batches(batches)
+    tbl = tbl.take(pc.sort_indices(tbl, sort_keys=[("event_id", "ascending")]))
+
+    with pq.ParquetWriter(out_path, tbl.schema, compression="zstd") as writer:
+        writer.write_table(tbl, row_group_size=row_group_size)
 
     # Get min/max timestamps for manifest
-    ts_vals = [r.timestamp for r in rows if r.timestamp is not None]
-    if ts_vals:
-        min_ts = min(ts_vals).strftime("%Y-%m-%dT%H:%M:%S")
-        max_ts = max(ts_vals).strftime("%Y-%m-%dT%H:%M:%S")
+    bounds = pc.min_max(tbl["timestamp"])
+    if bounds["min"].is_valid:
+        min_ts = bounds["min"].as_py().strftime("%Y-%m-%dT%H:%M:%S")
+        max_ts = bounds["max"].as_py().strftime("%Y-%m-%dT%H:%M:%S")
     else:
         min_ts = None
         max_ts = None
 
-    return len(rows), min_ts, max_ts
+    return tbl.num_rows, min_ts, max_ts
+
+
+def _partition_from_path(path: Path) -> Optional[Tuple[int, str]]:
+    """(chat_id, date) for files laid out by telegram_json_to_event_log.py, else None."""
+    m = PARTITION_PATH_RE.search(path.as_posix())
+    if not m:
+        return None
+    return int(m.group(1)), m.group(2)
+
+
+def _partition_keys(path: Path) -> List[Tuple[int, str]]:
+    """Every (chat_id, date) partition a file contributes rows to (parses the file)."""
+    keys = set()
+    for evt in _iter_jsonl_events(path):
+        if evt.get("chat_id") is None or evt.get("message_id") is None:
+            continue
+        day = _date_part(_parse_ts_z(evt.get("timestamp"))) or "unknown"
+        keys.add((int(evt["chat_id"]), day))
+    return sorted(keys)
+
+
+def _partition_out_path(out_base: Path, chat_id: int, day: str) -> Path:
+    return out_base / "canon" / "telegram_events" / f"chat_id={chat_id}" / f"date={day}" / "events.parquet"
+
+
+def _input_hash(inputs: List[Tuple[str, str]]) -> str:
+    """Hash of (path, file_hash) pairs feeding a partition; paths are part of the output (raw_event_ref)."""
+    payload = json.dumps([CANON_VERSION, sorted(inputs)], separators=(",", ":"))
+    return "sha256:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_manifest(manifest_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Latest manifest row per output path."""
+    latest: Dict[str, Dict[str, Any]] = {}
+    if not manifest_path.exists():
+        return latest
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(row, dict) and row.get("path"):
+                latest[row["path"]] = row
+    return latest
+
+
+def _compile_partition(
+    chat_id: int,
+    day: str,
+    in_paths: List[str],
+    out_path: str,
+    row_group_size: int,
+    batch_rows: int,
+) -> Dict[str, Any]:
+    """
+    Parse one partition's input files and write its Parquet file.
+
+    Rows are converted to Arrow every `batch_rows` rows so Python objects never
+    accumulate for the whole partition. Input files that also hold rows for
+    other partitions are reported back as `misplaced`.
+    """
+    out = Path(out_path)
+    tmp_path = out.with_suffix(".parquet.tmp")
+    batches: List[pa.RecordBatch] = []
+    pending: List[Row] = []
+    misplaced: List[str] = []
+
+    for p in in_paths:
+        stray = False
+        for r in _rows_from_event_file(Path(p)):
+            if r.chat_id != chat_id or (_date_part(r.timestamp) or "unknown") != day:
+                stray = True
+                continue
+            pending.append(r)
+            if len(pending) >= batch_rows:
+                batches.append(_row_batch(pending))
+                pending = []
+        if stray:
+            misplaced.append(p)
+    if pending:
+        batches.append(_row_batch(pending))
+
+    result: Dict[str, Any] = {"chat_id": chat_id, "date": day, "path": out_path, "misplaced": misplaced}
+    if not batches:
+        result["status"] = "empty"
+        return result
+
+    row_count, min_ts, max_ts = _write_parquet(batches, tmp_path, row_group_size)
+    file_hash = _sha256_file(tmp_path)
+
+    # If destination exists and has same hash, discard tmp (idempotent no-op)
+    if out.exists():
+        existing_hash = _sha256_file(out)
+        if existing_hash == file_hash:
+            tmp_path.unlink(missing_ok=True)
+            status = "deduped_same_hash"
+        else:
+            tmp_path.replace(out)
+            status = "replaced_new_hash"
+    else:
+        tmp_path.replace(out)
+        status = "created"
+
+    result.update(
+        row_count=row_count,
+        min_timestamp=min_ts,
+        max_timestamp=max_ts,
+        file_hash=file_hash,
+        status=status,
+    )
+    return result
+
+
+def _compile_partition_task(task: Tuple) -> Dict[str, Any]:
+    return _compile_partition(*task)
+
+
+def _map_ordered(fn, items: List[Any], workers: int) -> Iterator[Any]:
+    """fn over items in a process pool (inline if workers <= 1), results in input order."""
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield fn(item)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        yield from ex.map(fn, items)
 
 
 def main() -> int:
@@ -360,6 +524,13 @@ def main() -> int:
     ap.add_argument("--out-dir", required=True, help="Base directory to write canon/telegram_events/**")
     ap.add_argument("--manifest-path", required=True, help="Where to append manifest JSONL")
     ap.add_argument("--glob", default="raw/telegram/events/**/events_*.jsonl*", help="Glob under --events-dir")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="Parser processes (default: CPU count; 1 compiles inline)")
+    ap.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                    help=f"Max rows per Parquet row group (default: {DEFAULT_ROW_GROUP_SIZE})")
+    ap.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS,
+                    help=f"Rows parsed per Arrow batch (default: {DEFAULT_BATCH_ROWS})")
+    ap.add_argument("--force", action="store_true", help="Recompile partitions even if their inputs are unchanged")
     args = ap.parse_args()
 
     base = Path(args.events_dir)
@@ -372,58 +543,105 @@ def main() -> int:
         print(f"No input files found under {base} with glob {args.glob}", file=sys.stderr)
         return 2
 
-    # Group rows by (chat_id, date)
-    buckets: Dict[Tuple[int, str], List[Row]] = {}
+    # Hash inputs up front (hashlib releases the GIL on large reads)
+    with ThreadPoolExecutor(max_workers=max(1, min(args.workers, 16))) as ex:
+        in_hashes = dict(zip(map(str, in_paths), ex.map(_sha256_file, in_paths)))
 
+    # Plan (chat_id, date) -> input files. The event log layout names the
+    # partition in the path; anything else has to be scanned.
+    plan: Dict[Tuple[int, str], List[str]] = {}
+    unplaced = []
     for p in in_paths:
-        for r in _rows_from_event_file(p):
-            day = _date_part(r.timestamp) or "unknown"
-            key = (r.chat_id, day)
-            buckets.setdefault(key, []).append(r)
-
+        key = _partition_from_path(p)
+        if key is None:
+            unplaced.append(p)
+        else:
+            plan.setdefault(key, []).append(str(p))
+
+    def place(paths: List[Path]) -> List[Tuple[int, str]]:
+        added = []
+        for p, keys in zip(paths, _map_ordered(_partition_keys, paths, args.workers)):
+            for key in keys:
+                inputs = plan.setdefault(key, [])
+                if str(p) not in inputs:
+                    inputs.append(str(p))
+                    inputs.sort()
+                    added.append(key)
+        return added
+
+    place(unplaced)
+
+    # Files previously found to feed other partitions keep feeding them
+    manifest = _load_manifest(manifest_path)
+    for prev in manifest.values():
+        if prev.get("kind") != "canon.telegram_events" or prev.get("chat_id") is None:
+            continue
+        for p in prev.get("inputs") or []:
+            inputs = plan.setdefault((int(prev["chat_id"]), prev["date"]), [])
+            if p in in_hashes and p not in inputs:
+                inputs.append(p)
+                inputs.sort()
+    plan = {key: inputs for key, inputs in plan.items() if inputs}
+
+    previous = {} if args.force else manifest
     now_z = dt.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    pending = sorted(plan)
+    compiled = skipped = 0
 
     with open(manifest_path, "a", encoding="utf-8") as mf:
-        for (chat_id, day), rows in sorted(buckets.items()):
-            # deterministic ordering: event_id stable
-            rows.sort(key=lambda x: x.event_id)
-
-            out_path = out_base / "canon" / "telegram_events" / f"chat_id={chat_id}" / f"date={day}" / "events.parquet"
-            tmp_path = out_path.with_suffix(".parquet.tmp")
-
-            row_count, min_ts, max_ts = _write_parquet(rows, tmp_path)
-            file_hash = _sha256_file(tmp_path)
-
-            # If destination exists and has same hash, discard tmp (idempotent no-op)
-            if out_path.exists():
-                existing_hash = _sha256_file(out_path)
-                if existing_hash == file_hash:
-                    tmp_path.unlink(missing_ok=True)
-                    status = "deduped_same_hash"
-                else:
-                    tmp_path.replace(out_path)
-                    status = "replaced_new_hash"
-            else:
-                tmp_path.replace(out_path)
-                status = "created"
-
-            manifest_row = {
-                "kind": "canon.telegram_events",
-                "chat_id": chat_id,
-                "date": day,
-                "path": str(out_path),
-                "row_count": row_count,
-                "min_timestamp": min_ts,
-                "max_timestamp": max_ts,
-                "file_hash": file_hash,
-                "status": status,
-                "written_at": now_z,
-            }
-            mf.write(json.dumps(manifest_row, ensure_ascii=False) + "\n")
+        while pending:
+            tasks = []
+            input_hashes: Dict[str, str] = {}
+            for chat_id, day in pending:
+                out_path = str(_partition_out_path(out_base, chat_id, day))
+                input_hash = _input_hash([(p, in_hashes[p]) for p in plan[(chat_id, day)]])
+                input_hashes[out_path] = input_hash
+
+                prev = previous.get(out_path)
+                if prev and prev.get("input_hash") == input_hash and Path(out_path).exists():
+                    manifest_row = {
+                        **{k: prev.get(k) for k in ("kind", "chat_id", "date", "path", "row_count",
+                                                     "min_timestamp", "max_timestamp", "file_hash")},
+                        "input_hash": input_hash,
+                        "inputs": plan[(chat_id, day)],
+                        "status": "skipped_same_input",
+                        "written_at": now_z,
+                    }
+                    mf.write(json.dumps(manifest_row, ensure_ascii=False) + "\n")
+                    skipped += 1
+                    continue
+
+                tasks.append((chat_id, day, plan[(chat_id, day)], out_path, args.row_group_size, args.batch_rows))
+
+            misplaced = set()
+            for result in _map_ordered(_compile_partition_task, tasks, args.workers):
+                misplaced.update(result.pop("misplaced"))
+                if result["status"] == "empty":
+                    continue
+                manifest_row = {
+                    "kind": "canon.telegram_events",
+                    "chat_id": result["chat_id"],
+                    "date": result["date"],
+                    "path": result["path"],
+                    "row_count": result["row_count"],
+                    "min_timestamp": result["min_timestamp"],
+                    "max_timestamp": result["max_timestamp"],
+                    "file_hash": result["file_hash"],
+                    "input_hash": input_hashes[result["path"]],
+                    "inputs": plan[(result["chat_id"], result["date"])],
+                    "status": result["status"],
+                    "written_at": now_z,
+                }
+                mf.write(json.dumps(manifest_row, ensure_ascii=False) + "\n")
+                compiled += 1
+
+            # Files holding rows for partitions other than the one their path
+            # names: route them everywhere they belong and rebuild those.
+            pending = sorted(set(place(sorted(Path(p) for p in misplaced))))
 
+    print(f"Compiled {compiled} partitions, skipped {skipped} unchanged", file=sys.stderr)
     return 0
 
 
 if __name__ == "__main__":
-    import sys
     raise SystemExit(main())
@@ -8,9 +8,23 @@
  */
 
 import { z } from 'zod';
-import type { PythonEngine } from '@quantbot/infra/utils';
+import type { PythonEngine, PythonScriptOptions } from '@quantbot/infra/utils';
 import { logger, AppError, TimeoutError, findWorkspaceRoot } from '@quantbot/infra/utils';
+import { createWriteStream } from 'fs';
+import { mkdtemp, rm } from 'fs/promises';
+import { tmpdir } from 'os';
 import { join } from 'path';
+import { finished } from 'stream/promises';
+
+// Lazy import to avoid loading native bindings at module load time
+let duckdbModule: typeof import('duckdb') | null = null;
+
+async function getDuckdbModule() {
+  if (!duckdbModule) {
+    duckdbModule = await import('duckdb');
+  }
+  return duckdbModule;
+}
 
 // =============================================================================
 // Zod Schemas
@@ -267,6 +281,66 @@ export interface RunV1BaselineGroupedEvaluationConfig {
   verbose?: boolean;
 }
 
+// =============================================================================
+// Candle Transport
+// =============================================================================
+
+type CandlesByCallId = SimulateCapitalAwareConfig['candles_by_call_id'];
+
+/**
+ * First line of a request that carries its candles out of band
+ * (ARROW_REQUEST_MAGIC in tools/backtest/lib/v1_baseline_transport.py)
+ */
+const CANDLE_FILE_REQUEST_MAGIC = 'V1ARROW\n';
+
+function sqlString(value: string): string {
+  return `'${value.replace(/'/g, "''")}'`;
+}
+
+/**
+ * Write candles to a Parquet file (call_id, timestamp, high, low, close).
+ *
+ * Rows are streamed to a CSV file and DuckDB converts it, so the candles are
+ * never held as one serialized string.
+ */
+async function writeCandlesParquet(candlesByCallId: CandlesByCallId, dir: string): Promise<string> {
+  const csvPath = join(dir, 'candles.csv');
+  const parquetPath = join(dir, 'candles.parquet');
+
+  const out = createWriteStream(csvPath);
+  out.write('call_id,timestamp,high,low,close\n');
+  for (const [callId, candles] of Object.entries(candlesByCallId)) {
+    const id = `"${callId.replace(/"/g, '""')}"`;
+    let chunk = '';
+    for (const c of candles) {
+      chunk += `${id},${c.timestamp},${c.high},${c.low},${c.close}\n`;
+    }
+    if (!out.write(chunk)) {
+      await new Promise((resolve) => out.once('drain', resolve));
+    }
+  }
+  out.end();
+  await finished(out);
+
+  const duckdb = await getDuckdbModule();
+  const db = new duckdb.Database(':memory:');
+  try {
+    await new Promise<void>((resolve, reject) => {
+      db.run(
+        `COPY (
+          SELECT * FROM read_csv(${sqlString(csvPath)}, header = true, columns = {
+            'call_id': 'VARCHAR', 'timestamp': 'DOUBLE', 'high': 'DOUBLE', 'low': 'DOUBLE', 'close': 'DOUBLE'
+          })
+        ) TO ${sqlString(parquetPath)} (FORMAT PARQUET)`,
+        (err: Error | null) => (err ? reject(err) : resolve())
+      );
+    });
+  } finally {
+    await new Promise<void>((resolve) => db.close(() => resolve()));
+  }
+  return parquetPath;
+}
+
 // =============================================================================
 // V1 Baseline Python Service
 // =============================================================================
@@ -280,6 +354,29 @@ export interface RunV1BaselineGroupedEvaluationConfig {
 export class V1BaselinePythonService {
   constructor(private readonly pythonEngine: PythonEngine) {}
 
+  /**
+   * Run a V1 baseline script with the request's candles passed as a Parquet file.
+   *
+   * Stdin carries only the magic line and a JSON header naming the file; the
+   * response is still one JSON document.
+   */
+  private async runWithCandleFile<T>(
+    scriptPath: string,
+    request: { operation: string; candles_by_call_id: CandlesByCallId },
+    schema: z.ZodSchema<T>,
+    options: PythonScriptOptions
+  ): Promise<T> {
+    const { candles_by_call_id, ...header } = request;
+    const dir = await mkdtemp(join(tmpdir(), 'v1-baseline-'));
+    try {
+      const candlesPath = await writeCandlesParquet(candles_by_call_id, dir);
+      const stdin = CANDLE_FILE_REQUEST_MAGIC + JSON.stringify({ ...header, candles_path: candlesPath }) + '\n';
+      return await this.pythonEngine.runScriptWithStdin(scriptPath, stdin, schema, options);
+    } finally {
+      await rm(dir, { recursive: true, force: true });
+    }
+  }
+
   /**
    * Run capital-aware simulation
    *
@@ -291,13 +388,13 @@ export class V1BaselinePythonService {
     const workspaceRoot = findWorkspaceRoot();
 
     try {
-      // Call Python script with stdin (JSON input)
-      const result = await this.pythonEngine.runScriptWithStdin(
+      // Call Python script with stdin (header) and candles in a Parquet file
+      const result = await this.runWithCandleFile(
         scriptPath,
         {
           operation: 'simulate',
           ...config,
-        } as unknown as Record<string, unknown>,
+        },
         CapitalSimulationResultSchema,
         {
           timeout: 300000, // 5 minute timeout
@@ -340,12 +437,12 @@ export class V1BaselinePythonService {
     const workspaceRoot = findWorkspaceRoot();
 
     try {
-      const result = await this.pythonEngine.runScriptWithStdin(
+      const result = await this.runWithCandleFile(
         scriptPath,
         {
           operation: 'optimize',
           ...config,
-        } as unknown as Record<string, unknown>,
+        },
         V1BaselineOptimizationResultSchema,
         {
           timeout: 600000, // 10 minute timeout (grid search can be slow)
@@ -386,12 +483,12 @@ export class V1BaselinePythonService {
     const workspaceRoot = findWorkspaceRoot();
 
     try {
-      const result = await this.pythonEngine.runScriptWithStdin(
+      const result = await this.runWithCandleFile(
         scriptPath,
         {
           operation: 'optimize_per_caller',
           ...config,
-        } as unknown as Record<string, unknown>,
+        },
         z.record(z.string(), V1BaselinePerCallerResultSchema),
         {
           timeout: 600000, // 10 minute timeout
@@ -432,12 +529,12 @@ export class V1BaselinePythonService {
     const workspaceRoot = findWorkspaceRoot();
 
     try {
-      const result = await this.pythonEngine.runScriptWithStdin(
+      const result = await this.runWithCandleFile(
         scriptPath,
         {
           operation: 'grouped_evaluation',
           ...config,
-        } as unknown as Record<string, unknown>,
+        },
         V1BaselineGroupedResultSchema,
         {
           timeout: 600000, // 10 minute timeout
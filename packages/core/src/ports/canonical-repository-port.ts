@@ -61,9 +61,19 @@ export interface CanonicalEventQueryFilter {
   limit?: number;
 
   /**
-   * Offset for pagination
+   * Offset for pagination (prefer cursor for deep pages)
    */
   offset?: number;
+
+  /**
+   * Keyset cursor: nextCursor of the previous page (offset is ignored)
+   */
+  cursor?: string;
+
+  /**
+   * How total is computed: 'exact' (default) or 'approximate' (cheaper)
+   */
+  count?: 'exact' | 'approximate';
 }
 
 /**
@@ -79,6 +89,16 @@ export interface CanonicalEventQueryResult {
    * Total count (before limit/offset)
    */
   total: number;
+
+  /**
+   * True when total is an estimate (filter.count = 'approximate')
+   */
+  totalIsApproximate?: boolean;
+
+  /**
+   * Cursor for the next page, or null on the last page
+   */
+  nextCursor?: string | null;
 }
 
 /**
@@ -8,6 +8,8 @@
 import { PythonEngine, getPythonEngine, findWorkspaceRoot, logger } from '../../utils/index.js';
 import { z } from 'zod';
 import { join } from 'path';
+import { spawn } from 'child_process';
+import { createInterface } from 'readline';
 
 /**
  * DuckDB operation result schema
@@ -42,6 +44,42 @@ export interface DuckDBQueryResult {
   error?: string; // Python script may return errors in result
 }
 
+/**
+ * Options for DuckDBClient.queryStream
+ */
+export interface DuckDBStreamOptions {
+  /** Max rows per chunk (default 10000) */
+  chunkRows?: number;
+  /** Approximate max serialized bytes per chunk (default 4MB) */
+  maxChunkBytes?: number;
+  /** Stop after this many rows; the trailer cursor continues the query (needs pageKey) */
+  maxRows?: number;
+  /** Cursor from a previous stream's trailer (pass the same sql and pageKey) */
+  cursor?: string;
+  /**
+   * Unique, non-null result columns to page on (keyset paging). The stream is
+   * ordered by them, so the query should not ORDER BY itself.
+   */
+  pageKey?: string[];
+}
+
+/**
+ * Chunk of streamed query rows
+ */
+export interface DuckDBQueryChunk {
+  columns: Array<{ name: string; type: string }>;
+  rows: unknown[][];
+}
+
+/**
+ * End of a streamed query
+ */
+export interface DuckDBStreamTrailer {
+  rowCount: number;
+  /** Continuation cursor when maxRows stopped the stream early */
+  cursor: string | null;
+}
+
 /**
  * DuckDB Client
  * Provides repository-like interface for DuckDB operations
@@ -240,6 +278,97 @@ export class DuckDBClient {
     }
   }
 
+  /**
+   * Stream query results in size-bounded chunks (stream_sql NDJSON protocol).
+   *
+   * Unlike query(), output is read line by line from the Python process, so
+   * large results are not limited by the PythonEngine output buffer.
+   * Returns the trailer (row count and continuation cursor).
+   *
+   * Always requests --format ndjson; stream_sql's Arrow IPC format is for
+   * Python consumers (the workspace has no Arrow JS reader).
+   */
+  async *queryStream(
+    sql: string,
+    options: DuckDBStreamOptions = {}
+  ): AsyncGenerator<DuckDBQueryChunk, DuckDBStreamTrailer> {
+    const trimmedSql = sql.trim();
+    if (!trimmedSql) {
+      throw new Error('SQL query is empty');
+    }
+
+    const args = [
+      this.getDirectSqlScriptPath(),
+      '--operation',
+      'stream_sql',
+      '--db-path',
+      this.dbPath,
+      '--sql',
+      trimmedSql,
+      '--format',
+      'ndjson',
+    ];
+    if (options.chunkRows !== undefined) args.push('--chunk-rows', String(options.chunkRows));
+    if (options.maxChunkBytes !== undefined) {
+      args.push('--max-chunk-bytes', String(options.maxChunkBytes));
+    }
+    if (options.maxRows !== undefined) args.push('--max-rows', String(options.maxRows));
+    if (options.cursor) args.push('--cursor', options.cursor);
+    if (options.pageKey?.length) args.push('--page-key', options.pageKey.join(','));
+
+    const child = spawn(this.pythonEngine.pythonCommand, args, { stdio: ['ignore', 'pipe', 'pipe'] });
+    let stderr = '';
+    child.stderr.on('data', (data: Buffer) => {
+      stderr += data.toString();
+    });
+    const exited = new Promise<number | null>((resolve) => child.on('close', resolve));
+
+    let columns: DuckDBQueryChunk['columns'] = [];
+    let trailer: DuckDBStreamTrailer | undefined;
+    try {
+      for await (const line of createInterface({ input: child.stdout, crlfDelay: Infinity })) {
+        if (!line) continue;
+        const message = JSON.parse(line) as {
+          columns?: DuckDBQueryChunk['columns'];
+          rows?: unknown[][];
+          done?: boolean;
+          rowCount?: number;
+          cursor?: string | null;
+          error?: string;
+        };
+        if (message.error) {
+          throw new Error(message.error);
+        }
+        if (message.columns) {
+          columns = message.columns;
+        } else if (message.rows) {
+          yield { columns, rows: message.rows };
+        } else if (message.done) {
+          trailer = { rowCount: message.rowCount ?? 0, cursor: message.cursor ?? null };
+        }
+      }
+      const exitCode = await exited;
+      if (!trailer) {
+        throw new Error(`DuckDB stream ended without trailer (exit ${exitCode}): ${stderr.trim()}`);
+      }
+      return trailer;
+    } catch (error) {
+      const errorInfo = this.classifyError(error);
+      logger.error('DuckDB query stream failed', error as Error, {
+        category: errorInfo.category,
+        sql: sql.substring(0, 200),
+        dbPath: this.dbPath,
+      });
+      const enhancedError = new Error(errorInfo.userMessage);
+      enhancedError.cause = error;
+      throw enhancedError;
+    } finally {
+      if (child.exitCode === null) {
+        child.kill();
+      }
+    }
+  }
+
   /**
    * Close the database connection
    */
@@ -21,6 +21,8 @@ const CanonicalEventResponseSchema = CanonicalEventSchema;
 const CanonicalEventQueryResultSchema = z.object({
   events: z.array(CanonicalEventSchema),
   total: z.number().int(),
+  totalIsApproximate: z.boolean().optional(),
+  nextCursor: z.string().nullable().optional(),
 });
 
 const CanonicalEventListSchema = z.array(CanonicalEventSchema);
@@ -454,4 +454,49 @@ export class ExperimentTrackerAdapter implements ExperimentTrackerPort {
       );
     }
   }
+
+  /**
+   * Find experiments that depend on artifacts, directly or via derived artifacts
+   * (outputs of dependent experiments and, with manifestDb, artifact lineage).
+   */
+  async findDependentExperiments(
+    artifactIds: string[],
+    manifestDb?: string
+  ): Promise<Array<Experiment & { dependency: 'direct' | 'derived' }>> {
+    logger.debug('Finding dependent experiments', { artifactIds, manifestDb });
+
+    if (!Array.isArray(artifactIds)) {
+      throw new AppError('Artifact IDs must be an array', 'VALIDATION_ERROR', 400);
+    }
+    if (artifactIds.length === 0) {
+      return [];
+    }
+    artifactIds.forEach(validateArtifactId);
+
+    try {
+      const result = await this.pythonEngine.runScriptWithStdin(
+        this.scriptPath,
+        {
+          operation: 'find_dependent_experiments',
+          dbPath: this.dbPath,
+          artifactIds,
+          manifestDb,
+        },
+        z.array(ExperimentSchema.extend({ dependency: z.enum(['direct', 'derived']) }))
+      );
+
+      return result;
+    } catch (error) {
+      const message = error instanceof Error ? error.message : String(error);
+      if (error instanceof AppError && error.code === 'VALIDATION_ERROR') {
+        throw error;
+      }
+      throw new AppError(
+        `Failed to find dependent experiments: ${message}`,
+        'EXPERIMENT_TRACKER_ERROR',
+        500,
+        { artifactIds }
+      );
+    }
+  }
 }
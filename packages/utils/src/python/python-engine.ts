@@ -112,7 +112,8 @@ export interface ArtifactVerificationOptions {
  */
 export class PythonEngine {
   private readonly defaultTimeout = 5 * 60 * 1000; // 5 minutes
-  private readonly pythonCommand: string;
+  /** Interpreter used for every script run (also for callers that spawn Python directly) */
+  readonly pythonCommand: string;
 
   constructor(pythonCommand: string = 'python3') {
     this.pythonCommand = pythonCommand;
@@ -4,9 +4,10 @@ from __future__ import annotations
 import json
 import time
 import shutil
+import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import duckdb
 import sys
@@ -103,27 +104,59 @@ def ensure_catalog_schema(con: duckdb.DuckDBPyConnection) -> None:
         FROM catalog.artifacts_f
       ) SELECT * FROM ranked WHERE rn=1;
     """)
+    # One row per daemon cycle that ingested/rejected jobs or refreshed exports
+    con.execute("""
+      CREATE TABLE IF NOT EXISTS catalog.bus_cycles_f (
+        cycle_id         VARCHAR PRIMARY KEY,
+        started_at_utc   TIMESTAMP,
+        finished_at_utc  TIMESTAMP,
+        jobs_ingested    INTEGER,
+        jobs_rejected    INTEGER,
+        jobs_failed      INTEGER,
+        artifacts        INTEGER,
+        rows             BIGINT,
+        ingest_ms        DOUBLE,
+        exports_run      INTEGER,
+        exports_failed   INTEGER,
+        export_ms        DOUBLE,
+        touched_json     VARCHAR
+      );
+    """)
+
+
+def job_meta(job_dir: Path, manifest: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Manifest meta merged with the job's metadata.json (backtest commands create this), plus the raw file."""
+    manifest_meta = manifest.get("meta", {})
+    metadata_path = job_dir / "metadata.json"
+    metadata_content = None
+    if metadata_path.exists():
+        metadata_content = read_json(metadata_path)
+        # Merge metadata.json into manifest meta
+        manifest_meta = {**manifest_meta, **metadata_content}
+    return manifest_meta, metadata_content
+
+
+def touched_tables(manifest: Dict[str, Any]) -> Set[str]:
+    """Tables a job writes or feeds: the catalog tables plus each artifact's schema_hint."""
+    touched = {"catalog.runs_d", "catalog.artifacts_f"}
+    for a in manifest.get("artifacts", []):
+        if a.get("schema_hint"):
+            touched.add(a["schema_hint"])
+    return touched
 
 
-def canonicalize_and_catalog(
+def catalog_job(
     con: duckdb.DuckDBPyConnection,
     bus_dirs: Dict[str, Path],
     job_dir: Path,
     manifest: Dict[str, Any],
 ) -> None:
+    """Catalog rows for one job. Writes nothing to disk; see canonicalize_job."""
     run_id = manifest["run_id"]
     producer = manifest.get("producer")
     kind = manifest.get("kind")
     created_at = manifest.get("created_at_utc")
-    manifest_meta = manifest.get("meta", {})
-
-    # Check for metadata.json file (backtest commands create this)
-    metadata_path = job_dir / "metadata.json"
-    metadata_content = None
-    if metadata_path.exists():
-        metadata_content = read_json(metadata_path)
-        # Merge metadata.json into manifest meta
-        manifest_meta = {**manifest_meta, **metadata_content}
+    manifest_meta, metadata_content = job_meta(job_dir, manifest)
 
     meta_json = json.dumps(manifest_meta, ensure_ascii=False)
 
@@ -141,15 +174,56 @@ def canonicalize_and_catalog(
         [run_id, producer, created_at, meta_json],
     )
 
+    run_store = bus_dirs["store"] / run_id
+    seq = 0
+    for a in manifest["artifacts"]:
+        seq += 1
+        artifact_id = a["artifact_id"]
+        fmt = a.get("format", "parquet")
+        schema_hint = a.get("schema_hint")
+        rows = a.get("rows")
+
+        a_meta = a.copy()
+        a_meta.pop("relpath", None)
+
+        artifact_key = f"{run_id}:{artifact_id}:{seq}"
+        canonical_path = str(run_store / "artifacts" / artifact_id / f"data.{fmt}")
+
+        # Add metadata.json reference if this artifact has one
+        if metadata_content and a_meta.get("metadataFile") == "metadata.json":
+            a_meta["metadata_json_path"] = str(run_store / "metadata.json")
+
+        con.execute(
+            """
+            INSERT INTO catalog.artifacts_f (
+              artifact_key, run_id, artifact_id, producer, kind, format,
+              canonical_path, rows, schema_hint, created_at_utc, meta_json
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(artifact_key) DO NOTHING;
+            """,
+            [
+                artifact_key, run_id, artifact_id, producer, kind, fmt,
+                canonical_path, rows, schema_hint, created_at, json.dumps(a_meta, ensure_ascii=False)
+            ],
+        )
+
+
+def canonicalize_job(bus_dirs: Dict[str, Path], job_dir: Path, manifest: Dict[str, Any]) -> None:
+    """Move a job's files into the canonical store (after its catalog rows are committed)."""
+    run_id = manifest["run_id"]
+    manifest_meta, metadata_content = job_meta(job_dir, manifest)
+    metadata_path = job_dir / "metadata.json"
+
     run_store = bus_dirs["store"] / run_id
     run_store.mkdir(parents=True, exist_ok=True)
     
     # Write meta.json in canonical store (includes metadata.json content if present)
     write_json(run_store / "meta.json", {
         "run_id": run_id,
-        "producer": producer,
-        "kind": kind,
-        "created_at_utc": created_at,
+        "producer": manifest.get("producer"),
+        "kind": manifest.get("kind"),
+        "created_at_utc": manifest.get("created_at_utc"),
         "ingested_at_utc": utc_now_iso(),
         "meta": manifest_meta,
         "job_id": manifest.get("job_id"),
@@ -160,17 +234,10 @@ def canonicalize_and_catalog(
     if metadata_path.exists():
         shutil.move(str(metadata_path), str(run_store / "metadata.json"))
 
-    seq = 0
     for a in manifest["artifacts"]:
-        seq += 1
         artifact_id = a["artifact_id"]
         fmt = a.get("format", "parquet")
         relpath = a["relpath"]
-        schema_hint = a.get("schema_hint")
-        rows = a.get("rows")
-
-        a_meta = a.copy()
-        a_meta.pop("relpath", None)
 
         src = job_dir / relpath
         art_dir = run_store / "artifacts" / artifact_id
@@ -186,33 +253,51 @@ def canonicalize_and_catalog(
         if schema_path.exists():
             shutil.move(str(schema_path), str(art_dir / "schema.json"))
 
-        artifact_key = f"{run_id}:{artifact_id}:{seq}"
-        canonical_path = str(dst)
-
-        # Add metadata.json reference if this artifact has one
-        if metadata_content and a_meta.get("metadataFile") == "metadata.json":
-            a_meta["metadata_json_path"] = str(run_store / "metadata.json")
-
-        con.execute(
-            """
-            INSERT INTO catalog.artifacts_f (
-              artifact_key, run_id, artifact_id, producer, kind, format,
-              canonical_path, rows, schema_hint, created_at_utc, meta_json
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(artifact_key) DO NOTHING;
-            """,
-            [
-                artifact_key, run_id, artifact_id, producer, kind, fmt,
-                canonical_path, rows, schema_hint, created_at, json.dumps(a_meta, ensure_ascii=False)
-            ],
-        )
 
+def catalog_jobs(
+    con: duckdb.DuckDBPyConnection,
+    bus_dirs: Dict[str, Path],
+    jobs: List[Tuple[Path, Dict[str, Any]]],
+) -> Tuple[List[Tuple[Path, Dict[str, Any]]], List[Tuple[Path, str]]]:
+    """
+    Catalog a batch of jobs in one transaction.
 
-def run_exports(con: duckdb.DuckDBPyConnection, export_cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
+    If the batch fails it is rolled back and retried one job per transaction,
+    so a single bad job cannot hold back the rest. Returns (cataloged, failed).
+    """
+    if not jobs:
+        return [], []
+    con.execute("BEGIN TRANSACTION;")
+    try:
+        for job_dir, manifest in jobs:
+            catalog_job(con, bus_dirs, job_dir, manifest)
+        con.execute("COMMIT;")
+        return list(jobs), []
+    except Exception as e:
+        con.execute("ROLLBACK;")
+        if len(jobs) == 1:
+            return [], [(jobs[0][0], str(e))]
+
+    cataloged: List[Tuple[Path, Dict[str, Any]]] = []
+    failed: List[Tuple[Path, str]] = []
+    for job in jobs:
+        ok, err = catalog_jobs(con, bus_dirs, [job])
+        cataloged.extend(ok)
+        failed.extend(err)
+    return cataloged, failed
+
+
+def run_exports(
+    con: duckdb.DuckDBPyConnection,
+    export_cfg: Dict[str, Any],
+    touched: Optional[Set[str]] = None,
+) -> List[Dict[str, Any]]:
     """
     Regenerates golden Parquet exports from SQL.
     Uses COPY (SELECT ...) TO 'path' (FORMAT PARQUET).
+
+    With `touched`, export jobs that declare `depends_on` are only refreshed if
+    one of those tables was touched; jobs without `depends_on` always refresh.
     """
     if not export_cfg or not export_cfg.get("enabled"):
         return []
@@ -229,11 +314,18 @@ def run_exports(con: duckdb.DuckDBPyConnection, export_cfg: Dict[str, Any]) -> L
             results.append({"name": name, "ok": False, "error": "missing sql"})
             continue
 
+        depends_on = job.get("depends_on")
+        if touched is not None and depends_on and not touched.intersection(depends_on):
+            results.append({"name": name, "ok": True, "skipped": True, "path": str(out_path)})
+            continue
+
         try:
+            started = time.perf_counter()
             # DuckDB COPY requires a file path string literal; we embed safely by escaping single quotes
             out_str = str(out_path).replace("'", "''")
             con.execute(f"COPY ({sql}) TO '{out_str}' (FORMAT PARQUET);")
-            results.append({"name": name, "ok": True, "path": str(out_path)})
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            results.append({"name": name, "ok": True, "path": str(out_path), "ms": round(elapsed_ms, 1)})
         except Exception as e:
             results.append({"name": name, "ok": False, "error": str(e)})
 
@@ -245,38 +337,198 @@ def run_exports(con: duckdb.DuckDBPyConnection, export_cfg: Dict[str, Any]) -> L
     return results
 
 
-def process_one_job(config: Dict[str, Any], job_dir: Path) -> Optional[str]:
+class ExportDebouncer:
+    """
+    Collects tables touched by ingested jobs and says when exports are due:
+    once no new jobs have landed for `debounce_s`, or `max_delay_s` after the
+    first pending change so a steady stream of jobs cannot starve exports.
+    """
+
+    def __init__(self, debounce_s: float = 5.0, max_delay_s: float = 60.0):
+        self.debounce_s = debounce_s
+        self.max_delay_s = max_delay_s
+        self.pending: Set[str] = set()
+        self.first_at: Optional[float] = None
+        self.last_at: Optional[float] = None
+
+    def touch(self, tables: Iterable[str], now: float) -> None:
+        self.pending.update(tables)
+        if self.first_at is None:
+            self.first_at = now
+        self.last_at = now
+
+    def due(self, now: float) -> bool:
+        if self.first_at is None:
+            return False
+        return now - self.last_at >= self.debounce_s or now - self.first_at >= self.max_delay_s
+
+    def take(self) -> Set[str]:
+        touched = self.pending
+        self.pending = set()
+        self.first_at = None
+        self.last_at = None
+        return touched
+
+
+def reject_job(bus_dirs: Dict[str, Path], job_dir: Path, err: str) -> None:
+    rej_dir = bus_dirs["rejected"] / job_dir.name
+    if rej_dir.exists():
+        shutil.rmtree(rej_dir)
+    shutil.move(str(job_dir), str(rej_dir))
+    write_json(rej_dir / "REJECT_REASON.json", {"error": err, "rejected_at_utc": utc_now_iso()})
+    print(f"[bus_daemon] rejected {job_dir.name}: {err}", flush=True)
+
+
+def record_failure(bus_dirs: Dict[str, Path], job_dir: Path, err: str, max_attempts: int) -> bool:
+    """
+    Count a failed ingest attempt in the job's INGEST_FAILURES.json.
+
+    After max_attempts the job is moved to rejected/ like an invalid manifest
+    so it stops being retried every poll. Returns True if it was rejected.
+    """
+    failures_path = job_dir / "INGEST_FAILURES.json"
+    attempts = 0
+    if failures_path.exists():
+        try:
+            attempts = int(read_json(failures_path).get("attempts", 0))
+        except (ValueError, OSError):
+            attempts = 0
+    attempts += 1
+    if attempts >= max_attempts:
+        reject_job(bus_dirs, job_dir, f"ingest failed {attempts} times: {err}")
+        return True
+    write_json(failures_path, {"attempts": attempts, "last_error": err, "last_failed_at_utc": utc_now_iso()})
+    return False
+
+
+def load_job(job_dir: Path) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """(manifest, None) for a valid job, (None, reason) otherwise."""
     manifest_path = job_dir / "manifest.json"
     if not manifest_path.exists():
-        return f"missing manifest.json in {job_dir.name}"
+        return None, f"missing manifest.json in {job_dir.name}"
 
     manifest = read_json(manifest_path)
     errs = validate_manifest(manifest, job_dir)
     if errs:
-        return "manifest invalid: " + "; ".join(errs)
+        return None, "manifest invalid: " + "; ".join(errs)
+    return manifest, None
+
+
+def record_cycle(con: duckdb.DuckDBPyConnection, metrics: Dict[str, Any]) -> None:
+    con.execute(
+        """
+        INSERT INTO catalog.bus_cycles_f (
+          cycle_id, started_at_utc, finished_at_utc, jobs_ingested, jobs_rejected, jobs_failed,
+          artifacts, rows, ingest_ms, exports_run, exports_failed, export_ms, touched_json
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """,
+        [
+            metrics["cycle_id"], metrics["started_at_utc"], metrics["finished_at_utc"],
+            metrics["jobs_ingested"], metrics["jobs_rejected"], metrics["jobs_failed"],
+            metrics["artifacts"], metrics["rows"], metrics["ingest_ms"],
+            metrics["exports_run"], metrics["exports_failed"], metrics["export_ms"],
+            json.dumps(sorted(metrics["touched"])),
+        ],
+    )
 
-    bus_root = Path(config["bus_root"])
-    bus_dirs = ensure_dirs(bus_root)
+
+def run_cycle(
+    config: Dict[str, Any],
+    bus_dirs: Dict[str, Path],
+    debouncer: ExportDebouncer,
+    now: Callable[[], float] = time.monotonic,
+) -> Optional[Dict[str, Any]]:
+    """
+    Drain committed jobs from the inbox in one catalog transaction, refresh
+    exports if the debounce window has closed, and record cycle metrics.
+    Jobs that fail to catalog stay in the inbox and are rejected after
+    max_job_attempts failures. A cycle is only recorded in catalog.bus_cycles_f
+    if it ingested, rejected or exported something.
+    Returns the metrics, or None if there was nothing to do.
+    """
+    started_at = utc_now_iso()
+    max_jobs = int(config.get("max_jobs_per_cycle", 500))
+    max_attempts = int(config.get("max_job_attempts", 5))
+
+    jobs: List[Tuple[Path, Dict[str, Any]]] = []
+    rejected = 0
+    for job_dir in sorted([p for p in bus_dirs["inbox"].iterdir() if p.is_dir()]):
+        if len(jobs) >= max_jobs:
+            break
+        if not is_committed(job_dir):
+            continue
+        manifest, err = load_job(job_dir)
+        if err:
+            reject_job(bus_dirs, job_dir, err)
+            rejected += 1
+        else:
+            jobs.append((job_dir, manifest))
+
+    if not jobs and not rejected and not debouncer.due(now()):
+        return None
 
     duckdb_path = config["duckdb_path"]
     lock_path = duckdb_path + ".writer.lock"
-
-    with WriterLock(lock_path, meta={"task": "bus_ingest", "job_dir": str(job_dir)}, timeout_s=int(config.get("lock_timeout_s", 120))):
+    metrics: Dict[str, Any] = {
+        "cycle_id": uuid.uuid4().hex,
+        "started_at_utc": started_at,
+        "jobs_ingested": 0,
+        "jobs_rejected": rejected,
+        "jobs_failed": 0,
+        "artifacts": 0,
+        "rows": 0,
+        "ingest_ms": 0.0,
+        "exports_run": 0,
+        "exports_failed": 0,
+        "export_ms": 0.0,
+        "touched": set(),
+    }
+
+    with WriterLock(lock_path, meta={"task": "bus_ingest", "jobs": len(jobs)}, timeout_s=int(config.get("lock_timeout_s", 120))):
         con = duckdb.connect(duckdb_path)
         try:
             ensure_catalog_schema(con)
-            canonicalize_and_catalog(con, bus_dirs, job_dir, manifest)
 
-            # 🔥 Golden exports (always after successful ingest)
-            run_exports(con, config.get("export", {}))
+            t0 = time.perf_counter()
+            cataloged, failed = catalog_jobs(con, bus_dirs, jobs)
+            for job_dir, err in failed:
+                # Left in the inbox and retried next cycle, until max_job_attempts
+                print(f"[bus_daemon] error ingesting {job_dir.name}: {err}", flush=True)
+                if record_failure(bus_dirs, job_dir, err, max_attempts):
+                    metrics["jobs_rejected"] += 1
+
+            for job_dir, manifest in cataloged:
+                debouncer.touch(touched_tables(manifest), now())
+                canonicalize_job(bus_dirs, job_dir, manifest)
+                dest = bus_dirs["processed"] / job_dir.name
+                if dest.exists():
+                    shutil.rmtree(dest)
+                shutil.move(str(job_dir), str(dest))
+                metrics["artifacts"] += len(manifest["artifacts"])
+                metrics["rows"] += sum(int(a.get("rows") or 0) for a in manifest["artifacts"])
+            metrics["ingest_ms"] = (time.perf_counter() - t0) * 1000.0
+            metrics["jobs_ingested"] = len(cataloged)
+            metrics["jobs_failed"] = len(failed)
+
+            # 🔥 Golden exports (once per burst, only what the burst touched)
+            if debouncer.due(now()):
+                touched = debouncer.take()
+                t0 = time.perf_counter()
+                results = run_exports(con, config.get("export", {}), touched)
+                metrics["export_ms"] = (time.perf_counter() - t0) * 1000.0
+                metrics["exports_run"] = sum(1 for r in results if r["ok"] and not r.get("skipped"))
+                metrics["exports_failed"] = sum(1 for r in results if not r["ok"])
+                metrics["touched"] = touched
+
+            metrics["finished_at_utc"] = utc_now_iso()
+            # Cycles that only retried a failing job leave no trace in the catalog
+            if metrics["jobs_ingested"] or metrics["jobs_rejected"] or metrics["touched"]:
+                record_cycle(con, metrics)
         finally:
             con.close()
 
-    dest = bus_dirs["processed"] / job_dir.name
-    if dest.exists():
-        shutil.rmtree(dest)
-    shutil.move(str(job_dir), str(dest))
-    return None
+    return metrics
 
 
 def main() -> int:
@@ -290,23 +542,28 @@ def main() -> int:
     bus_dirs = ensure_dirs(bus_root)
 
     poll = float(config.get("poll_interval_s", 1.0))
+    export_cfg = config.get("export", {})
+    debouncer = ExportDebouncer(
+        debounce_s=float(export_cfg.get("debounce_s", 5.0)),
+        max_delay_s=float(export_cfg.get("max_delay_s", 60.0)),
+    )
     print(f"[bus_daemon] up. inbox={bus_dirs['inbox']} duckdb={config['duckdb_path']}", flush=True)
 
     while True:
         try:
-            for job_dir in sorted([p for p in bus_dirs["inbox"].iterdir() if p.is_dir()]):
-                if not is_committed(job_dir):
-                    continue
-                err = process_one_job(config, job_dir)
-                if err:
-                    rej_dir = bus_dirs["rejected"] / job_dir.name
-                    if rej_dir.exists():
-                        shutil.rmtree(rej_dir)
-                    shutil.move(str(job_dir), str(rej_dir))
-                    write_json(rej_dir / "REJECT_REASON.json", {"error": err, "rejected_at_utc": utc_now_iso()})
-                    print(f"[bus_daemon] rejected {job_dir.name}: {err}", flush=True)
-                else:
-                    print(f"[bus_daemon] processed {job_dir.name} + exports refreshed", flush=True)
+            metrics = run_cycle(config, bus_dirs, debouncer)
+            if metrics and metrics["jobs_ingested"]:
+                print(
+                    f"[bus_daemon] processed {metrics['jobs_ingested']} jobs "
+                    f"({metrics['rows']} rows) in {metrics['ingest_ms']:.0f} ms",
+                    flush=True,
+                )
+            if metrics and metrics["touched"]:
+                print(
+                    f"[bus_daemon] exports refreshed: {metrics['exports_run']} run, "
+                    f"{metrics['exports_failed']} failed in {metrics['export_ms']:.0f} ms",
+                    flush=True,
+                )
 
             time.sleep(poll)
         except KeyboardInterrupt:
@@ -319,4 +576,3 @@ def main() -> int:
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
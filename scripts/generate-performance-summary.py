@@ -9,7 +9,6 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 from pathlib import Path
 import statistics
-import random
 import numpy as np
 
 def analyze_trades(trades_file: str) -> dict:
@@ -257,18 +256,233 @@ def calculate_trend_and_volatility(weekly_pnls: list, use_full_history: bool = T
     }
 
 
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_BAND_PATHS = 100_000
+BAND_QUANTILES = [0.01, 0.05, 0.25, 0.50, 0.75, 0.95, 0.99]
+
+
+def _chunk_sizes(num_simulations: int, chunk_size: int):
+    for start in range(0, num_simulations, chunk_size):
+        yield min(chunk_size, num_simulations - start)
+
+
+def _block_bootstrap_indices(rng: np.random.Generator, n: int, weeks: int, history: int, block_size: int) -> np.ndarray:
+    """
+    [n, weeks] indices into the weekly return history, drawn as circular
+    blocks of `block_size` consecutive weeks (block_size=1 is plain iid
+    resampling).
+    """
+    if block_size <= 1:
+        return rng.integers(0, history, size=(n, weeks))
+    n_blocks = -(-weeks // block_size)
+    starts = rng.integers(0, history, size=(n, n_blocks, 1))
+    idx = (starts + np.arange(block_size)) % history
+    return idx.reshape(n, n_blocks * block_size)[:, :weeks]
+
+
+def simulate_bootstrap_paths(
+    historical_weekly_returns,
+    weeks: int,
+    starting_value: float,
+    num_simulations: int = 10000,
+    weekly_return_trend: float = 0.0,
+    block_size: int = 1,
+    seed=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    band_paths: int = DEFAULT_BAND_PATHS,
+):
+    """
+    Bootstrap weekly-return paths, `chunk_size` simulations at a time.
+
+    Each week resamples a historical weekly return (in blocks of `block_size`
+    weeks) and applies the trend, sample-size penalty, worse-week blend,
+    variability, mean-reversion and severe-week shocks of
+    bootstrap_trade_level_projection.
+
+    Returns (final_values [num_simulations], paths [min(band_paths, n), weeks])
+    where paths holds the portfolio value after each week for the first paths.
+    """
+    returns = np.asarray(historical_weekly_returns, dtype=np.float64)
+    avg_weekly_return = returns.mean()
+    std_weekly_return = returns.std(ddof=1) if len(returns) > 1 else 0.0
+
+    rng = np.random.default_rng(seed)
+    final_values = np.empty(num_simulations, dtype=np.float64)
+    paths = np.empty((min(band_paths, num_simulations), weeks), dtype=np.float64)
+
+    frac = np.arange(weeks) / weeks if weeks else np.zeros(0)
+    trend_adjustment = weekly_return_trend * frac * 0.7  # 70% of trend effect
+    sample_size_penalty = 1.0 - frac * 0.7  # Up to 70% reduction over full period
+    std_adjustment = std_weekly_return * (1.0 + frac * 0.5)  # Up to 50% more uncertainty
+
+    offset = 0
+    for n in _chunk_sizes(num_simulations, chunk_size):
+        r = returns[_block_bootstrap_indices(rng, n, weeks, len(returns), block_size)]
+        r = (r + trend_adjustment) * sample_size_penalty
+
+        # 35% chance of a worse-than-historical week, blended 50/50 with the sample
+        worse = rng.random((n, weeks)) < 0.35
+        worse_return = avg_weekly_return * 0.05 + rng.standard_normal((n, weeks)) * (std_adjustment * 2.0)
+        r = np.where(worse, 0.5 * r + 0.5 * worse_return, r)
+
+        # Variability (50% of std dev)
+        r += rng.standard_normal((n, weeks)) * (std_adjustment * 0.5)
+
+        # 8% mean-reversion shocks, 2% severe negative weeks
+        shock = rng.random((n, weeks)) < 0.08
+        r += np.where(shock, rng.standard_normal((n, weeks)) * (std_adjustment * 0.8) - std_adjustment * 2.0, 0.0)
+        severe = rng.random((n, weeks)) < 0.02
+        r += np.where(severe, rng.standard_normal((n, weeks)) * std_adjustment - std_adjustment * 3.0, 0.0)
+
+        np.clip(r, -25.0, 25.0, out=r)
+
+        # Compound only at the end of each week
+        growth = np.cumprod(1.0 + r / 100.0, axis=1)
+        final_values[offset:offset + n] = starting_value * (growth[:, -1] if weeks else 1.0)
+
+        keep = min(n, len(paths) - offset)
+        if keep > 0:
+            paths[offset:offset + keep] = starting_value * growth[:keep]
+        offset += n
+
+    return final_values, paths
+
+
+def simulate_ar1_paths(
+    weeks: int,
+    starting_value: float,
+    final_mean: float,
+    final_std: float,
+    autocorr: float,
+    num_simulations: int = 10000,
+    seed=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    band_paths: int = DEFAULT_BAND_PATHS,
+):
+    """
+    Autocorrelated normal weekly-return paths, `chunk_size` simulations at a time.
+
+    Each week's mean decays with time and carries `autocorr * 0.5` of the
+    previous week's return (AR(1)); volatility grows with time and 5% of
+    weeks are +/-2.5 std extremes, as in monte_carlo_projection.
+
+    Returns (final_values, paths) like simulate_bootstrap_paths.
+    """
+    rng = np.random.default_rng(seed)
+    final_values = np.empty(num_simulations, dtype=np.float64)
+    paths = np.empty((min(band_paths, num_simulations), weeks), dtype=np.float64)
+
+    offset = 0
+    for n in _chunk_sizes(num_simulations, chunk_size):
+        value = np.full(n, starting_value, dtype=np.float64)
+        previous_return = np.zeros(n, dtype=np.float64)
+        keep = max(0, min(n, len(paths) - offset))
+
+        for week in range(weeks):
+            adjusted_mean = final_mean * (1.0 - (week / weeks) * 0.3) + previous_return * autocorr * 0.5
+            adjusted_std = final_std * (1.0 + (week / weeks) * 0.3)
+
+            weekly_return = adjusted_mean + adjusted_std * rng.standard_normal(n)
+
+            # Fat tails: 5% chance of a 2.5 std extreme in either direction
+            extreme = rng.random(n) < 0.05
+            direction = np.where(rng.random(n) < 0.5, 1.0, -1.0)
+            weekly_return = np.where(extreme, adjusted_mean + direction * adjusted_std * 2.5, weekly_return)
+
+            np.clip(weekly_return, -20.0, 30.0, out=weekly_return)
+            value *= 1.0 + weekly_return / 100.0
+            previous_return = weekly_return
+            if keep:
+                paths[offset:offset + keep, week] = value[:keep]
+
+        final_values[offset:offset + n] = value
+        offset += n
+
+    return final_values, paths
+
+
+def summarize_projection(
+    final_values: np.ndarray,
+    paths: np.ndarray,
+    starting_value: float,
+    confidence_levels: list,
+) -> dict:
+    """
+    Percentiles, probabilities, stress test and weekly bands for simulated paths.
+
+    percentiles[conf] is the outcome exceeded with probability ~conf (the
+    (1 - conf) order statistic); bands[q] is np.quantile of portfolio value
+    at q after each week, over the stored paths.
+    """
+    num_simulations = len(final_values)
+    final_sorted = np.sort(final_values)
+    pnl = (final_values - starting_value) / starting_value * 100.0
+    multiplier = final_values / starting_value
+
+    def outcome(value: float) -> dict:
+        return {
+            'value': float(value),
+            'pnl': float((value - starting_value) / starting_value * 100.0),
+            'return_multiplier': float(value / starting_value)
+        }
+
+    percentiles = {conf: outcome(final_sorted[int((1 - conf) * num_simulations)]) for conf in confidence_levels}
+    expected = outcome(final_sorted[num_simulations // 2])
+
+    worst_5pct = float(final_sorted[int(0.05 * num_simulations)])
+    worst_1pct = float(final_sorted[int(0.01 * num_simulations)])
+
+    bands = {}
+    if paths.size:
+        band_values = np.quantile(paths, BAND_QUANTILES, axis=0)
+        bands = {q: band_values[i].tolist() for i, q in enumerate(BAND_QUANTILES)}
+
+    return {
+        'expected': expected,
+        'percentiles': percentiles,
+        'probabilities': {
+            'positive_return': float(np.count_nonzero(pnl > 0)) / num_simulations * 100.0,
+            'double_or_more': float(np.count_nonzero(multiplier >= 2.0)) / num_simulations * 100.0,
+            '10x_or_more': float(np.count_nonzero(multiplier >= 10.0)) / num_simulations * 100.0,
+            'loss': float(np.count_nonzero(pnl < 0)) / num_simulations * 100.0
+        },
+        'stress_test': {
+            'worst_5pct': worst_5pct,
+            'worst_1pct': worst_1pct,
+            'worst_5pct_multiplier': worst_5pct / starting_value,
+            'worst_1pct_multiplier': worst_1pct / starting_value,
+            'worst_5pct_pnl': (worst_5pct - starting_value) / starting_value * 100.0,
+            'worst_1pct_pnl': (worst_1pct - starting_value) / starting_value * 100.0
+        },
+        'bands': bands,
+        'all_simulations': [
+            {'final_value': float(v), 'final_pnl': float(p), 'return_multiplier': float(m)}
+            for v, p, m in zip(final_values[:100], pnl[:100], multiplier[:100])
+        ]
+    }
+
+
 def bootstrap_trade_level_projection(
     stats: dict,
     start_date: str,
     end_date: str,
     num_simulations: int = 10000,
     confidence_levels: list = [0.01, 0.05, 0.25, 0.50, 0.75, 0.95, 0.99],
-    use_full_history: bool = True
+    use_full_history: bool = True,
+    block_size: int = 1,
+    seed=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
 ) -> dict:
     """
     Bootstrap-based Monte Carlo projection using weekly returns.
     This is more statistically accurate than parametric models and preserves
     the actual correlation structure of trades within weeks.
+
+    The resampling unit is a historical weekly return, not an individual
+    trade: the default block_size=1 draws weeks iid, which is the same
+    statistic the original per-simulation loop computed. block_size > 1
+    resamples runs of consecutive weeks (moving-block bootstrap) to keep
+    week-to-week autocorrelation.
     """
     
     # Calculate weeks between dates
@@ -327,137 +541,31 @@ def bootstrap_trade_level_projection(
     else:
         trade_freq_trend = 0.0
     
-    # Run bootstrap Monte Carlo simulations
-    simulation_results = []
+    # Run bootstrap Monte Carlo simulations (vectorized, chunked)
     starting_value = stats['final_portfolio_value']
-    
-    for sim in range(num_simulations):
-        portfolio_value = starting_value
-        
-        # Generate weekly returns using bootstrap sampling
-        for week in range(weeks):
-            # Bootstrap sample from actual weekly returns
-            weekly_return = random.choice(historical_weekly_returns)
-            
-            # Apply trend (performance may improve or degrade over time)
-            # Trend is applied gradually over the projection period
-            trend_adjustment = weekly_return_trend * (week / weeks) * 0.7  # 70% of trend effect (more aggressive)
-            adjusted_weekly_return = weekly_return + trend_adjustment
-            
-            # Conservative adjustment: Account for small sample size and potential mean reversion
-            # As we project further into the future, reduce expected returns more aggressively
-            # This accounts for the fact that we're extrapolating from only 17 weeks
-            # More aggressive penalty: up to 70% reduction over full period
-            sample_size_penalty = 1.0 - (week / weeks) * 0.7  # Up to 70% reduction over full period
-            adjusted_weekly_return *= sample_size_penalty
-            
-            # Additional uncertainty penalty: increase variability as we project further
-            # More uncertainty in later weeks
-            uncertainty_multiplier = 1.0 + (week / weeks) * 0.5  # Up to 50% more uncertainty
-            std_adjustment = std_weekly_return * uncertainty_multiplier
-            
-            # Account for potential negative weeks we haven't seen yet
-            # With only 17 weeks, we may not have seen all possible outcomes
-            # Increased probability of worse outcomes (35% instead of 25%)
-            if np.random.random() < 0.35:  # 35% chance of worse-than-historical week
-                # Draw from a more conservative distribution
-                # Use negative tail of normal distribution with more negative bias
-                worse_return = np.random.normal(avg_weekly_return * 0.05, std_adjustment * 2.0)
-                # Blend with bootstrap sample (50% worse, 50% bootstrap) - equal weight
-                adjusted_weekly_return = 0.5 * adjusted_weekly_return + 0.5 * worse_return
-            
-            # Add more variability (increased from 20% to 50% of std dev)
-            # This adds more realistic variability while preserving bootstrap properties
-            variability = np.random.normal(0, std_adjustment * 0.5)
-            adjusted_weekly_return += variability
-            
-            # Additional mean reversion effect: occasional large negative corrections
-            # 8% chance of a significant negative week (mean reversion) - increased from 5%
-            if np.random.random() < 0.08:
-                mean_reversion_shock = np.random.normal(-std_adjustment * 2.0, std_adjustment * 0.8)
-                adjusted_weekly_return += mean_reversion_shock
-            
-            # Add probability of complete failure scenarios (market crashes, strategy failure)
-            # 2% chance per week of a severe negative week
-            if np.random.random() < 0.02:
-                severe_negative = np.random.normal(-std_adjustment * 3.0, std_adjustment * 1.0)
-                adjusted_weekly_return += severe_negative
-            
-            # Cap extreme outcomes to prevent unrealistic scenarios
-            # But allow significantly more negative outcomes than historical minimum
-            # Allow up to -25% per week (more realistic for crypto markets)
-            adjusted_weekly_return = max(-25.0, min(25.0, adjusted_weekly_return))  # Cap at -25% to +25%
-            
-            # Compound only at the end of each week
-            portfolio_value *= (1.0 + (adjusted_weekly_return / 100.0))
-        
-        final_pnl = (portfolio_value - starting_value) / starting_value * 100.0
-        simulation_results.append({
-            'final_value': portfolio_value,
-            'final_pnl': final_pnl,
-            'return_multiplier': portfolio_value / starting_value
-        })
-    
-    # Calculate percentiles
-    final_values = sorted([s['final_value'] for s in simulation_results])
-    final_pnls = sorted([s['final_pnl'] for s in simulation_results])
-    
-    percentiles = {}
-    for conf in confidence_levels:
-        idx = int((1 - conf) * len(final_values))
-        percentiles[conf] = {
-            'value': final_values[idx],
-            'pnl': final_pnls[idx],
-            'return_multiplier': final_values[idx] / starting_value
-        }
-    
-    # Calculate expected (median) values
-    median_idx = len(final_values) // 2
-    expected = {
-        'value': final_values[median_idx],
-        'pnl': final_pnls[median_idx],
-        'return_multiplier': final_values[median_idx] / starting_value
-    }
-    
-    # Calculate probability of different outcomes
-    prob_positive = sum(1 for s in simulation_results if s['final_pnl'] > 0) / num_simulations * 100.0
-    prob_double = sum(1 for s in simulation_results if s['return_multiplier'] >= 2.0) / num_simulations * 100.0
-    prob_10x = sum(1 for s in simulation_results if s['return_multiplier'] >= 10.0) / num_simulations * 100.0
-    prob_loss = sum(1 for s in simulation_results if s['final_pnl'] < 0) / num_simulations * 100.0
-    
-    # Stress test: worst case scenarios
-    worst_5pct_idx = int(0.05 * len(final_values))
-    worst_1pct_idx = int(0.01 * len(final_values))
-    worst_5pct = final_values[worst_5pct_idx]
-    worst_1pct = final_values[worst_1pct_idx]
+    final_values, paths = simulate_bootstrap_paths(
+        historical_weekly_returns,
+        weeks,
+        starting_value,
+        num_simulations=num_simulations,
+        weekly_return_trend=weekly_return_trend,
+        block_size=block_size,
+        seed=seed,
+        chunk_size=chunk_size,
+    )
     
     return {
         'weeks': weeks,
         'num_simulations': num_simulations,
         'method': 'bootstrap_weekly_returns',
+        'block_size': block_size,
         'avg_weekly_return': avg_weekly_return,
         'std_weekly_return': std_weekly_return,
         'weekly_return_trend': weekly_return_trend,
         'avg_trades_per_week': avg_trades_per_week,
         'trade_freq_trend': trade_freq_trend,
         'total_weeks_sampled': len(historical_weekly_returns),
-        'expected': expected,
-        'percentiles': percentiles,
-        'probabilities': {
-            'positive_return': prob_positive,
-            'double_or_more': prob_double,
-            '10x_or_more': prob_10x,
-            'loss': prob_loss
-        },
-        'stress_test': {
-            'worst_5pct': worst_5pct,
-            'worst_1pct': worst_1pct,
-            'worst_5pct_multiplier': worst_5pct / starting_value,
-            'worst_1pct_multiplier': worst_1pct / starting_value,
-            'worst_5pct_pnl': (worst_5pct - starting_value) / starting_value * 100.0,
-            'worst_1pct_pnl': (worst_1pct - starting_value) / starting_value * 100.0
-        },
-        'all_simulations': simulation_results[:100]
+        **summarize_projection(final_values, paths, starting_value, confidence_levels)
     }
 
 
@@ -467,7 +575,9 @@ def monte_carlo_projection(
     end_date: str,
     num_simulations: int = 10000,
     confidence_levels: list = [0.01, 0.05, 0.25, 0.50, 0.75, 0.95, 0.99],
-    use_full_history: bool = True
+    use_full_history: bool = True,
+    seed=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
 ) -> dict:
     """Run Monte Carlo simulation for forward projection."""
     
@@ -512,85 +622,18 @@ def monte_carlo_projection(
     else:
         autocorr = 0.2  # Default moderate autocorrelation
     
-    # Run Monte Carlo simulations
-    simulation_results = []
+    # Run Monte Carlo simulations (vectorized, chunked)
     starting_value = stats['final_portfolio_value']
-    
-    for sim in range(num_simulations):
-        portfolio_value = starting_value
-        previous_return = 0.0  # Track previous week's return for autocorrelation
-        
-        # Generate weekly returns with variability
-        for week in range(weeks):
-            # Time-varying mean: performance may decay over time
-            # Apply trend more strongly as weeks progress
-            time_decay_factor = 1.0 - (week / weeks) * 0.3  # Up to 30% decay over full period
-            adjusted_mean = final_mean * time_decay_factor
-            
-            # Autocorrelation: previous week's return influences current week
-            # If last week was good, this week slightly better; if bad, slightly worse
-            autocorr_adjustment = previous_return * autocorr * 0.5  # 50% of autocorr effect
-            adjusted_mean += autocorr_adjustment
-            
-            # Time-varying volatility: volatility increases over time (uncertainty compounds)
-            volatility_factor = 1.0 + (week / weeks) * 0.3  # Up to 30% more volatility
-            adjusted_std = final_std * volatility_factor
-            
-            # Sample from normal distribution with adjusted mean and std
-            weekly_return = np.random.normal(adjusted_mean, adjusted_std)
-            
-            # Fat tails: 5% chance of extreme event (2x std dev)
-            if np.random.random() < 0.05:
-                extreme_direction = 1 if np.random.random() < 0.5 else -1
-                weekly_return = adjusted_mean + (extreme_direction * adjusted_std * 2.5)
-            
-            # Apply bounds (prevent extreme outliers)
-            weekly_return = max(-20.0, min(30.0, weekly_return))  # Cap at -20% to +30%
-            
-            portfolio_value *= (1.0 + (weekly_return / 100.0))
-            previous_return = weekly_return  # Store for next iteration
-        
-        final_pnl = (portfolio_value - starting_value) / starting_value * 100.0
-        simulation_results.append({
-            'final_value': portfolio_value,
-            'final_pnl': final_pnl,
-            'return_multiplier': portfolio_value / starting_value
-        })
-    
-    # Calculate percentiles
-    final_values = sorted([s['final_value'] for s in simulation_results])
-    final_pnls = sorted([s['final_pnl'] for s in simulation_results])
-    
-    percentiles = {}
-    for conf in confidence_levels:
-        idx = int((1 - conf) * len(final_values))
-        percentiles[conf] = {
-            'value': final_values[idx],
-            'pnl': final_pnls[idx],
-            'return_multiplier': final_values[idx] / starting_value
-        }
-    
-    # Calculate expected (median) values
-    median_idx = len(final_values) // 2
-    expected = {
-        'value': final_values[median_idx],
-        'pnl': final_pnls[median_idx],
-        'return_multiplier': final_values[median_idx] / starting_value
-    }
-    
-    # Calculate probability of different outcomes
-    prob_positive = sum(1 for s in simulation_results if s['final_pnl'] > 0) / num_simulations * 100.0
-    prob_double = sum(1 for s in simulation_results if s['return_multiplier'] >= 2.0) / num_simulations * 100.0
-    prob_10x = sum(1 for s in simulation_results if s['return_multiplier'] >= 10.0) / num_simulations * 100.0
-    prob_loss = sum(1 for s in simulation_results if s['final_pnl'] < 0) / num_simulations * 100.0
-    
-    # Stress test: worst case scenarios
-    # Worst 5% case = 5th percentile (5% of outcomes are worse)
-    # Worst 1% case = 1st percentile (1% of outcomes are worse, so worse than 5%)
-    worst_5pct_idx = int(0.05 * len(final_values))
-    worst_1pct_idx = int(0.01 * len(final_values))
-    worst_5pct = final_values[worst_5pct_idx]
-    worst_1pct = final_values[worst_1pct_idx]
+    final_values, paths = simulate_ar1_paths(
+        weeks,
+        starting_value,
+        final_mean,
+        final_std,
+        autocorr,
+        num_simulations=num_simulations,
+        seed=seed,
+        chunk_size=chunk_size,
+    )
     
     return {
         'weeks': weeks,
@@ -607,23 +650,7 @@ def monte_carlo_projection(
         'recent_std': metrics['recent_std'],
         'overall_mean': metrics['overall_mean'],
         'overall_std': metrics['overall_std'],
-        'expected': expected,
-        'percentiles': percentiles,
-        'probabilities': {
-            'positive_return': prob_positive,
-            'double_or_more': prob_double,
-            '10x_or_more': prob_10x,
-            'loss': prob_loss
-        },
-        'stress_test': {
-            'worst_5pct': worst_5pct,
-            'worst_1pct': worst_1pct,
-            'worst_5pct_multiplier': worst_5pct / starting_value,
-            'worst_1pct_multiplier': worst_1pct / starting_value,
-            'worst_5pct_pnl': (worst_5pct - starting_value) / starting_value * 100.0,
-            'worst_1pct_pnl': (worst_1pct - starting_value) / starting_value * 100.0
-        },
-        'all_simulations': simulation_results[:100]  # Store first 100 for analysis
+        **summarize_projection(final_values, paths, starting_value, confidence_levels)
     }
 
 
@@ -863,6 +890,12 @@ def main():
         writer.writerow(['  Return Multiplier', f"{mc['stress_test']['worst_1pct_multiplier']:.2f}x"])
         writer.writerow(['  PNL (%)', f"{mc['stress_test']['worst_1pct_pnl']:.2f}%"])
         writer.writerow(['Starting Portfolio Value', f"{stats['final_portfolio_value']:.4f}"])
+        writer.writerow(['', ''])
+        writer.writerow(['WEEKLY PERCENTILE BANDS (Portfolio Value)', ''])
+        bands = mc['bands']
+        writer.writerow(['Week'] + [f"{int(q*100)}th" for q in bands])
+        for week in range(projection['projected_weeks'] if bands else 0):
+            writer.writerow([week + 1] + [f"{bands[q][week]:.4f}" for q in bands])
     
     print("\n" + "="*80)
     print("PERFORMANCE SUMMARY")
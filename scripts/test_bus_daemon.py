@@ -0,0 +1,151 @@
+"""
+Tests for bus_daemon.py batching, export debouncing and the ingest failure path.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bus_daemon import ExportDebouncer, ensure_dirs, run_cycle
+
+
+def submit(inbox: Path, job_id: str, created_at: str = "2025-01-01T00:00:00Z", schema_hint: str = "test.schema") -> Path:
+    job_dir = inbox / job_id
+    job_dir.mkdir(parents=True)
+    (job_dir / "data.parquet").write_bytes(b"PAR1")
+    (job_dir / "manifest.json").write_text(json.dumps({
+        "run_id": f"run_{job_id}",
+        "job_id": job_id,
+        "producer": "test",
+        "kind": "test_artifact",
+        "created_at_utc": created_at,
+        "artifacts": [{
+            "artifact_id": "data",
+            "format": "parquet",
+            "relpath": "data.parquet",
+            "schema_hint": schema_hint,
+            "rows": 3,
+        }],
+    }))
+    (job_dir / "COMMIT").write_text("")
+    return job_dir
+
+
+class Clock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+@pytest.fixture
+def bus(tmp_path):
+    bus_dirs = ensure_dirs(tmp_path / "bus")
+    config = {
+        "duckdb_path": str(tmp_path / "bus.duckdb"),
+        "max_jobs_per_cycle": 500,
+        "max_job_attempts": 3,
+        "export": {
+            "enabled": True,
+            "export_dir": str(tmp_path / "exports"),
+            "jobs": [
+                {"name": "runs", "path": "runs.parquet", "depends_on": ["catalog.runs_d"],
+                 "sql": "SELECT run_id FROM catalog.runs_d"},
+                {"name": "other", "path": "other.parquet", "depends_on": ["other.table"],
+                 "sql": "SELECT 1 AS x"},
+            ],
+        },
+    }
+    return config, bus_dirs
+
+
+def query(config, sql):
+    con = duckdb.connect(config["duckdb_path"], read_only=True)
+    try:
+        return con.execute(sql).fetchall()
+    finally:
+        con.close()
+
+
+def test_debouncer_waits_for_quiet_period_and_caps_delay():
+    d = ExportDebouncer(debounce_s=5.0, max_delay_s=20.0)
+    assert not d.due(0.0)
+
+    d.touch({"a"}, 0.0)
+    assert not d.due(4.9)
+    assert d.due(5.0)
+
+    # A steady stream of jobs keeps resetting the quiet period until max_delay_s
+    for t in range(0, 20, 2):
+        d.touch({f"t{t}"}, float(t))
+        assert not d.due(float(t) + 1.0)
+    assert d.due(20.0)
+
+    assert d.take() == {"a"} | {f"t{t}" for t in range(0, 20, 2)}
+    assert not d.due(100.0)
+    assert d.take() == set()
+
+
+def test_cycle_batches_jobs_and_debounces_exports(bus):
+    config, bus_dirs = bus
+    config["max_jobs_per_cycle"] = 3
+    for i in range(5):
+        submit(bus_dirs["inbox"], f"job_{i}")
+    clock = Clock()
+    debouncer = ExportDebouncer(debounce_s=5.0, max_delay_s=60.0)
+
+    first = run_cycle(config, bus_dirs, debouncer, now=clock)
+    assert first["jobs_ingested"] == 3
+    assert first["exports_run"] == 0
+    second = run_cycle(config, bus_dirs, debouncer, now=clock)
+    assert second["jobs_ingested"] == 2
+
+    assert sorted(p.name for p in bus_dirs["processed"].iterdir()) == [f"job_{i}" for i in range(5)]
+    assert query(config, "SELECT COUNT(*) FROM catalog.runs_d")[0][0] == 5
+    assert query(config, "SELECT COUNT(*) FROM catalog.artifacts_f")[0][0] == 5
+
+    # Nothing new and the window is still open: no work, no lock, no cycle row
+    assert run_cycle(config, bus_dirs, debouncer, now=clock) is None
+
+    clock.t += 5.0
+    third = run_cycle(config, bus_dirs, debouncer, now=clock)
+    assert third["jobs_ingested"] == 0
+    assert third["exports_run"] == 1  # "other" does not depend on anything touched
+    assert (Path(config["export"]["export_dir"]) / "runs.parquet").exists()
+    assert not (Path(config["export"]["export_dir"]) / "other.parquet").exists()
+    assert query(config, "SELECT COUNT(*) FROM catalog.bus_cycles_f")[0][0] == 3
+
+
+def test_failing_job_is_quarantined_without_cycle_rows(bus):
+    config, bus_dirs = bus
+    bad = submit(bus_dirs["inbox"], "job_bad", created_at="not-a-timestamp")
+    submit(bus_dirs["inbox"], "job_good")
+    debouncer = ExportDebouncer(debounce_s=1e9, max_delay_s=1e9)
+
+    first = run_cycle(config, bus_dirs, debouncer)
+    assert first["jobs_ingested"] == 1
+    assert first["jobs_failed"] == 1
+    assert bad.exists()
+    assert json.loads((bad / "INGEST_FAILURES.json").read_text())["attempts"] == 1
+
+    second = run_cycle(config, bus_dirs, debouncer)
+    assert second["jobs_failed"] == 1 and second["jobs_rejected"] == 0
+    # Only the cycle that ingested job_good was recorded
+    assert query(config, "SELECT COUNT(*) FROM catalog.bus_cycles_f")[0][0] == 1
+
+    third = run_cycle(config, bus_dirs, debouncer)
+    assert third["jobs_rejected"] == 1
+    assert not bad.exists()
+    reason = json.loads((bus_dirs["rejected"] / "job_bad" / "REJECT_REASON.json").read_text())
+    assert reason["error"].startswith("ingest failed 3 times")
+    assert query(config, "SELECT COUNT(*) FROM catalog.bus_cycles_f")[0][0] == 2
+
+    # Inbox is empty now: the daemon goes idle
+    assert run_cycle(config, bus_dirs, debouncer) is None
@@ -0,0 +1,107 @@
+"""
+Tests that the vectorized projections in generate-performance-summary.py
+match the distribution of the original per-simulation loops.
+"""
+
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+_spec = importlib.util.spec_from_file_location(
+    "generate_performance_summary", Path(__file__).parent / "generate-performance-summary.py"
+)
+gps = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(gps)
+
+HISTORY = [4.0, -1.5, 2.5, 6.0, 0.5, 3.0, -3.0, 5.5, 1.0, 2.0, 7.5, -0.5]
+WEEKS = 20
+START = 1.5
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+def loop_bootstrap(history, weeks, starting_value, num_simulations, weekly_return_trend, seed):
+    """The pre-vectorization bootstrap loop, kept verbatim in its arithmetic."""
+    random.seed(seed)
+    np.random.seed(seed)
+    avg_weekly_return = float(np.mean(history))
+    std_weekly_return = float(np.std(history, ddof=1))
+    finals = []
+    for _ in range(num_simulations):
+        value = starting_value
+        for week in range(weeks):
+            r = random.choice(history)
+            r += weekly_return_trend * (week / weeks) * 0.7
+            r *= 1.0 - (week / weeks) * 0.7
+            std_adjustment = std_weekly_return * (1.0 + (week / weeks) * 0.5)
+            if np.random.random() < 0.35:
+                worse = np.random.normal(avg_weekly_return * 0.05, std_adjustment * 2.0)
+                r = 0.5 * r + 0.5 * worse
+            r += np.random.normal(0, std_adjustment * 0.5)
+            if np.random.random() < 0.08:
+                r += np.random.normal(-std_adjustment * 2.0, std_adjustment * 0.8)
+            if np.random.random() < 0.02:
+                r += np.random.normal(-std_adjustment * 3.0, std_adjustment * 1.0)
+            r = max(-25.0, min(25.0, r))
+            value *= 1.0 + r / 100.0
+        finals.append(value)
+    return np.array(finals)
+
+
+def loop_ar1(weeks, starting_value, final_mean, final_std, autocorr, num_simulations, seed):
+    """The pre-vectorization AR(1) Monte Carlo loop."""
+    np.random.seed(seed)
+    finals = []
+    for _ in range(num_simulations):
+        value = starting_value
+        previous_return = 0.0
+        for week in range(weeks):
+            mean = final_mean * (1.0 - (week / weeks) * 0.3) + previous_return * autocorr * 0.5
+            std = final_std * (1.0 + (week / weeks) * 0.3)
+            r = np.random.normal(mean, std)
+            if np.random.random() < 0.05:
+                r = mean + (1 if np.random.random() < 0.5 else -1) * std * 2.5
+            r = max(-20.0, min(30.0, r))
+            value *= 1.0 + r / 100.0
+            previous_return = r
+        finals.append(value)
+    return np.array(finals)
+
+
+def assert_quantiles_close(vectorized, reference, rel=0.03):
+    got = np.quantile(vectorized, QUANTILES)
+    want = np.quantile(reference, QUANTILES)
+    np.testing.assert_allclose(got, want, rtol=rel)
+
+
+def test_bootstrap_matches_loop_distribution():
+    finals, paths = gps.simulate_bootstrap_paths(
+        HISTORY, WEEKS, START, num_simulations=20_000, weekly_return_trend=0.1, seed=7, chunk_size=3_000,
+    )
+    reference = loop_bootstrap(HISTORY, WEEKS, START, 4_000, 0.1, seed=7)
+    assert_quantiles_close(finals, reference)
+    assert paths.shape == (20_000, WEEKS)
+    np.testing.assert_array_equal(paths[:, -1], finals)
+
+
+def test_ar1_matches_loop_distribution():
+    finals, _ = gps.simulate_ar1_paths(WEEKS, START, 2.0, 4.0, 0.3, num_simulations=20_000, seed=7, chunk_size=3_000)
+    reference = loop_ar1(WEEKS, START, 2.0, 4.0, 0.3, 4_000, seed=7)
+    assert_quantiles_close(finals, reference)
+
+
+def test_seeded_runs_are_reproducible():
+    a, _ = gps.simulate_ar1_paths(WEEKS, START, 2.0, 4.0, 0.3, num_simulations=1_000, seed=11, chunk_size=1_000)
+    b, _ = gps.simulate_ar1_paths(WEEKS, START, 2.0, 4.0, 0.3, num_simulations=1_000, seed=11, chunk_size=1_000)
+    np.testing.assert_array_equal(a, b)
+
+
+def test_summary_bands_follow_stored_paths():
+    finals, paths = gps.simulate_bootstrap_paths(HISTORY, WEEKS, START, num_simulations=500, seed=3, band_paths=200)
+    summary = gps.summarize_projection(finals, paths, START, [0.05, 0.5, 0.95])
+    assert list(summary['bands']) == gps.BAND_QUANTILES
+    assert all(len(band) == WEEKS for band in summary['bands'].values())
+    np.testing.assert_allclose(summary['bands'][0.5], np.median(paths, axis=0))
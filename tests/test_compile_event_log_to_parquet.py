@@ -0,0 +1,100 @@
+"""
+Tests for compile_event_log_to_parquet.py input-hash skipping and partitioned compile.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import compile_event_log_to_parquet as compiler
+
+
+def write_events(events_dir: Path, chat_id: int, day: str, n: int, text: str = "hello") -> Path:
+    path = events_dir / "raw" / "telegram" / "events" / f"chat_id={chat_id}" / f"events_{day}.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({
+                "event_id": f"{chat_id}:{day}:{i:05d}",
+                "event_type": "message",
+                "chat_id": chat_id,
+                "message_id": i,
+                "from_id": "user1",
+                "timestamp": f"{day}T12:{i % 60:02d}:00Z",
+                "raw_text": f"{text} {i} So11111111111111111111111111111111111111112",
+            }) + "\n")
+    return path
+
+
+def run(tmp_path: Path, monkeypatch, *extra: str) -> list:
+    manifest = tmp_path / "manifest.jsonl"
+    before = manifest.read_text().count("\n") if manifest.exists() else 0
+    monkeypatch.setattr(sys, "argv", [
+        "compile_event_log_to_parquet.py",
+        "--events-dir", str(tmp_path / "events"),
+        "--out-dir", str(tmp_path / "out"),
+        "--manifest-path", str(manifest),
+        "--workers", "2",
+        *extra,
+    ])
+    assert compiler.main() == 0
+    rows = [json.loads(line) for line in manifest.read_text().splitlines()]
+    return rows[before:]
+
+
+def outputs(tmp_path: Path) -> dict:
+    return {
+        p.relative_to(tmp_path).as_posix(): p.read_bytes()
+        for p in sorted((tmp_path / "out").rglob("*.parquet"))
+    }
+
+
+@pytest.fixture
+def events(tmp_path):
+    events_dir = tmp_path / "events"
+    paths = {}
+    for chat_id in (-100, 200):
+        for day in ("2025-01-01", "2025-01-02"):
+            paths[(chat_id, day)] = write_events(events_dir, chat_id, day, 50)
+    return paths
+
+
+def test_second_run_is_skipped_and_byte_identical(tmp_path, monkeypatch, events):
+    first = run(tmp_path, monkeypatch)
+    assert len(first) == 4
+    assert {r["status"] for r in first} == {"created"}
+    assert all(r["row_count"] == 50 for r in first)
+    before = outputs(tmp_path)
+
+    second = run(tmp_path, monkeypatch)
+    assert len(second) == 4
+    assert {r["status"] for r in second} == {"skipped_same_input"}
+    assert [r["input_hash"] for r in second] == [r["input_hash"] for r in first]
+    assert outputs(tmp_path) == before
+
+    # --force recompiles; the output is still byte-identical
+    forced = run(tmp_path, monkeypatch, "--force")
+    assert {r["status"] for r in forced} == {"deduped_same_hash"}
+    assert outputs(tmp_path) == before
+
+
+def test_changed_input_recompiles_only_its_partition(tmp_path, monkeypatch, events):
+    first = {r["path"]: r for r in run(tmp_path, monkeypatch)}
+    write_events(tmp_path / "events", 200, "2025-01-02", 60, text="edited")
+
+    second = {r["path"]: r for r in run(tmp_path, monkeypatch)}
+
+    changed = str(compiler._partition_out_path(tmp_path / "out", 200, "2025-01-02"))
+    assert second[changed]["status"] == "replaced_new_hash"
+    assert second[changed]["row_count"] == 60
+    assert second[changed]["input_hash"] != first[changed]["input_hash"]
+    assert second[changed]["file_hash"] != first[changed]["file_hash"]
+    others = [r for path, r in second.items() if path != changed]
+    assert len(others) == 3
+    assert {r["status"] for r in others} == {"skipped_same_input"}
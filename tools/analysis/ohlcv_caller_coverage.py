@@ -27,7 +27,9 @@ Usage:
     python3 ohlcv_caller_coverage.py --caller Brook --interval 5m
     
 Performance:
-    The script uses parallel processing for ClickHouse queries. Configure workers via:
+    If the DuckDB file has a coverage index (tools/storage/build_coverage_index.py),
+    coverage is read from it and ClickHouse is not contacted at all.
+    Otherwise the script uses parallel processing for ClickHouse queries. Configure workers via:
     OHLCV_COVERAGE_WORKERS=16 python3 ohlcv_caller_coverage.py ...
     Default is 8 workers. Increase for faster processing, decrease if ClickHouse is overloaded.
     
@@ -56,6 +58,8 @@ if str(workspace_root) not in sys.path:
     sys.path.insert(0, str(workspace_root))
 from threading import Lock
 
+from tools.shared.coverage_index import CoverageIndex, open_coverage_index
+
 # Suppress deprecation warnings for cleaner JSON output
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 
@@ -646,7 +650,8 @@ def check_ohlcv_coverage(
     calls: List[Dict], 
     interval: str = '5m', 
     verbose: bool = False,
-    coverage_cache: Optional[Dict[str, bool]] = None
+    coverage_cache: Optional[Dict[str, bool]] = None,
+    coverage_index: Optional[CoverageIndex] = None
 ) -> Dict[str, Any]:
     """
     Check OHLCV coverage for a list of calls
@@ -655,6 +660,7 @@ def check_ohlcv_coverage(
     Coverage check now returns true if ANY interval exists for the token.
     
     Uses a coverage_cache to avoid re-querying ClickHouse for the same mints.
+    With a coverage_index, mints are looked up in the index instead.
     
     Returns:
         {
@@ -680,6 +686,16 @@ def check_ohlcv_coverage(
     # Get unique mints from calls
     mints = list(set(call['mint'] for call in calls))
     
+    if coverage_index is not None:
+        mints_with_coverage = {m for m in mints if coverage_index.has_mint(m)}
+        calls_with_coverage = sum(1 for call in calls if call['mint'] in mints_with_coverage)
+        return {
+            'total_calls': len(calls),
+            'calls_with_coverage': calls_with_coverage,
+            'coverage_ratio': calls_with_coverage / len(calls),
+            'missing_mints': [m for m in mints if m not in mints_with_coverage]
+        }
+    
     if verbose:
         print(f"Checking coverage for {len(mints)} unique mints...", file=sys.stderr, flush=True)
     
@@ -772,13 +788,15 @@ def build_coverage_matrix(
     caller_filter: Optional[str] = None,
     start_month: Optional[str] = None,
     end_month: Optional[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    coverage_index: Optional[CoverageIndex] = None
 ) -> Dict[str, Any]:
     """
     Build caller × month coverage matrix
     
     Uses a shared coverage cache to avoid re-querying ClickHouse for the same mints.
     This dramatically improves performance when the same mints appear across multiple caller-month combinations.
+    With a coverage_index, cells are filled from the index without ClickHouse.
     
     Returns:
         {
@@ -833,6 +851,18 @@ def build_coverage_matrix(
     total_cells = len(tasks)
     matrix = {}
     
+    if coverage_index is not None:
+        for caller, month, calls in tasks:
+            matrix.setdefault(caller, {})[month] = check_ohlcv_coverage(
+                None, database, calls, interval, coverage_index=coverage_index
+            )
+        return {
+            'callers': sorted(list(caller_calls.keys())),
+            'months': months,
+            'matrix': matrix,
+            'interval': interval
+        }
+    
     # Use parallel processing for I/O-bound ClickHouse queries
     # Allow configurable worker count via environment variable, default to 8
     default_workers = int(os.environ.get('OHLCV_COVERAGE_WORKERS', '8'))
@@ -1104,6 +1134,8 @@ def main():
                        help='Show verbose progress output to stderr')
     parser.add_argument('--no-kill-hanging', action='store_true',
                        help='Do not kill hanging instances of this script before running')
+    parser.add_argument('--no-coverage-index', action='store_true',
+                       help='Query ClickHouse even if a coverage index is available')
     
     args = parser.parse_args()
     
@@ -1120,11 +1152,17 @@ def main():
         # Connect to databases
         duckdb_conn = get_duckdb_connection(args.duckdb)
         
-        # Check if ClickHouse is accessible before attempting connection
-        if args.verbose:
-            print("Connecting to ClickHouse...", file=sys.stderr, flush=True)
-        
-        ch_client, database = get_clickhouse_client()  # Connection test with timeout is done inside
+        coverage_index = None if args.no_coverage_index else open_coverage_index(args.duckdb)
+        if coverage_index is not None:
+            if args.verbose:
+                print(f"Using coverage index ({len(coverage_index):,} token ranges)", file=sys.stderr, flush=True)
+            database = None
+        else:
+            # Check if ClickHouse is accessible before attempting connection
+            if args.verbose:
+                print("Connecting to ClickHouse...", file=sys.stderr, flush=True)
+            
+            ch_client, database = get_clickhouse_client()  # Connection test with timeout is done inside
         
         # Build coverage matrix
         coverage_data = build_coverage_matrix(
@@ -1135,7 +1173,8 @@ def main():
             caller_filter=args.caller,
             start_month=args.start_month,
             end_month=args.end_month,
-            verbose=args.verbose
+            verbose=args.verbose,
+            coverage_index=coverage_index
         )
         
         # Generate fetch plan if requested
@@ -15,6 +15,9 @@ Usage:
     python3 ohlcv_detailed_coverage.py --duckdb data/tele.duckdb --output coverage_report.json
     python3 ohlcv_detailed_coverage.py --duckdb data/tele.duckdb --format csv --output coverage_report.csv
     python3 ohlcv_detailed_coverage.py --duckdb data/tele.duckdb --caller Brook --start-month 2025-12
+
+Intervals present in the DuckDB coverage index (tools/storage/build_coverage_index.py)
+are counted from the index; ClickHouse is only queried for the rest.
 """
 
 import argparse
@@ -25,8 +28,15 @@ import warnings
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
+from pathlib import Path
 import csv
 
+# Add workspace root to path for tools.shared imports
+workspace_root = Path(__file__).resolve().parents[2]
+if str(workspace_root) not in sys.path:
+    sys.path.insert(0, str(workspace_root))
+from tools.shared.coverage_index import CoverageIndex, load_coverage_index
+
 # Suppress deprecation warnings
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 
@@ -227,11 +237,14 @@ def calculate_coverage_for_interval(
     interval: str,
     periods_before: int,
     periods_after: int,
-    verbose: bool = False
+    verbose: bool = False,
+    coverage_index: Optional[CoverageIndex] = None
 ) -> Dict[str, Any]:
     """
     Calculate coverage percentage for a specific interval.
     
+    Counts come from coverage_index when it has this interval indexed.
+    
     Args:
         ch_client: ClickHouse client
         database: Database name
@@ -259,6 +272,16 @@ def calculate_coverage_for_interval(
     
     expected_candles = periods_before + periods_after
     
+    if coverage_index is not None and coverage_index.is_indexed(interval):
+        actual_candles = coverage_index.candle_count(chain, mint, interval, int(start_ts), int(end_ts))
+        coverage_percent = (actual_candles / expected_candles * 100.0) if expected_candles > 0 else 0.0
+        return {
+            'coverage_percent': round(coverage_percent, 2),
+            'expected_candles': expected_candles,
+            'actual_candles': actual_candles,
+            'has_sufficient_coverage': actual_candles >= expected_candles
+        }
+    
     # Query ClickHouse for candles in range
     escaped_mint = mint.replace("'", "''")
     escaped_chain = chain.replace("'", "''")
@@ -315,7 +338,8 @@ def batch_calculate_coverage_by_month(
     database: str,
     calls_by_month: Dict[str, List[Dict]],
     token_created_map: Dict[str, int],
-    verbose: bool = False
+    verbose: bool = False,
+    coverage_index: Optional[CoverageIndex] = None
 ) -> List[Dict[str, Any]]:
     """
     Calculate coverage using batch queries grouped by month.
@@ -329,6 +353,7 @@ def batch_calculate_coverage_by_month(
         calls_by_month: Dict mapping year_month (YYYY-MM) to list of calls
         token_created_map: Dict mapping mint -> token_created_ts_ms
         verbose: Show verbose output
+        coverage_index: Optional coverage index (replaces ClickHouse for indexed intervals)
     
     Returns:
         List of coverage results (one per call)
@@ -386,7 +411,8 @@ def batch_calculate_coverage_by_month(
             for interval, periods_before, periods_after in intervals_to_check:
                 interval_coverage = calculate_coverage_for_interval(
                     ch_client, database, mint, chain, alert_ts_ms,
-                    interval, periods_before, periods_after, verbose
+                    interval, periods_before, periods_after, verbose,
+                    coverage_index=coverage_index
                 )
                 coverage['intervals'][interval] = interval_coverage
             
@@ -400,7 +426,8 @@ def calculate_coverage_for_call(
     database: str,
     call: Dict,
     token_created_ts_ms: Optional[int] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    coverage_index: Optional[CoverageIndex] = None
 ) -> Dict[str, Any]:
     """
     Calculate coverage for a single call.
@@ -442,7 +469,8 @@ def calculate_coverage_for_call(
     for interval, periods_before, periods_after in intervals_to_check:
         interval_coverage = calculate_coverage_for_interval(
             ch_client, database, mint, chain, alert_ts_ms,
-            interval, periods_before, periods_after, verbose
+            interval, periods_before, periods_after, verbose,
+            coverage_index=coverage_index
         )
         coverage['intervals'][interval] = interval_coverage
     
@@ -472,14 +500,15 @@ def get_token_created_timestamps(duckdb_conn) -> Dict[str, int]:
 
 def generate_coverage_report(
     duckdb_path: str,
-    ch_client: ClickHouseClient,
-    database: str,
+    ch_client: Optional[ClickHouseClient],
+    database: Optional[str],
     start_month: Optional[str] = None,
     end_month: Optional[str] = None,
     caller_filter: Optional[str] = None,
     verbose: bool = False,
     limit: Optional[int] = None,
-    summary_only: bool = False
+    summary_only: bool = False,
+    use_coverage_index: bool = True
 ) -> Dict[str, Any]:
     """
     Generate comprehensive coverage report.
@@ -612,9 +641,18 @@ def generate_coverage_report(
         
         print(f"Grouped into {len(calls_by_month)} months for batch processing", file=sys.stderr, flush=True)
         
+        coverage_index = None
+        if use_coverage_index:
+            coverage_index = load_coverage_index(duckdb_conn, mints={call['mint'] for call in calls})
+            if coverage_index.indexed_intervals:
+                print(f"Using coverage index for {len(coverage_index.indexed_intervals)} interval(s)", file=sys.stderr, flush=True)
+            else:
+                coverage_index = None
+        
         # Calculate coverage using batch queries by month
         coverage_results = batch_calculate_coverage_by_month(
-            ch_client, database, calls_by_month, token_created_map, verbose
+            ch_client, database, calls_by_month, token_created_map, verbose,
+            coverage_index=coverage_index
         )
         
         print(f"Completed: {len(coverage_results)}/{len(calls)} calls processed", file=sys.stderr, flush=True)
@@ -741,6 +779,33 @@ def export_to_csv(coverage_results: List[Dict], output_path: str):
             writer.writerow(row)
 
 
+# Every interval this report may check (15s/1s only for young tokens)
+INDEXED_INTERVALS_REQUIRED = ['1m', '5m', '15s', '1s']
+
+
+def connect_and_check_clickhouse() -> Tuple[ClickHouseClient, str]:
+    """Connect to ClickHouse and verify the candle table schema."""
+    print("Connecting to ClickHouse...", file=sys.stderr, flush=True)
+    
+    ch_client, database = get_clickhouse_client()
+    
+    print("Connected to ClickHouse successfully", file=sys.stderr, flush=True)
+    
+    # Test query to verify schema works
+    print("Testing ClickHouse query with interval_seconds...", file=sys.stderr, flush=True)
+    try:
+        test_query = f"SELECT COUNT(*) FROM {database}.ohlcv_candles WHERE interval_seconds = 60 LIMIT 1"
+        result = ch_client.execute(test_query)
+        print(f"✓ Schema test passed. Found {result[0][0] if result else 0} candles with interval_seconds=60", file=sys.stderr, flush=True)
+    except Exception as e:
+        print(f"ERROR: Schema test failed: {e}", file=sys.stderr, flush=True)
+        print(f"  Make sure the table {database}.ohlcv_candles has interval_seconds column (UInt32)", file=sys.stderr, flush=True)
+        ch_client.disconnect()
+        raise
+    
+    return ch_client, database
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate detailed OHLCV coverage report')
     parser.add_argument('--duckdb', default='data/tele.duckdb',
@@ -758,28 +823,24 @@ def main():
                        help='Limit number of calls to process (for testing/debugging)')
     parser.add_argument('--summary-only', action='store_true',
                        help='Return summary and metadata only (omit per-call details)')
+    parser.add_argument('--no-coverage-index', action='store_true',
+                       help='Query ClickHouse even if a coverage index is available')
     
     args = parser.parse_args()
     
     ch_client = None
+    database = None
     
     try:
-        print("Connecting to ClickHouse...", file=sys.stderr, flush=True)
-        
-        ch_client, database = get_clickhouse_client()
+        indexed_intervals = set()
+        if not args.no_coverage_index and os.path.exists(args.duckdb):
+            with duckdb.connect(args.duckdb, read_only=True) as con:
+                indexed_intervals = load_coverage_index(con, mints=[]).indexed_intervals
         
-        print("Connected to ClickHouse successfully", file=sys.stderr, flush=True)
-        
-        # Test query to verify schema works
-        print("Testing ClickHouse query with interval_seconds...", file=sys.stderr, flush=True)
-        try:
-            test_query = f"SELECT COUNT(*) FROM {database}.ohlcv_candles WHERE interval_seconds = 60 LIMIT 1"
-            result = ch_client.execute(test_query)
-            print(f"✓ Schema test passed. Found {result[0][0] if result else 0} candles with interval_seconds=60", file=sys.stderr, flush=True)
-        except Exception as e:
-            print(f"ERROR: Schema test failed: {e}", file=sys.stderr, flush=True)
-            print(f"  Make sure the table {database}.ohlcv_candles has interval_seconds column (UInt32)", file=sys.stderr, flush=True)
-            raise
+        if {calculate_interval_seconds(i) for i in INDEXED_INTERVALS_REQUIRED} <= indexed_intervals:
+            print("All intervals are in the coverage index; skipping ClickHouse", file=sys.stderr, flush=True)
+        else:
+            ch_client, database = connect_and_check_clickhouse()
         
         print("Generating coverage report...", file=sys.stderr, flush=True)
         
@@ -792,7 +853,8 @@ def main():
             args.caller,
             args.verbose,
             args.limit,
-            args.summary_only
+            args.summary_only,
+            use_coverage_index=not args.no_coverage_index
         )
         
         print("Coverage calculation complete!", file=sys.stderr, flush=True)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Caller Scoring Benchmark
+
+Compares leaderboard scoring on synthetic per-alert outcomes:
+- python: aggregate_by_caller + score_callers_v2 (one dict per caller)
+- vectorized: lib.scoring_engine.score_alerts over an Arrow table
+
+Usage:
+    python3 benchmark_caller_scoring.py --callers 5000 --alerts-per-caller 40
+"""
+
+import sys
+import argparse
+import random
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pyarrow as pa
+
+from lib.scoring import score_callers_v2
+from lib.scoring_engine import caller_stats_from_records, score_alerts, score_caller_arrays
+from lib.summary import aggregate_by_caller
+
+
+def make_rows(n_callers: int, alerts_per_caller: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    rows = []
+    for c in range(n_callers):
+        quality = rng.uniform(0.5, 3.0)
+        for _ in range(alerts_per_caller):
+            ath = rng.lognormvariate(0, 0.6) * quality
+            hit2x = ath >= 2.0
+            rows.append({
+                "status": "ok",
+                "caller": f"caller_{c:05d}",
+                "ath_mult": ath,
+                "time_to_2x_s": rng.uniform(30, 20_000) if hit2x else None,
+                "dd_pre2x": -rng.uniform(0.0, 0.7) if hit2x else None,
+                "dd_overall": -rng.uniform(0.0, 0.95),
+            })
+    return rows
+
+
+def best_of(fn, iterations: int) -> float:
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark caller scoring paths")
+    parser.add_argument("--callers", type=int, default=5000)
+    parser.add_argument("--alerts-per-caller", type=int, default=40)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.callers, args.alerts_per_caller)
+    table = pa.Table.from_pylist(rows)
+    callers = aggregate_by_caller(rows, min_trades=1)
+    stats = caller_stats_from_records(callers)
+
+    print(f"{len(rows):,} alerts, {args.callers:,} callers (best of {args.iterations})")
+    print("-" * 60)
+
+    results = [
+        ("python end-to-end", best_of(lambda: score_callers_v2(aggregate_by_caller(rows, min_trades=1)), args.iterations)),
+        ("vectorized end-to-end", best_of(lambda: score_alerts(table), args.iterations)),
+        ("python scoring only", best_of(lambda: score_callers_v2(callers), args.iterations)),
+        ("vectorized scoring only", best_of(lambda: score_caller_arrays(stats), args.iterations)),
+    ]
+    for name, seconds in results:
+        print(f"{name:<26} {seconds * 1000:>10.1f} ms")
+
+    print("-" * 60)
+    print(f"End-to-end speedup: {results[0][1] / results[1][1]:.1f}x")
+    print(f"Scoring speedup:    {results[2][1] / results[3][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,6 @@ Usage:
 """
 
 import streamlit as st
-import pyarrow.parquet as pq
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -15,6 +14,25 @@ from pathlib import Path
 import sys
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.trades_dataset import (
+    PLOT_SAMPLE_ROWS,
+    TradeFilters,
+    TradesDataset,
+    dataset_signature,
+)
+
+# Columns needed for the charts (everything else stays on disk)
+PLOT_COLUMNS = [
+    'caller', 'mint', 'exit_reason', 'peak_mult', 'exit_mult',
+    'giveback_from_peak_pct', 'hit_2x', 'hit_3x',
+]
+TOP_TRADE_COLUMNS = [
+    'caller', 'mint', 'entry_mult', 'peak_mult', 'exit_mult',
+    'giveback_from_peak_pct', 'hit_2x', 'hit_3x', 'hit_4x', 'hit_5x', 'hit_10x', 'exit_reason',
+]
+
 # Page config
 st.set_page_config(
     page_title="QuantBot EV Dashboard",
@@ -80,77 +98,46 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-@st.cache_data
-def load_data(parquet_pattern: str) -> pd.DataFrame:
-    """Load parquet data with caching."""
+@st.cache_resource(max_entries=16)
+def get_dataset(parquet_pattern: str, signature: tuple) -> TradesDataset:
+    """Open a lazy dataset over the matched files (re-opened when any file changes)."""
+    return TradesDataset(parquet_pattern, files=[path for path, _, _ in signature])
+
+
+def load_dataset(parquet_pattern: str) -> Optional[TradesDataset]:
+    """Resolve a pattern to a cached TradesDataset; nothing is read until queried."""
     try:
-        from glob import glob
-        
-        # Handle wildcard patterns
-        if '*' in parquet_pattern:
-            files = glob(parquet_pattern)
-            if not files:
-                st.error(f"No files found matching pattern: {parquet_pattern}")
-                return pd.DataFrame()
-            
-            # Load all matching files
-            dfs = []
-            for file in files:
-                df = pq.read_table(file).to_pandas()
-                dfs.append(df)
-            
-            df = pd.concat(dfs, ignore_index=True)
-            st.sidebar.success(f"✅ Loaded {len(files)} file(s)")
-        else:
-            df = pq.read_table(parquet_pattern).to_pandas()
-        
-        return df
+        signature = dataset_signature(parquet_pattern)
+        if not signature:
+            st.error(f"No files found matching pattern: {parquet_pattern}")
+            return None
+        
+        dataset = get_dataset(parquet_pattern, signature)
+        if len(signature) > 1:
+            st.sidebar.success(f"✅ Found {len(signature)} file(s)")
+        return dataset
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return pd.DataFrame()
+        return None
 
 
-def calculate_cohort_stats(df: pd.DataFrame) -> dict:
-    """Calculate cohort statistics."""
-    total = len(df)
-    
-    winners = df[df['hit_3x'] == True]
-    losers = df[(df['hit_2x'] == True) & (df['hit_3x'] == False)]
-    never_2x = df[df['hit_2x'] == False]
-    
-    # Cohort probabilities
-    p_reach_2x = (df['hit_2x'].sum() / total * 100) if total > 0 else 0
-    p_reach_3x = (df['hit_3x'].sum() / total * 100) if total > 0 else 0
-    p_3x_given_2x = (len(winners) / df['hit_2x'].sum() * 100) if df['hit_2x'].sum() > 0 else 0
-    p_2x_no3x = (len(losers) / total * 100) if total > 0 else 0
-    
-    # EV calculations
-    all_exit_mults = df['exit_mult']
-    ev_from_entry = ((all_exit_mults.mean() - 1.0) * 100) if len(all_exit_mults) > 0 else 0
-    
-    trades_hit_2x = df[df['hit_2x'] == True]
-    if len(trades_hit_2x) > 0:
-        ev_given_2x = ((trades_hit_2x['exit_mult'].mean() - 1.0) * 100)
-    else:
-        ev_given_2x = 0
-    
+def split_cohorts(df: pd.DataFrame) -> dict:
+    """Split (sampled) trades into winner / loser / never-2x frames for plotting."""
     return {
-        'total': total,
-        'winners': len(winners),
-        'losers': len(losers),
-        'never_2x': len(never_2x),
-        'p_reach_2x': p_reach_2x,
-        'p_reach_3x': p_reach_3x,
-        'p_3x_given_2x': p_3x_given_2x,
-        'p_2x_no3x': p_2x_no3x,
-        'ev_from_entry': ev_from_entry,
-        'ev_given_2x': ev_given_2x,
-        'winners_df': winners,
-        'losers_df': losers,
-        'never_2x_df': never_2x,
+        'winners_df': df[df['hit_3x'] == True],
+        'losers_df': df[(df['hit_2x'] == True) & (df['hit_3x'] == False)],
+        'never_2x_df': df[df['hit_2x'] == False],
     }
 
 
+def fmt_mult(value) -> str:
+    return f"{value:.2f}x" if value is not None else "N/A"
+
+
+def fmt_pct(value) -> str:
+    return f"{value:.1f}%" if value is not None else "N/A"
+
+
 def main():
     st.title("📊 QuantBot EV Dashboard")
     
@@ -253,32 +240,24 @@ def single_strategy_dashboard():
         return
     
     with st.spinner("Loading data..."):
-        df = load_data(parquet_pattern)
+        dataset = load_dataset(parquet_pattern)
     
-    if df.empty:
+    if dataset is None or dataset.empty:
         st.error("No data loaded. Check your file pattern.")
         return
     
-    st.sidebar.success(f"✅ Loaded {len(df):,} trades")
+    st.sidebar.success(f"✅ {dataset.row_count():,} trades available")
     
     # Sidebar - Filters
     st.sidebar.header("🎛️ Filters")
     
     # Strategy filters - Mode first
-    stop_modes = sorted(df['stop_mode'].unique())
+    stop_modes = dataset.distinct('stop_mode')
     selected_mode = st.sidebar.selectbox("Stop Mode", stop_modes)
     
-    # Filter available stops based on selected mode
-    mode_df = df[df['stop_mode'] == selected_mode]
-    
-    # Get available phase1/phase2 combinations for this mode
-    available_combos = mode_df[['phase1_stop_pct', 'phase2_stop_pct']].drop_duplicates().sort_values(['phase1_stop_pct', 'phase2_stop_pct'])
-    
     # Create a list of tuples for the combo selector
     combo_options = []
-    for _, row in available_combos.iterrows():
-        p1 = row['phase1_stop_pct']
-        p2 = row['phase2_stop_pct']
+    for p1, p2 in dataset.stop_configs(selected_mode):
         label = f"P1: {p1*100:.0f}% / P2: {p2*100:.0f}%"
         combo_options.append((label, p1, p2))
     
@@ -297,33 +276,53 @@ def single_strategy_dashboard():
     st.sidebar.caption(f"Phase 1: {selected_p1*100:.0f}% | Phase 2: {selected_p2*100:.0f}%")
     
     # Show ladder steps if applicable
-    if selected_mode == 'ladder' and 'ladder_steps' in df.columns:
-        ladder_steps = mode_df['ladder_steps'].iloc[0] if len(mode_df) > 0 else 0.5
-        st.sidebar.info(f"🪜 Ladder steps: {ladder_steps}x")
+    if selected_mode == 'ladder' and 'ladder_steps' in dataset.columns:
+        ladder_steps = dataset.first_value('ladder_steps', TradeFilters(stop_mode=selected_mode))
+        st.sidebar.info(f"🪜 Ladder steps: {ladder_steps if ladder_steps is not None else 0.5}x")
     
     # Caller filter
-    callers = ['All'] + sorted(df['caller'].unique().tolist())
+    callers = ['All'] + dataset.distinct('caller')
     selected_caller = st.sidebar.selectbox("Caller", callers)
     
-    # Apply filters
-    filtered_df = df[
-        (df['stop_mode'] == selected_mode) &
-        (df['phase1_stop_pct'] == selected_p1) &
-        (df['phase2_stop_pct'] == selected_p2)
-    ].copy()
+    # Date range filter (on entry time)
+    date_from = date_to = None
+    bounds = dataset.date_bounds()
+    if bounds is not None:
+        date_range = st.sidebar.date_input(
+            "Entry date range",
+            value=bounds,
+            min_value=bounds[0],
+            max_value=bounds[1],
+        )
+        if isinstance(date_range, (tuple, list)) and len(date_range) == 2:
+            if tuple(date_range) != tuple(bounds):
+                date_from, date_to = date_range
+    
+    # Apply filters (pushed down into the Parquet scan)
+    filters = TradeFilters(
+        stop_mode=selected_mode,
+        phase1_stop_pct=selected_p1,
+        phase2_stop_pct=selected_p2,
+        caller=None if selected_caller == 'All' else selected_caller,
+        date_from=date_from,
+        date_to=date_to,
+    )
     
-    if selected_caller != 'All':
-        filtered_df = filtered_df[filtered_df['caller'] == selected_caller]
+    # Calculate stats
+    stats = dataset.cohort_stats(filters)
     
     # Show filter results
-    if len(filtered_df) == 0:
+    if stats['total'] == 0:
         st.sidebar.error(f"⚠️ 0 trades after filters")
         st.sidebar.warning("Try different stop percentages")
     else:
-        st.sidebar.success(f"📊 {len(filtered_df):,} trades after filters")
+        st.sidebar.success(f"📊 {stats['total']:,} trades after filters")
     
-    # Calculate stats
-    stats = calculate_cohort_stats(filtered_df)
+    # Bounded sample of the filtered trades for charts
+    plot_df = dataset.fetch(filters, columns=PLOT_COLUMNS, sample=PLOT_SAMPLE_ROWS)
+    cohorts = split_cohorts(plot_df)
+    if stats['total'] > len(plot_df):
+        st.caption(f"Charts use a random sample of {len(plot_df):,} of {stats['total']:,} trades")
     
     # Main dashboard
     st.markdown("---")
@@ -360,28 +359,28 @@ def single_strategy_dashboard():
         st.metric("Count", f"{stats['winners']:,}")
         pct = (stats['winners']/stats['total']*100) if stats['total'] > 0 else 0
         st.metric("% of Total", f"{pct:.1f}%")
-        if len(stats['winners_df']) > 0:
-            st.metric("Mean Exit Mult", f"{stats['winners_df']['exit_mult'].mean():.2f}x")
-            st.metric("Median Exit Mult", f"{stats['winners_df']['exit_mult'].median():.2f}x")
-            st.metric("Mean Giveback", f"{stats['winners_df']['giveback_from_peak_pct'].mean():.1f}%")
+        if stats['winners'] > 0:
+            st.metric("Mean Exit Mult", fmt_mult(stats['winners_mean_exit_mult']))
+            st.metric("Median Exit Mult", fmt_mult(stats['winners_median_exit_mult']))
+            st.metric("Mean Giveback", fmt_pct(stats['winners_mean_giveback']))
     
     with col2:
         st.markdown("### 📉 Losers (2x, no 3x)")
         st.metric("Count", f"{stats['losers']:,}")
         pct = (stats['losers']/stats['total']*100) if stats['total'] > 0 else 0
         st.metric("% of Total", f"{pct:.1f}%")
-        if len(stats['losers_df']) > 0:
-            st.metric("Mean Exit Mult", f"{stats['losers_df']['exit_mult'].mean():.2f}x")
-            st.metric("Median Exit Mult", f"{stats['losers_df']['exit_mult'].median():.2f}x")
+        if stats['losers'] > 0:
+            st.metric("Mean Exit Mult", fmt_mult(stats['losers_mean_exit_mult']))
+            st.metric("Median Exit Mult", fmt_mult(stats['losers_median_exit_mult']))
     
     with col3:
         st.markdown("### ❌ Never 2x")
         st.metric("Count", f"{stats['never_2x']:,}")
         pct = (stats['never_2x']/stats['total']*100) if stats['total'] > 0 else 0
         st.metric("% of Total", f"{pct:.1f}%")
-        if len(stats['never_2x_df']) > 0:
-            st.metric("Mean Exit Mult", f"{stats['never_2x_df']['exit_mult'].mean():.2f}x")
-            st.metric("Median Exit Mult", f"{stats['never_2x_df']['exit_mult'].median():.2f}x")
+        if stats['never_2x'] > 0:
+            st.metric("Mean Exit Mult", fmt_mult(stats['never_2x_mean_exit_mult']))
+            st.metric("Median Exit Mult", fmt_mult(stats['never_2x_median_exit_mult']))
     
     st.markdown("---")
     
@@ -394,25 +393,25 @@ def single_strategy_dashboard():
         # Exit multiple distributions by cohort
         fig = go.Figure()
         
-        if len(stats['winners_df']) > 0:
+        if len(cohorts['winners_df']) > 0:
             fig.add_trace(go.Histogram(
-                x=stats['winners_df']['exit_mult'],
+                x=cohorts['winners_df']['exit_mult'],
                 name='Winners (≥3x)',
                 opacity=0.7,
                 nbinsx=50
             ))
         
-        if len(stats['losers_df']) > 0:
+        if len(cohorts['losers_df']) > 0:
             fig.add_trace(go.Histogram(
-                x=stats['losers_df']['exit_mult'],
+                x=cohorts['losers_df']['exit_mult'],
                 name='Losers (2x, no 3x)',
                 opacity=0.7,
                 nbinsx=50
             ))
         
-        if len(stats['never_2x_df']) > 0:
+        if len(cohorts['never_2x_df']) > 0:
             fig.add_trace(go.Histogram(
-                x=stats['never_2x_df']['exit_mult'],
+                x=cohorts['never_2x_df']['exit_mult'],
                 name='Never 2x',
                 opacity=0.7,
                 nbinsx=50
@@ -431,7 +430,7 @@ def single_strategy_dashboard():
     with tab2:
         # Peak vs Exit scatter
         fig = px.scatter(
-            filtered_df,
+            plot_df,
             x='peak_mult',
             y='exit_mult',
             color='hit_3x',
@@ -442,7 +441,7 @@ def single_strategy_dashboard():
         )
         
         # Add diagonal line (exit = peak, no giveback)
-        max_val = max(filtered_df['peak_mult'].max(), filtered_df['exit_mult'].max())
+        max_val = max(plot_df['peak_mult'].max(), plot_df['exit_mult'].max()) if len(plot_df) > 0 else 1.0
         fig.add_trace(go.Scatter(
             x=[0, max_val],
             y=[0, max_val],
@@ -457,9 +456,9 @@ def single_strategy_dashboard():
     
     with tab3:
         # Giveback distribution (winners only)
-        if len(stats['winners_df']) > 0:
+        if stats['winners'] > 0:
             fig = px.histogram(
-                stats['winners_df'],
+                cohorts['winners_df'],
                 x='giveback_from_peak_pct',
                 nbins=50,
                 title="Giveback from Peak Distribution (Winners Only)",
@@ -468,22 +467,22 @@ def single_strategy_dashboard():
             fig.update_layout(height=500)
             st.plotly_chart(fig, use_container_width=True)
             
-            # Giveback percentiles
+            # Giveback percentiles (exact, over all filtered winners)
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("P25 Giveback", f"{stats['winners_df']['giveback_from_peak_pct'].quantile(0.25):.1f}%")
+                st.metric("P25 Giveback", fmt_pct(stats['winners_giveback_p25']))
             with col2:
-                st.metric("P50 Giveback", f"{stats['winners_df']['giveback_from_peak_pct'].quantile(0.50):.1f}%")
+                st.metric("P50 Giveback", fmt_pct(stats['winners_giveback_p50']))
             with col3:
-                st.metric("P75 Giveback", f"{stats['winners_df']['giveback_from_peak_pct'].quantile(0.75):.1f}%")
+                st.metric("P75 Giveback", fmt_pct(stats['winners_giveback_p75']))
             with col4:
-                st.metric("P90 Giveback", f"{stats['winners_df']['giveback_from_peak_pct'].quantile(0.90):.1f}%")
+                st.metric("P90 Giveback", fmt_pct(stats['winners_giveback_p90']))
         else:
             st.info("No winners in this strategy")
     
     with tab4:
         # Exit reasons breakdown
-        exit_reasons = filtered_df['exit_reason'].value_counts()
+        exit_reasons = dataset.value_counts('exit_reason', filters)
         
         fig = px.pie(
             values=exit_reasons.values,
@@ -498,14 +497,14 @@ def single_strategy_dashboard():
         
         with col1:
             st.markdown("#### Winners Exit Reasons")
-            if len(stats['winners_df']) > 0:
-                winner_reasons = stats['winners_df']['exit_reason'].value_counts()
+            if stats['winners'] > 0:
+                winner_reasons = dataset.value_counts('exit_reason', filters, cohort='winners')
                 st.dataframe(winner_reasons, use_container_width=True)
         
         with col2:
             st.markdown("#### Losers Exit Reasons")
-            if len(stats['losers_df']) > 0:
-                loser_reasons = stats['losers_df']['exit_reason'].value_counts()
+            if stats['losers'] > 0:
+                loser_reasons = dataset.value_counts('exit_reason', filters, cohort='losers')
                 st.dataframe(loser_reasons, use_container_width=True)
     
     st.markdown("---")
@@ -515,10 +514,9 @@ def single_strategy_dashboard():
     
     top_n = st.slider("Number of trades to show", 10, 100, 20)
     
-    top_trades = filtered_df.nlargest(top_n, 'exit_mult')[
-        ['caller', 'mint', 'entry_mult', 'peak_mult', 'exit_mult', 
-         'giveback_from_peak_pct', 'hit_2x', 'hit_3x', 'hit_4x', 'hit_5x', 'hit_10x', 'exit_reason']
-    ].copy()
+    top_trades = dataset.fetch(
+        filters, columns=TOP_TRADE_COLUMNS, order_by='exit_mult DESC', limit=top_n,
+    )
     
     # Format for display
     top_trades['mint'] = top_trades['mint'].str[:20] + '...'
@@ -534,28 +532,15 @@ def single_strategy_dashboard():
     st.subheader("🔄 Strategy Comparison")
     
     if st.checkbox("Show strategy comparison"):
-        # Get all unique strategies
-        strategies = df.groupby(['stop_mode', 'phase1_stop_pct', 'phase2_stop_pct']).size().reset_index(name='count')
-        
+        # All strategies in one grouped scan (caller/date filters still apply)
         comparison_data = []
         
-        for _, row in strategies.iterrows():
-            strategy_df = df[
-                (df['stop_mode'] == row['stop_mode']) &
-                (df['phase1_stop_pct'] == row['phase1_stop_pct']) &
-                (df['phase2_stop_pct'] == row['phase2_stop_pct'])
-            ]
-            
-            if selected_caller != 'All':
-                strategy_df = strategy_df[strategy_df['caller'] == selected_caller]
-            
-            if len(strategy_df) > 0:
-                strategy_stats = calculate_cohort_stats(strategy_df)
-                
+        for strategy_stats in dataset.strategy_comparison(filters):
+            if strategy_stats['total'] > 0:
                 comparison_data.append({
-                    'Stop Mode': row['stop_mode'],
-                    'Phase1 Stop': f"{row['phase1_stop_pct']*100:.0f}%",
-                    'Phase2 Stop': f"{row['phase2_stop_pct']*100:.0f}%",
+                    'Stop Mode': strategy_stats['stop_mode'],
+                    'Phase1 Stop': f"{strategy_stats['phase1_stop_pct']*100:.0f}%",
+                    'Phase2 Stop': f"{strategy_stats['phase2_stop_pct']*100:.0f}%",
                     'Total Trades': strategy_stats['total'],
                     'EV from Entry': f"{strategy_stats['ev_from_entry']:.1f}%",
                     'EV given 2x': f"{strategy_stats['ev_given_2x']:.1f}%",
@@ -659,13 +644,13 @@ def comparison_dashboard():
         st.warning("⚠️ Please select at least 2 datasets to compare")
         return
     
-    # Load all selected datasets
+    # Open all selected datasets (lazy - nothing is read yet)
     datasets = {}
     for label in selected_datasets:
         pattern = dataset_options[label]
-        df = load_data(pattern)
-        if not df.empty:
-            datasets[label] = df
+        dataset = load_dataset(pattern)
+        if dataset is not None and not dataset.empty:
+            datasets[label] = dataset
     
     if len(datasets) < 2:
         st.error("Failed to load datasets")
@@ -678,8 +663,8 @@ def comparison_dashboard():
     
     # Get all unique stop modes
     all_stop_modes = set()
-    for df in datasets.values():
-        all_stop_modes.update(df['stop_mode'].unique())
+    for dataset in datasets.values():
+        all_stop_modes.update(dataset.distinct('stop_mode'))
     
     selected_stop_mode = st.sidebar.selectbox(
         "Stop Mode:",
@@ -689,10 +674,8 @@ def comparison_dashboard():
     
     # Get available stop configurations for selected mode
     stop_configs = set()
-    for df in datasets.values():
-        mode_df = df[df['stop_mode'] == selected_stop_mode]
-        for _, row in mode_df[['phase1_stop_pct', 'phase2_stop_pct']].drop_duplicates().iterrows():
-            stop_configs.add((row['phase1_stop_pct'], row['phase2_stop_pct']))
+    for dataset in datasets.values():
+        stop_configs.update(dataset.stop_configs(selected_stop_mode))
     
     stop_config_options = [
         f"{int(p1*100)}% / {int(p2*100)}%"
@@ -709,18 +692,19 @@ def comparison_dashboard():
     phase1_pct = float(selected_stop_config.split('%')[0]) / 100
     phase2_pct = float(selected_stop_config.split('/')[1].strip().split('%')[0]) / 100
     
-    # Filter all datasets
-    filtered_datasets = {}
-    for label, df in datasets.items():
-        filtered_df = df[
-            (df['stop_mode'] == selected_stop_mode) &
-            (df['phase1_stop_pct'] == phase1_pct) &
-            (df['phase2_stop_pct'] == phase2_pct)
-        ]
-        if not filtered_df.empty:
-            filtered_datasets[label] = filtered_df
-    
-    if not filtered_datasets:
+    # Aggregate each dataset under the same filters (pushed down into each scan)
+    filters = TradeFilters(
+        stop_mode=selected_stop_mode,
+        phase1_stop_pct=phase1_pct,
+        phase2_stop_pct=phase2_pct,
+    )
+    stats_by_label = {}
+    for label, dataset in datasets.items():
+        stats = dataset.cohort_stats(filters)
+        if stats['total'] > 0:
+            stats_by_label[label] = stats
+    
+    if not stats_by_label:
         st.error("No data found for selected strategy")
         return
     
@@ -728,10 +712,9 @@ def comparison_dashboard():
     st.markdown("---")
     st.markdown(f"### 📊 Comparison: {selected_stop_mode.title()} {selected_stop_config}")
     
-    # Calculate stats for each dataset
+    # Stats for each dataset
     comparison_stats = []
-    for label, df in filtered_datasets.items():
-        stats = calculate_cohort_stats(df)
+    for label, stats in stats_by_label.items():
         comparison_stats.append({
             'Entry Strategy': label,
             'Total Trades': stats['total'],
@@ -843,8 +826,7 @@ def comparison_dashboard():
     st.markdown("### 📈 Cohort Breakdown")
     
     cohort_data = []
-    for label, df in filtered_datasets.items():
-        stats = calculate_cohort_stats(df)
+    for label, stats in stats_by_label.items():
         cohort_data.append({
             'Entry Strategy': label,
             'Winners (≥3x)': stats['winners'],
@@ -927,7 +909,7 @@ def comparison_dashboard():
     
     # Footer
     st.markdown("---")
-    st.markdown(f"**QuantBot Comparison Dashboard** | Comparing {len(filtered_datasets)} entry strategies")
+    st.markdown(f"**QuantBot Comparison Dashboard** | Comparing {len(stats_by_label)} entry strategies")
 
 
 if __name__ == "__main__":
@@ -10,6 +10,7 @@ from .slice_exporter import (
     export_slice_streaming, 
     export_slice_streaming_with_quality,
     ExportResult,
+    load_coverage_index,
     query_coverage_batched,
 )
 from .slice_quality import (
@@ -31,6 +32,18 @@ from .extended_exits import (
     ExitConfig,
     run_extended_exit_query,
 )
+from .successive_halving import (
+    HalvingConfig,
+    RungRecord,
+    budget_folds,
+    subsample_alerts,
+    successive_halving,
+)
+from .result_cache import (
+    RESULT_CACHE_ENGINE_VERSION,
+    ResultCache,
+    hash_alerts,
+)
 from .storage import (
     store_baseline_run,
     store_tp_sl_run,
@@ -120,9 +133,12 @@ from .scoring_views import (
     CURRENT_SCORE_VERSION,
     VIEW_DEFINITIONS,
     ensure_baseline_trades_schema,
+    ensure_caller_stats_schema,
     create_scoring_views,
     get_caller_leaderboard,
     insert_trades_from_results,
+    merge_caller_stats,
+    rebuild_caller_stats,
     print_leaderboard,
 )
 from .risk_sizing import (
@@ -162,6 +178,12 @@ from .scoring import (
     print_scored_leaderboard,
     generate_caller_scored_v2_sql,
 )
+from .scoring_engine import (
+    caller_stats_from_alerts,
+    score_caller_arrays,
+    score_alerts,
+    scored_records,
+)
 from .trial_ledger import (
     ensure_trial_schema,
     store_optimizer_run,
@@ -187,6 +209,7 @@ from .trial_ledger import (
     load_island_champions,
     # Stress lane validation
     store_stress_lane_result,
+    store_stress_lane_results,
     get_completed_lanes_for_champion,
     load_stress_lane_results,
     # Champion validation
@@ -250,6 +273,13 @@ from .robust_region_finder import (
     # Entry point
     evaluate_candidate_robust,
 )
+from .island_clustering import (
+    ParamSpace,
+    KDTree,
+    kmeans_pp,
+    density_labels,
+    neighbour_score_stats,
+)
 from .stress_lanes import (
     # Stress lane types
     StressLane,
@@ -263,13 +293,28 @@ from .stress_lanes import (
     # Analytical simulation
     simulate_lane_stress_analytical,
     simulate_all_lanes_analytical,
+    # Matrix evaluation
+    lanes_table,
+    simulate_lanes_analytical_matrix,
+    TradeArrays,
+    recost_returns,
+    recost_rows,
+    simulate_lanes_from_trades,
+    group_lanes_by_latency,
     # Scoring
     LaneScoreResult,
     compute_lane_scores,
+    LaneMatrixResult,
+    compute_lane_scores_matrix,
     # Champion validation
     ChampionValidationResult,
     print_lane_matrix,
 )
+from .trades_dataset import (
+    TradeFilters,
+    TradesDataset,
+    dataset_signature,
+)
 from .run_mode import (
     # Types
     ModeType,
@@ -305,6 +350,7 @@ __all__ = [
     # Slice export
     "ClickHouseCfg",
     "export_slice_streaming",
+    "load_coverage_index",
     "query_coverage_batched",
     # Partitioning
     "partition_slice",
@@ -317,6 +363,16 @@ __all__ = [
     # Extended exits
     "ExitConfig",
     "run_extended_exit_query",
+    # Successive halving
+    "HalvingConfig",
+    "RungRecord",
+    "budget_folds",
+    "subsample_alerts",
+    "successive_halving",
+    # Result cache
+    "RESULT_CACHE_ENGINE_VERSION",
+    "ResultCache",
+    "hash_alerts",
     # Storage
     "store_baseline_run",
     "store_tp_sl_run",
@@ -407,13 +463,20 @@ __all__ = [
     "get_score_version",
     "list_score_versions",
     "print_metrics_doc",
+    # Trades dataset (dashboard)
+    "TradeFilters",
+    "TradesDataset",
+    "dataset_signature",
     # Scoring views
     "CURRENT_SCORE_VERSION",
     "VIEW_DEFINITIONS",
     "ensure_baseline_trades_schema",
+    "ensure_caller_stats_schema",
     "create_scoring_views",
     "get_caller_leaderboard",
     "insert_trades_from_results",
+    "merge_caller_stats",
+    "rebuild_caller_stats",
     "print_leaderboard",
     # Risk sizing
     "DEFAULT_RISK_BUDGET",
@@ -449,6 +512,10 @@ __all__ = [
     "score_callers_v2",
     "print_scored_leaderboard",
     "generate_caller_scored_v2_sql",
+    "caller_stats_from_alerts",
+    "score_caller_arrays",
+    "score_alerts",
+    "scored_records",
     # Trial Ledger (experiment tracking)
     "ensure_trial_schema",
     "store_optimizer_run",
@@ -474,6 +541,7 @@ __all__ = [
     "load_island_champions",
     # Stress lane validation storage
     "store_stress_lane_result",
+    "store_stress_lane_results",
     "get_completed_lanes_for_champion",
     "load_stress_lane_results",
     # Champion validation storage
@@ -526,6 +594,12 @@ __all__ = [
     "extract_island_champions",
     "print_island_champions",
     "evaluate_candidate_robust",
+    # Island clustering
+    "ParamSpace",
+    "KDTree",
+    "kmeans_pp",
+    "density_labels",
+    "neighbour_score_stats",
     # Stress Lanes
     "StressLane",
     "STRESS_LANES_BASIC",
@@ -536,8 +610,17 @@ __all__ = [
     "get_stress_lanes",
     "simulate_lane_stress_analytical",
     "simulate_all_lanes_analytical",
+    "lanes_table",
+    "simulate_lanes_analytical_matrix",
+    "TradeArrays",
+    "recost_returns",
+    "recost_rows",
+    "simulate_lanes_from_trades",
+    "group_lanes_by_latency",
     "LaneScoreResult",
     "compute_lane_scores",
+    "LaneMatrixResult",
+    "compute_lane_scores_matrix",
     "ChampionValidationResult",
     "print_lane_matrix",
     # Run Mode Contract
@@ -9,13 +9,16 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import duckdb
 
 from .alerts import Alert
 from .helpers import ceil_ms_to_interval_ts_ms, sql_escape
 
+if TYPE_CHECKING:
+    from .result_cache import ResultCache
+
 
 def run_baseline_query(
     alerts: List[Alert],
@@ -25,6 +28,7 @@ def run_baseline_query(
     horizon_hours: int,
     threads: int = 8,
     verbose: bool = False,
+    result_cache: Optional["ResultCache"] = None,
 ) -> List[Dict[str, Any]]:
     """
     Run baseline backtest query over alerts.
@@ -43,10 +47,24 @@ def run_baseline_query(
         horizon_hours: Lookforward window in hours
         threads: Number of DuckDB threads
         verbose: Print progress
+        result_cache: Optional content-addressed cache of per-alert results
 
     Returns:
         List of result dicts, one per alert
     """
+    if result_cache is not None:
+        params = {
+            "is_partitioned": is_partitioned,
+            "sql": _build_baseline_sql(interval_seconds, horizon_hours),
+        }
+        return result_cache.get_or_compute(
+            "baseline", alerts, slice_path, params,
+            lambda: run_baseline_query(
+                alerts, slice_path, is_partitioned, interval_seconds, horizon_hours,
+                threads=threads, verbose=verbose,
+            ),
+        )
+
     horizon_s = int(horizon_hours) * 3600
 
     # Build alert rows for temp table
@@ -13,12 +13,17 @@ All strategies return EntryResult with:
 - entry_ts_ms: int
 - time_to_entry_hrs: float
 - candles_after_entry: List[Dict]
+
+evaluate_entries() runs several entry strategies at once over candle arrays
+(see trade_simulator.simulate_trade_grid_arrays).
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime as dt_class
 
+import numpy as np
+
 
 @dataclass
 class EntryResult:
@@ -278,6 +283,96 @@ def _parse_timestamp_ms(ts_val) -> int:
         raise ValueError(f"Unknown timestamp type: {type(ts_val)}")
 
 
+def _first_true(mask: np.ndarray) -> int:
+    """Index of the first True, or len(mask) if none."""
+    return int(mask.argmax()) if mask.any() else len(mask)
+
+
+def evaluate_entries(
+    ts_ms: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    alert_price: float,
+    alert_ts_ms: int,
+    entries: Sequence[Tuple[str, Dict[str, Any]]],
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate entry strategies over candle arrays.
+    
+    Array counterpart of the strategy functions above: same fills, prices and
+    missed reasons, without building candles_after_entry lists.
+    
+    Args:
+        ts_ms: Candle timestamps (ms), int64
+        high, low, close: Candle prices, float64
+        alert_price: Price at alert
+        alert_ts_ms: Alert timestamp (ms)
+        entries: [(kind, params), ...] with kind a key of ENTRY_STRATEGIES
+    
+    Returns:
+        Dict of arrays (one value per entry): entry_occurred, entry_index
+        (first candle of candles_after_entry), entry_price, entry_ts_ms,
+        time_to_entry_hrs, missed_reason (object, None when filled)
+    """
+    n_entries = len(entries)
+    out = {
+        'entry_occurred': np.zeros(n_entries, dtype=bool),
+        'entry_index': np.zeros(n_entries, dtype=np.int64),
+        'entry_price': np.full(n_entries, float(alert_price)),
+        'entry_ts_ms': np.full(n_entries, int(alert_ts_ms), dtype=np.int64),
+        'time_to_entry_hrs': np.zeros(n_entries),
+        'missed_reason': np.full(n_entries, None, dtype=object),
+    }
+    n = len(ts_ms)
+    elapsed_hrs = (ts_ms - alert_ts_ms) / (1000 * 3600)
+    
+    for k, (kind, params) in enumerate(entries):
+        if kind == 'immediate':
+            out['entry_occurred'][k] = True
+            continue
+        if n == 0:
+            out['missed_reason'][k] = 'no_candles'
+            continue
+        
+        if kind == 'delayed_time':
+            target_entry_ts_ms = alert_ts_ms + int(params['wait_hrs'] * 3600 * 1000)
+            fill = _first_true(ts_ms >= target_entry_ts_ms)
+            timeout = n
+            fill_price = close
+            never_reason = 'observation_window_ended'
+        elif kind in ('delayed_dip', 'limit_order'):
+            if kind == 'delayed_dip':
+                target_entry_price = alert_price * (1.0 + params['dip_pct'])  # dip_pct is negative
+                fill = _first_true(low <= target_entry_price)
+                never_reason = 'dip_never_occurred'
+            else:
+                target_entry_price = params['limit_price']
+                fill = _first_true((low <= target_entry_price) & (target_entry_price <= high))
+                never_reason = 'limit_never_filled'
+            fill_price = None
+            max_wait_hrs = params.get('max_wait_hrs')
+            timeout = _first_true(elapsed_hrs > max_wait_hrs) if max_wait_hrs else n
+        else:
+            raise ValueError(f"Unknown entry strategy: {kind}")
+        
+        # Timeout is checked before the fill on the same candle
+        if timeout <= fill and timeout < n:
+            out['time_to_entry_hrs'][k] = elapsed_hrs[timeout]
+            out['missed_reason'][k] = f"timeout_{params.get('max_wait_hrs')}h"
+        elif fill < n:
+            out['entry_occurred'][k] = True
+            out['entry_index'][k] = fill
+            out['entry_price'][k] = close[fill] if fill_price is not None else target_entry_price
+            out['entry_ts_ms'][k] = ts_ms[fill]
+            out['time_to_entry_hrs'][k] = elapsed_hrs[fill]
+        else:
+            out['time_to_entry_hrs'][k] = elapsed_hrs[-1]
+            out['missed_reason'][k] = never_reason
+    
+    return out
+
+
 # Entry strategy registry for easy lookup
 ENTRY_STRATEGIES = {
     'immediate': immediate_entry,
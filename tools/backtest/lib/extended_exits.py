@@ -15,13 +15,16 @@ from __future__ import annotations
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple
 
 import duckdb
 
 from .alerts import Alert
 from .helpers import ceil_ms_to_interval_ts_ms, sql_escape
 
+if TYPE_CHECKING:
+    from .result_cache import ResultCache
+
 SliceType = Literal["file", "hive", "per_token"]
 
 
@@ -128,6 +131,7 @@ def run_extended_exit_query(
     threads: int = 8,
     verbose: bool = False,
     slice_type: Optional[SliceType] = None,
+    result_cache: Optional["ResultCache"] = None,
 ) -> List[Dict[str, Any]]:
     """
     Run backtest with extended exit types.
@@ -149,10 +153,29 @@ def run_extended_exit_query(
         threads: DuckDB threads
         verbose: Print progress
         slice_type: Slice format
+        result_cache: Optional content-addressed cache of per-alert results
     
     Returns:
         List of result dicts per alert
     """
+    if result_cache is not None:
+        effective_hours = horizon_hours
+        if exit_config.has_time_stop():
+            effective_hours = min(horizon_hours, exit_config.time_stop_hours)
+        params = {
+            "slice_type": slice_type,
+            "horizon_hours": horizon_hours,
+            "exit_config": exit_config.to_dict(),
+            "sql": _build_extended_exit_sql(exit_config, interval_seconds, effective_hours),
+        }
+        return result_cache.get_or_compute(
+            "extended_exit", alerts, slice_path, params,
+            lambda: run_extended_exit_query(
+                alerts, slice_path, exit_config, interval_seconds, horizon_hours,
+                threads=threads, verbose=verbose, slice_type=slice_type,
+            ),
+        )
+    
     horizon_s = int(horizon_hours) * 3600
     
     # Apply time stop if configured (reduces horizon)
@@ -0,0 +1,341 @@
+"""
+Vectorized parameter-space clustering for island detection.
+
+Building blocks used by robust_region_finder.cluster_parameters:
+
+- ParamSpace: maps param dicts to a normalized feature matrix over every
+  sampled dimension (numeric and bool min-max scaled to [0, 1], string
+  categoricals one-hot encoded, constant dimensions dropped)
+- KDTree: leaf-bucket KD-tree with batched radius-pair queries (one NumPy
+  distance block per leaf instead of one Python call per point)
+- kmeans_pp: k-means with k-means++ seeding and multiple restarts
+- density_labels: DBSCAN-style density islands (noise = -1)
+- neighbour_score_stats: score mean/std among each point's neighbours,
+  used as an island robustness measure (a peak surrounded by collapsing
+  neighbours is fragile)
+
+All functions are deterministic for a given seed and scale to ~100k trials.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# =============================================================================
+# FEATURE SPACE
+# =============================================================================
+
+class ParamSpace:
+    """
+    Normalized feature space over candidate param dicts.
+
+    Missing and None values count as 0 for numeric params (same default the
+    TP/SL-only clustering used) and as "" for categoricals.
+    """
+
+    def __init__(
+        self,
+        numeric_keys: List[str],
+        categorical: Dict[str, List[str]],
+        lo: np.ndarray,
+        hi: np.ndarray,
+    ):
+        self.numeric_keys = numeric_keys
+        self.categorical = categorical
+        self.lo = lo
+        self.hi = hi
+
+    @classmethod
+    def fit(cls, params: Sequence[Dict[str, Any]], keys: Optional[List[str]] = None) -> "ParamSpace":
+        """Infer dimensions (all keys seen, or `keys`) and their ranges."""
+        if keys is None:
+            seen: Dict[str, None] = {}
+            for p in params:
+                for k in p:
+                    seen.setdefault(k)
+            keys = list(seen)
+
+        numeric_keys: List[str] = []
+        categorical: Dict[str, List[str]] = {}
+        for k in keys:
+            values = [p.get(k) for p in params if p.get(k) is not None]
+            if values and all(isinstance(v, (bool, int, float)) for v in values):
+                numeric_keys.append(k)
+            elif values:
+                levels = sorted({str(v) for v in values})
+                if len(levels) > 1:
+                    categorical[k] = levels
+
+        raw = cls._numeric(params, numeric_keys)
+        if len(raw):
+            lo, hi = raw.min(axis=0), raw.max(axis=0)
+        else:
+            lo = hi = np.zeros(len(numeric_keys))
+        keep = hi > lo
+        return cls(
+            numeric_keys=[k for k, m in zip(numeric_keys, keep) if m],
+            categorical=categorical,
+            lo=lo[keep],
+            hi=hi[keep],
+        )
+
+    @staticmethod
+    def _numeric(params: Sequence[Dict[str, Any]], keys: List[str]) -> np.ndarray:
+        out = np.zeros((len(params), len(keys)))
+        for i, p in enumerate(params):
+            for j, k in enumerate(keys):
+                v = p.get(k)
+                if v is not None:
+                    out[i, j] = float(v)
+        return out
+
+    @property
+    def n_dims(self) -> int:
+        return len(self.numeric_keys) + sum(len(v) for v in self.categorical.values())
+
+    def raw_numeric(self, params: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Unscaled numeric values, shape (N, len(numeric_keys))."""
+        return self._numeric(params, self.numeric_keys)
+
+    def transform(self, params: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Feature matrix of shape (N, n_dims)."""
+        parts = [(self.raw_numeric(params) - self.lo) / (self.hi - self.lo)]
+        for k, levels in self.categorical.items():
+            col = np.array([str(p.get(k)) if p.get(k) is not None else "" for p in params])
+            parts.append((col[:, None] == np.array(levels)[None, :]).astype(np.float64))
+        return np.hstack(parts) if parts else np.zeros((len(params), 0))
+
+
+# =============================================================================
+# DISTANCES / KD-TREE
+# =============================================================================
+
+def _sq_dists(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Squared Euclidean distances, shape (len(a), len(b))."""
+    d2 = (a * a).sum(axis=1)[:, None] - 2.0 * (a @ b.T) + (b * b).sum(axis=1)[None, :]
+    return np.maximum(d2, 0.0)
+
+
+class KDTree:
+    """
+    Leaf-bucket KD-tree for batched radius queries.
+
+    Points are split at the median of the widest dimension until leaves
+    hold at most leaf_size points. query_pairs compares whole leaves: for
+    each query leaf, data leaves whose bounding boxes are within r are
+    gathered and distances computed in one block.
+    """
+
+    def __init__(self, data: np.ndarray, leaf_size: int = 128):
+        self.data = np.asarray(data, dtype=np.float64)
+        n, d = self.data.shape
+        leaves: List[np.ndarray] = []
+        stack = [np.arange(n)] if n else []
+        while stack:
+            idx = stack.pop()
+            pts = self.data[idx]
+            spread = pts.max(axis=0) - pts.min(axis=0) if d else np.zeros(0)
+            if len(idx) <= leaf_size or not spread.any():
+                leaves.append(idx)
+                continue
+            dim = int(np.argmax(spread))
+            half = len(idx) // 2
+            part = np.argpartition(pts[:, dim], half)
+            stack.append(idx[part[half:]])
+            stack.append(idx[part[:half]])
+        self.leaves = leaves
+        self.lo = np.array([self.data[l].min(axis=0) for l in leaves]).reshape(len(leaves), d)
+        self.hi = np.array([self.data[l].max(axis=0) for l in leaves]).reshape(len(leaves), d)
+
+    def query_pairs(self, queries: "KDTree", r: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All (query index, data index) pairs within distance r (inclusive).
+
+        Pass the tree itself as `queries` for self-pairs (each point pairs
+        with itself).
+        """
+        r2 = r * r + 1e-12
+        qi_parts: List[np.ndarray] = []
+        xj_parts: List[np.ndarray] = []
+        for q_idx, q_lo, q_hi in zip(queries.leaves, queries.lo, queries.hi):
+            gap = np.maximum(0.0, np.maximum(self.lo - q_hi, q_lo - self.hi))
+            near = np.flatnonzero((gap * gap).sum(axis=1) <= r2)
+            if not len(near):
+                continue
+            cand = np.concatenate([self.leaves[k] for k in near])
+            qi, cj = np.nonzero(_sq_dists(queries.data[q_idx], self.data[cand]) <= r2)
+            qi_parts.append(q_idx[qi])
+            xj_parts.append(cand[cj])
+        if not qi_parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(qi_parts), np.concatenate(xj_parts)
+
+
+def kth_neighbour_distance(
+    x: np.ndarray,
+    k: int,
+    sample: int = 2000,
+    seed: int = 0,
+    chunk: int = 256,
+) -> np.ndarray:
+    """Distance to the k-th nearest other point, for a random sample of rows."""
+    n = len(x)
+    if n < 2:
+        return np.zeros(0)
+    k = min(k, n - 1)
+    rows = np.random.default_rng(seed).choice(n, min(sample, n), replace=False)
+    out = []
+    for start in range(0, len(rows), chunk):
+        d2 = _sq_dists(x[rows[start:start + chunk]], x)
+        out.append(np.sqrt(np.partition(d2, k, axis=1)[:, k]))  # column 0 is the point itself
+    return np.concatenate(out)
+
+
+# =============================================================================
+# CLUSTERING
+# =============================================================================
+
+def kmeans_pp(
+    x: np.ndarray,
+    k: int,
+    n_init: int = 8,
+    max_iter: int = 100,
+    tol: float = 1e-6,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    k-means with k-means++ seeding; best of n_init restarts by inertia.
+
+    Returns:
+        (labels (N,), centroids (k, D), inertia)
+    """
+    n = len(x)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+    best: Optional[Tuple[np.ndarray, np.ndarray, float]] = None
+
+    for _ in range(n_init):
+        # k-means++: each next centre drawn with probability ∝ D(x)^2
+        centroids = np.empty((k, x.shape[1]))
+        centroids[0] = x[rng.integers(n)]
+        closest = _sq_dists(x, centroids[:1])[:, 0]
+        for c in range(1, k):
+            total = closest.sum()
+            pick = rng.choice(n, p=closest / total) if total > 0 else rng.integers(n)
+            centroids[c] = x[pick]
+            closest = np.minimum(closest, _sq_dists(x, centroids[c:c + 1])[:, 0])
+
+        for _ in range(max_iter):
+            d2 = _sq_dists(x, centroids)
+            labels = d2.argmin(axis=1)
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, x)
+            new = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids)
+            for c in np.flatnonzero(counts == 0):
+                # Re-seed an empty cluster at the worst-fit point
+                far = int(d2[np.arange(n), labels].argmax())
+                new[c] = x[far]
+                d2[far] = 0.0
+            shift = float(((new - centroids) ** 2).sum())
+            centroids = new
+            if shift <= tol:
+                break
+
+        d2 = _sq_dists(x, centroids)
+        labels = d2.argmin(axis=1)
+        inertia = float(d2[np.arange(n), labels].sum())
+        if best is None or inertia < best[2]:
+            best = (labels, centroids, inertia)
+
+    return best
+
+
+def _connected_components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Component label (smallest member index) per node for undirected edges a-b."""
+    labels = np.arange(n)
+    while True:
+        new = labels.copy()
+        np.minimum.at(new, a, labels[b])
+        np.minimum.at(new, b, labels[a])
+        new = new[new]  # pointer jumping
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def density_labels(
+    x: np.ndarray,
+    eps: float,
+    min_samples: int,
+    tree: Optional[KDTree] = None,
+) -> np.ndarray:
+    """
+    DBSCAN-style density clustering.
+
+    Points with at least min_samples neighbours within eps (self included)
+    are core points; connected core points form an island, and non-core
+    points within eps of a core point join its island. Everything else is
+    noise (-1). Islands are numbered 0.. in order of their first point.
+    """
+    n = len(x)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    tree = tree or KDTree(x)
+    i, j = tree.query_pairs(tree, eps)
+    core = np.bincount(i, minlength=n) >= min_samples
+
+    both = core[i] & core[j]
+    comp = _connected_components(n, i[both], j[both])
+    labels = np.where(core, comp, n)
+    border = ~core[i] & core[j]
+    np.minimum.at(labels, i[border], comp[j[border]])
+    labels = np.where(labels == n, -1, labels)
+
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    out = np.full(n, -1, dtype=np.int64)
+    ids = [u for u in np.argsort(first) if labels[first[u]] >= 0]
+    for new_id, u in enumerate(ids):
+        out[inverse == u] = new_id
+    return out
+
+
+def neighbour_score_stats(
+    tree: KDTree,
+    scores: np.ndarray,
+    queries: KDTree,
+    radius: float,
+) -> Dict[str, np.ndarray]:
+    """
+    Score statistics over each query point's neighbours in `tree`.
+
+    Returns:
+        Dict of (Q,) arrays: n_neighbours, mean, std (population std of
+        `scores` among neighbours within radius)
+    """
+    qi, xj = tree.query_pairs(queries, radius)
+    q = len(queries.data)
+    count = np.bincount(qi, minlength=q).astype(np.float64)
+    total = np.bincount(qi, weights=scores[xj], minlength=q)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / count, 0.0)
+    # Second pass around the mean (numerically safer than E[x^2] - E[x]^2)
+    sq = np.bincount(qi, weights=(scores[xj] - mean[qi]) ** 2, minlength=q)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.where(count > 0, np.sqrt(sq / np.maximum(count, 1)), 0.0)
+    return {"n_neighbours": count, "mean": mean, "std": std}
+
+
+def default_eps(x: np.ndarray, min_samples: int, seed: int = 0) -> float:
+    """Median distance to the min_samples-th neighbour (about half the points are core)."""
+    kd = kth_neighbour_distance(x, max(1, min_samples - 1), seed=seed)
+    if not len(kd):
+        return 0.0
+    eps = float(np.median(kd))
+    if eps <= 0:
+        eps = float(kd.max())
+    return eps if eps > 0 else math.sqrt(max(x.shape[1], 1)) * 1e-6
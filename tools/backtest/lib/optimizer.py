@@ -397,7 +397,12 @@ class GridOptimizer:
         
         try:
             from clickhouse_driver import Client as ClickHouseClient
-            from .slice_exporter import ClickHouseCfg, export_slice_streaming, query_coverage_batched
+            from .slice_exporter import (
+                ClickHouseCfg,
+                export_slice_streaming,
+                load_coverage_index,
+                query_coverage_batched,
+            )
         except ImportError:
             raise ImportError(
                 "clickhouse-driver required for slice creation. "
@@ -415,9 +420,12 @@ class GridOptimizer:
         )
         
         # Query coverage
+        coverage_index = load_coverage_index(
+            self.config.duckdb_path, self.config.chain, mints, self.config.interval_seconds
+        )
         coverage = query_coverage_batched(
             ch_cfg, self.config.chain, mints, self.config.interval_seconds,
-            date_from, date_to, ch_batch=1000, parallel=4
+            date_from, date_to, ch_batch=1000, parallel=4, coverage_index=coverage_index
         )
         covered_mints = {m for m, cnt in coverage.items() if cnt > 0}
         
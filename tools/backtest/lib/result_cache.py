@@ -0,0 +1,204 @@
+"""
+Content-addressed result cache for backtest evaluations.
+
+Each evaluation (baseline, tp/sl, extended exits) is keyed by a SHA-256 of:
+- the evaluation kind and RESULT_CACHE_ENGINE_VERSION
+- the alert set content (mint, caller, ts_ms of every alert, in order)
+- the slice content (SHA-256 of every parquet file it reads)
+- the evaluation params, including the generated SQL text
+
+Per-alert result rows are stored as one Parquet file per key. Hits refresh
+the file's mtime; puts evict the least recently used files until the cache
+is under its size cap.
+
+File content hashes are memoized in the cache directory by
+(path, size, mtime_ns), so a rerun over an unchanged slice only stats files.
+
+Usage:
+    from lib.result_cache import ResultCache
+
+    cache = ResultCache("results/result_cache", max_bytes=2 * 1024**3)
+    rows = run_tp_sl_query(alerts, slice_path, ..., result_cache=cache)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .alerts import Alert
+
+# Bump when evaluation semantics change without the generated SQL changing
+RESULT_CACHE_ENGINE_VERSION = "1"
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+_HASH_INDEX_FILE = "_file_hashes.json"
+
+
+def hash_alerts(alerts: Iterable[Alert]) -> str:
+    """Content hash of an alert set (order-sensitive: alert_id is positional)."""
+    h = hashlib.sha256()
+    for a in alerts:
+        h.update(f"{a.mint}\x1f{a.caller}\x1f{a.ts_ms}\x1e".encode())
+    return h.hexdigest()
+
+
+def _slice_files(slice_path: Path) -> List[Path]:
+    if slice_path.is_dir():
+        return sorted(slice_path.rglob("*.parquet"))
+    return [slice_path]
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ResultCache:
+    """Parquet-backed, size-capped LRU cache of per-alert evaluation results."""
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file_hashes: Optional[Dict[str, List[Any]]] = None
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def _load_hash_index(self) -> Dict[str, List[Any]]:
+        if self._file_hashes is None:
+            try:
+                self._file_hashes = json.loads((self.cache_dir / _HASH_INDEX_FILE).read_text())
+            except (OSError, ValueError):
+                self._file_hashes = {}
+        return self._file_hashes
+
+    def _save_hash_index(self) -> None:
+        path = self.cache_dir / _HASH_INDEX_FILE
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(self._file_hashes))
+        os.replace(tmp, path)
+
+    def hash_slice(self, slice_path: Path) -> str:
+        """Content hash of a slice file or directory (memoized per file stat)."""
+        with self._lock:
+            index = self._load_hash_index()
+            changed = False
+            h = hashlib.sha256()
+            for f in _slice_files(Path(slice_path)):
+                st = f.stat()
+                key = str(f.resolve())
+                entry = index.get(key)
+                if entry is None or entry[0] != st.st_size or entry[1] != st.st_mtime_ns:
+                    fh = hashlib.sha256()
+                    with open(f, "rb") as fp:
+                        for block in iter(lambda: fp.read(1 << 20), b""):
+                            fh.update(block)
+                    entry = [st.st_size, st.st_mtime_ns, fh.hexdigest()]
+                    index[key] = entry
+                    changed = True
+                rel = f.relative_to(slice_path).as_posix() if Path(slice_path).is_dir() else ""
+                h.update(f"{rel}\x1f{entry[2]}\x1e".encode())
+            if changed:
+                self._save_hash_index()
+            return h.hexdigest()
+
+    def evaluation_key(
+        self,
+        kind: str,
+        alerts: List[Alert],
+        slice_path: Path,
+        params: Dict[str, Any],
+    ) -> str:
+        """Cache key of one evaluation."""
+        payload = _canonical_json({
+            "kind": kind,
+            "engine_version": RESULT_CACHE_ENGINE_VERSION,
+            "alerts": hash_alerts(alerts),
+            "slice": self.hash_slice(slice_path),
+            "params": params,
+        })
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.parquet"
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Stored rows for key, or None."""
+        import pyarrow.parquet as pq
+
+        path = self._path(key)
+        try:
+            table = pq.read_table(path)
+        except (FileNotFoundError, OSError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU recency
+        except OSError:
+            pass
+        self.hits += 1
+        return table.to_pylist()
+
+    def put(self, key: str, rows: List[Dict[str, Any]]) -> None:
+        """Store rows for key, then evict down to max_bytes."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = self._path(key)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        pq.write_table(pa.Table.from_pylist(rows), tmp)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under max_bytes. Returns count removed."""
+        entries = []
+        for p in self.cache_dir.glob("*.parquet"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def get_or_compute(
+        self,
+        kind: str,
+        alerts: List[Alert],
+        slice_path: Path,
+        params: Dict[str, Any],
+        compute: Callable[[], List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """Return cached rows for the evaluation, computing and storing them on a miss."""
+        key = self.evaluation_key(kind, alerts, slice_path, params)
+        rows = self.get(key)
+        if rows is None:
+            rows = compute()
+            self.put(key, rows)
+        return rows
@@ -5,7 +5,8 @@ Key innovations:
 1. Objective = median(TestR across folds) - not mean, to survive outliers
 2. Exponential DD penalty: gentle at 30%, brutal by 60% (effectively disqualify)
 3. Stress lane: slippage ×2 + stop-gap worst-case simulation
-4. Parameter island clustering: top 30 candidates clustered into 2-4 regions
+4. Parameter island clustering: top candidates clustered into 2-4 regions
+   over the full normalized parameter vector (density + k-means++)
 
 Philosophy: Find profitable REGIONS with evidence they survive unseen periods.
 Not "the best params" but "robust parameter neighborhoods".
@@ -18,6 +19,17 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 from statistics import median
 
+import numpy as np
+
+from .island_clustering import (
+    KDTree,
+    ParamSpace,
+    default_eps,
+    density_labels,
+    kmeans_pp,
+    neighbour_score_stats,
+)
+
 # =============================================================================
 # EXPONENTIAL DD PENALTY (THE KEY)
 # =============================================================================
@@ -774,6 +786,11 @@ class ParameterIsland:
     # Spread (how "tight" is the cluster)
     param_spread: Dict[str, float]    # Std dev of each param
     
+    # Robustness: mean over members of the robust_score std among their
+    # parameter-space neighbours (lower = flatter, more robust region)
+    neighbour_score_std: float = 0.0
+    n_noise: int = 0                  # Pool candidates dropped as isolated (not in any island)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "island_id": self.island_id,
@@ -786,6 +803,8 @@ class ParameterIsland:
             "mean_ratio": self.mean_ratio,
             "pct_pass_gates": self.pct_pass_gates,
             "param_spread": self.param_spread,
+            "neighbour_score_std": self.neighbour_score_std,
+            "n_noise": self.n_noise,
             "members": self.members,
         }
 
@@ -793,17 +812,35 @@ class ParameterIsland:
 def cluster_parameters(
     candidates: List[Dict[str, Any]],
     n_clusters: int = 3,
-    top_n: int = 30,
+    top_n: Optional[int] = 30,
+    param_keys: Optional[List[str]] = None,
+    min_samples: Optional[int] = None,
+    eps: Optional[float] = None,
+    n_init: int = 8,
+    seed: int = 0,
 ) -> List[ParameterIsland]:
     """
     Cluster top candidates into parameter islands.
     
-    Uses simple k-means on TP/SL parameters.
+    Works on the full normalized parameter vector (every sampled dimension,
+    see island_clustering.ParamSpace) with NumPy, so it scales to the whole
+    trial set:
+    1. Density pass (DBSCAN-style) over the top candidates drops isolated
+       points - a lone high score with no good neighbours is luck, not a region
+    2. k-means++ with n_init restarts splits the dense points into islands
+    3. Robustness: score std among each member's neighbours within eps,
+       over ALL candidates (KD-tree radius queries)
     
     Args:
         candidates: List of dicts with "params" and "robust_result" keys
         n_clusters: Target number of clusters (2-4)
-        top_n: Number of top candidates to cluster
+        top_n: Number of top candidates to cluster (None = all)
+        param_keys: Param dimensions to use (default: all keys in params)
+        min_samples: Density threshold (default: 3..10 depending on pool size)
+        eps: Neighbourhood radius in normalized units (default: median
+            distance to the min_samples-th neighbour)
+        n_init: k-means++ restarts
+        seed: Random seed (results are deterministic per seed)
     
     Returns:
         List of ParameterIsland objects
@@ -811,65 +848,52 @@ def cluster_parameters(
     if not candidates:
         return []
     
-    # Take top N by robust_score
-    sorted_candidates = sorted(
+    # Sort all by robust_score; the pool is the top N
+    sorted_all = sorted(
         candidates,
         key=lambda c: c.get("robust_result", {}).get("robust_score", -999),
         reverse=True
-    )[:top_n]
+    )
+    n_pool = len(sorted_all) if top_n is None else min(top_n, len(sorted_all))
+    sorted_candidates = sorted_all[:n_pool]
     
     if len(sorted_candidates) < n_clusters:
         n_clusters = max(1, len(sorted_candidates))
     
-    # Extract param vectors (TP, SL)
-    param_keys = ["tp_mult", "sl_mult"]
+    # Feature space is fit on all candidates so distances mean the same
+    # thing for the pool and for the neighbourhoods around it
+    all_params = [c.get("params", {}) or {} for c in sorted_all]
+    space = ParamSpace.fit(all_params, param_keys)
+    x_all = space.transform(all_params)
+    x = x_all[:n_pool]
+    scores_all = np.array(
+        [c.get("robust_result", {}).get("robust_score", 0) or 0 for c in sorted_all],
+        dtype=np.float64,
+    )
     
-    def get_param_vec(c: Dict[str, Any]) -> List[float]:
-        params = c.get("params", {})
-        return [params.get(k, 0.0) for k in param_keys]
+    if min_samples is None:
+        min_samples = int(min(10, max(3, n_pool // 50)))
+    if eps is None:
+        eps = default_eps(x, min_samples, seed=seed)
     
-    # Simple k-means implementation (no numpy dependency)
-    vectors = [get_param_vec(c) for c in sorted_candidates]
+    pool_tree = KDTree(x)
+    dense = density_labels(x, eps, min_samples, tree=pool_tree) >= 0
+    if dense.sum() < n_clusters:
+        dense = np.ones(n_pool, dtype=bool)
     
-    # Initialize centroids (spread across range)
-    min_vals = [min(v[i] for v in vectors) for i in range(len(param_keys))]
-    max_vals = [max(v[i] for v in vectors) for i in range(len(param_keys))]
+    dense_idx = np.flatnonzero(dense)
+    km_labels, _, _ = kmeans_pp(x[dense_idx], n_clusters, n_init=n_init, seed=seed)
+    assignments = np.full(n_pool, -1)
+    assignments[dense_idx] = km_labels
     
-    # Evenly spaced initial centroids
-    centroids = []
-    for k in range(n_clusters):
-        frac = (k + 0.5) / n_clusters
-        centroid = [min_vals[i] + frac * (max_vals[i] - min_vals[i]) for i in range(len(param_keys))]
-        centroids.append(centroid)
-    
-    # K-means iterations
-    for _ in range(20):
-        # Assign to nearest centroid
-        assignments = []
-        for v in vectors:
-            dists = [sum((v[i] - c[i])**2 for i in range(len(param_keys))) for c in centroids]
-            assignments.append(dists.index(min(dists)))
-        
-        # Update centroids
-        new_centroids = []
-        for k in range(n_clusters):
-            members = [vectors[i] for i in range(len(vectors)) if assignments[i] == k]
-            if members:
-                new_centroid = [sum(m[i] for m in members) / len(members) for i in range(len(param_keys))]
-            else:
-                new_centroid = centroids[k]
-            new_centroids.append(new_centroid)
-        
-        # Check convergence
-        if new_centroids == centroids:
-            break
-        centroids = new_centroids
+    neighbours = neighbour_score_stats(KDTree(x_all), scores_all, pool_tree, eps)
+    raw = space.raw_numeric(all_params[:n_pool])
     
     # Build islands
     islands = []
     for k in range(n_clusters):
-        member_indices = [i for i in range(len(sorted_candidates)) if assignments[i] == k]
-        if not member_indices:
+        member_indices = np.flatnonzero(assignments == k)
+        if not len(member_indices):
             continue
         
         members = [sorted_candidates[i] for i in member_indices]
@@ -880,23 +904,34 @@ def cluster_parameters(
         ratios = [m.get("robust_result", {}).get("median_ratio", 0) for m in members]
         passes_gates = [m.get("robust_result", {}).get("passes_gates", False) for m in members]
         
-        # Param spread
-        param_spread = {}
-        for pi, pk in enumerate(param_keys):
-            values = [m.get("params", {}).get(pk, 0) for m in members]
-            mean_val = sum(values) / len(values) if values else 0
-            variance = sum((v - mean_val)**2 for v in values) / len(values) if values else 0
-            param_spread[pk] = math.sqrt(variance)
+        # Centroid (mean for numeric params, most common value for categoricals)
+        # and spread (std dev of numeric params)
+        member_raw = raw[member_indices]
+        centroid = {pk: float(v) for pk, v in zip(space.numeric_keys, member_raw.mean(axis=0))}
+        param_spread = {pk: float(v) for pk, v in zip(space.numeric_keys, member_raw.std(axis=0))}
+        for pk in space.categorical:
+            values = [str(m.get("params", {}).get(pk)) for m in members]
+            centroid[pk] = max(sorted(set(values)), key=values.count)
+        for pk in ("tp_mult", "sl_mult"):
+            if pk not in centroid:
+                # Constant across all candidates (dropped from the feature space)
+                values = [m.get("params", {}).get(pk, 0.0) for m in members]
+                centroid[pk] = sum(values) / len(values)
+                param_spread[pk] = 0.0
+        
+        neighbour_std = neighbours["std"][member_indices]
         
         island = ParameterIsland(
             island_id=k,
-            centroid=dict(zip(param_keys, centroids[k])),
+            centroid=centroid,
             members=[{
                 "params": m.get("params"),
                 "robust_score": m.get("robust_result", {}).get("robust_score"),
                 "median_test_r": m.get("robust_result", {}).get("median_test_r"),
                 "passes_gates": m.get("robust_result", {}).get("passes_gates"),
-            } for m in members],
+                "n_neighbours": int(neighbours["n_neighbours"][i]),
+                "neighbour_score_std": float(neighbours["std"][i]),
+            } for i, m in zip(member_indices, members)],
             mean_robust_score=sum(robust_scores) / len(robust_scores) if robust_scores else 0,
             median_robust_score=median(robust_scores) if robust_scores else 0,
             best_robust_score=max(robust_scores) if robust_scores else 0,
@@ -904,6 +939,8 @@ def cluster_parameters(
             mean_ratio=sum(ratios) / len(ratios) if ratios else 0,
             pct_pass_gates=sum(1 for p in passes_gates if p) / len(passes_gates) if passes_gates else 0,
             param_spread=param_spread,
+            neighbour_score_std=float(neighbour_std.mean()),
+            n_noise=int(n_pool - dense.sum()),
         )
         islands.append(island)
     
@@ -989,6 +1026,7 @@ def print_islands(islands: List[ParameterIsland]) -> None:
         print(f"    Mean TestR:    {island.mean_median_test_r:+.2f}")
         print(f"    Mean Ratio:    {island.mean_ratio:.2f}")
         print(f"    % Pass Gates:  {island.pct_pass_gates:.0%}")
+        print(f"    Nbr Score Std: {island.neighbour_score_std:.2f}")
         
         # Show top 3 in island
         sorted_members = sorted(island.members, key=lambda m: m.get("robust_score", 0), reverse=True)[:3]
@@ -300,6 +300,12 @@ class StressTestConfig:
 # FINGERPRINTS
 # =============================================================================
 
+# Order-independent md5 over the text form of each alert row
+_ALERT_CONTENT_HASH_SQL = (
+    "md5(string_agg(CAST(alerts AS VARCHAR), chr(10) ORDER BY CAST(alerts AS VARCHAR)))"
+)
+
+
 def compute_data_fingerprint(
     duckdb_path: str,
     date_from: str,
@@ -309,7 +315,8 @@ def compute_data_fingerprint(
 ) -> str:
     """
     Compute a hash of the data used for this run.
-    Includes: alerts count, date range, caller filter.
+    Includes: alerts count, date range, caller filter, and a content hash
+    of every alert row in range (so edits that keep count/min/max change it).
     """
     import duckdb
     
@@ -319,14 +326,14 @@ def compute_data_fingerprint(
             # Count alerts in range
             if caller_filter:
                 query = f"""
-                    SELECT COUNT(*), MIN(ts), MAX(ts)
+                    SELECT COUNT(*), MIN(ts), MAX(ts), {_ALERT_CONTENT_HASH_SQL}
                     FROM alerts
                     WHERE chain = ? AND ts >= ? AND ts < ? AND caller = ?
                 """
                 row = con.execute(query, [chain, date_from, date_to, caller_filter]).fetchone()
             else:
                 query = f"""
-                    SELECT COUNT(*), MIN(ts), MAX(ts)
+                    SELECT COUNT(*), MIN(ts), MAX(ts), {_ALERT_CONTENT_HASH_SQL}
                     FROM alerts
                     WHERE chain = ? AND ts >= ? AND ts < ?
                 """
@@ -336,6 +343,7 @@ def compute_data_fingerprint(
             n_alerts = row[0] if row else 0
             min_ts = str(row[1]) if row and row[1] else ""
             max_ts = str(row[2]) if row and row[2] else ""
+            content_hash = row[3] if row and row[3] else ""
             
             # Build fingerprint
             fingerprint_data = {
@@ -347,6 +355,7 @@ def compute_data_fingerprint(
                 "n_alerts": n_alerts,
                 "min_ts": min_ts,
                 "max_ts": max_ts,
+                "content_hash": content_hash,
             }
             
             canonical = json.dumps(fingerprint_data, sort_keys=True, separators=(",", ":"))
@@ -429,7 +429,7 @@ WITH src AS (
     median_t2x_hrs,
 
     -- Prefer "pre2x_or_horizon" because it exists even when 2x is never hit.
-    COALESCE(median_dd_pre2x_or_horizon_pct, median_dd_pre2x_pct, median_dd_overall_pct) AS risk_dd_pct,
+    COALESCE(median_dd_pre2x_or_horizon_pct, median_dd_pre2x_pct, median_dd_overall_pct, 0.0) AS risk_dd_pct,
     median_dd_pre2x_pct,
     median_dd_pre2x_or_horizon_pct,
     median_dd_overall_pct
@@ -449,7 +449,7 @@ feat AS (
     END AS median_t2x_min,
 
     -- Base upside: median edge times hit-rate
-    (GREATEST(median_ath - 1.0, 0.0) * (hit2x_pct / 100.0)) AS base_upside,
+    (GREATEST(COALESCE(NULLIF(median_ath, 0), 1.0) - 1.0, 0.0) * (COALESCE(hit2x_pct, 0.0) / 100.0)) AS base_upside,
 
     -- Tail bonus: reward p75 & p95 above median (fat right tail)
     ({config.tail_p75_weight} * GREATEST(p75_ath - median_ath, 0.0))
@@ -457,7 +457,7 @@ feat AS (
 
     -- Fast 2x boost in [0..1], only when median_t2x exists
     CASE
-      WHEN median_t2x_hrs IS NULL THEN 0.0
+      WHEN median_t2x_hrs IS NULL OR median_t2x_hrs <= 0 THEN 0.0
       ELSE exp(-(median_t2x_hrs * 60.0) / {config.timing_halflife_min})
     END AS fast2x_signal,
 
@@ -530,7 +530,7 @@ SELECT
   timing_mult,
 
   score_v2,
-  row_number() OVER (PARTITION BY run_id ORDER BY score_v2 DESC) AS rank_v2
+  row_number() OVER (PARTITION BY run_id ORDER BY score_v2 DESC, caller) AS rank_v2
 
 FROM score;
 """
@@ -0,0 +1,397 @@
+"""
+Vectorized caller scoring engine.
+
+Scores every caller in one pass over columnar per-alert outcomes
+(pyarrow Table, pandas DataFrame or dict of NumPy arrays) instead of
+building a stats dict per caller and calling score_caller_v2 in a loop.
+
+Two stages, both pure NumPy:
+1. caller_stats_from_alerts() encodes callers once and sorts each metric
+   column within caller groups, one column per thread. From the sorted
+   groups it computes the inputs scoring needs (n, median/p75/p95 ATH,
+   hit2x %, median time-to-2x, median drawdowns) with the same definitions
+   as summary.aggregate_by_caller.
+2. score_caller_arrays() applies the caller_scored_v2 formula from
+   scoring.py to whole columns at once.
+
+Results are deterministic: callers are ordered by name, ranks break score
+ties by that order.
+
+Usage:
+    from lib.scoring_engine import score_alerts
+
+    scored = score_alerts(alerts_table, min_trades=5)
+    for row in scored_records(scored)[:30]:
+        print(row["rank_v2"], row["caller"], row["score_v2"])
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping
+
+import numpy as np
+
+from .scoring import DEFAULT_SCORING_CONFIG, ScoringConfig
+
+# Per-alert columns read by caller_stats_from_alerts
+ALERT_COLUMNS = ("caller", "ath_mult", "time_to_2x_s", "dd_pre2x", "dd_overall")
+
+# Component columns added by score_caller_arrays, in score_caller_v2 order
+SCORE_COLUMNS = (
+    "risk_dd_pct",
+    "risk_mag",
+    "median_t2x_min",
+    "base_upside",
+    "tail_bonus",
+    "fast2x_signal",
+    "timing_mult",
+    "risk_penalty",
+    "discipline_bonus",
+    "confidence",
+    "score_v2",
+)
+
+
+def _column(data: Any, name: str) -> Any:
+    """Fetch a column from a pyarrow Table, DataFrame or mapping (None if absent)."""
+    if hasattr(data, "column_names"):  # pyarrow.Table
+        return data.column(name) if name in data.column_names else None
+    if hasattr(data, "columns") and hasattr(data, "__getitem__"):  # pandas.DataFrame
+        return data[name] if name in data.columns else None
+    return data.get(name)
+
+
+def _float_array(data: Any, name: str, length: int) -> np.ndarray:
+    """Column as float64 with nulls as NaN (all NaN if the column is missing)."""
+    col = _column(data, name)
+    if col is None:
+        return np.full(length, np.nan)
+    if hasattr(col, "null_count"):  # pyarrow
+        col = col.to_numpy(zero_copy_only=False)
+    arr = np.asarray(col)
+    if arr.dtype == object:
+        return np.array([np.nan if v is None else float(v) for v in arr], dtype=np.float64)
+    return arr.astype(np.float64)
+
+
+def _caller_codes(data: Any, name: str):
+    """
+    Encode the caller column as (sorted unique names, per-row codes).
+
+    Callers are stripped; empty or null callers get code -1.
+    """
+    col = _column(data, name)
+    if col is None:
+        raise KeyError(f"Missing column: {name}")
+    if hasattr(col, "null_count"):  # pyarrow: dictionary-encode without leaving Arrow
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        col = pc.utf8_trim_whitespace(pc.cast(col, pa.string()))
+        encoded = pc.dictionary_encode(col).combine_chunks()
+        dictionary = np.array(encoded.dictionary.to_pylist(), dtype=object)
+        indices = pc.cast(pc.fill_null(encoded.indices, -1), pa.int64()).to_numpy()
+    else:
+        # None and NaN (pandas' missing object value) are both null
+        values = ["" if v is None or v != v else str(v).strip() for v in col]
+        dictionary, indices = np.unique(np.array(values, dtype=object), return_inverse=True)
+
+    # Renumber so codes follow caller name order; "" -> -1
+    order = np.argsort(dictionary, kind="stable")
+    remap = np.empty(len(dictionary), dtype=np.int64)
+    remap[order] = np.arange(len(dictionary))
+    names = dictionary[order]
+    codes = np.where(indices >= 0, remap[np.maximum(indices, 0)] if len(remap) else -1, -1)
+    if len(names) and names[0] == "":
+        names = names[1:]
+        codes = np.where(codes > 0, codes - 1, -1)
+    return names, codes.astype(np.int64)
+
+
+def _status_ok(data: Any, length: int) -> np.ndarray:
+    col = _column(data, "status")
+    if col is None:
+        return np.ones(length, dtype=bool)
+    if hasattr(col, "null_count"):
+        import pyarrow.compute as pc
+
+        return pc.fill_null(pc.equal(col, "ok"), False).to_numpy(zero_copy_only=False)
+    return np.array([s == "ok" for s in col], dtype=bool)
+
+
+# =============================================================================
+# Grouped order statistics
+# =============================================================================
+
+def _grouped_sorted(values: np.ndarray, codes: np.ndarray, n_groups: int):
+    """
+    Sort non-NaN values within their groups.
+
+    Returns (sorted_values, starts, counts) where group g occupies
+    sorted_values[starts[g]:starts[g] + counts[g]].
+    """
+    valid = ~np.isnan(values)
+    v = values[valid]
+    c = codes[valid]
+    # Sort by value, then stable (radix) sort by group code
+    by_value = np.argsort(v)
+    order = by_value[np.argsort(c[by_value], kind="stable")]
+    counts = np.bincount(c, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return v[order], starts, counts
+
+
+def _median_of(grouped) -> np.ndarray:
+    """statistics.median per group (NaN for empty groups)."""
+    s, starts, counts = grouped
+    out = np.full(len(counts), np.nan)
+    has = counts > 0
+    lo = starts[has] + (counts[has] - 1) // 2
+    hi = starts[has] + counts[has] // 2
+    out[has] = (s[lo] + s[hi]) / 2.0
+    return out
+
+
+def _percentile_of(grouped, p: float) -> np.ndarray:
+    """Nearest-rank percentile sorted[int(len * p)] per group, as aggregate_by_caller."""
+    s, starts, counts = grouped
+    out = np.full(len(counts), np.nan)
+    has = counts > 0
+    idx = np.minimum(np.floor(counts[has] * p).astype(np.int64), counts[has] - 1)
+    out[has] = s[starts[has] + idx]
+    return out
+
+
+# =============================================================================
+# Stage 1: per-alert outcomes -> per-caller inputs
+# =============================================================================
+
+def caller_stats_from_alerts(
+    alerts: Any,
+    min_trades: int = 0,
+    max_workers: int = 4,
+) -> Dict[str, np.ndarray]:
+    """
+    Aggregate per-alert outcomes into the caller stats scoring needs.
+
+    Args:
+        alerts: pyarrow Table, DataFrame or dict of arrays with the
+            ALERT_COLUMNS (an optional "status" column keeps only "ok" rows)
+        min_trades: Minimum alerts per caller to include
+        max_workers: Threads used to sort the metric columns (NumPy releases
+            the GIL while sorting); 1 runs them inline
+
+    Returns:
+        Dict of equal-length arrays, one entry per caller, ordered by caller
+        name: caller, n, median_ath, p75_ath, p95_ath, hit2x_pct,
+        median_t2x_hrs, median_dd_pre2x_pct, median_dd_overall_pct,
+        median_dd_pre2x_or_horizon_pct. Missing values are NaN.
+
+    Nulls and NaN are both treated as missing; in particular a NaN
+    time_to_2x_s does not count as a 2x hit.
+    """
+    names, codes = _caller_codes(alerts, "caller")
+    n_rows = len(codes)
+    keep = (codes >= 0) & _status_ok(alerts, n_rows)
+    codes = codes[keep]
+
+    ath = _float_array(alerts, "ath_mult", n_rows)[keep]
+    t2x = _float_array(alerts, "time_to_2x_s", n_rows)[keep]
+    dd_pre2x = _float_array(alerts, "dd_pre2x", n_rows)[keep]
+    dd_overall = _float_array(alerts, "dd_overall", n_rows)[keep]
+
+    # Callers with no kept rows are dropped
+    n_groups = len(names)
+    counts = np.bincount(codes, minlength=n_groups)
+    present = counts > 0
+
+    # dd_pre2x when 2x was hit, otherwise the horizon drawdown
+    dd_pre2x_or_horizon = np.where(np.isnan(dd_pre2x), dd_overall, dd_pre2x)
+
+    hits = np.bincount(codes, weights=~np.isnan(t2x), minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hit2x_pct = hits / counts * 100
+
+    columns = (ath, t2x, dd_pre2x, dd_overall, dd_pre2x_or_horizon)
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            grouped = list(pool.map(lambda v: _grouped_sorted(v, codes, n_groups), columns))
+    else:
+        grouped = [_grouped_sorted(v, codes, n_groups) for v in columns]
+    g_ath, g_t2x, g_dd_pre2x, g_dd_overall, g_dd_pre2x_or_horizon = grouped
+
+    stats = {
+        "caller": names,
+        "n": counts,
+        "median_ath": _median_of(g_ath),
+        "p75_ath": _percentile_of(g_ath, 0.75),
+        "p95_ath": _percentile_of(g_ath, 0.95),
+        "hit2x_pct": hit2x_pct,
+        "median_t2x_hrs": _median_of(g_t2x) / 3600.0,
+        "median_dd_pre2x_pct": _median_of(g_dd_pre2x) * 100.0,
+        "median_dd_overall_pct": _median_of(g_dd_overall) * 100.0,
+        "median_dd_pre2x_or_horizon_pct": _median_of(g_dd_pre2x_or_horizon) * 100.0,
+    }
+
+    mask = present & (counts >= int(min_trades))
+    if not mask.all():
+        stats = {k: v[mask] for k, v in stats.items()}
+    return stats
+
+
+def caller_stats_from_records(callers: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Columnar view of caller stats dicts (None -> NaN), input order preserved."""
+    def col(name: str) -> np.ndarray:
+        return np.array(
+            [np.nan if c.get(name) is None else float(c[name]) for c in callers],
+            dtype=np.float64,
+        )
+
+    stats = {
+        name: col(name)
+        for name in (
+            "median_ath", "p75_ath", "p95_ath", "hit2x_pct", "median_t2x_hrs",
+            "median_dd_pre2x_pct", "median_dd_overall_pct", "median_dd_pre2x_or_horizon_pct",
+        )
+    }
+    stats["caller"] = np.array([c.get("caller") for c in callers], dtype=object)
+    stats["n"] = np.array([c.get("n", 0) for c in callers], dtype=np.int64)
+    return stats
+
+
+# =============================================================================
+# Stage 2: caller inputs -> score components
+# =============================================================================
+
+def score_caller_arrays(
+    stats: Mapping[str, np.ndarray],
+    config: ScoringConfig = DEFAULT_SCORING_CONFIG,
+) -> Dict[str, np.ndarray]:
+    """
+    Apply the v2 scoring formula (see scoring.score_caller_v2) to whole columns.
+
+    Args:
+        stats: Per-caller arrays as returned by caller_stats_from_alerts
+        config: Scoring configuration
+
+    Returns:
+        The input columns plus SCORE_COLUMNS and rank_v2 (1 = best).
+    """
+    n = np.asarray(stats["n"], dtype=np.float64)
+    length = len(n)
+
+    def get(name: str) -> np.ndarray:
+        v = stats.get(name)
+        return np.full(length, np.nan) if v is None else np.asarray(v, dtype=np.float64)
+
+    median_ath = get("median_ath")
+    median_ath = np.where(np.isnan(median_ath) | (median_ath == 0), 1.0, median_ath)
+    p75_ath = get("p75_ath")
+    p95_ath = get("p95_ath")
+    hit2x_pct = np.nan_to_num(get("hit2x_pct"), nan=0.0)
+    median_t2x_hrs = get("median_t2x_hrs")
+
+    # Prefer pre2x_or_horizon, fallback to pre2x, then overall
+    dd_pct = get("median_dd_pre2x_or_horizon_pct")
+    dd_pct = np.where(np.isnan(dd_pct), get("median_dd_pre2x_pct"), dd_pct)
+    dd_pct = np.where(np.isnan(dd_pct), np.nan_to_num(get("median_dd_overall_pct"), nan=0.0), dd_pct)
+    risk_mag = np.maximum(0.0, -dd_pct / 100.0)
+
+    median_t2x_min = median_t2x_hrs * 60.0
+
+    base_upside = np.maximum(median_ath - 1.0, 0.0) * (hit2x_pct / 100.0)
+
+    has_p75 = ~np.isnan(p75_ath)
+    tail_bonus = np.where(has_p75, config.tail_p75_weight * np.maximum(p75_ath - median_ath, 0.0), 0.0)
+    tail_bonus += np.where(
+        has_p75 & ~np.isnan(p95_ath),
+        config.tail_p95_weight * np.maximum(p95_ath - p75_ath, 0.0),
+        0.0,
+    )
+
+    fast = ~np.isnan(median_t2x_min) & (median_t2x_min > 0)
+    fast2x_signal = np.zeros(length)
+    fast2x_signal[fast] = np.exp(-median_t2x_min[fast] / config.timing_halflife_min)
+    timing_mult = 1.0 + config.timing_max_boost * fast2x_signal
+
+    risky = risk_mag > config.risk_threshold
+    risk_penalty = np.zeros(length)
+    risk_penalty[risky] = np.expm1(config.risk_rate * (risk_mag[risky] - config.risk_threshold))
+
+    discipline_bonus = np.where(
+        (hit2x_pct >= config.discipline_hit2x_threshold) & (risk_mag <= config.discipline_dd_threshold),
+        config.discipline_bonus,
+        0.0,
+    )
+
+    confidence = np.zeros(length)
+    pos = n > 0
+    confidence[pos] = np.sqrt(n[pos] / (n[pos] + config.confidence_k))
+
+    score_v2 = confidence * (
+        (base_upside + tail_bonus) * timing_mult
+        + discipline_bonus
+        - config.risk_weight * risk_penalty
+    )
+
+    # Stable sort: equal scores keep input (caller name) order
+    order = np.argsort(-score_v2, kind="stable")
+    rank_v2 = np.empty(length, dtype=np.int64)
+    rank_v2[order] = np.arange(1, length + 1)
+
+    return {
+        **stats,
+        "risk_dd_pct": dd_pct,
+        "risk_mag": risk_mag,
+        "median_t2x_min": median_t2x_min,
+        "base_upside": base_upside,
+        "tail_bonus": tail_bonus,
+        "fast2x_signal": fast2x_signal,
+        "timing_mult": timing_mult,
+        "risk_penalty": risk_penalty,
+        "discipline_bonus": discipline_bonus,
+        "confidence": confidence,
+        "score_v2": score_v2,
+        "rank_v2": rank_v2,
+    }
+
+
+def score_alerts(
+    alerts: Any,
+    config: ScoringConfig = DEFAULT_SCORING_CONFIG,
+    min_trades: int = 0,
+    max_workers: int = 4,
+) -> Dict[str, np.ndarray]:
+    """
+    Score all callers straight from per-alert outcomes.
+
+    Args:
+        alerts: pyarrow Table, DataFrame or dict of arrays (see ALERT_COLUMNS)
+        config: Scoring configuration
+        min_trades: Minimum alerts per caller to include
+        max_workers: Threads for the per-column sorts
+
+    Returns:
+        Columnar scored callers (see score_caller_arrays), ordered by caller.
+    """
+    return score_caller_arrays(caller_stats_from_alerts(alerts, min_trades, max_workers), config)
+
+
+def scored_records(scored: Mapping[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """
+    Convert columnar scores to score_callers_v2-style dicts sorted by rank_v2.
+
+    NaN becomes None so the result works with print_scored_leaderboard and
+    the DuckDB storage helpers.
+    """
+    order = np.argsort(np.asarray(scored["rank_v2"]), kind="stable")
+    columns = {k: np.asarray(v)[order].tolist() for k, v in scored.items()}
+    records = []
+    for i in range(len(order)):
+        row = {}
+        for k, values in columns.items():
+            v = values[i]
+            row[k] = None if isinstance(v, float) and v != v else v
+        records.append(row)
+    return records
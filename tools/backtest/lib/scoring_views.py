@@ -8,6 +8,12 @@ Score logic lives in DuckDB as versioned views:
 
 Runner prints whichever version is set as "current".
 This keeps experimentation cheap and history readable.
+
+Leaderboards are served from baseline.caller_stats_d, which holds mergeable
+per-(run_id, caller) sufficient statistics (counts, sums, sums of squares,
+maxima and value lists for medians). insert_trades_from_results merges new
+trades into it, and every score version is computed from the merged rows, so
+a leaderboard never rescans baseline.trades_d.
 """
 
 from __future__ import annotations
@@ -263,6 +269,210 @@ VIEW_DEFINITIONS: Dict[str, str] = {
 CURRENT_SCORE_VERSION = "v4"
 
 
+# =============================================================================
+# Materialized Caller Stats
+# =============================================================================
+
+# Per-(run_id, caller) sufficient statistics. Every column merges across
+# trades or runs by SUM, except max_dd (MAX) and the value lists (concat).
+CALLER_STATS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS baseline.caller_stats_d (
+    run_id TEXT NOT NULL,
+    caller TEXT NOT NULL,
+    
+    n_trades BIGINT NOT NULL,
+    
+    -- net_return
+    n_ret BIGINT,
+    sum_ret DOUBLE,
+    sumsq_ret DOUBLE,
+    n_win BIGINT,                -- net_return > 0
+    sum_win DOUBLE,
+    n_nonpos BIGINT,             -- net_return <= 0
+    sum_nonpos DOUBLE,
+    sum_neg DOUBLE,              -- net_return < 0
+    
+    -- peak_mult
+    n_peak BIGINT,
+    sum_peak DOUBLE,
+    n_2x BIGINT,
+    n_3x BIGINT,
+    n_4x BIGINT,
+    
+    -- Drawdown
+    sum_dd DOUBLE,               -- COALESCE(dd_pre2x_or_horizon, dd_max, 0.5)
+    max_dd DOUBLE,               -- MAX(COALESCE(dd_max, 0.5))
+    
+    -- r_multiple (NULL counts as 0 where the views COALESCE it)
+    sum_r DOUBLE,
+    sumsq_r DOUBLE,
+    n_r_pos BIGINT,
+    sum_r_pos DOUBLE,
+    n_r_nonpos BIGINT,
+    sum_r_nonpos DOUBLE,
+    sum_r_neg DOUBLE,
+    
+    -- Portfolio / sizing
+    sum_pnl DOUBLE,
+    n_position BIGINT,
+    sum_position DOUBLE,
+    
+    -- Value lists for exact medians
+    net_returns DOUBLE[],
+    r_values DOUBLE[],
+    
+    PRIMARY KEY (run_id, caller)
+);
+"""
+
+# Aggregates of baseline.trades_d rows into caller_stats_d columns
+_TRADE_STATS_SELECT = """
+    COUNT(*) AS n_trades,
+    COUNT(net_return) AS n_ret,
+    COALESCE(SUM(net_return), 0) AS sum_ret,
+    COALESCE(SUM(net_return * net_return), 0) AS sumsq_ret,
+    COUNT(*) FILTER (WHERE net_return > 0) AS n_win,
+    COALESCE(SUM(net_return) FILTER (WHERE net_return > 0), 0) AS sum_win,
+    COUNT(*) FILTER (WHERE net_return <= 0) AS n_nonpos,
+    COALESCE(SUM(net_return) FILTER (WHERE net_return <= 0), 0) AS sum_nonpos,
+    COALESCE(SUM(net_return) FILTER (WHERE net_return < 0), 0) AS sum_neg,
+    COUNT(peak_mult) AS n_peak,
+    COALESCE(SUM(peak_mult), 0) AS sum_peak,
+    COUNT(*) FILTER (WHERE peak_mult >= 2.0) AS n_2x,
+    COUNT(*) FILTER (WHERE peak_mult >= 3.0) AS n_3x,
+    COUNT(*) FILTER (WHERE peak_mult >= 4.0) AS n_4x,
+    SUM(COALESCE(dd_pre2x_or_horizon, dd_max, 0.5)) AS sum_dd,
+    MAX(COALESCE(dd_max, 0.5)) AS max_dd,
+    SUM(COALESCE(r_multiple, 0)) AS sum_r,
+    SUM(COALESCE(r_multiple, 0) * COALESCE(r_multiple, 0)) AS sumsq_r,
+    COUNT(*) FILTER (WHERE r_multiple > 0) AS n_r_pos,
+    COALESCE(SUM(r_multiple) FILTER (WHERE r_multiple > 0), 0) AS sum_r_pos,
+    COUNT(*) FILTER (WHERE r_multiple <= 0) AS n_r_nonpos,
+    COALESCE(SUM(r_multiple) FILTER (WHERE r_multiple <= 0), 0) AS sum_r_nonpos,
+    COALESCE(SUM(r_multiple) FILTER (WHERE r_multiple < 0), 0) AS sum_r_neg,
+    SUM(COALESCE(portfolio_pnl_pct, 0)) AS sum_pnl,
+    COUNT(position_pct) AS n_position,
+    COALESCE(SUM(position_pct), 0) AS sum_position,
+    COALESCE(LIST(net_return) FILTER (WHERE net_return IS NOT NULL), []::DOUBLE[]) AS net_returns,
+    LIST(COALESCE(r_multiple, 0)) AS r_values
+"""
+
+_SUM_STATS = [
+    "n_trades", "n_ret", "sum_ret", "sumsq_ret", "n_win", "sum_win", "n_nonpos",
+    "sum_nonpos", "sum_neg", "n_peak", "sum_peak", "n_2x", "n_3x", "n_4x", "sum_dd",
+    "sum_r", "sumsq_r", "n_r_pos", "sum_r_pos", "n_r_nonpos", "sum_r_nonpos",
+    "sum_r_neg", "sum_pnl", "n_position", "sum_position",
+]
+_LIST_STATS = ["net_returns", "r_values"]
+
+# Merge of caller_stats_d rows (e.g. across runs) per caller
+_MERGED_STATS_SELECT = ",\n".join(
+    [f"    SUM({c}) AS {c}" for c in _SUM_STATS]
+    + ["    MAX(max_dd) AS max_dd"]
+    + [f"    flatten(LIST({c})) AS {c}" for c in _LIST_STATS]
+)
+
+# Upsert merge of new trade aggregates into existing rows
+_MERGE_ON_CONFLICT = ",\n".join(
+    [f"    {c} = {c} + EXCLUDED.{c}" for c in _SUM_STATS]
+    + ["    max_dd = GREATEST(max_dd, EXCLUDED.max_dd)"]
+    + [f"    {c} = list_concat({c}, EXCLUDED.{c})" for c in _LIST_STATS]
+)
+
+
+def _stddev_sql(n: str, total: str, sumsq: str) -> str:
+    """Sample standard deviation from count, sum and sum of squares."""
+    return (
+        f"CASE WHEN {n} > 1 THEN "
+        f"SQRT(GREATEST(({sumsq} - {total} * {total} / {n}) / ({n} - 1), 0)) END"
+    )
+
+
+_PROFIT_FACTOR_SQL = """CASE
+            WHEN ABS(sum_neg) < 0.0001 THEN 999.99
+            ELSE sum_win / ABS(sum_neg)
+        END"""
+
+_EXPECTANCY_SQL = """(n_win::DOUBLE / n_trades) * COALESCE(sum_win / NULLIF(n_win, 0), 0)
+        + (1 - n_win::DOUBLE / n_trades) * COALESCE(sum_nonpos / NULLIF(n_nonpos, 0), 0)"""
+
+_RETURN_METRICS_SQL = """
+        n_win::DOUBLE / n_trades AS win_rate,
+        sum_ret / NULLIF(n_ret, 0) AS avg_return,
+        CASE WHEN n_ret > 0 THEN sum_ret END AS total_return,
+        list_aggregate(net_returns, 'median') AS median_return,"""
+
+_WIN_LOSS_PEAK_SQL = """
+        sum_win / NULLIF(n_win, 0) AS avg_win,
+        sum_nonpos / NULLIF(n_nonpos, 0) AS avg_loss,
+        sum_peak / NULLIF(n_peak, 0) AS avg_peak,
+        n_2x::DOUBLE / n_trades AS hit_2x_rate,
+        n_3x::DOUBLE / n_trades AS hit_3x_rate,"""
+
+# Per-version metric columns (same names and meaning as the views) and score
+STATS_SCORE_SQL: Dict[str, Dict[str, str]] = {
+    "v1": {
+        "metrics": _RETURN_METRICS_SQL + _WIN_LOSS_PEAK_SQL + f"""
+        {_PROFIT_FACTOR_SQL} AS profit_factor""",
+        "score": "win_rate * (1 + avg_return)",
+    },
+    "v2": {
+        "metrics": _RETURN_METRICS_SQL + f"""
+        {_stddev_sql("n_ret", "sum_ret", "sumsq_ret")} AS stddev_return,""" + _WIN_LOSS_PEAK_SQL + f"""
+        n_4x::DOUBLE / n_trades AS hit_4x_rate,
+        {_PROFIT_FACTOR_SQL} AS profit_factor,
+        {_EXPECTANCY_SQL} AS expectancy""",
+        "extra": "CASE WHEN stddev_return > 0.001 THEN avg_return / stddev_return ELSE 0 END AS sharpe_approx",
+        "score": """CASE
+            WHEN n_trades < 10 THEN 0
+            ELSE expectancy * LEAST(profit_factor, 5.0) * LN(n_trades + 1)
+        END""",
+    },
+    "v3": {
+        "metrics": _RETURN_METRICS_SQL + f"""
+        {_stddev_sql("n_ret", "sum_ret", "sumsq_ret")} AS stddev_return,""" + _WIN_LOSS_PEAK_SQL + f"""
+        n_4x::DOUBLE / n_trades AS hit_4x_rate,
+        sum_dd / n_trades AS avg_dd,
+        max_dd,
+        {_PROFIT_FACTOR_SQL} AS profit_factor,
+        {_EXPECTANCY_SQL} AS expectancy""",
+        "extra": "CASE WHEN stddev_return > 0.001 THEN avg_return / stddev_return ELSE 0 END AS sharpe_approx",
+        "score": """CASE
+            WHEN n_trades < 10 THEN 0
+            ELSE expectancy * LEAST(profit_factor, 5.0) * (1 - avg_dd) * LN(n_trades + 1)
+        END""",
+    },
+    "v4": {
+        "metrics": f"""
+        n_r_pos::DOUBLE / n_trades AS win_rate,
+        sum_r AS total_r,
+        sum_r / n_trades AS avg_r,
+        list_aggregate(r_values, 'median') AS median_r,
+        {_stddev_sql("n_trades", "sum_r", "sumsq_r")} AS stddev_r,
+        sum_r_pos / NULLIF(n_r_pos, 0) AS avg_winner_r,
+        sum_r_nonpos / NULLIF(n_r_nonpos, 0) AS avg_loser_r,
+        sum_pnl AS total_portfolio_pnl_pct,
+        sum_pnl / n_trades AS avg_portfolio_pnl_pct,
+        sum_ret / NULLIF(n_ret, 0) AS avg_token_return,
+        CASE WHEN n_ret > 0 THEN sum_ret END AS total_token_return,
+        sum_peak / NULLIF(n_peak, 0) AS avg_peak,
+        n_2x::DOUBLE / n_trades AS hit_2x_rate,
+        n_3x::DOUBLE / n_trades AS hit_3x_rate,
+        sum_position / NULLIF(n_position, 0) AS avg_position_pct,
+        CASE
+            WHEN ABS(sum_r_neg) < 0.0001 THEN 999.99
+            ELSE sum_r_pos / ABS(sum_r_neg)
+        END AS profit_factor_r,
+        sum_r / n_trades AS expectancy_r""",
+        "extra": "CASE WHEN stddev_r > 0.001 THEN avg_r / stddev_r ELSE 0 END AS sharpe_r",
+        "score": """CASE
+            WHEN n_trades < 10 THEN 0
+            ELSE expectancy_r * LEAST(profit_factor_r, 5.0) * LN(n_trades + 1)
+        END""",
+    },
+}
+
+
 # =============================================================================
 # Schema and View Management
 # =============================================================================
@@ -350,6 +560,84 @@ def ensure_baseline_trades_schema(con: duckdb.DuckDBPyConnection) -> None:
         CREATE INDEX IF NOT EXISTS trades_run_idx 
         ON baseline.trades_d(run_id);
     """)
+    
+    ensure_caller_stats_schema(con)
+
+
+def ensure_caller_stats_schema(con: duckdb.DuckDBPyConnection) -> None:
+    """
+    Create baseline.caller_stats_d.
+    
+    When the table is new and baseline.trades_d already has trades (a database
+    from before the table existed), it is backfilled from them.
+    """
+    exists = con.execute("""
+        SELECT 1 FROM information_schema.tables
+        WHERE table_schema = 'baseline' AND table_name = 'caller_stats_d'
+    """).fetchone()
+    if exists:
+        return
+    con.execute(CALLER_STATS_TABLE_SQL)
+    rebuild_caller_stats(con)
+
+
+def rebuild_caller_stats(
+    con: duckdb.DuckDBPyConnection,
+    run_ids: Optional[List[str]] = None,
+) -> int:
+    """
+    Recompute caller_stats_d rows from baseline.trades_d.
+    
+    Args:
+        con: DuckDB connection
+        run_ids: Runs to recompute (default: all)
+        
+    Returns:
+        Number of (run_id, caller) rows written
+    """
+    if run_ids is None:
+        con.execute("DELETE FROM baseline.caller_stats_d")
+        where, params = "", []
+    else:
+        con.execute("DELETE FROM baseline.caller_stats_d WHERE list_contains(?, run_id)", [run_ids])
+        where, params = "WHERE list_contains(?, run_id)", [run_ids]
+    
+    con.execute(f"""
+        INSERT INTO baseline.caller_stats_d BY NAME
+        SELECT run_id, caller, {_TRADE_STATS_SELECT}
+        FROM baseline.trades_d
+        {where}
+        GROUP BY run_id, caller
+    """, params)
+    count = con.execute(
+        f"SELECT COUNT(*) FROM baseline.caller_stats_d {where}", params
+    ).fetchone()
+    return int(count[0])
+
+
+def merge_caller_stats(
+    con: duckdb.DuckDBPyConnection,
+    trade_ids: List[str],
+) -> None:
+    """
+    Merge newly inserted trades into caller_stats_d.
+    
+    Aggregates only the given trades and adds them to the existing
+    (run_id, caller) rows: the sums and counts cost O(new trades), but
+    list_concat rewrites each touched row's net_returns / r_values lists
+    (kept for the medians), so that part is O(trades of the touched callers).
+    """
+    if not trade_ids:
+        return
+    con.execute(f"""
+        INSERT INTO baseline.caller_stats_d BY NAME
+        SELECT run_id, caller, {_TRADE_STATS_SELECT}
+        FROM baseline.trades_d
+        WHERE trade_id IN (SELECT UNNEST(?::TEXT[]))
+        GROUP BY run_id, caller
+        ON CONFLICT (run_id, caller) DO UPDATE SET
+{_MERGE_ON_CONFLICT}
+    """, [trade_ids])
 
 
 def create_scoring_views(
@@ -390,80 +678,66 @@ def get_caller_leaderboard(
     min_trades: int = 10,
     limit: int = 50,
     run_id: Optional[str] = None,
+    run_ids: Optional[List[str]] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Get caller leaderboard from a scoring view.
+    Get caller leaderboard from the materialized caller stats.
+    
+    Reads pre-aggregated baseline.caller_stats_d rows, merges them per caller
+    across the selected runs, and ranks them by the version's score. Columns
+    match the baseline.caller_scored_{version} view.
     
     Args:
         con: DuckDB connection
-        version: Score version (v1, v2, v3)
+        version: Score version (v1, v2, v3, v4)
         min_trades: Minimum trades to be included
         limit: Max number of callers to return
         run_id: If set, filter to trades from this run only
+        run_ids: If set, merge stats across these runs only
         
     Returns:
         List of caller dicts with scores and stats
     """
-    view_name = f"baseline.caller_scored_{version}"
+    if version not in STATS_SCORE_SQL:
+        raise ValueError(f"Unknown score version: {version}")
+    spec = STATS_SCORE_SQL[version]
     
-    # Check if view exists
     try:
-        con.execute(f"SELECT 1 FROM {view_name} LIMIT 1")
+        con.execute("SELECT 1 FROM baseline.caller_stats_d LIMIT 1")
     except duckdb.CatalogException:
-        # View doesn't exist, try to create it
-        create_scoring_views(con, [version])
+        ensure_baseline_trades_schema(con)
     
-    # If filtering by run_id, we need to use a modified query
     if run_id:
-        sql = f"""
-            WITH filtered_trades AS (
-                SELECT * FROM baseline.trades_d WHERE run_id = '{run_id}'
-            ),
-            caller_stats AS (
-                SELECT
-                    caller,
-                    COUNT(*) AS n_trades,
-                    SUM(CASE WHEN net_return > 0 THEN 1 ELSE 0 END)::DOUBLE / COUNT(*) AS win_rate,
-                    AVG(net_return) AS avg_return,
-                    SUM(net_return) AS total_return,
-                    MEDIAN(net_return) AS median_return,
-                    AVG(CASE WHEN net_return > 0 THEN net_return END) AS avg_win,
-                    AVG(CASE WHEN net_return <= 0 THEN net_return END) AS avg_loss,
-                    AVG(peak_mult) AS avg_peak,
-                    SUM(CASE WHEN peak_mult >= 2.0 THEN 1 ELSE 0 END)::DOUBLE / COUNT(*) AS hit_2x_rate,
-                    CASE 
-                        WHEN ABS(SUM(CASE WHEN net_return < 0 THEN net_return ELSE 0 END)) < 0.0001 THEN 999.99
-                        ELSE SUM(CASE WHEN net_return > 0 THEN net_return ELSE 0 END) / 
-                             ABS(SUM(CASE WHEN net_return < 0 THEN net_return ELSE 0 END))
-                    END AS profit_factor,
-                    (SUM(CASE WHEN net_return > 0 THEN 1 ELSE 0 END)::DOUBLE / COUNT(*)) 
-                        * COALESCE(AVG(CASE WHEN net_return > 0 THEN net_return END), 0)
-                    + (1 - SUM(CASE WHEN net_return > 0 THEN 1 ELSE 0 END)::DOUBLE / COUNT(*))
-                        * COALESCE(AVG(CASE WHEN net_return <= 0 THEN net_return END), 0)
-                    AS expectancy
-                FROM filtered_trades
-                GROUP BY caller
-            )
+        run_ids = [run_id]
+    where, params = "", []
+    if run_ids is not None:
+        where, params = "WHERE list_contains(?, run_id)", [list(run_ids)]
+    
+    extra = f"{spec['extra']},\n            " if "extra" in spec else ""
+    sql = f"""
+        WITH merged AS (
             SELECT
-                *,
-                CASE 
-                    WHEN n_trades < 10 THEN 0
-                    ELSE expectancy * LEAST(profit_factor, 5.0) * LN(n_trades + 1)
-                END AS score
-            FROM caller_stats
-            WHERE n_trades >= {min_trades}
-            ORDER BY score DESC
-            LIMIT {limit}
-        """
-    else:
-        sql = f"""
-            SELECT * FROM {view_name}
-            WHERE n_trades >= {min_trades}
-            ORDER BY score DESC
-            LIMIT {limit}
-        """
-    
-    result = con.execute(sql).fetchall()
+                caller,
+{_MERGED_STATS_SELECT}
+            FROM baseline.caller_stats_d
+            {where}
+            GROUP BY caller
+        ),
+        caller_stats AS (
+            SELECT
+                caller,
+                n_trades,{spec["metrics"]}
+            FROM merged
+            WHERE n_trades >= ?
+        )
+        SELECT
+            *,
+            {extra}{spec["score"]} AS score
+        FROM caller_stats
+        ORDER BY score DESC
+        LIMIT ?
+    """
+    result = con.execute(sql, params + [min_trades, limit]).fetchall()
     cols = [d[0] for d in con.description]
     
     return [dict(zip(cols, row)) for row in result]
@@ -503,6 +777,7 @@ def insert_trades_from_results(
     """
     Insert trade results into baseline.trades_d.
     
+    The inserted trades are merged into baseline.caller_stats_d.
     Results should be enriched with risk fields from enrich_results_with_risk().
     
     Args:
@@ -519,6 +794,7 @@ def insert_trades_from_results(
     import uuid
     
     rows_inserted = 0
+    inserted_ids: List[str] = []
     for r in results:
         trade_id = uuid.uuid4().hex
         
@@ -629,9 +905,12 @@ def insert_trades_from_results(
                 net_return > 0,
             ])
             rows_inserted += 1
+            inserted_ids.append(trade_id)
         except Exception as e:
             print(f"Warning: Failed to insert trade: {e}")
     
+    merge_caller_stats(con, inserted_ids)
+    
     return rows_inserted
 
 
@@ -68,6 +68,23 @@ class ClickHouseCfg:
         )
 
 
+def load_coverage_index(
+    duckdb_path: str,
+    chain: str,
+    mints: Set[str],
+    interval_seconds: int,
+):
+    """
+    Load the candle coverage index for these tokens from DuckDB.
+
+    Returns None if the index has not been built for this interval
+    (see tools/storage/build_coverage_index.py).
+    """
+    from tools.shared.coverage_index import open_coverage_index
+
+    return open_coverage_index(duckdb_path, interval_seconds, chain=chain, mints=mints)
+
+
 def query_coverage_batched(
     cfg: ClickHouseCfg,
     chain: str,
@@ -77,6 +94,7 @@ def query_coverage_batched(
     date_to: datetime,
     ch_batch: int = 1000,
     parallel: int = 4,
+    coverage_index: Optional[Any] = None,
 ) -> Dict[str, int]:
     """
     Query candle counts per token from ClickHouse.
@@ -84,6 +102,9 @@ def query_coverage_batched(
     Uses batched IN() lists to avoid query string explosions.
     Runs batches in parallel for speed.
 
+    If coverage_index (tools.shared.coverage_index.CoverageIndex) has this
+    interval indexed, counts are read from it and ClickHouse is not queried.
+
     Args:
         cfg: ClickHouse configuration
         chain: Chain name
@@ -93,6 +114,7 @@ def query_coverage_batched(
         date_to: End date (exclusive of next day)
         ch_batch: Max mints per IN() clause
         parallel: Number of parallel workers
+        coverage_index: Optional coverage index to answer from
 
     Returns:
         Dict mapping mint address to candle count
@@ -100,6 +122,15 @@ def query_coverage_batched(
     if not mints:
         return {}
 
+    if coverage_index is not None and coverage_index.is_indexed(interval_seconds):
+        first_ts = int(date_from.astimezone(UTC).timestamp())
+        end_ts = int((date_to + timedelta(days=1)).astimezone(UTC).timestamp())
+        counts = {
+            mint: coverage_index.candle_count(chain, mint, interval_seconds, first_ts, end_ts - 1)
+            for mint in mints
+        }
+        return {mint: count for mint, count in counts.items() if count > 0}
+
     chain_q = sql_escape(chain)
     mints_list = sorted(mints)
     chunks = list(batched(mints_list, ch_batch))
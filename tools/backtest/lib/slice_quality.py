@@ -11,10 +11,21 @@ Provides functions to analyze candle data quality:
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
+# Add tools directory to path for shared imports (tools.shared.candle_runs)
+_tools_dir = Path(__file__).resolve().parent.parent.parent.parent
+if str(_tools_dir) not in sys.path:
+    sys.path.insert(0, str(_tools_dir))
+
+from tools.shared.candle_runs import gap_runs  # noqa: E402
+
 UTC = timezone.utc
 
 
@@ -93,30 +104,17 @@ def analyze_candles(
         return int(ts)
     
     # Extract and sort by timestamp
-    timestamps: List[int] = []
-    for candle in candles:
-        ts = to_unix(candle[1])
-        timestamps.append(ts)
-    
-    timestamps.sort()
+    timestamps = np.sort(np.fromiter((to_unix(c[1]) for c in candles), dtype=np.int64, count=len(candles)))
     metrics.total_candles = len(timestamps)
     
     # Detect duplicates
-    seen: set = set()
-    duplicates = 0
-    unique_timestamps: List[int] = []
-    for ts in timestamps:
-        if ts in seen:
-            duplicates += 1
-        else:
-            seen.add(ts)
-            unique_timestamps.append(ts)
-    metrics.duplicates = duplicates
+    unique_timestamps = np.unique(timestamps)
+    metrics.duplicates = len(timestamps) - len(unique_timestamps)
     
     # Calculate expected candles from time range
-    if unique_timestamps:
-        min_ts = unique_timestamps[0]
-        max_ts = unique_timestamps[-1]
+    if len(unique_timestamps):
+        min_ts = int(unique_timestamps[0])
+        max_ts = int(unique_timestamps[-1])
         
         # Use provided bounds or infer from data
         start_ts = expected_start_ts if expected_start_ts is not None else min_ts
@@ -125,58 +123,43 @@ def analyze_candles(
         time_span = max(0, end_ts - start_ts)
         metrics.expected_candles = max(1, (time_span // interval_seconds) + 1)
     
-    # Analyze gaps
-    gap_details: List[Dict[str, Any]] = []
-    total_missing = 0
-    gap_segments = 0
-    
-    for i in range(1, len(unique_timestamps)):
-        prev_ts = unique_timestamps[i - 1]
-        curr_ts = unique_timestamps[i]
-        diff = curr_ts - prev_ts
+    # Analyze gaps (steps wider than 1.5x interval, i.e. 50% tolerance)
+    gaps = gap_runs(unique_timestamps, interval_seconds, tolerance=1.5)
+    metrics.gaps = int(gaps['missing_candles'].sum())
+    metrics.gap_segments = len(gaps['index'])
+    metrics.gap_details = [
+        {
+            "start": int(start),
+            "end": int(end),
+            "missing_candles": int(missing),
+            "gap_seconds": int(seconds),
+        }
+        for start, end, missing, seconds in zip(
+            gaps['start'], gaps['end'], gaps['missing_candles'], gaps['gap_seconds']
+        )
+    ]
+    
+    # Analyze OHLC quality over (token_address, timestamp, open, high, low, close, volume)
+    rows = [c for c in candles if len(c) >= 7]
+    if rows:
+        # None -> NaN: NaN fails every comparison below, as None was skipped
+        def column(i: int) -> np.ndarray:
+            return np.array([c[i] for c in rows], dtype=np.float64)
         
-        if diff > interval_seconds * 1.5:  # Allow 50% tolerance
-            missing_count = (diff // interval_seconds) - 1
-            total_missing += missing_count
-            gap_segments += 1
-            
-            gap_details.append({
-                "start": prev_ts,
-                "end": curr_ts,
-                "missing_candles": missing_count,
-                "gap_seconds": diff,
-            })
-    
-    metrics.gaps = total_missing
-    metrics.gap_segments = gap_segments
-    metrics.gap_details = gap_details
-    
-    # Analyze OHLC quality
-    distortions = 0
-    zero_volume = 0
-    negative_values = 0
-    
-    for candle in candles:
-        # candle: (token_address, timestamp, open, high, low, close, volume)
-        if len(candle) >= 7:
-            open_p, high_p, low_p, close_p, vol = candle[2], candle[3], candle[4], candle[5], candle[6]
-            
-            # Check for negative/zero prices
-            if open_p is not None and high_p is not None and low_p is not None and close_p is not None:
-                if any(x <= 0 for x in [open_p, high_p, low_p, close_p] if x is not None):
-                    negative_values += 1
-                
-                # Check OHLC constraints
-                if high_p < low_p or open_p > high_p or open_p < low_p or close_p > high_p or close_p < low_p:
-                    distortions += 1
-            
-            # Check volume
-            if vol is not None and (vol == 0 or vol is None):
-                zero_volume += 1
-    
-    metrics.distortions = distortions
-    metrics.zero_volume = zero_volume
-    metrics.negative_values = negative_values
+        open_p, high_p, low_p, close_p, vol = (column(i) for i in range(2, 7))
+        priced = ~(np.isnan(open_p) | np.isnan(high_p) | np.isnan(low_p) | np.isnan(close_p))
+        
+        # Check for negative/zero prices
+        metrics.negative_values = int(np.count_nonzero(
+            priced & ((open_p <= 0) | (high_p <= 0) | (low_p <= 0) | (close_p <= 0))
+        ))
+        # Check OHLC constraints
+        metrics.distortions = int(np.count_nonzero(priced & (
+            (high_p < low_p) | (open_p > high_p) | (open_p < low_p)
+            | (close_p > high_p) | (close_p < low_p)
+        )))
+        # Check volume
+        metrics.zero_volume = int(np.count_nonzero(vol == 0))
     
     # Calculate derived metrics
     if metrics.expected_candles > 0:
@@ -14,12 +14,17 @@ All strategies return ExitResult with:
 - exit_reason: str
 - peak_mult: float
 - hit_milestones: Dict[str, bool]
+
+evaluate_stops() runs several stop strategies at once over candle arrays
+(see trade_simulator.simulate_trade_grid_arrays).
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime as dt_class
 
+import numpy as np
+
 
 @dataclass
 class ExitResult:
@@ -322,6 +327,110 @@ def _parse_timestamp_ms(ts_val) -> int:
         raise ValueError(f"Unknown timestamp type: {type(ts_val)}")
 
 
+MILESTONES = (2, 3, 4, 5, 10)
+
+
+def evaluate_stops(
+    ts_ms: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entry_price: float,
+    entry_ts_ms: int,
+    reference_price: float,
+    stops: Sequence[Tuple[str, Dict[str, Any]]],
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate stop strategies over the candles after entry, as arrays.
+    
+    Array counterpart of static_stop / trailing_stop: every stop is evaluated
+    against the same candles with one (stops x candles) comparison, giving
+    the same exits as the per-candle loops.
+    
+    The phase 1 -> 2 advance only happens at 2x (phases[0].target_mult == 2.0),
+    as in the loops, so a trailing stop level is the running peak times
+    (1 - stop_pct of the current phase) and a static level is constant per phase.
+    
+    Args:
+        ts_ms: Candle timestamps (ms) from the entry candle on, int64
+        high, low, close: Candle prices, float64
+        entry_price: Actual entry price
+        entry_ts_ms: Entry timestamp (ms)
+        reference_price: Static stop anchor (alert or entry price)
+        stops: [(kind, params), ...] with kind a key of STOP_STRATEGIES and
+               params holding phases (and optionally max_duration_hrs)
+    
+    Returns:
+        Dict of arrays (one value per stop): exit_price, exit_ts_ms,
+        exit_reason (object), peak_mult, hit_2x .. hit_10x, ath_multiple
+    """
+    n_stops = len(stops)
+    n = len(ts_ms)
+    out: Dict[str, np.ndarray] = {
+        'exit_price': np.full(n_stops, float(entry_price)),
+        'exit_ts_ms': np.full(n_stops, int(entry_ts_ms), dtype=np.int64),
+        'exit_reason': np.full(n_stops, 'no_data', dtype=object),
+        'peak_mult': np.ones(n_stops),
+        'ath_multiple': np.ones(n_stops),
+    }
+    for m in MILESTONES:
+        out[f'hit_{m}x'] = np.zeros(n_stops, dtype=bool)
+    if n == 0 or n_stops == 0:
+        return out
+    
+    # Running peak (starting from entry) and first 2x candle
+    peak = np.maximum.accumulate(np.maximum(high, entry_price))
+    two_x = entry_price * 2.0
+    k_2x = int((high >= two_x).argmax()) if (high >= two_x).any() else n
+    elapsed_hrs = (ts_ms - entry_ts_ms) / (1000 * 3600)
+    after_2x = np.arange(n) >= k_2x
+    
+    levels = np.empty((n_stops, n))
+    cutoff = np.empty(n_stops, dtype=np.int64)
+    advances = np.zeros(n_stops, dtype=bool)
+    for i, (kind, params) in enumerate(stops):
+        phases = params['phases']
+        advances[i] = len(phases) > 1 and phases[0].target_mult == 2.0
+        stop_1 = phases[0].stop_pct
+        stop_2 = phases[1].stop_pct if advances[i] else stop_1
+        if kind == 'trailing':
+            levels[i] = peak * np.where(advances[i] & after_2x, 1.0 - stop_2, 1.0 - stop_1)
+        elif kind == 'static':
+            levels[i] = np.where(
+                advances[i] & after_2x,
+                two_x * (1.0 - stop_2),
+                reference_price * (1.0 - stop_1),
+            )
+        else:
+            raise ValueError(f"Unknown stop strategy: {kind}")
+        timed_out = elapsed_hrs >= params.get('max_duration_hrs', 48.0)
+        cutoff[i] = int(timed_out.argmax()) if timed_out.any() else n
+    
+    # First stop hit before the duration cutoff
+    hit = (low[None, :] <= levels) & (np.arange(n)[None, :] < cutoff[:, None])
+    stopped = hit.any(axis=1)
+    stop_idx = np.where(stopped, hit.argmax(axis=1), n)
+    
+    rows = np.arange(n_stops)
+    # Last candle whose high was seen (-1: none, exit on the first candle's duration check)
+    last_seen = np.where(stopped, stop_idx, np.minimum(cutoff, n) - 1)
+    peak_price = np.where(last_seen >= 0, peak[np.maximum(last_seen, 0)], entry_price)
+    exit_idx = np.where(stopped, stop_idx, np.minimum(cutoff, n - 1))
+    
+    out['exit_price'] = np.where(stopped, levels[rows, np.minimum(stop_idx, n - 1)], close[exit_idx])
+    out['exit_ts_ms'] = ts_ms[exit_idx].astype(np.int64)
+    phase = np.where(advances & (stop_idx >= k_2x), 2, 1)
+    out['exit_reason'] = np.array(
+        [f"stopped_phase{p}" if s else "end_of_data" for s, p in zip(stopped, phase)],
+        dtype=object,
+    )
+    out['peak_mult'] = peak_price / entry_price
+    out['ath_multiple'] = out['peak_mult'].copy()
+    for m in MILESTONES:
+        out[f'hit_{m}x'] = peak_price >= entry_price * float(m)
+    return out
+
+
 # Stop strategy registry
 STOP_STRATEGIES = {
     'static': static_stop,
@@ -20,8 +20,9 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass, field
 from statistics import median
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 
 # =============================================================================
 # STRESS LANE CONFIGURATION
@@ -596,3 +597,319 @@ def print_lane_matrix(champions: List[ChampionValidationResult]) -> None:
         print(f"  Worst lane: {winner.lane_score_result.worst_lane}")
         print("=" * 80)
 
+
+
+# =============================================================================
+# MATRIX EVALUATION (all champions × all lanes at once)
+# =============================================================================
+# The per-pair functions above evaluate one (candidate, lane) at a time in
+# Python. The functions below take arrays for all candidates and a lanes
+# table and return (candidate × lane) arrays, so stress validation costs one
+# vectorized pass instead of C×L Python calls (and C×L backtest re-runs).
+
+LANE_COLUMNS = ("fee_bps", "slippage_bps", "latency_candles", "stop_gap_prob", "stop_gap_mult")
+
+
+def lanes_table(lanes: List[StressLane]) -> Dict[str, np.ndarray]:
+    """Lane configs as column arrays of shape (L,)."""
+    return {col: np.array([getattr(l, col) for l in lanes], dtype=np.float64) for col in LANE_COLUMNS}
+
+
+def simulate_lanes_analytical_matrix(
+    base_test_r: Sequence[float],
+    win_rate: Sequence[float],
+    n_trades: Sequence[int],
+    avg_r_loss: Sequence[float],
+    lanes: List[StressLane],
+    base_slippage_bps: float = 50.0,
+) -> np.ndarray:
+    """
+    Vectorized simulate_lane_stress_analytical for C candidates × L lanes.
+
+    Args:
+        base_test_r, win_rate, n_trades, avg_r_loss: Per-candidate arrays (C,)
+        lanes: Stress lanes (L)
+        base_slippage_bps: Slippage used in the base backtests
+
+    Returns:
+        stressed_r array of shape (C, L)
+    """
+    t = lanes_table(lanes)
+    base_r = np.asarray(base_test_r, dtype=np.float64)[:, None]
+    n = np.asarray(n_trades, dtype=np.float64)[:, None]
+    wr = np.asarray(win_rate, dtype=np.float64)[:, None]
+    loss_r = np.abs(np.asarray(avg_r_loss, dtype=np.float64))[:, None]
+
+    slippage_hit = (t["slippage_bps"] - base_slippage_bps) / 10000.0 * n
+    fee_hit = np.where(t["fee_bps"] > 30.0, (t["fee_bps"] - 30.0) / 10000.0 * n, 0.0)
+    n_losses = np.trunc(n * (1.0 - wr))
+    n_gapped = np.trunc(n_losses * t["stop_gap_prob"])
+    gap_hit = loss_r * (t["stop_gap_mult"] - 1.0) * n_gapped
+    latency_hit = 0.005 * t["latency_candles"] * n
+
+    stressed = base_r - (slippage_hit + fee_hit + gap_hit + latency_hit)
+    return np.where(n > 0, stressed, 0.0)
+
+
+@dataclass
+class TradeArrays:
+    """
+    Per-trade outcomes for C candidates, padded to (C, T).
+
+    returns are tp_sl_ret values from the run that produced them (with
+    fee_bps/slippage_bps costs); mask marks real trades. n_ok counts all
+    status == 'ok' rows (the win-rate denominator in summarize_tp_sl), which
+    can exceed the number of trades when some rows have no tp_sl_ret.
+    """
+    returns: np.ndarray          # (C, T) net return per trade
+    is_sl: np.ndarray            # (C, T) bool, exit_reason == 'sl'
+    mask: np.ndarray             # (C, T) bool
+    sl_mult: np.ndarray          # (C,) stop-loss multiplier (R unit = 1 - sl_mult)
+    n_ok: Optional[np.ndarray] = None  # (C,) defaults to mask.sum(axis=1)
+    fee_bps: float = 0.0
+    slippage_bps: float = 0.0
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows_per_candidate: Sequence[List[Dict[str, Any]]],
+        sl_mults: Sequence[float],
+        fee_bps: float = 0.0,
+        slippage_bps: float = 0.0,
+    ) -> "TradeArrays":
+        """Build from run_tp_sl_query rows (status == 'ok' rows with a tp_sl_ret)."""
+        n_ok = [sum(1 for r in rows if r.get("status") == "ok") for rows in rows_per_candidate]
+        trades = [
+            [(float(r["tp_sl_ret"]), r.get("tp_sl_exit_reason") == "sl")
+             for r in rows
+             if r.get("status") == "ok" and r.get("tp_sl_ret") is not None and not math.isnan(r["tp_sl_ret"])]
+            for rows in rows_per_candidate
+        ]
+        width = max((len(t) for t in trades), default=0)
+        returns = np.zeros((len(trades), width))
+        is_sl = np.zeros((len(trades), width), dtype=bool)
+        mask = np.zeros((len(trades), width), dtype=bool)
+        for c, t in enumerate(trades):
+            if t:
+                returns[c, :len(t)] = [x[0] for x in t]
+                is_sl[c, :len(t)] = [x[1] for x in t]
+                mask[c, :len(t)] = True
+        return cls(
+            returns=returns,
+            is_sl=is_sl,
+            mask=mask,
+            sl_mult=np.asarray(sl_mults, dtype=np.float64),
+            n_ok=np.asarray(n_ok, dtype=np.float64),
+            fee_bps=fee_bps,
+            slippage_bps=slippage_bps,
+        )
+
+
+def recost_returns(
+    returns: np.ndarray,
+    from_fee_bps: float,
+    from_slippage_bps: float,
+    to_fee_bps: np.ndarray,
+    to_slippage_bps: np.ndarray,
+) -> np.ndarray:
+    """
+    Re-price trade returns under different costs.
+
+    Inverts the tp_sl_query return formula
+        ret = X * (1 - (fee + slip)/1e4) / (1 + slip/1e4) - 1
+    to the gross exit multiple X, then re-applies the new costs. Exit
+    decisions do not depend on costs, so this is exact.
+
+    Args:
+        returns: (..., T) returns priced with from_* costs
+        to_fee_bps, to_slippage_bps: (L,) target costs
+
+    Returns:
+        (..., L, T) returns
+    """
+    gross = (returns + 1.0) * (1.0 + from_slippage_bps / 10000.0) / (
+        1.0 - (from_fee_bps + from_slippage_bps) / 10000.0
+    )
+    fee = np.asarray(to_fee_bps, dtype=np.float64)[:, None]
+    slip = np.asarray(to_slippage_bps, dtype=np.float64)[:, None]
+    return gross[..., None, :] * (1.0 - (fee + slip) / 10000.0) / (1.0 + slip / 10000.0) - 1.0
+
+
+def recost_rows(
+    rows: List[Dict[str, Any]],
+    fee_bps: float,
+    slippage_bps: float,
+    from_fee_bps: float = 0.0,
+    from_slippage_bps: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """
+    run_tp_sl_query rows with tp_sl_ret re-priced under one lane's costs.
+
+    tp_sl_ret is the only cost-dependent field, so summarize_tp_sl over the
+    result equals summarizing a full run at fee_bps / slippage_bps. Rows
+    without a usable tp_sl_ret are passed through unchanged.
+    """
+    priced = [
+        i for i, r in enumerate(rows)
+        if r.get("tp_sl_ret") is not None and not math.isnan(r["tp_sl_ret"])
+    ]
+    if not priced:
+        return list(rows)
+    returns = recost_returns(
+        np.array([rows[i]["tp_sl_ret"] for i in priced], dtype=np.float64),
+        from_fee_bps, from_slippage_bps, np.array([fee_bps]), np.array([slippage_bps]),
+    )[0]
+    out = list(rows)
+    for i, ret in zip(priced, returns.tolist()):
+        out[i] = {**rows[i], "tp_sl_ret": ret}
+    return out
+
+
+def simulate_lanes_from_trades(
+    trades: TradeArrays,
+    lanes: List[StressLane],
+    gap_model: str = "expected",
+    gap_threshold: float = 0.15,
+    seed: int = 0,
+) -> Dict[str, np.ndarray]:
+    """
+    Re-simulate all lanes from trade-level outcomes.
+
+    Fees and slippage are re-priced exactly per trade. Entry latency cannot
+    be derived from trade outcomes: pass a TradeArrays produced by a run with
+    the lane's entry_delay_candles (see group_lanes_by_latency).
+
+    Stop gaps are applied to lanes with stop_gap_prob > gap_threshold (the
+    baseline gap rate is assumed to be in the data already):
+    - "expected": extra = |avg_r_loss| × (mult - 1) × int(n_losses × prob),
+      same as the full-run validation formula
+    - "sampled": that many stop-loss exits (chosen by a seeded draw, capped
+      at the number of stop exits) lose mult × their R instead of 1×
+
+    Returns:
+        Dict of (C, L) arrays: stressed_r, total_r, avg_r, win_rate,
+        avg_r_loss, gap_r, n_trades
+    """
+    if gap_model not in ("expected", "sampled"):
+        raise ValueError(f"gap_model must be 'expected' or 'sampled', got {gap_model!r}")
+    t = lanes_table(lanes)
+    n_lanes = len(lanes)
+
+    rets = recost_returns(trades.returns, trades.fee_bps, trades.slippage_bps, t["fee_bps"], t["slippage_bps"])
+    mask = trades.mask[:, None, :]                                        # (C, 1, T)
+    max_loss = 1.0 - trades.sl_mult
+    max_loss = np.where(max_loss <= 0, 0.5, max_loss)[:, None, None]      # (C, 1, 1)
+    r = np.where(mask, rets / max_loss, 0.0)                               # (C, L, T)
+
+    n_valid = mask.sum(axis=2).astype(np.float64)                          # (C, 1)
+    n_ok = n_valid if trades.n_ok is None else np.asarray(trades.n_ok, dtype=np.float64)[:, None]
+    n_b = np.broadcast_to(n_ok, (len(max_loss), n_lanes))
+    wins = ((rets > 0) & mask).sum(axis=2)
+    loss_mask = (r <= 0) & mask
+    n_loss_r = loss_mask.sum(axis=2)
+    sum_loss_r = np.where(loss_mask, r, 0.0).sum(axis=2)
+
+    total_r = r.sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_rate = np.where(n_b > 0, wins / n_b, 0.0)
+        avg_r = np.where(n_valid > 0, total_r / n_valid, 0.0)
+        avg_r_loss = np.where(n_loss_r > 0, sum_loss_r / n_loss_r, 0.0)
+
+    gapped_lane = t["stop_gap_prob"] > gap_threshold                       # (L,)
+    n_gapped = np.trunc(np.trunc(n_b * (1.0 - win_rate)) * t["stop_gap_prob"])
+
+    if gap_model == "expected":
+        gap_r = np.abs(avg_r_loss) * (t["stop_gap_mult"] - 1.0) * n_gapped
+    else:
+        # Rank stop exits by a seeded key; the first n_gapped per (C, L) gap
+        stops = loss_mask & trades.is_sl[:, None, :]
+        keys = np.random.default_rng(seed).random(trades.returns.shape)
+        keys = np.where(stops, keys[:, None, :], np.inf)
+        rank = np.argsort(np.argsort(keys, axis=2, kind="stable"), axis=2, kind="stable")
+        gapped = stops & (rank < n_gapped[..., None])
+        gap_r = (np.abs(np.where(gapped, r, 0.0)) * (t["stop_gap_mult"] - 1.0)[:, None]).sum(axis=2)
+
+    gap_r = np.where(gapped_lane, gap_r, 0.0)
+    return {
+        "stressed_r": total_r - gap_r,
+        "total_r": total_r,
+        "avg_r": avg_r,
+        "win_rate": win_rate,
+        "avg_r_loss": avg_r_loss,
+        "gap_r": gap_r,
+        "n_trades": n_b,
+    }
+
+
+def group_lanes_by_latency(lanes: List[StressLane]) -> Dict[int, List[int]]:
+    """Lane indices grouped by latency_candles (one backtest run per group)."""
+    groups: Dict[int, List[int]] = {}
+    for i, lane in enumerate(lanes):
+        groups.setdefault(int(lane.latency_candles), []).append(i)
+    return groups
+
+
+@dataclass
+class LaneMatrixResult:
+    """Stressed R and maximin scores for C candidates × L lanes."""
+    lane_names: List[str]
+    stressed_r: np.ndarray       # (C, L)
+    robust_score: np.ndarray     # (C,) min over lanes
+    median_score: np.ndarray     # (C,)
+    p25_score: np.ndarray        # (C,)
+    mean_score: np.ndarray       # (C,)
+    worst_lane_idx: np.ndarray   # (C,)
+    lanes_passing: np.ndarray    # (C,)
+
+    def lane_score_result(self, c: int) -> LaneScoreResult:
+        """Candidate c as a LaneScoreResult (same values as compute_lane_scores)."""
+        if not self.lane_names:
+            return compute_lane_scores({})
+        worst = int(self.worst_lane_idx[c])
+        return LaneScoreResult(
+            lane_scores={name: float(self.stressed_r[c, j]) for j, name in enumerate(self.lane_names)},
+            lane_details={},
+            robust_score=float(self.robust_score[c]),
+            median_score=float(self.median_score[c]),
+            p25_score=float(self.p25_score[c]),
+            mean_score=float(self.mean_score[c]),
+            worst_lane=self.lane_names[worst],
+            worst_lane_score=float(self.stressed_r[c, worst]),
+            lanes_passing=int(self.lanes_passing[c]),
+            lanes_total=len(self.lane_names),
+        )
+
+    def lane_score_results(self) -> List[LaneScoreResult]:
+        return [self.lane_score_result(c) for c in range(self.stressed_r.shape[0])]
+
+
+def compute_lane_scores_matrix(
+    stressed_r: np.ndarray,
+    lane_names: List[str],
+    min_score_threshold: float = 0.0,
+) -> LaneMatrixResult:
+    """
+    Vectorized compute_lane_scores over a (C, L) stressed R matrix.
+
+    Percentile conventions match compute_lane_scores: median = sorted[L // 2],
+    p25 = sorted[max(0, L // 4 - 1)] for L >= 4 else sorted[0].
+    """
+    stressed_r = np.asarray(stressed_r, dtype=np.float64).reshape(-1, len(lane_names))
+    n_cand, n = stressed_r.shape
+    if n == 0:
+        empty = np.full(n_cand, -999.0)
+        zeros = np.zeros(n_cand)
+        return LaneMatrixResult(lane_names, stressed_r, empty, zeros, zeros, zeros,
+                                np.zeros(n_cand, dtype=int), np.zeros(n_cand, dtype=int))
+    s = np.sort(stressed_r, axis=1)
+    p25_idx = max(0, n // 4 - 1) if n >= 4 else 0
+    return LaneMatrixResult(
+        lane_names=list(lane_names),
+        stressed_r=stressed_r,
+        robust_score=s[:, 0],
+        median_score=s[:, n // 2],
+        p25_score=s[:, p25_idx],
+        mean_score=stressed_r.mean(axis=1),
+        worst_lane_idx=np.argmin(stressed_r, axis=1),
+        lanes_passing=(stressed_r >= min_score_threshold).sum(axis=1),
+    )
@@ -0,0 +1,164 @@
+"""
+Successive Halving (multi-fidelity) trial scheduling.
+
+Most random-search trials are obviously bad after a fraction of the data.
+Instead of evaluating every sampled parameter set on all folds and all alerts:
+
+1. Evaluate every trial at the smallest budget (alert subsample or fold subset)
+2. Keep the top 1/eta by score, re-evaluate them at eta× the budget
+3. Repeat until the survivors are evaluated at the full budget (1.0)
+
+With eta=3 and min_budget=1/9 the rungs are 1/9, 1/3, 1 and total cost is
+about n/3 full evaluations instead of n.
+
+Budgets are nested: the alerts kept at budget b are a subset of those kept
+at any larger budget (stable hash order), so a promoted trial only ever sees
+more of the same data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple, TypeVar
+
+from .alerts import Alert
+
+T = TypeVar("T")
+Fold = Tuple[List[Alert], List[Alert], str]
+
+RESOURCES = ("alerts", "folds")
+
+
+@dataclass
+class HalvingConfig:
+    """Successive halving schedule."""
+    eta: int = 3                   # Keep top 1/eta at each rung
+    min_budget: float = 1 / 9      # Budget fraction of the first rung
+    resource: str = "alerts"       # "alerts" (subsample within folds) or "folds" (fold subset)
+    min_alerts: int = 5            # Floor on alerts per fold split at partial budgets
+
+    def __post_init__(self):
+        if self.eta < 2:
+            raise ValueError(f"eta must be >= 2, got {self.eta}")
+        if not 0 < self.min_budget <= 1:
+            raise ValueError(f"min_budget must be in (0, 1], got {self.min_budget}")
+        if self.resource not in RESOURCES:
+            raise ValueError(f"resource must be one of {RESOURCES}, got {self.resource!r}")
+
+    def rungs(self) -> List[float]:
+        """Budget fractions per rung, ending at 1.0."""
+        n = int(math.floor(math.log(1 / self.min_budget) / math.log(self.eta) + 1e-9))
+        return [float(self.eta) ** -(n - i) for i in range(n + 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "eta": self.eta,
+            "min_budget": self.min_budget,
+            "resource": self.resource,
+            "min_alerts": self.min_alerts,
+            "rungs": self.rungs(),
+        }
+
+
+@dataclass
+class RungRecord:
+    """One evaluation of one candidate at one budget."""
+    candidate: int        # Index into the candidate list
+    rung: int
+    budget: float
+    score: float
+    promoted: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rung": self.rung,
+            "budget": self.budget,
+            "score": self.score,
+            "promoted": self.promoted,
+        }
+
+
+def _alert_order_key(alert: Alert) -> str:
+    return hashlib.sha1(f"{alert.mint}:{alert.ts_ms}".encode()).hexdigest()
+
+
+def subsample_alerts(alerts: List[Alert], budget: float, min_alerts: int = 0) -> List[Alert]:
+    """
+    Deterministic nested subsample of alerts.
+
+    Keeps the first ceil(budget * n) alerts in stable hash order (at least
+    min_alerts), returned in their original order.
+    """
+    n = len(alerts)
+    if budget >= 1.0 or n == 0:
+        return list(alerts)
+    k = min(n, max(int(math.ceil(budget * n)), min_alerts))
+    keep = set(sorted(range(n), key=lambda i: _alert_order_key(alerts[i]))[:k])
+    return [a for i, a in enumerate(alerts) if i in keep]
+
+
+def budget_folds(folds: List[Fold], budget: float, config: HalvingConfig) -> List[Fold]:
+    """Folds to evaluate at a budget fraction."""
+    if budget >= 1.0:
+        return folds
+    if config.resource == "folds" and len(folds) > 1:
+        # Evenly spaced subset, always including the most recent fold
+        k = max(1, int(math.ceil(budget * len(folds))))
+        step = len(folds) / k
+        idx = sorted({len(folds) - 1 - int(i * step) for i in range(k)})
+        return [folds[i] for i in idx]
+    return [
+        (
+            subsample_alerts(train, budget, config.min_alerts),
+            subsample_alerts(test, budget, config.min_alerts),
+            name,
+        )
+        for train, test, name in folds
+    ]
+
+
+def successive_halving(
+    candidates: Sequence[T],
+    evaluate: Callable[[List[int], int, float], List[float]],
+    config: HalvingConfig,
+) -> Tuple[List[int], List[RungRecord]]:
+    """
+    Run one successive halving bracket.
+
+    Args:
+        candidates: Candidates to schedule (only their count is used here)
+        evaluate: evaluate(candidate_indices, rung, budget) -> scores (higher is better)
+        config: Halving schedule
+
+    Returns:
+        (indices of candidates evaluated at full budget, all rung records)
+    """
+    active = list(range(len(candidates)))
+    records: List[RungRecord] = []
+    rungs = config.rungs()
+
+    for rung, budget in enumerate(rungs):
+        if not active:
+            break
+        scores = evaluate(active, rung, budget)
+        rung_records = [
+            RungRecord(candidate=i, rung=rung, budget=budget, score=s)
+            for i, s in zip(active, scores)
+        ]
+        records.extend(rung_records)
+        if rung == len(rungs) - 1:
+            break
+
+        n_keep = max(1, len(active) // config.eta)
+        ranked = sorted(
+            rung_records,
+            key=lambda r: r.score if r.score is not None and not math.isnan(r.score) else -math.inf,
+            reverse=True,
+        )
+        for r in ranked[:n_keep]:
+            r.promoted = True
+        active = sorted(r.candidate for r in ranked[:n_keep])
+
+    return active, records
@@ -8,13 +8,16 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple
 
 import duckdb
 
 from .alerts import Alert
 from .helpers import ceil_ms_to_interval_ts_ms, sql_escape
 
+if TYPE_CHECKING:
+    from .result_cache import ResultCache
+
 # Slice type for backwards compatibility
 SliceType = Literal["file", "hive", "per_token"]
 
@@ -34,6 +37,7 @@ def run_tp_sl_query(
     verbose: bool = False,
     slice_type: SliceType | None = None,
     entry_delay_candles: int = 0,
+    result_cache: Optional["ResultCache"] = None,
 ) -> List[Dict[str, Any]]:
     """
     Run TP/SL backtest query over alerts.
@@ -57,10 +61,36 @@ def run_tp_sl_query(
         verbose: Print progress
         slice_type: Explicit slice type ('file', 'hive', 'per_token'). If None, inferred.
         entry_delay_candles: Number of candles to delay entry (0 = immediate, 1+ = latency simulation)
+        result_cache: Optional content-addressed cache of per-alert results
 
     Returns:
         List of result dicts, one per alert
     """
+    if result_cache is not None:
+        params = {
+            "is_partitioned": is_partitioned,
+            "slice_type": slice_type,
+            "sql": _build_tp_sl_sql(
+                interval_seconds=interval_seconds,
+                horizon_hours=horizon_hours,
+                tp_mult=tp_mult,
+                sl_mult=sl_mult,
+                intrabar_order=intrabar_order,
+                fee_bps=fee_bps,
+                slippage_bps=slippage_bps,
+                entry_delay_candles=entry_delay_candles,
+            ),
+        }
+        return result_cache.get_or_compute(
+            "tp_sl", alerts, slice_path, params,
+            lambda: run_tp_sl_query(
+                alerts, slice_path, is_partitioned, interval_seconds, horizon_hours,
+                tp_mult, sl_mult, intrabar_order, fee_bps, slippage_bps,
+                threads=threads, verbose=verbose, slice_type=slice_type,
+                entry_delay_candles=entry_delay_candles,
+            ),
+        )
+
     horizon_s = int(horizon_hours) * 3600
     entry_delay_ms = entry_delay_candles * interval_seconds * 1000
 
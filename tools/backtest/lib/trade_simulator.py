@@ -25,13 +25,30 @@ Usage:
             ]
         },
     )
+
+Grid experiments over many entry × stop combinations should use
+simulate_trade_grid_arrays (or simulate_trade_grid, which dispatches to it
+for registry strategies): candles are converted to arrays once and every
+stop is evaluated against them in one vectorized pass per entry.
 """
 
+import inspect
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
-from entry_strategies import EntryResult, immediate_entry
-from stop_strategies import ExitResult, PhaseConfig, trailing_stop
+from entry_strategies import ENTRY_STRATEGIES, EntryResult, evaluate_entries, immediate_entry
+from stop_strategies import (
+    MILESTONES,
+    STOP_STRATEGIES,
+    ExitResult,
+    PhaseConfig,
+    _parse_timestamp_ms,
+    evaluate_stops,
+    trailing_stop,
+)
 
 
 @dataclass
@@ -69,6 +86,41 @@ class TradeResult:
     reference_price: float  # Price used for stop calculations
 
 
+# One row per trade of simulate_trade_grid_arrays (NaN / -1 where TradeResult has None)
+TRADE_RESULT_DTYPE = np.dtype([
+    ('entry_occurred', np.bool_),
+    ('entry_price', np.float64),
+    ('entry_ts_ms', np.int64),
+    ('time_to_entry_hrs', np.float64),
+    ('missed_reason', 'U32'),
+    ('exit_price', np.float64),
+    ('exit_ts_ms', np.int64),
+    ('exit_reason', 'U32'),
+    ('entry_mult', np.float64),
+    ('peak_mult', np.float64),
+    ('exit_mult', np.float64),
+    ('exit_mult_from_alert', np.float64),
+    ('giveback_from_peak_pct', np.float64),
+    ('hit_2x', np.bool_),
+    ('hit_3x', np.bool_),
+    ('hit_4x', np.bool_),
+    ('hit_5x', np.bool_),
+    ('hit_10x', np.bool_),
+    ('ath_multiple', np.float64),
+    ('alert_price', np.float64),
+    ('reference_price', np.float64),
+])
+
+_ENTRY_KINDS = {fn: kind for kind, fn in ENTRY_STRATEGIES.items()}
+_STOP_KINDS = {fn: kind for kind, fn in STOP_STRATEGIES.items()}
+
+
+@lru_cache(maxsize=None)
+def _takes_reference_price(stop_strategy: Callable) -> bool:
+    """Whether a stop strategy needs reference_price (static_stop does, trailing_stop doesn't)."""
+    return 'reference_price' in inspect.signature(stop_strategy).parameters
+
+
 def simulate_trade(
     candles: List[Dict],
     alert_price: float,
@@ -136,10 +188,7 @@ def simulate_trade(
     reference_price = alert_price if stop_reference == 'alert' else entry_result.entry_price
     
     # Execute stop strategy on remaining candles
-    # Check if stop strategy needs reference_price (static_stop does, trailing_stop doesn't)
-    import inspect
-    sig = inspect.signature(stop_strategy)
-    if 'reference_price' in sig.parameters:
+    if _takes_reference_price(stop_strategy):
         exit_result: ExitResult = stop_strategy(
             candles=entry_result.candles_after_entry,
             entry_price=entry_result.entry_price,
@@ -189,6 +238,158 @@ def simulate_trade(
     )
 
 
+def candle_arrays(candles: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Convert candle dicts to contiguous (ts_ms, high, low, close) arrays."""
+    ts_ms = np.fromiter((_parse_timestamp_ms(c['timestamp']) for c in candles), dtype=np.int64, count=len(candles))
+    high = np.fromiter((float(c['high']) for c in candles), dtype=np.float64, count=len(candles))
+    low = np.fromiter((float(c['low']) for c in candles), dtype=np.float64, count=len(candles))
+    close = np.fromiter((float(c['close']) for c in candles), dtype=np.float64, count=len(candles))
+    return ts_ms, high, low, close
+
+
+def simulate_trade_grid_arrays(
+    ts_ms: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    alert_price: float,
+    alert_ts_ms: int,
+    entries: Sequence[Tuple[str, Dict[str, Any]]],
+    stops: Sequence[Tuple[str, Dict[str, Any]]],
+    stop_reference: str = 'alert',
+) -> np.ndarray:
+    """
+    Simulate a full entry × stop grid for one alert over candle arrays.
+    
+    Same trades as simulate_trade for every combination, computed with one
+    entry pass and one (stops × candles) pass per filled entry.
+    
+    Args:
+        ts_ms: Candle timestamps (ms), int64, ascending
+        high, low, close: Candle prices, float64
+        alert_price: Price at alert
+        alert_ts_ms: Alert timestamp (ms)
+        entries: [(kind, params), ...] with kind a key of ENTRY_STRATEGIES
+        stops: [(kind, params), ...] with kind a key of STOP_STRATEGIES
+        stop_reference: Calculate stops from 'alert' or 'entry' price
+    
+    Returns:
+        TRADE_RESULT_DTYPE array of len(entries) * len(stops) rows,
+        entry-major (row = entry_i * len(stops) + stop_j)
+    """
+    ts_ms = np.ascontiguousarray(ts_ms, dtype=np.int64)
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    
+    n_stops = len(stops)
+    out = np.zeros(len(entries) * n_stops, dtype=TRADE_RESULT_DTYPE)
+    out['alert_price'] = alert_price
+    out['entry_mult'] = 1.0
+    
+    entry = evaluate_entries(ts_ms, high, low, close, alert_price, alert_ts_ms, entries)
+    for i in range(len(entries)):
+        rows = out[i * n_stops:(i + 1) * n_stops]
+        rows['time_to_entry_hrs'] = entry['time_to_entry_hrs'][i]
+        
+        if not entry['entry_occurred'][i]:
+            rows['entry_price'] = alert_price
+            rows['entry_ts_ms'] = alert_ts_ms
+            rows['missed_reason'] = entry['missed_reason'][i]
+            rows['reference_price'] = alert_price
+            for name in ('exit_price', 'peak_mult', 'exit_mult', 'exit_mult_from_alert',
+                         'giveback_from_peak_pct', 'ath_multiple'):
+                rows[name] = np.nan
+            rows['exit_ts_ms'] = -1
+            continue
+        
+        entry_price = float(entry['entry_price'][i])
+        entry_ts_ms = int(entry['entry_ts_ms'][i])
+        reference_price = alert_price if stop_reference == 'alert' else entry_price
+        start = int(entry['entry_index'][i])
+        exits = evaluate_stops(
+            ts_ms[start:], high[start:], low[start:], close[start:],
+            entry_price, entry_ts_ms, reference_price, stops,
+        )
+        
+        rows['entry_occurred'] = True
+        rows['entry_price'] = entry_price
+        rows['entry_ts_ms'] = entry_ts_ms
+        rows['reference_price'] = reference_price
+        rows['exit_price'] = exits['exit_price']
+        rows['exit_ts_ms'] = exits['exit_ts_ms']
+        rows['exit_reason'] = exits['exit_reason']
+        rows['peak_mult'] = exits['peak_mult']
+        rows['ath_multiple'] = exits['ath_multiple']
+        for m in MILESTONES:
+            rows[f'hit_{m}x'] = exits[f'hit_{m}x']
+        rows['exit_mult'] = exits['exit_price'] / entry_price
+        rows['exit_mult_from_alert'] = exits['exit_price'] / alert_price
+        peak_price = entry_price * exits['peak_mult']
+        rows['giveback_from_peak_pct'] = np.where(
+            exits['peak_mult'] > 1.0,
+            (peak_price - exits['exit_price']) / peak_price * 100.0,
+            np.nan,
+        )
+    
+    return out
+
+
+def trade_result_from_row(row: np.void) -> TradeResult:
+    """Convert one TRADE_RESULT_DTYPE row back to a TradeResult."""
+    def optional(name: str) -> Optional[float]:
+        value = float(row[name])
+        return None if np.isnan(value) else value
+    
+    if not row['entry_occurred']:
+        return TradeResult(
+            entry_occurred=False,
+            entry_price=float(row['entry_price']),
+            entry_ts_ms=int(row['entry_ts_ms']),
+            time_to_entry_hrs=float(row['time_to_entry_hrs']),
+            missed_reason=str(row['missed_reason']) or None,
+            exit_price=None,
+            exit_ts_ms=None,
+            exit_reason=None,
+            entry_mult=1.0,
+            peak_mult=None,
+            exit_mult=None,
+            exit_mult_from_alert=None,
+            giveback_from_peak_pct=None,
+            hit_2x=None,
+            hit_3x=None,
+            hit_4x=None,
+            hit_5x=None,
+            hit_10x=None,
+            ath_multiple=None,
+            alert_price=float(row['alert_price']),
+            reference_price=float(row['reference_price']),
+        )
+    return TradeResult(
+        entry_occurred=True,
+        entry_price=float(row['entry_price']),
+        entry_ts_ms=int(row['entry_ts_ms']),
+        time_to_entry_hrs=float(row['time_to_entry_hrs']),
+        missed_reason=None,
+        exit_price=float(row['exit_price']),
+        exit_ts_ms=int(row['exit_ts_ms']),
+        exit_reason=str(row['exit_reason']),
+        entry_mult=1.0,
+        peak_mult=float(row['peak_mult']),
+        exit_mult=float(row['exit_mult']),
+        exit_mult_from_alert=float(row['exit_mult_from_alert']),
+        giveback_from_peak_pct=optional('giveback_from_peak_pct'),
+        hit_2x=bool(row['hit_2x']),
+        hit_3x=bool(row['hit_3x']),
+        hit_4x=bool(row['hit_4x']),
+        hit_5x=bool(row['hit_5x']),
+        hit_10x=bool(row['hit_10x']),
+        ath_multiple=float(row['ath_multiple']),
+        alert_price=float(row['alert_price']),
+        reference_price=float(row['reference_price']),
+    )
+
+
 def simulate_trade_grid(
     candles: List[Dict],
     alert_price: float,
@@ -200,6 +401,10 @@ def simulate_trade_grid(
     """
     Simulate a grid of entry × stop strategy combinations.
     
+    When every strategy comes from ENTRY_STRATEGIES / STOP_STRATEGIES the grid
+    runs through simulate_trade_grid_arrays; custom strategy functions fall
+    back to one simulate_trade call per combination.
+    
     Args:
         candles: All candles after alert
         alert_price: Price at alert
@@ -213,6 +418,28 @@ def simulate_trade_grid(
     """
     results = []
     
+    if all(fn in _ENTRY_KINDS for fn, _, _ in entry_strategies) and all(
+        fn in _STOP_KINDS for fn, _, _ in stop_strategies
+    ):
+        grid = simulate_trade_grid_arrays(
+            *candle_arrays(candles),
+            alert_price=alert_price,
+            alert_ts_ms=alert_ts_ms,
+            entries=[(_ENTRY_KINDS[fn], params or {}) for fn, params, _ in entry_strategies],
+            stops=[(_STOP_KINDS[fn], params or {}) for fn, params, _ in stop_strategies],
+            stop_reference=stop_reference,
+        )
+        row = 0
+        for _, _, entry_name in entry_strategies:
+            for _, _, stop_name in stop_strategies:
+                results.append({
+                    'entry_strategy': entry_name,
+                    'stop_strategy': stop_name,
+                    'result': trade_result_from_row(grid[row]),
+                })
+                row += 1
+        return results
+    
     for entry_fn, entry_params, entry_name in entry_strategies:
         for stop_fn, stop_params, stop_name in stop_strategies:
             result = simulate_trade(
@@ -233,4 +460,3 @@ def simulate_trade_grid(
             })
     
     return results
-
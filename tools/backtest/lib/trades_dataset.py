@@ -0,0 +1,338 @@
+"""
+Trades dataset - lazy DuckDB view over phased stop result Parquet files.
+
+Backs the Streamlit dashboard (dashboard.py) without loading every file into pandas:
+- Files are exposed as a single DuckDB view over read_parquet(), so sidebar
+  filters (strategy, caller, date range) are pushed down into the scan and only
+  the projected columns are read.
+- Cohort statistics are computed as SQL aggregates and cached per filter set.
+- Plot data is a bounded, reproducible reservoir sample of the filtered rows.
+
+Usage:
+    from lib.trades_dataset import TradesDataset, TradeFilters
+
+    ds = TradesDataset("output/2025_v2/phased_stop_results_*.parquet")
+    filters = TradeFilters(stop_mode="static", phase1_stop_pct=0.1, phase2_stop_pct=0.2)
+    stats = ds.cohort_stats(filters)
+    sample = ds.fetch(filters, columns=["peak_mult", "exit_mult"], sample=50_000)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timezone
+from glob import glob
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import duckdb
+import pandas as pd
+
+UTC = timezone.utc
+
+# Default number of rows drawn for charts
+PLOT_SAMPLE_ROWS = 50_000
+
+# Filter sets whose cohort stats are kept in memory
+STATS_CACHE_SIZE = 256
+
+# Strategy identity columns
+STRATEGY_COLUMNS = ("stop_mode", "phase1_stop_pct", "phase2_stop_pct")
+
+
+def resolve_files(parquet_pattern: str) -> List[str]:
+    """Expand a glob pattern (or single path) to a sorted list of files."""
+    if any(ch in parquet_pattern for ch in "*?["):
+        return sorted(glob(parquet_pattern))
+    return [parquet_pattern] if os.path.exists(parquet_pattern) else []
+
+
+def dataset_signature(parquet_pattern: str) -> Tuple[Tuple[str, int, int], ...]:
+    """
+    (path, mtime_ns, size) for every file matching the pattern.
+
+    Changes whenever a file is added, removed or rewritten, so it can be used
+    as a cache key for datasets built from the pattern.
+    """
+    sig = []
+    for path in resolve_files(parquet_pattern):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        sig.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+@dataclass(frozen=True)
+class TradeFilters:
+    """Sidebar filter set. None means "no filter" for that field."""
+    stop_mode: Optional[str] = None
+    phase1_stop_pct: Optional[float] = None
+    phase2_stop_pct: Optional[float] = None
+    caller: Optional[str] = None
+    date_from: Optional[date] = None  # inclusive, on entry_ts_ms (UTC)
+    date_to: Optional[date] = None    # inclusive, on entry_ts_ms (UTC)
+
+    def without_strategy(self) -> "TradeFilters":
+        return replace(self, stop_mode=None, phase1_stop_pct=None, phase2_stop_pct=None)
+
+    def to_sql(self) -> Tuple[str, List[Any]]:
+        """Build a WHERE clause (including the keyword, or '') and its parameters."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if self.stop_mode is not None:
+            clauses.append("stop_mode = ?")
+            params.append(self.stop_mode)
+        if self.phase1_stop_pct is not None:
+            clauses.append("phase1_stop_pct = ?")
+            params.append(float(self.phase1_stop_pct))
+        if self.phase2_stop_pct is not None:
+            clauses.append("phase2_stop_pct = ?")
+            params.append(float(self.phase2_stop_pct))
+        if self.caller is not None:
+            clauses.append("caller = ?")
+            params.append(self.caller)
+        if self.date_from is not None:
+            clauses.append("entry_ts_ms >= ?")
+            params.append(_date_to_ms(self.date_from))
+        if self.date_to is not None:
+            clauses.append("entry_ts_ms < ?")
+            params.append(_date_to_ms(self.date_to) + 86_400_000)
+        if not clauses:
+            return "", params
+        return "WHERE " + " AND ".join(clauses), params
+
+
+def _date_to_ms(d: date) -> int:
+    return int(datetime(d.year, d.month, d.day, tzinfo=UTC).timestamp() * 1000)
+
+
+# Cohort aggregates, matching the pandas definitions the dashboard used:
+#   winners  = hit_3x
+#   losers   = hit_2x and not hit_3x
+#   never_2x = not hit_2x
+COHORT_STATS_SQL = """
+SELECT
+    COUNT(*) AS total,
+    COUNT(*) FILTER (WHERE hit_3x IS TRUE) AS winners,
+    COUNT(*) FILTER (WHERE hit_2x IS TRUE AND hit_3x IS FALSE) AS losers,
+    COUNT(*) FILTER (WHERE hit_2x IS FALSE) AS never_2x,
+    COUNT(*) FILTER (WHERE hit_2x IS TRUE) AS n_hit_2x,
+    COUNT(*) FILTER (WHERE hit_3x IS TRUE) AS n_hit_3x,
+    AVG(exit_mult) AS mean_exit_mult,
+    AVG(exit_mult) FILTER (WHERE hit_2x IS TRUE) AS mean_exit_mult_2x,
+    AVG(exit_mult) FILTER (WHERE hit_3x IS TRUE) AS winners_mean_exit_mult,
+    MEDIAN(exit_mult) FILTER (WHERE hit_3x IS TRUE) AS winners_median_exit_mult,
+    AVG(giveback_from_peak_pct) FILTER (WHERE hit_3x IS TRUE) AS winners_mean_giveback,
+    QUANTILE_CONT(giveback_from_peak_pct, [0.25, 0.5, 0.75, 0.9]) FILTER (WHERE hit_3x IS TRUE)
+        AS winners_giveback_quantiles,
+    AVG(exit_mult) FILTER (WHERE hit_2x IS TRUE AND hit_3x IS FALSE) AS losers_mean_exit_mult,
+    MEDIAN(exit_mult) FILTER (WHERE hit_2x IS TRUE AND hit_3x IS FALSE) AS losers_median_exit_mult,
+    AVG(exit_mult) FILTER (WHERE hit_2x IS FALSE) AS never_2x_mean_exit_mult,
+    MEDIAN(exit_mult) FILTER (WHERE hit_2x IS FALSE) AS never_2x_median_exit_mult
+FROM trades
+{where}
+"""
+
+# Row predicates for each cohort, usable in fetch()/value_counts()
+COHORT_PREDICATES = {
+    "winners": "hit_3x IS TRUE",
+    "losers": "hit_2x IS TRUE AND hit_3x IS FALSE",
+    "never_2x": "hit_2x IS FALSE",
+}
+
+
+def _finish_cohort_stats(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the percentage/EV fields from raw aggregates."""
+    total = row["total"] or 0
+    n_2x = row["n_hit_2x"] or 0
+    stats = dict(row)
+    stats["p_reach_2x"] = (n_2x / total * 100) if total > 0 else 0
+    stats["p_reach_3x"] = (row["n_hit_3x"] / total * 100) if total > 0 else 0
+    stats["p_3x_given_2x"] = (row["winners"] / n_2x * 100) if n_2x > 0 else 0
+    stats["p_2x_no3x"] = (row["losers"] / total * 100) if total > 0 else 0
+    stats["ev_from_entry"] = ((row["mean_exit_mult"] - 1.0) * 100) if total > 0 else 0
+    stats["ev_given_2x"] = ((row["mean_exit_mult_2x"] - 1.0) * 100) if n_2x > 0 else 0
+    quantiles = row.get("winners_giveback_quantiles") or [None] * 4
+    for q, value in zip((25, 50, 75, 90), quantiles):
+        stats[f"winners_giveback_p{q}"] = value
+    return stats
+
+
+class TradesDataset:
+    """
+    Lazy view over a set of phased stop result Parquet files.
+
+    Nothing is read until a query runs; every query goes through DuckDB with
+    the filters in the WHERE clause, so only matching row groups and the
+    requested columns are scanned. Safe to share across Streamlit sessions
+    (each query uses its own cursor).
+    """
+
+    def __init__(self, parquet_pattern: str, files: Optional[Sequence[str]] = None):
+        self.parquet_pattern = parquet_pattern
+        self.files = list(files) if files is not None else resolve_files(parquet_pattern)
+        self._con = duckdb.connect(":memory:")
+        self._lock = threading.Lock()
+        self._stats_cache: "OrderedDict[TradeFilters, Dict[str, Any]]" = OrderedDict()
+        self.columns: List[str] = []
+        if self.files:
+            # Views can't take prepared parameters, so inline the quoted file list
+            file_list = ", ".join("'" + f.replace("'", "''") + "'" for f in self.files)
+            self._con.execute(
+                f"CREATE VIEW trades AS SELECT * FROM read_parquet([{file_list}], union_by_name = true)"
+            )
+            self.columns = [r[0] for r in self._con.execute("DESCRIBE trades").fetchall()]
+
+    @property
+    def empty(self) -> bool:
+        return not self.files
+
+    def _query(self, sql: str, params: Optional[List[Any]] = None) -> duckdb.DuckDBPyConnection:
+        cur = self._con.cursor()
+        return cur.execute(sql, params or [])
+
+    def row_count(self, filters: Optional[TradeFilters] = None) -> int:
+        if self.empty:
+            return 0
+        where, params = (filters or TradeFilters()).to_sql()
+        return self._query(f"SELECT COUNT(*) FROM trades {where}", params).fetchone()[0]
+
+    def distinct(self, column: str, filters: Optional[TradeFilters] = None) -> List[Any]:
+        """Sorted distinct non-null values of a column."""
+        if self.empty or column not in self.columns:
+            return []
+        where, params = (filters or TradeFilters()).to_sql()
+        where = f"{where} AND {column} IS NOT NULL" if where else f"WHERE {column} IS NOT NULL"
+        rows = self._query(f"SELECT DISTINCT {column} FROM trades {where} ORDER BY 1", params).fetchall()
+        return [r[0] for r in rows]
+
+    def stop_configs(self, stop_mode: str) -> List[Tuple[float, float]]:
+        """Sorted distinct (phase1_stop_pct, phase2_stop_pct) pairs for a stop mode."""
+        if self.empty:
+            return []
+        rows = self._query(
+            """
+            SELECT DISTINCT phase1_stop_pct, phase2_stop_pct
+            FROM trades WHERE stop_mode = ?
+            ORDER BY 1, 2
+            """,
+            [stop_mode],
+        ).fetchall()
+        return [(r[0], r[1]) for r in rows]
+
+    def date_bounds(self) -> Optional[Tuple[date, date]]:
+        """(min, max) entry date in UTC, or None if unavailable."""
+        if self.empty or "entry_ts_ms" not in self.columns:
+            return None
+        lo, hi = self._query(
+            "SELECT MIN(entry_ts_ms), MAX(entry_ts_ms) FROM trades WHERE entry_ts_ms > 0"
+        ).fetchone()
+        if lo is None:
+            return None
+        return (
+            datetime.fromtimestamp(lo / 1000, tz=UTC).date(),
+            datetime.fromtimestamp(hi / 1000, tz=UTC).date(),
+        )
+
+    def first_value(self, column: str, filters: TradeFilters) -> Any:
+        if self.empty or column not in self.columns:
+            return None
+        where, params = filters.to_sql()
+        row = self._query(f"SELECT {column} FROM trades {where} LIMIT 1", params).fetchone()
+        return row[0] if row else None
+
+    def cohort_stats(self, filters: TradeFilters) -> Dict[str, Any]:
+        """
+        Cohort statistics (counts, probabilities, EV, per-cohort exit/giveback
+        aggregates) for a filter set. Cached per filter set.
+        """
+        with self._lock:
+            hit = self._stats_cache.get(filters)
+            if hit is not None:
+                self._stats_cache.move_to_end(filters)
+                return hit
+
+        if self.empty:
+            stats = _finish_cohort_stats({
+                "total": 0, "winners": 0, "losers": 0, "never_2x": 0,
+                "n_hit_2x": 0, "n_hit_3x": 0, "mean_exit_mult": None, "mean_exit_mult_2x": None,
+            })
+        else:
+            where, params = filters.to_sql()
+            cur = self._query(COHORT_STATS_SQL.format(where=where), params)
+            names = [d[0] for d in cur.description]
+            stats = _finish_cohort_stats(dict(zip(names, cur.fetchone())))
+
+        with self._lock:
+            self._stats_cache[filters] = stats
+            while len(self._stats_cache) > STATS_CACHE_SIZE:
+                self._stats_cache.popitem(last=False)
+        return stats
+
+    def strategy_comparison(self, filters: TradeFilters) -> List[Dict[str, Any]]:
+        """
+        Cohort stats for every (stop_mode, phase1, phase2) strategy in one
+        grouped scan. Strategy fields of filters are ignored.
+        """
+        if self.empty:
+            return []
+        where, params = filters.without_strategy().to_sql()
+        group_cols = ", ".join(STRATEGY_COLUMNS)
+        sql = COHORT_STATS_SQL.format(where=where).replace(
+            "SELECT\n", f"SELECT\n    {group_cols},\n", 1
+        ) + f"GROUP BY {group_cols}"
+        cur = self._query(sql, params)
+        names = [d[0] for d in cur.description]
+        return [_finish_cohort_stats(dict(zip(names, row))) for row in cur.fetchall()]
+
+    def fetch(
+        self,
+        filters: TradeFilters,
+        columns: Optional[Sequence[str]] = None,
+        cohort: Optional[str] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        sample: Optional[int] = None,
+        seed: int = 42,
+    ) -> pd.DataFrame:
+        """
+        Filtered rows as a DataFrame, projected to columns.
+
+        sample draws a reproducible reservoir sample of at most that many
+        filtered rows (for charts); order_by/limit are applied otherwise.
+        """
+        if self.empty:
+            return pd.DataFrame(columns=list(columns or []))
+        cols = [c for c in (columns or self.columns) if c in self.columns]
+        select = ", ".join(cols) if cols else "*"
+        where, params = filters.to_sql()
+        if cohort is not None:
+            predicate = COHORT_PREDICATES[cohort]
+            where = f"{where} AND {predicate}" if where else f"WHERE {predicate}"
+        sql = f"SELECT {select} FROM trades {where}"
+        if sample is not None:
+            sql = f"SELECT * FROM ({sql}) USING SAMPLE reservoir({int(sample)} ROWS) REPEATABLE ({int(seed)})"
+        else:
+            if order_by:
+                sql += f" ORDER BY {order_by}"
+            if limit is not None:
+                sql += f" LIMIT {int(limit)}"
+        return self._query(sql, params).df()
+
+    def value_counts(self, column: str, filters: TradeFilters, cohort: Optional[str] = None) -> pd.Series:
+        """Counts of each value of column among filtered rows, descending."""
+        if self.empty or column not in self.columns:
+            return pd.Series(dtype="int64", name="count")
+        where, params = filters.to_sql()
+        if cohort is not None:
+            predicate = COHORT_PREDICATES[cohort]
+            where = f"{where} AND {predicate}" if where else f"WHERE {predicate}"
+        df = self._query(
+            f"SELECT {column}, COUNT(*) AS count FROM trades {where} GROUP BY 1 ORDER BY 2 DESC, 1",
+            params,
+        ).df()
+        return df.set_index(column)["count"]
@@ -1534,6 +1534,62 @@ def store_stress_lane_result(
         return result_id
 
 
+def store_stress_lane_results(
+    duckdb_path: str,
+    run_id: str,
+    phase_id: str,
+    results: List[Dict[str, Any]],
+) -> List[str]:
+    """
+    Store many stress lane results in one connection and one executemany.
+
+    Each entry has champion_id, lane_name, lane_config, result and optionally
+    duration_ms (same fields as store_stress_lane_result).
+    """
+    if not results:
+        return []
+    ensure_trial_schema(duckdb_path)
+
+    from tools.shared.duckdb_adapter import get_write_connection
+    now = datetime.now(UTC).replace(tzinfo=None)
+    rows = []
+    for r in results:
+        lane_config = r["lane_config"]
+        result = r["result"]
+        rows.append([
+            f"{r['champion_id']}_{r['lane_name']}",
+            run_id,
+            phase_id,
+            r["champion_id"],
+            r["lane_name"],
+            now,
+            lane_config.get("fee_bps"),
+            lane_config.get("slippage_bps"),
+            lane_config.get("latency_candles", 0),
+            lane_config.get("stop_gap_prob"),
+            lane_config.get("stop_gap_mult"),
+            json.dumps(lane_config, separators=(",", ":"), default=str),
+            result.get("test_r"),
+            result.get("ratio"),
+            result.get("passes_gates", False),
+            r.get("duration_ms", 0),
+            json.dumps(result.get("summary", {}), separators=(",", ":"), default=str),
+        ])
+
+    with get_write_connection(duckdb_path) as con:
+        con.executemany("""
+            INSERT OR REPLACE INTO optimizer.stress_lane_results_f (
+                result_id, run_id, phase_id, champion_id, lane_name, created_at,
+                fee_bps, slippage_bps, latency_candles, stop_gap_prob, stop_gap_mult,
+                lane_config_json,
+                test_r, ratio, passes_gates,
+                duration_ms, summary_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    return [row[0] for row in rows]
+
+
 def get_completed_lanes_for_champion(
     duckdb_path: str,
     run_id: str,
@@ -1814,52 +1870,55 @@ def write_trials_to_parquet(trials: List[Dict[str, Any]], run_id: str, parquet_p
             CREATE TABLE trials_temp AS
             SELECT * FROM (
                 SELECT 
-                    ?::TEXT as trial_id,
-                    ?::TEXT as run_id,
-                    ?::TIMESTAMP as created_at,
-                    ?::TEXT as strategy_name,
-                    ?::DOUBLE as tp_mult,
-                    ?::DOUBLE as sl_mult,
-                    ?::TEXT as intrabar_order,
-                    ?::TEXT as params_json,
-                    ?::DATE as date_from,
-                    ?::DATE as date_to,
-                    ?::TEXT as entry_mode,
-                    ?::INTEGER as horizon_hours,
-                    ?::INTEGER as alerts_total,
-                    ?::INTEGER as alerts_ok,
-                    ?::DOUBLE as total_r,
-                    ?::DOUBLE as avg_r,
-                    ?::DOUBLE as avg_r_win,
-                    ?::DOUBLE as avg_r_loss,
-                    ?::DOUBLE as r_profit_factor,
-                    ?::DOUBLE as win_rate,
-                    ?::DOUBLE as profit_factor,
-                    ?::DOUBLE as expectancy_pct,
-                    ?::DOUBLE as total_return_pct,
-                    ?::DOUBLE as risk_adj_total_return_pct,
-                    ?::DOUBLE as hit2x_pct,
-                    ?::DOUBLE as hit3x_pct,
-                    ?::DOUBLE as hit4x_pct,
-                    ?::DOUBLE as median_ath_mult,
-                    ?::DOUBLE as p75_ath_mult,
-                    ?::DOUBLE as p95_ath_mult,
-                    ?::DOUBLE as median_time_to_2x_min,
-                    ?::DOUBLE as median_time_to_3x_min,
-                    ?::DOUBLE as median_dd_pre2x,
-                    ?::DOUBLE as p95_dd_pre2x,
-                    ?::DOUBLE as p75_dd_pre2x,
-                    ?::DOUBLE as median_dd_overall,
-                    ?::DOUBLE as objective_score,
-                    ?::DOUBLE as test_train_ratio,
-                    ?::DOUBLE as robust_score,
-                    ?::DOUBLE as stress_penalty,
-                    ?::TEXT as worst_lane,
-                    ?::DOUBLE as worst_lane_score,
-                    ?::TEXT as gate_check_json,
-                    ?::BOOLEAN as passes_gates,
-                    ?::BIGINT as duration_ms,
-                    ?::TEXT as summary_json
+                    NULL::TEXT as trial_id,
+                    NULL::TEXT as run_id,
+                    NULL::TIMESTAMP as created_at,
+                    NULL::TEXT as strategy_name,
+                    NULL::DOUBLE as tp_mult,
+                    NULL::DOUBLE as sl_mult,
+                    NULL::TEXT as intrabar_order,
+                    NULL::TEXT as params_json,
+                    NULL::DATE as date_from,
+                    NULL::DATE as date_to,
+                    NULL::TEXT as entry_mode,
+                    NULL::INTEGER as horizon_hours,
+                    NULL::INTEGER as alerts_total,
+                    NULL::INTEGER as alerts_ok,
+                    NULL::DOUBLE as total_r,
+                    NULL::DOUBLE as avg_r,
+                    NULL::DOUBLE as avg_r_win,
+                    NULL::DOUBLE as avg_r_loss,
+                    NULL::DOUBLE as r_profit_factor,
+                    NULL::DOUBLE as win_rate,
+                    NULL::DOUBLE as profit_factor,
+                    NULL::DOUBLE as expectancy_pct,
+                    NULL::DOUBLE as total_return_pct,
+                    NULL::DOUBLE as risk_adj_total_return_pct,
+                    NULL::DOUBLE as hit2x_pct,
+                    NULL::DOUBLE as hit3x_pct,
+                    NULL::DOUBLE as hit4x_pct,
+                    NULL::DOUBLE as median_ath_mult,
+                    NULL::DOUBLE as p75_ath_mult,
+                    NULL::DOUBLE as p95_ath_mult,
+                    NULL::DOUBLE as median_time_to_2x_min,
+                    NULL::DOUBLE as median_time_to_3x_min,
+                    NULL::DOUBLE as median_dd_pre2x,
+                    NULL::DOUBLE as p95_dd_pre2x,
+                    NULL::DOUBLE as p75_dd_pre2x,
+                    NULL::DOUBLE as median_dd_overall,
+                    NULL::DOUBLE as objective_score,
+                    NULL::DOUBLE as test_train_ratio,
+                    NULL::DOUBLE as robust_score,
+                    NULL::DOUBLE as stress_penalty,
+                    NULL::TEXT as worst_lane,
+                    NULL::DOUBLE as worst_lane_score,
+                    NULL::TEXT as gate_check_json,
+                    NULL::BOOLEAN as passes_gates,
+                    NULL::BIGINT as duration_ms,
+                    NULL::TEXT as summary_json,
+                    NULL::DOUBLE as budget,
+                    NULL::INTEGER as rung,
+                    NULL::TEXT as budget_history_json
             ) WHERE FALSE
         """)
         
@@ -1885,7 +1944,7 @@ def write_trials_to_parquet(trials: List[Dict[str, Any]], run_id: str, parquet_p
                 INSERT INTO trials_temp VALUES (
                     ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 
                     ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                    ?, ?, ?, ?, ?, ?, ?
+                    ?, ?, ?, ?, ?, ?, ?, ?, ?
                 )
             """, [
                 trial_id, run_id, created_at,
@@ -1913,6 +1972,8 @@ def write_trials_to_parquet(trials: List[Dict[str, Any]], run_id: str, parquet_p
                 json.dumps(gate_check, separators=(",", ":")) if gate_check else None,
                 passes_gates, r.get("duration_ms", 0),
                 json.dumps(s, separators=(",", ":"), default=str),
+                r.get("budget", 1.0), r.get("rung", 0),
+                json.dumps(r.get("budget_history") or [], separators=(",", ":")),
             ])
         
         # Export to Parquet
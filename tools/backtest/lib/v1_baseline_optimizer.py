@@ -5,7 +5,8 @@ Performs grid search over parameter combinations to find optimal TP/SL parameter
 with capital-aware simulation.
 
 Features:
-- Grid search over tp_mult, sl_mult, max_hold_hrs
+- Grid search over tp_mult, sl_mult, max_hold_hrs (trade exits for the whole
+  grid are planned once; per-combination capital replays run in a process pool)
 - Per-caller optimization
 - Grouped evaluation with filtering
 - Objective: maximize final capital (C_final)
@@ -15,7 +16,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import os
 import sys
 
@@ -25,6 +26,9 @@ try:
         V1BaselineParams,
         CapitalSimulationResult,
         CapitalSimulatorConfig,
+        TradePlans,
+        plan_trades,
+        replay_capital,
         simulate_capital_aware,
     )
 except ImportError:
@@ -32,6 +36,9 @@ except ImportError:
         V1BaselineParams,
         CapitalSimulationResult,
         CapitalSimulatorConfig,
+        TradePlans,
+        plan_trades,
+        replay_capital,
         simulate_capital_aware,
     )
 
@@ -43,6 +50,28 @@ DEFAULT_TP_MULTS = [1.5, 2.0, 2.5, 3.0, 4.0, 5.0]
 DEFAULT_SL_MULTS = [0.85, 0.88, 0.9, 0.92, 0.95]
 DEFAULT_MAX_HOLD_HRS = [48.0]  # Only 48h for V1 baseline
 
+# Below this many (calls x parameter sets) replays run in-process
+PROCESS_POOL_MIN_WORK = 200_000
+
+
+# =============================================================================
+# Process Pool Workers
+# =============================================================================
+
+_worker_plans: Optional[TradePlans] = None
+_worker_config: Optional[CapitalSimulatorConfig] = None
+
+
+def _init_replay_worker(plans: TradePlans, config: Optional[CapitalSimulatorConfig]) -> None:
+    """Receive the trade plans once per worker process."""
+    global _worker_plans, _worker_config
+    _worker_plans = plans
+    _worker_config = config
+
+
+def _replay_worker(param_index: int) -> CapitalSimulationResult:
+    return replay_capital(_worker_plans, param_index, _worker_config)
+
 
 # =============================================================================
 # Types
@@ -122,66 +151,76 @@ def optimize_v1_baseline(
         print(f"  Max hold hrs: {len(max_hold_hrs_list)}")
         print(f"  Total combinations: {total_combinations}")
     
-    # Evaluate each parameter combination (with threading)
-    results: List[Dict[str, Any]] = []
-    
-    # Determine number of workers (default: CPU count or 4)
-    max_workers = int(os.environ.get("V1_OPTIMIZER_THREADS", os.cpu_count() or 4))
-    
-    if verbose:
-        print(f"  Using {max_workers} threads for parallel grid search")
-    
-    # Helper function to evaluate a single parameter combination
-    def evaluate_params(tp_mult: float, sl_mult: float, max_hold_hr: float) -> Dict[str, Any]:
-        params = V1BaselineParams(
-            tp_mult=tp_mult,
-            sl_mult=sl_mult,
-            max_hold_hrs=max_hold_hr,
-        )
-        
-        # Run capital simulation
-        result = simulate_capital_aware(
-            calls_to_optimize,
-            candles_by_call_id,
-            params,
-            simulator_config,
-        )
-        
-        return {
-            "params": params,
-            "result": result,
-        }
-    
     # Generate all parameter combinations
-    param_combinations = [
-        (tp_mult, sl_mult, max_hold_hr)
+    params_list = [
+        V1BaselineParams(tp_mult=tp_mult, sl_mult=sl_mult, max_hold_hrs=max_hold_hr)
         for tp_mult in tp_mults
         for sl_mult in sl_mults
         for max_hold_hr in max_hold_hrs_list
     ]
     
-    # Execute in parallel using ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_params = {
-            executor.submit(evaluate_params, tp, sl, mh): (tp, sl, mh)
-            for tp, sl, mh in param_combinations
-        }
-        
-        # Collect results as they complete
-        completed = 0
-        for future in as_completed(future_to_params):
-            try:
-                result_dict = future.result()
-                results.append(result_dict)
-                completed += 1
-                
+    # Entries and exits of every call under every combination (one vectorized scan per call)
+    plans = plan_trades(calls_to_optimize, candles_by_call_id, params_list, simulator_config)
+    
+    # Determine number of worker processes (default: CPU count)
+    max_workers = int(
+        os.environ.get("V1_OPTIMIZER_WORKERS")
+        or os.environ.get("V1_OPTIMIZER_THREADS")
+        or os.cpu_count()
+        or 4
+    )
+    use_pool = (
+        max_workers > 1
+        and len(params_list) > 1
+        and len(calls_to_optimize) * len(params_list) >= PROCESS_POOL_MIN_WORK
+    )
+    
+    if verbose:
+        mode = f"{max_workers} processes" if use_pool else "1 process"
+        print(f"  Replaying {total_combinations} combinations with {mode}")
+    
+    # Replay each combination through the capital rules; a failing
+    # combination is reported and skipped, the rest of the grid still runs
+    replayed: List[Optional[CapitalSimulationResult]] = [None] * len(params_list)
+    
+    def report_error(k: int, e: Exception) -> None:
+        if verbose:
+            p = params_list[k]
+            print(f"  Error evaluating params (tp={p.tp_mult}, sl={p.sl_mult}, mh={p.max_hold_hrs}): {e}")
+    
+    if use_pool:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_replay_worker,
+            initargs=(plans, simulator_config),
+        ) as executor:
+            future_to_index = {
+                executor.submit(_replay_worker, k): k
+                for k in range(len(params_list))
+            }
+            for completed, future in enumerate(as_completed(future_to_index), start=1):
+                k = future_to_index[future]
+                try:
+                    replayed[k] = future.result()
+                except Exception as e:
+                    report_error(k, e)
                 if verbose and completed % 10 == 0:
                     print(f"  Progress: {completed}/{total_combinations} combinations evaluated")
+    else:
+        for k in range(len(params_list)):
+            try:
+                replayed[k] = replay_capital(plans, k, simulator_config)
             except Exception as e:
-                tp, sl, mh = future_to_params[future]
-                if verbose:
-                    print(f"  Error evaluating params (tp={tp}, sl={sl}, mh={mh}): {e}")
+                report_error(k, e)
+            if verbose and (k + 1) % 10 == 0:
+                print(f"  Progress: {k + 1}/{total_combinations} combinations evaluated")
+    
+    # Keep grid order so ties sort the same with and without the pool
+    results: List[Dict[str, Any]] = [
+        {"params": params, "result": result}
+        for params, result in zip(params_list, replayed)
+        if result is not None
+    ]
     
     # Sort by final capital (descending) - objective is to maximize C_final
     results.sort(key=lambda x: x["result"].final_capital, reverse=True)
@@ -385,20 +424,25 @@ def main_stdin() -> None:
     """
     Main entry point for stdin-based operation (called by TypeScript).
     
-    Reads JSON from stdin, executes operation, writes JSON to stdout.
+    Reads a JSON request (or an Arrow request, see v1_baseline_transport) from
+    stdin, executes operation, writes JSON (or Arrow) to stdout.
     """
     import json
-    import sys
+    
+    try:
+        from .v1_baseline_transport import read_request, write_response
+    except ImportError:
+        from lib.v1_baseline_transport import read_request, write_response
     
     try:
         # Read input from stdin
-        input_data = json.load(sys.stdin)
+        input_data, candles_by_call_id = read_request(sys.stdin.buffer)
         operation = input_data.get("operation")
+        result_format = input_data.get("result_format", "json")
         
         if operation == "optimize":
             # Extract config
             calls = input_data["calls"]
-            candles_by_call_id = input_data["candles_by_call_id"]
             param_grid = input_data.get("param_grid")
             simulator_config_dict = input_data.get("simulator_config")
             caller_groups = input_data.get("caller_groups")
@@ -431,12 +475,11 @@ def main_stdin() -> None:
                 "params_evaluated": result.params_evaluated,
             }
             
-            json.dump(output, sys.stdout)
+            write_response(output, sys.stdout.buffer, result_format)
             
         elif operation == "optimize_per_caller":
             # Extract config
             calls = input_data["calls"]
-            candles_by_call_id = input_data["candles_by_call_id"]
             param_grid = input_data.get("param_grid")
             simulator_config_dict = input_data.get("simulator_config")
             verbose = input_data.get("verbose", False)
@@ -471,12 +514,11 @@ def main_stdin() -> None:
                     "requires_extreme_params": result.requires_extreme_params,
                 }
             
-            json.dump(output, sys.stdout)
+            write_response(output, sys.stdout.buffer, result_format)
             
         elif operation == "grouped_evaluation":
             # Extract config
             calls = input_data["calls"]
-            candles_by_call_id = input_data["candles_by_call_id"]
             param_grid = input_data.get("param_grid")
             simulator_config_dict = input_data.get("simulator_config")
             filter_collapsed = input_data.get("filter_collapsed", True)
@@ -523,20 +565,7 @@ def main_stdin() -> None:
                     "total_return": gr.total_return,
                     "trades_executed": gr.trades_executed,
                     "trades_skipped": gr.trades_skipped,
-                    "completed_trades": [
-                        {
-                            "call_id": t.call_id,
-                            "entry_ts_ms": t.entry_ts_ms,
-                            "exit_ts_ms": t.exit_ts_ms,
-                            "entry_px": t.entry_px,
-                            "exit_px": t.exit_px,
-                            "size": t.size,
-                            "pnl": t.pnl,
-                            "exit_reason": t.exit_reason,
-                            "exit_mult": t.exit_mult,
-                        }
-                        for t in gr.completed_trades
-                    ],
+                    "completed_trades": gr.completed_trades,
                 }
             
             grouped_params_dict = None
@@ -555,7 +584,7 @@ def main_stdin() -> None:
                 "grouped_params": grouped_params_dict,
             }
             
-            json.dump(output, sys.stdout)
+            write_response(output, sys.stdout.buffer, result_format)
             
         else:
             raise ValueError(f"Unknown operation: {operation}")
@@ -13,13 +13,31 @@ Key features:
 - Position sizing: min(size_risk, size_alloc, free_cash)
 - Trade lifecycle: TP at tp_mult, SL at sl_mult, Time exit at 48h
 - Objective: maximize final capital (C_final)
+
+Engine:
+- plan_trades() converts each call's candles to arrays once and finds the
+  entry and the natural exit (first TP / SL / time candle) of every call for
+  every parameter set with a vectorized scan (running max/min + searchsorted).
+- replay_capital() replays one parameter set: calls in alert order, exits
+  from a single min-heap keyed by exit time. Open positions live in arrays
+  indexed by call, so no candle list is rescanned during the replay.
+
+Exit semantics (same as the TypeScript capital simulator): every open
+position is settled at the next alert - at its own exit if that comes first,
+otherwise at the alert time with the last candle's close - so positions never
+overlap. CapitalSimulatorConfig.hold_until_exit=True keeps positions open
+until their own TP / SL / time exit instead.
 """
 
 from __future__ import annotations
 
+import heapq
+import math
 import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
 
 # Type aliases
 ExitReason = Literal["take_profit", "stop_loss", "time_exit", "no_entry", "insufficient_capital"]
@@ -99,6 +117,33 @@ class CapitalSimulatorConfig:
     min_executable_size: float = 10  # $10 minimum
     taker_fee_bps: float = 30
     slippage_bps: float = 10
+    hold_until_exit: bool = False  # Keep positions open past the next alert
+
+
+# Exit reason codes used in TradePlans.exit_reason
+EXIT_REASON_CODES: Tuple[ExitReason, ...] = ("take_profit", "stop_loss", "time_exit")
+
+
+@dataclass
+class TradePlans:
+    """
+    Entry and natural exit of every call under every parameter set.
+    
+    Per-call arrays have one value per call (calls sorted by alert time);
+    exit arrays have shape (len(params), n_calls).
+    """
+    
+    params: List[V1BaselineParams]
+    call_ids: List[str]
+    alert_ts_ms: np.ndarray
+    has_candles: np.ndarray  # bool: call has any candles
+    entry_ok: np.ndarray  # bool: entry candle found with a finite, positive close
+    entry_ts_ms: np.ndarray
+    entry_px: np.ndarray
+    exit_ts_ms: np.ndarray
+    exit_px: np.ndarray
+    exit_reason: np.ndarray  # index into EXIT_REASON_CODES
+    last_px: np.ndarray  # close of the call's last candle
 
 
 # =============================================================================
@@ -124,65 +169,20 @@ def calculate_position_size(
     return min(size_risk, size_alloc, free_cash)
 
 
-def execute_entry(
-    state: CapitalState,
-    call: Dict[str, Any],
-    candles: List[Dict[str, Any]],
-    params: V1BaselineParams,
-    position_size: float,
-    max_hold_hrs: float,
-    current_time: int,
-    config: CapitalSimulatorConfig,
-) -> Optional[Dict[str, Any]]:
-    """
-    Execute entry for an alert.
-    
-    Returns dict with 'position' and 'estimated_exit_time' or None if entry fails.
-    """
-    # Find entry candle (first candle at/after alert time)
-    alert_ts_ms = call["ts_ms"]
-    entry_idx = -1
-    
-    for i, candle in enumerate(candles):
-        ts_ms = candle["timestamp"] * 1000 if isinstance(candle["timestamp"], (int, float)) else int(candle["timestamp"].timestamp() * 1000)
-        if ts_ms >= alert_ts_ms:
-            entry_idx = i
-            break
-    
-    if entry_idx == -1 or entry_idx >= len(candles):
-        return None
-    
-    entry_candle = candles[entry_idx]
-    entry_ts_ms = entry_candle["timestamp"] * 1000 if isinstance(entry_candle["timestamp"], (int, float)) else int(entry_candle["timestamp"].timestamp() * 1000)
-    entry_px = entry_candle["close"]
-    
-    if not (entry_px > 0 and entry_px != float('inf') and entry_px != float('-inf')):
-        return None
-    
-    # Deduct position size from free cash
-    state.free_cash -= position_size
-    
-    # Calculate TP/SL prices
-    tp_price = entry_px * params.tp_mult
-    sl_price = entry_px * params.sl_mult
-    max_hold_ts_ms = entry_ts_ms + int(max_hold_hrs * 60 * 60 * 1000)
-    
-    position = Position(
-        call_id=call["id"],
-        mint=call["mint"],
-        caller=call["caller"],
-        entry_ts_ms=entry_ts_ms,
-        entry_px=entry_px,
-        size=position_size,
-        tp_price=tp_price,
-        sl_price=sl_price,
-        max_hold_ts_ms=max_hold_ts_ms,
-    )
-    
-    # Estimate exit time (use max hold as conservative estimate)
-    estimated_exit_time = max_hold_ts_ms
-    
-    return {"position": position, "estimated_exit_time": estimated_exit_time}
+def _candle_ts_ms(candle: Dict[str, Any]) -> int:
+    """Candle timestamp in ms (numeric timestamps are unix seconds)."""
+    ts = candle["timestamp"]
+    return int(ts * 1000) if isinstance(ts, (int, float)) else int(ts.timestamp() * 1000)
+
+
+def candle_arrays(candles: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Convert candle dicts to (ts_ms, high, low, close) arrays."""
+    n = len(candles)
+    ts_ms = np.fromiter((_candle_ts_ms(c) for c in candles), dtype=np.int64, count=n)
+    high = np.fromiter((c["high"] for c in candles), dtype=np.float64, count=n)
+    low = np.fromiter((c["low"] for c in candles), dtype=np.float64, count=n)
+    close = np.fromiter((c["close"] for c in candles), dtype=np.float64, count=n)
+    return ts_ms, high, low, close
 
 
 def find_exit_in_candles(
@@ -318,84 +318,136 @@ def execute_exit(
     state.completed_trades.append(trade)
 
 
-def check_and_execute_exits(
-    state: CapitalState,
+def plan_trades(
+    calls: List[Dict[str, Any]],
     candles_by_call_id: Dict[str, List[Dict[str, Any]]],
-    current_time: int,
-    config: CapitalSimulatorConfig,
-) -> None:
-    """Check and execute exits for positions that should exit at or before currentTime."""
-    positions_to_exit: List[Dict[str, Any]] = []
+    params_list: Sequence[V1BaselineParams],
+    config: Optional[CapitalSimulatorConfig] = None,
+) -> TradePlans:
+    """
+    Find every call's entry and natural exit for every parameter set.
+    
+    candles_by_call_id values are candle dict lists or (ts_ms, high, low,
+    close) array tuples.
+    
+    Entry is the first candle at/after the alert (entry price = its close).
+    The exit is the first candle from entry on where high >= TP, low <= SL or
+    ts >= entry + max hold (checked in that priority within a candle), else
+    the last candle at its close - the same rules as find_exit_in_candles
+    with no time limit. Each call's candles are converted to arrays once and
+    all parameter sets are resolved with running max/min + searchsorted.
+    """
+    cfg = config or CapitalSimulatorConfig()
+    params_list = list(params_list)
+    n_params = len(params_list)
+    sorted_calls = sorted(calls, key=lambda c: c["ts_ms"])
+    n_calls = len(sorted_calls)
+    
+    tp_mults = np.array([p.tp_mult for p in params_list], dtype=np.float64)
+    sl_mults = np.array([p.sl_mult for p in params_list], dtype=np.float64)
+    hold_ms = np.array([
+        int((p.max_hold_hrs if p.max_hold_hrs is not None else cfg.max_trade_horizon_hrs) * 60 * 60 * 1000)
+        for p in params_list
+    ], dtype=np.int64)
+    
+    plans = TradePlans(
+        params=params_list,
+        call_ids=[c["id"] for c in sorted_calls],
+        alert_ts_ms=np.array([c["ts_ms"] for c in sorted_calls], dtype=np.int64),
+        has_candles=np.zeros(n_calls, dtype=bool),
+        entry_ok=np.zeros(n_calls, dtype=bool),
+        entry_ts_ms=np.zeros(n_calls, dtype=np.int64),
+        entry_px=np.zeros(n_calls, dtype=np.float64),
+        exit_ts_ms=np.zeros((n_params, n_calls), dtype=np.int64),
+        exit_px=np.zeros((n_params, n_calls), dtype=np.float64),
+        exit_reason=np.zeros((n_params, n_calls), dtype=np.int8),
+        last_px=np.zeros(n_calls, dtype=np.float64),
+    )
     
-    for call_id, position in state.positions.items():
-        candles = candles_by_call_id.get(call_id)
-        if not candles or len(candles) == 0:
+    arrays_by_call_id: Dict[str, Tuple[np.ndarray, ...]] = {}
+    for i, call in enumerate(sorted_calls):
+        candles = candles_by_call_id.get(call["id"])
+        if isinstance(candles, tuple):
+            arrays = candles  # (ts_ms, high, low, close) arrays, e.g. from the Arrow transport
+        elif candles:
+            if call["id"] not in arrays_by_call_id:
+                arrays_by_call_id[call["id"]] = candle_arrays(candles)
+            arrays = arrays_by_call_id[call["id"]]
+        else:
             continue
+        if len(arrays[0]) == 0:
+            continue
+        plans.has_candles[i] = True
+        ts_ms, high, low, close = arrays
+        plans.last_px[i] = close[-1]
         
-        # Find exit point up to current time
-        exit_result = find_exit_in_candles(
-            candles,
-            position.entry_ts_ms,
-            position.entry_px,
-            position.tp_price,
-            position.sl_price,
-            position.max_hold_ts_ms,
-            current_time,
-        )
+        # Entry candle: first candle at/after alert time
+        at_or_after = ts_ms >= call["ts_ms"]
+        if not at_or_after.any():
+            continue
+        e = int(at_or_after.argmax())
+        entry_px = float(close[e])
+        if not (entry_px > 0 and math.isfinite(entry_px)):
+            continue
+        entry_ts_ms = int(ts_ms[e])
+        plans.entry_ok[i] = True
+        plans.entry_ts_ms[i] = entry_ts_ms
+        plans.entry_px[i] = entry_px
+        
+        # First candle (from entry) reaching each TP / SL / max hold
+        running_high = np.maximum.accumulate(np.nan_to_num(high[e:], nan=-np.inf))
+        running_low = np.minimum.accumulate(np.nan_to_num(low[e:], nan=np.inf))
+        running_ts = np.maximum.accumulate(ts_ms[e:])
+        tp_price = entry_px * tp_mults
+        sl_price = entry_px * sl_mults
+        j_tp = np.searchsorted(running_high, tp_price, side="left")
+        j_sl = np.searchsorted(-running_low, -sl_price, side="left")
+        j_time = np.searchsorted(running_ts, entry_ts_ms + hold_ms, side="left")
         
-        # Check if exit should have occurred before currentTime
-        if exit_result["exit_ts_ms"] <= current_time:
-            positions_to_exit.append({"position": position, "exit_result": exit_result})
-    
-    # Sort exits by timestamp to process in order
-    positions_to_exit.sort(key=lambda x: x["exit_result"]["exit_ts_ms"])
-    
-    # Execute exits
-    for item in positions_to_exit:
-        position = item["position"]
-        exit_result = item["exit_result"]
-        execute_exit(
-            state,
-            position,
-            exit_result["exit_price"],
-            exit_result["exit_reason"],
-            exit_result["exit_ts_ms"],
-            config,
+        n_after = len(running_ts)
+        j_exit = np.minimum(np.minimum(j_tp, j_sl), j_time)
+        found = j_exit < n_after
+        exit_idx = e + np.minimum(j_exit, n_after - 1)
+        reason = np.where(j_tp == j_exit, 0, np.where(j_sl == j_exit, 1, 2))
+        plans.exit_reason[:, i] = np.where(found, reason, 2)
+        plans.exit_ts_ms[:, i] = ts_ms[exit_idx]
+        plans.exit_px[:, i] = np.where(
+            found & (reason == 0), tp_price,
+            np.where(found & (reason == 1), sl_price, close[exit_idx]),
         )
-        del state.positions[position.call_id]
-
+    
+    return plans
 
-# =============================================================================
-# Main Simulator
-# =============================================================================
 
-def simulate_capital_aware(
-    calls: List[Dict[str, Any]],
-    candles_by_call_id: Dict[str, List[Dict[str, Any]]],
-    params: V1BaselineParams,
+def replay_capital(
+    plans: TradePlans,
+    param_index: int = 0,
     config: Optional[CapitalSimulatorConfig] = None,
 ) -> CapitalSimulationResult:
     """
-    Simulate capital-aware trading over a sequence of alerts.
+    Replay one parameter set of a TradePlans through the capital rules.
     
-    Processes alerts in timestamp order and executes trades with position constraints.
-    
-    Args:
-        calls: List of call dicts with keys: id, mint, caller, ts_ms
-        candles_by_call_id: Dict mapping call_id to list of candle dicts
-        params: V1 baseline parameters (tp_mult, sl_mult, max_hold_hrs)
-        config: Optional simulator configuration
+    Calls are taken in alert order; before each call, positions whose exit
+    time is at or before the alert are closed from a min-heap of
+    (exit_ts_ms, call slot) events. Open positions are array slots indexed
+    by call.
     
-    Returns:
-        CapitalSimulationResult with final capital, trades, etc.
+    Unless cfg.hold_until_exit, positions still open at an alert are then
+    settled at the alert time with their last candle's close (time exit),
+    matching the per-alert rescan of the TypeScript simulator.
     """
     cfg = config or CapitalSimulatorConfig()
-    max_hold_hrs = params.max_hold_hrs if params.max_hold_hrs is not None else cfg.max_trade_horizon_hrs
+    params = plans.params[param_index]
+    exit_ts = plans.exit_ts_ms[param_index].tolist()
+    exit_px = plans.exit_px[param_index].tolist()
+    exit_reason = plans.exit_reason[param_index].tolist()
+    entry_ts = plans.entry_ts_ms.tolist()
+    entry_px = plans.entry_px.tolist()
+    has_candles = plans.has_candles.tolist()
+    entry_ok = plans.entry_ok.tolist()
+    last_px = plans.last_px.tolist()
+    sizes = [0.0] * len(plans.call_ids)
     
-    # Sort calls by timestamp
-    sorted_calls = sorted(calls, key=lambda c: c["ts_ms"])
-    
-    # Initialize capital state
     state = CapitalState(
         initial_capital=cfg.initial_capital,
         free_cash=cfg.initial_capital,
@@ -403,61 +455,73 @@ def simulate_capital_aware(
         positions={},
         completed_trades=[],
     )
-    
-    # Process alerts in timestamp order
-    for call in sorted_calls:
-        alert_ts_ms = call["ts_ms"]
-        
-        # First, check for any positions that should exit before this alert
-        check_and_execute_exits(state, candles_by_call_id, alert_ts_ms, cfg)
+    total_fee_bps = cfg.taker_fee_bps + cfg.slippage_bps
+    events: List[Tuple[int, int]] = []  # (exit_ts_ms, call slot); slots grow in entry order
+    
+    def close_position(slot: int, settle_ts_ms: Optional[int] = None) -> None:
+        size = sizes[slot]
+        if settle_ts_ms is not None and exit_ts[slot] > settle_ts_ms:
+            # Settled at the alert before reaching its own exit
+            slot_exit_ts, slot_exit_px, slot_exit_reason = settle_ts_ms, last_px[slot], "time_exit"
+        else:
+            slot_exit_ts, slot_exit_px = exit_ts[slot], exit_px[slot]
+            slot_exit_reason = EXIT_REASON_CODES[exit_reason[slot]]
+        exit_mult = slot_exit_px / entry_px[slot]
+        gross_pnl = size * (exit_mult - 1)
+        fee_amount = ((size * total_fee_bps) / 10000) * 2  # Entry + exit
+        net_pnl = gross_pnl - fee_amount
+        state.free_cash += size + net_pnl
+        state.total_capital = state.free_cash
+        state.completed_trades.append(TradeExecution(
+            call_id=plans.call_ids[slot],
+            entry_ts_ms=entry_ts[slot],
+            exit_ts_ms=slot_exit_ts,
+            entry_px=entry_px[slot],
+            exit_px=slot_exit_px,
+            size=size,
+            pnl=net_pnl,
+            exit_reason=slot_exit_reason,
+            exit_mult=exit_mult,
+        ))
+    
+    for slot, alert_ts_ms in enumerate(plans.alert_ts_ms.tolist()):
+        # Close positions that exited at or before this alert
+        while events and events[0][0] <= alert_ts_ms:
+            close_position(heapq.heappop(events)[1])
+        if not cfg.hold_until_exit:
+            while events:
+                close_position(heapq.heappop(events)[1], alert_ts_ms)
         
         # Check if we can take a new position
-        if len(state.positions) >= cfg.max_concurrent_positions:
+        if len(events) >= cfg.max_concurrent_positions:
             continue  # Skip - max positions reached
-        
-        candles = candles_by_call_id.get(call["id"])
-        if not candles or len(candles) == 0:
+        if not has_candles[slot]:
             continue
         
-        # Calculate position size
         position_size = calculate_position_size(
             params.sl_mult,
             cfg.max_risk_per_trade,
             cfg.max_allocation_pct,
             state.free_cash,
         )
-        
-        # Check minimum executable size
         if position_size < cfg.min_executable_size:
             continue  # Skip - size too small
-        
-        # Check if we have enough capital
         if position_size > state.free_cash:
             continue  # Skip - insufficient capital
+        if not entry_ok[slot]:
+            continue  # No usable entry candle
         
-        # Execute entry
-        entry_result = execute_entry(
-            state,
-            call,
-            candles,
-            params,
-            position_size,
-            max_hold_hrs,
-            alert_ts_ms,
-            cfg,
-        )
-        
-        if entry_result:
-            state.positions[call["id"]] = entry_result["position"]
+        state.free_cash -= position_size
+        sizes[slot] = position_size
+        heapq.heappush(events, (exit_ts[slot], slot))
     
     # Process remaining open positions at end
-    # Use a large timestamp to force all exits
-    check_and_execute_exits(state, candles_by_call_id, sys.maxsize, cfg)
+    while events:
+        close_position(heapq.heappop(events)[1])
     
     # Final capital update (all positions should be closed now)
     state.total_capital = state.free_cash
     
-    # Calculate final metrics
     total_return = (state.total_capital - cfg.initial_capital) / cfg.initial_capital
     trades_executed = sum(
         1 for t in state.completed_trades
@@ -478,6 +542,41 @@ def simulate_capital_aware(
     )
 
 
+# =============================================================================
+# Main Simulator
+# =============================================================================
+
+def simulate_capital_aware(
+    calls: List[Dict[str, Any]],
+    candles_by_call_id: Dict[str, List[Dict[str, Any]]],
+    params: V1BaselineParams,
+    config: Optional[CapitalSimulatorConfig] = None,
+) -> CapitalSimulationResult:
+    """
+    Simulate capital-aware trading over a sequence of alerts.
+    
+    Processes alerts in timestamp order and executes trades with position constraints.
+    Open positions are settled at the next alert (at their own exit if it comes
+    first, else at the alert with the last candle's close); with
+    config.hold_until_exit each position instead stays open (holding its
+    capital and a concurrency slot) until its own TP / SL / time exit.
+    
+    To evaluate several parameter sets, call plan_trades() once with all of
+    them and replay_capital() per set (see optimize_v1_baseline).
+    
+    Args:
+        calls: List of call dicts with keys: id, mint, caller, ts_ms
+        candles_by_call_id: Dict mapping call_id to list of candle dicts
+        params: V1 baseline parameters (tp_mult, sl_mult, max_hold_hrs)
+        config: Optional simulator configuration
+    
+    Returns:
+        CapitalSimulationResult with final capital, trades, etc.
+    """
+    cfg = config or CapitalSimulatorConfig()
+    return replay_capital(plan_trades(calls, candles_by_call_id, [params], cfg), 0, cfg)
+
+
 # =============================================================================
 # CLI / Stdin Wrapper (for TypeScript integration)
 # =============================================================================
@@ -486,20 +585,24 @@ def main_stdin() -> None:
     """
     Main entry point for stdin-based operation (called by TypeScript).
     
-    Reads JSON from stdin, executes operation, writes JSON to stdout.
+    Reads a JSON request (or an Arrow request, see v1_baseline_transport) from
+    stdin, executes operation, writes JSON (or Arrow) to stdout.
     """
     import json
-    import sys
+    
+    try:
+        from .v1_baseline_transport import read_request, write_response
+    except ImportError:
+        from lib.v1_baseline_transport import read_request, write_response
     
     try:
         # Read input from stdin
-        input_data = json.load(sys.stdin)
+        input_data, candles_by_call_id = read_request(sys.stdin.buffer)
         operation = input_data.get("operation")
         
         if operation == "simulate":
             # Extract config
             calls = input_data["calls"]
-            candles_by_call_id = input_data["candles_by_call_id"]
             params_dict = input_data["params"]
             config_dict = input_data.get("config")
             
@@ -518,29 +621,15 @@ def main_stdin() -> None:
             # Run simulation
             result = simulate_capital_aware(calls, candles_by_call_id, params, config)
             
-            # Convert to dict for JSON serialization
             output = {
                 "final_capital": result.final_capital,
                 "total_return": result.total_return,
                 "trades_executed": result.trades_executed,
                 "trades_skipped": result.trades_skipped,
-                "completed_trades": [
-                    {
-                        "call_id": t.call_id,
-                        "entry_ts_ms": t.entry_ts_ms,
-                        "exit_ts_ms": t.exit_ts_ms,
-                        "entry_px": t.entry_px,
-                        "exit_px": t.exit_px,
-                        "size": t.size,
-                        "pnl": t.pnl,
-                        "exit_reason": t.exit_reason,
-                        "exit_mult": t.exit_mult,
-                    }
-                    for t in result.completed_trades
-                ],
+                "completed_trades": result.completed_trades,
             }
             
-            json.dump(output, sys.stdout)
+            write_response(output, sys.stdout.buffer, input_data.get("result_format", "json"))
             
         else:
             raise ValueError(f"Unknown operation: {operation}")
@@ -0,0 +1,197 @@
+"""
+V1 Baseline stdin/stdout Transport
+
+Request/response framing for the TypeScript-invoked V1 baseline scripts
+(v1_baseline_simulator.py, v1_baseline_optimizer.py). The TypeScript service
+(v1-baseline-python-service.ts) sends Arrow requests with "candles_path" set
+to a Parquet file and reads JSON responses.
+
+Requests (stdin):
+- JSON (default): one JSON document holding operation, calls,
+  candles_by_call_id (candle dicts) and options - unchanged.
+- Arrow: the ARROW_REQUEST_MAGIC line, a single-line JSON header with
+  everything except candles, then the candles as an Arrow IPC stream.
+  Instead of the stream the header may name a Parquet / Arrow IPC file in
+  "candles_path".
+  Candle columns: call_id, timestamp (unix seconds or an Arrow timestamp),
+  high, low, close.
+
+Responses (stdout), chosen by the request's "result_format":
+- "json" (default): one JSON document - unchanged.
+- "arrow": a single-line JSON header in which completed_trades is replaced by
+  {"format": "arrow", "rows": n}, followed by the trades as an Arrow IPC
+  stream (columns TRADE_COLUMNS). Responses without trades are header only.
+
+Errors are always reported as a JSON document.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Tuple
+
+import numpy as np
+
+CANDLE_COLUMNS = ("call_id", "timestamp", "high", "low", "close")
+# First line of an Arrow request; a JSON request cannot start with it
+ARROW_REQUEST_MAGIC = b"V1ARROW\n"
+TRADE_COLUMNS = (
+    "call_id", "entry_ts_ms", "exit_ts_ms", "entry_px", "exit_px",
+    "size", "pnl", "exit_reason", "exit_mult",
+)
+
+
+def read_request(stream: BinaryIO) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Read a request from a binary stream.
+
+    Returns (request, candles_by_call_id). For Arrow requests the candle
+    values are (ts_ms, high, low, close) array tuples, which the simulator
+    uses as-is; for JSON requests they are the candle dict lists.
+    """
+    prefix = stream.read(len(ARROW_REQUEST_MAGIC))
+    if prefix != ARROW_REQUEST_MAGIC:
+        request = json.loads(prefix + stream.read())
+        return request, request.get("candles_by_call_id", {})
+
+    import pyarrow as pa
+
+    header = json.loads(stream.readline())
+    if header.get("candles_path"):
+        table = read_candle_file(header["candles_path"])
+    else:
+        table = pa.ipc.open_stream(stream).read_all()
+    return header, candles_from_table(table)
+
+
+def read_candle_file(path: str):
+    """Read a Parquet or Arrow IPC candle file."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if Path(path).suffix.lower() == ".parquet":
+        return pq.read_table(path, columns=list(CANDLE_COLUMNS))
+    with pa.memory_map(path) as source:
+        try:
+            return pa.ipc.open_file(source).read_all().select(list(CANDLE_COLUMNS))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            return pa.ipc.open_stream(source).read_all().select(list(CANDLE_COLUMNS))
+
+
+def candles_from_table(table) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Split a candle table into per-call (ts_ms, high, low, close) arrays.
+
+    Rows are ordered by (call_id, timestamp); numeric timestamps are unix
+    seconds, as in the JSON candle dicts.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    missing = [c for c in CANDLE_COLUMNS if c not in table.column_names]
+    if missing:
+        raise ValueError(f"Candle table is missing columns: {missing}")
+
+    ts_col = table.column("timestamp")
+    if pa.types.is_timestamp(ts_col.type):
+        ts_ms = ts_col.cast(pa.timestamp("ms", tz=ts_col.type.tz)).cast(pa.int64())
+    else:
+        ts_ms = pc.multiply(ts_col.cast(pa.float64()), 1000).cast(pa.int64(), safe=False)
+    table = pa.table({
+        "call_id": table.column("call_id").cast(pa.string()),
+        "ts_ms": ts_ms,
+        "high": table.column("high").cast(pa.float64()),
+        "low": table.column("low").cast(pa.float64()),
+        "close": table.column("close").cast(pa.float64()),
+    }).sort_by([("call_id", "ascending"), ("ts_ms", "ascending")])
+
+    n = table.num_rows
+    if n == 0:
+        return {}
+    call_ids = table.column("call_id")
+    starts = np.flatnonzero(
+        pc.not_equal(call_ids.slice(1), call_ids.slice(0, n - 1)).to_numpy(zero_copy_only=False)
+    ) + 1
+    offsets = np.concatenate(([0], starts, [n]))
+
+    ts = table.column("ts_ms").to_numpy()
+    high = table.column("high").to_numpy()
+    low = table.column("low").to_numpy()
+    close = table.column("close").to_numpy()
+    ids = call_ids.take(pa.array(offsets[:-1])).to_pylist()
+    return {
+        call_id: (ts[a:b], high[a:b], low[a:b], close[a:b])
+        for call_id, a, b in zip(ids, offsets[:-1], offsets[1:])
+    }
+
+
+def trades_table(trades: List[Any]):
+    """Completed trades (TradeExecution or dicts) as an Arrow table."""
+    import pyarrow as pa
+
+    rows = [t if isinstance(t, dict) else asdict(t) for t in trades]
+    columns = {name: [row[name] for row in rows] for name in TRADE_COLUMNS}
+    return pa.table({
+        "call_id": pa.array(columns["call_id"], pa.string()),
+        "entry_ts_ms": pa.array(columns["entry_ts_ms"], pa.int64()),
+        "exit_ts_ms": pa.array(columns["exit_ts_ms"], pa.int64()),
+        "entry_px": pa.array(columns["entry_px"], pa.float64()),
+        "exit_px": pa.array(columns["exit_px"], pa.float64()),
+        "size": pa.array(columns["size"], pa.float64()),
+        "pnl": pa.array(columns["pnl"], pa.float64()),
+        "exit_reason": pa.array(columns["exit_reason"], pa.string()),
+        "exit_mult": pa.array(columns["exit_mult"], pa.float64()),
+    })
+
+
+def _take_trades(node: Any, found: List[List[Any]]) -> Any:
+    """Copy of node with completed_trades lists pulled out into found."""
+    if isinstance(node, dict):
+        out = {}
+        for key, value in node.items():
+            if key == "completed_trades" and isinstance(value, list):
+                found.append(value)
+                out[key] = {"format": "arrow", "rows": len(value)}
+            else:
+                out[key] = _take_trades(value, found)
+        return out
+    return node
+
+
+def _trades_as_dicts(node: Any) -> Any:
+    """Copy of node with TradeExecution objects converted to dicts."""
+    if isinstance(node, dict):
+        return {key: _trades_as_dicts(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_trades_as_dicts(value) for value in node]
+    if hasattr(node, "__dataclass_fields__"):
+        return asdict(node)
+    return node
+
+
+def write_response(output: Dict[str, Any], stream: BinaryIO, result_format: str = "json") -> None:
+    """
+    Write a response; completed_trades lists may hold TradeExecution objects.
+
+    Arrow responses carry at most one completed_trades list.
+    """
+    if result_format != "arrow":
+        stream.write(json.dumps(_trades_as_dicts(output)).encode())
+        stream.flush()
+        return
+
+    import pyarrow as pa
+
+    found: List[List[Any]] = []
+    header = _take_trades(output, found)
+    if len(found) > 1:
+        raise ValueError("Arrow responses carry at most one completed_trades list")
+    stream.write(json.dumps(header).encode() + b"\n")
+    if found:
+        table = trades_table(found[0])
+        with pa.ipc.new_stream(stream, table.schema) as writer:
+            writer.write_table(table)
+    stream.flush()
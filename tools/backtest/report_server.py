@@ -7,13 +7,21 @@ Generates reports on-demand from DuckDB data.
 """
 
 import argparse
+import gzip
+import hashlib
 import json
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
-from urllib.parse import unquote
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
 
 import duckdb
 import pandas as pd
@@ -71,12 +79,252 @@ except ImportError as e:
     generate_drilldown_report = generate_drilldown_module.generate_drilldown_report
 
 
+# Responses smaller than this are sent uncompressed (gzip overhead isn't worth it)
+GZIP_MIN_BYTES = 1024
+
+# /api/runs pagination defaults
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def db_version(db_path: str) -> Tuple[int, int]:
+    """
+    Version token for a DuckDB file: (mtime_ns, size).
+
+    Any committed write changes at least one of these, so cached responses
+    tagged with an older version are stale.
+    """
+    try:
+        st = os.stat(db_path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (0, 0)
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "version", "users", "last_used")
+
+    def __init__(self, conn, version: Tuple[int, int]):
+        self.conn = conn
+        self.version = version
+        self.users = 0
+        self.last_used = time.monotonic()
+
+
+class ReadOnlyConnectionPool:
+    """
+    One shared read-only DuckDB connection per database file.
+
+    Each request gets its own cursor (DuckDB cursors are safe to use from
+    separate threads), so concurrent requests share the buffer pool and
+    catalog instead of re-opening the file every time.
+
+    A read-only connection holds the file lock, which blocks writers
+    (run_baseline.py, run_tp_sl.py, ...). The connection is therefore
+    closed once it has been idle for ``idle_timeout`` seconds, and re-opened
+    when the file has changed underneath it. ``idle_timeout=0`` closes it
+    as soon as the last cursor is released (the old per-request behavior).
+    """
+
+    def __init__(self, idle_timeout: float = 5.0):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _PooledConnection] = {}
+        self._reaper: Optional[threading.Thread] = None
+
+    @contextmanager
+    def cursor(self, db_path: str) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow a cursor on the shared read-only connection for db_path."""
+        with self._lock:
+            entry = self._entries.get(db_path)
+            version = db_version(db_path)
+            if entry is not None and entry.users == 0 and entry.version != version:
+                entry.conn.close()
+                entry = None
+            if entry is None:
+                entry = _PooledConnection(duckdb.connect(db_path, read_only=True), version)
+                self._entries[db_path] = entry
+            entry.users += 1
+            cur = entry.conn.cursor()
+        try:
+            yield cur
+        finally:
+            try:
+                cur.close()
+            finally:
+                self._release(db_path, entry)
+
+    def _release(self, db_path: str, entry: _PooledConnection) -> None:
+        with self._lock:
+            entry.users -= 1
+            entry.last_used = time.monotonic()
+            if entry.users > 0:
+                return
+            if self.idle_timeout <= 0:
+                self._close_entry(db_path, entry)
+            elif self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_loop, name="duckdb-pool-reaper", daemon=True)
+                self._reaper.start()
+
+    def _close_entry(self, db_path: str, entry: _PooledConnection) -> None:
+        # Caller holds self._lock
+        if self._entries.get(db_path) is entry:
+            del self._entries[db_path]
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    def _reap_loop(self) -> None:
+        while True:
+            time.sleep(max(self.idle_timeout / 2, 0.1))
+            now = time.monotonic()
+            with self._lock:
+                for db_path, entry in list(self._entries.items()):
+                    if entry.users == 0 and now - entry.last_used >= self.idle_timeout:
+                        self._close_entry(db_path, entry)
+
+    def close_all(self) -> None:
+        """Close every idle pooled connection."""
+        with self._lock:
+            for db_path, entry in list(self._entries.items()):
+                if entry.users == 0:
+                    self._close_entry(db_path, entry)
+
+
+@dataclass
+class CachedResponse:
+    """A rendered response body plus its transport variants."""
+    body: bytes
+    content_type: str
+    etag: str
+    gzipped: Optional[bytes] = None
+
+    @classmethod
+    def build(cls, body: bytes, content_type: str) -> "CachedResponse":
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+        return cls(body=body, content_type=content_type, etag=etag, gzipped=gzipped)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + (len(self.gzipped) if self.gzipped else 0)
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of rendered responses.
+
+    Entries are keyed by request (e.g. ('report', run_id, run_type)) and
+    tagged with the DuckDB file version they were rendered from; a lookup
+    against a newer version is a miss. Total size is bounded by max_bytes.
+
+    lock_for(key) gives a per-key lock so that N concurrent requests for the
+    same (expensive) run report render it once instead of N times.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Tuple[Tuple[int, int], CachedResponse]]" = OrderedDict()
+        self._bytes = 0
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+
+    def get(self, key: tuple, version: Tuple[int, int]) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            if item[0] != version:
+                self._evict(key)
+                return None
+            self._entries.move_to_end(key)
+            return item[1]
+
+    def put(self, key: tuple, version: Tuple[int, int], response: CachedResponse) -> CachedResponse:
+        if self.max_bytes <= 0 or response.size > self.max_bytes:
+            return response
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = (version, response)
+            self._bytes += response.size
+            while self._bytes > self.max_bytes and self._entries:
+                self._evict(next(iter(self._entries)))
+        return response
+
+    def invalidate(self, key: tuple) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+
+    def _evict(self, key: tuple) -> None:
+        # Caller holds self._lock
+        _, response = self._entries.pop(key)
+        self._bytes -= response.size
+        # Drop the key's render lock with its entry so _key_locks stays bounded
+        # by the cache. A held lock stays; losing an idle one at worst lets two
+        # requests render the same key once.
+        lock = self._key_locks.get(key)
+        if lock is not None and not lock.locked():
+            del self._key_locks[key]
+
+    def lock_for(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+
+class ReportError(Exception):
+    """Report could not be produced; carries the HTTP status to send."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles requests on a bounded thread pool."""
+
+    def __init__(self, server_address, handler_class, max_workers: int = 8):
+        super().__init__(server_address, handler_class)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-server")
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
 class ReportHandler(BaseHTTPRequestHandler):
     """HTTP handler for report server."""
     
-    def __init__(self, duckdb_path: str, slices_dir: str, *args, **kwargs):
+    def __init__(
+        self,
+        duckdb_path: str,
+        slices_dir: str,
+        pool: ReadOnlyConnectionPool,
+        cache: ResponseCache,
+        *args,
+        **kwargs,
+    ):
         self.duckdb_path = duckdb_path
         self.slices_dir = slices_dir
+        self.pool = pool
+        self.cache = cache
         super().__init__(*args, **kwargs)
     
     def log_message(self, format, *args):
@@ -117,21 +365,78 @@ class ReportHandler(BaseHTTPRequestHandler):
     
     def get_query_param(self, key: str, default: str = None) -> Optional[str]:
         """Extract query parameter from URL."""
-        if '?' not in self.path:
-            return default
-        query = self.path.split('?')[1]
-        params = {}
-        for pair in query.split('&'):
-            if '=' in pair:
-                k, v = pair.split('=', 1)
-                params[k] = v
-        return params.get(key, default)
+        values = parse_qs(urlsplit(self.path).query).get(key)
+        return values[0] if values else default
+    
+    def get_int_query_param(self, key: str, default: int, minimum: int, maximum: int) -> int:
+        """Extract an integer query parameter, clamped to [minimum, maximum]."""
+        try:
+            value = int(self.get_query_param(key, default))
+        except (TypeError, ValueError):
+            value = default
+        return max(minimum, min(maximum, value))
+    
+    def cached(self, key: tuple, content_type: str, render) -> Optional[CachedResponse]:
+        """
+        Return the cached response for key, rendering it with render() on a miss.
+        
+        render() returns the body (str or bytes) or None if there is nothing to
+        serve; None results are not cached.
+        """
+        version = db_version(self.duckdb_path)
+        hit = self.cache.get(key, version)
+        if hit is not None:
+            return hit
+        with self.cache.lock_for(key):
+            # Another thread may have rendered it while we waited
+            hit = self.cache.get(key, version)
+            if hit is not None:
+                return hit
+            body = render()
+            if body is None:
+                return None
+            if isinstance(body, str):
+                body = body.encode()
+            return self.cache.put(key, version, CachedResponse.build(body, content_type))
+    
+    def send_cached_response(self, response: CachedResponse):
+        """Send a cached response, honoring If-None-Match and Accept-Encoding."""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match and response.etag in [t.strip() for t in if_none_match.split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', response.etag)
+            self.end_headers()
+            return
+        
+        accepts_gzip = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+        payload = response.gzipped if (accepts_gzip and response.gzipped is not None) else response.body
+        
+        self.send_response(200)
+        self.send_header('Content-type', response.content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', response.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if payload is response.gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        
+        # Write in chunks to avoid overwhelming the connection
+        chunk_size = 1024 * 1024  # 1MB chunks
+        for i in range(0, len(payload), chunk_size):
+            self.wfile.write(payload[i:i + chunk_size])
+        self.wfile.flush()
     
     def send_index(self):
         """Send index page with list of all runs."""
-        runs = self.list_all_runs()
+        response = self.cached(('index',), 'text/html; charset=utf-8', self.render_index)
+        self.send_cached_response(response)
+    
+    def render_index(self) -> str:
+        """Render index page HTML."""
+        runs = self.runs_snapshot()
         
-        html = f'''<!DOCTYPE html>
+        return f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -308,11 +613,6 @@ class ReportHandler(BaseHTTPRequestHandler):
     </script>
 </body>
 </html>'''
-        
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html.encode())
     
     def render_runs_table(self, runs: List[Dict]) -> str:
         """Render runs table HTML."""
@@ -367,141 +667,177 @@ class ReportHandler(BaseHTTPRequestHandler):
     
     def list_all_runs(self) -> List[Dict]:
         """List all runs from all schemas."""
-        try:
-            conn = duckdb.connect(self.duckdb_path, read_only=True)
-        except Exception as e:
-            print(f"Error connecting to DuckDB: {e}", file=sys.stderr)
-            return []
-        
         runs = []
         
-        # Query baseline runs
         try:
-            # Check if schema exists first - try to query information_schema
-            try:
-                schemas = [row[0] for row in conn.execute("SELECT schema_name FROM information_schema.schemata WHERE schema_name NOT IN ('pg_catalog', 'information_schema', 'temp')").fetchall()]
-            except:
-                # Fallback: just try the query and catch if it fails
-                schemas = ['baseline', 'bt', 'optimizer']  # Assume they exist
-            
-            # Query baseline runs
-            if 'baseline' in schemas:
-                baseline_runs = conn.execute("""
-                    SELECT run_id, run_name, created_at, date_from, date_to, 
-                           interval_seconds, horizon_hours, chain
-                    FROM baseline.runs_d
-                    ORDER BY created_at DESC
-                """).fetchall()
+            with self.pool.cursor(self.duckdb_path) as conn:
+                # Check if schema exists first - try to query information_schema
+                try:
+                    schemas = [row[0] for row in conn.execute("SELECT schema_name FROM information_schema.schemata WHERE schema_name NOT IN ('pg_catalog', 'information_schema', 'temp')").fetchall()]
+                except Exception:
+                    # Fallback: just try the query and catch if it fails
+                    schemas = ['baseline', 'bt', 'optimizer']  # Assume they exist
                 
-                for row in baseline_runs:
-                    runs.append({
-                        'run_id': row[0],
-                        'run_name': row[1] if row[1] else f"baseline_{row[0][:8]}",
-                        'created_at': row[2],
-                        'date_from': row[3],
-                        'date_to': row[4],
-                        'interval_seconds': row[5],
-                        'horizon_hours': row[6],
-                        'chain': row[7] if len(row) > 7 else 'solana',
-                        'run_type': 'baseline'
-                    })
-                print(f"Found {len(baseline_runs)} baseline runs", file=sys.stderr)
-            else:
-                print("baseline schema not found", file=sys.stderr)
-        except Exception as e:
-            print(f"Warning: Could not query baseline runs: {e}", file=sys.stderr)
-            import traceback
-            traceback.print_exc()
-        
-            # Query bt (strategy) runs
-            if 'bt' in schemas:
-                bt_runs = conn.execute("""
-                    SELECT run_id, run_name, created_at, date_from, date_to,
-                           interval_seconds, horizon_hours, chain
-                    FROM bt.runs_d
-                    ORDER BY created_at DESC
-                """).fetchall()
+                # Query baseline runs
+                if 'baseline' in schemas:
+                    try:
+                        baseline_runs = conn.execute("""
+                            SELECT run_id, run_name, created_at, date_from, date_to, 
+                                   interval_seconds, horizon_hours, chain
+                            FROM baseline.runs_d
+                            ORDER BY created_at DESC
+                        """).fetchall()
+                        
+                        for row in baseline_runs:
+                            runs.append({
+                                'run_id': row[0],
+                                'run_name': row[1] if row[1] else f"baseline_{row[0][:8]}",
+                                'created_at': row[2],
+                                'date_from': row[3],
+                                'date_to': row[4],
+                                'interval_seconds': row[5],
+                                'horizon_hours': row[6],
+                                'chain': row[7] if len(row) > 7 else 'solana',
+                                'run_type': 'baseline'
+                            })
+                        print(f"Found {len(baseline_runs)} baseline runs", file=sys.stderr)
+                    except Exception as e:
+                        print(f"Warning: Could not query baseline runs: {e}", file=sys.stderr)
+                else:
+                    print("baseline schema not found", file=sys.stderr)
                 
-                for row in bt_runs:
-                    runs.append({
-                        'run_id': row[0],
-                        'run_name': row[1] if row[1] else f"strategy_{row[0][:8]}",
-                        'created_at': row[2],
-                        'date_from': row[3],
-                        'date_to': row[4],
-                        'interval_seconds': row[5],
-                        'horizon_hours': row[6],
-                        'chain': row[7] if len(row) > 7 else 'solana',
-                        'run_type': 'strategy'
-                    })
-                print(f"Found {len(bt_runs)} strategy runs", file=sys.stderr)
-            else:
-                print("bt schema not found", file=sys.stderr)
-            
-            # Query optimizer runs
-            if 'optimizer' in schemas:
-                opt_runs = conn.execute("""
-                    SELECT run_id, name, created_at, date_from, date_to,
-                           interval_seconds, horizon_hours
-                    FROM optimizer.runs_d
-                    ORDER BY created_at DESC
-                """).fetchall()
-            
-                for row in opt_runs:
-                    runs.append({
-                        'run_id': row[0],
-                        'run_name': row[1] if row[1] else f"optimizer_{row[0][:8]}",
-                        'created_at': row[2],
-                        'date_from': row[3],
-                        'date_to': row[4],
-                        'interval_seconds': row[5],
-                        'horizon_hours': row[6],
-                        'chain': 'solana',
-                        'run_type': 'optimizer'
-                    })
-                print(f"Found {len(opt_runs)} optimizer runs", file=sys.stderr)
-            else:
-                print("optimizer schema not found", file=sys.stderr)
+                # Query bt (strategy) runs
+                if 'bt' in schemas:
+                    try:
+                        bt_runs = conn.execute("""
+                            SELECT run_id, run_name, created_at, date_from, date_to,
+                                   interval_seconds, horizon_hours, chain
+                            FROM bt.runs_d
+                            ORDER BY created_at DESC
+                        """).fetchall()
+                        
+                        for row in bt_runs:
+                            runs.append({
+                                'run_id': row[0],
+                                'run_name': row[1] if row[1] else f"strategy_{row[0][:8]}",
+                                'created_at': row[2],
+                                'date_from': row[3],
+                                'date_to': row[4],
+                                'interval_seconds': row[5],
+                                'horizon_hours': row[6],
+                                'chain': row[7] if len(row) > 7 else 'solana',
+                                'run_type': 'strategy'
+                            })
+                        print(f"Found {len(bt_runs)} strategy runs", file=sys.stderr)
+                    except Exception as e:
+                        print(f"Warning: Could not query strategy runs: {e}", file=sys.stderr)
+                else:
+                    print("bt schema not found", file=sys.stderr)
+                
+                # Query optimizer runs
+                if 'optimizer' in schemas:
+                    try:
+                        opt_runs = conn.execute("""
+                            SELECT run_id, name, created_at, date_from, date_to,
+                                   interval_seconds, horizon_hours
+                            FROM optimizer.runs_d
+                            ORDER BY created_at DESC
+                        """).fetchall()
+                    
+                        for row in opt_runs:
+                            runs.append({
+                                'run_id': row[0],
+                                'run_name': row[1] if row[1] else f"optimizer_{row[0][:8]}",
+                                'created_at': row[2],
+                                'date_from': row[3],
+                                'date_to': row[4],
+                                'interval_seconds': row[5],
+                                'horizon_hours': row[6],
+                                'chain': 'solana',
+                                'run_type': 'optimizer'
+                            })
+                        print(f"Found {len(opt_runs)} optimizer runs", file=sys.stderr)
+                    except Exception as e:
+                        print(f"Warning: Could not query optimizer runs: {e}", file=sys.stderr)
+                else:
+                    print("optimizer schema not found", file=sys.stderr)
         except Exception as e:
             print(f"Warning: Could not query runs: {e}", file=sys.stderr)
             import traceback
             traceback.print_exc()
-        finally:
-            conn.close()
         
         print(f"Total runs found: {len(runs)}", file=sys.stderr)
         return runs
     
     def send_runs_api(self):
-        """Send runs list as JSON API."""
-        runs = self.list_all_runs()
-        self.send_json_response(runs)
+        """
+        Send runs list as JSON API.
+        
+        Paginated with ?limit=N&offset=M (limit defaults to 100, max 1000).
+        The full run list is cached per DB version; pages are sliced from it.
+        """
+        limit = self.get_int_query_param('limit', DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        offset = self.get_int_query_param('offset', 0, 0, sys.maxsize)
+        
+        def render_page():
+            runs = self.runs_snapshot()
+            return json.dumps({
+                'runs': runs[offset:offset + limit],
+                'total': len(runs),
+                'limit': limit,
+                'offset': offset,
+            }, default=str)
+        
+        response = self.cached(('api_runs', limit, offset), 'application/json', render_page)
+        self.send_cached_response(response)
+    
+    def runs_snapshot(self) -> List[Dict]:
+        """All runs for the current DB version (cached, shared by every page)."""
+        response = self.cached(
+            ('runs',), 'application/json',
+            lambda: json.dumps(self.list_all_runs(), default=str),
+        )
+        return json.loads(response.body)
     
     def send_run_data_api(self, run_id: str, run_type: str):
         """Send run data as JSON API."""
-        # Export run data to CSV first, then return metadata
-        csv_path = self.export_run_to_csv(run_id, run_type)
-        if csv_path:
-            self.send_json_response({
+        def render():
+            # Export run data to CSV first, then return metadata
+            csv_path = self.export_run_to_csv(run_id, run_type)
+            if not csv_path:
+                return None
+            return json.dumps({
                 'run_id': run_id,
                 'run_type': run_type,
                 'csv_path': csv_path,
                 'status': 'ready'
             })
+        
+        key = ('api_run', run_id, run_type)
+        response = self.cached(key, 'application/json', render)
+        if response is not None and not os.path.exists(json.loads(response.body)['csv_path']):
+            # CSV was cleaned up since it was cached - export again
+            self.cache.invalidate(key)
+            response = self.cached(key, 'application/json', render)
+        if response is not None:
+            self.send_cached_response(response)
         else:
             self.send_error(404, "Run not found")
     
     def export_run_to_csv(self, run_id: str, run_type: str) -> Optional[str]:
         """Export run data from DuckDB to CSV."""
-        try:
-            conn = duckdb.connect(self.duckdb_path, read_only=True)
-        except Exception as e:
-            print(f"Error connecting to DuckDB: {e}", file=sys.stderr)
-            return None
-        
         csv_path = os.path.abspath(f"results/tmp_{run_id}.csv")
         os.makedirs(os.path.dirname(csv_path), exist_ok=True)
         
+        try:
+            with self.pool.cursor(self.duckdb_path) as conn:
+                return self._write_run_csv(conn, run_id, run_type, csv_path)
+        except Exception as e:
+            print(f"Error exporting run: {e}", file=sys.stderr)
+            return None
+    
+    def _write_run_csv(self, conn, run_id: str, run_type: str, csv_path: str) -> Optional[str]:
+        """Query one run's rows on conn and write them to csv_path."""
         try:
             if run_type == 'baseline':
                 # Export from baseline.alert_results_f
@@ -544,12 +880,10 @@ class ReportHandler(BaseHTTPRequestHandler):
                 print(f"Exported {len(df)} rows from strategy", file=sys.stderr)
             else:
                 print(f"Unknown run type: {run_type}", file=sys.stderr)
-                conn.close()
                 return None
             
             if df.empty:
                 print(f"No data found for {run_type} run {run_id}", file=sys.stderr)
-                conn.close()
                 return None
             
             # Check what columns we actually have
@@ -591,41 +925,72 @@ class ReportHandler(BaseHTTPRequestHandler):
                 # Convert timestamp to string if needed
                 df['alert_ts_utc'] = pd.to_datetime(df['alert_ts_utc']).dt.strftime('%Y-%m-%d %H:%M:%S')
             
-            # Save to CSV
-            df.to_csv(csv_path, index=False)
+            # Save to CSV. The API and report handlers export the same run under
+            # different cache keys, so write a private file and swap it in.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(csv_path), suffix=".csv.tmp")
+            try:
+                with os.fdopen(fd, "w", newline="") as f:
+                    df.to_csv(f, index=False)
+                os.replace(tmp_path, csv_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
             print(f"Saved CSV to {csv_path} with {len(df)} rows", file=sys.stderr)
-            conn.close()
             return csv_path
         except Exception as e:
             print(f"Error exporting run: {e}", file=sys.stderr)
-            conn.close()
             return None
     
     def send_run_report(self, run_id: str, run_type: str):
-        """Generate and send report for a specific run."""
+        """Generate (or reuse the cached) report for a specific run and send it."""
+        try:
+            response = self.cached(
+                ('report', run_id, run_type), 'text/html; charset=utf-8',
+                lambda: self.render_run_report(run_id, run_type),
+            )
+            self.send_cached_response(response)
+            print(f"Report sent for {run_id}", file=sys.stderr)
+        except (BrokenPipeError, ConnectionResetError, OSError) as e:
+            # Client disconnected - not a real error, just log it
+            print(f"Client disconnected during report generation for {run_id}: {e}", file=sys.stderr)
+            return
+        except ReportError as e:
+            try:
+                self.send_error(e.status, e.message)
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                return
+        except Exception as e:
+            print(f"Error generating report: {e}", file=sys.stderr)
+            import traceback
+            traceback.print_exc()
+            try:
+                # Only send error if connection is still alive
+                self.send_error(500, f"Error generating report: {str(e)}")
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                # Client already disconnected, can't send error
+                print(f"Client disconnected before error response could be sent", file=sys.stderr)
+                return
+    
+    def render_run_report(self, run_id: str, run_type: str) -> str:
+        """Export a run to CSV and render its drill-down HTML report."""
         # Export to CSV first
         csv_path = self.export_run_to_csv(run_id, run_type)
         if not csv_path:
-            self.send_error(404, f"Run {run_id} not found or export failed")
-            return
+            raise ReportError(404, f"Run {run_id} not found or export failed")
         
         if not os.path.exists(csv_path):
-            self.send_error(404, f"CSV file was not created: {csv_path}")
-            return
+            raise ReportError(404, f"CSV file was not created: {csv_path}")
         
         csv_size = os.path.getsize(csv_path)
         print(f"CSV exported: {csv_path} ({csv_size} bytes)", file=sys.stderr)
         
         if csv_size == 0:
-            self.send_error(500, f"CSV file is empty: {csv_path}")
-            return
+            raise ReportError(500, f"CSV file is empty: {csv_path}")
         
-        # Generate report
-        try:
-            # Get run config from DuckDB to extract TP/SL params
-            conn = duckdb.connect(self.duckdb_path, read_only=True)
-            config = {}
-            
+        # Get run config from DuckDB to extract TP/SL params
+        config = {}
+        row = None
+        with self.pool.cursor(self.duckdb_path) as conn:
             if run_type == 'baseline':
                 row = conn.execute("""
                     SELECT config_json FROM baseline.runs_d WHERE run_id = ?
@@ -644,129 +1009,119 @@ class ReportHandler(BaseHTTPRequestHandler):
                 row = conn.execute("""
                     SELECT config_json FROM optimizer.runs_d WHERE run_id = ?
                 """, [run_id]).fetchone()
-            
-            if not config and row and row[0]:
-                try:
-                    config = json.loads(row[0]) if isinstance(row[0], str) else row[0]
-                except:
-                    config = {}
-            conn.close()
-            
-            tp_mult = config.get('tp_mult', config.get('first_tp_mult', 80.0))
-            sl_mult = config.get('sl_mult', 0.7)
-            risk_per_trade = config.get('risk_per_trade', 0.02)
-            
-            # Generate HTML report - use absolute paths
-            html_path = os.path.abspath(f"results/tmp_{run_id}_report.html")
-            csv_path_abs = os.path.abspath(csv_path)
-            
-            print(f"Generating report from CSV: {csv_path_abs}", file=sys.stderr)
-            print(f"Output HTML path: {html_path}", file=sys.stderr)
-            
-            # Ensure results directory exists
-            os.makedirs(os.path.dirname(html_path), exist_ok=True)
-            
-            try:
-                generate_drilldown_report(
-                    csv_path=csv_path_abs,
-                    output_path=html_path,
-                    max_trades_per_caller=None,  # No limit - process all trades
-                    risk_per_trade=risk_per_trade,
-                    default_tp_mult=tp_mult,
-                    default_sl_mult=sl_mult,
-                    max_workers=None
-                )
-            except Exception as gen_error:
-                print(f"Error in generate_drilldown_report: {gen_error}", file=sys.stderr)
-                import traceback
-                traceback.print_exc()
-                raise
-            
-            # Verify file was created
-            if not os.path.exists(html_path):
-                raise FileNotFoundError(f"Report file was not created at: {html_path}")
-            
-            file_size = os.path.getsize(html_path)
-            print(f"Report file created: {html_path} ({file_size} bytes)", file=sys.stderr)
-            
-            if file_size == 0:
-                raise ValueError(f"Report file is empty: {html_path}")
-            
-            # Read and send HTML
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html = f.read()
-            
-            if not html or len(html.strip()) == 0:
-                raise ValueError(f"Report HTML is empty after reading from {html_path}")
-            
-            # Validate HTML structure - should contain JavaScript data
-            if 'tradeData' not in html or 'callerStats' not in html:
-                print(f"WARNING: HTML file may be missing JavaScript data. File size: {len(html)} bytes", file=sys.stderr)
-                # Check first 1000 chars
-                print(f"First 500 chars: {html[:500]}", file=sys.stderr)
-                # Don't fail - might still be valid, just warn
-            
-            print(f"Read {len(html)} bytes of HTML from {html_path}", file=sys.stderr)
-            
-            # Check if connection is still alive before sending
+        
+        if not config and row and row[0]:
             try:
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html')
-                self.send_header('Content-Length', str(len(html.encode())))
-                self.end_headers()
-                
-                # Write in chunks to avoid overwhelming the connection
-                html_bytes = html.encode()
-                chunk_size = 1024 * 1024  # 1MB chunks
-                for i in range(0, len(html_bytes), chunk_size):
-                    chunk = html_bytes[i:i + chunk_size]
-                    try:
-                        self.wfile.write(chunk)
-                        self.wfile.flush()
-                    except (BrokenPipeError, ConnectionResetError, OSError):
-                        # Client disconnected - not an error, just stop sending
-                        print(f"Client disconnected while sending report for {run_id}", file=sys.stderr)
-                        return
-            except (BrokenPipeError, ConnectionResetError, OSError) as e:
-                # Client disconnected - not an error, just log and return
-                print(f"Client disconnected before/during report send for {run_id}: {e}", file=sys.stderr)
-                return
-            
-            # DON'T clean up files immediately - keep them for debugging
-            # Clean up temp files only after successful send
-            # (They'll be cleaned up on next request or by a cleanup job)
-            print(f"Report sent successfully. Files kept for debugging: {csv_path}, {html_path}", file=sys.stderr)
-        except (BrokenPipeError, ConnectionResetError, OSError) as e:
-            # Client disconnected - not a real error, just log it
-            print(f"Client disconnected during report generation for {run_id}: {e}", file=sys.stderr)
-            return
-        except Exception as e:
-            print(f"Error generating report: {e}", file=sys.stderr)
+                config = json.loads(row[0]) if isinstance(row[0], str) else row[0]
+            except Exception:
+                config = {}
+        
+        tp_mult = config.get('tp_mult', config.get('first_tp_mult', 80.0))
+        sl_mult = config.get('sl_mult', 0.7)
+        risk_per_trade = config.get('risk_per_trade', 0.02)
+        
+        # Generate HTML report - use absolute paths
+        html_path = os.path.abspath(f"results/tmp_{run_id}_report.html")
+        csv_path_abs = os.path.abspath(csv_path)
+        
+        print(f"Generating report from CSV: {csv_path_abs}", file=sys.stderr)
+        print(f"Output HTML path: {html_path}", file=sys.stderr)
+        
+        # Ensure results directory exists
+        os.makedirs(os.path.dirname(html_path), exist_ok=True)
+        
+        try:
+            generate_drilldown_report(
+                csv_path=csv_path_abs,
+                output_path=html_path,
+                max_trades_per_caller=None,  # No limit - process all trades
+                risk_per_trade=risk_per_trade,
+                default_tp_mult=tp_mult,
+                default_sl_mult=sl_mult,
+                max_workers=None
+            )
+        except Exception as gen_error:
+            print(f"Error in generate_drilldown_report: {gen_error}", file=sys.stderr)
             import traceback
             traceback.print_exc()
-            try:
-                # Only send error if connection is still alive
-                self.send_error(500, f"Error generating report: {str(e)}")
-            except (BrokenPipeError, ConnectionResetError, OSError):
-                # Client already disconnected, can't send error
-                print(f"Client disconnected before error response could be sent", file=sys.stderr)
-                return
+            raise
+        
+        # Verify file was created
+        if not os.path.exists(html_path):
+            raise FileNotFoundError(f"Report file was not created at: {html_path}")
+        
+        file_size = os.path.getsize(html_path)
+        print(f"Report file created: {html_path} ({file_size} bytes)", file=sys.stderr)
+        
+        if file_size == 0:
+            raise ValueError(f"Report file is empty: {html_path}")
+        
+        # Read HTML
+        with open(html_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        
+        if not html or len(html.strip()) == 0:
+            raise ValueError(f"Report HTML is empty after reading from {html_path}")
+        
+        # Validate HTML structure - should contain JavaScript data
+        if 'tradeData' not in html or 'callerStats' not in html:
+            print(f"WARNING: HTML file may be missing JavaScript data. File size: {len(html)} bytes", file=sys.stderr)
+            # Check first 1000 chars
+            print(f"First 500 chars: {html[:500]}", file=sys.stderr)
+            # Don't fail - might still be valid, just warn
+        
+        # DON'T clean up files - keep them for debugging
+        # (They'll be cleaned up on next request or by a cleanup job)
+        print(f"Read {len(html)} bytes of HTML from {html_path}", file=sys.stderr)
+        return html
     
     def send_json_response(self, data):
         """Send JSON response."""
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        body = json.dumps(data, default=str).encode()
+        self.send_cached_response(CachedResponse.build(body, 'application/json'))
 
 
-def create_handler(duckdb_path: str, slices_dir: str):
-    """Create handler with closure over duckdb_path."""
+def create_handler(
+    duckdb_path: str,
+    slices_dir: str,
+    pool: Optional[ReadOnlyConnectionPool] = None,
+    cache: Optional[ResponseCache] = None,
+):
+    """Create handler with closure over duckdb_path and the shared pool/cache."""
+    pool = pool if pool is not None else ReadOnlyConnectionPool()
+    cache = cache if cache is not None else ResponseCache()
+    
     def handler(*args, **kwargs):
-        return ReportHandler(duckdb_path, slices_dir, *args, **kwargs)
+        return ReportHandler(duckdb_path, slices_dir, pool, cache, *args, **kwargs)
     return handler
 
 
+def create_server(
+    host: str,
+    port: int,
+    duckdb_path: str,
+    slices_dir: str,
+    workers: int = 8,
+    idle_timeout: float = 5.0,
+    cache_mb: int = 256,
+) -> HTTPServer:
+    """
+    Build the report server.
+    
+    workers > 0 serves requests on a thread pool of that size; workers == 0
+    keeps the old single-threaded HTTPServer.
+    """
+    handler = create_handler(
+        duckdb_path,
+        slices_dir,
+        pool=ReadOnlyConnectionPool(idle_timeout=idle_timeout),
+        cache=ResponseCache(max_bytes=cache_mb * 1024 * 1024),
+    )
+    if workers > 0:
+        return PooledHTTPServer((host, port), handler, max_workers=workers)
+    return HTTPServer((host, port), handler)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Unified Backtest Report Server')
     parser.add_argument('--duckdb', default=os.getenv('DUCKDB_PATH', 'data/alerts.duckdb'),
@@ -777,19 +1132,34 @@ def main():
                         help='Port to serve on (default: 8080)')
     parser.add_argument('--host', default='0.0.0.0',
                         help='Host to bind to (default: 0.0.0.0)')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Request handler threads; 0 = single-threaded (default: 8)')
+    parser.add_argument('--conn-idle-timeout', type=float, default=5.0,
+                        help='Seconds an idle pooled read-only DuckDB connection is kept open '
+                             'before releasing the file lock for writers (default: 5)')
+    parser.add_argument('--cache-mb', type=int, default=256,
+                        help='Max size of the in-memory response cache in MB; 0 disables (default: 256)')
     args = parser.parse_args()
     
     if not os.path.exists(args.duckdb):
         print(f"Error: DuckDB file not found: {args.duckdb}", file=sys.stderr)
         sys.exit(1)
     
-    handler = create_handler(args.duckdb, args.slices_dir)
-    server = HTTPServer((args.host, args.port), handler)
+    server = create_server(
+        args.host,
+        args.port,
+        args.duckdb,
+        args.slices_dir,
+        workers=args.workers,
+        idle_timeout=args.conn_idle_timeout,
+        cache_mb=args.cache_mb,
+    )
     
     print(f"⚡ QuantBot Report Server starting...")
     print(f"   DuckDB: {args.duckdb}")
     print(f"   Slices: {args.slices_dir}")
     print(f"   Server: http://{args.host}:{args.port}")
+    print(f"   Workers: {args.workers or 'single-threaded'}")
     print(f"   Press Ctrl+C to stop")
     print()
     
@@ -797,7 +1167,7 @@ def main():
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down server...")
-        server.shutdown()
+        server.server_close()
 
 
 if __name__ == '__main__':
@@ -56,6 +56,7 @@ import duckdb
 from lib.slice_exporter import (
     ClickHouseCfg,
     export_slice_streaming,
+    load_coverage_index,
     query_coverage_batched,
 )
 from lib.helpers import sql_escape
@@ -1079,8 +1080,10 @@ def main() -> None:
             if verbose:
                 print("[2/5] Querying ClickHouse coverage (batched)...", file=sys.stderr)
             t0 = time.time()
+            coverage_index = load_coverage_index(args.duckdb, args.chain, mints, args.interval_seconds)
             coverage = query_coverage_batched(
-                ch_cfg, args.chain, mints, args.interval_seconds, date_from, date_to, ch_batch=args.ch_batch
+                ch_cfg, args.chain, mints, args.interval_seconds, date_from, date_to, ch_batch=args.ch_batch,
+                coverage_index=coverage_index
             )
             covered_mints = {m for m, cnt in coverage.items() if cnt > 0}
             if verbose:
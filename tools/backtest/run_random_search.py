@@ -20,13 +20,19 @@ Usage:
         --from 2025-12-01 --to 2025-12-24 \
         --trials 20 \
         --slice slices/per_token
+
+    # 2000 trials screened with successive halving (1/9 -> 1/3 -> all alerts)
+    python3 run_random_search.py \
+        --from 2025-10-01 --to 2025-12-31 \
+        --trials 2000 --halving --robust \
+        --slice slices/per_token
 """
 from __future__ import annotations
 
 import argparse
 import hashlib
 import json
-import os
+import math
 import random
 import sys
 import uuid
@@ -44,16 +50,14 @@ from lib.caller_groups import load_caller_group
 from lib.helpers import parse_yyyy_mm_dd
 from lib.optimizer_objective import (
     ObjectiveConfig,
-    DEFAULT_OBJECTIVE_CONFIG,
     compute_objective,
 )
 from lib.summary import summarize_tp_sl
-from lib.timing import TimingContext, format_ms
+from lib.timing import TimingContext
 from lib.tp_sl_query import run_tp_sl_query
 from lib.extended_exits import run_extended_exit_query, ExitConfig
 from lib.overfitting_guard import (
     enforce_walk_forward_validation,
-    OverfittingError,
     OptimizerResult as OverfittingOptimizerResult,
 )
 from lib.trial_ledger import (
@@ -62,36 +66,21 @@ from lib.trial_ledger import (
     store_optimizer_run,
     write_trials_to_parquet,
     write_trades_to_parquet,
-    load_trades_from_parquet,
     get_completed_trial_ids_from_parquet,
-    replay_run_from_parquet,
     load_trials_for_resume,
     # Pipeline phases (audit trail + resume)
     store_phase_start,
-    store_phase_complete,
-    store_phase_failed,
     get_phase_status,
     get_resumable_run_state,
     print_run_state,
-    # Islands storage
-    store_islands,
-    load_islands,
-    # Champions storage
-    store_island_champions,
-    load_island_champions,
     # Stress lane validation storage
-    store_stress_lane_result,
+    store_stress_lane_results,
     get_completed_lanes_for_champion,
     load_stress_lane_results,
-    # Champion validation storage
-    store_champion_validation,
-    load_champion_validations,
-    get_maximin_winner,
 )
 from lib.robust_region_finder import (
     FoldResult,
     RobustObjectiveConfig,
-    DEFAULT_ROBUST_CONFIG,
     compute_robust_objective,
     cluster_parameters,
     print_islands,
@@ -99,18 +88,24 @@ from lib.robust_region_finder import (
     StressConfig,
     extract_island_champions,
     print_island_champions,
-    IslandChampion,
 )
 from lib.stress_lanes import (
-    StressLane,
     get_stress_lanes,
-    compute_lane_scores,
+    compute_lane_scores_matrix,
+    group_lanes_by_latency,
+    recost_rows,
+    simulate_lanes_from_trades,
+    TradeArrays,
     ChampionValidationResult,
     print_lane_matrix,
 )
+from lib.successive_halving import (
+    HalvingConfig,
+    budget_folds,
+    subsample_alerts,
+    successive_halving,
+)
 from lib.run_mode import (
-    ModeType,
-    LanePack,
     RunMode,
     create_mode,
     print_mode_summary,
@@ -296,6 +291,7 @@ class RandomSearchConfig:
     use_robust_mode: bool = False     # Enable robust region finder
     top_n_candidates: int = 30        # Top N candidates to output/cluster
     n_clusters: int = 3               # Number of parameter islands (2-4)
+    cluster_top_frac: float = 0.10    # Cluster the top fraction of trials (at least top_n_candidates)
     
     # DD penalty config (gentle at 30%, brutal at 60%)
     dd_gentle_threshold: float = 0.30
@@ -311,6 +307,14 @@ class RandomSearchConfig:
     validate_champions: bool = False  # Run full stress lane validation on island champions
     stress_lanes_preset: str = "full" # Stress lane preset: "basic", "full", "extended"
     
+    # ==========================================================================
+    # MULTI-FIDELITY SCHEDULING (successive halving)
+    # ==========================================================================
+    use_halving: bool = False          # Screen trials on partial budgets, promote top 1/eta
+    halving_eta: int = 3
+    halving_min_budget: float = 1 / 9  # Budget fraction of the first rung
+    halving_resource: str = "alerts"   # "alerts" (subsample per fold) or "folds" (fold subset)
+    
     # ==========================================================================
     # RESUME & AUDIT TRAIL
     # ==========================================================================
@@ -347,6 +351,7 @@ class RandomSearchConfig:
             "use_robust_mode": self.use_robust_mode,
             "top_n_candidates": self.top_n_candidates,
             "n_clusters": self.n_clusters,
+            "cluster_top_frac": self.cluster_top_frac,
             "dd_gentle_threshold": self.dd_gentle_threshold,
             "dd_brutal_threshold": self.dd_brutal_threshold,
             "stress_slippage_mult": self.stress_slippage_mult,
@@ -354,6 +359,11 @@ class RandomSearchConfig:
             # Two-pass validation
             "validate_champions": self.validate_champions,
             "stress_lanes_preset": self.stress_lanes_preset,
+            # Multi-fidelity
+            "use_halving": self.use_halving,
+            "halving_eta": self.halving_eta,
+            "halving_min_budget": self.halving_min_budget,
+            "halving_resource": self.halving_resource,
             # Resume
             "resume_run_id": self.resume_run_id,
             "run_id": self.run_id,
@@ -387,6 +397,11 @@ class TrialResult:
     median_t2x_min: Optional[float] = None
     passes_gates: bool = False              # True if tradeable
     
+    # Multi-fidelity (successive halving): budget of this evaluation
+    budget: float = 1.0                     # Fraction of alerts/folds evaluated (1.0 = full)
+    rung: int = 0
+    budget_history: List[Dict[str, Any]] = field(default_factory=list)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "trial_id": self.trial_id,
@@ -406,6 +421,9 @@ class TrialResult:
             "hit2x_pct": self.hit2x_pct,
             "median_t2x_min": self.median_t2x_min,
             "passes_gates": self.passes_gates,
+            "budget": self.budget,
+            "rung": self.rung,
+            "budget_history": self.budget_history,
         }
 
 
@@ -743,6 +761,209 @@ def run_single_trial(
     return result, robust_candidate, all_trade_records
 
 
+def trial_rank_score(result: TrialResult) -> float:
+    """Score used to promote trials between successive halving rungs."""
+    for key in ("robust_score", "final_score"):
+        value = result.objective.get(key)
+        if value is not None:
+            return value
+    return result.test_r if result.test_r is not None else (result.train_r or 0.0)
+
+
+def run_halving_discovery(
+    param_samples: List[Dict[str, Any]],
+    folds: List[Tuple[List[Alert], List[Alert], str]],
+    all_alerts: List[Alert],
+    slice_path: Path,
+    is_partitioned: bool,
+    config: RandomSearchConfig,
+    robust_config: Optional[RobustObjectiveConfig],
+    verbose: bool,
+    baseline_cache: Optional[Any],
+    run_id: str,
+    skip_trial_ids: Optional[Set[str]] = None,
+) -> Tuple[List[TrialResult], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Discovery with successive halving instead of full evaluation of every trial.
+
+    Every trial is first evaluated on the smallest budget; the top 1/eta are
+    promoted to the next budget until survivors are evaluated on all folds and
+    all alerts.
+
+    Returns (results, robust_candidates, trade_records):
+    - results: the latest evaluation of every trial, with budget/rung and the
+      per-rung budget_history (for the trial ledger)
+    - robust_candidates, trade_records: from full-budget evaluations only, so
+      robust-objective ranking and island clustering see survivors only
+    """
+    halving = HalvingConfig(
+        eta=config.halving_eta,
+        min_budget=config.halving_min_budget,
+        resource=config.halving_resource,
+    )
+    trial_ids = [compute_trial_id(params, run_id) for params in param_samples]
+    candidates = [i for i, tid in enumerate(trial_ids) if tid not in (skip_trial_ids or set())]
+
+    latest: Dict[int, Tuple[TrialResult, Optional[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+    history: Dict[int, List[Dict[str, Any]]] = {}
+
+    def evaluate(indices: List[int], rung: int, budget: float) -> List[float]:
+        rung_folds = budget_folds(folds, budget, halving)
+        rung_alerts = subsample_alerts(all_alerts, budget, halving.min_alerts)
+        if verbose:
+            n_test = sum(len(test_a) for _, test_a, _ in rung_folds)
+            print(
+                f"\n[halving] rung {rung}: {len(indices)} trials at budget {budget:.3f} "
+                f"({len(rung_folds)} folds, {n_test} test alerts)",
+                file=sys.stderr,
+            )
+
+        def run(pos: int, idx: int):
+            return run_single_trial(
+                pos, len(indices), param_samples[candidates[idx]], rung_folds, rung_alerts,
+                slice_path, is_partitioned, config, robust_config, verbose, baseline_cache,
+                trial_id=trial_ids[candidates[idx]], run_id=run_id,
+            )
+
+        outputs: Dict[int, Any] = {}
+        if config.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
+                futures = {executor.submit(run, pos, idx): idx for pos, idx in enumerate(indices, 1)}
+                for future in as_completed(futures):
+                    try:
+                        outputs[futures[future]] = future.result()
+                    except Exception as e:
+                        print(f"⚠️  Trial {trial_ids[candidates[futures[future]]]} failed: {e}", file=sys.stderr)
+        else:
+            for pos, idx in enumerate(indices, 1):
+                outputs[idx] = run(pos, idx)
+
+        scores = []
+        for idx in indices:
+            if idx not in outputs:
+                scores.append(float("-inf"))
+                continue
+            result, robust_candidate, trade_records = outputs[idx]
+            result.budget = budget
+            result.rung = rung
+            score = trial_rank_score(result)
+            history.setdefault(idx, []).append({"rung": rung, "budget": budget, "score": score})
+            latest[idx] = (result, robust_candidate, trade_records)
+            scores.append(score)
+        return scores
+
+    survivors, _ = successive_halving(candidates, evaluate, halving)
+
+    results: List[TrialResult] = []
+    robust_candidates: List[Dict[str, Any]] = []
+    trade_records: List[Dict[str, Any]] = []
+    for idx in sorted(latest):
+        result, robust_candidate, records = latest[idx]
+        result.budget_history = history[idx]
+        results.append(result)
+        if result.budget >= 1.0:
+            if robust_candidate:
+                robust_candidates.append(robust_candidate)
+            for tr in records:
+                tr["run_id"] = run_id
+            trade_records.extend(records)
+
+    if verbose:
+        n_full = sum(1 for r in results if r.budget >= 1.0)
+        print(
+            f"\n[halving] {len(candidates)} trials screened, {n_full} evaluated at full budget "
+            f"(rungs={', '.join(f'{b:.3f}' for b in halving.rungs())})",
+            file=sys.stderr,
+        )
+    return results, robust_candidates, trade_records
+
+
+def fully_evaluated(results: List[TrialResult]) -> List[TrialResult]:
+    """Trials evaluated at the full budget (all trials when halving is off)."""
+    return [r for r in results if getattr(r, "budget", 1.0) >= 1.0]
+
+
+def load_trials_from_parquet(parquet_path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Load a run's trials Parquet for resume mode.
+
+    Trials screened on a partial halving budget (budget < 1.0) are skipped:
+    only full-budget evaluations are ranked and clustered.
+
+    Returns:
+        (results, robust_candidates) - List of TrialResult dicts and robust_candidates for clustering
+    """
+    import pandas as pd
+
+    df = pd.read_parquet(parquet_path)
+    results: List[Dict[str, Any]] = []
+    robust_candidates: List[Dict[str, Any]] = []
+
+    # Convert DataFrame rows to TrialResult dicts
+    for _, row in df.iterrows():
+        budget = row.get('budget')
+        budget = 1.0 if budget is None or pd.isna(budget) else float(budget)
+        if budget < 1.0:
+            continue
+
+        params = json.loads(row['params_json']) if pd.notna(row['params_json']) else {}
+        summary = json.loads(row['summary_json']) if pd.notna(row['summary_json']) else {}
+
+        # Build robust_result if available
+        robust_result = {}
+        if pd.notna(row.get('test_train_ratio')):
+            robust_result = {
+                "robust_score": row.get('robust_score', 0.0) or 0.0,
+                "median_test_r": row.get('total_r', 0.0) or 0.0,  # Approximate
+                "median_train_r": (row.get('total_r', 0.0) or 0.0) / (row.get('test_train_ratio', 1.0) or 1.0),
+                "median_ratio": row.get('test_train_ratio', 0.0) or 0.0,
+                "stress_penalty": row.get('stress_penalty', 0.0) or 0.0,
+                "worst_lane": row.get('worst_lane'),
+                "worst_lane_score": row.get('worst_lane_score'),
+                "passes_gates": bool(row.get('passes_gates', False)),
+            }
+
+        objective = {
+            "final_score": row.get('objective_score', 0.0) or 0.0,
+            "robust_score": row.get('robust_score'),
+            "test_train_ratio": row.get('test_train_ratio'),
+        }
+        if robust_result:
+            objective.update(robust_result)
+
+        results.append({
+            "trial_id": row['trial_id'],
+            "params": params,
+            "summary": summary,
+            "objective": objective,
+            "duration_ms": int(row.get('duration_ms', 0) or 0),
+            "alerts_ok": int(row.get('alerts_ok', 0) or 0),
+            "alerts_total": int(row.get('alerts_total', 0) or 0),
+            "test_r": robust_result.get("median_test_r") if robust_result else None,
+            "train_r": robust_result.get("median_train_r") if robust_result else None,
+            "ratio": row.get('test_train_ratio'),
+            "median_dd_pre2x": row.get('median_dd_pre2x'),
+            "p75_dd_pre2x": row.get('p75_dd_pre2x'),
+            "hit2x_pct": row.get('hit2x_pct'),
+            "median_t2x_min": row.get('median_time_to_2x_min'),
+            "passes_gates": bool(row.get('passes_gates', False)),
+            "budget": budget,
+        })
+
+        if robust_result:
+            robust_candidates.append({
+                "params": params,
+                "robust_result": robust_result,
+            })
+
+    return results, robust_candidates
+
+
+def cluster_pool_size(config: RandomSearchConfig, n_candidates: int) -> int:
+    """Number of top candidates to cluster into islands."""
+    return max(config.top_n_candidates, int(math.ceil(config.cluster_top_frac * n_candidates)))
+
+
 def format_params_summary(params: Dict[str, Any]) -> str:
     """Format a compact summary of all parameters for display."""
     parts = []
@@ -889,11 +1110,13 @@ def run_random_search(
     run_id: Optional[str] = None,
     verbose: bool = True,
     output_dir: Optional[Path] = None,
-) -> List[TrialResult]:
+) -> Tuple[List[TrialResult], List[Dict[str, Any]]]:
     """
     Run random search optimization with audit trail through DuckDB.
     
     If use_walk_forward=True, each trial is evaluated on out-of-sample data.
+    Returns (results, trade_records); trade_records holds the per-alert trades
+    of the trials evaluated in this call (none when discovery was skipped).
     
     Pipeline phases (all tracked in DuckDB for audit trail + resume):
       1. discovery     - Random search sampling
@@ -904,7 +1127,7 @@ def run_random_search(
     """
     import uuid as uuid_mod
     run_id = run_id or uuid_mod.uuid4().hex[:12]
-    from lib.partitioner import is_hive_partitioned, is_per_token_directory
+    from lib.partitioner import is_hive_partitioned
     
     timing = TimingContext()
     timing.start()
@@ -920,7 +1143,6 @@ def run_random_search(
     
     # Load baseline cache if provided or auto-detect
     baseline_cache = None
-    baseline_lookup = {}
     baseline_cache_path = None
     
     if config.baseline_parquet:
@@ -952,7 +1174,7 @@ def run_random_search(
                 if not is_valid:
                     if verbose:
                         print(f"⚠️  Baseline cache validation failed: {error_msg}", file=sys.stderr)
-                        print(f"   Proceeding without cache...", file=sys.stderr)
+                        print("   Proceeding without cache...", file=sys.stderr)
                 else:
                     # Fast cache loading using pandas (6.60ms average)
                     import time
@@ -1051,7 +1273,7 @@ def run_random_search(
                 
                 if len(filtered_alerts) == 0:
                     if verbose:
-                        print(f"⚠️  Warning: Baseline cache loaded but no alerts matched. Check timestamp format.", file=sys.stderr)
+                        print("⚠️  Warning: Baseline cache loaded but no alerts matched. Check timestamp format.", file=sys.stderr)
                         print(f"   Sample cache mint: {baseline_cache.iloc[0]['mint'][:20]}...", file=sys.stderr)
                         print(f"   Sample cache ts_ms: {baseline_cache.iloc[0]['alert_ts_ms']}", file=sys.stderr)
                         if all_alerts:
@@ -1150,6 +1372,12 @@ def run_random_search(
         print(f"\nRunning {config.n_trials} random trials...", file=sys.stderr)
         print(f"TP range: [{config.tp_min}, {config.tp_max}]", file=sys.stderr)
         print(f"SL range: [{config.sl_min}, {config.sl_max}]", file=sys.stderr)
+        if config.use_halving:
+            print(
+                f"Successive halving: eta={config.halving_eta}, "
+                f"min budget={config.halving_min_budget:.3f} ({config.halving_resource})",
+                file=sys.stderr,
+            )
         if len(folds) > 1:
             print(f"Multi-fold: averaging across {len(folds)} folds", file=sys.stderr)
         print()
@@ -1168,7 +1396,7 @@ def run_random_search(
             ),
         )
         if verbose:
-            print(f"ROBUST MODE enabled:", file=sys.stderr)
+            print("ROBUST MODE enabled:", file=sys.stderr)
             print(f"  DD penalty: gentle at {config.dd_gentle_threshold:.0%}, brutal at {config.dd_brutal_threshold:.0%}", file=sys.stderr)
             print(f"  Stress lane: slippage x{config.stress_slippage_mult:.1f}, stop gap {config.stress_stop_gap_prob:.0%}", file=sys.stderr)
             print(f"  Output: top {config.top_n_candidates} candidates, {config.n_clusters} parameter islands", file=sys.stderr)
@@ -1184,7 +1412,7 @@ def run_random_search(
         if discovery_status and discovery_status.get("status") == "completed":
             skip_discovery = True
             if verbose:
-                print(f"⏭  Skipping discovery phase (already completed)", file=sys.stderr)
+                print("⏭  Skipping discovery phase (already completed)", file=sys.stderr)
     
     # Initialize run record early (before phases reference it)
     # This ensures the run exists in the database before phases are stored
@@ -1206,7 +1434,6 @@ def run_random_search(
     
     # Check for resume from Parquet trades file
     completed_trial_ids: Set[str] = set()
-    resume_from_parquet = False
     if not skip_discovery:
         # Check if trades Parquet file exists for this run_id
         # If it exists, we can resume by skipping completed trials
@@ -1214,7 +1441,6 @@ def run_random_search(
         trades_parquet_path = output_dir / f"{run_id}_trades.parquet"
         
         if trades_parquet_path.exists():
-            resume_from_parquet = True
             completed_by_fold = get_completed_trial_ids_from_parquet(str(trades_parquet_path))
             # Flatten to single set of all completed trial_ids
             for fold_trials in completed_by_fold.values():
@@ -1227,7 +1453,7 @@ def run_random_search(
     if skip_discovery:
         # Load previous results from DuckDB or Parquet
         if verbose:
-            print(f"  Loading previous discovery results...", file=sys.stderr)
+            print("  Loading previous discovery results...", file=sys.stderr)
         
         # Try loading from Parquet first (more reliable, includes all data)
         output_dir = output_dir or Path("output")
@@ -1237,63 +1463,7 @@ def run_random_search(
             if verbose:
                 print(f"  Loading from Parquet: {trials_parquet_path}", file=sys.stderr)
             try:
-                import pandas as pd
-                df = pd.read_parquet(trials_parquet_path)
-                
-                # Convert DataFrame rows to TrialResult dicts
-                for _, row in df.iterrows():
-                    import json
-                    params = json.loads(row['params_json']) if pd.notna(row['params_json']) else {}
-                    summary = json.loads(row['summary_json']) if pd.notna(row['summary_json']) else {}
-                    
-                    # Build robust_result if available
-                    robust_result = {}
-                    if pd.notna(row.get('test_train_ratio')):
-                        robust_result = {
-                            "robust_score": row.get('robust_score', 0.0) or 0.0,
-                            "median_test_r": row.get('total_r', 0.0) or 0.0,  # Approximate
-                            "median_train_r": (row.get('total_r', 0.0) or 0.0) / (row.get('test_train_ratio', 1.0) or 1.0),
-                            "median_ratio": row.get('test_train_ratio', 0.0) or 0.0,
-                            "stress_penalty": row.get('stress_penalty', 0.0) or 0.0,
-                            "worst_lane": row.get('worst_lane'),
-                            "worst_lane_score": row.get('worst_lane_score'),
-                            "passes_gates": bool(row.get('passes_gates', False)),
-                        }
-                    
-                    objective = {
-                        "final_score": row.get('objective_score', 0.0) or 0.0,
-                        "robust_score": row.get('robust_score'),
-                        "test_train_ratio": row.get('test_train_ratio'),
-                    }
-                    if robust_result:
-                        objective.update(robust_result)
-                    
-                    trial_result = {
-                        "trial_id": row['trial_id'],
-                        "params": params,
-                        "summary": summary,
-                        "objective": objective,
-                        "duration_ms": int(row.get('duration_ms', 0) or 0),
-                        "alerts_ok": int(row.get('alerts_ok', 0) or 0),
-                        "alerts_total": int(row.get('alerts_total', 0) or 0),
-                        "test_r": robust_result.get("median_test_r") if robust_result else None,
-                        "train_r": robust_result.get("median_train_r") if robust_result else None,
-                        "ratio": row.get('test_train_ratio'),
-                        "median_dd_pre2x": row.get('median_dd_pre2x'),
-                        "p75_dd_pre2x": row.get('p75_dd_pre2x'),
-                        "hit2x_pct": row.get('hit2x_pct'),
-                        "median_t2x_min": row.get('median_time_to_2x_min'),
-                        "passes_gates": bool(row.get('passes_gates', False)),
-                    }
-                    
-                    results.append(trial_result)
-                    
-                    if robust_result:
-                        robust_candidates.append({
-                            "params": params,
-                            "robust_result": robust_result,
-                        })
-                
+                results, robust_candidates = load_trials_from_parquet(str(trials_parquet_path))
                 if verbose:
                     print(f"  ✅ Loaded {len(results)} trials from Parquet", file=sys.stderr)
             except Exception as e:
@@ -1331,26 +1501,82 @@ def run_random_search(
         
         # Run discovery trials
         with timing.phase("trials"):
-            if config.max_workers > 1:
-            # Parallel execution
-            if verbose:
-                print(f"Running {config.n_trials} trials in parallel (max_workers={config.max_workers})...", file=sys.stderr)
-            
-            with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
-                future_to_trial = {}
-                for i, params in enumerate(param_samples):
+            if config.use_halving:
+                results, robust_candidates, halving_trades = run_halving_discovery(
+                    param_samples,
+                    folds,
+                    all_alerts,
+                    slice_path,
+                    is_partitioned,
+                    config,
+                    robust_config,
+                    verbose,
+                    baseline_cache,
+                    run_id,
+                    skip_trial_ids=completed_trial_ids,
+                )
+                all_trade_records.extend(halving_trades)
+            elif config.max_workers > 1:
+                # Parallel execution
+                if verbose:
+                    print(f"Running {config.n_trials} trials in parallel (max_workers={config.max_workers})...", file=sys.stderr)
+                
+                with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
+                    future_to_trial = {}
+                    for i, params in enumerate(param_samples):
+                        # Compute deterministic trial_id for resume checking
+                        trial_id = compute_trial_id(params, run_id)
+                        
+                        # Skip if already completed (resume mode)
+                        if trial_id in completed_trial_ids:
+                            if verbose:
+                                print(f"⏭  Skipping trial {i+1}/{config.n_trials} (already in Parquet: {trial_id})", file=sys.stderr)
+                            continue
+                        
+                        future_to_trial[executor.submit(
+                            run_single_trial,
+                            i + 1,
+                            config.n_trials,
+                            params,
+                            folds,
+                            all_alerts,
+                            slice_path,
+                            is_partitioned,
+                            config,
+                            robust_config,
+                            verbose,
+                            baseline_cache,
+                            trial_id=trial_id,  # Pass deterministic trial_id
+                            run_id=run_id,
+                        )] = (i, params, trial_id)
+                    
+                    for future in as_completed(future_to_trial):
+                        try:
+                            result, robust_candidate, trade_records = future.result()
+                            results.append(result)
+                            if robust_candidate:
+                                robust_candidates.append(robust_candidate)
+                            # Add run_id to trade records and collect
+                            for tr in trade_records:
+                                tr["run_id"] = run_id
+                            all_trade_records.extend(trade_records)
+                        except Exception as e:
+                            trial_idx, params, _ = future_to_trial[future]
+                            print(f"⚠️  Trial {trial_idx + 1} failed: {e}", file=sys.stderr)
+            else:
+                # Sequential execution (original behavior)
+                for i, params in enumerate(param_samples, 1):
                     # Compute deterministic trial_id for resume checking
                     trial_id = compute_trial_id(params, run_id)
                     
                     # Skip if already completed (resume mode)
                     if trial_id in completed_trial_ids:
                         if verbose:
-                            print(f"⏭  Skipping trial {i+1}/{config.n_trials} (already in Parquet: {trial_id})", file=sys.stderr)
+                            print(f"⏭  Skipping trial {i}/{config.n_trials} (already in Parquet: {trial_id})", file=sys.stderr)
                         continue
                     
-                    future_to_trial[executor.submit(
-                        run_single_trial,
-                        i + 1,
+                    result, robust_candidate, trade_records = run_single_trial(
+                        i,
                         config.n_trials,
                         params,
                         folds,
@@ -1363,188 +1589,26 @@ def run_random_search(
                         baseline_cache,
                         trial_id=trial_id,  # Pass deterministic trial_id
                         run_id=run_id,
-                    )] = (i, params, trial_id)
-                
-                for future in as_completed(future_to_trial):
-                    try:
-                        result, robust_candidate, trade_records = future.result()
-                        results.append(result)
-                        if robust_candidate:
-                            robust_candidates.append(robust_candidate)
-                        # Add run_id to trade records and collect
-                        for tr in trade_records:
-                            tr["run_id"] = run_id
-                        all_trade_records.extend(trade_records)
-                    except Exception as e:
-                        trial_idx, params = future_to_trial[future]
-                        print(f"⚠️  Trial {trial_idx + 1} failed: {e}", file=sys.stderr)
-        else:
-            # Sequential execution (original behavior)
-            for i, params in enumerate(param_samples, 1):
-                # Compute deterministic trial_id for resume checking
-                trial_id = compute_trial_id(params, run_id)
-                
-                # Skip if already completed (resume mode)
-                if trial_id in completed_trial_ids:
-                    if verbose:
-                        print(f"⏭  Skipping trial {i}/{config.n_trials} (already in Parquet: {trial_id})", file=sys.stderr)
-                    continue
-                
-                result, robust_candidate, trade_records = run_single_trial(
-                    i,
-                    config.n_trials,
-                    params,
-                    folds,
-                    all_alerts,
-                    slice_path,
-                    is_partitioned,
-                    config,
-                    robust_config,
-                    verbose,
-                    baseline_cache,
-                    trial_id=trial_id,  # Pass deterministic trial_id
-                    run_id=run_id,
-                )
-                results.append(result)
-                if robust_candidate:
-                    robust_candidates.append(robust_candidate)
-                # Add run_id to trade records and collect
-                for tr in trade_records:
-                    tr["run_id"] = run_id
-                all_trade_records.extend(trade_records)
-            
-            # Legacy mode handling (for backward compatibility)
-            if not config.use_robust_mode:
-                # This branch is now handled inside run_single_trial
-                pass
-                # Average across folds (legacy behavior)
-                train_r = sum(fold_train_rs) / len(fold_train_rs) if fold_train_rs else 0.0
-                test_r = sum(fold_test_rs) / len(fold_test_rs) if fold_test_rs else None
-                delta_r = (test_r - train_r) if test_r is not None else None
-                
-                # Use last fold's summary for detailed metrics (or could average)
-                final_summary = fold_summaries[-1] if fold_summaries else {}
-                
-                # For multi-fold, compute average of key metrics
-                if len(fold_summaries) > 1:
-                    avg_keys = ["avg_r", "win_rate", "pct_hit_2x"]
-                    for key in avg_keys:
-                        vals = [s.get(key) for s in fold_summaries if s.get(key) is not None]
-                        if vals:
-                            final_summary[key] = sum(vals) / len(vals)
-                    # Sum alerts across folds
-                    final_summary["alerts_ok"] = sum(s.get("alerts_ok", 0) for s in fold_summaries)
-                    final_summary["total_r"] = test_r if test_r is not None else train_r
-                
-                # Compute objective
-                obj = compute_objective(
-                    avg_r=final_summary.get("avg_r", 0.0),
-                    total_r=final_summary.get("total_r", 0.0),
-                    n_trades=final_summary.get("alerts_ok", 0),
-                    dd_magnitude=abs(final_summary.get("dd_pre2x_median", 0.0) or 0.0),
-                    time_to_2x_min=final_summary.get("time_to_2x_median_min"),
-                    hit2x_pct=final_summary.get("pct_hit_2x", 0.0) or 0.0,
-                    median_ath=final_summary.get("median_ath_mult", 1.0) or 1.0,
-                    p75_ath=final_summary.get("p75_ath"),
-                    p95_ath=final_summary.get("p95_ath"),
-                    config=DEFAULT_OBJECTIVE_CONFIG,
-                )
-                
-                trial_timing.end()
-                
-                # Extract DD metrics for gates
-                # Note: DD values are typically negative (drawdown), so we abs() them for gates
-                median_dd = abs(final_summary.get("median_dd_pre2x") or final_summary.get("dd_pre2x_median") or 0.0)
-                p75_dd = abs(final_summary.get("p75_dd_pre2x") or final_summary.get("dd_pre2x_p75") or 0.0)
-                hit2x = final_summary.get("pct_hit_2x") or 0.0
-                t2x_min = final_summary.get("time_to_2x_median_min") or final_summary.get("median_time_to_2x_min")
-                
-                # Compute anti-overfit metrics
-                if config.use_walk_forward and test_r is not None:
-                    anti_overfit = compute_anti_overfit_metrics(
-                        train_r=train_r,
-                        test_r=test_r,
-                        median_dd_pre2x=median_dd,
-                        p75_dd_pre2x=p75_dd,
-                        hit2x_pct=hit2x,
-                        median_t2x_min=t2x_min,
                     )
-                    ratio = anti_overfit["ratio"]
-                    pessimistic_r = anti_overfit["pessimistic_r"]
-                    passes_gates = anti_overfit["passes_gates"]
-                    
-                    # Compute robust score (the one you should rank by)
-                    robust_score = compute_robust_score(
-                        test_r=test_r,
-                        pessimistic_r=pessimistic_r,
-                        ratio=ratio,
-                        objective_score=obj.final_score,
-                        passes_gates=passes_gates,
-                    )
-                else:
-                    ratio = None
-                    pessimistic_r = None
-                    passes_gates = True
-                    robust_score = obj.final_score
-                
-                # Count total alerts across folds
-                total_test_alerts = sum(len(test_a) for _, test_a, _ in folds)
-                total_train_alerts = sum(len(train_a) for train_a, _, _ in folds)
-                
-                result = TrialResult(
-                    trial_id=trial_id,
-                    params=params,
-                    summary=final_summary,
-                    objective={**obj.to_dict(), "robust_score": robust_score, "n_folds": len(folds)},
-                    duration_ms=trial_timing.total_ms,
-                    alerts_ok=final_summary.get("alerts_ok", 0),
-                    alerts_total=total_test_alerts if config.use_walk_forward else total_train_alerts,
-                    train_r=train_r,
-                    test_r=test_r,
-                    delta_r=delta_r,
-                    ratio=ratio,
-                    pessimistic_r=pessimistic_r,
-                    median_dd_pre2x=median_dd,
-                    p75_dd_pre2x=p75_dd,
-                    hit2x_pct=hit2x,
-                    median_t2x_min=t2x_min,
-                    passes_gates=passes_gates,
-                )
-                results.append(result)
-                
-                if verbose:
-                    wr = final_summary.get("tp_sl_win_rate", 0.0) * 100
-                    avg_r = final_summary.get("avg_r", 0.0)
-                    
-                    if config.use_walk_forward:
-                        # Show ratio and pessimistic_r - THE KEY metrics
-                        ratio_str = f"{ratio:.2f}" if ratio is not None else "N/A"
-                        pess_str = f"{pessimistic_r:+.1f}" if pessimistic_r is not None else "N/A"
-                        gate_str = "✓" if passes_gates else "✗"
-                        print(
-                            f"[{i:3d}/{config.n_trials}] "
-                            f"TP={params['tp_mult']:.2f}x SL={params['sl_mult']:.2f}x | "
-                            f"TrR={train_r:+.1f} TeR={test_r:+.1f} "
-                            f"Ratio={ratio_str} Pess={pess_str} {gate_str}",
-                            file=sys.stderr
-                        )
-                    else:
-                        score = obj.final_score
-                        print(
-                            f"[{i:3d}/{config.n_trials}] "
-                            f"TP={params['tp_mult']:.2f}x SL={params['sl_mult']:.2f}x | "
-                            f"WR={wr:.0f}% AvgR={avg_r:+.2f} Score={score:+.3f}",
-                            file=sys.stderr
-                        )
+                    results.append(result)
+                    if robust_candidate:
+                        robust_candidates.append(robust_candidate)
+                    # Add run_id to trade records and collect
+                    for tr in trade_records:
+                        tr["run_id"] = run_id
+                    all_trade_records.extend(trade_records)
     
     timing.end()
     
+    # Ranking and leaderboards only use fully evaluated trials (halving survivors)
+    ranked_results = fully_evaluated(results)
+    
     # ========================================================================
     # OVERFITTING GUARD: Validate best results
     # ========================================================================
-    if config.use_walk_forward and results:
+    if config.use_walk_forward and ranked_results:
         # Find best result with walk-forward validation
-        best_results = [r for r in results if r.test_r is not None and r.train_r is not None]
+        best_results = [r for r in ranked_results if r.test_r is not None and r.train_r is not None]
         if best_results:
             # Sort by test_r (out-of-sample performance)
             best_results_sorted = sorted(best_results, key=lambda r: r.test_r or -9999, reverse=True)
@@ -1590,7 +1654,7 @@ def run_random_search(
                     print(f"{'='*80}", file=sys.stderr)
                     print(validation.message, file=sys.stderr)
                     if not validation.passed:
-                        print(f"⚠️  Best result failed overfitting guard checks!", file=sys.stderr)
+                        print("⚠️  Best result failed overfitting guard checks!", file=sys.stderr)
                         print(f"   Degradation: {validation.degradation_pct:.1%} (max 10%)", file=sys.stderr)
                         print(f"   Robustness: {validation.robustness_score:.3f} (min 0.7)", file=sys.stderr)
                     print(f"{'='*80}\n", file=sys.stderr)
@@ -1601,7 +1665,7 @@ def run_random_search(
     # Record discovery phase completion (deferred to avoid lock conflicts)
     # Phase will be recorded in store_optimizer_run at the end
     if verbose:
-        print(f"✓ Phase 1: Discovery complete ({len(results)} trials)", file=sys.stderr)
+        print(f"✓ Phase 1: Discovery complete ({len(results)} trials, {len(ranked_results)} fully evaluated)", file=sys.stderr)
     
     # Print summary
     if verbose:
@@ -1651,13 +1715,11 @@ def run_random_search(
             # ================================================================
             # PHASE 2: CLUSTERING (parameter island formation)
             # ================================================================
-            # Defer phase tracking to avoid DuckDB lock conflicts
-            clustering_phase_id = f"{run_id}_clustering"
-            
+            # Phase tracking deferred to avoid DuckDB lock conflicts
             islands = cluster_parameters(
                 sorted_robust, 
                 n_clusters=config.n_clusters, 
-                top_n=config.top_n_candidates
+                top_n=cluster_pool_size(config, len(sorted_robust)),
             )
             
             # Store islands to DuckDB (deferred to avoid lock conflicts)
@@ -1694,11 +1756,11 @@ def run_random_search(
             # ================================================================
             
             # Filter to only tradeable setups
-            tradeable = [r for r in results if r.passes_gates]
-            print(f"\nTradeable setups (pass DD gates): {len(tradeable)}/{len(results)}", file=sys.stderr)
+            tradeable = [r for r in ranked_results if r.passes_gates]
+            print(f"\nTradeable setups (pass DD gates): {len(tradeable)}/{len(ranked_results)}", file=sys.stderr)
             
             # 1. TOP BY TEST R (raw out-of-sample)
-            sorted_by_test_r = sorted(results, key=lambda r: r.test_r or 0, reverse=True)
+            sorted_by_test_r = sorted(ranked_results, key=lambda r: r.test_r or 0, reverse=True)
             print(f"\n{'─'*80}", file=sys.stderr)
             print("TOP 10 BY TEST R (raw out-of-sample performance):", file=sys.stderr)
             print("─" * 80, file=sys.stderr)
@@ -1713,7 +1775,7 @@ def run_random_search(
                 )
             
             # 2. TOP BY PESSIMISTIC R (robust to overfitting)
-            sorted_by_pess = sorted(results, key=lambda r: r.pessimistic_r or -9999, reverse=True)
+            sorted_by_pess = sorted(ranked_results, key=lambda r: r.pessimistic_r or -9999, reverse=True)
             print(f"\n{'─'*80}", file=sys.stderr)
             print("TOP 10 BY PESSIMISTIC R (TestR - 0.15*|TrainR-TestR|):", file=sys.stderr)
             print("  → Penalizes large train/test gaps", file=sys.stderr)
@@ -1730,7 +1792,7 @@ def run_random_search(
             
             # 3. TOP BY ROBUST SCORE (pessimistic + ratio penalty + gates)
             sorted_by_robust = sorted(
-                results, 
+                ranked_results, 
                 key=lambda r: r.objective.get("robust_score", -9999), 
                 reverse=True
             )
@@ -1774,9 +1836,9 @@ def run_random_search(
                     )
             
             # Walk-forward summary stats
-            test_rs = [r.test_r for r in results if r.test_r is not None]
-            pess_rs = [r.pessimistic_r for r in results if r.pessimistic_r is not None]
-            ratios = [r.ratio for r in results if r.ratio is not None]
+            test_rs = [r.test_r for r in ranked_results if r.test_r is not None]
+            pess_rs = [r.pessimistic_r for r in ranked_results if r.pessimistic_r is not None]
+            ratios = [r.ratio for r in ranked_results if r.ratio is not None]
             
             avg_test_r = sum(test_rs) / len(test_rs) if test_rs else 0
             avg_pess_r = sum(pess_rs) / len(pess_rs) if pess_rs else 0
@@ -1789,14 +1851,14 @@ def run_random_search(
             print(f"  Avg Pessimistic R: {avg_pess_r:+.2f}", file=sys.stderr)
             print(f"  Avg Ratio:         {avg_ratio:.2f}", file=sys.stderr)
             print(f"  % Profitable:      {pct_profitable:.0f}%", file=sys.stderr)
-            print(f"  % Tradeable:       {len(tradeable)/len(results)*100:.0f}%", file=sys.stderr)
+            print(f"  % Tradeable:       {len(tradeable)/len(ranked_results)*100:.0f}%", file=sys.stderr)
             print(f"{'='*80}", file=sys.stderr)
             
         else:
             # Non walk-forward mode - simple leaderboard
-            sorted_results = sorted(results, key=lambda r: r.objective.get("final_score", 0), reverse=True)
+            sorted_results = sorted(ranked_results, key=lambda r: r.objective.get("final_score", 0), reverse=True)
             
-            print(f"\nTOP 10 BY OBJECTIVE SCORE:", file=sys.stderr)
+            print("\nTOP 10 BY OBJECTIVE SCORE:", file=sys.stderr)
             print("-" * 80, file=sys.stderr)
             for i, r in enumerate(sorted_results[:10], 1):
                 score = r.objective.get("final_score", 0)
@@ -1808,7 +1870,7 @@ def run_random_search(
                     file=sys.stderr
                 )
     
-    return results
+    return results, all_trade_records
 
 
 def main() -> None:
@@ -1882,6 +1944,8 @@ def main() -> None:
                     help="Number of top candidates to output/cluster (default: 30)")
     ap.add_argument("--n-clusters", type=int, default=3,
                     help="Number of parameter islands (default: 3, range 2-4)")
+    ap.add_argument("--cluster-top-frac", type=float, default=0.10,
+                    help="Fraction of trials to cluster into islands, at least --top-n (default: 0.10)")
     ap.add_argument("--dd-gentle", type=float, default=0.30,
                     help="DD penalty gentle threshold (default: 0.30 = 30%%)")
     ap.add_argument("--dd-brutal", type=float, default=0.60,
@@ -1897,6 +1961,16 @@ def main() -> None:
     ap.add_argument("--stress-lanes", type=str, default="full",
                     help="Stress lane preset: 'basic', 'full', 'extended', or comma-separated lane names (default: full)")
     
+    # Multi-fidelity scheduling
+    ap.add_argument("--halving", action="store_true",
+                    help="Successive halving: screen trials on partial budgets, promote the top 1/eta")
+    ap.add_argument("--halving-eta", type=int, default=3,
+                    help="Keep the top 1/eta trials at each rung (default: 3)")
+    ap.add_argument("--halving-min-budget", type=float, default=1 / 9,
+                    help="Budget fraction of the first rung (default: 1/9 -> rungs 1/9, 1/3, 1)")
+    ap.add_argument("--halving-resource", choices=["alerts", "folds"], default="alerts",
+                    help="Partial budget = alert subsample per fold, or subset of folds (default: alerts)")
+    
     # Resume & audit trail
     ap.add_argument("--resume", dest="resume_run_id", type=str,
                     help="Resume a previous run from last completed phase (DuckDB-based)")
@@ -1952,6 +2026,7 @@ def main() -> None:
         use_robust_mode=args.robust,
         top_n_candidates=args.top_n,
         n_clusters=args.n_clusters,
+        cluster_top_frac=args.cluster_top_frac,
         dd_gentle_threshold=args.dd_gentle,
         dd_brutal_threshold=args.dd_brutal,
         stress_slippage_mult=args.stress_slippage,
@@ -1959,6 +2034,11 @@ def main() -> None:
         # Two-pass validation
         validate_champions=args.validate_champions,
         stress_lanes_preset=args.stress_lanes,
+        # Multi-fidelity
+        use_halving=args.halving,
+        halving_eta=args.halving_eta,
+        halving_min_budget=args.halving_min_budget,
+        halving_resource=args.halving_resource,
         # Resume & audit trail
         resume_run_id=args.resume_run_id,
         run_id=args.run_id,
@@ -2038,7 +2118,7 @@ def main() -> None:
     output_dir = Path(args.output_dir)
     
     # Run
-    results = run_random_search(config, run_id=run_id, verbose=not args.quiet, output_dir=output_dir)
+    results, all_trade_records = run_random_search(config, run_id=run_id, verbose=not args.quiet, output_dir=output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / f"{run_id}_random_search.json"
     
@@ -2053,16 +2133,16 @@ def main() -> None:
     if config.use_robust_mode:
         # Sort candidates for output
         sorted_robust = sorted(
-            [{"params": r.params, "robust_result": r.objective} for r in results],
+            [{"params": r.params, "robust_result": r.objective} for r in fully_evaluated(results)],
             key=lambda c: c.get("robust_result", {}).get("robust_score", -999),
             reverse=True
         )
         
-        # Cluster top candidates
+        # Cluster the top fraction of candidates
         islands = cluster_parameters(
             sorted_robust,
             n_clusters=config.n_clusters,
-            top_n=config.top_n_candidates
+            top_n=cluster_pool_size(config, len(sorted_robust)),
         )
         
         output_data["robust_mode"] = {
@@ -2075,7 +2155,7 @@ def main() -> None:
         # TWO-PASS VALIDATION: Run stress lane matrix on island champions
         # ====================================================================
         if config.validate_champions and islands:
-            from lib.partitioner import is_hive_partitioned, is_per_token_directory
+            from lib.partitioner import is_hive_partitioned
             
             print(f"\n{'='*80}", file=sys.stderr)
             print("PASS 2: STRESS LANE VALIDATION (island champions)", file=sys.stderr)
@@ -2084,8 +2164,7 @@ def main() -> None:
             # ================================================================
             # PHASE 3: CHAMPION SELECTION
             # ================================================================
-            # Defer phase tracking to avoid DuckDB lock conflicts
-            selection_phase_id = f"{run_id}_champion_selection"
+            # Phase tracking deferred to avoid DuckDB lock conflicts
             
             # Extract champions
             champions = extract_island_champions(islands, prefer_passing_gates=True)
@@ -2093,12 +2172,11 @@ def main() -> None:
             
             # Store champions to DuckDB (will be deferred if lock conflict)
             # For now, skip storing to avoid conflicts during parallel execution
-            champion_dicts = [c.to_dict() for c in champions]
             # store_island_champions(
             #     duckdb_path=config.duckdb_path,
             #     run_id=run_id,
-            #     phase_id=selection_phase_id,
-            #     champions=champion_dicts,
+            #     phase_id=f"{run_id}_champion_selection",
+            #     champions=[c.to_dict() for c in champions],
             # )
             
             # Phase tracking deferred
@@ -2137,29 +2215,6 @@ def main() -> None:
             slice_path = Path(config.slice_path)
             is_partitioned = is_hive_partitioned(slice_path) or (slice_path.is_dir() and not slice_path.suffix)
             
-            # Load baseline cache for stress validation (same logic as in run_random_search)
-            baseline_cache = None
-            baseline_cache_path = None
-            
-            if config.baseline_parquet:
-                baseline_cache_path = Path(config.baseline_parquet)
-            else:
-                # Auto-detect baseline cache
-                try:
-                    from lib.cache_utils import find_baseline_cache
-                    auto_cache = find_baseline_cache(date_from, date_to)
-                    if auto_cache:
-                        baseline_cache_path = auto_cache
-                except ImportError:
-                    pass
-            
-            if baseline_cache_path and baseline_cache_path.exists():
-                try:
-                    import pandas as pd
-                    baseline_cache = pd.read_parquet(baseline_cache_path)
-                except Exception:
-                    baseline_cache = None
-            
             # ================================================================
             # PHASE 4: STRESS VALIDATION
             # ================================================================
@@ -2167,24 +2222,23 @@ def main() -> None:
             validation_phase_id = f"{run_id}_stress_validation"
             print(f"📝 Phase 4: Stress Validation (phase_id={validation_phase_id})", file=sys.stderr)
             
-            # Validate each champion across all lanes
+            # Validate all champions across all lanes at once: one zero-cost
+            # backtest per (champion, latency), then every lane's fees,
+            # slippage and stop gaps are applied as array ops.
             validated_champions: List[ChampionValidationResult] = []
+            champion_ids = [f"{run_id}_champ_{champ.island_id}" for champ in champions]
+            champ_lane_results: List[Dict[str, Dict[str, Any]]] = []
+            pending: List[List[int]] = []  # Lane indices still to run, per champion
             
-            for champ in champions:
-                champion_id = f"{run_id}_champ_{champ.island_id}"
-                print(f"\nValidating Island {champ.island_id} Champion...", file=sys.stderr)
-                
+            for champ, champion_id in zip(champions, champion_ids):
                 # Check which lanes are already complete (for resume)
                 completed_lanes = get_completed_lanes_for_champion(
                     config.duckdb_path, run_id, champion_id
                 )
-                if completed_lanes:
-                    print(f"  (Skipping {len(completed_lanes)} already-completed lanes)", file=sys.stderr)
-                
                 lane_results = {}
-                
-                # Load previously completed lane results
                 if completed_lanes:
+                    print(f"  Island {champ.island_id}: skipping {len(completed_lanes)} already-completed lanes",
+                          file=sys.stderr)
                     prev_results = load_stress_lane_results(
                         config.duckdb_path, run_id, champion_id
                     )
@@ -2195,15 +2249,20 @@ def main() -> None:
                             "passes_gates": r.get("passes_gates", False),
                             "summary": r.get("summary", {}),
                         }
+                champ_lane_results.append(lane_results)
+                pending.append([j for j, lane in enumerate(stress_lanes) if lane.name not in completed_lanes])
+            
+            for latency, lane_idx in sorted(group_lanes_by_latency(stress_lanes).items()):
+                group_champs = [c for c in range(len(champions)) if set(pending[c]) & set(lane_idx)]
+                if not group_champs:
+                    continue
+                print(f"  Latency {latency}: {len(group_champs)} champions × {len(lane_idx)} lanes...",
+                      file=sys.stderr)
                 
-                for lane in stress_lanes:
-                    # Skip if already completed (resume mode)
-                    if lane.name in completed_lanes:
-                        continue
-                    print(f"  Running lane '{lane.name}'...", file=sys.stderr, end=" ")
-                    
-                    # Run backtest with lane parameters
-                    rows = run_tp_sl_query(
+                rows_per_champ = []
+                for c in group_champs:
+                    champ = champions[c]
+                    rows_per_champ.append(run_tp_sl_query(
                         alerts=test_alerts,
                         slice_path=slice_path,
                         is_partitioned=is_partitioned,
@@ -2212,69 +2271,86 @@ def main() -> None:
                         tp_mult=champ.params.get("tp_mult", 2.0),
                         sl_mult=champ.params.get("sl_mult", 0.5),
                         intrabar_order=champ.params.get("intrabar_order", "sl_first"),
-                        fee_bps=lane.fee_bps,
-                        slippage_bps=lane.slippage_bps,
-                        entry_delay_candles=lane.latency_candles,
+                        fee_bps=0.0,
+                        slippage_bps=0.0,
+                        entry_delay_candles=latency,
                         threads=config.threads,
                         verbose=False,
-                    )
-                    
-                    summary = summarize_tp_sl(
-                        rows, 
-                        sl_mult=champ.params.get("sl_mult", 0.5),
-                        risk_per_trade=config.risk_per_trade,
-                    )
-                    
-                    test_r = summary.get("total_r", 0.0)
+                    ))
+                
+                group_lanes = [stress_lanes[j] for j in lane_idx]
+                trades = TradeArrays.from_rows(
+                    rows_per_champ,
+                    sl_mults=[champions[c].params.get("sl_mult", 0.5) for c in group_champs],
+                )
+                sim = simulate_lanes_from_trades(trades, group_lanes)
+                
+                new_lane_rows: List[Dict[str, Any]] = []
+                for gi, c in enumerate(group_champs):
+                    champ = champions[c]
                     train_r = champ.discovery_score  # Use discovery score as proxy
-                    ratio = test_r / train_r if abs(train_r) > 0.01 else 1.0
-                    
-                    # Apply stop gap penalty analytically
-                    if lane.stop_gap_prob > 0.15:
-                        n_trades = summary.get("alerts_ok", 0)
-                        win_rate = summary.get("tp_sl_win_rate", 0.5)
-                        avg_r_loss = summary.get("avg_r_loss", -1.0)
-                        n_losses = int(n_trades * (1.0 - win_rate))
-                        n_gapped = int(n_losses * lane.stop_gap_prob)
-                        extra_loss = abs(avg_r_loss) * (lane.stop_gap_mult - 1.0) * n_gapped
-                        test_r -= extra_loss
-                    
-                    lane_result = {
-                        "test_r": test_r,
-                        "ratio": ratio,
-                        "passes_gates": test_r >= 0 and ratio >= 0.20,
-                        "summary": summary,
-                    }
-                    lane_results[lane.name] = lane_result
-                    
-                    # Store lane result to DuckDB (audit trail + resume)
-                    store_stress_lane_result(
-                        duckdb_path=config.duckdb_path,
-                        run_id=run_id,
-                        phase_id=validation_phase_id,
-                        champion_id=champion_id,
-                        lane_name=lane.name,
-                        lane_config={
-                            "fee_bps": lane.fee_bps,
-                            "slippage_bps": lane.slippage_bps,
-                            "latency_candles": lane.latency_candles,
-                            "stop_gap_prob": lane.stop_gap_prob,
-                            "stop_gap_mult": lane.stop_gap_mult,
-                        },
-                        result=lane_result,
-                    )
-                    
-                    print(f"TestR={test_r:+.1f}", file=sys.stderr)
+                    for gl, j in enumerate(lane_idx):
+                        if j not in pending[c]:
+                            continue
+                        lane = stress_lanes[j]
+                        total_r = float(sim["total_r"][gi, gl])
+                        test_r = float(sim["stressed_r"][gi, gl])
+                        ratio = total_r / train_r if abs(train_r) > 0.01 else 1.0
+                        # Every return-based field at this lane's costs, as a
+                        # full run at lane fee/slippage would report
+                        summary = summarize_tp_sl(
+                            recost_rows(rows_per_champ[gi], lane.fee_bps, lane.slippage_bps),
+                            sl_mult=champ.params.get("sl_mult", 0.5),
+                            risk_per_trade=config.risk_per_trade,
+                        )
+                        summary["stop_gap_r"] = float(sim["gap_r"][gi, gl])
+                        lane_result = {
+                            "test_r": test_r,
+                            "ratio": ratio,
+                            "passes_gates": test_r >= 0 and ratio >= 0.20,
+                            "summary": summary,
+                        }
+                        champ_lane_results[c][lane.name] = lane_result
+                        new_lane_rows.append({
+                            "champion_id": champion_ids[c],
+                            "lane_name": lane.name,
+                            "lane_config": {
+                                "fee_bps": lane.fee_bps,
+                                "slippage_bps": lane.slippage_bps,
+                                "latency_candles": lane.latency_candles,
+                                "stop_gap_prob": lane.stop_gap_prob,
+                                "stop_gap_mult": lane.stop_gap_mult,
+                            },
+                            "result": lane_result,
+                        })
                 
-                # Compute lane scores
-                lane_scores = {name: result["test_r"] for name, result in lane_results.items()}
-                lane_score_result = compute_lane_scores(lane_scores)
+                # Store each latency group as it finishes (audit trail + resume),
+                # so an interrupted run keeps the groups already simulated
+                store_stress_lane_results(
+                    duckdb_path=config.duckdb_path,
+                    run_id=run_id,
+                    phase_id=validation_phase_id,
+                    results=new_lane_rows,
+                )
+            
+            # Maximin scores for all champions over the current lane pack
+            lane_names = [lane.name for lane in stress_lanes]
+            lane_matrix = compute_lane_scores_matrix(
+                [[lr.get(name, {}).get("test_r", 0.0) for name in lane_names] for lr in champ_lane_results],
+                lane_names,
+            )
+            
+            for c, champ in enumerate(champions):
+                lane_score_result = lane_matrix.lane_score_result(c)
+                print(f"\nIsland {champ.island_id} Champion: "
+                      + " ".join(f"{name}={lane_score_result.lane_scores[name]:+.1f}" for name in lane_names),
+                      file=sys.stderr)
                 
                 validated_champ = ChampionValidationResult(
                     island_id=champ.island_id,
                     params=champ.params,
                     discovery_score=champ.discovery_score,
-                    lane_results=lane_results,
+                    lane_results=champ_lane_results[c],
                     lane_score_result=lane_score_result,
                     validation_score=lane_score_result.robust_score,
                     score_delta=lane_score_result.robust_score - champ.discovery_score,
@@ -2282,12 +2358,12 @@ def main() -> None:
                 validated_champions.append(validated_champ)
             
             # Phase 4 complete (deferred to avoid lock conflicts)
-            print(f"✓ Phase 4: Stress Validation complete", file=sys.stderr)
+            print("✓ Phase 4: Stress Validation complete", file=sys.stderr)
             
             # ================================================================
             # PHASE 5: FINAL SELECTION (maximin winner)
             # ================================================================
-            final_phase_id = store_phase_start(
+            store_phase_start(
                 duckdb_path=config.duckdb_path,
                 run_id=run_id,
                 phase_name="final_selection",
@@ -2309,21 +2385,17 @@ def main() -> None:
                 )
                 
                 # Defer champion validation storage to avoid DuckDB lock conflicts
-                for rank, champ in enumerate(sorted_champs, 1):
-                    island_id = f"{run_id}_island_{champ.island_id}"
-                    champion_id = f"{run_id}_champ_{champ.island_id}"
-                    lane_scores = {name: result["test_r"] for name, result in champ.lane_results.items()}
-                    
-                    # store_champion_validation(
-                    #     duckdb_path=config.duckdb_path,
-                    #     run_id=run_id,
-                    #     phase_id=final_phase_id,
-                    #     champion_id=champion_id,
-                    #     island_id=island_id,
-                    #     lane_scores=lane_scores,
-                    #     validation_rank=rank,
-                    #     discovery_score=champ.discovery_score,
-                    # )
+                # for rank, champ in enumerate(sorted_champs, 1):
+                #     store_champion_validation(
+                #         duckdb_path=config.duckdb_path,
+                #         run_id=run_id,
+                #         phase_id=f"{run_id}_final_selection",
+                #         champion_id=f"{run_id}_champ_{champ.island_id}",
+                #         island_id=f"{run_id}_island_{champ.island_id}",
+                #         lane_scores={name: result["test_r"] for name, result in champ.lane_results.items()},
+                #         validation_rank=rank,
+                #         discovery_score=champ.discovery_score,
+                #     )
                 
                 maximin_winner = sorted_champs[0]
                 print(f"\n🏆 MAXIMIN WINNER: Island {maximin_winner.island_id}", file=sys.stderr)
@@ -2333,7 +2405,7 @@ def main() -> None:
                 print(f"   Score Delta:      {maximin_winner.score_delta:+.1f}", file=sys.stderr)
             
             # Phase tracking deferred to avoid lock conflicts
-            print(f"✓ Phase 5: Final Selection complete", file=sys.stderr)
+            print("✓ Phase 5: Final Selection complete", file=sys.stderr)
             
             # Print final run state
             print_run_state(config.duckdb_path, run_id)
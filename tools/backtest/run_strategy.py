@@ -50,6 +50,7 @@ from lib import (
     load_alerts,
     ClickHouseCfg,
     export_slice_streaming,
+    load_coverage_index,
     query_coverage_batched,
     partition_slice,
     is_hive_partitioned,
@@ -247,9 +248,10 @@ Examples:
             if verbose:
                 print("[2/5] Querying ClickHouse coverage (batched)...", file=sys.stderr)
             t0 = time.time()
+            coverage_index = load_coverage_index(args.duckdb, args.chain, mints, args.interval_seconds)
             coverage = query_coverage_batched(
                 ch_cfg, args.chain, mints, args.interval_seconds, date_from, date_to,
-                ch_batch=args.ch_batch, parallel=args.ch_parallel
+                ch_batch=args.ch_batch, parallel=args.ch_parallel, coverage_index=coverage_index
             )
             covered_mints = {m for m, cnt in coverage.items() if cnt > 0}
             if verbose:
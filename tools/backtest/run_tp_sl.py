@@ -33,10 +33,12 @@ from lib import (
     load_alerts,
     ClickHouseCfg,
     export_slice_streaming,
+    load_coverage_index,
     query_coverage_batched,
     partition_slice,
     is_hive_partitioned,
     run_tp_sl_query,
+    ResultCache,
     store_tp_sl_run,
     summarize_tp_sl,
     aggregate_by_caller,
@@ -96,6 +98,10 @@ def main() -> None:
     ap.add_argument("--threads", type=int, default=8)
     ap.add_argument("--output-format", choices=["console", "json"], default="console")
     ap.add_argument("--verbose", action="store_true")
+    ap.add_argument("--result-cache-dir", default=None,
+                    help="Cache per-alert results keyed by alert/slice content and params")
+    ap.add_argument("--result-cache-max-mb", type=int, default=2048,
+                    help="Result cache size cap in MB (least recently used entries evicted)")
 
     # Storage
     ap.add_argument("--store-duckdb", action="store_true", help="Store to bt.* schema")
@@ -151,9 +157,10 @@ def main() -> None:
             if verbose:
                 print("[2/5] Querying ClickHouse coverage (batched)...", file=sys.stderr)
             t0 = time.time()
+            coverage_index = load_coverage_index(args.duckdb, args.chain, mints, args.interval_seconds)
             coverage = query_coverage_batched(
                 ch_cfg, args.chain, mints, args.interval_seconds, date_from, date_to,
-                ch_batch=args.ch_batch, parallel=args.ch_parallel
+                ch_batch=args.ch_batch, parallel=args.ch_parallel, coverage_index=coverage_index
             )
             covered_mints = {m for m, cnt in coverage.items() if cnt > 0}
             if verbose:
@@ -201,6 +208,10 @@ def main() -> None:
     if verbose:
         print(f"[5/5] Running TP/SL backtest (tp={args.tp_mult}x, sl={args.sl_mult}x)...", file=sys.stderr)
     t0 = time.time()
+    result_cache = (
+        ResultCache(args.result_cache_dir, max_bytes=args.result_cache_max_mb * 1024 * 1024)
+        if args.result_cache_dir else None
+    )
     out_rows = run_tp_sl_query(
         alerts=alerts,
         slice_path=slice_path,
@@ -214,9 +225,12 @@ def main() -> None:
         slippage_bps=args.slippage_bps,
         threads=args.threads,
         verbose=verbose,
+        result_cache=result_cache,
     )
     if verbose:
         print(f"      Query completed in {time.time()-t0:.1f}s", file=sys.stderr)
+        if result_cache is not None:
+            print(f"      Result cache: {'hit' if result_cache.hits else 'miss'}", file=sys.stderr)
 
     # Step 5: Summarize
     summary = summarize_tp_sl(out_rows)
@@ -0,0 +1,141 @@
+"""
+Tests for the materialized caller stats behind get_caller_leaderboard.
+
+Leaderboards built from baseline.caller_stats_d must match the
+baseline.caller_scored_{version} views over baseline.trades_d, whether the
+stats were merged incrementally, rebuilt, or merged across runs.
+"""
+from __future__ import annotations
+
+import math
+import random
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+from lib.scoring_views import (
+    VIEW_DEFINITIONS,
+    create_scoring_views,
+    get_caller_leaderboard,
+    insert_trades_from_results,
+    rebuild_caller_stats,
+)
+
+T0_MS = 1_735_689_600_000
+
+
+def make_results(n: int, seed: int, n_callers: int = 6):
+    rng = random.Random(seed)
+    results = []
+    for i in range(n):
+        net_return = rng.uniform(-0.6, 2.5)
+        peak = max(1.0, 1 + net_return + rng.uniform(0, 1.5))
+        results.append({
+            "caller": f"caller_{rng.randrange(n_callers)}",
+            "mint": f"mint_{seed}_{i}",
+            "alert_timestamp_ms": T0_MS + i * 60_000,
+            "net_return": net_return,
+            "peak_mult": peak,
+            "dd_max": rng.uniform(0, 0.9) if rng.random() > 0.2 else None,
+            "dd_pre2x": rng.uniform(0, 0.5) if rng.random() > 0.3 else None,
+            "r_multiple": net_return * rng.uniform(0.5, 3) if rng.random() > 0.1 else None,
+            "portfolio_pnl_pct": net_return * 0.05,
+            "position_pct": rng.uniform(0.05, 0.3),
+            "time_to_2x_s": 600 if peak >= 2 else None,
+        })
+    return results
+
+
+def view_leaderboard(con, version, run_ids=None):
+    """Reference: the version's view over a copy of (run_ids') trades."""
+    where, params = "", []
+    if run_ids is not None:
+        where, params = "WHERE list_contains(?, run_id)", [run_ids]
+    trades = con.execute(f"SELECT * FROM baseline.trades_d {where}", params).fetchall()
+
+    ref = duckdb.connect()
+    try:
+        create_scoring_views(ref, [version])
+        if trades:
+            placeholders = ", ".join("?" * len(trades[0]))
+            ref.executemany(f"INSERT INTO baseline.trades_d VALUES ({placeholders})", trades)
+        rows = ref.execute(f"SELECT * FROM baseline.caller_scored_{version}").fetchall()
+        cols = [d[0] for d in ref.description]
+    finally:
+        ref.close()
+    return {row[0]: dict(zip(cols, row)) for row in rows}
+
+
+def assert_same_rows(actual, expected):
+    assert set(actual) == set(expected)
+    for caller, exp in expected.items():
+        got = actual[caller]
+        assert set(got) == set(exp), caller
+        for key, value in exp.items():
+            if isinstance(value, float) and got[key] is not None:
+                assert math.isclose(got[key], value, rel_tol=1e-9, abs_tol=1e-9), (caller, key)
+            else:
+                assert got[key] == value, (caller, key)
+
+
+@pytest.fixture
+def con():
+    conn = duckdb.connect()
+    insert_trades_from_results(conn, "run_a", make_results(300, seed=1))
+    insert_trades_from_results(conn, "run_a", make_results(80, seed=2))  # append
+    insert_trades_from_results(conn, "run_b", make_results(200, seed=3))
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("version", sorted(VIEW_DEFINITIONS))
+def test_leaderboard_matches_view(con, version):
+    board = get_caller_leaderboard(con, version, min_trades=0, limit=100)
+    assert [r["score"] for r in board] == sorted((r["score"] for r in board), reverse=True)
+    assert_same_rows({r["caller"]: r for r in board}, view_leaderboard(con, version))
+
+
+@pytest.mark.parametrize("version", ["v2", "v4"])
+def test_run_filters_match_view_over_those_runs(con, version):
+    single = get_caller_leaderboard(con, version, min_trades=0, limit=100, run_id="run_b")
+    assert_same_rows({r["caller"]: r for r in single}, view_leaderboard(con, version, ["run_b"]))
+
+    both = get_caller_leaderboard(con, version, min_trades=0, limit=100, run_ids=["run_a", "run_b"])
+    assert_same_rows({r["caller"]: r for r in both}, view_leaderboard(con, version))
+
+
+def test_incremental_merge_equals_rebuild(con):
+    before = con.execute(
+        "SELECT * FROM baseline.caller_stats_d ORDER BY run_id, caller"
+    ).fetchall()
+    rebuild_caller_stats(con)
+    after = con.execute(
+        "SELECT * FROM baseline.caller_stats_d ORDER BY run_id, caller"
+    ).fetchall()
+    assert len(before) == len(after)
+    for old, new in zip(before, after):
+        for a, b in zip(old, new):
+            if isinstance(a, list):
+                assert sorted(a) == pytest.approx(sorted(b))
+            elif isinstance(a, float):
+                assert a == pytest.approx(b)
+            else:
+                assert a == b
+
+
+def test_min_trades_and_limit(con):
+    board = get_caller_leaderboard(con, "v4", min_trades=70, limit=2)
+    assert len(board) <= 2
+    assert all(r["n_trades"] >= 70 for r in board)
+
+
+def test_backfills_stats_for_existing_trades(con):
+    con.execute("DROP TABLE baseline.caller_stats_d")
+    board = get_caller_leaderboard(con, "v2", min_trades=0, limit=100)
+    assert_same_rows({r["caller"]: r for r in board}, view_leaderboard(con, "v2"))
@@ -0,0 +1,136 @@
+"""
+Tests for vectorized parameter-island clustering.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+from lib.island_clustering import (
+    KDTree,
+    ParamSpace,
+    density_labels,
+    kmeans_pp,
+    neighbour_score_stats,
+)
+from lib.robust_region_finder import cluster_parameters
+
+
+def blobs(rng, centers, n, scale=0.03):
+    return np.vstack([c + rng.normal(0, scale, (n, len(c))) for c in centers])
+
+
+def brute_pairs(q, x, r):
+    d = np.sqrt(((q[:, None, :] - x[None, :, :]) ** 2).sum(axis=2))
+    return set(zip(*np.nonzero(d <= r)))
+
+
+def test_kdtree_pairs_match_brute_force():
+    rng = np.random.default_rng(0)
+    x = rng.random((700, 4))
+    q = rng.random((150, 4))
+    tree = KDTree(x, leaf_size=16)
+
+    qi, xj = tree.query_pairs(KDTree(q, leaf_size=16), 0.2)
+    assert set(zip(qi.tolist(), xj.tolist())) == brute_pairs(q, x, 0.2)
+
+    si, sj = tree.query_pairs(tree, 0.1)
+    assert set(zip(si.tolist(), sj.tolist())) == brute_pairs(x, x, 0.1)
+
+
+def test_param_space_normalizes_all_dimensions():
+    params = [
+        {"tp_mult": 2.0, "sl_mult": 0.5, "time_stop_hours": None, "entry_mode": "immediate", "reentry_enabled": False},
+        {"tp_mult": 4.0, "sl_mult": 0.5, "time_stop_hours": 12, "entry_mode": "wait_dip", "reentry_enabled": True},
+    ]
+    space = ParamSpace.fit(params)
+    x = space.transform(params)
+
+    # sl_mult is constant and dropped; entry_mode is one-hot
+    assert space.numeric_keys == ["tp_mult", "time_stop_hours", "reentry_enabled"]
+    assert list(space.categorical) == ["entry_mode"]
+    assert x.tolist() == [[0, 0, 0, 1, 0], [1, 1, 1, 0, 1]]
+
+
+def test_kmeans_pp_recovers_separated_blobs():
+    rng = np.random.default_rng(1)
+    centers = [np.array([0.1, 0.1, 0.9]), np.array([0.9, 0.2, 0.1]), np.array([0.5, 0.9, 0.5])]
+    x = blobs(rng, centers, 200)
+
+    labels, centroids, inertia = kmeans_pp(x, 3, n_init=4, seed=3)
+
+    for b in range(3):
+        assert len(set(labels[b * 200:(b + 1) * 200])) == 1
+    assert len(set(labels)) == 3
+    assert kmeans_pp(x, 3, n_init=4, seed=3)[2] == inertia
+
+
+def test_density_labels_separate_islands_and_noise():
+    rng = np.random.default_rng(2)
+    x = np.vstack([blobs(rng, [np.array([0.2, 0.2]), np.array([0.8, 0.8])], 100, scale=0.02), [[0.5, 0.5]]])
+
+    labels = density_labels(x, eps=0.05, min_samples=5)
+
+    assert labels[-1] == -1
+    assert set(labels[:100]) == {0}
+    assert set(labels[100:200]) == {1}
+
+
+def test_neighbour_score_stats_match_brute_force():
+    rng = np.random.default_rng(4)
+    x = rng.random((300, 3))
+    scores = rng.normal(0, 1, 300)
+    q = x[:40]
+
+    stats = neighbour_score_stats(KDTree(x), scores, KDTree(q), 0.25)
+
+    d = np.sqrt(((q[:, None, :] - x[None, :, :]) ** 2).sum(axis=2))
+    for i in range(40):
+        nb = scores[d[i] <= 0.25]
+        assert stats["n_neighbours"][i] == len(nb)
+        assert stats["std"][i] == pytest.approx(nb.std())
+
+
+def test_cluster_parameters_uses_all_dimensions():
+    """Islands that differ only in a non-TP/SL dimension are still separated."""
+    rng = np.random.default_rng(5)
+    candidates = []
+    for i in range(3000):
+        good = i < 600
+        region = i % 2
+        candidates.append({
+            "params": {
+                "tp_mult": 2.5 + rng.normal(0, 0.05),
+                "sl_mult": 0.5 + rng.normal(0, 0.01),
+                "time_stop_hours": (6 if region == 0 else 36) + rng.normal(0, 1) if good else rng.uniform(1, 48),
+                "intrabar_order": "sl_first" if region == 0 else "tp_first",
+            },
+            "robust_result": {
+                "robust_score": (10.0 if good else 0.0) + rng.normal(0, 0.5),
+                "median_test_r": 5.0,
+                "median_ratio": 0.5,
+                "passes_gates": good,
+            },
+        })
+    # A lone lucky point far from everything
+    candidates.append({
+        "params": {"tp_mult": 9.0, "sl_mult": 0.9, "time_stop_hours": 24, "intrabar_order": "sl_first"},
+        "robust_result": {"robust_score": 50.0, "median_test_r": 50.0, "median_ratio": 1.0, "passes_gates": True},
+    })
+
+    islands = cluster_parameters(candidates, n_clusters=2, top_n=601)
+
+    assert len(islands) == 2
+    stops = sorted(i.centroid["time_stop_hours"] for i in islands)
+    assert stops[0] == pytest.approx(6, abs=1) and stops[1] == pytest.approx(36, abs=1)
+    assert {i.centroid["intrabar_order"] for i in islands} == {"sl_first", "tp_first"}
+    assert all(i.n_noise >= 1 for i in islands)
+    assert all(m["params"]["tp_mult"] != 9.0 for i in islands for m in i.members)
+    assert all(i.neighbour_score_std >= 0 for i in islands)
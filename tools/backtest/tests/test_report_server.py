@@ -0,0 +1,215 @@
+"""
+Tests for the report server's pooled connections, response cache and API.
+
+Runs a real server on an ephemeral port against a small DuckDB file.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import duckdb
+import pytest
+
+# Add parent directory to path
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+from report_server import (
+    CachedResponse,
+    ReadOnlyConnectionPool,
+    ResponseCache,
+    create_server,
+    db_version,
+)
+
+
+def make_runs_db(path: Path, n_runs: int) -> None:
+    conn = duckdb.connect(str(path))
+    conn.execute("CREATE SCHEMA baseline")
+    conn.execute("""
+        CREATE TABLE baseline.runs_d (
+            run_id VARCHAR, run_name VARCHAR, created_at TIMESTAMP,
+            date_from DATE, date_to DATE, interval_seconds INTEGER,
+            horizon_hours INTEGER, chain VARCHAR, config_json VARCHAR
+        )
+    """)
+    for i in range(n_runs):
+        conn.execute(
+            "INSERT INTO baseline.runs_d VALUES (?, ?, TIMESTAMP '2025-01-01' + INTERVAL (?) HOUR, "
+            "DATE '2025-01-01', DATE '2025-01-31', 60, 48, 'solana', '{}')",
+            [f"run{i:04d}", f"run {i}", i],
+        )
+    conn.close()
+
+
+@pytest.fixture
+def server(tmp_dir, monkeypatch):
+    # Run exports write to results/ under the working directory
+    monkeypatch.chdir(tmp_dir)
+    db_path = tmp_dir / "runs.duckdb"
+    make_runs_db(db_path, 25)
+    srv = create_server("127.0.0.1", 0, str(db_path), str(tmp_dir), workers=4, idle_timeout=0.2)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    yield base, db_path
+    srv.shutdown()
+    srv.server_close()
+
+
+def get(url: str, headers=None):
+    req = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, dict(resp.headers), resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+class TestRunsApi:
+    """Paginated /api/runs."""
+
+    def test_pagination(self, server):
+        base, _ = server
+        status, _, body = get(f"{base}/api/runs?limit=10&offset=20")
+        assert status == 200
+        page = json.loads(body)
+        assert page["total"] == 25
+        assert page["limit"] == 10
+        assert page["offset"] == 20
+        assert len(page["runs"]) == 5
+
+    def test_limit_is_clamped(self, server):
+        base, _ = server
+        _, _, body = get(f"{base}/api/runs?limit=0")
+        assert json.loads(body)["limit"] == 1
+        _, _, body = get(f"{base}/api/runs?limit=abc")
+        assert json.loads(body)["limit"] == 100
+
+    def test_etag_returns_304(self, server):
+        base, _ = server
+        status, headers, _ = get(f"{base}/api/runs")
+        etag = headers["ETag"]
+        status, _, body = get(f"{base}/api/runs", {"If-None-Match": etag})
+        assert status == 304
+        assert body == b""
+
+    def test_gzip_when_accepted(self, server):
+        base, _ = server
+        _, plain_headers, plain = get(f"{base}/api/runs")
+        _, headers, body = get(f"{base}/api/runs", {"Accept-Encoding": "gzip"})
+        assert headers.get("Content-Encoding") == "gzip"
+        assert gzip.decompress(body) == plain
+        assert "Content-Encoding" not in plain_headers
+
+    def test_db_change_invalidates_cache(self, server):
+        base, db_path = server
+        _, _, body = get(f"{base}/api/runs")
+        assert json.loads(body)["total"] == 25
+
+        # Wait for the pooled connection to be released so we can write
+        deadline = time.time() + 5
+        while True:
+            try:
+                conn = duckdb.connect(str(db_path))
+                break
+            except duckdb.Error:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.05)
+        conn.execute(
+            "INSERT INTO baseline.runs_d VALUES ('new', 'new', now(), NULL, NULL, 60, 48, 'solana', '{}')"
+        )
+        conn.close()
+
+        _, _, body = get(f"{base}/api/runs")
+        assert json.loads(body)["total"] == 26
+
+    def test_concurrent_requests(self, server):
+        base, _ = server
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            results = list(ex.map(lambda i: get(f"{base}/api/runs?offset={i}"), range(16)))
+        assert all(status == 200 for status, _, _ in results)
+
+    def test_index_page(self, server):
+        base, _ = server
+        status, headers, body = get(f"{base}/")
+        assert status == 200
+        assert headers["Content-type"].startswith("text/html")
+        assert b"All Runs (25 total)" in body
+
+    def test_unknown_run_is_404(self, server):
+        base, _ = server
+        status, _, _ = get(f"{base}/run/missing?type=baseline")
+        assert status == 404
+
+
+class TestConnectionPool:
+    """Pooled read-only connections."""
+
+    def test_connection_shared_and_released(self, tmp_dir):
+        db_path = tmp_dir / "pool.duckdb"
+        make_runs_db(db_path, 1)
+        pool = ReadOnlyConnectionPool(idle_timeout=0.1)
+
+        with pool.cursor(str(db_path)) as a, pool.cursor(str(db_path)) as b:
+            assert a.execute("SELECT count(*) FROM baseline.runs_d").fetchone()[0] == 1
+            assert b.execute("SELECT count(*) FROM baseline.runs_d").fetchone()[0] == 1
+            assert len(pool._entries) == 1
+
+        # Idle connection is closed so writers can take the lock
+        deadline = time.time() + 5
+        while pool._entries and time.time() < deadline:
+            time.sleep(0.05)
+        assert not pool._entries
+        duckdb.connect(str(db_path)).close()
+
+    def test_zero_idle_timeout_closes_immediately(self, tmp_dir):
+        db_path = tmp_dir / "pool.duckdb"
+        make_runs_db(db_path, 1)
+        pool = ReadOnlyConnectionPool(idle_timeout=0)
+        with pool.cursor(str(db_path)) as cur:
+            cur.execute("SELECT 1").fetchone()
+        assert not pool._entries
+
+
+class TestResponseCache:
+    """Version-tagged LRU response cache."""
+
+    def test_version_mismatch_is_miss(self):
+        cache = ResponseCache()
+        cache.put(("k",), (1, 1), CachedResponse.build(b"x", "text/plain"))
+        assert cache.get(("k",), (1, 1)).body == b"x"
+        assert cache.get(("k",), (2, 1)) is None
+        assert cache.get(("k",), (1, 1)) is None
+
+    def test_lru_eviction_by_size(self):
+        cache = ResponseCache(max_bytes=3000)
+        for key in ("a", "b", "c"):
+            cache.put((key,), (1, 1), CachedResponse.build(os.urandom(1000), "application/octet-stream"))
+        cache.get(("a",), (1, 1))
+        cache.put(("d",), (1, 1), CachedResponse.build(os.urandom(1000), "application/octet-stream"))
+        assert cache.get(("a",), (1, 1)) is not None
+        assert cache.get(("b",), (1, 1)) is None
+
+    def test_eviction_drops_idle_key_lock(self):
+        cache = ResponseCache(max_bytes=2000)
+        for key in ("a", "b"):
+            with cache.lock_for((key,)):
+                cache.put((key,), (1, 1), CachedResponse.build(os.urandom(1000), "application/octet-stream"))
+        cache.put(("c",), (1, 1), CachedResponse.build(os.urandom(1000), "application/octet-stream"))
+        assert ("a",) not in cache._key_locks
+        assert ("b",) in cache._key_locks
+
+    def test_db_version_missing_file(self, tmp_dir):
+        assert db_version(str(tmp_dir / "missing.duckdb")) == (0, 0)
@@ -0,0 +1,99 @@
+"""
+Tests for the content-addressed backtest result cache.
+
+Cached evaluations must return the same rows as uncached ones, and the key
+must change whenever the alert set, slice content, or params change.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+_TESTS_DIR = Path(__file__).parent
+if str(_TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(_TESTS_DIR))
+
+from fixtures import make_instant_rug, make_linear_pump, write_candles_to_parquet
+from lib.alerts import Alert
+from lib.baseline_query import run_baseline_query
+from lib.extended_exits import ExitConfig, run_extended_exit_query
+from lib.result_cache import ResultCache
+from lib.tp_sl_query import run_tp_sl_query
+
+UTC = timezone.utc
+BASE = datetime(2025, 1, 1, 0, 0, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def setup(tmp_path: Path):
+    candles = make_linear_pump("PUMP", BASE, entry_price=1.0, peak_mult=3.0,
+                               candles_to_peak=30, candles_after_peak=30)
+    candles += make_instant_rug("RUG", BASE, entry_price=1.0, num_candles=60)
+    slice_path = tmp_path / "slice.parquet"
+    write_candles_to_parquet(candles, slice_path)
+    ts_ms = int(BASE.timestamp() * 1000)
+    alerts = [Alert(mint="PUMP", caller="A", ts_ms=ts_ms), Alert(mint="RUG", caller="B", ts_ms=ts_ms)]
+    cache = ResultCache(tmp_path / "cache")
+    return {"slice_path": slice_path, "alerts": alerts, "cache": cache}
+
+
+def test_cached_evaluations_match_uncached(setup):
+    alerts, slice_path, cache = setup["alerts"], setup["slice_path"], setup["cache"]
+    runs = [
+        lambda **kw: run_baseline_query(alerts, slice_path, False, 60, 2, **kw),
+        lambda **kw: run_tp_sl_query(alerts, slice_path, interval_seconds=60, horizon_hours=2, **kw),
+        lambda **kw: run_extended_exit_query(
+            alerts, slice_path, ExitConfig(tp_mult=2.0, sl_mult=0.5), 60, 2, **kw
+        ),
+    ]
+    for i, run in enumerate(runs):
+        expected = run()
+        first = run(result_cache=cache)
+        second = run(result_cache=cache)
+        assert first == expected
+        assert second == expected
+        assert cache.hits == i + 1
+
+
+def test_key_changes_with_inputs(setup, tmp_path):
+    alerts, slice_path, cache = setup["alerts"], setup["slice_path"], setup["cache"]
+    key = cache.evaluation_key("tp_sl", alerts, slice_path, {"tp": 2.0})
+
+    assert cache.evaluation_key("tp_sl", alerts, slice_path, {"tp": 2.0}) == key
+    assert cache.evaluation_key("tp_sl", alerts, slice_path, {"tp": 3.0}) != key
+    assert cache.evaluation_key("baseline", alerts, slice_path, {"tp": 2.0}) != key
+    assert cache.evaluation_key("tp_sl", alerts[:1], slice_path, {"tp": 2.0}) != key
+
+    # Same count and time range, different content
+    moved = [Alert(mint="RUG", caller="A", ts_ms=alerts[0].ts_ms), alerts[1]]
+    assert cache.evaluation_key("tp_sl", moved, slice_path, {"tp": 2.0}) != key
+
+    # Rewriting the slice with different candles changes the key
+    write_candles_to_parquet(make_instant_rug("RUG", BASE, entry_price=1.0, num_candles=60), slice_path)
+    assert cache.evaluation_key("tp_sl", alerts, slice_path, {"tp": 2.0}) != key
+
+
+def test_lru_eviction_respects_size_cap(setup):
+    cache = setup["cache"]
+    rows = [{"alert_id": i, "mint": f"m{i}", "ret": i * 0.5} for i in range(50)]
+    cache.put("a" * 64, rows)
+    size = os.path.getsize(cache.cache_dir / f"{'a' * 64}.parquet")
+    cache.max_bytes = 2 * size
+
+    cache.put("b" * 64, rows)
+    past = os.stat(cache.cache_dir / f"{'a' * 64}.parquet").st_mtime - 100
+    os.utime(cache.cache_dir / f"{'b' * 64}.parquet", (past, past))
+    assert cache.get("a" * 64) == rows  # refreshes "a"
+
+    cache.put("c" * 64, rows)
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) == rows
+    assert cache.get("c" * 64) == rows
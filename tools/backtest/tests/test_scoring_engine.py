@@ -0,0 +1,172 @@
+"""
+Parity tests for the vectorized caller scoring engine.
+
+The engine must agree with both existing scoring paths:
+- summary.aggregate_by_caller + scoring.score_callers_v2 (Python)
+- scoring.generate_caller_scored_v2_sql (DuckDB view)
+"""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+import pytest
+
+# Add parent directory to path
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+from lib.scoring import ScoringConfig, generate_caller_scored_v2_sql, score_callers_v2
+from lib.scoring_engine import (
+    SCORE_COLUMNS,
+    caller_stats_from_alerts,
+    score_alerts,
+    score_caller_arrays,
+    scored_records,
+)
+from lib.summary import aggregate_by_caller
+
+STAT_FIELDS = (
+    "n", "median_ath", "p75_ath", "p95_ath", "hit2x_pct", "median_t2x_hrs",
+    "median_dd_pre2x_pct", "median_dd_overall_pct", "median_dd_pre2x_or_horizon_pct",
+)
+
+
+def make_alert_rows(n_callers: int, seed: int):
+    rng = random.Random(seed)
+    rows = []
+    for c in range(n_callers):
+        # Mix of tiny and large samples, good and terrible callers
+        n = rng.choice([1, 2, 3, 7, 20, 60])
+        quality = rng.uniform(0.5, 3.0)
+        for _ in range(n):
+            ath = rng.lognormvariate(0, 0.6) * quality
+            hit2x = ath >= 2.0
+            dd_overall = -rng.uniform(0.0, 0.95)
+            rows.append({
+                "status": rng.choice(["ok"] * 9 + ["missing"]),
+                "caller": f"caller_{c:03d}",
+                "ath_mult": ath,
+                "time_to_2x_s": rng.uniform(30, 20_000) if hit2x else None,
+                "dd_pre2x": -rng.uniform(0.0, 0.7) if hit2x else None,
+                "dd_overall": dd_overall,
+            })
+    return rows
+
+
+def to_table(rows) -> pa.Table:
+    return pa.Table.from_pylist(rows)
+
+
+@pytest.fixture
+def alert_rows():
+    return make_alert_rows(120, seed=11)
+
+
+class TestPythonParity:
+    """Engine vs aggregate_by_caller + score_callers_v2."""
+
+    def test_caller_stats_match_aggregate_by_caller(self, alert_rows):
+        expected = {c["caller"]: c for c in aggregate_by_caller(alert_rows, min_trades=2)}
+        stats = caller_stats_from_alerts(to_table(alert_rows), min_trades=2)
+
+        assert sorted(expected) == list(stats["caller"])
+        for i, caller in enumerate(stats["caller"]):
+            for field in STAT_FIELDS:
+                ref = expected[caller][field]
+                got = stats[field][i]
+                if ref is None:
+                    assert got != got, (caller, field)
+                else:
+                    assert got == pytest.approx(ref, rel=1e-12), (caller, field)
+
+    @pytest.mark.parametrize("config", [
+        ScoringConfig(),
+        ScoringConfig(risk_threshold=0.3, risk_rate=15.0, discipline_hit2x_threshold=20.0, confidence_k=10.0),
+    ])
+    def test_scores_and_ranks_match_score_callers_v2(self, alert_rows, config):
+        callers = sorted(aggregate_by_caller(alert_rows, min_trades=1), key=lambda c: c["caller"])
+        expected = score_callers_v2(callers, config)
+
+        got = scored_records(score_alerts(to_table(alert_rows), config, min_trades=1))
+
+        assert [r["caller"] for r in got] == [r["caller"] for r in expected]
+        for ref, row in zip(expected, got):
+            assert row["rank_v2"] == ref["rank_v2"]
+            for field in SCORE_COLUMNS:
+                if ref[field] is None:
+                    assert row[field] is None, (ref["caller"], field)
+                else:
+                    assert row[field] == pytest.approx(ref[field], rel=1e-9, abs=1e-12), (ref["caller"], field)
+
+    def test_accepts_dataframe_and_dict(self, alert_rows):
+        import pandas as pd
+
+        table = score_alerts(to_table(alert_rows))["score_v2"]
+        df = pd.DataFrame(alert_rows)
+        assert score_alerts(df)["score_v2"].tolist() == pytest.approx(table.tolist())
+        as_dict = {k: df[k].to_numpy() for k in df.columns}
+        assert score_alerts(as_dict)["score_v2"].tolist() == pytest.approx(table.tolist())
+
+    @pytest.mark.parametrize("kind", ["arrow", "pandas"])
+    def test_null_and_blank_callers_are_dropped(self, alert_rows, kind):
+        import pandas as pd
+
+        extra = [dict(alert_rows[i], caller=caller) for i, caller in enumerate([None, "  ", None, ""])]
+        data = to_table(alert_rows + extra) if kind == "arrow" else pd.DataFrame(alert_rows + extra)
+
+        expected = score_alerts(to_table(alert_rows))
+        got = score_alerts(data)
+        assert list(got["caller"]) == list(expected["caller"])
+        assert got["score_v2"].tolist() == pytest.approx(expected["score_v2"].tolist())
+
+    def test_empty_input(self):
+        scored = score_alerts({"caller": [], "ath_mult": [], "time_to_2x_s": [], "dd_pre2x": [], "dd_overall": []})
+        assert len(scored["caller"]) == 0
+        assert scored_records(scored) == []
+
+
+class TestSqlParity:
+    """Engine vs the baseline.caller_scored_v2 view."""
+
+    def test_matches_generated_view(self, alert_rows):
+        config = ScoringConfig()
+        stats = caller_stats_from_alerts(to_table(alert_rows), min_trades=1)
+        scored = score_caller_arrays(stats, config)
+
+        conn = duckdb.connect(":memory:")
+        conn.execute("CREATE SCHEMA baseline")
+        caller_stats = pa.table({
+            "run_id": ["run"] * len(stats["caller"]),
+            "caller": list(stats["caller"]),
+            **{f: stats[f] for f in STAT_FIELDS},
+            **{f: pa.nulls(len(stats["caller"]), pa.float64()) for f in ("hit3x_pct", "hit4x_pct", "hit5x_pct")},
+        })
+        conn.register("caller_stats_arrow", caller_stats)
+        # NaN -> NULL as the storage layer writes it
+        conn.execute("""
+            CREATE TABLE baseline.caller_stats_f AS
+            SELECT * REPLACE (
+                CASE WHEN isnan(median_t2x_hrs) THEN NULL ELSE median_t2x_hrs END AS median_t2x_hrs,
+                CASE WHEN isnan(median_dd_pre2x_pct) THEN NULL ELSE median_dd_pre2x_pct END AS median_dd_pre2x_pct
+            )
+            FROM caller_stats_arrow
+        """)
+        conn.execute(generate_caller_scored_v2_sql(config))
+        rows = conn.execute(
+            "SELECT caller, score_v2, risk_penalty, fast2x_signal, tail_bonus, confidence, rank_v2 "
+            "FROM baseline.caller_scored_v2 ORDER BY caller"
+        ).fetchall()
+
+        assert [r[0] for r in rows] == list(scored["caller"])
+        for i, (caller, score, penalty, fast2x, tail, confidence, rank) in enumerate(rows):
+            assert score == pytest.approx(scored["score_v2"][i], rel=1e-9, abs=1e-12), caller
+            assert penalty == pytest.approx(scored["risk_penalty"][i], rel=1e-9, abs=1e-12)
+            assert fast2x == pytest.approx(scored["fast2x_signal"][i], rel=1e-9, abs=1e-12)
+            assert tail == pytest.approx(scored["tail_bonus"][i], rel=1e-9, abs=1e-12)
+            assert confidence == pytest.approx(scored["confidence"][i])
+            assert rank == scored["rank_v2"][i]
@@ -0,0 +1,171 @@
+"""
+Tests for matrix (all candidates × all lanes) stress lane evaluation.
+
+The vectorized paths must agree with the per-pair functions they replace.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+from lib.stress_lanes import (
+    STRESS_LANES_ADVERSARIAL,
+    STRESS_LANES_FULL,
+    StressLane,
+    TradeArrays,
+    compute_lane_scores,
+    compute_lane_scores_matrix,
+    group_lanes_by_latency,
+    recost_returns,
+    recost_rows,
+    simulate_lane_stress_analytical,
+    simulate_lanes_analytical_matrix,
+    simulate_lanes_from_trades,
+)
+from lib.summary import summarize_tp_sl
+
+
+def tp_sl_ret(gross: float, fee_bps: float, slippage_bps: float) -> float:
+    """Return formula used by tp_sl_query."""
+    return gross * (1 - (fee_bps + slippage_bps) / 10000) / (1 + slippage_bps / 10000) - 1
+
+
+def make_rows(rng, n: int, tp: float, sl: float, fee_bps: float = 0.0, slippage_bps: float = 0.0):
+    rows = []
+    for i in range(n):
+        gross = tp if rng.random() < 0.4 else (sl if rng.random() < 0.7 else rng.uniform(0.6, 1.4))
+        reason = "tp" if gross == tp else ("sl" if gross == sl else "horizon")
+        rows.append({
+            "alert_id": i,
+            "status": "ok",
+            "tp_sl_ret": tp_sl_ret(gross, fee_bps, slippage_bps),
+            "tp_sl_exit_reason": reason,
+        })
+    rows.append({"alert_id": n, "status": "missing"})
+    return rows
+
+
+def test_analytical_matrix_matches_per_pair():
+    lanes = STRESS_LANES_ADVERSARIAL
+    rng = np.random.default_rng(1)
+    base_r = rng.normal(5, 10, 40)
+    win_rate = rng.uniform(0.2, 0.7, 40)
+    n_trades = rng.integers(0, 200, 40)
+    avg_r_loss = -rng.uniform(0.5, 1.2, 40)
+
+    matrix = simulate_lanes_analytical_matrix(base_r, win_rate, n_trades, avg_r_loss, lanes)
+
+    assert matrix.shape == (40, len(lanes))
+    for c in range(40):
+        for j, lane in enumerate(lanes):
+            expected, _ = simulate_lane_stress_analytical(
+                base_test_r=base_r[c], base_slippage_bps=50.0, avg_r=0.0, win_rate=win_rate[c],
+                n_trades=int(n_trades[c]), avg_r_loss=avg_r_loss[c], lane=lane,
+            )
+            assert matrix[c, j] == pytest.approx(expected)
+
+
+def test_recost_matches_direct_pricing():
+    gross = np.array([[2.0, 0.5, 1.1], [0.7, 3.0, 1.0]])
+    priced = np.vectorize(tp_sl_ret)(gross, 30.0, 50.0)
+    fees = np.array([0.0, 30.0, 75.0])
+    slips = np.array([0.0, 200.0, 500.0])
+
+    out = recost_returns(priced, 30.0, 50.0, fees, slips)
+
+    assert out.shape == (2, 3, 3)
+    for j in range(3):
+        assert out[:, j, :] == pytest.approx(np.vectorize(tp_sl_ret)(gross, fees[j], slips[j]))
+
+
+def test_lanes_from_trades_match_full_reruns():
+    """Re-costing zero-cost trades gives the same summary as re-running each lane."""
+    sl_mults = [0.5, 0.7, 0.6]
+    seeds = [11, 12, 13]
+    lanes = [l for l in STRESS_LANES_FULL if l.latency_candles == 0]
+    lanes.append(StressLane(name="gap", fee_bps=50, slippage_bps=100, stop_gap_prob=0.5, stop_gap_mult=2.0))
+
+    base_rows = [make_rows(np.random.default_rng(s), 60, 2.5, sl) for s, sl in zip(seeds, sl_mults)]
+    sim = simulate_lanes_from_trades(TradeArrays.from_rows(base_rows, sl_mults), lanes)
+
+    for c, (seed, sl) in enumerate(zip(seeds, sl_mults)):
+        for j, lane in enumerate(lanes):
+            rows = make_rows(np.random.default_rng(seed), 60, 2.5, sl, lane.fee_bps, lane.slippage_bps)
+            summary = summarize_tp_sl(rows, sl_mult=sl)
+            assert sim["total_r"][c, j] == pytest.approx(summary["total_r"])
+            assert sim["avg_r"][c, j] == pytest.approx(summary["avg_r"])
+            assert sim["win_rate"][c, j] == pytest.approx(summary["tp_sl_win_rate"])
+            assert sim["avg_r_loss"][c, j] == pytest.approx(summary["avg_r_loss"])
+
+            # Expected gap model = the full-run validation formula
+            extra = 0.0
+            if lane.stop_gap_prob > 0.15:
+                n_losses = int(summary["alerts_ok"] * (1.0 - summary["tp_sl_win_rate"]))
+                n_gapped = int(n_losses * lane.stop_gap_prob)
+                extra = abs(summary["avg_r_loss"]) * (lane.stop_gap_mult - 1.0) * n_gapped
+            assert sim["stressed_r"][c, j] == pytest.approx(summary["total_r"] - extra)
+
+
+def test_recost_rows_summary_matches_full_run():
+    """Every summary field of re-costed zero-cost rows equals a run at the lane's costs."""
+    base_rows = make_rows(np.random.default_rng(21), 60, 2.5, 0.6)
+    for fee_bps, slippage_bps in [(0.0, 0.0), (30.0, 50.0), (75.0, 500.0)]:
+        direct = make_rows(np.random.default_rng(21), 60, 2.5, 0.6, fee_bps, slippage_bps)
+        recosted = summarize_tp_sl(recost_rows(base_rows, fee_bps, slippage_bps), sl_mult=0.6)
+        expected = summarize_tp_sl(direct, sl_mult=0.6)
+        assert recosted.keys() == expected.keys()
+        for key, value in expected.items():
+            if isinstance(value, float):
+                assert recosted[key] == pytest.approx(value, nan_ok=True), key
+            else:
+                assert recosted[key] == value, key
+    assert base_rows[0]["tp_sl_ret"] == make_rows(np.random.default_rng(21), 60, 2.5, 0.6)[0]["tp_sl_ret"]
+
+
+def test_sampled_gaps_hit_expected_number_of_stops():
+    rows = [make_rows(np.random.default_rng(3), 80, 2.0, 0.5)]
+    lane = StressLane(name="gap", fee_bps=0.0, slippage_bps=0.0, stop_gap_prob=0.5, stop_gap_mult=2.0)
+    trades = TradeArrays.from_rows(rows, [0.5])
+
+    sim = simulate_lanes_from_trades(trades, [lane], gap_model="sampled", seed=5)
+
+    n_losses = int(sim["n_trades"][0, 0] * (1.0 - sim["win_rate"][0, 0]))
+    k = min(int(n_losses * 0.5), int(trades.is_sl.sum()))
+    assert k > 0
+    # Zero-cost stops at sl_mult=0.5 are exactly -1R, so each gap adds (2.0 - 1) × 1R
+    assert sim["gap_r"][0, 0] == pytest.approx(k)
+    assert sim["stressed_r"][0, 0] == pytest.approx(sim["total_r"][0, 0] - k)
+    with pytest.raises(ValueError):
+        simulate_lanes_from_trades(trades, [lane], gap_model="bogus")
+
+
+def test_lane_scores_matrix_matches_compute_lane_scores():
+    names = [f"lane_{j}" for j in range(7)]
+    stressed = np.random.default_rng(2).normal(0, 5, (25, len(names)))
+
+    result = compute_lane_scores_matrix(stressed, names)
+
+    for c in range(25):
+        expected = compute_lane_scores(dict(zip(names, stressed[c].tolist())))
+        got = result.lane_score_result(c)
+        assert got.robust_score == expected.robust_score
+        assert got.median_score == expected.median_score
+        assert got.p25_score == expected.p25_score
+        assert got.mean_score == pytest.approx(expected.mean_score)
+        assert got.worst_lane == expected.worst_lane
+        assert got.lanes_passing == expected.lanes_passing
+        assert got.lane_scores == expected.lane_scores
+
+
+def test_group_lanes_by_latency():
+    groups = group_lanes_by_latency(STRESS_LANES_FULL)
+    assert sorted(i for idx in groups.values() for i in idx) == list(range(len(STRESS_LANES_FULL)))
+    for latency, idx in groups.items():
+        assert all(STRESS_LANES_FULL[i].latency_candles == latency for i in idx)
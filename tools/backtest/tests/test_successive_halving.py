@@ -0,0 +1,108 @@
+"""
+Tests for the successive halving trial scheduler.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+from lib.alerts import Alert
+from lib.successive_halving import (
+    HalvingConfig,
+    budget_folds,
+    subsample_alerts,
+    successive_halving,
+)
+
+T0_MS = 1_735_689_600_000
+
+
+def make_alerts(n: int, offset: int = 0):
+    return [Alert(mint=f"mint_{offset + i}", ts_ms=T0_MS + i * 60_000, caller="c") for i in range(n)]
+
+
+def test_rungs():
+    assert HalvingConfig(eta=3, min_budget=1 / 9).rungs() == pytest.approx([1 / 9, 1 / 3, 1.0])
+    assert HalvingConfig(eta=2, min_budget=0.3).rungs() == pytest.approx([0.5, 1.0])
+    assert HalvingConfig(eta=3, min_budget=1.0).rungs() == [1.0]
+    with pytest.raises(ValueError):
+        HalvingConfig(resource="bogus")
+
+
+def test_subsample_is_nested_and_ordered():
+    alerts = make_alerts(200)
+    small = subsample_alerts(alerts, 1 / 9)
+    medium = subsample_alerts(alerts, 1 / 3)
+    assert len(small) == 23 and len(medium) == 67
+    assert set(map(id, small)) <= set(map(id, medium))
+    assert small == sorted(small, key=lambda a: a.ts_ms)
+    assert subsample_alerts(alerts, 1.0) == alerts
+    assert len(subsample_alerts(make_alerts(6), 0.1, min_alerts=5)) == 5
+
+
+def test_budget_folds():
+    folds = [(make_alerts(90, i * 100), make_alerts(30, i * 100 + 50), f"fold_{i}") for i in range(6)]
+
+    by_alerts = budget_folds(folds, 1 / 3, HalvingConfig())
+    assert [name for _, _, name in by_alerts] == [name for _, _, name in folds]
+    assert [(len(tr), len(te)) for tr, te, _ in by_alerts] == [(30, 10)] * 6
+
+    by_folds = budget_folds(folds, 1 / 3, HalvingConfig(resource="folds"))
+    assert [name for _, _, name in by_folds] == ["fold_2", "fold_5"]
+    assert budget_folds(folds, 1.0, HalvingConfig(resource="folds")) is folds
+
+
+def test_successive_halving_promotes_top_trials():
+    quality = [0.1 * i for i in range(27)]
+    calls = []
+
+    def evaluate(indices, rung, budget):
+        calls.append((rung, budget, list(indices)))
+        return [quality[i] for i in indices]
+
+    survivors, records = successive_halving(quality, evaluate, HalvingConfig(eta=3, min_budget=1 / 9))
+
+    assert [len(c[2]) for c in calls] == [27, 9, 3]
+    assert survivors == [24, 25, 26]
+    assert calls[-1][1] == 1.0
+    assert sum(r.promoted for r in records) == 9 + 3
+    assert {r.candidate for r in records if r.budget == 1.0} == {24, 25, 26}
+
+
+def test_failed_evaluations_are_not_promoted():
+    def evaluate(indices, rung, budget):
+        return [float("nan") if i == 0 else float(i % 5) for i in indices]
+
+    survivors, _ = successive_halving(list(range(10)), evaluate, HalvingConfig(eta=2, min_budget=0.25))
+    assert 0 not in survivors
+    assert len(survivors) == 2
+
+
+def test_resume_skips_partial_budget_trials(tmp_path):
+    from lib.trial_ledger import write_trials_to_parquet
+    from run_random_search import load_trials_from_parquet
+
+    def trial(tp_mult, budget):
+        return {
+            "params": {"tp_mult": tp_mult, "sl_mult": 0.5},
+            "summary": {"total_r": tp_mult},
+            "objective": {"final_score": tp_mult, "median_ratio": 0.8, "robust_score": tp_mult},
+            "ratio": 0.8,
+            "budget": budget,
+        }
+
+    path = tmp_path / "run_trials.parquet"
+    trials = [trial(2.0, 1 / 9), trial(3.0, 1 / 3), trial(4.0, 1.0), trial(5.0, 1.0)]
+    write_trials_to_parquet(trials, "run", str(path))
+
+    results, robust_candidates = load_trials_from_parquet(str(path))
+
+    assert [r["params"]["tp_mult"] for r in results] == [4.0, 5.0]
+    assert all(r["budget"] == 1.0 for r in results)
+    assert [c["params"]["tp_mult"] for c in robust_candidates] == [4.0, 5.0]
@@ -0,0 +1,112 @@
+"""
+Tests for the array entry × stop grid.
+
+simulate_trade_grid_arrays must give the same trades as simulate_trade
+(per-candle loops) for every entry × stop combination.
+"""
+from __future__ import annotations
+
+import random
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# trade_simulator uses flat imports from lib/
+_LIB_DIR = Path(__file__).parent.parent / "lib"
+if str(_LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(_LIB_DIR))
+
+from entry_strategies import ENTRY_STRATEGIES  # noqa: E402
+from stop_strategies import STOP_STRATEGIES, PhaseConfig  # noqa: E402
+from trade_simulator import (  # noqa: E402
+    candle_arrays,
+    simulate_trade,
+    simulate_trade_grid,
+    simulate_trade_grid_arrays,
+    trade_result_from_row,
+)
+
+ALERT_TS_MS = 1_735_689_600_000
+
+ENTRIES = [
+    ("immediate", {}),
+    ("delayed_dip", {"dip_pct": -0.10}),
+    ("delayed_dip", {"dip_pct": -0.30, "max_wait_hrs": 2.0}),
+    ("delayed_time", {"wait_hrs": 1.0}),
+    ("limit_order", {"limit_price": 0.95, "max_wait_hrs": 6.0}),
+]
+
+STOPS = [
+    ("trailing", {"phases": [PhaseConfig(stop_pct=0.15, target_mult=2.0), PhaseConfig(stop_pct=0.50)]}),
+    ("trailing", {"phases": [PhaseConfig(stop_pct=0.25)], "max_duration_hrs": 4.0}),
+    ("static", {"phases": [PhaseConfig(stop_pct=0.20, target_mult=2.0), PhaseConfig(stop_pct=0.30)]}),
+    ("static", {"phases": [PhaseConfig(stop_pct=0.40, target_mult=3.0), PhaseConfig(stop_pct=0.10)]}),
+    ("static", {"phases": [PhaseConfig(stop_pct=0.10)], "max_duration_hrs": 0.0}),
+]
+
+
+def random_path(rng: random.Random, n: int):
+    """5m candles with a drifting random-walk close (so 2x phases get hit)."""
+    candles = []
+    price = 1.0
+    for i in range(n):
+        move = rng.gauss(0.01, 0.08)
+        close = max(price * (1 + move), 1e-6)
+        high = max(price, close) * (1 + abs(rng.gauss(0.0, 0.03)))
+        low = min(price, close) * (1 - abs(rng.gauss(0.0, 0.03)))
+        candles.append({"timestamp": ALERT_TS_MS + i * 300_000, "high": high, "low": low, "close": close})
+        price = close
+    return candles
+
+
+def assert_same(array_result, loop_result):
+    a, b = asdict(array_result), asdict(loop_result)
+    for key, expected in b.items():
+        if isinstance(expected, float):
+            assert a[key] == pytest.approx(expected, rel=1e-12, abs=0), key
+        else:
+            assert a[key] == expected, key
+
+
+@pytest.mark.parametrize("stop_reference", ["alert", "entry"])
+def test_grid_matches_per_trade_loops(stop_reference):
+    rng = random.Random(11)
+    for _ in range(40):
+        candles = random_path(rng, rng.randint(0, 200))
+        grid = simulate_trade_grid_arrays(
+            *candle_arrays(candles), 1.0, ALERT_TS_MS, ENTRIES, STOPS, stop_reference=stop_reference
+        )
+        assert len(grid) == len(ENTRIES) * len(STOPS)
+        row = 0
+        for entry_kind, entry_params in ENTRIES:
+            for stop_kind, stop_params in STOPS:
+                expected = simulate_trade(
+                    candles, 1.0, ALERT_TS_MS,
+                    entry_strategy=ENTRY_STRATEGIES[entry_kind], entry_params=entry_params,
+                    stop_strategy=STOP_STRATEGIES[stop_kind], stop_params=stop_params,
+                    stop_reference=stop_reference,
+                )
+                assert_same(trade_result_from_row(grid[row]), expected)
+                row += 1
+
+
+def test_simulate_trade_grid_uses_names_and_order():
+    candles = random_path(random.Random(5), 50)
+    entries = [(ENTRY_STRATEGIES[k], p, f"e{i}") for i, (k, p) in enumerate(ENTRIES)]
+    stops = [(STOP_STRATEGIES[k], p, f"s{i}") for i, (k, p) in enumerate(STOPS)]
+    results = simulate_trade_grid(candles, 1.0, ALERT_TS_MS, entries, stops)
+    assert [(r["entry_strategy"], r["stop_strategy"]) for r in results] == [
+        (e[2], s[2]) for e in entries for s in stops
+    ]
+
+
+def test_missed_entry_row_has_no_exit():
+    ts_ms, high, low, close = candle_arrays([])
+    grid = simulate_trade_grid_arrays(ts_ms, high, low, close, 1.0, ALERT_TS_MS, ENTRIES[1:2], STOPS[:1])
+    assert not grid["entry_occurred"][0]
+    assert grid["missed_reason"][0] == "no_candles"
+    assert np.isnan(grid["exit_price"][0])
+    assert trade_result_from_row(grid[0]).exit_reason is None
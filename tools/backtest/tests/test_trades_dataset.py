@@ -0,0 +1,176 @@
+"""
+Tests for the lazy trades dataset backing the EV dashboard.
+
+Cohort stats computed in DuckDB must match the pandas definitions the
+dashboard used before (winners = hit_3x, losers = 2x without 3x, ...).
+"""
+from __future__ import annotations
+
+import random
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add parent directory to path
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+from lib.trades_dataset import TradeFilters, TradesDataset, dataset_signature
+
+UTC = timezone.utc
+
+
+def make_trades(n: int, seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    base_ms = int(datetime(2025, 1, 1, tzinfo=UTC).timestamp() * 1000)
+    rows = []
+    for i in range(n):
+        peak = rng.uniform(0.5, 8.0)
+        exit_mult = rng.uniform(0.3, peak)
+        rows.append({
+            'caller': rng.choice(['alpha', 'beta', 'gamma']),
+            'mint': f"mint{i:05d}",
+            'entry_ts_ms': base_ms + rng.randrange(0, 30) * 86_400_000,
+            'entry_mult': 1.0,
+            'peak_mult': peak,
+            'exit_mult': exit_mult,
+            'giveback_from_peak_pct': (1 - exit_mult / peak) * 100,
+            'exit_reason': rng.choice(['stop', 'horizon', 'trail']),
+            'stop_mode': rng.choice(['static', 'trailing']),
+            'phase1_stop_pct': rng.choice([0.1, 0.2]),
+            'phase2_stop_pct': 0.3,
+            'hit_2x': peak >= 2.0,
+            'hit_3x': peak >= 3.0,
+            'hit_4x': peak >= 4.0,
+            'hit_5x': peak >= 5.0,
+            'hit_10x': peak >= 10.0,
+        })
+    return pd.DataFrame(rows)
+
+
+def reference_stats(df: pd.DataFrame) -> dict:
+    """The pandas cohort stats the dashboard used to compute."""
+    total = len(df)
+    winners = df[df['hit_3x'] == True]
+    losers = df[(df['hit_2x'] == True) & (df['hit_3x'] == False)]
+    never_2x = df[df['hit_2x'] == False]
+    return {
+        'total': total,
+        'winners': len(winners),
+        'losers': len(losers),
+        'never_2x': len(never_2x),
+        'p_reach_2x': df['hit_2x'].sum() / total * 100,
+        'p_3x_given_2x': len(winners) / df['hit_2x'].sum() * 100,
+        'ev_from_entry': (df['exit_mult'].mean() - 1.0) * 100,
+        'ev_given_2x': (df[df['hit_2x'] == True]['exit_mult'].mean() - 1.0) * 100,
+        'winners_median_exit_mult': winners['exit_mult'].median(),
+        'winners_giveback_p75': winners['giveback_from_peak_pct'].quantile(0.75),
+        'never_2x_mean_exit_mult': never_2x['exit_mult'].mean(),
+    }
+
+
+@pytest.fixture
+def trades_dir(tmp_dir):
+    frames = [make_trades(400, seed) for seed in range(3)]
+    for i, df in enumerate(frames):
+        pq.write_table(pa.Table.from_pandas(df), tmp_dir / f"phased_stop_results_{i}.parquet", row_group_size=50)
+    return tmp_dir, pd.concat(frames, ignore_index=True)
+
+
+class TestCohortStats:
+    """SQL cohort aggregates vs the pandas reference."""
+
+    def test_matches_pandas(self, trades_dir):
+        path, all_df = trades_dir
+        ds = TradesDataset(str(path / "phased_stop_results_*.parquet"))
+        filters = TradeFilters(stop_mode='static', phase1_stop_pct=0.1, phase2_stop_pct=0.3, caller='beta')
+
+        stats = ds.cohort_stats(filters)
+        df = all_df[
+            (all_df['stop_mode'] == 'static') & (all_df['phase1_stop_pct'] == 0.1)
+            & (all_df['phase2_stop_pct'] == 0.3) & (all_df['caller'] == 'beta')
+        ]
+        for key, expected in reference_stats(df).items():
+            assert stats[key] == pytest.approx(expected), key
+
+    def test_date_filter_is_inclusive(self, trades_dir):
+        path, all_df = trades_dir
+        ds = TradesDataset(str(path / "*.parquet"))
+        filters = TradeFilters(date_from=date(2025, 1, 5), date_to=date(2025, 1, 10))
+
+        lo = int(datetime(2025, 1, 5, tzinfo=UTC).timestamp() * 1000)
+        hi = int(datetime(2025, 1, 11, tzinfo=UTC).timestamp() * 1000)
+        expected = ((all_df['entry_ts_ms'] >= lo) & (all_df['entry_ts_ms'] < hi)).sum()
+        assert ds.cohort_stats(filters)['total'] == expected
+        assert ds.row_count(filters) == expected
+
+    def test_stats_cached_per_filter_set(self, trades_dir):
+        path, _ = trades_dir
+        ds = TradesDataset(str(path / "*.parquet"))
+        a = ds.cohort_stats(TradeFilters(caller='alpha'))
+        assert ds.cohort_stats(TradeFilters(caller='alpha')) is a
+        assert ds.cohort_stats(TradeFilters(caller='beta')) is not a
+
+    def test_strategy_comparison_matches_per_strategy(self, trades_dir):
+        path, _ = trades_dir
+        ds = TradesDataset(str(path / "*.parquet"))
+        base = TradeFilters(caller='gamma')
+        grouped = ds.strategy_comparison(base)
+        assert len(grouped) == 4
+        for row in grouped:
+            single = ds.cohort_stats(TradeFilters(
+                stop_mode=row['stop_mode'],
+                phase1_stop_pct=row['phase1_stop_pct'],
+                phase2_stop_pct=row['phase2_stop_pct'],
+                caller='gamma',
+            ))
+            assert row['total'] == single['total']
+            assert row['ev_from_entry'] == pytest.approx(single['ev_from_entry'])
+
+
+class TestQueries:
+    """Projection, sampling and lookups."""
+
+    def test_fetch_projects_and_limits(self, trades_dir):
+        path, all_df = trades_dir
+        ds = TradesDataset(str(path / "*.parquet"))
+        top = ds.fetch(TradeFilters(), columns=['mint', 'exit_mult'], order_by='exit_mult DESC', limit=5)
+        assert list(top.columns) == ['mint', 'exit_mult']
+        assert top['exit_mult'].tolist() == all_df['exit_mult'].nlargest(5).tolist()
+
+    def test_sample_is_bounded_and_repeatable(self, trades_dir):
+        path, _ = trades_dir
+        ds = TradesDataset(str(path / "*.parquet"))
+        filters = TradeFilters(stop_mode='trailing')
+        a = ds.fetch(filters, columns=['mint', 'stop_mode'], sample=100)
+        b = ds.fetch(filters, columns=['mint', 'stop_mode'], sample=100)
+        assert len(a) == 100
+        assert set(a['stop_mode']) == {'trailing'}
+        assert a['mint'].tolist() == b['mint'].tolist()
+
+    def test_value_counts_by_cohort(self, trades_dir):
+        path, all_df = trades_dir
+        ds = TradesDataset(str(path / "*.parquet"))
+        counts = ds.value_counts('exit_reason', TradeFilters(), cohort='winners')
+        expected = all_df[all_df['hit_3x']]['exit_reason'].value_counts()
+        assert counts.to_dict() == expected.to_dict()
+
+    def test_distinct_and_bounds(self, trades_dir):
+        path, _ = trades_dir
+        ds = TradesDataset(str(path / "*.parquet"))
+        assert ds.distinct('caller') == ['alpha', 'beta', 'gamma']
+        assert ds.stop_configs('static') == [(0.1, 0.3), (0.2, 0.3)]
+        lo, hi = ds.date_bounds()
+        assert lo >= date(2025, 1, 1) and hi <= date(2025, 1, 30)
+
+    def test_missing_files(self, tmp_dir):
+        ds = TradesDataset(str(tmp_dir / "nothing_*.parquet"))
+        assert ds.empty
+        assert ds.cohort_stats(TradeFilters())['total'] == 0
+        assert dataset_signature(str(tmp_dir / "nothing_*.parquet")) == ()
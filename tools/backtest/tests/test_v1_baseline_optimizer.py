@@ -360,3 +360,65 @@ class TestGroupedEvaluation:
         assert result["grouped_params"] is not None
         assert result["grouped_params"].max_hold_hrs == 48.0
 
+
+def make_grid_inputs():
+    base_ts = int(datetime(2025, 1, 1, 0, 0, 0, tzinfo=UTC).timestamp() * 1000)
+    calls, candles_by_call_id = [], {}
+    for i in range(20):
+        call_id = f"call{i}"
+        calls.append(make_call_dict(call_id, f"TOKEN_{i}", "Caller1", base_ts + i * 300_000))
+        candles_by_call_id[call_id] = [
+            make_candle_dict(base_ts + i * 300_000 + j * 60000, 1.0, 1.0 + 0.02 * (j % (i + 3)), 0.9, 1.0)
+            for j in range(120)
+        ]
+    return calls, candles_by_call_id
+
+
+class TestProcessPool:
+    """Grid replays in worker processes."""
+    
+    def test_pool_matches_in_process(self, monkeypatch):
+        """Process-pool replays give the same results as in-process replays."""
+        import lib.v1_baseline_optimizer as optimizer
+        
+        calls, candles_by_call_id = make_grid_inputs()
+        param_grid = {"tp_mults": [1.05, 1.2, 1.5], "sl_mults": [0.85, 0.95], "max_hold_hrs": [1.0, 48.0]}
+        
+        monkeypatch.setenv("V1_OPTIMIZER_WORKERS", "1")
+        serial = optimize_v1_baseline(calls, candles_by_call_id, param_grid)
+        
+        monkeypatch.setenv("V1_OPTIMIZER_WORKERS", "2")
+        monkeypatch.setattr(optimizer, "PROCESS_POOL_MIN_WORK", 0)
+        pooled = optimize_v1_baseline(calls, candles_by_call_id, param_grid)
+        
+        assert pooled.params_evaluated == serial.params_evaluated == 12
+        assert [(r["params"], r["result"].final_capital) for r in pooled.all_results] == [
+            (r["params"], r["result"].final_capital) for r in serial.all_results
+        ]
+    
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_failing_combination_is_skipped(self, monkeypatch, workers):
+        """A combination whose replay raises is skipped; the rest of the grid is returned."""
+        import multiprocessing
+        import lib.v1_baseline_optimizer as optimizer
+        
+        if workers != "1" and multiprocessing.get_start_method() != "fork":
+            pytest.skip("patched replay only reaches forked workers")
+        
+        real_replay = optimizer.replay_capital
+        
+        def flaky_replay(plans, param_index, config=None):
+            if plans.params[param_index].tp_mult == 1.2:
+                raise ValueError("boom")
+            return real_replay(plans, param_index, config)
+        
+        monkeypatch.setattr(optimizer, "replay_capital", flaky_replay)
+        monkeypatch.setattr(optimizer, "PROCESS_POOL_MIN_WORK", 0)
+        monkeypatch.setenv("V1_OPTIMIZER_WORKERS", workers)
+        
+        calls, candles_by_call_id = make_grid_inputs()
+        param_grid = {"tp_mults": [1.05, 1.2, 1.5], "sl_mults": [0.85, 0.95], "max_hold_hrs": [48.0]}
+        result = optimize_v1_baseline(calls, candles_by_call_id, param_grid)
+        
+        assert result.params_evaluated == 4
+        assert all(r["params"].tp_mult != 1.2 for r in result.all_results)
@@ -21,6 +21,9 @@ from lib.v1_baseline_simulator import (
     CapitalSimulatorConfig,
     simulate_capital_aware,
     calculate_position_size,
+    find_exit_in_candles,
+    plan_trades,
+    EXIT_REASON_CODES,
 )
 
 UTC = timezone.utc
@@ -412,3 +415,92 @@ class TestMinExecutableSize:
         assert result.trades_executed == 0
         assert result.final_capital == 100  # No change
 
+
+class TestEventEngine:
+    """Planned exits and heap replay."""
+    
+    def test_planned_exits_match_candle_scan(self):
+        """plan_trades gives the same exits as find_exit_in_candles for every param set."""
+        import random
+        rng = random.Random(4)
+        base_ts = int(datetime(2025, 1, 1, 0, 0, 0, tzinfo=UTC).timestamp() * 1000)
+        params_list = [
+            V1BaselineParams(tp_mult=tp, sl_mult=sl, max_hold_hrs=hold)
+            for tp in (1.5, 2.0, 3.0) for sl in (0.8, 0.9) for hold in (0.5, 2.0)
+        ]
+        calls, candles_by_call_id = [], {}
+        for i in range(30):
+            call_id = f"call{i}"
+            alert_ts = base_ts + i * 600_000
+            calls.append(make_call_dict(call_id, f"TOKEN_{i}", "Caller1", alert_ts))
+            price, candles = 1.0, []
+            for j in range(rng.randint(1, 200)):
+                close = price * (1 + rng.gauss(0.005, 0.05))
+                candles.append(make_candle_dict(alert_ts - 120_000 + j * 60_000, price,
+                                                max(price, close) * 1.01, min(price, close) * 0.99, close))
+                price = close
+            candles_by_call_id[call_id] = candles
+        
+        plans = plan_trades(calls, candles_by_call_id, params_list)
+        for i, call_id in enumerate(plans.call_ids):
+            assert plans.entry_ok[i]
+            for k, params in enumerate(params_list):
+                expected = find_exit_in_candles(
+                    candles_by_call_id[call_id],
+                    int(plans.entry_ts_ms[i]),
+                    float(plans.entry_px[i]),
+                    plans.entry_px[i] * params.tp_mult,
+                    plans.entry_px[i] * params.sl_mult,
+                    int(plans.entry_ts_ms[i]) + int(params.max_hold_hrs * 3600 * 1000),
+                    sys.maxsize,
+                )
+                assert plans.exit_ts_ms[k, i] == expected["exit_ts_ms"]
+                assert plans.exit_px[k, i] == pytest.approx(expected["exit_price"], rel=1e-12)
+                assert EXIT_REASON_CODES[plans.exit_reason[k, i]] == expected["exit_reason"]
+    
+    def _overlapping_calls(self):
+        base_ts = int(datetime(2025, 1, 1, 0, 0, 0, tzinfo=UTC).timestamp() * 1000)
+        calls, candles_by_call_id = [], {}
+        for i in range(4):
+            call_id = f"call{i}"
+            calls.append(make_call_dict(call_id, f"TOKEN_{i}", "Caller1", base_ts + i * 1000))
+            candles_by_call_id[call_id] = [
+                make_candle_dict(base_ts + j * 60000, 1.0, 1.05, 0.95, 1.0 + 0.001 * j)
+                for j in range(100)
+            ]
+        return calls, candles_by_call_id
+    
+    def test_positions_settle_at_next_alert_by_default(self):
+        """Open positions are settled at the next alert with the last candle's close."""
+        calls, candles_by_call_id = self._overlapping_calls()
+        
+        params = V1BaselineParams(tp_mult=2.0, sl_mult=0.85, max_hold_hrs=1.0)
+        result = simulate_capital_aware(
+            calls, candles_by_call_id, params, CapitalSimulatorConfig(max_concurrent_positions=3)
+        )
+        
+        assert result.trades_executed == 4  # Slots are freed at every alert
+        trades = result.completed_trades
+        assert [t.exit_reason for t in trades] == ["time_exit"] * 4
+        assert [t.exit_ts_ms for t in trades[:3]] == [c["ts_ms"] for c in calls[1:]]
+        assert all(t.exit_px == pytest.approx(1.099) for t in trades[:3])
+        assert trades[3].exit_ts_ms == trades[3].entry_ts_ms + 3_600_000
+        assert trades[3].exit_px == pytest.approx(1.061)
+    
+    def test_positions_stay_open_until_their_exit(self):
+        """With hold_until_exit, a later alert does not close earlier positions; capital and slots stay tied up."""
+        calls, candles_by_call_id = self._overlapping_calls()
+        
+        params = V1BaselineParams(tp_mult=2.0, sl_mult=0.85, max_hold_hrs=1.0)
+        result = simulate_capital_aware(
+            calls, candles_by_call_id, params,
+            CapitalSimulatorConfig(max_concurrent_positions=3, hold_until_exit=True),
+        )
+        
+        assert result.trades_executed == 3  # Fourth alert finds all 3 slots taken
+        assert [t.exit_reason for t in result.completed_trades] == ["time_exit"] * 3
+        for trade in result.completed_trades:
+            assert trade.exit_ts_ms == trade.entry_ts_ms + 3_600_000
+        sizes = [t.size for t in result.completed_trades]
+        assert sizes[0] == pytest.approx(400.0)
+        assert sizes[1] == pytest.approx(0.04 * (10_000 - 400.0))
@@ -0,0 +1,131 @@
+"""
+Tests for the V1 baseline stdin/stdout transport.
+
+Arrow requests must simulate exactly like the equivalent JSON request.
+"""
+from __future__ import annotations
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add parent directory to path
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+from lib.v1_baseline_simulator import V1BaselineParams, simulate_capital_aware
+from lib.v1_baseline_transport import ARROW_REQUEST_MAGIC, read_request, write_response
+
+BASE_TS = 1_735_689_600_000
+
+
+def make_request():
+    calls, candles_by_call_id = [], {}
+    for i in range(4):
+        call_id = f"call{i}"
+        alert_ts = BASE_TS + i * 120_000
+        calls.append({"id": call_id, "mint": f"TOKEN_{i}", "caller": "Caller1", "ts_ms": alert_ts})
+        candles_by_call_id[call_id] = [
+            {"timestamp": alert_ts / 1000 + 60 * j, "open": 1.0, "high": 1.0 + 0.08 * j * (i % 2),
+             "low": 0.97 - 0.01 * j * ((i + 1) % 2), "close": 1.0 + 0.02 * j, "volume": 1.0}
+            for j in range(40)
+        ]
+    return {
+        "operation": "simulate",
+        "calls": calls,
+        "candles_by_call_id": candles_by_call_id,
+        "params": {"tp_mult": 2.0, "sl_mult": 0.85},
+    }
+
+
+def candle_table(candles_by_call_id):
+    rows = [(call_id, c) for call_id, candles in candles_by_call_id.items() for c in candles]
+    return pa.table({
+        "call_id": [r[0] for r in rows],
+        "timestamp": [r[1]["timestamp"] for r in rows],
+        "high": [r[1]["high"] for r in rows],
+        "low": [r[1]["low"] for r in rows],
+        "close": [r[1]["close"] for r in rows],
+    })
+
+
+def arrow_request(request, **header_fields):
+    header = {k: v for k, v in request.items() if k != "candles_by_call_id"}
+    header.update(header_fields)
+    stream = io.BytesIO()
+    stream.write(ARROW_REQUEST_MAGIC + json.dumps(header).encode() + b"\n")
+    if "candles_path" not in header_fields:
+        table = candle_table(request["candles_by_call_id"])
+        with pa.ipc.new_stream(stream, table.schema) as writer:
+            writer.write_table(table)
+    stream.seek(0)
+    return stream
+
+
+def simulate(request, candles_by_call_id):
+    params = V1BaselineParams(**request["params"])
+    return simulate_capital_aware(request["calls"], candles_by_call_id, params)
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_request_is_unchanged(indent):
+    request = make_request()
+    parsed, candles = read_request(io.BytesIO(json.dumps(request, indent=indent).encode()))
+    assert parsed == request
+    assert candles == request["candles_by_call_id"]
+
+
+def test_json_request_is_decoded_once(monkeypatch):
+    import lib.v1_baseline_transport as transport
+
+    calls = []
+    real_loads = json.loads
+    monkeypatch.setattr(transport.json, "loads", lambda s: calls.append(s) or real_loads(s))
+    read_request(io.BytesIO(json.dumps(make_request()).encode()))
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("source", ["stream", "parquet", "ipc_file"])
+def test_arrow_request_simulates_like_json(source, tmp_path):
+    request = make_request()
+    expected = simulate(request, request["candles_by_call_id"])
+
+    fields = {}
+    if source == "parquet":
+        fields["candles_path"] = str(tmp_path / "candles.parquet")
+        pq.write_table(candle_table(request["candles_by_call_id"]), fields["candles_path"])
+    elif source == "ipc_file":
+        fields["candles_path"] = str(tmp_path / "candles.arrow")
+        table = candle_table(request["candles_by_call_id"])
+        with pa.OSFile(fields["candles_path"], "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    header, candles = read_request(arrow_request(request, **fields))
+    assert header["operation"] == "simulate"
+    result = simulate(header, candles)
+    assert result.final_capital == expected.final_capital
+    assert result.completed_trades == expected.completed_trades
+
+
+def test_arrow_response_round_trip():
+    request = make_request()
+    result = simulate(request, request["candles_by_call_id"])
+    output = {"final_capital": result.final_capital, "completed_trades": result.completed_trades}
+
+    json_out = io.BytesIO()
+    write_response(output, json_out)
+    as_json = json.loads(json_out.getvalue())
+
+    arrow_out = io.BytesIO()
+    write_response(output, arrow_out, "arrow")
+    header_line, body = arrow_out.getvalue().split(b"\n", 1)
+    header = json.loads(header_line)
+    assert header["completed_trades"] == {"format": "arrow", "rows": len(result.completed_trades)}
+    assert header["final_capital"] == as_json["final_capital"]
+    assert pa.ipc.open_stream(body).read_all().to_pylist() == as_json["completed_trades"]
@@ -0,0 +1,126 @@
+"""
+Tests for the batch slice validator in validate_slices.py.
+
+scan_parquet_slices must report the same metrics as analyze_parquet_slice,
+and validate_directory must skip files unchanged since the summary parquet.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+_BACKTEST_DIR = Path(__file__).parent.parent
+if str(_BACKTEST_DIR) not in sys.path:
+    sys.path.insert(0, str(_BACKTEST_DIR))
+
+import validate_slices
+from validate_slices import (
+    GAP_DETAIL_LIMIT,
+    analyze_parquet_slice,
+    load_summary_parquet,
+    scan_parquet_slices,
+    validate_directory,
+)
+
+T0 = 1_764_547_200  # 2025-12-01T00:00:00Z
+
+
+def write_slice(path: Path, token: str, rows: list) -> None:
+    """rows: (epoch_seconds, open, high, low, close, volume)"""
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE t (token_address VARCHAR, timestamp TIMESTAMP,
+                        open DOUBLE, high DOUBLE, low DOUBLE, close DOUBLE, volume DOUBLE)
+    """)
+    if rows:
+        conn.executemany(
+            "INSERT INTO t VALUES (?, TIMESTAMP 'epoch' + to_seconds(?), ?, ?, ?, ?, ?)",
+            [(token, ts, o, h, l, c, v) for ts, o, h, l, c, v in rows],
+        )
+    conn.execute(f"COPY t TO '{path}' (FORMAT PARQUET)")
+    conn.close()
+
+
+def candles(start: int, count: int, interval: int = 60) -> list:
+    return [(start + i * interval, 1.0, 1.1, 0.9, 1.0, 100.0) for i in range(count)]
+
+
+@pytest.fixture
+def slice_dir(tmp_path):
+    clean = candles(T0, 120)
+    gappy = candles(T0, 30) + candles(T0 + 45 * 60, 30) + candles(T0 + 100 * 60, 10)
+    many_gaps = [c for i, c in enumerate(candles(T0, 200)) if i % 10 != 5]
+    messy = candles(T0, 50) + candles(T0 + 10 * 60, 3)  # duplicates
+    messy += [
+        (T0 + 60 * 60, 1.0, 0.8, 0.9, 1.0, 0.0),  # high < low, zero volume
+        (T0 + 61 * 60, -1.0, 1.1, 0.9, 1.0, None),  # negative, null volume
+    ]
+    write_slice(tmp_path / "20251201_0000_clean.parquet", "CLEAN", clean)
+    write_slice(tmp_path / "20251201_0100_gappy.parquet", "GAPPY", gappy)
+    write_slice(tmp_path / "20251201_0200_many.parquet", "MANY", many_gaps)
+    write_slice(tmp_path / "20251201_0300_messy.parquet", "MESSY", messy)
+    write_slice(tmp_path / "20251201_0400_empty.parquet", "EMPTY", [])
+    return tmp_path
+
+
+@pytest.mark.parametrize("expected_hours", [None, 4.0])
+def test_scan_matches_per_file_analysis(slice_dir, expected_hours):
+    files = sorted(slice_dir.glob("*.parquet"))
+    scanned = scan_parquet_slices(files, 60, expected_hours)
+
+    assert [q.filepath for q in scanned] == [str(f) for f in files]
+    for batch_q, f in zip(scanned, files):
+        single = analyze_parquet_slice(f, 60, expected_hours)
+        expected = single.to_dict()
+        expected["gap_details"] = single.gap_details[:GAP_DETAIL_LIMIT]
+        assert batch_q.to_dict() == expected, f.name
+        assert batch_q.extra_in_parquet == single.extra_in_parquet
+
+
+def test_corrupt_file_falls_back_per_file(slice_dir):
+    bad = slice_dir / "20251201_0500_bad.parquet"
+    bad.write_bytes(b"not a parquet file")
+    files = sorted(slice_dir.glob("*.parquet"))
+
+    scanned = {Path(q.filepath).name: q for q in scan_parquet_slices(files)}
+
+    assert "error" in scanned["20251201_0500_bad.parquet"].gap_details[0]
+    assert scanned["20251201_0000_clean.parquet"].total_candles == 120
+
+
+def test_directory_batches_and_workers_agree(slice_dir):
+    serial = validate_directory(slice_dir, scan_batch_files=100)
+    parallel = validate_directory(slice_dir, scan_batch_files=2, workers=2)
+    assert [q.to_dict() for q in parallel] == [q.to_dict() for q in serial]
+
+
+def test_summary_parquet_skips_unchanged_files(slice_dir, monkeypatch):
+    summary = slice_dir / "quality" / "summary.parquet"
+    first = validate_directory(slice_dir, summary_path=summary)
+    first_by_name = {Path(q.filepath).name: q for q in first}
+    assert set(load_summary_parquet(summary)) == {q.filepath for q in first}
+
+    scanned_files: list = []
+    real_scan = validate_slices.scan_parquet_slices
+
+    def tracking_scan(filepaths, *args, **kwargs):
+        scanned_files.extend(Path(f).name for f in filepaths)
+        return real_scan(filepaths, *args, **kwargs)
+
+    monkeypatch.setattr(validate_slices, "scan_parquet_slices", tracking_scan)
+
+    second = validate_directory(slice_dir, summary_path=summary)
+    assert scanned_files == []
+    assert [q.to_dict() for q in second] == [q.to_dict() for q in first]
+
+    write_slice(slice_dir / "20251201_0000_clean.parquet", "CLEAN", candles(T0, 60))
+    third = {Path(q.filepath).name: q for q in validate_directory(slice_dir, summary_path=summary)}
+    assert scanned_files == ["20251201_0000_clean.parquet"]
+    assert third["20251201_0000_clean.parquet"].total_candles == 60
+    assert third["20251201_0100_gappy.parquet"].gaps == first_by_name["20251201_0100_gappy.parquet"].gaps
+
+    validate_directory(slice_dir, summary_path=summary, force=True)
+    assert len(scanned_files) == 1 + len(first)
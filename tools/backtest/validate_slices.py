@@ -23,18 +23,24 @@ Usage:
 
   # Generate worklist of tokens to re-ingest
   python validate_slices.py --dir slices/per_token --output-worklist worklist.json
+
+  # Large directories: parallel batch scans, re-validating only changed files
+  python validate_slices.py --dir slices/per_token --workers 8 \
+      --summary-parquet slices/per_token_quality.parquet
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import duckdb
 
@@ -140,6 +146,51 @@ class SliceQuality:
 # Analysis Functions
 # =============================================================================
 
+def _expected_candles(
+    unique_ts_span: Optional[int],
+    interval_seconds: int,
+    expected_hours: Optional[float],
+) -> int:
+    """
+    Expected candle count for a slice.
+    
+    WARNING: If expected_hours is not provided, we use the data's actual time span
+    This can OVERESTIMATE coverage if there are gaps at the start/end of the data!
+    """
+    if expected_hours:
+        return int((expected_hours * 3600) // interval_seconds)
+    if unique_ts_span is not None:
+        # Fallback: use actual data span (may overestimate coverage!)
+        return max(1, (unique_ts_span // interval_seconds) + 1)
+    return 0
+
+
+def _apply_derived_metrics(quality: SliceQuality) -> None:
+    """Fill coverage, gap/zero-volume percentages and quality score from counts."""
+    # Calculate derived metrics
+    if quality.expected_candles > 0:
+        quality.coverage_pct = (quality.unique_candles / quality.expected_candles) * 100
+        quality.gap_pct = (quality.gaps / quality.expected_candles) * 100
+    
+    if quality.total_candles > 0:
+        quality.zero_volume_pct = (quality.zero_volume / quality.total_candles) * 100
+    
+    # Calculate quality score
+    score = 100.0
+    score -= min(30, quality.duplicates * 0.5)
+    score -= min(30, quality.gaps * 0.1)
+    score -= min(20, quality.distortions * 1.0)
+    score -= min(10, quality.zero_volume * 0.05)
+    score -= min(10, quality.negative_values * 2.0)
+    
+    if quality.coverage_pct >= 95:
+        score = min(100, score + 5)
+    elif quality.coverage_pct < 80:
+        score -= (80 - quality.coverage_pct) * 0.5
+    
+    quality.quality_score = max(0, score)
+
+
 def analyze_parquet_slice(
     filepath: Path,
     interval_seconds: int = 60,
@@ -210,16 +261,11 @@ def analyze_parquet_slice(
     
     quality.duplicates = duplicates
     quality.unique_candles = len(unique_ts)
-    
-    # Calculate expected candles
-    # WARNING: If expected_hours is not provided, we use the data's actual time span
-    # This can OVERESTIMATE coverage if there are gaps at the start/end of the data!
-    if expected_hours:
-        quality.expected_candles = int((expected_hours * 3600) // interval_seconds)
-    elif unique_ts:
-        # Fallback: use actual data span (may overestimate coverage!)
-        time_span = unique_ts[-1] - unique_ts[0]
-        quality.expected_candles = max(1, (time_span // interval_seconds) + 1)
+    quality.expected_candles = _expected_candles(
+        unique_ts[-1] - unique_ts[0] if unique_ts else None,
+        interval_seconds,
+        expected_hours,
+    )
     
     # Detect gaps
     gap_details: List[Dict[str, Any]] = []
@@ -272,28 +318,7 @@ def analyze_parquet_slice(
     quality.zero_volume = zero_volume
     quality.negative_values = negative_values
     
-    # Calculate derived metrics
-    if quality.expected_candles > 0:
-        quality.coverage_pct = (quality.unique_candles / quality.expected_candles) * 100
-        quality.gap_pct = (quality.gaps / quality.expected_candles) * 100
-    
-    if quality.total_candles > 0:
-        quality.zero_volume_pct = (quality.zero_volume / quality.total_candles) * 100
-    
-    # Calculate quality score
-    score = 100.0
-    score -= min(30, quality.duplicates * 0.5)
-    score -= min(30, quality.gaps * 0.1)
-    score -= min(20, quality.distortions * 1.0)
-    score -= min(10, quality.zero_volume * 0.05)
-    score -= min(10, quality.negative_values * 2.0)
-    
-    if quality.coverage_pct >= 95:
-        score = min(100, score + 5)
-    elif quality.coverage_pct < 80:
-        score -= (80 - quality.coverage_pct) * 0.5
-    
-    quality.quality_score = max(0, score)
+    _apply_derived_metrics(quality)
     
     return quality
 
@@ -375,6 +400,328 @@ def parse_parquet_filename_date(filename: str) -> Optional[datetime]:
     return None
 
 
+# =============================================================================
+# Batch Validation
+# =============================================================================
+
+# Gap details kept per file by the batch scan (matches to_dict's limit)
+GAP_DETAIL_LIMIT = 5
+
+# Summary parquet columns stored as-is from SliceQuality
+_SUMMARY_FIELDS = [
+    "filepath", "token_address", "total_candles", "expected_candles", "unique_candles",
+    "min_ts", "max_ts", "duplicates", "gaps", "gap_segments", "distortions",
+    "zero_volume", "negative_values", "coverage_pct", "quality_score", "gap_pct",
+    "zero_volume_pct", "ch_candles", "missing_from_parquet", "extra_in_parquet",
+]
+
+
+def _sql_str(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def scan_parquet_slices(
+    filepaths: List[Path],
+    interval_seconds: int = 60,
+    expected_hours: Optional[float] = None,
+    threads: Optional[int] = None,
+) -> List[SliceQuality]:
+    """
+    Compute SliceQuality for many parquet files in one DuckDB scan.
+    
+    The files are read once into a temp table (grouped by filename), and all
+    counts, gaps and OHLC checks are aggregated per file in SQL. Metrics match
+    analyze_parquet_slice; gap_details is limited to the first
+    GAP_DETAIL_LIMIT gaps per file.
+    
+    If the batch cannot be read as a whole (e.g. one corrupt file), each file
+    is analyzed on its own so the error is attributed to that file.
+    
+    Returns:
+        SliceQuality per input file, in input order
+    """
+    if not filepaths:
+        return []
+    
+    file_list = ", ".join(_sql_str(str(f)) for f in filepaths)
+    conn = duckdb.connect()
+    try:
+        if threads:
+            conn.execute(f"SET threads = {int(threads)}")
+        conn.execute(f"""
+            CREATE TEMP TABLE candles AS
+            SELECT
+                filename,
+                token_address,
+                timestamp,
+                CAST(EXTRACT(EPOCH FROM timestamp) AS BIGINT) AS ts,
+                open, high, low, close, volume
+            FROM read_parquet([{file_list}], filename = true, union_by_name = true)
+        """)
+        
+        per_file = conn.execute("""
+            SELECT
+                filename,
+                arg_min(token_address, timestamp) AS token_address,
+                count(*) AS total_candles,
+                count(DISTINCT ts) AS unique_candles,
+                min(ts) AS min_ts,
+                max(ts) AS max_ts,
+                count(*) FILTER (
+                    WHERE open IS NOT NULL AND high IS NOT NULL AND low IS NOT NULL AND close IS NOT NULL
+                      AND (open <= 0 OR high <= 0 OR low <= 0 OR close <= 0)
+                ) AS negative_values,
+                count(*) FILTER (
+                    WHERE open IS NOT NULL AND high IS NOT NULL AND low IS NOT NULL AND close IS NOT NULL
+                      AND (high < low OR open > high OR open < low OR close > high OR close < low)
+                ) AS distortions,
+                count(*) FILTER (WHERE volume IS NULL OR volume = 0) AS zero_volume
+            FROM candles
+            GROUP BY filename
+        """).fetchall()
+        
+        gap_rows = conn.execute(f"""
+            WITH steps AS (
+                SELECT
+                    filename,
+                    lag(ts) OVER (PARTITION BY filename ORDER BY ts) AS prev_ts,
+                    ts
+                FROM (SELECT DISTINCT filename, ts FROM candles)
+            ),
+            gaps AS (
+                SELECT
+                    filename, prev_ts, ts,
+                    ts - prev_ts AS diff,
+                    (ts - prev_ts) // {int(interval_seconds)} - 1 AS missing,
+                    row_number() OVER (PARTITION BY filename ORDER BY ts) AS gap_no,
+                    count(*) OVER (PARTITION BY filename) AS gap_segments,
+                    sum((ts - prev_ts) // {int(interval_seconds)} - 1) OVER (PARTITION BY filename) AS total_missing
+                FROM steps
+                WHERE ts - prev_ts > {interval_seconds * 1.5}
+            )
+            SELECT filename, gap_segments, total_missing, gap_no, prev_ts, ts, diff, missing
+            FROM gaps
+            WHERE gap_no <= {GAP_DETAIL_LIMIT}
+            ORDER BY filename, gap_no
+        """).fetchall()
+    except Exception:
+        conn.close()
+        return [analyze_parquet_slice(f, interval_seconds, expected_hours) for f in filepaths]
+    conn.close()
+    
+    gaps_by_file: Dict[str, Dict[str, Any]] = {}
+    for filename, segments, total_missing, _, prev_ts, ts, diff, missing in gap_rows:
+        entry = gaps_by_file.setdefault(
+            filename, {"segments": int(segments), "missing": int(total_missing), "details": []}
+        )
+        entry["details"].append({
+            "start": datetime.fromtimestamp(prev_ts, tz=UTC).isoformat(),
+            "end": datetime.fromtimestamp(ts, tz=UTC).isoformat(),
+            "missing_candles": int(missing),
+            "gap_seconds": int(diff),
+        })
+    
+    stats_by_file = {row[0]: row for row in per_file}
+    results: List[SliceQuality] = []
+    for filepath in filepaths:
+        quality = SliceQuality(filepath=str(filepath))
+        row = stats_by_file.get(str(filepath))
+        if row is None:
+            results.append(quality)  # Empty file
+            continue
+        
+        (_, token, total, unique, min_ts, max_ts,
+         negative_values, distortions, zero_volume) = row
+        quality.token_address = token
+        quality.total_candles = int(total)
+        quality.unique_candles = int(unique)
+        quality.duplicates = quality.total_candles - quality.unique_candles
+        quality.min_ts = datetime.fromtimestamp(min_ts, tz=UTC)
+        quality.max_ts = datetime.fromtimestamp(max_ts, tz=UTC)
+        quality.expected_candles = _expected_candles(
+            int(max_ts) - int(min_ts), interval_seconds, expected_hours
+        )
+        gap = gaps_by_file.get(str(filepath))
+        if gap:
+            quality.gaps = gap["missing"]
+            quality.gap_segments = gap["segments"]
+            quality.gap_details = gap["details"]
+        quality.distortions = int(distortions)
+        quality.zero_volume = int(zero_volume)
+        quality.negative_values = int(negative_values)
+        _apply_derived_metrics(quality)
+        results.append(quality)
+    
+    return results
+
+
+def _scan_batch_worker(args: tuple) -> List[SliceQuality]:
+    """Process-pool entry point for scan_parquet_slices."""
+    filepaths, interval_seconds, expected_hours = args
+    # One DuckDB thread per worker; the pool provides the parallelism
+    return scan_parquet_slices(filepaths, interval_seconds, expected_hours, threads=1)
+
+
+def compare_with_clickhouse_batch(
+    qualities: List[SliceQuality],
+    ch_client: 'ClickHouseClient',
+    database: str,
+    chain: str,
+    interval_seconds: int,
+    batch_size: int = 200,
+) -> List[SliceQuality]:
+    """
+    Compare many parquet slices with ClickHouse, batch_size tokens per query.
+    
+    Each batch issues one ClickHouse query (one OR-ed time range per slice) and
+    one DuckDB scan of the batch's parquet files, instead of one of each per
+    file as compare_with_clickhouse does. Updates qualities in place.
+    """
+    comparable = [q for q in qualities if q.token_address and q.min_ts and q.max_ts]
+    
+    for start in range(0, len(comparable), batch_size):
+        batch = comparable[start:start + batch_size]
+        params: Dict[str, Any] = {"chain": chain, "interval": interval_seconds}
+        ranges = []
+        for i, q in enumerate(batch):
+            params[f"t{i}"] = q.token_address
+            params[f"f{i}"] = int(q.min_ts.timestamp())
+            params[f"e{i}"] = int(q.max_ts.timestamp())
+            ranges.append(
+                f"(token_address = %(t{i})s AND timestamp >= toDateTime(%(f{i})s) "
+                f"AND timestamp <= toDateTime(%(e{i})s))"
+            )
+        
+        try:
+            rows = ch_client.execute(f"""
+                SELECT token_address, toUnixTimestamp(timestamp) as ts
+                FROM {database}.ohlcv_candles
+                WHERE lower(chain) = lower(%(chain)s)
+                  AND interval_seconds = %(interval)s
+                  AND ({" OR ".join(ranges)})
+            """, params)
+            
+            ch_by_token: Dict[str, set] = {}
+            for token, ts in rows:
+                ch_by_token.setdefault(token, set()).add(int(ts))
+            
+            file_list = ", ".join(_sql_str(q.filepath) for q in batch)
+            conn = duckdb.connect()
+            pq_rows = conn.execute(f"""
+                SELECT DISTINCT filename, CAST(EXTRACT(EPOCH FROM timestamp) AS BIGINT) as ts
+                FROM read_parquet([{file_list}], filename = true, union_by_name = true)
+            """).fetchall()
+            conn.close()
+        except Exception as e:
+            for q in batch:
+                q.gap_details.append({"ch_error": str(e)})
+            continue
+        
+        pq_by_file: Dict[str, set] = {}
+        for filename, ts in pq_rows:
+            pq_by_file.setdefault(filename, set()).add(int(ts))
+        
+        for q in batch:
+            lo, hi = int(q.min_ts.timestamp()), int(q.max_ts.timestamp())
+            ch_timestamps = {
+                ts for ts in ch_by_token.get(q.token_address, ()) if lo <= ts <= hi
+            }
+            pq_timestamps = pq_by_file.get(q.filepath, set())
+            q.ch_candles = len(ch_timestamps)
+            q.missing_from_parquet = len(ch_timestamps - pq_timestamps)
+            q.extra_in_parquet = len(pq_timestamps - ch_timestamps)
+    
+    return qualities
+
+
+def file_fingerprint(filepath: Path, params: str) -> str:
+    """Hash of a file's size/mtime and the validation settings."""
+    st = filepath.stat()
+    return hashlib.sha256(f"{st.st_size}:{st.st_mtime_ns}:{params}".encode()).hexdigest()[:16]
+
+
+def load_summary_parquet(path: Path) -> Dict[str, Tuple[str, SliceQuality]]:
+    """
+    Load a summary parquet written by write_summary_parquet.
+    
+    Returns:
+        filepath -> (fingerprint, SliceQuality)
+    """
+    if not path.exists():
+        return {}
+    conn = duckdb.connect()
+    try:
+        cursor = conn.execute(f"SELECT * FROM read_parquet({_sql_str(str(path))})")
+        names = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+    
+    cached: Dict[str, Tuple[str, SliceQuality]] = {}
+    for row in rows:
+        record = dict(zip(names, row))
+        quality = SliceQuality(**{k: record[k] for k in _SUMMARY_FIELDS})
+        for key in ("min_ts", "max_ts"):
+            ts = getattr(quality, key)
+            if ts is not None and ts.tzinfo is None:
+                setattr(quality, key, ts.replace(tzinfo=UTC))
+        quality.gap_details = json.loads(record["gap_details"] or "[]")
+        cached[quality.filepath] = (record["fingerprint"], quality)
+    return cached
+
+
+def write_summary_parquet(
+    path: Path,
+    results: List[SliceQuality],
+    fingerprints: Dict[str, str],
+) -> None:
+    """Write per-file validation results (and their fingerprints) to parquet."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    records = []
+    for q in results:
+        record = {k: getattr(q, k) for k in _SUMMARY_FIELDS}
+        for key in ("min_ts", "max_ts"):
+            # Stored as naive UTC (DuckDB needs pytz to return TIMESTAMPTZ)
+            if record[key] is not None:
+                record[key] = record[key].astimezone(UTC).replace(tzinfo=None)
+        record["severity"] = q.severity
+        record["gap_details"] = json.dumps(q.gap_details)
+        record["fingerprint"] = fingerprints.get(q.filepath)
+        records.append(record)
+    
+    schema = pa.schema([
+        ("filepath", pa.string()),
+        ("token_address", pa.string()),
+        ("total_candles", pa.int64()),
+        ("expected_candles", pa.int64()),
+        ("unique_candles", pa.int64()),
+        ("min_ts", pa.timestamp("us")),
+        ("max_ts", pa.timestamp("us")),
+        ("duplicates", pa.int64()),
+        ("gaps", pa.int64()),
+        ("gap_segments", pa.int64()),
+        ("distortions", pa.int64()),
+        ("zero_volume", pa.int64()),
+        ("negative_values", pa.int64()),
+        ("coverage_pct", pa.float64()),
+        ("quality_score", pa.float64()),
+        ("gap_pct", pa.float64()),
+        ("zero_volume_pct", pa.float64()),
+        ("ch_candles", pa.int64()),
+        ("missing_from_parquet", pa.int64()),
+        ("extra_in_parquet", pa.int64()),
+        ("severity", pa.string()),
+        ("gap_details", pa.string()),
+        ("fingerprint", pa.string()),
+    ])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    pq.write_table(pa.Table.from_pylist(records, schema=schema), tmp)
+    os.replace(tmp, path)
+
+
 def validate_directory(
     directory: Path,
     interval_seconds: int = 60,
@@ -386,10 +733,23 @@ def validate_directory(
     verbose: bool = False,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
+    workers: int = 1,
+    scan_batch_files: int = 1000,
+    ch_batch_size: int = 200,
+    summary_path: Optional[Path] = None,
+    force: bool = False,
 ) -> List[SliceQuality]:
     """
     Validate all parquet files in a directory.
     
+    Files are scanned scan_batch_files at a time (one DuckDB scan per batch,
+    see scan_parquet_slices), with batches spread over a process pool when
+    workers > 1. ClickHouse comparison runs ch_batch_size tokens per query.
+    
+    With summary_path, results are kept in a summary parquet keyed by
+    filepath and a size/mtime fingerprint; unchanged files are taken from it
+    instead of being re-scanned (unless force).
+    
     Args:
         date_from: Optional start date filter (inclusive)
         date_to: Optional end date filter (inclusive)
@@ -419,20 +779,58 @@ def validate_directory(
         if len(parquet_files) < len(all_parquet_files):
             print(f"  (filtered from {len(all_parquet_files)} total files)", file=sys.stderr)
     
-    results: List[SliceQuality] = []
+    params = f"{interval_seconds}:{expected_hours}:{compare_ch}:{chain}"
+    fingerprints = {str(f): file_fingerprint(f, params) for f in parquet_files}
+    cached = load_summary_parquet(summary_path) if summary_path and not force else {}
     
-    for i, filepath in enumerate(parquet_files):
-        if verbose and i % 50 == 0:
-            print(f"  Progress: {i}/{len(parquet_files)}...", file=sys.stderr)
-        
-        quality = analyze_parquet_slice(filepath, interval_seconds, expected_hours)
-        
-        if compare_ch and ch_client:
-            quality = compare_with_clickhouse(
-                quality, ch_client, ch_database, chain, interval_seconds
-            )
-        
-        results.append(quality)
+    by_path: Dict[str, SliceQuality] = {}
+    pending: List[Path] = []
+    for f in parquet_files:
+        hit = cached.get(str(f))
+        if hit and hit[0] == fingerprints[str(f)]:
+            by_path[str(f)] = hit[1]
+        else:
+            pending.append(f)
+    
+    if verbose and cached:
+        print(f"  Unchanged since last summary: {len(by_path)}, to validate: {len(pending)}",
+              file=sys.stderr)
+    
+    batches = [
+        pending[i:i + scan_batch_files] for i in range(0, len(pending), scan_batch_files)
+    ]
+    tasks = [(batch, interval_seconds, expected_hours) for batch in batches]
+    fresh: List[SliceQuality] = []
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scanned = executor.map(_scan_batch_worker, tasks)
+            for batch_results in scanned:
+                fresh.extend(batch_results)
+                if verbose:
+                    print(f"  Progress: {len(fresh)}/{len(pending)}...", file=sys.stderr)
+    else:
+        for batch in batches:
+            fresh.extend(scan_parquet_slices(batch, interval_seconds, expected_hours))
+            if verbose:
+                print(f"  Progress: {len(fresh)}/{len(pending)}...", file=sys.stderr)
+    
+    if compare_ch and ch_client:
+        compare_with_clickhouse_batch(
+            fresh, ch_client, ch_database, chain, interval_seconds, ch_batch_size
+        )
+    
+    for quality in fresh:
+        by_path[quality.filepath] = quality
+    results = [by_path[str(f)] for f in parquet_files]
+    
+    if summary_path:
+        # Keep earlier entries for files outside this run's date filter
+        kept = [
+            q for path, (fp, q) in cached.items()
+            if path not in by_path and Path(path).exists()
+        ]
+        fingerprints.update({path: fp for path, (fp, _) in cached.items() if path not in by_path})
+        write_summary_parquet(summary_path, results + kept, fingerprints)
     
     return results
 
@@ -657,6 +1055,18 @@ def main() -> None:
                         default=int(os.getenv("CLICKHOUSE_PORT", "19000")))
     parser.add_argument("--ch-db", default=os.getenv("CLICKHOUSE_DATABASE", "quantbot"))
     parser.add_argument("--chain", default="solana")
+    parser.add_argument("--ch-batch-size", type=int, default=200,
+                        help="Tokens per ClickHouse comparison query (default: 200)")
+    
+    # Throughput / incremental
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes scanning file batches in parallel (default: 1)")
+    parser.add_argument("--scan-batch-files", type=int, default=1000,
+                        help="Files per DuckDB scan (default: 1000)")
+    parser.add_argument("--summary-parquet", type=Path,
+                        help="Per-file results parquet; unchanged files are not re-validated")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-validate all files, ignoring --summary-parquet contents")
     
     # Output
     parser.add_argument("--output", type=Path, help="Output JSON report path")
@@ -723,6 +1133,11 @@ def main() -> None:
             verbose=args.verbose,
             date_from=date_from,
             date_to=date_to,
+            workers=args.workers,
+            scan_batch_files=args.scan_batch_files,
+            ch_batch_size=args.ch_batch_size,
+            summary_path=args.summary_parquet,
+            force=args.force,
         )
     
     # Generate summary
@@ -0,0 +1,268 @@
+"""
+Columnar Candle Run Detection
+
+Finds token death (runs of flat, zero-volume candles) and gap runs for many
+tokens' candles at once, using array operations instead of per-candle loops.
+
+Candles are passed as columns (NumPy arrays or anything np.asarray accepts,
+including Arrow arrays) sorted by (token, timestamp), plus segment offsets:
+token i owns rows offsets[i]:offsets[i + 1]. A single token is simply one
+segment (offsets=None).
+
+A candle is "dead" when volume == 0 and open == high == low == close. A token
+has died at candle i when candles i .. i+run_length-1 of the same segment are
+all dead at the same price (check_continuous_event_windows used run_length=3).
+
+Window queries (which alert windows are continuously covered / contain a
+death) are answered per query with two searchsorted lookups and prefix sums.
+
+All timestamps are unix SECONDS.
+
+Usage:
+    from tools.shared.candle_runs import segment_offsets, window_checks
+
+    offsets = segment_offsets(token_ids)          # token_ids sorted
+    covered, died = window_checks(
+        ts, o, h, l, c, v, offsets,
+        segments=alert_token_idx, starts=alert_s, ends=alert_s + 24 * 3600,
+        min_candles=24 * 60 * 0.8, max_gap_seconds=600,
+    )
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+DEATH_RUN_LENGTH = 3
+
+
+def segment_offsets(*keys) -> np.ndarray:
+    """
+    Segment offsets for key columns that are already grouped (sorted).
+
+    A new segment starts wherever any key column changes value.
+    Returns int64 array of length n_segments + 1.
+    """
+    columns = [np.asarray(k) for k in keys]
+    n = len(columns[0]) if columns else 0
+    if n == 0:
+        return np.zeros(1, dtype=np.int64)
+    changed = np.zeros(n - 1, dtype=bool)
+    for col in columns:
+        changed |= col[1:] != col[:-1]
+    starts = np.flatnonzero(changed) + 1
+    return np.concatenate(([0], starts, [n])).astype(np.int64)
+
+
+def _segment_starts_mask(n: int, offsets: Optional[np.ndarray]) -> np.ndarray:
+    """True at the first row of every segment."""
+    mask = np.zeros(n, dtype=bool)
+    if n == 0:
+        return mask
+    if offsets is None:
+        mask[0] = True
+    else:
+        starts = np.asarray(offsets[:-1], dtype=np.int64)
+        mask[starts[starts < n]] = True
+    return mask
+
+
+def _segment_ids(n: int, offsets: Optional[np.ndarray]) -> np.ndarray:
+    """Segment number of every row."""
+    if offsets is None:
+        return np.zeros(n, dtype=np.int64)
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+
+
+def dead_candle_mask(open_, high, low, close, volume) -> np.ndarray:
+    """True where a candle has zero volume and a flat price (O = H = L = C)."""
+    open_ = np.asarray(open_, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    return (
+        (np.asarray(volume, dtype=np.float64) == 0)
+        & (open_ == np.asarray(high, dtype=np.float64))
+        & (open_ == np.asarray(low, dtype=np.float64))
+        & (open_ == close)
+    )
+
+
+def death_run_starts(
+    open_,
+    high,
+    low,
+    close,
+    volume,
+    offsets: Optional[np.ndarray] = None,
+    run_length: int = DEATH_RUN_LENGTH,
+) -> np.ndarray:
+    """
+    Row indices that start a death run.
+
+    Row i starts a death run when rows i .. i+run_length-1 lie in one segment,
+    are all dead candles, and share one close price.
+
+    Returns sorted int64 array of global row indices.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    dead = dead_candle_mask(open_, high, low, close, volume)
+    n = len(dead)
+    if n < run_length:
+        return np.zeros(0, dtype=np.int64)
+    if run_length <= 1:
+        return np.flatnonzero(dead).astype(np.int64)
+
+    # links[j]: row j continues the dead run of row j - 1
+    links = np.zeros(n, dtype=bool)
+    links[1:] = dead[1:] & dead[:-1] & (close[1:] == close[:-1])
+    links &= ~_segment_starts_mask(n, offsets)
+
+    # Row i starts a run when links[i+1 .. i+run_length-1] are all set
+    linked = np.concatenate(([0], np.cumsum(links, dtype=np.int64)))
+    last = np.arange(run_length - 1, n)
+    first = last - (run_length - 1)
+    complete = (linked[last + 1] - linked[first + 1]) == run_length - 1
+    return first[complete & dead[first]].astype(np.int64)
+
+
+def first_death_index(
+    open_,
+    high,
+    low,
+    close,
+    volume,
+    offsets: Optional[np.ndarray] = None,
+    run_length: int = DEATH_RUN_LENGTH,
+) -> np.ndarray:
+    """
+    Per-segment index (relative to the segment start) of the first death run,
+    or -1 where the token never died.
+    """
+    n = len(np.asarray(close))
+    if offsets is None:
+        offsets = np.array([0, n], dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    result = np.full(len(offsets) - 1, -1, dtype=np.int64)
+    starts = death_run_starts(open_, high, low, close, volume, offsets, run_length)
+    if len(starts):
+        seg = np.searchsorted(offsets, starts, side='right') - 1
+        first_seg, first_pos = np.unique(seg, return_index=True)
+        result[first_seg] = starts[first_pos] - offsets[first_seg]
+    return result
+
+
+def gap_runs(
+    ts,
+    interval_seconds: int,
+    offsets: Optional[np.ndarray] = None,
+    tolerance: float = 1.5,
+) -> Dict[str, np.ndarray]:
+    """
+    Gaps between consecutive candles of the same segment.
+
+    A gap is a step larger than interval_seconds * tolerance; it is missing
+    (step // interval_seconds) - 1 candles.
+
+    Returns dict of equal-length arrays: segment, index (row after the gap),
+    start, end, gap_seconds, missing_candles.
+    """
+    ts = np.asarray(ts, dtype=np.int64)
+    n = len(ts)
+    step = np.diff(ts)
+    is_gap = step > interval_seconds * tolerance
+    if n:
+        is_gap &= ~_segment_starts_mask(n, offsets)[1:]
+    idx = np.flatnonzero(is_gap) + 1
+    gap_seconds = step[idx - 1]
+    return {
+        'segment': _segment_ids(n, offsets)[idx],
+        'index': idx.astype(np.int64),
+        'start': ts[idx - 1],
+        'end': ts[idx],
+        'gap_seconds': gap_seconds,
+        'missing_candles': gap_seconds // interval_seconds - 1,
+    }
+
+
+def window_bounds(
+    ts,
+    offsets: np.ndarray,
+    segments,
+    starts,
+    ends,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row range [lo, hi) of the candles with start <= ts <= end for each query.
+
+    Queries are (segments[k], starts[k], ends[k]); ts must be sorted within
+    every segment.
+    """
+    ts = np.asarray(ts, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    segments = np.asarray(segments, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if len(ts) == 0:
+        zeros = np.zeros(len(segments), dtype=np.int64)
+        return zeros, zeros.copy()
+
+    # One global searchsorted over (segment, ts) packed into a single key
+    t_min = int(ts.min())
+    width = int(ts.max()) - t_min + 3
+    key = _segment_ids(len(ts), offsets) * width + (ts - t_min + 1)
+    lo_key = segments * width + np.clip(starts - t_min + 1, 0, width - 1)
+    hi_key = segments * width + np.clip(ends - t_min + 1, 0, width - 1)
+    lo = np.searchsorted(key, lo_key, side='left')
+    hi = np.searchsorted(key, hi_key, side='right')
+    return lo.astype(np.int64), np.maximum(lo, hi).astype(np.int64)
+
+
+def window_checks(
+    ts,
+    open_,
+    high,
+    low,
+    close,
+    volume,
+    offsets: np.ndarray,
+    segments,
+    starts,
+    ends,
+    min_candles,
+    max_gap_seconds: int,
+    run_length: int = DEATH_RUN_LENGTH,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Continuity and death per window query, in one pass.
+
+    min_candles is a scalar or one value per query.
+
+    For each query the window holds the segment's candles with
+    start <= ts <= end. Mirrors check_continuous_coverage:
+    - died: a complete death run lies inside the window
+    - has_coverage: died, or the window holds >= min_candles candles and
+      every step between them is < max_gap_seconds
+
+    Returns (has_coverage, died) boolean arrays.
+    """
+    ts = np.asarray(ts, dtype=np.int64)
+    lo, hi = window_bounds(ts, offsets, segments, starts, ends)
+    count = hi - lo
+
+    deaths = death_run_starts(open_, high, low, close, volume, offsets, run_length)
+    nxt = np.searchsorted(deaths, lo, side='left')
+    died = np.zeros(len(lo), dtype=bool)
+    has_next = nxt < len(deaths)
+    died[has_next] = deaths[nxt[has_next]] + run_length <= hi[has_next]
+    died &= count > 0
+
+    # wide[j]: steps of at least max_gap_seconds ending at rows 1..j; the steps
+    # inside a window end at rows lo+1 .. hi-1 (never across a segment start)
+    wide = np.concatenate(([0], np.cumsum(np.diff(ts) >= max_gap_seconds, dtype=np.int64)))
+    last = np.clip(hi - 1, 0, None)
+    first = np.clip(lo, 0, last)
+    wide_steps = np.where(count > 0, wide[last] - wide[first], 0)
+    continuous = (count > 0) & (count >= min_candles) & (wide_steps == 0)
+
+    return died | continuous, died
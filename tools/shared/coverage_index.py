@@ -0,0 +1,567 @@
+"""
+Candle Coverage Index
+
+Persistent per-token index of which candles exist in the candle store.
+
+For every (chain, mint, interval_seconds) the index keeps a sorted list of
+contiguous candle runs. A run covers the half-open range
+[first_candle_ts, last_candle_ts + interval_seconds) and contains one candle
+per interval step. Coverage questions ("how many candles in [a, b]?",
+"what fraction of [a, b) is covered?", "which sub-ranges are missing?")
+are answered with two bisects and a prefix sum, so tools no longer need to
+scan ClickHouse to learn what is there.
+
+All timestamps are unix SECONDS (the resolution of ClickHouse DateTime).
+
+Storage (DuckDB):
+    ohlcv_coverage_ranges       one row per run
+    ohlcv_coverage_index_state  per-interval refresh watermark
+
+The index is maintained by `refresh_from_clickhouse()`, which only reads
+candles ingested since the last watermark and merges them into the stored
+runs (see tools/storage/build_coverage_index.py for the CLI).
+
+Usage:
+    from tools.shared.coverage_index import open_coverage_index
+
+    index = open_coverage_index("data/alerts.duckdb", interval_seconds=60)
+    if index is not None:
+        frac = index.covered_fraction("solana", mint, 60, start_s, end_s)
+        gaps = index.missing_ranges("solana", mint, 60, start_s, end_s)
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+RANGES_TABLE = "ohlcv_coverage_ranges"
+STATE_TABLE = "ohlcv_coverage_index_state"
+
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS {RANGES_TABLE} (
+    chain TEXT NOT NULL,
+    mint TEXT NOT NULL,
+    interval_seconds INTEGER NOT NULL,
+    range_start BIGINT NOT NULL,
+    range_end BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+    interval_seconds INTEGER PRIMARY KEY,
+    watermark BIGINT NOT NULL,
+    token_count BIGINT NOT NULL,
+    range_count BIGINT NOT NULL,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+INTERVAL_SECONDS = {
+    '1s': 1,
+    '15s': 15,
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+    '4h': 14400,
+    '1d': 86400,
+}
+
+INTERVAL_LABELS = {seconds: label for label, seconds in INTERVAL_SECONDS.items()}
+
+CoverageKey = Tuple[str, str, int]
+
+
+def interval_to_seconds(interval: Union[str, int]) -> int:
+    """Convert '1m'/'5m'/... (or an int) to interval seconds."""
+    if isinstance(interval, int):
+        return interval
+    if interval in INTERVAL_SECONDS:
+        return INTERVAL_SECONDS[interval]
+    try:
+        return int(interval)
+    except ValueError:
+        raise ValueError(f"Unknown candle interval: {interval!r}") from None
+
+
+def interval_label(interval_seconds: int) -> str:
+    """Convert interval seconds back to '1m'/'5m'/... where known."""
+    return INTERVAL_LABELS.get(interval_seconds, f"{interval_seconds}s")
+
+
+def ranges_from_timestamps(timestamps: Iterable[int], interval_seconds: int) -> Tuple[List[int], List[int]]:
+    """
+    Collapse candle timestamps into contiguous runs.
+
+    Timestamps may be unsorted and contain duplicates. A step of at most
+    one interval continues a run; anything larger starts a new one.
+
+    Returns:
+        (starts, ends) with ends exclusive (last candle + interval)
+    """
+    starts: List[int] = []
+    ends: List[int] = []
+    prev = None
+    for ts in sorted(set(int(t) for t in timestamps)):
+        if prev is None or ts - prev > interval_seconds:
+            starts.append(ts)
+            ends.append(ts + interval_seconds)
+        else:
+            ends[-1] = ts + interval_seconds
+        prev = ts
+    return starts, ends
+
+
+class CoverageRanges:
+    """Sorted, disjoint candle runs for one (chain, mint, interval)."""
+
+    __slots__ = ('interval_seconds', 'starts', 'ends', '_candles_before')
+
+    def __init__(self, interval_seconds: int, starts: Sequence[int] = (), ends: Sequence[int] = ()):
+        self.interval_seconds = interval_seconds
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self._merge(list(starts), list(ends))
+
+    @classmethod
+    def from_sorted(cls, interval_seconds: int, starts: List[int], ends: List[int]) -> 'CoverageRanges':
+        """Wrap runs that are already sorted and disjoint (as stored), skipping the merge."""
+        ranges = cls.__new__(cls)
+        ranges.interval_seconds = interval_seconds
+        ranges.starts = starts
+        ranges.ends = ends
+        ranges._index_candles()
+        return ranges
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __iter__(self):
+        return iter(zip(self.starts, self.ends))
+
+    def __repr__(self) -> str:
+        return f"CoverageRanges(interval_seconds={self.interval_seconds}, ranges={list(self)})"
+
+    def _merge(self, starts: List[int], ends: List[int]) -> None:
+        pairs = sorted(zip(self.starts + starts, self.ends + ends))
+        merged_starts: List[int] = []
+        merged_ends: List[int] = []
+        for start, end in pairs:
+            if merged_ends and start <= merged_ends[-1]:
+                if end > merged_ends[-1]:
+                    merged_ends[-1] = end
+            else:
+                merged_starts.append(start)
+                merged_ends.append(end)
+        self.starts = merged_starts
+        self.ends = merged_ends
+        self._index_candles()
+
+    def _index_candles(self) -> None:
+        step = self.interval_seconds
+        self._candles_before = list(accumulate(
+            ((end - start) // step for start, end in zip(self.starts, self.ends)), initial=0
+        ))
+
+    def add_ranges(self, starts: Sequence[int], ends: Sequence[int]) -> None:
+        """Merge runs into this index (touching or overlapping runs coalesce)."""
+        self._merge(list(starts), list(ends))
+
+    def add_timestamps(self, timestamps: Iterable[int]) -> None:
+        """Merge newly ingested candle timestamps."""
+        self.add_ranges(*ranges_from_timestamps(timestamps, self.interval_seconds))
+
+    def _span(self, start: int, end: int) -> Tuple[int, int]:
+        """Indices [i, j) of runs overlapping the half-open range [start, end)."""
+        return bisect_right(self.ends, start), bisect_right(self.starts, end - 1)
+
+    def _run_candles(self, run: int, first_ts: int, last_ts: int) -> int:
+        """Candles of one run with timestamps in [first_ts, last_ts]."""
+        step = self.interval_seconds
+        run_start = self.starts[run]
+        lo = max(first_ts, run_start)
+        hi = min(last_ts, self.ends[run] - step)
+        if lo > hi:
+            return 0
+        first = run_start + -(-(lo - run_start) // step) * step
+        last = run_start + ((hi - run_start) // step) * step
+        return (last - first) // step + 1 if first <= last else 0
+
+    def candle_count(self, first_ts: int, last_ts: int) -> int:
+        """Number of candles with first_ts <= timestamp <= last_ts."""
+        if last_ts < first_ts:
+            return 0
+        i, j = self._span(first_ts, last_ts + 1)
+        if i >= j:
+            return 0
+        if j - i == 1:
+            return self._run_candles(i, first_ts, last_ts)
+        inner = self._candles_before[j - 1] - self._candles_before[i + 1]
+        return inner + self._run_candles(i, first_ts, last_ts) + self._run_candles(j - 1, first_ts, last_ts)
+
+    def covered_seconds(self, start: int, end: int) -> int:
+        """Seconds of [start, end) covered by candle runs."""
+        if end <= start:
+            return 0
+        i, j = self._span(start, end)
+        if i >= j:
+            return 0
+        inner = (self._candles_before[j] - self._candles_before[i]) * self.interval_seconds
+        # Clip the outer runs to the query range
+        inner -= max(0, start - self.starts[i])
+        inner -= max(0, self.ends[j - 1] - end)
+        return inner
+
+    def covered_fraction(self, start: int, end: int) -> float:
+        """Fraction of [start, end) covered by candle runs (0.0-1.0)."""
+        if end <= start:
+            return 0.0
+        return self.covered_seconds(start, end) / (end - start)
+
+    def missing_ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Uncovered sub-ranges of [start, end), as half-open (start, end) pairs."""
+        if end <= start:
+            return []
+        i, j = self._span(start, end)
+        gaps: List[Tuple[int, int]] = []
+        cursor = start
+        for run in range(i, j):
+            if self.starts[run] > cursor:
+                gaps.append((cursor, self.starts[run]))
+            cursor = max(cursor, self.ends[run])
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+
+class CoverageIndex:
+    """In-memory view of the coverage index, keyed by (chain, mint, interval_seconds)."""
+
+    def __init__(self, indexed_intervals: Iterable[int] = ()):
+        self.ranges: Dict[CoverageKey, CoverageRanges] = {}
+        # Intervals with a completed refresh: a missing key means "no candles"
+        self.indexed_intervals: Set[int] = set(indexed_intervals)
+        self._mints: Dict[str, Set[CoverageKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    @staticmethod
+    def key(chain: str, mint: str, interval: Union[str, int]) -> CoverageKey:
+        return ((chain or 'solana').lower(), mint, interval_to_seconds(interval))
+
+    def is_indexed(self, interval: Union[str, int]) -> bool:
+        return interval_to_seconds(interval) in self.indexed_intervals
+
+    def get(self, chain: str, mint: str, interval: Union[str, int]) -> CoverageRanges:
+        """Runs for a token (empty if the token has no candles)."""
+        key = self.key(chain, mint, interval)
+        found = self.ranges.get(key)
+        return found if found is not None else CoverageRanges(key[2])
+
+    def put(self, key: CoverageKey, ranges: CoverageRanges) -> None:
+        self.ranges[key] = ranges
+        self._mints.setdefault(key[1], set()).add(key)
+
+    def add_timestamps(self, chain: str, mint: str, interval: Union[str, int], timestamps: Iterable[int]) -> CoverageKey:
+        """Merge ingested candle timestamps for one token; returns its key."""
+        key = self.key(chain, mint, interval)
+        ranges = self.ranges.get(key)
+        if ranges is None:
+            ranges = CoverageRanges(key[2])
+            self.put(key, ranges)
+        ranges.add_timestamps(timestamps)
+        return key
+
+    def has_mint(self, mint: str, interval: Optional[Union[str, int]] = None) -> bool:
+        """True if any chain has candles for this mint (optionally for one interval)."""
+        keys = self._mints.get(mint, ())
+        if interval is None:
+            return any(self.ranges[k] for k in keys)
+        interval_s = interval_to_seconds(interval)
+        return any(k[2] == interval_s and self.ranges[k] for k in keys)
+
+    def intervals_for(self, chain: str, mint: str) -> List[int]:
+        """Intervals with at least one candle run for this token."""
+        chain = (chain or 'solana').lower()
+        return sorted(k[2] for k in self._mints.get(mint, ()) if k[0] == chain and self.ranges[k])
+
+    def candle_count(self, chain: str, mint: str, interval: Union[str, int], first_ts: int, last_ts: int) -> int:
+        return self.get(chain, mint, interval).candle_count(first_ts, last_ts)
+
+    def covered_fraction(self, chain: str, mint: str, interval: Union[str, int], start: int, end: int) -> float:
+        return self.get(chain, mint, interval).covered_fraction(start, end)
+
+    def missing_ranges(self, chain: str, mint: str, interval: Union[str, int], start: int, end: int) -> List[Tuple[int, int]]:
+        return self.get(chain, mint, interval).missing_ranges(start, end)
+
+
+# =============================================================================
+# DuckDB persistence
+# =============================================================================
+
+def ensure_schema(con) -> None:
+    """Create coverage index tables if missing."""
+    con.execute(SCHEMA_SQL)
+
+
+def _table_exists(con, table_name: str) -> bool:
+    row = con.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+        [table_name],
+    ).fetchone()
+    return bool(row and row[0])
+
+
+def load_coverage_index(
+    con,
+    interval_seconds: Optional[Union[str, int]] = None,
+    chain: Optional[str] = None,
+    mints: Optional[Iterable[str]] = None,
+) -> CoverageIndex:
+    """
+    Load (part of) the coverage index from DuckDB.
+
+    Filters keep memory proportional to the tokens a tool actually asks
+    about. Returns an empty index with no indexed intervals if the tables
+    do not exist yet.
+    """
+    if not _table_exists(con, STATE_TABLE) or not _table_exists(con, RANGES_TABLE):
+        return CoverageIndex()
+
+    where = []
+    params: list = []
+    if interval_seconds is not None:
+        where.append("interval_seconds = ?")
+        params.append(interval_to_seconds(interval_seconds))
+
+    state_sql = f"SELECT interval_seconds FROM {STATE_TABLE}"
+    if where:
+        state_sql += " WHERE " + " AND ".join(where)
+    index = CoverageIndex(row[0] for row in con.execute(state_sql, params).fetchall())
+
+    if chain is not None:
+        where.append("chain = ?")
+        params.append(chain.lower())
+    if mints is not None:
+        import pyarrow as pa
+
+        con.register('_coverage_mints', pa.table({'mint': pa.array(sorted(set(mints)), pa.string())}))
+        where.append("mint IN (SELECT mint FROM _coverage_mints)")
+
+    sql = f"SELECT chain, mint, interval_seconds, range_start, range_end FROM {RANGES_TABLE}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY chain, mint, interval_seconds, range_start"
+
+    try:
+        cols = con.execute(sql, params).fetchnumpy()
+    finally:
+        if mints is not None:
+            con.unregister('_coverage_mints')
+    n = len(cols['range_start'])
+    if n == 0:
+        return index
+    import numpy as np
+
+    # Rows are sorted by key; split at key changes
+    changed = np.zeros(n, dtype=bool)
+    changed[0] = True
+    for name in ('chain', 'mint', 'interval_seconds'):
+        col = np.asarray(cols[name])
+        changed[1:] |= col[1:] != col[:-1]
+    bounds = np.flatnonzero(changed).tolist() + [n]
+    chains = np.asarray(cols['chain'])[bounds[:-1]].tolist()
+    mints_col = np.asarray(cols['mint'])[bounds[:-1]].tolist()
+    intervals = np.asarray(cols['interval_seconds'])[bounds[:-1]].tolist()
+    starts = cols['range_start'].tolist()
+    ends = cols['range_end'].tolist()
+    for g, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        key = (chains[g], mints_col[g], intervals[g])
+        index.put(key, CoverageRanges.from_sorted(key[2], starts[lo:hi], ends[lo:hi]))
+    return index
+
+
+def open_coverage_index(
+    db_path: str,
+    interval_seconds: Optional[Union[str, int]] = None,
+    chain: Optional[str] = None,
+    mints: Optional[Iterable[str]] = None,
+) -> Optional[CoverageIndex]:
+    """
+    Open a DuckDB file read-only and load its coverage index.
+
+    Returns None when the file is missing or the requested interval has
+    never been indexed, so callers can fall back to querying candles.
+    """
+    if db_path != ':memory:' and not Path(db_path).exists():
+        return None
+    from tools.shared.duckdb_adapter import get_readonly_connection
+
+    try:
+        with get_readonly_connection(db_path) as con:
+            index = load_coverage_index(con, interval_seconds, chain, mints)
+    except Exception:
+        return None
+    if not index.indexed_intervals:
+        return None
+    return index
+
+
+def save_ranges(con, index: CoverageIndex, keys: Optional[Iterable[CoverageKey]] = None) -> int:
+    """
+    Replace stored runs for `keys` (default: every key in the index).
+
+    Returns the number of run rows written.
+    """
+    import pyarrow as pa
+
+    keys = list(index.ranges) if keys is None else list(keys)
+    if not keys:
+        return 0
+
+    key_table = pa.table({
+        'chain': [k[0] for k in keys],
+        'mint': [k[1] for k in keys],
+        'interval_seconds': pa.array([k[2] for k in keys], pa.int32()),
+    })
+    columns: Dict[str, list] = {'chain': [], 'mint': [], 'interval_seconds': [], 'range_start': [], 'range_end': []}
+    for key in keys:
+        ranges = index.ranges.get(key)
+        if not ranges:
+            continue
+        n = len(ranges)
+        columns['chain'].extend([key[0]] * n)
+        columns['mint'].extend([key[1]] * n)
+        columns['interval_seconds'].extend([key[2]] * n)
+        columns['range_start'].extend(ranges.starts)
+        columns['range_end'].extend(ranges.ends)
+    range_table = pa.table({
+        'chain': columns['chain'],
+        'mint': columns['mint'],
+        'interval_seconds': pa.array(columns['interval_seconds'], pa.int32()),
+        'range_start': pa.array(columns['range_start'], pa.int64()),
+        'range_end': pa.array(columns['range_end'], pa.int64()),
+    })
+
+    con.register('_coverage_keys', key_table)
+    con.register('_coverage_rows', range_table)
+    try:
+        con.execute("BEGIN TRANSACTION")
+        con.execute(f"""
+            DELETE FROM {RANGES_TABLE} AS r
+            USING _coverage_keys AS k
+            WHERE r.chain = k.chain AND r.mint = k.mint AND r.interval_seconds = k.interval_seconds
+        """)
+        con.execute(f"INSERT INTO {RANGES_TABLE} SELECT * FROM _coverage_rows")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.unregister('_coverage_keys')
+        con.unregister('_coverage_rows')
+    return range_table.num_rows
+
+
+def _update_state(con, interval_seconds: int, watermark: int) -> None:
+    con.execute(f"""
+        INSERT OR REPLACE INTO {STATE_TABLE}
+            (interval_seconds, watermark, token_count, range_count, refreshed_at)
+        SELECT ?, ?, COUNT(DISTINCT (chain, mint)), COUNT(*), CURRENT_TIMESTAMP
+        FROM {RANGES_TABLE}
+        WHERE interval_seconds = ?
+    """, [interval_seconds, watermark, interval_seconds])
+
+
+def get_watermark(con, interval_seconds: int) -> Optional[int]:
+    """Unix seconds of the newest ingested_at already folded into the index."""
+    row = con.execute(
+        f"SELECT watermark FROM {STATE_TABLE} WHERE interval_seconds = ?",
+        [interval_seconds],
+    ).fetchone()
+    return row[0] if row else None
+
+
+def refresh_from_clickhouse(
+    con,
+    ch_client,
+    database: str,
+    interval: Union[str, int],
+    table: str = 'ohlcv_candles',
+    full: bool = False,
+) -> Dict[str, int]:
+    """
+    Fold candles ingested since the last refresh into the stored index.
+
+    Only tokens with newly ingested candles are read from ClickHouse, and
+    only their new timestamps; they are merged into the stored runs for
+    those tokens. `full=True` rebuilds the interval from scratch.
+
+    Args:
+        con: Writable DuckDB connection holding the index
+        ch_client: clickhouse_driver Client
+        database: ClickHouse database
+        interval: Candle interval ('1m', '5m', ... or seconds)
+        table: Candle table (must have interval_seconds and ingested_at)
+        full: Ignore the watermark and rebuild
+
+    Returns:
+        {'interval_seconds', 'tokens_updated', 'rows_written', 'watermark'}
+    """
+    interval_s = interval_to_seconds(interval)
+    ensure_schema(con)
+
+    watermark = None if full else get_watermark(con, interval_s)
+    where = f"interval_seconds = {interval_s}"
+    if watermark is not None:
+        # >= so rows sharing the watermark second are not lost; merging is idempotent
+        where += f" AND ingested_at >= toDateTime({int(watermark)})"
+
+    rows = ch_client.execute(f"""
+        SELECT
+            lower(chain) AS chain,
+            token_address,
+            arraySort(groupUniqArray(toUInt32(timestamp))) AS ts,
+            toUInt32(max(ingested_at)) AS max_ingested
+        FROM {database}.{table}
+        WHERE {where}
+        GROUP BY chain, token_address
+    """)
+
+    if full:
+        con.execute(f"DELETE FROM {RANGES_TABLE} WHERE interval_seconds = ?", [interval_s])
+        index = CoverageIndex([interval_s])
+    else:
+        index = load_coverage_index(con, interval_s, mints={row[1] for row in rows})
+
+    touched: List[CoverageKey] = []
+    new_watermark = watermark or 0
+    for chain, mint, timestamps, max_ingested in rows:
+        touched.append(index.add_timestamps(chain, mint, interval_s, timestamps))
+        new_watermark = max(new_watermark, int(max_ingested))
+
+    written = save_ranges(con, index, touched)
+    _update_state(con, interval_s, new_watermark)
+    return {
+        'interval_seconds': interval_s,
+        'tokens_updated': len(touched),
+        'rows_written': written,
+        'watermark': new_watermark,
+    }
+
+
+def export_parquet(con, path: str) -> None:
+    """Write the run table to Parquet, sorted for range lookups."""
+    escaped = str(path).replace("'", "''")
+    con.execute(f"""
+        COPY (
+            SELECT * FROM {RANGES_TABLE}
+            ORDER BY interval_seconds, chain, mint, range_start
+        ) TO '{escaped}' (FORMAT PARQUET)
+    """)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar candle run detection.
+
+Results are checked against the per-candle loops they replace
+(check_continuous_event_windows.check_token_death / check_continuous_coverage).
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add workspace root to path
+workspace_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(workspace_root))
+
+from tools.shared.candle_runs import (
+    death_run_starts,
+    first_death_index,
+    gap_runs,
+    segment_offsets,
+    window_bounds,
+    window_checks,
+)
+
+T0 = 1_735_689_600  # 2025-01-01T00:00:00Z
+
+
+def loop_token_death(candles):
+    """Reference: the original nested-loop death check."""
+    if len(candles) < 3:
+        return None
+    for i in range(len(candles) - 2):
+        _, open_price, high, low, close, volume = candles[i]
+        if volume == 0 and open_price == high == low == close:
+            is_dead = True
+            for j in range(i + 1, min(i + 3, len(candles))):
+                _, o, h, l, c, v = candles[j]
+                if v != 0 or not (o == h == l == c == close):
+                    is_dead = False
+                    break
+            if is_dead:
+                return i
+    return None
+
+
+def loop_window_check(candles, start, end, min_candles, max_gap_seconds=600):
+    """Reference: the original per-window coverage check."""
+    window = [c for c in candles if start <= c[0] <= end]
+    if not window:
+        return (False, False)
+    if loop_token_death(window) is not None:
+        return (True, True)
+    if len(window) >= min_candles:
+        max_gap = max((b[0] - a[0] for a, b in zip(window, window[1:])), default=0)
+        if max_gap < max_gap_seconds:
+            return (True, False)
+    return (False, False)
+
+
+def random_token(rng, n):
+    """1m candles with gaps, flat stretches and a possible death run."""
+    candles = []
+    t = T0 + rng.randint(0, 3600)
+    price = 1.0
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.15:
+            candles.append((t, price, price, price, price, 0.0))
+        elif roll < 0.2:
+            candles.append((t, price, price, price, price, 5.0))
+        else:
+            price *= 1 + rng.uniform(-0.05, 0.05)
+            candles.append((t, price, price * 1.01, price * 0.99, price, rng.uniform(0, 10)))
+        t += 60 if rng.random() < 0.97 else 60 * rng.randint(2, 30)
+    return candles
+
+
+def columns(tokens):
+    """Concatenate per-token candle lists into columns + offsets."""
+    rows = [c for candles in tokens for c in candles]
+    cols = [np.array([r[i] for r in rows], dtype=np.float64) for i in range(6)]
+    lengths = [len(candles) for candles in tokens]
+    offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    return cols[0].astype(np.int64), cols[1:], offsets
+
+
+class TestDeath:
+    """Death-run detection."""
+
+    def test_run_must_be_complete_and_flat(self):
+        flat = (T0, 2.0, 2.0, 2.0, 2.0, 0.0)
+        candles = [flat, flat, (T0, 3.0, 3.0, 3.0, 3.0, 0.0), flat, flat, flat]
+        ts, ohlcv, _ = columns([candles])
+        assert list(death_run_starts(*ohlcv)) == [3]
+        assert first_death_index(*ohlcv)[0] == 3 == loop_token_death(candles)
+
+    def test_runs_do_not_cross_segments(self):
+        flat = (T0, 2.0, 2.0, 2.0, 2.0, 0.0)
+        _, ohlcv, offsets = columns([[flat, flat], [flat, flat, flat]])
+        assert list(first_death_index(*ohlcv, offsets)) == [-1, 0]
+
+    def test_matches_loop(self):
+        rng = random.Random(3)
+        tokens = [random_token(rng, rng.randint(0, 80)) for _ in range(300)]
+        _, ohlcv, offsets = columns(tokens)
+        got = first_death_index(*ohlcv, offsets)
+        expected = [loop_token_death(candles) for candles in tokens]
+        assert [None if g < 0 else int(g) for g in got] == expected
+
+
+class TestGapsAndWindows:
+    """Gap runs and per-window checks."""
+
+    def test_gap_runs(self):
+        ts = np.array([T0, T0 + 60, T0 + 300, T0 + 330, T0, T0 + 600])
+        gaps = gap_runs(ts, 60, offsets=np.array([0, 4, 6]))
+        assert list(gaps['segment']) == [0, 1]
+        assert list(gaps['missing_candles']) == [3, 9]
+        assert list(gaps['start']) == [T0 + 60, T0]
+
+    def test_window_bounds_outside_data(self):
+        ts = np.array([T0, T0 + 60, T0 + 120])
+        lo, hi = window_bounds(ts, np.array([0, 3]), [0, 0, 0], [T0 - 600, T0 + 60, T0 + 500],
+                               [T0 - 1, T0 + 60, T0 + 900])
+        assert list(hi - lo) == [0, 1, 0]
+
+    @pytest.mark.parametrize('seed', [1, 2])
+    def test_matches_loop(self, seed):
+        rng = random.Random(seed)
+        tokens = [random_token(rng, rng.randint(0, 400)) for _ in range(60)]
+        ts, ohlcv, offsets = columns(tokens)
+
+        segments, starts, ends, min_candles = [], [], [], []
+        for seg in range(len(tokens)):
+            for _ in range(5):
+                start = T0 + rng.randint(-3600, 6 * 3600)
+                hours = rng.choice([1, 2, 4])
+                segments.append(seg)
+                starts.append(start)
+                ends.append(start + hours * 3600)
+                min_candles.append(hours * 60 * 0.8)
+
+        covered, died = window_checks(ts, *ohlcv, offsets, segments, starts, ends,
+                                      min_candles=np.array(min_candles), max_gap_seconds=600)
+        for k, seg in enumerate(segments):
+            assert (covered[k], died[k]) == loop_window_check(tokens[seg], starts[k], ends[k], min_candles[k])
+
+    def test_segment_offsets_on_two_keys(self):
+        mints = np.array(['a', 'a', 'a', 'b'], dtype=object)
+        chains = np.array(['base', 'solana', 'solana', 'solana'], dtype=object)
+        assert list(segment_offsets(mints, chains)) == [0, 1, 3, 4]
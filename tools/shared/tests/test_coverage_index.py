@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Tests for the candle coverage index.
+
+Range queries are checked against brute force over the candle timestamps.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+# Add workspace root to path
+workspace_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(workspace_root))
+
+from tools.shared.coverage_index import (
+    CoverageIndex,
+    CoverageRanges,
+    ensure_schema,
+    load_coverage_index,
+    open_coverage_index,
+    ranges_from_timestamps,
+    refresh_from_clickhouse,
+    save_ranges,
+)
+
+T0 = 1_735_689_600  # 2025-01-01T00:00:00Z
+
+
+def random_candles(rng: random.Random, interval: int, n: int):
+    """Candle timestamps on the interval grid with random gaps."""
+    ts = []
+    t = T0
+    for _ in range(n):
+        ts.append(t)
+        t += interval * (1 if rng.random() < 0.8 else rng.randint(2, 30))
+    return ts
+
+
+class FakeClickHouse:
+    """Serves the refresh query from an in-memory candle list."""
+
+    def __init__(self):
+        self.candles = []  # (chain, mint, interval_seconds, ts, ingested_at)
+        self.queries = []
+
+    def execute(self, sql):
+        self.queries.append(sql)
+        watermark = None
+        if 'ingested_at >= toDateTime(' in sql:
+            watermark = int(sql.split('ingested_at >= toDateTime(')[1].split(')')[0])
+        interval = int(sql.split('interval_seconds = ')[1].split()[0])
+        grouped = {}
+        for chain, mint, iv, ts, ingested in self.candles:
+            if iv != interval or (watermark is not None and ingested < watermark):
+                continue
+            entry = grouped.setdefault((chain.lower(), mint), [set(), 0])
+            entry[0].add(ts)
+            entry[1] = max(entry[1], ingested)
+        return [(chain, mint, sorted(ts), ingested) for (chain, mint), (ts, ingested) in grouped.items()]
+
+
+class TestCoverageRanges:
+    """Range arithmetic."""
+
+    def test_runs_from_timestamps(self):
+        starts, ends = ranges_from_timestamps([T0 + 120, T0, T0 + 60, T0 + 60, T0 + 600], 60)
+        assert list(zip(starts, ends)) == [(T0, T0 + 180), (T0 + 600, T0 + 660)]
+
+    def test_merge_touching_and_overlapping(self):
+        ranges = CoverageRanges(60, [T0, T0 + 600], [T0 + 120, T0 + 720])
+        ranges.add_ranges([T0 + 120, T0 + 660], [T0 + 240, T0 + 900])
+        assert list(ranges) == [(T0, T0 + 240), (T0 + 600, T0 + 900)]
+
+    @pytest.mark.parametrize('interval', [60, 300])
+    def test_queries_match_brute_force(self, interval):
+        rng = random.Random(interval)
+        candles = random_candles(rng, interval, 2000)
+        ranges = CoverageRanges(interval)
+        # Feed in shuffled chunks, as incremental ingests would
+        shuffled = candles[:]
+        rng.shuffle(shuffled)
+        for i in range(0, len(shuffled), 300):
+            ranges.add_timestamps(shuffled[i:i + 300])
+
+        last = candles[-1] + interval
+        for _ in range(300):
+            a = rng.randint(T0 - 5 * interval, last + 5 * interval)
+            b = a + rng.randint(0, 200 * interval)
+            covered = sum(max(0, min(b, t + interval) - max(a, t)) for t in candles)
+            assert ranges.covered_seconds(a, b) == covered
+            assert ranges.candle_count(a, b) == sum(1 for t in candles if a <= t <= b)
+
+            gaps = ranges.missing_ranges(a, b)
+            missing = sum(end - start for start, end in gaps)
+            assert missing == (b - a) - covered
+            for start, end in gaps:
+                assert ranges.covered_seconds(start, end) == 0
+
+    def test_fraction_bounds(self):
+        ranges = CoverageRanges(60, [T0], [T0 + 3600])
+        assert ranges.covered_fraction(T0, T0 + 3600) == 1.0
+        assert ranges.covered_fraction(T0 - 3600, T0 + 3600) == 0.5
+        assert ranges.covered_fraction(T0 + 7200, T0 + 9000) == 0.0
+        assert ranges.missing_ranges(T0 - 60, T0 + 3660) == [(T0 - 60, T0), (T0 + 3600, T0 + 3660)]
+
+
+class TestPersistence:
+    """DuckDB storage and incremental refresh."""
+
+    def test_save_and_load_filters(self):
+        con = duckdb.connect(':memory:')
+        ensure_schema(con)
+        index = CoverageIndex([60])
+        index.add_timestamps('Solana', 'MintA', '1m', [T0, T0 + 60])
+        index.add_timestamps('base', 'MintB', 60, [T0])
+        save_ranges(con, index)
+        con.execute("INSERT INTO ohlcv_coverage_index_state VALUES (60, 0, 2, 2, CURRENT_TIMESTAMP)")
+
+        loaded = load_coverage_index(con, '1m', chain='solana', mints=['MintA'])
+        assert loaded.is_indexed('1m')
+        assert list(loaded.get('solana', 'MintA', '1m')) == [(T0, T0 + 120)]
+        assert not loaded.get('base', 'MintB', '1m')
+        assert loaded.has_mint('MintA') and not loaded.has_mint('MintB')
+
+    def test_missing_tables_give_unindexed(self, tmp_path):
+        assert open_coverage_index(str(tmp_path / 'absent.duckdb')) is None
+        con = duckdb.connect(':memory:')
+        assert load_coverage_index(con).indexed_intervals == set()
+
+    def test_incremental_refresh_matches_full_rebuild(self, tmp_path):
+        ch = FakeClickHouse()
+        rng = random.Random(7)
+        for mint, ingested_at in (('MintA', 1000), ('MintB', 900)):
+            for ts in random_candles(rng, 60, 500):
+                ch.candles.append(('solana', mint, 60, ts, ingested_at))
+
+        db_path = str(tmp_path / 'index.duckdb')
+        con = duckdb.connect(db_path)
+        stats = refresh_from_clickhouse(con, ch, 'quantbot', '1m')
+        assert stats['tokens_updated'] == 2 and stats['watermark'] == 1000
+
+        # A later ingest backfills MintA and adds MintC
+        for ts in range(T0 - 3600, T0 + 36000, 60):
+            ch.candles.append(('solana', 'MintA', 60, ts, 2000))
+        ch.candles.append(('SOLANA', 'MintC', 60, T0, 2000))
+        stats = refresh_from_clickhouse(con, ch, 'quantbot', '1m')
+        assert stats['tokens_updated'] == 2
+        assert 'ingested_at >= toDateTime(1000)' in ch.queries[-1]
+        incremental = con.execute(
+            "SELECT * FROM ohlcv_coverage_ranges ORDER BY ALL").fetchall()
+
+        refresh_from_clickhouse(con, ch, 'quantbot', '1m', full=True)
+        assert con.execute("SELECT * FROM ohlcv_coverage_ranges ORDER BY ALL").fetchall() == incremental
+        con.close()
+
+        index = open_coverage_index(db_path, '1m')
+        assert index.covered_fraction('solana', 'MintA', '1m', T0 - 3600, T0 + 36000) == 1.0
+        assert index.candle_count('solana', 'MintC', '1m', T0, T0) == 1
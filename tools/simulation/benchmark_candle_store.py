@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+CandleStore.bulk_load Benchmark
+
+Loads a batch of candles into a store that already holds history and
+compares:
+- per-partition: the previous bulk_load, which ran the anti-join against a
+  partition's files twice per touched partition (COUNT, then COPY)
+- bulk_load: one anti-join over the touched partitions into a temp table,
+  then one COPY per partition from it
+
+Both start from identical copies of the store and must insert the same rows.
+
+Usage:
+    python3 tools/simulation/benchmark_candle_store.py --mints 5000 --candles 2000
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import duckdb
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from candle_store import CandleStore, mint_bucket
+
+T0 = 1_704_067_200
+
+
+def make_candles(con: duckdb.DuckDBPyConnection, name: str, mints: int, candles: int, offset: int) -> None:
+    """mints x candles 60s rows starting `offset` candles after T0."""
+    con.execute(f"""
+        CREATE OR REPLACE TABLE {name} AS
+        SELECT
+            'Mint' || m || 'pump' AS mint,
+            ({T0} + (c + {offset}) * 60)::INTEGER AS timestamp,
+            1.0 + c / 1000.0 AS open,
+            1.05 + c / 1000.0 AS high,
+            0.97 + c / 1000.0 AS low,
+            1.01 + c / 1000.0 AS close,
+            100.0 + c AS volume,
+            60 AS interval_seconds,
+            'bench' AS source
+        FROM range({mints}) t1(m), range({candles}) t2(c)
+    """)
+
+
+def per_partition_load(store: CandleStore, relation: str) -> int:
+    """The previous bulk_load write loop (stage and buckets as in bulk_load)."""
+    con = store.con
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _candle_stage AS
+        SELECT * FROM {relation}
+        QUALIFY row_number() OVER (PARTITION BY mint, timestamp, interval_seconds) = 1
+    """)
+    mints = [r[0] for r in con.execute("SELECT DISTINCT mint FROM _candle_stage").fetchall()]
+    con.execute("""
+        CREATE OR REPLACE TEMP TABLE _candle_buckets AS
+        SELECT UNNEST(?::TEXT[]) AS mint, UNNEST(?::INTEGER[]) AS mint_bucket
+    """, [mints, [mint_bucket(m, store.n_buckets) for m in mints]])
+    partitions = con.execute("""
+        SELECT DISTINCT s.interval_seconds, b.mint_bucket
+        FROM _candle_stage s JOIN _candle_buckets b USING (mint)
+        ORDER BY 1, 2
+    """).fetchall()
+
+    inserted = 0
+    for interval_seconds, bucket in partitions:
+        part_dir = store._partition_dir(interval_seconds, bucket)
+        existing = store._source_sql(sorted(str(p) for p in part_dir.glob("*.parquet")))
+        new_rows = f"""
+            SELECT s.mint, s.timestamp, s.open, s.high, s.low, s.close, s.volume, s.source
+            FROM _candle_stage s
+            JOIN _candle_buckets b USING (mint)
+            WHERE s.interval_seconds = {int(interval_seconds)}
+              AND b.mint_bucket = {int(bucket)}
+              AND NOT EXISTS (
+                  SELECT 1 FROM {existing} e
+                  WHERE e.mint = s.mint AND e.timestamp = s.timestamp
+              )
+        """
+        count = con.execute(f"SELECT COUNT(*) FROM ({new_rows})").fetchone()[0]
+        if not count:
+            continue
+        part_dir.mkdir(parents=True, exist_ok=True)
+        target = part_dir / f"part_{uuid.uuid4().hex}.parquet"
+        con.execute(f"COPY ({new_rows} ORDER BY s.mint, s.timestamp) TO '{target}' (FORMAT PARQUET)")
+        inserted += count
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CandleStore.bulk_load")
+    parser.add_argument("--mints", type=int, default=5000)
+    parser.add_argument("--candles", type=int, default=2000, help="Existing candles per mint")
+    parser.add_argument("--new-candles", type=int, default=500,
+                        help="Candles per mint in the load; half overlap existing rows")
+    parser.add_argument("--buckets", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        con = duckdb.connect()
+        seed_root = Path(tmp) / "seed"
+        print(f"Seeding {args.mints * args.candles:,} existing rows...")
+        make_candles(con, "history", args.mints, args.candles, 0)
+        CandleStore(con, str(seed_root), n_buckets=args.buckets).bulk_load("history")
+        make_candles(con, "batch", args.mints, args.new_candles, args.candles - args.new_candles // 2)
+
+        results = {}
+        for name in ("per-partition", "bulk_load"):
+            root = Path(tmp) / name
+            shutil.copytree(seed_root, root)
+            store = CandleStore(con, str(root), n_buckets=args.buckets)
+            start = time.perf_counter()
+            if name == "bulk_load":
+                inserted = store.bulk_load("batch")["inserted_rows"]
+            else:
+                inserted = per_partition_load(store, "batch")
+            results[name] = (time.perf_counter() - start, inserted)
+
+        print(f"{'mode':<15} {'seconds':>9} {'inserted':>12}")
+        for name, (seconds, inserted) in results.items():
+            print(f"{name:<15} {seconds:>9.2f} {inserted:>12,}")
+        if len({inserted for _, inserted in results.values()}) != 1:
+            print("inserted row counts differ", file=sys.stderr)
+            sys.exit(1)
+        old, new = results["per-partition"][0], results["bulk_load"][0]
+        print(f"speedup: {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
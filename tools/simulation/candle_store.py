@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Partitioned Parquet candle store for the DuckDB simulator.
+
+Alternative to the ohlcv_candles_d table for bulk candle data. Candles are
+stored as Parquet under
+
+    <root>/interval_seconds=<n>/mint_bucket=<b>/part_<id>.parquet
+
+with each file sorted by (mint, timestamp). mint_bucket is a stable hash of
+the mint (md5, mod n_buckets), so a lookup for one mint reads one bucket
+directory. There is no primary key or ART index: bulk_load dedupes incoming
+rows with one anti-join against the files of the partitions it touches, then
+appends one sorted file per partition. compact() merges a partition's files back into one.
+
+Rows have the ohlcv_candles_d columns:
+    mint, timestamp (unix seconds), open, high, low, close, volume,
+    interval_seconds, source
+
+Usage:
+    # Import an existing ohlcv_candles_d table
+    python candle_store.py --root data/candles --import-duckdb data/sim.duckdb
+
+    # Load Parquet files with the same columns
+    python candle_store.py --root data/candles --load 'exports/candles_*.parquet'
+"""
+
+import argparse
+import hashlib
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import duckdb
+
+DEFAULT_BUCKETS = 64
+
+CANDLE_COLUMNS = (
+    "mint", "timestamp", "open", "high", "low", "close", "volume", "interval_seconds", "source",
+)
+
+# Columns stored in the files (partition columns live in the path)
+_FILE_COLUMNS = "mint, timestamp, open, high, low, close, volume, source"
+
+_EMPTY_CANDLES_SQL = """
+SELECT
+    NULL::TEXT AS mint, NULL::INTEGER AS timestamp,
+    NULL::DOUBLE AS open, NULL::DOUBLE AS high, NULL::DOUBLE AS low,
+    NULL::DOUBLE AS close, NULL::DOUBLE AS volume,
+    NULL::INTEGER AS interval_seconds, NULL::TEXT AS source
+WHERE false
+"""
+
+
+def mint_bucket(mint: str, n_buckets: int = DEFAULT_BUCKETS) -> int:
+    """Stable partition bucket for a mint."""
+    return int(hashlib.md5(mint.encode()).hexdigest()[:8], 16) % n_buckets
+
+
+class CandleStore:
+    """Partitioned, index-free Parquet candle store."""
+
+    def __init__(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        root: str,
+        n_buckets: int = DEFAULT_BUCKETS,
+    ):
+        self.con = con
+        self.root = Path(root)
+        self.n_buckets = n_buckets
+        self._check_layout()
+
+    def _check_layout(self) -> None:
+        """Persist n_buckets; reopening with a different count would misroute mints."""
+        meta_path = self.root / "_store.json"
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            if meta.get("n_buckets") != self.n_buckets:
+                raise ValueError(
+                    f"Candle store {self.root} uses {meta.get('n_buckets')} buckets, "
+                    f"not {self.n_buckets}"
+                )
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta_path.write_text(json.dumps({"n_buckets": self.n_buckets}))
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _partition_dir(self, interval_seconds: int, bucket: int) -> Path:
+        return self.root / f"interval_seconds={int(interval_seconds)}" / f"mint_bucket={int(bucket)}"
+
+    def _files(self, buckets: Optional[Iterable[int]] = None) -> List[str]:
+        """Parquet files of all partitions, or of the given buckets only."""
+        if buckets is None:
+            return sorted(str(p) for p in self.root.glob("interval_seconds=*/mint_bucket=*/*.parquet"))
+        files: List[str] = []
+        for bucket in sorted(set(buckets)):
+            files.extend(str(p) for p in self.root.glob(f"interval_seconds=*/mint_bucket={bucket}/*.parquet"))
+        return sorted(files)
+
+    def _source_sql(self, files: Sequence[str]) -> str:
+        """SQL relation over the given files (empty relation if none)."""
+        if not files:
+            return f"({_EMPTY_CANDLES_SQL})"
+        file_list = ", ".join("'" + f.replace("'", "''") + "'" for f in files)
+        return f"""(
+            SELECT {_FILE_COLUMNS}, interval_seconds
+            FROM read_parquet([{file_list}], hive_partitioning = true, union_by_name = true)
+        )"""
+
+    def create_view(self, name: str = "ohlcv_candles_pq") -> str:
+        """
+        (Re)create a view over the whole store with the ohlcv_candles_d columns.
+
+        The view lists files when created; call again after bulk_load/compact.
+        """
+        self.con.execute(f"""
+            CREATE OR REPLACE VIEW {name} AS
+            SELECT {", ".join(CANDLE_COLUMNS)} FROM {self._source_sql(self._files())}
+        """)
+        return name
+
+    def fetch(
+        self,
+        mint: str,
+        start_ts: int,
+        end_ts: int,
+        interval_seconds: Optional[int] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Candles of one mint in [start_ts, end_ts], reading only its bucket.
+
+        Returns:
+            (timestamp, open, high, low, close, volume, interval_seconds) rows
+            ordered by timestamp
+        """
+        rows = self.fetch_windows([(mint, start_ts, end_ts)], interval_seconds)
+        return rows[0]
+
+    def fetch_windows(
+        self,
+        windows: Sequence[Tuple[str, int, int]],
+        interval_seconds: Optional[int] = None,
+    ) -> List[List[Tuple[Any, ...]]]:
+        """
+        Candles for many (mint, start_ts, end_ts) windows in one query.
+
+        Only the buckets of the requested mints are read.
+
+        Returns:
+            One row list per window (same row shape as fetch)
+        """
+        if not windows:
+            return []
+        files = self._files(mint_bucket(mint, self.n_buckets) for mint, _, _ in windows)
+        interval_filter = "AND c.interval_seconds = ?" if interval_seconds is not None else ""
+        params: List[Any] = [
+            list(range(len(windows))),
+            [w[0] for w in windows],
+            [int(w[1]) for w in windows],
+            [int(w[2]) for w in windows],
+        ]
+        if interval_seconds is not None:
+            params.append(int(interval_seconds))
+
+        rows = self.con.execute(f"""
+            WITH windows AS (
+                SELECT
+                    UNNEST(?::INTEGER[]) AS idx,
+                    UNNEST(?::TEXT[]) AS mint,
+                    UNNEST(?::BIGINT[]) AS start_ts,
+                    UNNEST(?::BIGINT[]) AS end_ts
+            )
+            SELECT w.idx, c.timestamp, c.open, c.high, c.low, c.close, c.volume, c.interval_seconds
+            FROM {self._source_sql(files)} c
+            JOIN windows w
+              ON c.mint = w.mint
+             AND c.timestamp >= w.start_ts
+             AND c.timestamp <= w.end_ts
+            WHERE true {interval_filter}
+            ORDER BY w.idx, c.timestamp
+        """, params).fetchall()
+
+        result: List[List[Tuple[Any, ...]]] = [[] for _ in windows]
+        for row in rows:
+            result[row[0]].append(row[1:])
+        return result
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def bulk_load(self, relation_sql: str, source: Optional[str] = None) -> Dict[str, int]:
+        """
+        Append candles from any DuckDB relation (table name, view, or query).
+
+        Incoming rows are deduped on (mint, timestamp, interval_seconds), first
+        within the input and then by a single anti-join against the files of
+        the partitions they fall in; existing rows win. The surviving rows are
+        staged once in a temp table, and each partition with new rows gets one
+        new file sorted by (mint, timestamp).
+
+        Args:
+            relation_sql: Table/view name or a parenthesized SELECT with the
+                candle columns (source is optional)
+            source: Value for the source column when the input has none
+
+        Returns:
+            {"input_rows", "inserted_rows", "partitions"}
+        """
+        con = self.con
+        con.execute(f"CREATE OR REPLACE TEMP VIEW _candle_input AS SELECT * FROM {relation_sql}")
+        input_cols = {d[0] for d in con.execute("SELECT * FROM _candle_input LIMIT 0").description}
+        source_sql = "source" if "source" in input_cols else "?::TEXT"
+        source_params = [] if "source" in input_cols else [source]
+
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE _candle_stage AS
+            SELECT
+                mint::TEXT AS mint,
+                timestamp::INTEGER AS timestamp,
+                open::DOUBLE AS open,
+                high::DOUBLE AS high,
+                low::DOUBLE AS low,
+                close::DOUBLE AS close,
+                volume::DOUBLE AS volume,
+                interval_seconds::INTEGER AS interval_seconds,
+                {source_sql} AS source
+            FROM _candle_input
+            QUALIFY row_number() OVER (PARTITION BY mint, timestamp, interval_seconds) = 1
+        """, source_params)
+        input_rows = con.execute("SELECT COUNT(*) FROM _candle_stage").fetchone()[0]
+
+        mints = [r[0] for r in con.execute("SELECT DISTINCT mint FROM _candle_stage").fetchall()]
+        con.execute("""
+            CREATE OR REPLACE TEMP TABLE _candle_buckets AS
+            SELECT UNNEST(?::TEXT[]) AS mint, UNNEST(?::INTEGER[]) AS mint_bucket
+        """, [mints, [mint_bucket(m, self.n_buckets) for m in mints]])
+
+        partitions = con.execute("""
+            SELECT DISTINCT s.interval_seconds, b.mint_bucket
+            FROM _candle_stage s JOIN _candle_buckets b USING (mint)
+            ORDER BY 1, 2
+        """).fetchall()
+        files = sorted(
+            str(p)
+            for interval_seconds, bucket in partitions
+            for p in self._partition_dir(interval_seconds, bucket).glob("*.parquet")
+        )
+
+        # New rows of every touched partition: one anti-join over their files
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE _candle_new AS
+            SELECT s.*, b.mint_bucket
+            FROM _candle_stage s
+            JOIN _candle_buckets b USING (mint)
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {self._source_sql(files)} e
+                WHERE e.mint = s.mint
+                  AND e.timestamp = s.timestamp
+                  AND e.interval_seconds = s.interval_seconds
+            )
+            ORDER BY s.interval_seconds, b.mint_bucket, s.mint, s.timestamp
+        """)
+        new_counts = con.execute("""
+            SELECT interval_seconds, mint_bucket, COUNT(*)
+            FROM _candle_new
+            GROUP BY ALL
+            ORDER BY 1, 2
+        """).fetchall()
+
+        inserted = 0
+        for interval_seconds, bucket, count in new_counts:
+            part_dir = self._partition_dir(interval_seconds, bucket)
+            part_dir.mkdir(parents=True, exist_ok=True)
+            target = part_dir / f"part_{uuid.uuid4().hex}.parquet"
+            con.execute(f"""
+                COPY (
+                    SELECT {_FILE_COLUMNS}
+                    FROM _candle_new
+                    WHERE interval_seconds = {int(interval_seconds)}
+                      AND mint_bucket = {int(bucket)}
+                    ORDER BY mint, timestamp
+                ) TO '{target}' (FORMAT PARQUET)
+            """)
+            inserted += count
+
+        con.execute("DROP TABLE IF EXISTS _candle_new")
+        con.execute("DROP TABLE IF EXISTS _candle_stage")
+        con.execute("DROP TABLE IF EXISTS _candle_buckets")
+        con.execute("DROP VIEW IF EXISTS _candle_input")
+        return {"input_rows": int(input_rows), "inserted_rows": int(inserted), "partitions": len(new_counts)}
+
+    def import_table(self, table: str = "ohlcv_candles_d") -> Dict[str, int]:
+        """Bulk load every row of an ohlcv_candles_d-shaped table."""
+        return self.bulk_load(table)
+
+    def compact(self) -> int:
+        """
+        Merge each multi-file partition into one file sorted by (mint, timestamp).
+
+        Returns:
+            Number of partitions compacted
+        """
+        compacted = 0
+        for part_dir in sorted(self.root.glob("interval_seconds=*/mint_bucket=*")):
+            files = sorted(str(p) for p in part_dir.glob("*.parquet"))
+            if len(files) < 2:
+                continue
+            file_list = ", ".join("'" + f.replace("'", "''") + "'" for f in files)
+            target = part_dir / f"part_{uuid.uuid4().hex}.parquet"
+            tmp = part_dir / f".{target.name}.tmp"
+            self.con.execute(f"""
+                COPY (
+                    SELECT {_FILE_COLUMNS}
+                    FROM read_parquet([{file_list}], hive_partitioning = false, union_by_name = true)
+                    ORDER BY mint, timestamp
+                ) TO '{tmp}' (FORMAT PARQUET)
+            """)
+            tmp.rename(target)
+            for f in files:
+                Path(f).unlink()
+            compacted += 1
+        return compacted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Partitioned Parquet candle store",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--root", required=True, help="Store root directory")
+    parser.add_argument("--buckets", type=int, default=DEFAULT_BUCKETS, help="Mint buckets per interval")
+    parser.add_argument("--import-duckdb", help="DuckDB file whose ohlcv_candles_d table to import")
+    parser.add_argument("--load", help="Parquet file or glob with candle columns to load")
+    parser.add_argument("--source", help="source value for rows without one")
+    parser.add_argument("--compact", action="store_true", help="Merge partition files after loading")
+    args = parser.parse_args()
+
+    con = duckdb.connect()
+    store = CandleStore(con, args.root, args.buckets)
+    stats: Dict[str, Any] = {}
+    if args.import_duckdb:
+        path = args.import_duckdb.replace("'", "''")
+        con.execute(f"ATTACH '{path}' AS src (READ_ONLY)")
+        stats["import"] = store.import_table("src.ohlcv_candles_d")
+    if args.load:
+        path = args.load.replace("'", "''")
+        stats["load"] = store.bulk_load(f"read_parquet('{path}')", source=args.source)
+    if args.compact:
+        stats["compacted_partitions"] = store.compact()
+    con.close()
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
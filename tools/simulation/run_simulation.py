@@ -9,6 +9,7 @@ import sys
 import duckdb
 from datetime import datetime
 from simulator import DuckDBSimulator, StrategyConfig
+from candle_store import DEFAULT_BUCKETS, CandleStore
 
 def main():
     # Read config from stdin (JSON)
@@ -31,8 +32,15 @@ def main():
     from tools.shared.duckdb_adapter import get_write_connection
     try:
         with get_write_connection(config['duckdb_path']) as con:
-            # Create simulator
-            simulator = DuckDBSimulator(con)
+            # Create simulator (optionally reading candles from a Parquet candle store)
+            candle_store = None
+            if config.get('candle_store'):
+                candle_store = CandleStore(
+                    con,
+                    config['candle_store'],
+                    config.get('candle_store_buckets', DEFAULT_BUCKETS),
+                )
+            simulator = DuckDBSimulator(con, candle_store)
             
             # Parse strategy config
             try:
@@ -58,7 +66,9 @@ def main():
                         strategy,
                         mints,
                         alert_timestamps,
-                        config.get('initial_capital', 1000.0)
+                        config.get('initial_capital', 1000.0),
+                        config.get('lookback_minutes', 260),
+                        config.get('lookforward_minutes', 1440)
                     )
                 else:
                     # Single simulation
@@ -15,10 +15,12 @@ from pathlib import Path
 # Handle both relative and absolute imports
 try:
     from .sql_functions import setup_simulation_schema
+    from .candle_store import CandleStore
 except ImportError:
     # Fallback for when run as script (not as package)
     sys.path.insert(0, str(Path(__file__).parent))
     from sql_functions import setup_simulation_schema
+    from candle_store import CandleStore
 
 # Import canonical contracts
 sys.path.insert(0, str(Path(__file__).parent.parent / 'telegram' / 'simulation'))
@@ -77,8 +79,19 @@ class SimulationEvent:
 class DuckDBSimulator:
     """Run simulations directly in DuckDB using SQL."""
     
-    def __init__(self, con: duckdb.DuckDBPyConnection):
+    def __init__(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        candle_store: Optional[CandleStore] = None,
+    ):
+        """
+        Args:
+            con: DuckDB connection
+            candle_store: Read candles from this partitioned Parquet store
+                instead of the ohlcv_candles_d table
+        """
         self.con = con
+        self.candle_store = candle_store
         setup_simulation_schema(con)
     
     def run_simulation(
@@ -88,11 +101,14 @@ class DuckDBSimulator:
         alert_timestamp: datetime,
         initial_capital: float = 1000.0,
         lookback_minutes: int = 260,  # Pre-alert window
-        lookforward_minutes: int = 1440  # Post-alert window
+        lookforward_minutes: int = 1440,  # Post-alert window
+        candles: Optional[List[Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
         """
         Run a complete simulation for a single token/alert.
         
+        candles: Pre-fetched window candles (batch_simulate); fetched if None.
+        
         Returns:
             {
                 'run_id': str,
@@ -107,9 +123,10 @@ class DuckDBSimulator:
         """
         try:
             # 1. Fetch candles for time window
-            candles = self._fetch_candles(
-                mint, alert_timestamp, lookback_minutes, lookforward_minutes
-            )
+            if candles is None:
+                candles = self._fetch_candles(
+                    mint, alert_timestamp, lookback_minutes, lookforward_minutes
+                )
             
             if not candles:
                 return {
@@ -166,13 +183,37 @@ class DuckDBSimulator:
         strategy: StrategyConfig,
         mints: List[str],
         alert_timestamps: List[datetime],
-        initial_capital: float = 1000.0
+        initial_capital: float = 1000.0,
+        lookback_minutes: int = 260,
+        lookforward_minutes: int = 1440
     ) -> List[Dict[str, Any]]:
-        """Run simulations for multiple tokens in parallel."""
+        """
+        Run simulations for multiple tokens.
+        
+        Candles for all windows are fetched in one query up front.
+        """
+        windows = [
+            self._candle_window(alert_ts, lookback_minutes, lookforward_minutes)
+            for alert_ts in alert_timestamps
+        ]
+        try:
+            prefetched = self._fetch_candle_windows(
+                [(mint, start_ts, end_ts) for mint, (start_ts, end_ts) in zip(mints, windows)]
+            )
+        except Exception as e:
+            logger.warning(f"Batch candle fetch failed, fetching per simulation: {e}")
+            prefetched = [None] * len(mints)
+        
         results = []
-        for mint, alert_ts in zip(mints, alert_timestamps):
+        for mint, alert_ts, candles in zip(mints, alert_timestamps, prefetched):
             try:
-                result = self.run_simulation(strategy, mint, alert_ts, initial_capital)
+                if candles == []:
+                    # No OHLCV rows: per-call fetch applies the user_calls_d fallback
+                    candles = None
+                result = self.run_simulation(
+                    strategy, mint, alert_ts, initial_capital,
+                    lookback_minutes, lookforward_minutes, candles=candles
+                )
                 results.append(result)
             except Exception as e:
                 logger.error(f"Simulation failed for {mint} at {alert_ts}: {e}")
@@ -183,6 +224,67 @@ class DuckDBSimulator:
                 })
         return results
     
+    @staticmethod
+    def _candle_window(
+        alert_timestamp: datetime,
+        lookback_minutes: int,
+        lookforward_minutes: int
+    ) -> Tuple[int, int]:
+        """Unix-second [start, end] of a simulation window."""
+        start_time = alert_timestamp - timedelta(minutes=lookback_minutes)
+        end_time = alert_timestamp + timedelta(minutes=lookforward_minutes)
+        return int(start_time.timestamp()), int(end_time.timestamp())
+    
+    @staticmethod
+    def _candle_rows_to_dicts(rows: List[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(row[0]),
+                'open': float(row[1]),
+                'high': float(row[2]),
+                'low': float(row[3]),
+                'close': float(row[4]),
+                'volume': float(row[5]),
+                'interval_seconds': int(row[6])
+            }
+            for row in rows
+        ]
+    
+    def _fetch_candle_windows(
+        self,
+        windows: List[Tuple[str, int, int]]
+    ) -> List[List[Dict[str, Any]]]:
+        """OHLCV candles for many (mint, start_ts, end_ts) windows in one query."""
+        if self.candle_store is not None:
+            rows_per_window = self.candle_store.fetch_windows(windows)
+        else:
+            rows_per_window = [[] for _ in windows]
+            if windows:
+                rows = self.con.execute("""
+                    WITH windows AS (
+                        SELECT
+                            UNNEST(?::INTEGER[]) AS idx,
+                            UNNEST(?::TEXT[]) AS mint,
+                            UNNEST(?::BIGINT[]) AS start_ts,
+                            UNNEST(?::BIGINT[]) AS end_ts
+                    )
+                    SELECT w.idx, c.timestamp, c.open, c.high, c.low, c.close, c.volume, c.interval_seconds
+                    FROM ohlcv_candles_d c
+                    JOIN windows w
+                      ON c.mint = w.mint
+                     AND c.timestamp >= w.start_ts
+                     AND c.timestamp <= w.end_ts
+                    ORDER BY w.idx, c.timestamp
+                """, [
+                    list(range(len(windows))),
+                    [w[0] for w in windows],
+                    [w[1] for w in windows],
+                    [w[2] for w in windows],
+                ]).fetchall()
+                for row in rows:
+                    rows_per_window[row[0]].append(row[1:])
+        return [self._candle_rows_to_dicts(rows) for rows in rows_per_window]
+    
     def _fetch_candles(
         self,
         mint: str,
@@ -197,47 +299,38 @@ class DuckDBSimulator:
         OHLCV data must be pre-ingested by the OHLCV ingestion job before simulation runs.
         
         Data sources (in order):
-        1. ohlcv_candles_d table (primary) - populated by OHLCV ingestion job
+        1. candle_store if set, else ohlcv_candles_d table (primary) - populated by OHLCV ingestion job
         2. user_calls_d table (fallback) - creates single candle from call price if OHLCV not available
         
         Returns empty list if no data found (simulation will fail gracefully).
         """
-        start_time = alert_timestamp - timedelta(minutes=lookback_minutes)
-        end_time = alert_timestamp + timedelta(minutes=lookforward_minutes)
+        start_ts, end_ts = self._candle_window(
+            alert_timestamp, lookback_minutes, lookforward_minutes
+        )
         
-        start_ts = int(start_time.timestamp())
-        end_ts = int(end_time.timestamp())
-        
-        # Primary source: ohlcv_candles_d table (populated by OHLCV ingestion job)
-        result = self.con.execute("""
-            SELECT 
-                timestamp,
-                open,
-                high,
-                low,
-                close,
-                volume,
-                interval_seconds
-            FROM ohlcv_candles_d
-            WHERE mint = ? 
-              AND timestamp >= ? 
-              AND timestamp <= ?
-            ORDER BY timestamp ASC
-        """, [mint, start_ts, end_ts]).fetchall()
+        # Primary source: candle store if configured, else ohlcv_candles_d table
+        # (populated by OHLCV ingestion job)
+        if self.candle_store is not None:
+            result = self.candle_store.fetch(mint, start_ts, end_ts)
+        else:
+            result = self.con.execute("""
+                SELECT 
+                    timestamp,
+                    open,
+                    high,
+                    low,
+                    close,
+                    volume,
+                    interval_seconds
+                FROM ohlcv_candles_d
+                WHERE mint = ? 
+                  AND timestamp >= ? 
+                  AND timestamp <= ?
+                ORDER BY timestamp ASC
+            """, [mint, start_ts, end_ts]).fetchall()
         
         if result:
-            return [
-                {
-                    'timestamp': datetime.fromtimestamp(row[0]),
-                    'open': float(row[1]),
-                    'high': float(row[2]),
-                    'low': float(row[3]),
-                    'close': float(row[4]),
-                    'volume': float(row[5]),
-                    'interval_seconds': int(row[6])
-                }
-                for row in result
-            ]
+            return self._candle_rows_to_dicts(result)
         
         # Fallback: try to get price from user_calls_d (still read-only, no API calls)
         # This creates a minimal single candle if OHLCV data not available
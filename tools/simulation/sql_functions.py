@@ -84,6 +84,8 @@ CREATE TABLE IF NOT EXISTS simulation_events (
 );
 
 -- OHLCV candles table (if not exists, create view from existing data)
+-- The primary key already serves (mint, timestamp) lookups, so there is no
+-- secondary index. For bulk candle data use candle_store.CandleStore.
 CREATE TABLE IF NOT EXISTS ohlcv_candles_d (
   mint TEXT NOT NULL,
   timestamp INTEGER NOT NULL,  -- Unix timestamp in seconds
@@ -103,7 +105,6 @@ CREATE INDEX IF NOT EXISTS idx_simulation_runs_mint ON simulation_runs(mint);
 CREATE INDEX IF NOT EXISTS idx_simulation_runs_alert_timestamp ON simulation_runs(alert_timestamp);
 CREATE INDEX IF NOT EXISTS idx_simulation_runs_caller ON simulation_runs(caller_name);
 CREATE INDEX IF NOT EXISTS idx_simulation_events_run ON simulation_events(run_id);
-CREATE INDEX IF NOT EXISTS idx_ohlcv_mint_timestamp ON ohlcv_candles_d(mint, timestamp);
 CREATE INDEX IF NOT EXISTS idx_strategy_config_strategy_id ON strategy_config(strategy_id);
 CREATE INDEX IF NOT EXISTS idx_run_strategies_used_config ON run_strategies_used(strategy_config_id);
 """
@@ -0,0 +1,178 @@
+"""
+Tests for the partitioned Parquet candle store and its use by DuckDBSimulator.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from candle_store import CandleStore, mint_bucket
+from simulator import DuckDBSimulator, StrategyConfig
+
+T0 = 1_704_110_400  # 2024-01-01 12:00:00 UTC
+MINTS = [f"Mint{i:03d}pump" for i in range(12)]
+
+
+def candle_rows(mint, start, count, interval=60, price=1.0):
+    rows = []
+    for i in range(count):
+        p = price * (1 + 0.01 * i)
+        rows.append((mint, start + i * interval, p, p * 1.05, p * 0.97, p * 1.01, 100.0 + i, interval, "test"))
+    return rows
+
+
+@pytest.fixture
+def con():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE input_candles (
+            mint TEXT, timestamp INTEGER, open DOUBLE, high DOUBLE, low DOUBLE,
+            close DOUBLE, volume DOUBLE, interval_seconds INTEGER, source TEXT
+        )
+    """)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def store(con, tmp_path):
+    return CandleStore(con, str(tmp_path / "candles"), n_buckets=4)
+
+
+def insert(con, rows):
+    con.executemany("INSERT INTO input_candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def test_bulk_load_partitions_and_sorts(con, store):
+    rows = []
+    for j, mint in enumerate(MINTS):
+        rows += candle_rows(mint, T0, 30, price=1 + j)
+        rows += candle_rows(mint, T0, 10, interval=300, price=1 + j)
+    insert(con, list(reversed(rows)))
+
+    stats = store.bulk_load("input_candles")
+    assert stats["input_rows"] == stats["inserted_rows"] == len(rows)
+
+    for part in (store.root).glob("interval_seconds=*/mint_bucket=*"):
+        bucket = int(part.name.split("=")[1])
+        files = list(part.glob("*.parquet"))
+        assert len(files) == 1
+        stored = con.execute(f"SELECT mint, timestamp FROM read_parquet('{files[0]}')").fetchall()
+        assert stored == sorted(stored)
+        assert all(mint_bucket(m, 4) == bucket for m, _ in stored)
+
+
+def test_bulk_load_dedupes_against_existing_rows(con, store):
+    insert(con, candle_rows(MINTS[0], T0, 20))
+    store.bulk_load("input_candles")
+
+    # Overlapping reload with different prices, plus an in-batch duplicate
+    con.execute("DELETE FROM input_candles")
+    overlap = candle_rows(MINTS[0], T0 + 10 * 60, 20, price=9.0)
+    insert(con, overlap + overlap[:1])
+    stats = store.bulk_load("input_candles")
+
+    assert stats["input_rows"] == 20
+    assert stats["inserted_rows"] == 10
+    rows = store.fetch(MINTS[0], T0, T0 + 3600)
+    assert [r[0] for r in rows] == [T0 + i * 60 for i in range(30)]
+    # Existing rows win
+    assert rows[10][1] == pytest.approx(1.0 * 1.10)
+
+
+def test_bulk_load_dedupes_per_interval_in_one_pass(con, store):
+    insert(con, candle_rows(MINTS[0], T0, 20) + candle_rows(MINTS[1], T0, 20))
+    store.bulk_load("input_candles")
+
+    # Same timestamps at another interval are new rows; MINTS[1] is a full repeat
+    con.execute("DELETE FROM input_candles")
+    insert(con, candle_rows(MINTS[0], T0, 20, interval=300) + candle_rows(MINTS[1], T0, 20))
+    stats = store.bulk_load("input_candles")
+
+    assert stats == {"input_rows": 40, "inserted_rows": 20, "partitions": 1}
+    assert len(store.fetch(MINTS[0], T0, T0 + 20 * 300)) == 40
+    assert len(store.fetch(MINTS[1], T0, T0 + 20 * 300)) == 20
+    assert con.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name LIKE '_candle_%'"
+    ).fetchone()[0] == 0
+
+
+def test_fetch_matches_table_and_view(con, store):
+    rows = []
+    for j, mint in enumerate(MINTS):
+        rows += candle_rows(mint, T0 + j * 120, 40, price=1 + j)
+    insert(con, rows)
+    store.bulk_load("input_candles")
+    store.compact()
+
+    view = store.create_view()
+    assert con.execute(f"SELECT COUNT(*) FROM {view}").fetchone()[0] == len(rows)
+
+    windows = [(mint, T0 + 300, T0 + 1800) for mint in MINTS] + [("missing", T0, T0 + 60)]
+    batched = store.fetch_windows(windows)
+    for (mint, start, end), got in zip(windows, batched):
+        expected = con.execute("""
+            SELECT timestamp, open, high, low, close, volume, interval_seconds
+            FROM input_candles WHERE mint = ? AND timestamp BETWEEN ? AND ?
+            ORDER BY timestamp
+        """, [mint, start, end]).fetchall()
+        assert got == expected
+        assert store.fetch(mint, start, end) == expected
+
+
+def test_store_rejects_different_bucket_count(con, store):
+    with pytest.raises(ValueError):
+        CandleStore(con, str(store.root), n_buckets=8)
+
+
+def test_compact_merges_partition_files(con, store):
+    for i in range(3):
+        con.execute("DELETE FROM input_candles")
+        insert(con, candle_rows(MINTS[0], T0 + i * 600, 10))
+        store.bulk_load("input_candles")
+    part = next(store.root.glob("interval_seconds=60/mint_bucket=*"))
+    assert len(list(part.glob("*.parquet"))) == 3
+
+    assert store.compact() == 1
+    files = list(part.glob("*.parquet"))
+    assert len(files) == 1
+    stored = con.execute(f"SELECT timestamp FROM read_parquet('{files[0]}')").fetchall()
+    assert [r[0] for r in stored] == [T0 + i * 60 for i in range(30)]
+
+
+def test_simulator_batch_with_store_matches_table(con, store, tmp_path):
+    rows = []
+    for j, mint in enumerate(MINTS[:5]):
+        rows += candle_rows(mint, T0 - 3600, 200, price=1 + j)
+    insert(con, rows)
+    store.bulk_load("input_candles")
+
+    strategy = StrategyConfig(
+        strategy_id="pt2",
+        name="PT 1.5x",
+        entry_type="immediate",
+        profit_targets=[{"target": 1.5, "percent": 1.0}],
+        stop_loss_pct=0.3,
+    )
+    alerts = [datetime.fromtimestamp(T0)] * 5
+
+    table_con = duckdb.connect(str(tmp_path / "table.duckdb"))
+    DuckDBSimulator(table_con)
+    table_con.executemany(
+        "INSERT INTO ohlcv_candles_d VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+    )
+    from_table = DuckDBSimulator(table_con).batch_simulate(strategy, MINTS[:5], alerts)
+    table_con.close()
+
+    from_store = DuckDBSimulator(con, store).batch_simulate(strategy, MINTS[:5], alerts)
+
+    def comparable(result):
+        return {k: v for k, v in result.items() if k != "run_id"}
+
+    assert [comparable(r) for r in from_store] == [comparable(r) for r in from_table]
+    assert all("error" not in r for r in from_store)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Direct SQL Result Transport Benchmark
+
+Runs one query through duckdb_direct_sql.py as the TypeScript client does
+(one subprocess, result on stdout) and compares:
+- query_sql: fetchall() + one JSON document
+- stream_sql --format ndjson: size-bounded {"rows": ...} lines
+- stream_sql --format arrow: Arrow IPC record batches
+- with --page-rows, stream_sql ndjson paged: one process per page of
+  --page-rows rows, following the trailer cursor (keyset paging on id)
+
+Reports wall time, time to first chunk, stdout bytes and peak child RSS.
+
+Usage:
+    python3 tools/storage/benchmark_direct_sql.py --rows 10000000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+
+SCRIPT = Path(__file__).parent / "duckdb_direct_sql.py"
+
+
+def make_db(path: str, rows: int) -> None:
+    con = duckdb.connect(path)
+    con.execute(f"""
+        CREATE TABLE candles AS
+        SELECT
+            range AS id,
+            'mint_' || (range % 5000) AS mint,
+            TIMESTAMP '2025-01-01' + to_seconds(range * 60) AS ts,
+            1.0 + (range % 997) / 1000.0 AS open,
+            1.1 + (range % 991) / 1000.0 AS high,
+            0.9 + (range % 983) / 1000.0 AS low,
+            1.0 + (range % 977) / 1000.0 AS close,
+            (range % 10007) * 1.5 AS volume
+        FROM range({rows})
+    """)
+    con.close()
+
+
+def run(args: list) -> dict:
+    """Run the script, drain stdout, return timings and peak RSS"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(SCRIPT), *args], stdout=subprocess.PIPE)
+    first = None
+    total = 0
+    last = b""
+    while True:
+        data = proc.stdout.read1(1 << 20)
+        if not data:
+            break
+        if first is None and total + len(data) > 0 and (total > 0 or b"\n" in data):
+            first = time.perf_counter() - start
+        total += len(data)
+        last = (last + data)[-65536:]
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "seconds": time.perf_counter() - start,
+        "first_chunk_s": first,
+        "bytes": total,
+        "peak_rss_mb": usage.ru_maxrss / 1024,
+        "ok": proc.returncode == 0,
+        "tail": last if total else b"",
+    }
+
+
+def run_paged(args: list, page_rows: int) -> dict:
+    """Page through the query with --max-rows/--cursor, one process per page"""
+    start = time.perf_counter()
+    cursor = None
+    totals = {"bytes": 0, "peak_rss_mb": 0.0, "ok": True, "first_chunk_s": None}
+    while True:
+        page_args = args + ["--max-rows", str(page_rows), "--page-key", "id"]
+        if cursor:
+            page_args += ["--cursor", cursor]
+        r = run(page_args)
+        if totals["first_chunk_s"] is None:
+            totals["first_chunk_s"] = r["first_chunk_s"]
+        totals["bytes"] += r["bytes"]
+        totals["peak_rss_mb"] = max(totals["peak_rss_mb"], r["peak_rss_mb"])
+        if not r["ok"]:
+            totals["ok"] = False
+            break
+        cursor = json.loads(r["tail"].rstrip(b"\n").rsplit(b"\n", 1)[-1]).get("cursor")
+        if not cursor:
+            break
+    totals["seconds"] = time.perf_counter() - start
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark duckdb_direct_sql result transport")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--db-path", help="Existing DuckDB file with a candles table")
+    parser.add_argument("--page-rows", type=int, help="Also page through the result this many rows at a time")
+    parser.add_argument("--skip-query-sql", action="store_true",
+                        help="Skip the fetchall() baseline (slow and memory-hungry at 10M rows)")
+    args = parser.parse_args()
+
+    tmp = None
+    db_path = args.db_path
+    if not db_path:
+        tmp = tempfile.TemporaryDirectory()
+        db_path = str(Path(tmp.name) / "bench.duckdb")
+        print(f"Creating {args.rows:,} rows...")
+        make_db(db_path, args.rows)
+
+    sql = "SELECT * FROM candles ORDER BY id"
+    base = ["--db-path", db_path, "--sql", sql]
+    stream = base + ["--operation", "stream_sql"]
+    modes = [
+        ("stream_sql arrow", lambda: run(stream + ["--format", "arrow"])),
+        ("stream_sql ndjson", lambda: run(stream + ["--format", "ndjson"])),
+    ]
+    if args.page_rows:
+        # Paged queries leave the order to --page-key
+        paged = ["--db-path", db_path, "--sql", "SELECT * FROM candles", "--operation", "stream_sql"]
+        modes.append(("stream_sql ndjson paged", lambda: run_paged(paged + ["--format", "ndjson"], args.page_rows)))
+    if not args.skip_query_sql:
+        modes.append(("query_sql", lambda: run(base + ["--operation", "query_sql"])))
+
+    print(f"{'mode':<24} {'total s':>9} {'first s':>9} {'MB out':>9} {'peak RSS MB':>12}")
+    for name, run_mode in modes:
+        r = run_mode()
+        first = f"{r['first_chunk_s']:.2f}" if r["first_chunk_s"] is not None else "-"
+        status = "" if r["ok"] else "  (failed)"
+        print(f"{name:<24} {r['seconds']:>9.2f} {first:>9} {r['bytes'] / 1e6:>9.1f} "
+              f"{r['peak_rss_mb']:>12.0f}{status}")
+
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Build / Refresh Candle Coverage Index
+
+Maintains the per-token coverage index (ohlcv_coverage_ranges) in DuckDB
+from ClickHouse ohlcv_candles. Each refresh only reads candles ingested
+since the previous one, so it is cheap to run after every ingest.
+
+Coverage tools (ohlcv_horizon_coverage_matrix.py, populate_coverage_matrix.py,
+check_continuous_event_windows.py, tools/analysis/ohlcv_*_coverage.py and the
+backtest slice coverage step) read this index instead of scanning candles.
+
+Usage:
+    python3 build_coverage_index.py --duckdb data/alerts.duckdb --interval 1m --interval 5m
+    python3 build_coverage_index.py --duckdb data/alerts.duckdb --interval 1m --full
+    python3 build_coverage_index.py --duckdb data/alerts.duckdb --export-parquet data/coverage_ranges.parquet
+    python3 build_coverage_index.py --duckdb data/alerts.duckdb --query solana <mint> 1m 2025-12-01T00:00:00 2025-12-02T00:00:00
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add workspace root to path for tools.shared imports
+_workspace_root = Path(__file__).resolve().parents[2]
+if str(_workspace_root) not in sys.path:
+    sys.path.insert(0, str(_workspace_root))
+
+from tools.shared.coverage_index import (  # noqa: E402
+    export_parquet,
+    load_coverage_index,
+    refresh_from_clickhouse,
+)
+from tools.shared.duckdb_adapter import get_readonly_connection, get_write_connection  # noqa: E402
+
+
+def get_clickhouse_client():
+    """Get ClickHouse client from environment or defaults."""
+    try:
+        from clickhouse_driver import Client as ClickHouseClient
+    except ImportError:
+        print("ERROR: clickhouse-driver not installed. Run: pip install clickhouse-driver", file=sys.stderr)
+        sys.exit(1)
+
+    port = int(os.getenv('CLICKHOUSE_PORT', '19000'))
+    # Map HTTP ports to native protocol ports
+    port = {8123: 9000, 18123: 19000}.get(port, port)
+    database = os.getenv('CLICKHOUSE_DATABASE', 'quantbot')
+    client = ClickHouseClient(
+        host=os.getenv('CLICKHOUSE_HOST', 'localhost'),
+        port=port,
+        database=database,
+        user=os.getenv('CLICKHOUSE_USER', 'default'),
+        password=os.getenv('CLICKHOUSE_PASSWORD', ''),
+        connect_timeout=int(os.getenv('CLICKHOUSE_CONNECT_TIMEOUT', '5')),
+        send_receive_timeout=int(os.getenv('CLICKHOUSE_SEND_RECEIVE_TIMEOUT', '300')),
+    )
+    return client, database
+
+
+def refresh_index(duckdb_path: str, intervals, full: bool = False, table: str = 'ohlcv_candles', verbose: bool = False):
+    """Refresh the coverage index for each interval; returns per-interval stats."""
+    ch_client, database = get_clickhouse_client()
+    results = []
+    try:
+        with get_write_connection(duckdb_path) as con:
+            for interval in intervals:
+                t0 = time.time()
+                stats = refresh_from_clickhouse(con, ch_client, database, interval, table=table, full=full)
+                stats['seconds'] = round(time.time() - t0, 3)
+                results.append(stats)
+                if verbose:
+                    print(
+                        f"[coverage-index] {interval}: {stats['tokens_updated']:,} tokens updated, "
+                        f"{stats['rows_written']:,} ranges written in {stats['seconds']:.1f}s",
+                        file=sys.stderr,
+                    )
+    finally:
+        ch_client.disconnect()
+    return results
+
+
+def _parse_ts(value: str) -> int:
+    if value.isdigit():
+        return int(value)
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def query_index(duckdb_path: str, chain: str, mint: str, interval: str, start: str, end: str) -> dict:
+    """Answer a single coverage question from the index."""
+    start_s, end_s = _parse_ts(start), _parse_ts(end)
+    with get_readonly_connection(duckdb_path) as con:
+        index = load_coverage_index(con, interval, chain=chain, mints=[mint])
+    return {
+        'chain': chain,
+        'mint': mint,
+        'interval': interval,
+        'indexed': index.is_indexed(interval),
+        'start': start_s,
+        'end': end_s,
+        'covered_fraction': index.covered_fraction(chain, mint, interval, start_s, end_s),
+        'candle_count': index.candle_count(chain, mint, interval, start_s, end_s - 1),
+        'missing_ranges': index.missing_ranges(chain, mint, interval, start_s, end_s),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or refresh the candle coverage index')
+    parser.add_argument('--duckdb', required=True, help='DuckDB file holding the index')
+    parser.add_argument('--interval', action='append', default=None,
+                        help='Candle interval to refresh (repeatable, default: 1m and 5m)')
+    parser.add_argument('--full', action='store_true', help='Rebuild from scratch instead of incrementally')
+    parser.add_argument('--table', default='ohlcv_candles', help='ClickHouse candle table (default: ohlcv_candles)')
+    parser.add_argument('--export-parquet', help='Also write the range table to this Parquet file')
+    parser.add_argument('--query', nargs=5, metavar=('CHAIN', 'MINT', 'INTERVAL', 'START', 'END'),
+                        help='Print coverage of [START, END) for one token and exit (no refresh)')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    if args.query:
+        print(json.dumps(query_index(args.duckdb, *args.query), indent=2))
+        return 0
+
+    results = refresh_index(args.duckdb, args.interval or ['1m', '5m'], full=args.full,
+                            table=args.table, verbose=args.verbose)
+
+    if args.export_parquet:
+        with get_readonly_connection(args.duckdb) as con:
+            export_parquet(con, args.export_parquet)
+
+    print(json.dumps({'success': True, 'intervals': results}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,13 +17,30 @@ Usage:
 
 Environment variables for ClickHouse:
     CLICKHOUSE_HOST, CLICKHOUSE_PORT, CLICKHOUSE_USER, CLICKHOUSE_PASSWORD, CLICKHOUSE_DATABASE
+
+Candles are fetched once per batch of tokens (--batch-tokens) over the merged
+alert windows, and every alert/window is checked in one columnar pass
+(tools.shared.candle_runs) instead of one query per alert and window.
+
+If the DuckDB file has a 1m coverage index (build_coverage_index.py), alerts
+without any candles are answered from it without querying ClickHouse.
 """
 
 import os
 import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
+# Add workspace root to path for tools.shared imports
+_workspace_root = Path(__file__).resolve().parents[2]
+if str(_workspace_root) not in sys.path:
+    sys.path.insert(0, str(_workspace_root))
+from tools.shared.candle_runs import first_death_index, segment_offsets, window_checks  # noqa: E402
+from tools.shared.coverage_index import CoverageIndex, open_coverage_index  # noqa: E402
+
+import numpy as np  # noqa: E402
+
 try:
     import duckdb
 except ImportError:
@@ -46,6 +63,13 @@ except ImportError:
 # Time windows in hours
 TIME_WINDOWS = [12, 24, 36, 48, 72, 96]
 
+# Continuity rules: >= 80% of the expected 1m candles, no step of 10 minutes or more
+MIN_CANDLE_FRACTION = 0.8
+MAX_GAP_SECONDS = 600
+
+# Tokens fetched per ClickHouse query
+DEFAULT_BATCH_TOKENS = 200
+
 
 def get_clickhouse_client():
     """
@@ -159,27 +183,9 @@ def check_token_death(candles: List[Tuple]) -> Optional[int]:
     if len(candles) < 3:
         return None
     
-    # Check forward from beginning to find first point where token dies
-    for i in range(len(candles) - 2):
-        # Check if current candle has zero volume and constant price
-        _, open_price, high, low, close, volume = candles[i]
-        
-        if volume == 0 and open_price == high == low == close:
-            # Check if this state persists for at least 3 candles
-            constant_price = close
-            is_dead = True
-            
-            # Check next 2 candles (total of 3 including current)
-            for j in range(i + 1, min(i + 3, len(candles))):
-                _, o, h, l, c, v = candles[j]
-                if v != 0 or not (o == h == l == c == constant_price):
-                    is_dead = False
-                    break
-            
-            if is_dead:
-                return i
-    
-    return None
+    _, open_, high, low, close, volume = (np.asarray(col, dtype=np.float64) for col in zip(*candles))
+    death_index = int(first_death_index(open_, high, low, close, volume)[0])
+    return death_index if death_index >= 0 else None
 
 
 def check_continuous_coverage(
@@ -188,11 +194,15 @@ def check_continuous_coverage(
     mint: str,
     chain: str,
     alert_ts_ms: int,
-    window_hours: int
+    window_hours: int,
+    coverage_index: Optional[CoverageIndex] = None
 ) -> Tuple[bool, bool]:
     """
     Check if there's continuous coverage for a time window after alert.
     
+    With a coverage_index, windows that hold no candles return immediately;
+    candles are only fetched when there is something to check for death.
+    
     Returns:
         (has_coverage, token_died) tuple
         - has_coverage: True if continuous candles exist OR token died
@@ -201,6 +211,11 @@ def check_continuous_coverage(
     alert_ts = alert_ts_ms / 1000.0  # Convert to seconds
     window_end_ts = alert_ts + (window_hours * 3600)
     
+    if coverage_index is not None and coverage_index.candle_count(
+        chain, mint, '1m', int(alert_ts), int(window_end_ts)
+    ) == 0:
+        return (False, False)
+    
     # Query candles from alert time to window end
     query = f"""
         SELECT 
@@ -243,7 +258,7 @@ def check_continuous_coverage(
         
         # Check for continuous coverage
         # For 1-minute candles, we expect roughly (window_hours * 60) candles
-        expected_min_candles = window_hours * 60 * 0.8  # Allow 20% tolerance for gaps
+        expected_min_candles = window_hours * 60 * MIN_CANDLE_FRACTION  # Allow 20% tolerance for gaps
         
         if len(candles) >= expected_min_candles:
             # Check for large gaps (missing more than 10 minutes)
@@ -257,7 +272,7 @@ def check_continuous_coverage(
                 prev_ts = ts
             
             # If largest gap is less than 10 minutes (600 seconds), consider continuous
-            if max_gap < 600:
+            if max_gap < MAX_GAP_SECONDS:
                 return (True, False)
         
         return (False, False)
@@ -268,14 +283,124 @@ def check_continuous_coverage(
         return (False, False)
 
 
+def merge_alert_windows(alert_starts: List[int], span_seconds: int) -> List[Tuple[int, int]]:
+    """Merge [alert, alert + span] windows of one token into disjoint inclusive ranges."""
+    merged: List[Tuple[int, int]] = []
+    for start in sorted(alert_starts):
+        end = start + span_seconds
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def fetch_candle_columns(
+    client,
+    database: str,
+    token_ranges: Dict[Tuple[str, str], List[Tuple[int, int]]]
+) -> Dict[str, np.ndarray]:
+    """
+    Fetch 1m candles for several tokens in one query.
+    
+    token_ranges maps (mint, chain) -> inclusive [start, end] ranges in unix seconds.
+    
+    Returns columns (mint, chain, ts, open, high, low, close, volume) sorted by
+    (mint, chain, ts).
+    """
+    conditions = []
+    parameters: Dict[str, Any] = {}
+    n = 0
+    for (mint, chain), ranges in token_ranges.items():
+        for start, end in ranges:
+            conditions.append(
+                f"(token_address = %(m{n})s AND chain = %(c{n})s "
+                f"AND toUnixTimestamp(timestamp) >= %(s{n})s AND toUnixTimestamp(timestamp) <= %(e{n})s)"
+            )
+            parameters.update({f'm{n}': mint, f'c{n}': chain, f's{n}': int(start), f'e{n}': int(end)})
+            n += 1
+    
+    query = f"""
+        SELECT
+            token_address,
+            chain,
+            toUnixTimestamp(timestamp) as ts,
+            open,
+            high,
+            low,
+            close,
+            volume
+        FROM {database}.ohlcv_candles_1m
+        WHERE {' OR '.join(conditions)}
+        ORDER BY token_address, chain, timestamp ASC
+    """
+    result = client.query(query, parameters=parameters)
+    names = ['mint', 'chain', 'ts', 'open', 'high', 'low', 'close', 'volume']
+    columns = result.result_columns if result.result_rows else [[] for _ in names]
+    out = {name: np.asarray(col, dtype=object) for name, col in zip(names[:2], columns[:2])}
+    out['ts'] = np.asarray(columns[2], dtype=np.int64)
+    for name, col in zip(names[3:], columns[3:]):
+        out[name] = np.asarray(col, dtype=np.float64)
+    return out
+
+
+def check_alert_windows(
+    candles: Dict[str, np.ndarray],
+    alerts: List[Tuple[str, str, int]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Check every TIME_WINDOWS window of every alert against fetched candles.
+    
+    alerts: (mint, chain, alert_ts_ms) tuples.
+    
+    Returns (has_coverage, token_died) boolean arrays of shape
+    (len(alerts), len(TIME_WINDOWS)), with the same rules as
+    check_continuous_coverage.
+    """
+    shape = (len(alerts), len(TIME_WINDOWS))
+    offsets = segment_offsets(candles['mint'], candles['chain'])
+    segment_of = {
+        (candles['mint'][offsets[i]], candles['chain'][offsets[i]]): i
+        for i in range(len(offsets) - 1)
+    }
+    alert_segments = np.array([segment_of.get((mint, chain), -1) for mint, chain, _ in alerts], dtype=np.int64)
+    alert_starts = np.array([int(ts_ms / 1000.0) for _, _, ts_ms in alerts], dtype=np.int64)
+    window_seconds = np.array(TIME_WINDOWS, dtype=np.int64) * 3600
+    
+    known = np.repeat(alert_segments >= 0, len(TIME_WINDOWS))
+    has_coverage = np.zeros(known.shape, dtype=bool)
+    token_died = np.zeros(known.shape, dtype=bool)
+    if known.any():
+        starts = np.repeat(alert_starts, len(TIME_WINDOWS))[known]
+        ends = (alert_starts[:, None] + window_seconds[None, :]).ravel()[known]
+        min_candles = np.tile(np.array(TIME_WINDOWS) * 60 * MIN_CANDLE_FRACTION, len(alerts))[known]
+        has_coverage[known], token_died[known] = window_checks(
+            candles['ts'], candles['open'], candles['high'], candles['low'],
+            candles['close'], candles['volume'], offsets,
+            segments=np.repeat(alert_segments, len(TIME_WINDOWS))[known],
+            starts=starts,
+            ends=ends,
+            min_candles=min_candles,
+            max_gap_seconds=MAX_GAP_SECONDS,
+        )
+    return has_coverage.reshape(shape), token_died.reshape(shape)
+
+
 def analyze_per_token(
     client,
     database: str,
-    alerts: List[Dict[str, Any]]
+    alerts: List[Dict[str, Any]],
+    coverage_index: Optional[CoverageIndex] = None,
+    batch_tokens: int = DEFAULT_BATCH_TOKENS
 ) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Analyze coverage per token across all time windows.
     
+    Candles are fetched for batch_tokens tokens per query (over each token's
+    merged alert windows) and all windows of all their alerts are checked in
+    one pass. With a coverage_index, alerts with no candles in their longest
+    window are not fetched at all.
+    
     Returns:
         Tuple of:
         - Dictionary mapping (mint, chain) -> coverage stats
@@ -292,31 +417,59 @@ def analyze_per_token(
     results = {}
     all_alert_results = []  # Per-alert coverage data
     total_tokens = len(token_alerts)
+    span_seconds = max(TIME_WINDOWS) * 3600
     
     print(f"Analyzing {total_tokens} tokens with {len(alerts)} total alerts...", file=sys.stderr)
     
-    for idx, (key, token_alert_list) in enumerate(token_alerts.items()):
-        mint, chain = key
-        
-        if (idx + 1) % 10 == 0:
-            print(f"  Progress: {idx + 1}/{total_tokens} tokens...", file=sys.stderr)
-        
-        # Pre-compute coverage for all alerts and windows
+    # Alerts worth fetching candles for, per token
+    fetch_ranges: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+    for (mint, chain), token_alert_list in token_alerts.items():
+        starts = []
+        for alert in token_alert_list:
+            alert_s = int(alert['alert_ts_ms'] / 1000.0)
+            if coverage_index is not None and coverage_index.candle_count(
+                chain, mint, '1m', alert_s, alert_s + span_seconds
+            ) == 0:
+                continue
+            starts.append(alert_s)
+        if starts:
+            fetch_ranges[(mint, chain)] = merge_alert_windows(starts, span_seconds)
+    
+    # Fetch and check per batch of tokens
+    window_results: Dict[Tuple[str, str, int], Tuple[np.ndarray, np.ndarray]] = {}
+    fetch_keys = list(fetch_ranges)
+    for batch_start in range(0, len(fetch_keys), batch_tokens):
+        batch = fetch_keys[batch_start:batch_start + batch_tokens]
+        batch_alerts = [
+            (mint, chain, alert['alert_ts_ms'])
+            for mint, chain in batch
+            for alert in token_alerts[(mint, chain)]
+        ]
+        try:
+            candles = fetch_candle_columns(client, database, {key: fetch_ranges[key] for key in batch})
+        except Exception as e:
+            # If query fails, assume no coverage
+            print(f"[warning] Query failed for {len(batch)} tokens: {e}", file=sys.stderr)
+            continue
+        has_coverage, token_died = check_alert_windows(candles, batch_alerts)
+        for i, alert_key in enumerate(batch_alerts):
+            window_results[alert_key] = (has_coverage[i], token_died[i])
+        print(
+            f"  Progress: {min(batch_start + batch_tokens, len(fetch_keys))}/{len(fetch_keys)} tokens fetched...",
+            file=sys.stderr
+        )
+    
+    no_coverage = (np.zeros(len(TIME_WINDOWS), dtype=bool), np.zeros(len(TIME_WINDOWS), dtype=bool))
+    for (mint, chain), token_alert_list in token_alerts.items():
+        # Coverage for all alerts and windows
         alert_coverage_data = []
         for alert in token_alert_list:
+            covered, died = window_results.get((mint, chain, alert['alert_ts_ms']), no_coverage)
             alert_window_results = {}
-            for window_hours in TIME_WINDOWS:
-                has_coverage, token_died = check_continuous_coverage(
-                    client,
-                    database,
-                    mint,
-                    chain,
-                    alert['alert_ts_ms'],
-                    window_hours
-                )
+            for w, window_hours in enumerate(TIME_WINDOWS):
                 alert_window_results[f'{window_hours}hr'] = {
-                    'has_coverage': has_coverage,
-                    'token_died': token_died
+                    'has_coverage': bool(covered[w]),
+                    'token_died': bool(died[w])
                 }
             alert_coverage_data.append({
                 'alert': alert,
@@ -460,6 +613,17 @@ def main():
         '--output',
         help='Output JSON file path (optional)'
     )
+    parser.add_argument(
+        '--batch-tokens',
+        type=int,
+        default=DEFAULT_BATCH_TOKENS,
+        help=f'Tokens fetched per ClickHouse query (default: {DEFAULT_BATCH_TOKENS})'
+    )
+    parser.add_argument(
+        '--no-coverage-index',
+        action='store_true',
+        help='Query ClickHouse for every window even if a coverage index is available'
+    )
     
     args = parser.parse_args()
     
@@ -481,8 +645,16 @@ def main():
             print("[error] No alerts found", file=sys.stderr)
             sys.exit(1)
         
+        coverage_index = None
+        if not args.no_coverage_index:
+            coverage_index = open_coverage_index(args.duckdb, '1m', mints={a['mint'] for a in alerts})
+            if coverage_index is not None:
+                print(f"✓ Using 1m coverage index ({len(coverage_index):,} tokens)\n", file=sys.stderr)
+        
         # Analyze per token
-        results, all_alert_results = analyze_per_token(ch_client, ch_database, alerts)
+        results, all_alert_results = analyze_per_token(
+            ch_client, ch_database, alerts, coverage_index, batch_tokens=args.batch_tokens
+        )
         
         # Add metadata to output
         output_data = {
@@ -3,15 +3,52 @@
 DuckDB Canonical Events Storage
 
 Stores and retrieves canonical events (unified market data representation).
+
+Asset addresses are normalized at write time into asset_address_key
+(lowercase), so address filters are plain equality lookups on an indexed
+column. Batches are ingested columnar (Arrow / DataFrame) in one statement,
+deduplicated on id (last occurrence wins, existing rows are replaced).
+Queries page with a keyset cursor on (timestamp, id) instead of OFFSET.
 """
 
+import base64
 import duckdb
 import json
 import sys
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from datetime import datetime
 
+# Columns of canonical_events written by the bulk path, in table order
+# (asset_address_key and created_at are derived on insert)
+EVENT_COLUMNS = (
+    'id', 'asset_address', 'asset_chain', 'asset_symbol', 'asset_name',
+    'venue_name', 'venue_type', 'venue_id',
+    'timestamp', 'event_type', 'value_json', 'confidence', 'metadata_json',
+    'source_hash', 'source_run_id',
+)
+
+# Filtered approximate counts are exact below this many rows
+APPROX_COUNT_MIN_ROWS = 1_000_000
+APPROX_COUNT_SAMPLE_PERCENT = 5
+
+SELECT_COLUMNS = """
+    id, asset_address, asset_chain, asset_symbol, asset_name,
+    venue_name, venue_type, venue_id,
+    timestamp, event_type, value_json, confidence, metadata_json,
+    source_hash, source_run_id
+"""
+
+
+def normalize_address(address: Optional[str]) -> Optional[str]:
+    """
+    Address lookup key (chain-agnostic).
+
+    Lowercase, so EVM checksum casing does not matter; this is the same
+    case-insensitive match the query path always used.
+    """
+    return address.lower() if address else address
+
 def init_schema(con: duckdb.DuckDBPyConnection) -> None:
     """Initialize canonical events schema in DuckDB."""
     con.execute("""
@@ -31,9 +68,19 @@ def init_schema(con: duckdb.DuckDBPyConnection) -> None:
             metadata_json JSON,
             source_hash TEXT,
             source_run_id TEXT,
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            asset_address_key TEXT
         );
-        
+    """)
+
+    # Databases created before asset_address_key existed: add and backfill
+    con.execute("ALTER TABLE canonical_events ADD COLUMN IF NOT EXISTS asset_address_key TEXT")
+    con.execute("""
+        UPDATE canonical_events SET asset_address_key = LOWER(asset_address)
+        WHERE asset_address_key IS NULL
+    """)
+
+    con.execute("""
         CREATE INDEX IF NOT EXISTS idx_canonical_asset_address ON canonical_events(asset_address);
         CREATE INDEX IF NOT EXISTS idx_canonical_asset_chain ON canonical_events(asset_chain);
         CREATE INDEX IF NOT EXISTS idx_canonical_venue_name ON canonical_events(venue_name);
@@ -44,6 +91,7 @@ def init_schema(con: duckdb.DuckDBPyConnection) -> None:
         CREATE INDEX IF NOT EXISTS idx_canonical_source_run_id ON canonical_events(source_run_id);
         CREATE INDEX IF NOT EXISTS idx_canonical_asset_time ON canonical_events(asset_address, timestamp);
         CREATE INDEX IF NOT EXISTS idx_canonical_venue_time ON canonical_events(venue_name, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_canonical_address_key ON canonical_events(asset_address_key);
     """)
 
 
@@ -61,15 +109,16 @@ def store_canonical_event(con: duckdb.DuckDBPyConnection, event: Dict[str, Any])
     
     con.execute("""
         INSERT OR REPLACE INTO canonical_events (
-            id, asset_address, asset_chain, asset_symbol, asset_name,
+            id, asset_address, asset_address_key, asset_chain, asset_symbol, asset_name,
             venue_name, venue_type, venue_id,
             timestamp, event_type, value_json, confidence, metadata_json,
             source_hash, source_run_id
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (
         event['id'],
         asset['address'],
+        normalize_address(asset['address']),
         asset['chain'],
         asset.get('symbol'),
         asset.get('name'),
@@ -88,23 +137,140 @@ def store_canonical_event(con: duckdb.DuckDBPyConnection, event: Dict[str, Any])
     return {"success": True}
 
 
+def events_to_table(events: List[Dict[str, Any]]):
+    """
+    Canonical event dicts as an Arrow table with EVENT_COLUMNS.
+
+    Timestamps stay ISO strings; they are parsed by DuckDB on insert.
+    """
+    import pyarrow as pa
+
+    assets = [event['asset'] for event in events]
+    venues = [event['venue'] for event in events]
+    return pa.table({
+        'id': pa.array([event['id'] for event in events], pa.string()),
+        'asset_address': pa.array([a['address'] for a in assets], pa.string()),
+        'asset_chain': pa.array([a['chain'] for a in assets], pa.string()),
+        'asset_symbol': pa.array([a.get('symbol') for a in assets], pa.string()),
+        'asset_name': pa.array([a.get('name') for a in assets], pa.string()),
+        'venue_name': pa.array([v['name'] for v in venues], pa.string()),
+        'venue_type': pa.array([v['type'] for v in venues], pa.string()),
+        'venue_id': pa.array([v.get('venueId') for v in venues], pa.string()),
+        'timestamp': pa.array([
+            e['timestamp'] if isinstance(e['timestamp'], str) else e['timestamp'].isoformat()
+            for e in events
+        ], pa.string()),
+        'event_type': pa.array([event['eventType'] for event in events], pa.string()),
+        'value_json': pa.array([json.dumps(event['value']) for event in events], pa.string()),
+        'confidence': pa.array([event.get('confidence') for event in events], pa.float64()),
+        'metadata_json': pa.array([
+            json.dumps(event['metadata']) if event.get('metadata') else None for event in events
+        ], pa.string()),
+        'source_hash': pa.array([event.get('sourceHash') for event in events], pa.string()),
+        'source_run_id': pa.array([event.get('sourceRunId') for event in events], pa.string()),
+    })
+
+
+def store_canonical_events_table(con: duckdb.DuckDBPyConnection, table: Any, replace: bool = True) -> int:
+    """
+    Bulk-insert events from a columnar table in one statement.
+
+    table is anything DuckDB can scan (pyarrow Table / RecordBatchReader,
+    pandas DataFrame) with EVENT_COLUMNS; optional columns may be missing.
+    Rows are deduplicated on id, the last occurrence winning. With
+    replace=True existing rows with the same id are replaced (as
+    store_canonical_event does), otherwise they are kept.
+
+    The schema must already exist (init_schema). Returns rows in the batch.
+    """
+    required = {'id', 'asset_address', 'asset_chain', 'venue_name', 'venue_type',
+                'timestamp', 'event_type', 'value_json'}
+    con.register('_canonical_batch', table)
+    try:
+        present = {row[0] for row in con.execute("DESCRIBE _canonical_batch").fetchall()}
+        missing = required - present
+        if missing:
+            raise ValueError(f"Canonical event table is missing columns: {sorted(missing)}")
+        select = [
+            column if column in present else f"NULL AS {column}"
+            for column in EVENT_COLUMNS
+        ]
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        con.execute(f"""
+            {verb} INTO canonical_events (
+                {', '.join(EVENT_COLUMNS)}, asset_address_key
+            )
+            SELECT
+                id, asset_address, asset_chain, asset_symbol, asset_name,
+                venue_name, venue_type, venue_id,
+                CAST(CAST(timestamp AS TIMESTAMPTZ) AS TIMESTAMP),
+                event_type, value_json, confidence, metadata_json,
+                source_hash, source_run_id,
+                LOWER(asset_address)
+            FROM (
+                SELECT {', '.join(select)}, ROW_NUMBER() OVER () AS _row
+                FROM _canonical_batch
+            )
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY id ORDER BY _row DESC) = 1
+        """)
+        return con.execute("SELECT COUNT(*) FROM _canonical_batch").fetchone()[0]
+    finally:
+        con.unregister('_canonical_batch')
+
+
 def store_canonical_events_batch(con: duckdb.DuckDBPyConnection, events: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Store multiple canonical events (batch)."""
     init_schema(con)
-    
-    for event in events:
-        store_canonical_event(con, event)
-    
+    if events:
+        store_canonical_events_table(con, events_to_table(events))
     return {"success": True, "count": len(events)}
 
 
+def store_canonical_events_file(con: duckdb.DuckDBPyConnection, path: str, batch_rows: int = 500_000) -> Dict[str, Any]:
+    """
+    Store events from a Parquet file or directory with EVENT_COLUMNS
+    (backfills), streaming batch_rows rows per insert.
+    """
+    import pyarrow.dataset as ds
+
+    init_schema(con)
+    dataset = ds.dataset(path, format='parquet')
+    columns = [c for c in EVENT_COLUMNS if c in dataset.schema.names]
+    count = 0
+    for batch in dataset.to_batches(columns=columns, batch_size=batch_rows):
+        count += store_canonical_events_table(con, batch)
+    return {"success": True, "count": count}
+
+
+def _row_to_event(row: tuple) -> Dict[str, Any]:
+    """Convert a SELECT_COLUMNS row to a canonical event dict."""
+    return {
+        "id": row[0],
+        "asset": {
+            "address": row[1],
+            "chain": row[2],
+            "symbol": row[3],
+            "name": row[4],
+        },
+        "venue": {
+            "name": row[5],
+            "type": row[6],
+            "venueId": row[7],
+        },
+        "timestamp": row[8].isoformat() if row[8] else None,
+        "eventType": row[9],
+        "value": json.loads(row[10]),
+        "confidence": row[11],
+        "metadata": json.loads(row[12]) if row[12] else {},
+        "sourceHash": row[13],
+        "sourceRunId": row[14],
+    }
+
+
 def get_canonical_event(con: duckdb.DuckDBPyConnection, event_id: str) -> Optional[Dict[str, Any]]:
     """Get canonical event by ID."""
-    result = con.execute("""
-        SELECT id, asset_address, asset_chain, asset_symbol, asset_name,
-               venue_name, venue_type, venue_id,
-               timestamp, event_type, value_json, confidence, metadata_json,
-               source_hash, source_run_id
+    result = con.execute(f"""
+        SELECT {SELECT_COLUMNS}
         FROM canonical_events
         WHERE id = ?
     """, (event_id,)).fetchone()
@@ -112,39 +278,62 @@ def get_canonical_event(con: duckdb.DuckDBPyConnection, event_id: str) -> Option
     if not result:
         return None
     
-    return {
-        "id": result[0],
-        "asset": {
-            "address": result[1],
-            "chain": result[2],
-            "symbol": result[3],
-            "name": result[4],
-        },
-        "venue": {
-            "name": result[5],
-            "type": result[6],
-            "venueId": result[7],
-        },
-        "timestamp": result[8].isoformat() if result[8] else None,
-        "eventType": result[9],
-        "value": json.loads(result[10]),
-        "confidence": result[11],
-        "metadata": json.loads(result[12]) if result[12] else {},
-        "sourceHash": result[13],
-        "sourceRunId": result[14],
-    }
+    return _row_to_event(result)
+
+
+def encode_cursor(timestamp: datetime, event_id: str) -> str:
+    """Opaque keyset cursor for the page after (timestamp, id)."""
+    raw = json.dumps([timestamp.isoformat(), event_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp, event_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), event_id
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _approximate_count(con: duckdb.DuckDBPyConnection, where_clause: str, params: List[Any]) -> int:
+    """
+    Estimated number of matching events.
+
+    Unfiltered: the table's row estimate. Filtered: exact on small tables,
+    otherwise a scaled count over a block sample.
+    """
+    size_row = con.execute("""
+        SELECT estimated_size FROM duckdb_tables() WHERE table_name = 'canonical_events'
+    """).fetchone()
+    table_rows = size_row[0] if size_row else 0
+    if where_clause == "1=1":
+        return table_rows
+    if table_rows < APPROX_COUNT_MIN_ROWS:
+        return con.execute(f"SELECT COUNT(*) FROM canonical_events WHERE {where_clause}", params).fetchone()[0]
+    sampled = con.execute(f"""
+        SELECT COUNT(*) FROM canonical_events
+        TABLESAMPLE {APPROX_COUNT_SAMPLE_PERCENT}% (system)
+        WHERE {where_clause}
+    """, params).fetchone()[0]
+    return int(round(sampled * 100 / APPROX_COUNT_SAMPLE_PERCENT))
 
 
 def query_canonical_events(con: duckdb.DuckDBPyConnection, filter: Dict[str, Any]) -> Dict[str, Any]:
-    """Query canonical events by filter."""
+    """
+    Query canonical events by filter, newest first (timestamp, id descending).
+
+    Pagination: pass the previous page's nextCursor as filter['cursor']
+    (keyset, constant cost per page); offset is still honoured without a
+    cursor. filter['count'] is 'exact' (default) or 'approximate'.
+    """
     conditions = []
     params = []
     
     if filter.get('assetAddress'):
-        # Normalize address (lowercase for EVM, case-preserved for Solana)
-        asset_address = filter['assetAddress'].lower() if filter.get('chain') in ['ethereum', 'bsc', 'base', 'evm'] else filter['assetAddress']
-        conditions.append("LOWER(asset_address) = LOWER(?)")
-        params.append(asset_address)
+        conditions.append("asset_address_key = ?")
+        params.append(normalize_address(filter['assetAddress']))
     
     if filter.get('chain'):
         conditions.append("asset_chain = ?")
@@ -180,55 +369,44 @@ def query_canonical_events(con: duckdb.DuckDBPyConnection, filter: Dict[str, Any
     
     where_clause = " AND ".join(conditions) if conditions else "1=1"
     
-    # Get total count
-    count_result = con.execute(f"""
-        SELECT COUNT(*) FROM canonical_events WHERE {where_clause}
-    """, params).fetchone()
-    total = count_result[0] if count_result else 0
+    if filter.get('count', 'exact') == 'approximate':
+        total = _approximate_count(con, where_clause, params)
+    else:
+        count_result = con.execute(f"""
+            SELECT COUNT(*) FROM canonical_events WHERE {where_clause}
+        """, params).fetchone()
+        total = count_result[0] if count_result else 0
     
-    # Apply limit and offset
     limit = filter.get('limit', 1000)
-    offset = filter.get('offset', 0)
+    page_conditions = list(conditions)
+    page_params = list(params)
+    if filter.get('cursor'):
+        cursor_ts, cursor_id = decode_cursor(filter['cursor'])
+        page_conditions.append("(timestamp < ? OR (timestamp = ? AND id < ?))")
+        page_params.extend([cursor_ts, cursor_ts, cursor_id])
+        offset = 0
+    else:
+        offset = filter.get('offset', 0)
+    page_where = " AND ".join(page_conditions) if page_conditions else "1=1"
     
+    # One extra row tells whether there is a next page
     results = con.execute(f"""
-        SELECT id, asset_address, asset_chain, asset_symbol, asset_name,
-               venue_name, venue_type, venue_id,
-               timestamp, event_type, value_json, confidence, metadata_json,
-               source_hash, source_run_id
+        SELECT {SELECT_COLUMNS}
         FROM canonical_events
-        WHERE {where_clause}
-        ORDER BY timestamp DESC
+        WHERE {page_where}
+        ORDER BY timestamp DESC, id DESC
         LIMIT ? OFFSET ?
-    """, params + [limit, offset]).fetchall()
+    """, page_params + [limit + 1, offset]).fetchall()
     
-    events = [
-        {
-            "id": row[0],
-            "asset": {
-                "address": row[1],
-                "chain": row[2],
-                "symbol": row[3],
-                "name": row[4],
-            },
-            "venue": {
-                "name": row[5],
-                "type": row[6],
-                "venueId": row[7],
-            },
-            "timestamp": row[8].isoformat() if row[8] else None,
-            "eventType": row[9],
-            "value": json.loads(row[10]),
-            "confidence": row[11],
-            "metadata": json.loads(row[12]) if row[12] else {},
-            "sourceHash": row[13],
-            "sourceRunId": row[14],
-        }
-        for row in results
-    ]
+    has_more = len(results) > limit
+    results = results[:limit]
+    next_cursor = encode_cursor(results[-1][8], results[-1][0]) if has_more and results else None
     
     return {
-        "events": events,
+        "events": [_row_to_event(row) for row in results],
         "total": total,
+        "totalIsApproximate": filter.get('count', 'exact') == 'approximate',
+        "nextCursor": next_cursor,
     }
 
 
@@ -263,12 +441,12 @@ def main():
     parser = argparse.ArgumentParser(description='DuckDB Canonical Events Storage')
     parser.add_argument('--db-path', required=True, help='Path to DuckDB file')
     parser.add_argument('--operation', required=True,
-                        choices=['init', 'store', 'store_batch', 'get', 'query', 'get_by_asset'])
+                        choices=['init', 'store', 'store_batch', 'store_file', 'get', 'query', 'get_by_asset'])
     parser.add_argument('--data', type=str, help='JSON data for operation')
     
     args = parser.parse_args()
     
-    if args.operation in ['store', 'store_batch', 'init']:
+    if args.operation in ['store', 'store_batch', 'store_file', 'init']:
         con = get_write_connection(args.db_path)
     else:
         con = get_readonly_connection(args.db_path)
@@ -288,6 +466,11 @@ def main():
             result = store_canonical_events_batch(con, events)
             print(json.dumps(result))
         
+        elif args.operation == 'store_file':
+            data = json.loads(args.data)
+            result = store_canonical_events_file(con, data['path'])
+            print(json.dumps(result))
+        
         elif args.operation == 'get':
             data = json.loads(args.data)
             event = get_canonical_event(con, data['id'])
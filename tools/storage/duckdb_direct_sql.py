@@ -2,12 +2,28 @@
 """
 DuckDB Direct SQL Execution - Execute SQL queries directly
 Supports both file-based and in-memory databases
+
+stream_sql writes large results in size-bounded chunks instead of one JSON
+document:
+- ndjson: {"columns": [...]}, then {"rows": [[...], ...]} lines
+- arrow: {"columns": [...], "format": "arrow"}, then an Arrow IPC stream
+Both end with a trailer line {"done": true, "rowCount": n, "cursor": ...}
+(or {"error": ...} on failure).
+NDJSON rows are rendered to JSON by DuckDB, not by Python.
+With max_rows, cursor continues the same query on the next call. Paging is
+keyset paging on page_key, which must be unique, non-null columns of the
+result; each page seeks past the previous page's last key instead of
+skipping rows with OFFSET. The page_key is the order, so a paged query
+should not have its own ORDER BY (DuckDB would sort it again per page).
 """
 
 import argparse
+import base64
+import hashlib
 import json
 import sys
 from pathlib import Path
+from typing import BinaryIO, List, Optional, Sequence
 
 try:
     import duckdb
@@ -15,6 +31,14 @@ except ImportError:
     print("ERROR: duckdb package not installed. Run: pip install duckdb", file=sys.stderr)
     sys.exit(1)
 
+# Stream chunk bounds
+DEFAULT_CHUNK_ROWS = 10_000
+DEFAULT_MAX_CHUNK_BYTES = 4 * 1024 * 1024
+# Rows per keyset query within a page. DuckDB plans ORDER BY ... LIMIT this
+# small as a top-N whose bound prunes the scan, so a step costs the same at any
+# depth; larger limits can fall back to sorting every remaining row.
+PAGE_STEP_ROWS = 5000
+
 # Global connection cache for in-memory databases
 _connection_cache: dict[str, duckdb.DuckDBPyConnection] = {}
 
@@ -82,16 +106,7 @@ def query_sql(db_path: str, sql: str) -> dict:
         con = get_connection(db_path, read_only=True)
         result = con.execute(sql)
         
-        # Get column information
-        # DuckDB description format: (name, type, ...)
-        columns = []
-        if result.description:
-            for col in result.description:
-                col_name = col[0] if len(col) > 0 else ""
-                col_type = col[1] if len(col) > 1 else ""
-                # Convert type to string if it's a DuckDBPyType object
-                col_type_str = str(col_type) if col_type else ""
-                columns.append({"name": col_name, "type": col_type_str})
+        columns = _columns(result)
         
         # Fetch all rows
         rows = result.fetchall()
@@ -112,6 +127,235 @@ def query_sql(db_path: str, sql: str) -> dict:
         }
 
 
+def _columns(result: duckdb.DuckDBPyConnection) -> list:
+    """Column names and types of an executed query"""
+    # DuckDB description format: (name, type, ...)
+    columns = []
+    if result.description:
+        for col in result.description:
+            col_name = col[0] if len(col) > 0 else ""
+            col_type = col[1] if len(col) > 1 else ""
+            # Convert type to string if it's a DuckDBPyType object
+            col_type_str = str(col_type) if col_type else ""
+            columns.append({"name": col_name, "type": col_type_str})
+    return columns
+
+
+def _sql_digest(sql: str) -> str:
+    return hashlib.sha256(sql.encode()).hexdigest()[:16]
+
+
+def encode_cursor(sql: str, after: list) -> str:
+    """Continuation token: page_key values of the last row sent, bound to the query text"""
+    raw = json.dumps({"sql": _sql_digest(sql), "after": after}, default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(sql: str, cursor: str) -> list:
+    """page_key values of a cursor from encode_cursor for the same query"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        after = data["after"]
+        digest = data["sql"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(after, list):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if digest != _sql_digest(sql):
+        raise ValueError("Cursor belongs to a different query")
+    return after
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _page_query(sql: str, page_key: Sequence[str], after: Optional[list], limit: int):
+    """
+    (query, params) for the first limit rows of sql after the page_key values in after.
+    
+    The seek is the row-value comparison (k1, k2, ...) > (v1, v2, ...) spelled
+    out as an OR of prefixes, so DuckDB can push it into the scan.
+    """
+    keys = [_quote_ident(k) for k in page_key]
+    where = ""
+    params: list = []
+    if after is not None:
+        if len(after) != len(keys):
+            raise ValueError("Cursor does not match page_key")
+        terms = []
+        for i, key in enumerate(keys):
+            terms.append("(" + " AND ".join([f"{k} = ?" for k in keys[:i]] + [f"{key} > ?"]) + ")")
+            params.extend(after[:i + 1])
+        where = "WHERE " + " OR ".join(terms)
+    return f"SELECT * FROM ({sql}) AS q {where} ORDER BY {', '.join(keys)} LIMIT {int(limit)}", params
+
+
+def _write_line(out: BinaryIO, obj: dict) -> None:
+    out.write(json.dumps(obj, default=str).encode())
+    out.write(b"\n")
+
+
+def _bounded_slices(batch, max_rows: int, max_bytes: int):
+    """Slices of a record batch of at most max_rows rows and ~max_bytes bytes"""
+    row_bytes = batch.nbytes / batch.num_rows
+    rows = max(1, min(max_rows, int(max_bytes / row_bytes) if row_bytes else max_rows))
+    for start in range(0, batch.num_rows, rows):
+        yield batch.slice(start, rows)
+
+
+def _ndjson_chunks(rows: List[str], max_bytes: int):
+    """Encoded {"rows": ...} lines of JSON-encoded rows, split until under max_bytes"""
+    line = ('{"rows": [' + ', '.join(rows) + ']}').encode()
+    if len(line) <= max_bytes or len(rows) <= 1:
+        yield line
+        return
+    half = len(rows) // 2
+    yield from _ndjson_chunks(rows[:half], max_bytes)
+    yield from _ndjson_chunks(rows[half:], max_bytes)
+
+
+def _json_rows(batch, rows_as_json: bool) -> List[str]:
+    """Rows of a batch as JSON array strings"""
+    if rows_as_json:
+        return batch.column(0).to_pylist()
+    rows = zip(*(column.to_pylist() for column in batch.columns))
+    return [json.dumps(list(row), default=str) for row in rows]
+
+
+def _last_key(batch, key_index: List[int], rows_as_json: bool) -> list:
+    """page_key values of the last row of a non-empty batch"""
+    last = batch.num_rows - 1
+    if rows_as_json:
+        row = json.loads(batch.column(0)[last].as_py())
+        return [row[i] for i in key_index]
+    return [batch.column(i)[last].as_py() for i in key_index]
+
+
+def stream_sql(
+    db_path: str,
+    sql: str,
+    out: BinaryIO,
+    fmt: str = 'ndjson',
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    max_rows: Optional[int] = None,
+    cursor: Optional[str] = None,
+    page_key: Optional[Sequence[str]] = None,
+) -> dict:
+    """
+    Execute a query and stream its rows to out in bounded chunks.
+    
+    Each chunk holds at most chunk_rows rows and (approximately, never
+    splitting a row) max_chunk_bytes bytes. With max_rows the stream stops
+    after that many rows and the trailer's cursor continues the query;
+    paging needs page_key and orders the result by it.
+    
+    Returns the trailer dict (also written as the last line).
+    """
+    if fmt not in ('ndjson', 'arrow'):
+        raise ValueError(f"Unknown stream format: {fmt}")
+    paged = max_rows is not None or cursor is not None
+    if paged and not page_key:
+        raise ValueError("max_rows and cursor need page_key (unique, non-null columns to page on)")
+    if max_rows is not None and max_rows < 1:
+        raise ValueError("max_rows must be at least 1")
+    after = decode_cursor(sql, cursor) if cursor else None
+    inner = sql.strip().rstrip(';')
+    
+    con = get_connection(db_path, read_only=True)
+    try:
+        rows_as_json = fmt == 'ndjson'
+        try:
+            columns = _columns(con.execute(f"SELECT * FROM ({inner}) AS q LIMIT 0"))
+        except duckdb.ParserException:
+            if paged:
+                raise
+            # Statements that cannot be a subquery (PRAGMA, ...) run as-is
+            columns = None
+            rows_as_json = False
+        
+        key_index = []
+        if paged:
+            names = [c["name"] for c in columns]
+            missing = [k for k in page_key if k not in names]
+            if missing:
+                raise ValueError(f"page_key columns not in result: {missing}")
+            key_index = [names.index(k) for k in page_key]
+        
+        def run(step_after: Optional[list], limit: int):
+            if columns is None:
+                return con.execute(inner)
+            query, params = _page_query(inner, page_key, step_after, limit) if paged else (inner, [])
+            if rows_as_json:
+                query = f"SELECT json_array(*COLUMNS(*)) FROM ({query}) AS q"
+            return con.execute(query, params)
+        
+        header_written = False
+        writer = None
+        sent = 0
+        has_more = False
+        last_key = after
+        while True:
+            # A page is fetched PAGE_STEP_ROWS at a time (plus one row to
+            # detect more), each step seeking past the last key sent
+            step = 0
+            if paged:
+                step = PAGE_STEP_ROWS if max_rows is None else min(PAGE_STEP_ROWS, max_rows + 1 - sent)
+            result = run(last_key, step)
+            if not header_written:
+                if columns is None:
+                    columns = _columns(result)
+                header = {"columns": columns}
+                if fmt == 'arrow':
+                    header["format"] = "arrow"
+                _write_line(out, header)
+                header_written = True
+            reader = result.to_arrow_reader(chunk_rows)
+            if fmt == 'arrow' and writer is None:
+                import pyarrow as pa
+                writer = pa.ipc.new_stream(out, reader.schema)
+            
+            fetched = 0
+            for batch in reader:
+                fetched += batch.num_rows
+                if max_rows is not None and sent + batch.num_rows > max_rows:
+                    has_more = True
+                    batch = batch.slice(0, max_rows - sent)
+                if batch.num_rows:
+                    if writer is not None:
+                        for piece in _bounded_slices(batch, chunk_rows, max_chunk_bytes):
+                            writer.write_batch(piece)
+                    else:
+                        for line in _ndjson_chunks(_json_rows(batch, rows_as_json), max_chunk_bytes):
+                            out.write(line)
+                            out.write(b"\n")
+                    sent += batch.num_rows
+                    if paged:
+                        last_key = _last_key(batch, key_index, rows_as_json)
+                if has_more:
+                    break
+            if not paged or has_more or fetched < step:
+                break
+        
+        if writer is not None:
+            writer.close()
+            out.write(b"\n")
+    finally:
+        # For file-based databases, close connection
+        if db_path != ':memory:':
+            con.close()
+    
+    trailer = {
+        "done": True,
+        "rowCount": sent,
+        "cursor": encode_cursor(sql, last_key) if has_more else None,
+    }
+    _write_line(out, trailer)
+    out.flush()
+    return trailer
+
+
 def close_connection(db_path: str) -> dict:
     """Close database connection (for in-memory databases)"""
     try:
@@ -126,8 +370,19 @@ def close_connection(db_path: str) -> dict:
 def main():
     parser = argparse.ArgumentParser(description='DuckDB Direct SQL Execution')
     parser.add_argument('--db-path', required=True, help='Path to DuckDB file or :memory:')
-    parser.add_argument('--operation', required=True, choices=['execute_sql', 'query_sql', 'close'])
+    parser.add_argument('--operation', required=True, choices=['execute_sql', 'query_sql', 'stream_sql', 'close'])
     parser.add_argument('--sql', help='SQL statement or query')
+    parser.add_argument('--format', default='ndjson', choices=['ndjson', 'arrow'],
+                        help='stream_sql output format')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help='stream_sql: max rows per chunk')
+    parser.add_argument('--max-chunk-bytes', type=int, default=DEFAULT_MAX_CHUNK_BYTES,
+                        help='stream_sql: approximate max bytes per chunk')
+    parser.add_argument('--max-rows', type=int, help='stream_sql: stop after this many rows (page size)')
+    parser.add_argument('--cursor', help='stream_sql: cursor from the previous page trailer')
+    parser.add_argument('--page-key',
+                        help='stream_sql: comma-separated unique, non-null columns to page on '
+                             '(required with --max-rows/--cursor)')
     
     args = parser.parse_args()
     
@@ -143,7 +398,21 @@ def main():
             print(json.dumps({"columns": [], "rows": [], "error": "SQL query required"}))
             sys.exit(1)
         result = query_sql(args.db_path, args.sql)
-        print(json.dumps(result))
+        print(json.dumps(result, default=str))
+    
+    elif args.operation == 'stream_sql':
+        out = sys.stdout.buffer
+        if not args.sql:
+            _write_line(out, {"error": "SQL query required"})
+            sys.exit(1)
+        try:
+            stream_sql(args.db_path, args.sql, out, args.format, args.chunk_rows,
+                       args.max_chunk_bytes, args.max_rows, args.cursor,
+                       args.page_key.split(',') if args.page_key else None)
+        except Exception as e:
+            _write_line(out, {"error": str(e)})
+            out.flush()
+            sys.exit(1)
     
     elif args.operation == 'close':
         result = close_connection(args.db_path)
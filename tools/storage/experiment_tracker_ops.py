@@ -11,12 +11,13 @@ Follows existing pattern used by:
 """
 
 import json
+import sqlite3
 import sys
 import time
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Set
 
 # Import shared DuckDB adapter for proper connection management
 try:
@@ -43,6 +44,13 @@ except ImportError:
         return "lock" in msg or "conflicting" in msg or "could not set lock" in msg
 
 
+# Input roles (definition['inputs'] keys) recorded in experiment_inputs
+INPUT_ROLES = ('alerts', 'ohlcv', 'strategies')
+
+# Output artifact columns; an experiment's outputs are derived from its inputs
+OUTPUT_COLUMNS = ('output_trades', 'output_metrics', 'output_curves', 'output_diagnostics')
+
+
 # Input validation functions
 def validate_artifact_id(artifact_id: str) -> bool:
     """Validate artifact ID format (alphanumeric, hyphens, underscores only)"""
@@ -97,14 +105,16 @@ def ensure_schema(db_path: str) -> None:
     # Check if schema already exists using read-only connection (avoids write lock)
     try:
         with get_readonly_connection(db_path) as con:
-            # Try to query the experiments table - if it exists, schema is already there
+            # Try to query the tables - if they exist, schema is already there
             con.execute("SELECT 1 FROM experiments LIMIT 1")
+            con.execute("SELECT 1 FROM experiment_inputs LIMIT 1")
             return  # Schema exists, no need to create
     except Exception:
         # Schema doesn't exist or table doesn't exist, need to create it
         pass
     
-    # Schema doesn't exist - use write connection to create it
+    # Schema (or experiment_inputs) doesn't exist - use write connection to
+    # create it; this also backfills experiment_inputs from existing rows
     schema_sql = schema_path.read_text()
     with get_write_connection(db_path) as con:
         con.execute(schema_sql)
@@ -224,6 +234,18 @@ def create_experiment(db_path: str, definition: Dict[str, Any]) -> Dict[str, Any
                 git_commit, git_dirty, engine_version, created_at
             ))
             
+            # Insert input artifact edges
+            edges = [
+                (experiment_id, artifact_id, role)
+                for role in INPUT_ROLES
+                for artifact_id in inputs.get(role) or []
+            ]
+            if edges:
+                con.executemany(
+                    "INSERT OR IGNORE INTO experiment_inputs (experiment_id, artifact_id, role) VALUES (?, ?, ?)",
+                    edges
+                )
+            
             # Fetch created experiment
             row = con.execute(
                 "SELECT * FROM experiments WHERE experiment_id = ?",
@@ -455,6 +477,11 @@ def store_results(db_path: str, experiment_id: str, results: Dict[str, Any]) ->
             raise
 
 
+def _placeholders(values: Iterable[Any]) -> str:
+    """Comma-separated ? placeholders, one per value"""
+    return ", ".join("?" for _ in values)
+
+
 def find_by_input_artifacts(db_path: str, artifact_ids: List[str]) -> List[Dict[str, Any]]:
     """Find experiments by input artifact IDs"""
     ensure_schema(db_path)
@@ -466,34 +493,111 @@ def find_by_input_artifacts(db_path: str, artifact_ids: List[str]) -> List[Dict[
     
     # Use read-only connection for SELECT operation (allows concurrent reads)
     with get_readonly_connection(db_path) as con:
-        # Use parameterized LIKE queries for safe matching
-        # Since artifact IDs are validated, we can safely construct JSON pattern strings
-        # The pattern will be: %"artifact-id"% (JSON array format)
-        conditions = []
-        params = []
+        # Indexed lookup on experiment_inputs.artifact_id
+        rows = con.execute(
+            f"""
+            SELECT * FROM experiments
+            WHERE experiment_id IN (
+                SELECT experiment_id FROM experiment_inputs
+                WHERE artifact_id IN ({_placeholders(artifact_ids)})
+            )
+            ORDER BY created_at DESC
+            """,
+            list(artifact_ids)
+        ).fetchall()
         
-        for artifact_id in artifact_ids:
-            # Create JSON pattern string (artifact IDs are already validated)
-            # Format: "artifact-id" as it appears in JSON array
-            json_pattern = f'"{artifact_id}"'
-            # Use parameterized LIKE queries - all values come from params array
-            conditions.append("""
-                (input_alerts LIKE ? ESCAPE '\\'
-                 OR input_ohlcv LIKE ? ESCAPE '\\'
-                 OR (input_strategies IS NOT NULL AND input_strategies LIKE ? ESCAPE '\\'))
-            """)
-            # Add pattern with wildcards for LIKE matching
-            params.extend([f'%{json_pattern}%', f'%{json_pattern}%', f'%{json_pattern}%'])
+        return [row_to_dict(row) for row in rows]
+
+
+def _manifest_downstream(manifest_db: str, artifact_ids: Set[str]) -> Set[str]:
+    """Artifacts derived (transitively) from artifact_ids in the artifact manifest"""
+    con = sqlite3.connect(f"file:{manifest_db}?mode=ro", uri=True)
+    try:
+        rows = con.execute(
+            f"""
+            WITH RECURSIVE downstream(artifact_id) AS (
+                VALUES {", ".join("(?)" for _ in artifact_ids)}
+                UNION
+                SELECT l.artifact_id
+                FROM artifact_lineage l
+                JOIN downstream d ON l.input_artifact_id = d.artifact_id
+            )
+            SELECT artifact_id FROM downstream
+            """,
+            list(artifact_ids)
+        ).fetchall()
+    finally:
+        con.close()
+    return {row[0] for row in rows}
+
+
+def find_dependent_experiments(
+    db_path: str,
+    artifact_ids: List[str],
+    manifest_db: str = None,
+) -> List[Dict[str, Any]]:
+    """
+    Find experiments that depend on artifacts, directly or via derived artifacts.
+
+    Derived artifacts are the outputs of dependent experiments and, when
+    manifest_db is given, artifacts downstream in the artifact manifest's
+    lineage. Each experiment gets dependency 'direct' (consumes one of
+    artifact_ids) or 'derived'.
+    """
+    ensure_schema(db_path)
+    
+    for artifact_id in artifact_ids:
+        if not validate_artifact_id(artifact_id):
+            raise ValueError(f"Invalid artifact ID format: {artifact_id}")
+    
+    direct_ids = set(artifact_ids)
+    reached = set(artifact_ids)
+    frontier = set(artifact_ids)
+    dependency: Dict[str, str] = {}
+    
+    with get_readonly_connection(db_path) as con:
+        # Breadth-first over artifact -> consuming experiment -> output artifact
+        while frontier:
+            if manifest_db:
+                frontier |= _manifest_downstream(manifest_db, frontier) - reached
+                reached |= frontier
+            
+            rows = con.execute(
+                f"""
+                SELECT i.experiment_id, i.artifact_id, {", ".join(f"e.{c}" for c in OUTPUT_COLUMNS)}
+                FROM experiment_inputs i
+                JOIN experiments e ON e.experiment_id = i.experiment_id
+                WHERE i.artifact_id IN ({_placeholders(frontier)})
+                """,
+                list(frontier)
+            ).fetchall()
+            
+            outputs = set()
+            for experiment_id, artifact_id, *experiment_outputs in rows:
+                if artifact_id in direct_ids:
+                    dependency[experiment_id] = 'direct'
+                else:
+                    dependency.setdefault(experiment_id, 'derived')
+                outputs.update(o for o in experiment_outputs if o)
+            frontier = outputs - reached
+            reached |= frontier
         
-        where_clause = " OR ".join(conditions)
+        if not dependency:
+            return []
         
-        # Use parameterized query - all values are in params array, no string interpolation
         rows = con.execute(
-            f"SELECT * FROM experiments WHERE {where_clause} ORDER BY created_at DESC",
-            params
+            f"""
+            SELECT * FROM experiments
+            WHERE experiment_id IN ({_placeholders(dependency)})
+            ORDER BY created_at DESC
+            """,
+            list(dependency)
         ).fetchall()
-        
-        return [row_to_dict(row) for row in rows]
+    
+    return [
+        {**row_to_dict(row), 'dependency': dependency[row[0]]}
+        for row in rows
+    ]
 
 
 def main():
@@ -550,6 +654,12 @@ def main():
                 raise ValueError("Missing 'artifactIds' field")
             result = find_by_input_artifacts(db_path, artifact_ids)
         
+        elif operation == 'find_dependent_experiments':
+            artifact_ids = input_data.get('artifactIds')
+            if not artifact_ids:
+                raise ValueError("Missing 'artifactIds' field")
+            result = find_dependent_experiments(db_path, artifact_ids, input_data.get('manifestDb'))
+        
         else:
             raise ValueError(f"Unknown operation: {operation}")
         
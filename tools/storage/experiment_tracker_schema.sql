@@ -5,7 +5,8 @@
 --
 -- Design principles:
 -- - Experiments are immutable once created (except status and outputs)
--- - Input artifacts stored as JSON arrays for flexible querying
+-- - Input artifacts stored as JSON arrays for flexible querying, and as
+--   experiment_inputs edges for indexed lineage lookups
 -- - Output artifacts stored as separate columns for type safety
 -- - Provenance tracked for reproducibility
 
@@ -56,6 +57,33 @@ CREATE INDEX IF NOT EXISTS idx_experiments_commit ON experiments(git_commit);
 -- Index for experiment name searches
 CREATE INDEX IF NOT EXISTS idx_experiments_name ON experiments(name);
 
+-- Input artifact edges (one row per experiment x input artifact)
+-- Maintained by create_experiment; mirrors the input_* JSON arrays
+CREATE TABLE IF NOT EXISTS experiment_inputs (
+  experiment_id TEXT NOT NULL,
+  artifact_id TEXT NOT NULL,
+  role TEXT NOT NULL CHECK (role IN ('alerts', 'ohlcv', 'strategies')),
+  PRIMARY KEY (experiment_id, artifact_id, role)
+);
+
+-- Index for "which experiments consume this artifact" lookups
+CREATE INDEX IF NOT EXISTS idx_experiment_inputs_artifact ON experiment_inputs(artifact_id);
+
+-- Backfill edges for experiments created before experiment_inputs existed
+-- (idempotent)
+INSERT OR IGNORE INTO experiment_inputs (experiment_id, artifact_id, role)
+SELECT experiment_id, artifact_id, role FROM (
+  SELECT experiment_id, unnest(from_json(input_alerts, '["VARCHAR"]')) AS artifact_id, 'alerts' AS role
+  FROM experiments
+  UNION ALL
+  SELECT experiment_id, unnest(from_json(input_ohlcv, '["VARCHAR"]')), 'ohlcv'
+  FROM experiments
+  UNION ALL
+  SELECT experiment_id, unnest(from_json(input_strategies, '["VARCHAR"]')), 'strategies'
+  FROM experiments
+  WHERE input_strategies IS NOT NULL
+);
+
 -- Comments for documentation
 COMMENT ON TABLE experiments IS 'Experiment tracking with artifact lineage';
 COMMENT ON COLUMN experiments.experiment_id IS 'Unique experiment identifier';
@@ -78,4 +106,6 @@ COMMENT ON COLUMN experiments.started_at IS 'Execution start timestamp';
 COMMENT ON COLUMN experiments.completed_at IS 'Execution completion timestamp';
 COMMENT ON COLUMN experiments.duration_ms IS 'Execution duration in milliseconds';
 COMMENT ON COLUMN experiments.error IS 'Error message if failed';
+COMMENT ON TABLE experiment_inputs IS 'Input artifact edges of experiments (lineage lookups)';
+COMMENT ON COLUMN experiment_inputs.role IS 'Input role: alerts, ohlcv, strategies';
 
@@ -8,20 +8,39 @@ missing candle data from Birdeye API for each worklist item.
 For each worklist item, calculates the time window needed based on the largest
 missing window and fetches candles using the quantbot CLI.
 
+Batch mode (--batch) merges overlapping windows for the same mint into one
+request and runs requests with bounded concurrency, either one CLI process per
+merged request or one --batch-cmd process per JSONL file of requests.
+Completed requests are appended to --checkpoint so an interrupted run resumes
+where it stopped.
+
 Usage:
     python tools/storage/fetch_worklist_candles.py <worklist.json> [--interval 1m] [--dry-run]
+    python tools/storage/fetch_worklist_candles.py <worklist.json> --batch --concurrency 8 \
+        --checkpoint data/worklist.checkpoint.jsonl
 """
 
 import json
+import os
+import shlex
 import sys
 import argparse
 import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 
 TIME_WINDOWS = [12, 24, 36, 48, 72, 96]
 
+ISO_FMT = '%Y-%m-%dT%H:%M:%S'
+
+# Upper bound on one --batch-cmd process, however many requests its file holds
+MAX_BATCH_TIMEOUT_S = 3600
+
 
 def load_worklist(json_path: str) -> Dict[str, Any]:
     """Load worklist JSON from file."""
@@ -51,6 +70,26 @@ def calculate_time_window(alert_ts_ms: int, max_missing_window_hours: int) -> tu
     return from_time, to_time
 
 
+def build_fetch_cmd(
+    quantbot_cmd: str,
+    mint: str,
+    chain: str,
+    interval: str,
+    from_iso: str,
+    to_iso: str
+) -> List[str]:
+    """quantbot ohlcv fetch argv for one (chain, mint, interval, range) request."""
+    return [
+        quantbot_cmd,
+        'ohlcv', 'fetch',
+        '--mint', mint,
+        '--chain', chain,
+        '--interval', interval,
+        '--from', from_iso,
+        '--to', to_iso
+    ]
+
+
 def fetch_candles_for_item(
     item: Dict[str, Any],
     interval: str,
@@ -97,18 +136,10 @@ def fetch_candles_for_item(
         }
     
     # Build quantbot CLI command
-    from_iso = from_time.strftime('%Y-%m-%dT%H:%M:%S')
-    to_iso = to_time.strftime('%Y-%m-%dT%H:%M:%S')
+    from_iso = from_time.strftime(ISO_FMT)
+    to_iso = to_time.strftime(ISO_FMT)
     
-    cmd = [
-        quantbot_cmd,
-        'ohlcv', 'fetch',
-        '--mint', mint,
-        '--chain', chain,
-        '--interval', interval,
-        '--from', from_iso,
-        '--to', to_iso
-    ]
+    cmd = build_fetch_cmd(quantbot_cmd, mint, chain, interval, from_iso, to_iso)
     
     try:
         result = subprocess.run(
@@ -151,6 +182,236 @@ def fetch_candles_for_item(
         }
 
 
+def build_fetch_requests(
+    items: List[Dict[str, Any]],
+    interval: str,
+    merge_gap_hours: float = 0.0
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    Merge worklist items into minimal non-overlapping fetch requests.
+    
+    Each item needs [alert, alert + 1.1 * max missing window] (see
+    calculate_time_window). Windows for the same (chain, mint) that overlap,
+    or are at most merge_gap_hours apart, become one request.
+    
+    Returns:
+        (requests, skipped_item_indices). Each request has chain, mint,
+        interval, from, to, key and item_indices (positions in items).
+    """
+    windows: Dict[Tuple[str, str], List[Tuple[datetime, datetime, int]]] = {}
+    skipped: List[int] = []
+    for idx, item in enumerate(items):
+        missing_windows = item.get('missing_windows', [])
+        if not missing_windows:
+            skipped.append(idx)
+            continue
+        from_time, to_time = calculate_time_window(item['alert_ts_ms'], max(missing_windows))
+        windows.setdefault((item['chain'], item['mint']), []).append((from_time, to_time, idx))
+    
+    gap = timedelta(hours=merge_gap_hours)
+    requests: List[Dict[str, Any]] = []
+    for (chain, mint), spans in windows.items():
+        spans.sort()
+        merged: List[List[Any]] = []
+        for from_time, to_time, idx in spans:
+            if merged and from_time <= merged[-1][1] + gap:
+                merged[-1][1] = max(merged[-1][1], to_time)
+                merged[-1][2].append(idx)
+            else:
+                merged.append([from_time, to_time, [idx]])
+        for from_time, to_time, indices in merged:
+            from_iso = from_time.strftime(ISO_FMT)
+            to_iso = to_time.strftime(ISO_FMT)
+            requests.append({
+                'chain': chain,
+                'mint': mint,
+                'interval': interval,
+                'from': from_iso,
+                'to': to_iso,
+                'key': f"{chain}|{mint}|{interval}|{from_iso}|{to_iso}",
+                'item_indices': sorted(indices),
+            })
+    
+    # Deterministic order: first worklist position covered by each request
+    requests.sort(key=lambda r: r['item_indices'][0])
+    return requests, skipped
+
+
+def load_checkpoint(checkpoint_path: Optional[str]) -> Set[str]:
+    """Keys of requests a previous run completed successfully."""
+    done: Set[str] = set()
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn last line from an interrupted run
+                continue
+            if entry.get('success'):
+                done.add(entry['key'])
+    return done
+
+
+class _RateLimiter:
+    """Spaces process launches at least delay_s apart across threads."""
+    
+    def __init__(self, delay_s: float):
+        self.delay_s = delay_s
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+    
+    def wait(self) -> None:
+        if self.delay_s <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.delay_s
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+def _run_cmd(cmd: List[str], timeout: int) -> Dict[str, Any]:
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'success': False, 'error': f'Timeout after {timeout} seconds'}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    if result.returncode == 0:
+        return {'success': True, 'stdout': result.stdout, 'stderr': result.stderr}
+    return {
+        'success': False,
+        'error': result.stderr,
+        'stdout': result.stdout,
+        'returncode': result.returncode
+    }
+
+
+def fetch_requests(
+    requests: List[Dict[str, Any]],
+    quantbot_cmd: str = 'quantbot',
+    concurrency: int = 4,
+    rate_limit: float = 0.0,
+    checkpoint_path: Optional[str] = None,
+    batch_cmd: Optional[str] = None,
+    batch_size: int = 200,
+    timeout: int = 300
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run merged fetch requests with bounded concurrency.
+    
+    Without batch_cmd, each request is one `quantbot ohlcv fetch` process.
+    With batch_cmd (a command template containing {batch_file}), requests are
+    written batch_size at a time to a JSONL file (chain, mint, interval, from,
+    to per line) and the command runs once per file.
+    
+    Requests already in the checkpoint are not re-run; each finished request
+    is appended to it as it completes.
+    
+    Returns:
+        Result dictionary per request key.
+    """
+    done = load_checkpoint(checkpoint_path)
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = []
+    for req in requests:
+        if req['key'] in done:
+            results[req['key']] = {'success': True, 'skipped': True, 'reason': 'checkpoint'}
+        else:
+            pending.append(req)
+    
+    if batch_cmd:
+        units = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    else:
+        units = [[req] for req in pending]
+    
+    limiter = _RateLimiter(rate_limit)
+    checkpoint_lock = threading.Lock()
+    checkpoint_file = open(checkpoint_path, 'a') if checkpoint_path else None
+    
+    def run_unit(unit: List[Dict[str, Any]]) -> None:
+        limiter.wait()
+        if batch_cmd:
+            fd, batch_file = tempfile.mkstemp(prefix='worklist_batch_', suffix='.jsonl')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    for req in unit:
+                        f.write(json.dumps({k: req[k] for k in ('chain', 'mint', 'interval', 'from', 'to')}) + '\n')
+                cmd = [part.replace('{batch_file}', batch_file) for part in shlex.split(batch_cmd)]
+                outcome = _run_cmd(cmd, min(timeout * len(unit), MAX_BATCH_TIMEOUT_S))
+            finally:
+                os.unlink(batch_file)
+        else:
+            req = unit[0]
+            outcome = _run_cmd(
+                build_fetch_cmd(quantbot_cmd, req['mint'], req['chain'], req['interval'], req['from'], req['to']),
+                timeout
+            )
+        
+        with checkpoint_lock:
+            for req in unit:
+                results[req['key']] = outcome
+                if checkpoint_file:
+                    checkpoint_file.write(json.dumps({'key': req['key'], 'success': outcome['success']}) + '\n')
+            if checkpoint_file:
+                checkpoint_file.flush()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            for future in [pool.submit(run_unit, unit) for unit in units]:
+                future.result()
+    finally:
+        if checkpoint_file:
+            checkpoint_file.close()
+    
+    return results
+
+
+def fetch_worklist_batched(
+    items: List[Dict[str, Any]],
+    interval: str,
+    dry_run: bool = False,
+    merge_gap_hours: float = 0.0,
+    **fetch_kwargs: Any
+) -> List[Dict[str, Any]]:
+    """
+    Batch-mode counterpart of calling fetch_candles_for_item on every item.
+    
+    Returns one result per item, in worklist order; items sharing a merged
+    request share its outcome and carry its request_key.
+    """
+    requests, skipped = build_fetch_requests(items, interval, merge_gap_hours)
+    print(f"Merged {len(items) - len(skipped)} items into {len(requests)} fetch requests", file=sys.stderr)
+    
+    item_results: List[Dict[str, Any]] = [None] * len(items)
+    for idx in skipped:
+        item_results[idx] = {'success': True, 'skipped': True, 'reason': 'No missing windows'}
+    
+    if dry_run:
+        for req in requests:
+            print(f"[DRY RUN] Would fetch {req['mint']} ({req['chain']}) {req['interval']} "
+                  f"{req['from']} -> {req['to']} for {len(req['item_indices'])} items", file=sys.stderr)
+        outcomes = {req['key']: {'success': True, 'dry_run': True} for req in requests}
+    else:
+        outcomes = fetch_requests(requests, **fetch_kwargs)
+    
+    for req in requests:
+        for idx in req['item_indices']:
+            item_results[idx] = {
+                **outcomes[req['key']],
+                'mint': req['mint'],
+                'chain': req['chain'],
+                'request_key': req['key'],
+            }
+    return item_results
+
+
 def main():
     """Main script entry point."""
     parser = argparse.ArgumentParser(description=__doc__)
@@ -185,6 +446,43 @@ def main():
         default=1.0,
         help='Rate limit delay between fetches in seconds (default: 1.0)'
     )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Merge overlapping windows per mint and fetch requests concurrently'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='Fetch processes running at once in batch mode (default: 4)'
+    )
+    parser.add_argument(
+        '--merge-gap-hours',
+        type=float,
+        default=0.0,
+        help='Also merge windows for the same mint at most this far apart (default: 0)'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        help='JSONL file of completed requests; rerunning with it resumes (batch mode)'
+    )
+    parser.add_argument(
+        '--batch-cmd',
+        help='Batch fetcher command template with {batch_file}, run once per JSONL file of requests '
+             '(batch mode; default: one quantbot process per request)'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=200,
+        help='Requests per --batch-cmd file (default: 200)'
+    )
+    parser.add_argument(
+        '--coverage-index',
+        metavar='DUCKDB',
+        help='Refresh the candle coverage index in this DuckDB file after fetching'
+    )
     
     args = parser.parse_args()
     
@@ -208,32 +506,48 @@ def main():
         failed = 0
         skipped = 0
         
-        for idx, item in enumerate(worklist_items, 1):
-            print(f"Processing item {idx}/{len(worklist_items)}: {item['mint'][:16]}...", file=sys.stderr, end=' ')
-            
-            result = fetch_candles_for_item(
-                item,
+        if args.batch:
+            results = fetch_worklist_batched(
+                worklist_items,
                 args.interval,
                 dry_run=args.dry_run,
-                quantbot_cmd=args.quantbot_cmd
+                merge_gap_hours=args.merge_gap_hours,
+                quantbot_cmd=args.quantbot_cmd,
+                concurrency=args.concurrency,
+                rate_limit=args.rate_limit,
+                checkpoint_path=args.checkpoint,
+                batch_cmd=args.batch_cmd,
+                batch_size=args.batch_size
             )
+            skipped = sum(1 for r in results if r.get('skipped'))
+            successful = sum(1 for r in results if r['success'] and not r.get('skipped'))
+            failed = sum(1 for r in results if not r['success'])
+        else:
+            for idx, item in enumerate(worklist_items, 1):
+                print(f"Processing item {idx}/{len(worklist_items)}: {item['mint'][:16]}...", file=sys.stderr, end=' ')
             
-            results.append(result)
+                result = fetch_candles_for_item(
+                    item,
+                    args.interval,
+                    dry_run=args.dry_run,
+                    quantbot_cmd=args.quantbot_cmd
+                )
             
-            if result.get('skipped'):
-                print("SKIPPED", file=sys.stderr)
-                skipped += 1
-            elif result['success']:
-                print("SUCCESS", file=sys.stderr)
-                successful += 1
-            else:
-                print(f"FAILED: {result.get('error', 'Unknown error')}", file=sys.stderr)
-                failed += 1
+                results.append(result)
+            
+                if result.get('skipped'):
+                    print("SKIPPED", file=sys.stderr)
+                    skipped += 1
+                elif result['success']:
+                    print("SUCCESS", file=sys.stderr)
+                    successful += 1
+                else:
+                    print(f"FAILED: {result.get('error', 'Unknown error')}", file=sys.stderr)
+                    failed += 1
             
-            # Rate limiting (except for last item)
-            if idx < len(worklist_items) and not args.dry_run:
-                import time
-                time.sleep(args.rate_limit)
+                # Rate limiting (except for last item)
+                if idx < len(worklist_items) and not args.dry_run:
+                    time.sleep(args.rate_limit)
         
         # Print summary
         print(f"\n{'='*70}", file=sys.stderr)
@@ -244,12 +558,20 @@ def main():
         print(f"  Skipped: {skipped}", file=sys.stderr)
         print(f"{'='*70}\n", file=sys.stderr)
         
+        if args.coverage_index and successful and not args.dry_run:
+            from build_coverage_index import refresh_index
+            try:
+                refresh_index(args.coverage_index, [args.interval], verbose=True)
+            except Exception as e:
+                print(f"[warning] Coverage index refresh failed: {e}", file=sys.stderr)
+        
         # Output results as JSON
         output_data = {
             'metadata': {
                 'worklist_file': args.worklist_json,
                 'interval': args.interval,
                 'dry_run': args.dry_run,
+                'batch': args.batch,
                 'total_items': len(worklist_items),
                 'successful': successful,
                 'failed': failed,
@@ -16,6 +16,9 @@ Matrix structure:
 Usage:
     python3 ohlcv_horizon_coverage_matrix.py --duckdb data/tele.duckdb --interval 1m
     python3 ohlcv_horizon_coverage_matrix.py --duckdb data/tele.duckdb --interval 5m --visualize
+
+If the DuckDB file holds a coverage index for the interval (see
+build_coverage_index.py), coverage is read from it and ClickHouse is not queried.
 """
 
 import argparse
@@ -32,6 +35,12 @@ if _shared_path not in sys.path:
     sys.path.insert(0, _shared_path)
 from progress_bar import ProgressBar
 
+# Add workspace root to path for tools.shared imports
+_workspace_root = os.path.join(os.path.dirname(__file__), '..', '..')
+if _workspace_root not in sys.path:
+    sys.path.insert(0, _workspace_root)
+from tools.shared.coverage_index import CoverageIndex, load_coverage_index
+
 # Suppress deprecation warnings
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 
@@ -312,6 +321,30 @@ def normalize_chain(chain: str) -> str:
     return chain_map.get(chain_lower, chain_lower)
 
 
+def horizon_window(alert_ts_ms: int, horizon_hours: int, window_minutes: int = 60) -> Tuple[int, int]:
+    """Window (unix seconds, inclusive) around a horizon point."""
+    horizon_ts_ms = alert_ts_ms + (horizon_hours * 3600 * 1000)
+    window_start_ms = horizon_ts_ms - (window_minutes * 60 * 1000)
+    window_end_ms = horizon_ts_ms + (window_minutes * 60 * 1000)
+    return window_start_ms // 1000, window_end_ms // 1000
+
+
+def check_coverage_at_horizon_indexed(
+    coverage_index: CoverageIndex,
+    mint: str,
+    chain: str,
+    alert_ts_ms: int,
+    horizon_hours: int,
+    interval: str,
+    window_minutes: int = 60,
+) -> bool:
+    """Same check as check_coverage_at_horizon, answered from the coverage index."""
+    window_start_sec, window_end_sec = horizon_window(alert_ts_ms, horizon_hours, window_minutes)
+    return coverage_index.candle_count(
+        normalize_chain(chain), mint, interval, window_start_sec, window_end_sec
+    ) > 0
+
+
 def check_coverage_at_horizon(
     ch_client: ClickHouseClient,
     database: str,
@@ -343,15 +376,7 @@ def check_coverage_at_horizon(
     # Normalize chain to lowercase
     normalized_chain = normalize_chain(chain)
     
-    # Calculate horizon timestamp
-    horizon_ts_ms = alert_ts_ms + (horizon_hours * 3600 * 1000)
-    
-    # Calculate window around horizon
-    window_start_ms = horizon_ts_ms - (window_minutes * 60 * 1000)
-    window_end_ms = horizon_ts_ms + (window_minutes * 60 * 1000)
-    
-    window_start_sec = window_start_ms // 1000
-    window_end_sec = window_end_ms // 1000
+    window_start_sec, window_end_sec = horizon_window(alert_ts_ms, horizon_hours, window_minutes)
     
     # Escape values for SQL (use parameterized query if possible, but ClickHouse driver may not support it)
     escaped_mint = mint.replace("'", "''")
@@ -403,15 +428,19 @@ def check_coverage_at_horizon(
 
 def calculate_coverage_matrix(
     conn: duckdb.DuckDBPyConnection,
-    ch_client: ClickHouseClient,
+    ch_client: Optional[ClickHouseClient],
     database: str,
     interval: str,
     progress_callback: Optional[callable] = None,
-    debug: bool = False
+    debug: bool = False,
+    coverage_index: Optional[CoverageIndex] = None
 ) -> Tuple[Dict[str, Dict[int, float]], Dict[str, int]]:
     """
     Calculate coverage matrix: month -> horizon -> coverage percentage.
     
+    With a coverage_index, horizons are checked against the index instead
+    of one ClickHouse query per alert and horizon.
+    
     Returns:
         Tuple of (coverage_matrix, total_alerts)
         coverage_matrix: Dict mapping month_key -> horizon_hours -> coverage_percentage
@@ -451,16 +480,21 @@ def calculate_coverage_matrix(
                 alert_ts_ms = alert['alert_timestamp']
                 
                 for horizon in HORIZONS:
-                    has_coverage = check_coverage_at_horizon(
-                        ch_client,
-                        database,
-                        mint,
-                        chain,
-                        alert_ts_ms,
-                        horizon,
-                        interval,
-                        debug=debug
-                    )
+                    if coverage_index is not None:
+                        has_coverage = check_coverage_at_horizon_indexed(
+                            coverage_index, mint, chain, alert_ts_ms, horizon, interval
+                        )
+                    else:
+                        has_coverage = check_coverage_at_horizon(
+                            ch_client,
+                            database,
+                            mint,
+                            chain,
+                            alert_ts_ms,
+                            horizon,
+                            interval,
+                            debug=debug
+                        )
                     
                     if has_coverage:
                         matrix[month_key][horizon] += 1
@@ -598,6 +632,8 @@ def main():
     parser.add_argument('--visualize', action='store_true', help='Print visualization')
     parser.add_argument('--skip-storage', action='store_true', help='Skip storing in DuckDB')
     parser.add_argument('--debug', action='store_true', help='Enable debug output for coverage checks')
+    parser.add_argument('--no-coverage-index', action='store_true',
+                        help='Query ClickHouse even if a coverage index is available')
     
     args = parser.parse_args()
     
@@ -622,7 +658,17 @@ def main():
         print("\nTip: If you have alert data in a different database, use --duckdb to point to it.", file=sys.stderr)
         sys.exit(1)
     
-    ch_client, database = get_clickhouse_client()
+    coverage_index = None
+    if not args.no_coverage_index:
+        coverage_index = load_coverage_index(conn, args.interval)
+        if not coverage_index.is_indexed(args.interval):
+            coverage_index = None
+    
+    if coverage_index is not None:
+        print(f"Using coverage index ({len(coverage_index):,} tokens)", file=sys.stderr)
+        ch_client, database = None, None
+    else:
+        ch_client, database = get_clickhouse_client()
     
     # Create schema
     if not args.skip_storage:
@@ -630,7 +676,9 @@ def main():
     
     # Calculate matrix
     print(f"Calculating coverage matrix for {args.interval} candles...", file=sys.stderr)
-    matrix, total_alerts = calculate_coverage_matrix(conn, ch_client, database, args.interval, debug=args.debug)
+    matrix, total_alerts = calculate_coverage_matrix(
+        conn, ch_client, database, args.interval, debug=args.debug, coverage_index=coverage_index
+    )
     
     # Store in DuckDB
     if not args.skip_storage:
@@ -12,6 +12,9 @@ Usage:
     python3 populate_coverage_matrix.py --duckdb data/tele.duckdb --caller Brook
     python3 populate_coverage_matrix.py --duckdb data/tele.duckdb --refresh-all
     python3 populate_coverage_matrix.py --duckdb data/tele.duckdb --start-month 2025-11 --end-month 2025-12
+
+Step 2 reads the coverage index (build_coverage_index.py) when the DuckDB file
+has one, and only falls back to per-alert ClickHouse queries without it.
 """
 
 import argparse
@@ -21,6 +24,12 @@ import warnings
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+# Add workspace root to path for tools.shared imports
+_workspace_root = os.path.join(os.path.dirname(__file__), '..', '..')
+if _workspace_root not in sys.path:
+    sys.path.insert(0, _workspace_root)
+from tools.shared.coverage_index import CoverageIndex, interval_label, load_coverage_index  # noqa: E402
+
 # Suppress deprecation warnings
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 
@@ -225,7 +234,8 @@ def check_ohlcv_coverage(
     trigger_ts_ms: int,
     pre_window_minutes: int = 260,
     post_window_minutes: int = 1440,
-    interval: str = '5m'
+    interval: str = '5m',
+    coverage_index: Optional[CoverageIndex] = None
 ) -> Dict:
     """
     Check OHLCV coverage for a specific token-alert combination.
@@ -233,6 +243,8 @@ def check_ohlcv_coverage(
     Uses a simplified approach: first check if ANY data exists, then check specific interval.
     This is more robust and handles errors better.
     
+    With a coverage_index, all counts come from the index and ch_client is unused.
+    
     Returns:
         {
             'has_ohlcv_data': bool,
@@ -275,6 +287,24 @@ def check_ohlcv_coverage(
     start_ts_seconds = coverage_start_ts_ms // 1000
     end_ts_seconds = coverage_end_ts_ms // 1000
     
+    if coverage_index is not None:
+        counts = {
+            interval_label(iv): coverage_index.candle_count(chain, mint, iv, start_ts_seconds, end_ts_seconds)
+            for iv in coverage_index.intervals_for(chain, mint)
+        }
+        intervals_available = [label for label, count in counts.items() if count > 0]
+        actual_candles = counts.get(interval, 0)
+        coverage_ratio = actual_candles / expected_candles if expected_candles > 0 else 0.0
+        return {
+            'has_ohlcv_data': bool(intervals_available),
+            'coverage_ratio': min(1.0, coverage_ratio),
+            'expected_candles': expected_candles,
+            'actual_candles': actual_candles,
+            'intervals_available': intervals_available,
+            'coverage_start_ts_ms': coverage_start_ts_ms,
+            'coverage_end_ts_ms': coverage_end_ts_ms
+        }
+    
     # Initialize defaults
     actual_candles = 0
     intervals_available_str = []
@@ -355,12 +385,13 @@ def check_ohlcv_coverage(
 def upsert_coverage_matrix(
     conn: duckdb.DuckDBPyConnection,
     alerts: List[Dict],
-    ch_client: ClickHouseClient,
-    database: str,
+    ch_client: Optional[ClickHouseClient],
+    database: Optional[str],
     pre_window_minutes: int = 260,
     post_window_minutes: int = 1440,
     interval: str = '5m',
-    verbose: bool = False
+    verbose: bool = False,
+    coverage_index: Optional[CoverageIndex] = None
 ) -> Dict[str, int]:
     """
     Upsert coverage data into the coverage matrix table.
@@ -384,7 +415,8 @@ def upsert_coverage_matrix(
                 alert['trigger_ts_ms'],
                 pre_window_minutes,
                 post_window_minutes,
-                interval
+                interval,
+                coverage_index=coverage_index
             )
             
             # Upsert into coverage matrix
@@ -469,6 +501,8 @@ def main():
     parser.add_argument('--post-window', type=int, default=1440, help='Post-window minutes (default: 1440)')
     parser.add_argument('--interval', default='5m', help='OHLCV interval to check (default: 5m)')
     parser.add_argument('--verbose', action='store_true', help='Show verbose output')
+    parser.add_argument('--no-coverage-index', action='store_true',
+                        help='Query ClickHouse even if a coverage index is available')
     
     args = parser.parse_args()
     
@@ -481,10 +515,6 @@ def main():
             print("Connecting to DuckDB...", file=sys.stderr, flush=True)
         duckdb_conn = get_duckdb_connection(args.duckdb)
         
-        if args.verbose:
-            print("Connecting to ClickHouse...", file=sys.stderr, flush=True)
-        ch_client, database = get_clickhouse_client()
-        
         # Get alerts to process
         if args.verbose:
             print("Fetching alerts from DuckDB...", file=sys.stderr, flush=True)
@@ -503,6 +533,20 @@ def main():
             print("No alerts to process", file=sys.stderr, flush=True)
             return 0
         
+        coverage_index = None
+        database = None
+        if not args.no_coverage_index:
+            coverage_index = load_coverage_index(duckdb_conn, mints={a['mint'] for a in alerts})
+            if not coverage_index.is_indexed(args.interval):
+                coverage_index = None
+        if coverage_index is not None:
+            if args.verbose:
+                print(f"Using coverage index ({len(coverage_index):,} token ranges)", file=sys.stderr, flush=True)
+        else:
+            if args.verbose:
+                print("Connecting to ClickHouse...", file=sys.stderr, flush=True)
+            ch_client, database = get_clickhouse_client()
+        
         # Process alerts and update coverage matrix
         if args.verbose:
             print("Processing coverage checks...", file=sys.stderr, flush=True)
@@ -515,7 +559,8 @@ def main():
             pre_window_minutes=args.pre_window,
             post_window_minutes=args.post_window,
             interval=args.interval,
-            verbose=args.verbose
+            verbose=args.verbose,
+            coverage_index=coverage_index
         )
         
         # Print summary
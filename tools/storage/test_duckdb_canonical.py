@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for duckdb_canonical.py
+
+Bulk ingest, address normalization and keyset pagination.
+"""
+
+import unittest
+from pathlib import Path
+
+try:
+    import duckdb
+except ImportError:
+    print("Skipping tests: duckdb not installed")
+    exit(0)
+
+# Import the module under test
+import sys
+sys.path.insert(0, str(Path(__file__).parent))
+
+from duckdb_canonical import (
+    events_to_table,
+    init_schema,
+    query_canonical_events,
+    store_canonical_event,
+    store_canonical_events_batch,
+    store_canonical_events_table,
+)
+
+
+def make_event(i, address='So1AnaMint', minute=None, value=None):
+    minute = i % 60 if minute is None else minute
+    return {
+        "id": f"evt-{i}",
+        "asset": {"address": address, "chain": "solana"},
+        "venue": {"name": "birdeye", "type": "data_provider"},
+        "timestamp": f"2025-01-01T00:{minute:02d}:00Z",
+        "eventType": "price",
+        "value": value if value is not None else {"price": i},
+    }
+
+
+class TestDuckDBCanonical(unittest.TestCase):
+    """Test suite for duckdb_canonical module."""
+
+    def setUp(self):
+        self.con = duckdb.connect(':memory:')
+
+    def tearDown(self):
+        self.con.close()
+
+    def test_batch_matches_single_inserts(self):
+        events = [make_event(i) for i in range(20)] + [make_event(3, value={"price": -1})]
+        store_canonical_events_batch(self.con, events)
+
+        single = duckdb.connect(':memory:')
+        for event in events:
+            store_canonical_event(single, event)
+
+        query = "SELECT * EXCLUDE (created_at) FROM canonical_events ORDER BY id"
+        self.assertEqual(self.con.execute(query).fetchall(), single.execute(query).fetchall())
+        single.close()
+
+    def test_table_insert_dedupes_and_keeps_existing(self):
+        init_schema(self.con)
+        store_canonical_events_batch(self.con, [make_event(1, value={"price": 1})])
+        table = events_to_table([make_event(1, value={"price": 2}), make_event(2)])
+        store_canonical_events_table(self.con, table, replace=False)
+        rows = self.con.execute("SELECT id, value_json FROM canonical_events ORDER BY id").fetchall()
+        self.assertEqual(rows, [("evt-1", '{"price": 1}'), ("evt-2", '{"price": 2}')])
+
+    def test_address_filter_is_case_insensitive(self):
+        store_canonical_events_batch(self.con, [
+            make_event(1, address='0xAbCdEf'),
+            make_event(2, address='0xabcdef'),
+            make_event(3, address='0x123456'),
+        ])
+        result = query_canonical_events(self.con, {"assetAddress": "0xABCDEF"})
+        self.assertEqual(result["total"], 2)
+        self.assertEqual({e["asset"]["address"] for e in result["events"]}, {'0xAbCdEf', '0xabcdef'})
+
+    def test_cursor_pages_cover_offset_order(self):
+        # Timestamp ties force the id tiebreak
+        store_canonical_events_batch(self.con, [make_event(i, minute=i % 4) for i in range(25)])
+        full = query_canonical_events(self.con, {"limit": 100})
+        self.assertIsNone(full["nextCursor"])
+
+        ids, cursor = [], None
+        while True:
+            page = query_canonical_events(self.con, {"limit": 6, "cursor": cursor})
+            ids.extend(e["id"] for e in page["events"])
+            cursor = page["nextCursor"]
+            if cursor is None:
+                break
+        self.assertEqual(ids, [e["id"] for e in full["events"]])
+        self.assertEqual(page["total"], 25)
+
+    def test_invalid_cursor(self):
+        init_schema(self.con)
+        with self.assertRaises(ValueError):
+            query_canonical_events(self.con, {"cursor": "not-a-cursor"})
+
+
+if __name__ == '__main__':
+    unittest.main()
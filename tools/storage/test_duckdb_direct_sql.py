@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for duckdb_direct_sql.py connection handling and stream_sql chunking.
+"""
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import duckdb
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import duckdb_direct_sql as direct_sql
+
+
+def read_ndjson(data: bytes) -> list:
+    return [json.loads(line) for line in data.splitlines() if line]
+
+
+class TestDirectSql(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / "test.duckdb")
+        con = duckdb.connect(self.db_path)
+        con.execute("CREATE TABLE t AS SELECT range AS id, 'row_' || range AS label FROM range(2500)")
+        con.close()
+        self.sql = "SELECT * FROM t ORDER BY id"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_file_connections_are_released(self):
+        direct_sql.execute_sql(self.db_path, "CREATE TABLE u (x INTEGER)")
+        direct_sql.stream_sql(self.db_path, self.sql, io.BytesIO())
+        self.assertNotIn(self.db_path, direct_sql._connection_cache)
+        # No connection left holding the file: another one can write
+        con = duckdb.connect(self.db_path)
+        con.execute("INSERT INTO u VALUES (1)")
+        con.close()
+
+    def test_write_after_query(self):
+        direct_sql.query_sql(self.db_path, "SELECT 1")
+        result = direct_sql.execute_sql(self.db_path, "INSERT INTO t VALUES (9999, 'x')")
+        self.assertTrue(result["success"])
+        rows = direct_sql.query_sql(self.db_path, "SELECT count(*) FROM t")["rows"]
+        self.assertEqual(rows[0][0], 2501)
+
+    def test_ndjson_chunks_respect_row_bound(self):
+        out = io.BytesIO()
+        trailer = direct_sql.stream_sql(self.db_path, self.sql, out, chunk_rows=1000)
+        lines = read_ndjson(out.getvalue())
+        self.assertEqual([c["name"] for c in lines[0]["columns"]], ["id", "label"])
+        chunks = [line["rows"] for line in lines[1:-1]]
+        self.assertTrue(all(len(rows) <= 1000 for rows in chunks))
+        self.assertEqual([row[0] for rows in chunks for row in rows], list(range(2500)))
+        self.assertEqual(lines[-1], trailer)
+        self.assertEqual(trailer, {"done": True, "rowCount": 2500, "cursor": None})
+
+    def test_ndjson_chunks_respect_byte_bound(self):
+        out = io.BytesIO()
+        direct_sql.stream_sql(self.db_path, self.sql, out, max_chunk_bytes=2048)
+        for line in out.getvalue().splitlines()[1:-1]:
+            self.assertLessEqual(len(line), 2048)
+
+    def test_cursor_pages_through_query(self):
+        ids = []
+        cursor = None
+        pages = 0
+        while True:
+            out = io.BytesIO()
+            trailer = direct_sql.stream_sql(self.db_path, self.sql, out, max_rows=1000, cursor=cursor,
+                                            page_key=["id"])
+            ids.extend(row[0] for line in read_ndjson(out.getvalue())[1:-1] for row in line["rows"])
+            pages += 1
+            cursor = trailer["cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, list(range(2500)))
+
+    def test_cursor_pages_on_composite_key(self):
+        sql = "SELECT id % 7 AS bucket, id, label FROM t"
+        seen = []
+        cursor = None
+        while True:
+            out = io.BytesIO()
+            # Pages span several keyset steps
+            with mock.patch.object(direct_sql, "PAGE_STEP_ROWS", 250):
+                trailer = direct_sql.stream_sql(self.db_path, sql, out, max_rows=600, cursor=cursor,
+                                                page_key=["bucket", "id"])
+            seen.extend((row[0], row[1]) for line in read_ndjson(out.getvalue())[1:-1] for row in line["rows"])
+            cursor = trailer["cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, sorted((i % 7, i) for i in range(2500)))
+
+    def test_paging_needs_page_key(self):
+        with self.assertRaises(ValueError):
+            direct_sql.stream_sql(self.db_path, self.sql, io.BytesIO(), max_rows=10)
+
+    def test_cursor_rejects_other_query(self):
+        cursor = direct_sql.encode_cursor(self.sql, [100])
+        with self.assertRaises(ValueError):
+            direct_sql.decode_cursor("SELECT 1", cursor)
+
+    def test_ndjson_renders_values_like_query_sql(self):
+        sql = "SELECT 1 AS i, 2.5 AS f, 'a\"b' AS s, NULL AS n, TIMESTAMP '2025-01-01 00:01:00' AS ts"
+        out = io.BytesIO()
+        direct_sql.stream_sql(self.db_path, sql, out)
+        self.assertEqual(read_ndjson(out.getvalue())[1]["rows"], [[1, 2.5, 'a"b', None, "2025-01-01 00:01:00"]])
+
+    def test_arrow_stream(self):
+        import pyarrow as pa
+
+        out = io.BytesIO()
+        direct_sql.stream_sql(self.db_path, self.sql, out, fmt="arrow", chunk_rows=700)
+        data = out.getvalue()
+        header_end = data.index(b"\n")
+        self.assertEqual(json.loads(data[:header_end])["format"], "arrow")
+        reader = pa.ipc.open_stream(io.BytesIO(data[header_end + 1:]))
+        table = reader.read_all()
+        self.assertEqual(table.column("id").to_pylist(), list(range(2500)))
+        trailer = json.loads(data.rstrip(b"\n").rsplit(b"\n", 1)[-1])
+        self.assertEqual(trailer["rowCount"], 2500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for experiment_tracker_ops.py
+
+Input artifact edges (experiment_inputs), backfill and dependency lookups.
+"""
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import duckdb
+except ImportError:
+    print("Skipping tests: duckdb not installed")
+    exit(0)
+
+# Import the module under test
+import sys
+sys.path.insert(0, str(Path(__file__).parent))
+
+from experiment_tracker_ops import (
+    create_experiment,
+    find_by_input_artifacts,
+    find_dependent_experiments,
+    store_results,
+)
+
+
+def make_definition(experiment_id, alerts, ohlcv, strategies=None, created_at='2026-01-01T00:00:00'):
+    inputs = {'alerts': alerts, 'ohlcv': ohlcv}
+    if strategies:
+        inputs['strategies'] = strategies
+    return {
+        'experimentId': experiment_id,
+        'name': experiment_id,
+        'inputs': inputs,
+        'config': {},
+        'provenance': {
+            'gitCommit': 'abc123',
+            'gitDirty': False,
+            'engineVersion': '1.0.0',
+            'createdAt': created_at,
+        },
+    }
+
+
+class TestExperimentInputs(unittest.TestCase):
+    """Test suite for experiment input lineage."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.temp_dir.name) / 'experiments.duckdb')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def ids(self, experiments):
+        return sorted(e['experimentId'] for e in experiments)
+
+    def test_find_by_input_artifacts_is_exact(self):
+        create_experiment(self.db_path, make_definition('exp-1', ['alert_1'], ['ohlcv-1']))
+        create_experiment(self.db_path, make_definition('exp-2', ['alertX1'], ['ohlcv-1'], ['strat-1']))
+
+        # '_' was a LIKE wildcard in the old text match
+        self.assertEqual(self.ids(find_by_input_artifacts(self.db_path, ['alert_1'])), ['exp-1'])
+        self.assertEqual(self.ids(find_by_input_artifacts(self.db_path, ['ohlcv-1'])), ['exp-1', 'exp-2'])
+        self.assertEqual(self.ids(find_by_input_artifacts(self.db_path, ['strat-1'])), ['exp-2'])
+
+    def test_backfill_for_existing_database(self):
+        schema_sql = (Path(__file__).parent / 'experiment_tracker_schema.sql').read_text()
+        old_schema = schema_sql.split('-- Input artifact edges')[0]
+        with duckdb.connect(self.db_path) as con:
+            con.execute(old_schema)
+            con.execute("""
+                INSERT INTO experiments (experiment_id, name, input_alerts, input_ohlcv, input_strategies,
+                                         config, git_commit, git_dirty, engine_version)
+                VALUES ('exp-old', 'old', '["alert-1", "alert-2"]', '["ohlcv-1"]', NULL, '{}', 'abc', false, '1')
+            """)
+
+        self.assertEqual(self.ids(find_by_input_artifacts(self.db_path, ['alert-2'])), ['exp-old'])
+        with duckdb.connect(self.db_path) as con:
+            edges = con.execute("SELECT artifact_id, role FROM experiment_inputs ORDER BY artifact_id").fetchall()
+        self.assertEqual(edges, [('alert-1', 'alerts'), ('alert-2', 'alerts'), ('ohlcv-1', 'ohlcv')])
+
+    def test_dependents_via_outputs_and_manifest(self):
+        # exp-a consumes ohlcv-1 and produces trades-a; exp-b consumes trades-a.
+        # In the manifest, ohlcv-2 is derived from ohlcv-1 and consumed by exp-c.
+        create_experiment(self.db_path, make_definition('exp-a', ['alert-1'], ['ohlcv-1']))
+        store_results(self.db_path, 'exp-a', {'tradesArtifactId': 'trades-a'})
+        create_experiment(self.db_path, make_definition('exp-b', ['trades-a'], ['ohlcv-9']))
+        create_experiment(self.db_path, make_definition('exp-c', ['alert-2'], ['ohlcv-2']))
+        create_experiment(self.db_path, make_definition('exp-d', ['alert-3'], ['ohlcv-3']))
+
+        dependents = find_dependent_experiments(self.db_path, ['ohlcv-1'])
+        self.assertEqual({e['experimentId']: e['dependency'] for e in dependents},
+                         {'exp-a': 'direct', 'exp-b': 'derived'})
+
+        manifest_db = str(Path(self.temp_dir.name) / 'manifest.sqlite')
+        with sqlite3.connect(manifest_db) as con:
+            con.execute("CREATE TABLE artifact_lineage (artifact_id TEXT, input_artifact_id TEXT)")
+            con.execute("INSERT INTO artifact_lineage VALUES ('ohlcv-2', 'ohlcv-1')")
+        dependents = find_dependent_experiments(self.db_path, ['ohlcv-1'], manifest_db)
+        self.assertEqual({e['experimentId']: e['dependency'] for e in dependents},
+                         {'exp-a': 'direct', 'exp-b': 'derived', 'exp-c': 'derived'})
+
+        self.assertEqual(find_dependent_experiments(self.db_path, ['unused-1']), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for fetch_worklist_candles.py batch mode.
+
+Uses a stub fetcher script in place of the quantbot CLI.
+"""
+
+import json
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fetch_worklist_candles import (
+    build_fetch_requests,
+    fetch_requests,
+    fetch_worklist_batched,
+    load_checkpoint,
+)
+
+HOUR_MS = 3600 * 1000
+T0 = 1_735_689_600_000  # 2025-01-01T00:00:00Z
+
+STUB_FETCHER = """#!{python}
+import json, sys
+argv = sys.argv[1:]
+with open({log!r}, 'a') as f:
+    f.write(json.dumps(argv) + '\\n')
+if {fail_mint!r} in argv:
+    sys.exit(1)
+if argv and argv[0] == '--batch-file':
+    with open(argv[1]) as batch, open({log!r}, 'a') as f:
+        for line in batch:
+            f.write(json.dumps(json.loads(line)) + '\\n')
+"""
+
+
+def item(mint, alert_ts_ms, missing_windows, chain='solana'):
+    return {'mint': mint, 'chain': chain, 'alert_ts_ms': alert_ts_ms, 'missing_windows': missing_windows}
+
+
+class TestBuildFetchRequests(unittest.TestCase):
+    """Window merging."""
+
+    def test_overlapping_windows_merge_per_mint(self):
+        items = [
+            item('MintA', T0, [24]),                  # [T0, T0+26h]
+            item('MintB', T0, [12]),
+            item('MintA', T0 + 10 * HOUR_MS, [48]),   # overlaps first -> [T0, T0+62h]
+            item('MintA', T0 + 200 * HOUR_MS, [12]),  # separate
+            item('MintA', T0, []),                    # nothing missing
+        ]
+        requests, skipped = build_fetch_requests(items, '1m')
+
+        self.assertEqual(skipped, [4])
+        self.assertEqual([r['item_indices'] for r in requests], [[0, 2], [1], [3]])
+        merged = requests[0]
+        self.assertEqual(merged['mint'], 'MintA')
+        first_to = build_fetch_requests([items[2]], '1m')[0][0]['to']
+        self.assertEqual(merged['to'], first_to)
+
+    def test_same_mint_on_other_chain_is_not_merged(self):
+        items = [item('Mint', T0, [24]), item('Mint', T0, [24], chain='base')]
+        requests, _ = build_fetch_requests(items, '1m')
+        self.assertEqual(len(requests), 2)
+
+    def test_merge_gap(self):
+        items = [item('Mint', T0, [12]), item('Mint', T0 + 20 * HOUR_MS, [12])]
+        self.assertEqual(len(build_fetch_requests(items, '1m')[0]), 2)
+        self.assertEqual(len(build_fetch_requests(items, '1m', merge_gap_hours=8)[0]), 1)
+
+
+class TestFetchRequests(unittest.TestCase):
+    """Running requests through a stub fetcher."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.log = self.dir / 'calls.jsonl'
+        self.checkpoint = str(self.dir / 'checkpoint.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_stub(self, fail_mint='__none__'):
+        stub = self.dir / 'stub_fetcher'
+        stub.write_text(STUB_FETCHER.format(python=sys.executable, log=str(self.log), fail_mint=fail_mint))
+        stub.chmod(stub.stat().st_mode | stat.S_IEXEC)
+        return str(stub)
+
+    def calls(self):
+        if not self.log.exists():
+            return []
+        return [json.loads(line) for line in self.log.read_text().splitlines()]
+
+    def test_one_process_per_merged_request(self):
+        items = [item('MintA', T0, [24]), item('MintA', T0 + HOUR_MS, [24]), item('MintB', T0, [24])]
+        results = fetch_worklist_batched(items, '1m', quantbot_cmd=self.make_stub(), concurrency=2)
+
+        self.assertEqual(len(self.calls()), 2)
+        self.assertTrue(all(r['success'] for r in results))
+        self.assertEqual(results[0]['request_key'], results[1]['request_key'])
+        self.assertEqual(results[2]['mint'], 'MintB')
+
+    def test_checkpoint_resumes_only_unfinished_requests(self):
+        items = [item('MintA', T0, [24]), item('MintB', T0, [24]), item('MintC', T0, [24])]
+        requests, _ = build_fetch_requests(items, '1m')
+
+        first = fetch_requests(requests, quantbot_cmd=self.make_stub(fail_mint='MintB'),
+                               checkpoint_path=self.checkpoint)
+        self.assertEqual([first[r['key']]['success'] for r in requests], [True, False, True])
+        self.assertEqual(len(load_checkpoint(self.checkpoint)), 2)
+
+        self.log.unlink()
+        second = fetch_requests(requests, quantbot_cmd=self.make_stub(), checkpoint_path=self.checkpoint)
+        self.assertEqual(len(self.calls()), 1)
+        self.assertIn('MintB', self.calls()[0])
+        self.assertTrue(all(second[r['key']]['success'] for r in requests))
+        self.assertEqual(len(load_checkpoint(self.checkpoint)), 3)
+
+    def test_batch_cmd_receives_request_files(self):
+        items = [item(f'Mint{i}', T0, [24]) for i in range(5)]
+        requests, _ = build_fetch_requests(items, '5m')
+        results = fetch_requests(requests, batch_cmd=f'{self.make_stub()} --batch-file {{batch_file}}',
+                                 batch_size=2, concurrency=1)
+
+        calls = self.calls()
+        invocations = [c for c in calls if isinstance(c, list)]
+        lines = [c for c in calls if isinstance(c, dict)]
+        self.assertEqual(len(invocations), 3)
+        self.assertEqual([l['mint'] for l in lines], [f'Mint{i}' for i in range(5)])
+        self.assertEqual({l['interval'] for l in lines}, {'5m'})
+        self.assertTrue(all(r['success'] for r in results.values()))
+        self.assertFalse(any(os.path.exists(c[1]) for c in invocations))
+
+    def test_batch_cmd_keeps_other_braces(self):
+        requests, _ = build_fetch_requests([item('MintA', T0, [24])], '1m')
+        results = fetch_requests(requests, batch_cmd=f"{self.make_stub()} --batch-file {{batch_file}} '{{\"k\": 1}}'")
+
+        invocation = next(c for c in self.calls() if isinstance(c, list))
+        self.assertEqual(invocation[2], '{"k": 1}')
+        self.assertTrue(all(r['success'] for r in results.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,8 +4,11 @@ import argparse
 import json
 import re
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple, List, Set
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple, List, Set
 from dataclasses import dataclass
 from enum import Enum
 
@@ -13,6 +16,7 @@ import duckdb
 import ijson
 import hashlib
 import os
+import pyarrow as pa
 from tools.shared.duckdb_adapter import get_write_connection
 
 # Import address validation from extracted module
@@ -1336,6 +1340,436 @@ def get_script_version() -> str:
     # Fallback: use a version string (update this when making breaking changes)
     return "v1.0"
 
+# =============================================================================
+# Pipelined ingest: parser stage (process pool) -> bounded queue -> Arrow writer
+# =============================================================================
+
+DEFAULT_INGEST_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+DEFAULT_INGEST_CHUNK = 5000
+
+TG_NORM_COLUMNS = (
+  "chat_id", "chat_name", "message_id", "ts_ms", "from_name", "from_id", "type", "is_service",
+  "reply_to_message_id", "text", "links_json", "norm_json", "run_id",
+)
+
+CALLER_LINK_COLUMNS = (
+  "trigger_chat_id", "trigger_message_id", "trigger_ts_ms", "trigger_from_id", "trigger_from_name", "trigger_text",
+  "bot_message_id", "bot_ts_ms", "bot_from_name", "bot_type",
+  "token_name", "ticker", "mint", "mint_raw", "mint_validation_status", "mint_validation_reason",
+  "chain", "platform",
+  "token_age_s", "token_created_ts_ms", "views",
+  "price_usd", "price_move_pct", "mcap_usd", "mcap_change_pct",
+  "vol_usd", "liquidity_usd", "zero_liquidity",
+  "chg_1h_pct", "buys_1h", "sells_1h",
+  "ath_mcap_usd", "ath_drawdown_pct", "ath_age_s",
+  "fresh_1d_pct", "fresh_7d_pct", "top10_pct", "holders_total",
+  "top5_holders_pct_json", "dev_sold", "dex_paid",
+  "card_json", "validation_passed", "run_id",
+)
+
+# Bot replies joined to the message they reply to (input rows for build_caller_link_row)
+CALLER_LINK_CANDIDATES_SQL = """
+  SELECT
+    b.chat_id,
+    b.message_id AS bot_message_id,
+    b.ts_ms AS bot_ts_ms,
+    b.from_name AS bot_from_name,
+    b.text AS bot_text,
+    b.reply_to_message_id AS trigger_message_id,
+    t.ts_ms AS trigger_ts_ms,
+    t.from_id AS trigger_from_id,
+    t.from_name AS trigger_from_name,
+    t.text AS trigger_text
+  FROM tg_norm_d b
+  JOIN tg_norm_d t
+    ON t.chat_id = b.chat_id
+   AND t.message_id = b.reply_to_message_id
+  WHERE b.chat_id = ?
+    AND b.reply_to_message_id IS NOT NULL
+    AND b.is_service = FALSE
+    AND b.ts_ms IS NOT NULL
+    AND t.ts_ms IS NOT NULL
+    -- Filter out bot commands (messages starting with /)
+    AND NOT (t.text LIKE '/%')
+  ORDER BY b.message_id
+"""
+
+def normalize_message_row(m: dict, chat_id: str, chat_name: str, run_id: str) -> Optional[tuple]:
+  """Flatten one exported message into a tg_norm_d row (None if it has no id)"""
+  mid = m.get("id")
+  if mid is None:
+    return None
+  ts_ms = ts_ms_from_obj(m)
+  mtype = m.get("type")
+  is_service = False if (mtype == "message") else True
+  links_json = json.dumps(m.get("links"), ensure_ascii=False) if m.get("links") is not None else None
+  reply_to = m.get("reply_to_message_id")
+  reply_to_mid = int(reply_to) if isinstance(reply_to, int) or (isinstance(reply_to, str) and reply_to.isdigit()) else None
+  return (
+    chat_id,
+    chat_name,
+    int(mid),
+    int(ts_ms) if ts_ms is not None else None,
+    m.get("from"),
+    m.get("from_id"),
+    mtype,
+    bool(is_service),
+    reply_to_mid,
+    flatten_text(m.get("text")),
+    links_json,
+    json.dumps(m, ensure_ascii=False),
+    run_id,
+  )
+
+def _normalize_message_chunk(messages: List[dict], chat_id: str, chat_name: str, run_id: str, include_run_id: bool = True) -> List[tuple]:
+  rows = []
+  for m in messages:
+    row = normalize_message_row(m, chat_id, chat_name, run_id)
+    if row is not None:
+      rows.append(row if include_run_id else row[:-1])
+  return rows
+
+def _build_caller_link_chunk(candidates: List[tuple], run_id: str, include_run_id: bool = True) -> List[tuple]:
+  rows = [build_caller_link_row(r, run_id) for r in candidates]
+  return rows if include_run_id else [row[:-1] for row in rows]
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+  chunk = []
+  for item in items:
+    chunk.append(item)
+    if len(chunk) >= size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+def _fetch_chunks(cursor: duckdb.DuckDBPyConnection, size: int) -> Iterator[List[tuple]]:
+  while True:
+    rows = cursor.fetchmany(size)
+    if not rows:
+      return
+    yield rows
+
+def run_pipelined(chunks: Iterable[Any], fn: Callable[[Any], Any], workers: int, max_pending: Optional[int] = None) -> Iterator[Any]:
+  """Yield fn(chunk) for each chunk, in input order.
+
+  With workers > 0 the chunks are parsed in a process pool while the caller
+  writes earlier results; at most max_pending chunks (default 2 per worker)
+  are in flight, so memory stays bounded however large the export is.
+  workers <= 0 runs everything inline.
+  """
+  if workers <= 0:
+    for chunk in chunks:
+      yield fn(chunk)
+    return
+  max_pending = max_pending or workers * 2
+  with ProcessPoolExecutor(max_workers=workers) as pool:
+    pending = deque()
+    for chunk in chunks:
+      pending.append(pool.submit(fn, chunk))
+      if len(pending) >= max_pending:
+        yield pending.popleft().result()
+    while pending:
+      yield pending.popleft().result()
+
+def _arrow_column(values: List[Any]) -> pa.Array:
+  try:
+    return pa.array(values)
+  except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, OverflowError):
+    # Mixed Python types (e.g. a card field that is sometimes "N/A"): let DuckDB cast on insert
+    return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+def append_rows_arrow(con: duckdb.DuckDBPyConnection, table: str, columns: Sequence[str], rows: List[tuple], or_ignore: bool = True) -> None:
+  """Append rows to table as one Arrow batch in a single transaction.
+
+  Uses INSERT OR IGNORE when the table has primary keys (idempotent schema),
+  falling back to a plain INSERT for legacy tables without them.
+  """
+  batch = pa.Table.from_arrays(
+    [_arrow_column([row[i] for row in rows]) for i in range(len(columns))],
+    names=list(columns),
+  )
+  col_sql = ", ".join(columns)
+  con.register("_ingest_batch", batch)
+  try:
+    con.execute("BEGIN TRANSACTION")
+    try:
+      if or_ignore:
+        try:
+          con.execute(f"INSERT OR IGNORE INTO {table} ({col_sql}) SELECT {col_sql} FROM _ingest_batch")
+        except duckdb.Error:
+          # If INSERT OR IGNORE fails (no PRIMARY KEYs), use regular INSERT
+          con.execute("ROLLBACK")
+          con.execute("BEGIN TRANSACTION")
+          con.execute(f"INSERT INTO {table} ({col_sql}) SELECT {col_sql} FROM _ingest_batch")
+      else:
+        con.execute(f"INSERT INTO {table} ({col_sql}) SELECT {col_sql} FROM _ingest_batch")
+      con.execute("COMMIT")
+    except Exception:
+      try:
+        con.execute("ROLLBACK")
+      except Exception:
+        pass
+      raise
+  finally:
+    con.unregister("_ingest_batch")
+
+def build_caller_link_row(r: tuple, run_id: str) -> tuple:
+  """Parse one bot reply candidate (see CALLER_LINK_CANDIDATES_SQL) into a caller_links_d row"""
+  (c_id, bot_mid, bot_ts, bot_from, bot_text, trig_mid, trig_ts, trig_from_id, trig_from_name, trig_text) = r
+  card = parse_bot(bot_from, bot_text or "", trig_text)
+  
+  # Ensure bot_type is set correctly from bot_from name (override any incorrect bot_type from parser)
+  if card:
+    bot_from_lower = (bot_from or "").lower()
+    if "phanes" in bot_from_lower:
+      card["bot_type"] = "phanes"
+    elif "rick" in bot_from_lower:
+      card["bot_type"] = "rick"
+    elif "prometheus" in bot_from_lower:
+      card["bot_type"] = "prometheus"
+    # else keep existing bot_type from parser
+  
+  # Link bot messages even if card parsing fails (like SQLite does)
+  # This improves Phanes reply rate significantly
+  if not card:
+    # Still create a link entry with minimal data
+    # Extract mint/ticker from bot text or trigger text as fallback
+    mint = None
+    ticker = None
+    
+    # Try to extract mint from bot text (use BASE58_RE from this file)
+    if bot_text:
+      mints = BASE58_RE.findall(bot_text)
+      if mints:
+        mint = mints[0]
+      # Also check for EVM addresses
+      evm_matches = EVM_ADDRESS_RE.findall(bot_text)
+      if evm_matches and not mint:
+        mint = evm_matches[0].lower()
+    
+    # Try to extract ticker from bot text
+    if bot_text:
+      ticker_matches = re.findall(r"\$\$?([A-Za-z0-9_]{2,20})", bot_text)
+      if ticker_matches:
+        candidate_ticker = ticker_matches[0].upper()
+        # Filter out common false positives if there's a mint address in the same text
+        # These will be on a new line, next msg, or with a space from the mint
+        excluded_tickers = {"JS", "HM", "LB", "LAST"}
+        if candidate_ticker not in excluded_tickers or not mint:
+          ticker = candidate_ticker
+    
+    # Fallback to trigger text if bot text didn't yield results
+    if not mint and trig_text:
+      mints = BASE58_RE.findall(trig_text)
+      if mints:
+        mint = mints[0]
+      evm_matches = EVM_ADDRESS_RE.findall(trig_text)
+      if evm_matches and not mint:
+        mint = evm_matches[0].lower()
+    
+    if not ticker and trig_text:
+      ticker_matches = re.findall(r"\$\$?([A-Za-z0-9_]{2,20})", trig_text)
+      if ticker_matches:
+        candidate_ticker = ticker_matches[0].upper()
+        # Filter out common false positives if there's a mint address in the same text
+        # These will be on a new line, next msg, or with a space from the mint
+        excluded_tickers = {"JS", "HM", "LB", "LAST"}
+        if candidate_ticker not in excluded_tickers or not mint:
+          ticker = candidate_ticker
+    
+    # Create minimal card for linking
+    # Determine bot_type from bot_from name (more reliable than parsing)
+    bot_from_lower = (bot_from or "").lower()
+    if "phanes" in bot_from_lower:
+      bot_type = "phanes"
+    elif "rick" in bot_from_lower:
+      bot_type = "rick"
+    elif "prometheus" in bot_from_lower:
+      bot_type = "prometheus"
+    else:
+      bot_type = "unknown"
+    
+    card = {
+      "bot_type": bot_type,
+      "mint": mint,
+      "ticker": ticker,
+      "token_name": None,
+      "chain": None,
+      "platform": None,
+      "price_usd": None,
+      "mcap_usd": None,
+      "vol_usd": None,
+      "liquidity_usd": None,
+      "card_json": json.dumps({"bot": bot_type, "mint": mint, "ticker": ticker}, ensure_ascii=False)
+    }
+  
+  # Pass 1 + Pass 2: Extract and validate address (Solana or EVM)
+  # Preserves case, never truncates
+  detected_chain = card.get("chain")
+  if USE_EXTRACTED_MODULE:
+      # Use extracted module
+      solana_candidates = find_solana_candidates(bot_text or "", int(bot_mid))
+      evm_candidates = find_evm_candidates(bot_text or "", int(bot_mid))
+      # Filter by chain if known
+      chain_lower = (detected_chain or "").lower()
+      if chain_lower in ["evm", "ethereum", "eth", "base", "arbitrum", "arb", "bsc", "bnb", "polygon", "matic"]:
+          address_candidates = evm_candidates
+      elif chain_lower in ["solana", "sol"]:
+          address_candidates = solana_candidates
+      else:
+          address_candidates = solana_candidates + evm_candidates
+  else:
+      # Use inline function
+      address_candidates = find_address_candidates(bot_text or "", int(bot_mid), detected_chain)
+  
+  mint = None
+  mint_raw = None
+  mint_validation_status = None
+  mint_validation_reason = None
+  final_chain = normalize_chain(detected_chain)  # Normalize chain from card
+  
+  # Find first valid address (Pass 1 + Pass 2)
+  for candidate in address_candidates:
+    if candidate.status == MintValidationStatus.PASS1_ACCEPTED:
+      if candidate.address_type == "solana":
+        # Solana validation
+        is_valid, reason = validate_mint_pass2(candidate.normalized)
+        if is_valid:
+          mint = candidate.normalized  # Use normalized (preserves case, just cleaned)
+          mint_raw = candidate.raw  # Keep original for audit
+          mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
+          if not final_chain:
+            final_chain = normalize_chain("solana")  # Normalize to lowercase
+          break
+        else:
+          # Pass 1 passed but Pass 2 failed
+          mint_raw = candidate.raw
+          mint_validation_status = MintValidationStatus.PASS2_REJECTED.value
+          mint_validation_reason = reason
+      elif candidate.address_type == "evm":
+        # EVM validation
+        is_valid, reason, checksum_status = validate_evm_pass2(candidate.normalized)
+        if is_valid:
+          mint = candidate.normalized.lower()  # Store lowercase for EVM (canonical)
+          mint_raw = candidate.raw  # Keep original (preserves case for checksum)
+          mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
+          if not final_chain:
+            final_chain = normalize_chain("evm")  # Normalize to lowercase
+          break
+        else:
+          mint_raw = candidate.raw
+          mint_validation_status = MintValidationStatus.PASS2_REJECTED.value
+          mint_validation_reason = reason
+  
+  # Fallback: if no valid address found, try trigger text
+  if not mint and trig_text:
+    trigger_candidates = find_address_candidates(trig_text, int(trig_mid), detected_chain)
+    for candidate in trigger_candidates:
+      if candidate.status == MintValidationStatus.PASS1_ACCEPTED:
+        if candidate.address_type == "solana":
+          is_valid, reason = validate_mint_pass2(candidate.normalized)
+          if is_valid:
+            mint = candidate.normalized
+            mint_raw = candidate.raw
+            mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
+            if not final_chain:
+              final_chain = "solana"
+            break
+        elif candidate.address_type == "evm":
+          is_valid, reason, checksum_status = validate_evm_pass2(candidate.normalized)
+          if is_valid:
+            mint = candidate.normalized.lower()
+            mint_raw = candidate.raw
+            mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
+            if not final_chain:
+              final_chain = "evm"
+            break
+  
+  # If still no mint, try card.get("mint") as fallback (for backward compatibility)
+  if not mint:
+    mint = card.get("mint")
+    if mint:
+      # Try to determine type and validate
+      if mint.startswith("0x") and len(mint) == 42:
+        # EVM address
+        is_valid, reason, checksum_status = validate_evm_pass2(mint)
+        if is_valid:
+          mint = mint.lower()  # Normalize to lowercase
+          mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
+          if not final_chain:
+            final_chain = "evm"
+        else:
+          mint_validation_status = MintValidationStatus.PASS2_REJECTED.value
+          mint_validation_reason = reason
+      else:
+        # Assume Solana
+        is_valid, reason = validate_mint_pass2(mint)
+        if is_valid:
+          mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
+          if not final_chain:
+            final_chain = "solana"
+        else:
+          mint_validation_status = MintValidationStatus.PASS2_REJECTED.value
+          mint_validation_reason = reason
+  
+  ticker = card.get("ticker")
+  token_name = card.get("token_name")
+  
+  # validation: mint present in trigger OR token name substring
+  validation = False
+  if mint and trig_text and mint in trig_text:
+    validation = True
+  elif token_name and trig_text and str(token_name).lower() in trig_text.lower():
+    validation = True
+
+  token_age_s = card.get("token_age_s")
+  token_created_ts_ms = None
+  if token_age_s is not None and bot_ts is not None:
+    try:
+      token_created_ts_ms = int(bot_ts) - int(token_age_s) * 1000
+    except Exception:
+      token_created_ts_ms = None
+  
+  # Check for zero liquidity
+  liquidity_usd = card.get("liquidity_usd")
+  zero_liquidity = False
+  if liquidity_usd is not None:
+    # Check for 0, 0x, LP 0, etc.
+    if liquidity_usd == 0:
+      zero_liquidity = True
+    # Also check if bot text mentions zero liquidity
+    if bot_text:
+      zero_liq_patterns = [
+        r"LP\s*[:\s]*0\b",
+        r"Liq[:\s]*\$?\s*0\b",
+        r"liquidity[:\s]*\$?\s*0\b",
+        r"0x\s*LP",
+      ]
+      for pattern in zero_liq_patterns:
+        if re.search(pattern, bot_text, re.IGNORECASE):
+          zero_liquidity = True
+          break
+
+  # Normalize chain before inserting
+  chain_to_insert = normalize_chain(final_chain or card.get("chain"))
+  
+  return (
+    c_id, int(trig_mid), int(trig_ts), trig_from_id, trig_from_name, trig_text,
+    int(bot_mid), int(bot_ts), bot_from, card.get("bot_type"),
+    token_name, ticker, mint, mint_raw, mint_validation_status, mint_validation_reason,
+    chain_to_insert, card.get("platform"),
+    token_age_s, token_created_ts_ms, card.get("views"),
+    card.get("price_usd"), card.get("price_move_pct"), card.get("mcap_usd"), card.get("mcap_change_pct"),
+    card.get("vol_usd"), liquidity_usd, zero_liquidity,
+    card.get("chg_1h_pct"), card.get("buys_1h"), card.get("sells_1h"),
+    card.get("ath_mcap_usd"), card.get("ath_drawdown_pct"), card.get("ath_age_s"),
+    card.get("fresh_1d_pct"), card.get("fresh_7d_pct"), card.get("top10_pct"), card.get("holders_total"),
+    card.get("top5_holders_pct_json"), card.get("dev_sold"), card.get("dex_paid"),
+    card.get("card_json"), bool(validation),
+    run_id  # Add run_id
+  )
+
 def _run_main_logic(args, con):
   """Main ingestion logic - separated to use context manager properly"""
   # Set performance PRAGMAs (these are in addition to busy_timeout)
@@ -1445,386 +1879,22 @@ def _run_main_logic(args, con):
     except Exception:
       has_run_id = False
 
-  # --- ingest messages streaming ---
-  batch = []
-  BATCH_N = 5000
+  # --- ingest messages streaming (parser processes -> Arrow writer, one transaction per chunk) ---
+  workers = getattr(args, "workers", DEFAULT_INGEST_WORKERS)
+  chunk_size = getattr(args, "chunk_size", DEFAULT_INGEST_CHUNK)
+  tg_columns = TG_NORM_COLUMNS if has_run_id else TG_NORM_COLUMNS[:-1]
+  normalize_chunk = partial(
+    _normalize_message_chunk, chat_id=chat_id, chat_name=chat_name, run_id=run_id, include_run_id=has_run_id
+  )
   with open(args.in_path, "rb") as f:
-    for m in ijson.items(f, "messages.item"):
-      mid = m.get("id")
-      if mid is None:
-        continue
-      ts_ms = ts_ms_from_obj(m)
-      from_name = m.get("from")
-      from_id = m.get("from_id")
-      mtype = m.get("type")
-      is_service = False if (mtype == "message") else True
-      text = flatten_text(m.get("text"))
-      links_json = json.dumps(m.get("links"), ensure_ascii=False) if m.get("links") is not None else None
-      norm_json = json.dumps(m, ensure_ascii=False)
-      reply_to = m.get("reply_to_message_id")
-      reply_to_mid = int(reply_to) if isinstance(reply_to, int) or (isinstance(reply_to, str) and reply_to.isdigit()) else None
-
-      batch.append((
-        chat_id,
-        chat_name,
-        int(mid),
-        int(ts_ms) if ts_ms is not None else None,
-        from_name,
-        from_id,
-        mtype,
-        bool(is_service),
-        reply_to_mid,
-        text,
-        links_json,
-        norm_json,
-        run_id  # Add run_id
-      ))
-
-      if len(batch) >= BATCH_N:
-        if has_run_id:
-          try:
-            result = con.executemany("""
-              INSERT OR IGNORE INTO tg_norm_d 
-              (chat_id, chat_name, message_id, ts_ms, from_name, from_id, type, is_service, 
-               reply_to_message_id, text, links_json, norm_json, run_id)
-              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, batch)
-          except Exception:
-            # If INSERT OR IGNORE fails (no PRIMARY KEYs), use regular INSERT
-            result = con.executemany("""
-              INSERT INTO tg_norm_d 
-              (chat_id, chat_name, message_id, ts_ms, from_name, from_id, type, is_service, 
-               reply_to_message_id, text, links_json, norm_json, run_id)
-              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, batch)
-        else:
-          # Legacy schema without run_id
-          result = con.executemany("""
-            INSERT INTO tg_norm_d 
-            (chat_id, chat_name, message_id, ts_ms, from_name, from_id, type, is_service, 
-             reply_to_message_id, text, links_json, norm_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-          """, [row[:12] for row in batch])  # Remove run_id from batch
+    messages = _chunked(ijson.items(f, "messages.item"), chunk_size)
+    for batch in run_pipelined(messages, normalize_chunk, workers):
+      if batch:
+        append_rows_arrow(con, "tg_norm_d", tg_columns, batch, or_ignore=has_run_id)
         row_counts['tg_norm'] += len(batch)
-        batch.clear()
 
-  if batch:
-    if has_run_id:
-      try:
-        result = con.executemany("""
-          INSERT OR IGNORE INTO tg_norm_d 
-          (chat_id, chat_name, message_id, ts_ms, from_name, from_id, type, is_service, 
-           reply_to_message_id, text, links_json, norm_json, run_id)
-          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, batch)
-      except Exception:
-        # If INSERT OR IGNORE fails (no PRIMARY KEYs), use regular INSERT
-        result = con.executemany("""
-          INSERT INTO tg_norm_d 
-          (chat_id, chat_name, message_id, ts_ms, from_name, from_id, type, is_service, 
-           reply_to_message_id, text, links_json, norm_json, run_id)
-          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, batch)
-    else:
-      # Legacy schema without run_id
-      result = con.executemany("""
-        INSERT INTO tg_norm_d 
-        (chat_id, chat_name, message_id, ts_ms, from_name, from_id, type, is_service, 
-         reply_to_message_id, text, links_json, norm_json)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-      """, [row[:12] for row in batch])  # Remove run_id from batch
-    row_counts['tg_norm'] += len(batch)
-    batch.clear()
-
-  # --- link bot replies by reply_to join + parse in python ---
-  # pull candidates (only replies) then parse per row
+  # --- link bot replies by reply_to join + parse (parser processes -> Arrow writer) ---
   print(f"Linking bot replies for chat_id={chat_id}...", file=sys.stderr, flush=True)
-  rows = con.execute("""
-    SELECT
-      b.chat_id,
-      b.message_id AS bot_message_id,
-      b.ts_ms AS bot_ts_ms,
-      b.from_name AS bot_from_name,
-      b.text AS bot_text,
-      b.reply_to_message_id AS trigger_message_id,
-      t.ts_ms AS trigger_ts_ms,
-      t.from_id AS trigger_from_id,
-      t.from_name AS trigger_from_name,
-      t.text AS trigger_text
-    FROM tg_norm_d b
-    JOIN tg_norm_d t
-      ON t.chat_id = b.chat_id
-     AND t.message_id = b.reply_to_message_id
-    WHERE b.chat_id = ?
-      AND b.reply_to_message_id IS NOT NULL
-      AND b.is_service = FALSE
-      AND b.ts_ms IS NOT NULL
-      AND t.ts_ms IS NOT NULL
-      -- Filter out bot commands (messages starting with /)
-      AND NOT (t.text LIKE '/%')
-  """, [chat_id]).fetchall()
-
-  print(f"Found {len(rows)} bot reply candidates, parsing...", file=sys.stderr, flush=True)
-  link_rows = []
-  for i, r in enumerate(rows):
-    if i % 1000 == 0 and i > 0:
-      print(f"  Processed {i}/{len(rows)} bot replies...", file=sys.stderr, flush=True)
-    (c_id, bot_mid, bot_ts, bot_from, bot_text, trig_mid, trig_ts, trig_from_id, trig_from_name, trig_text) = r
-    card = parse_bot(bot_from, bot_text or "", trig_text)
-    
-    # Ensure bot_type is set correctly from bot_from name (override any incorrect bot_type from parser)
-    if card:
-      bot_from_lower = (bot_from or "").lower()
-      if "phanes" in bot_from_lower:
-        card["bot_type"] = "phanes"
-      elif "rick" in bot_from_lower:
-        card["bot_type"] = "rick"
-      elif "prometheus" in bot_from_lower:
-        card["bot_type"] = "prometheus"
-      # else keep existing bot_type from parser
-    
-    # Link bot messages even if card parsing fails (like SQLite does)
-    # This improves Phanes reply rate significantly
-    if not card:
-      # Still create a link entry with minimal data
-      # Extract mint/ticker from bot text or trigger text as fallback
-      mint = None
-      ticker = None
-      
-      # Try to extract mint from bot text (use BASE58_RE from this file)
-      if bot_text:
-        mints = BASE58_RE.findall(bot_text)
-        if mints:
-          mint = mints[0]
-        # Also check for EVM addresses
-        evm_matches = EVM_ADDRESS_RE.findall(bot_text)
-        if evm_matches and not mint:
-          mint = evm_matches[0].lower()
-      
-      # Try to extract ticker from bot text
-      if bot_text:
-        ticker_matches = re.findall(r"\$\$?([A-Za-z0-9_]{2,20})", bot_text)
-        if ticker_matches:
-          candidate_ticker = ticker_matches[0].upper()
-          # Filter out common false positives if there's a mint address in the same text
-          # These will be on a new line, next msg, or with a space from the mint
-          excluded_tickers = {"JS", "HM", "LB", "LAST"}
-          if candidate_ticker not in excluded_tickers or not mint:
-            ticker = candidate_ticker
-      
-      # Fallback to trigger text if bot text didn't yield results
-      if not mint and trig_text:
-        mints = BASE58_RE.findall(trig_text)
-        if mints:
-          mint = mints[0]
-        evm_matches = EVM_ADDRESS_RE.findall(trig_text)
-        if evm_matches and not mint:
-          mint = evm_matches[0].lower()
-      
-      if not ticker and trig_text:
-        ticker_matches = re.findall(r"\$\$?([A-Za-z0-9_]{2,20})", trig_text)
-        if ticker_matches:
-          candidate_ticker = ticker_matches[0].upper()
-          # Filter out common false positives if there's a mint address in the same text
-          # These will be on a new line, next msg, or with a space from the mint
-          excluded_tickers = {"JS", "HM", "LB", "LAST"}
-          if candidate_ticker not in excluded_tickers or not mint:
-            ticker = candidate_ticker
-      
-      # Create minimal card for linking
-      # Determine bot_type from bot_from name (more reliable than parsing)
-      bot_from_lower = (bot_from or "").lower()
-      if "phanes" in bot_from_lower:
-        bot_type = "phanes"
-      elif "rick" in bot_from_lower:
-        bot_type = "rick"
-      elif "prometheus" in bot_from_lower:
-        bot_type = "prometheus"
-      else:
-        bot_type = "unknown"
-      
-      card = {
-        "bot_type": bot_type,
-        "mint": mint,
-        "ticker": ticker,
-        "token_name": None,
-        "chain": None,
-        "platform": None,
-        "price_usd": None,
-        "mcap_usd": None,
-        "vol_usd": None,
-        "liquidity_usd": None,
-        "card_json": json.dumps({"bot": bot_type, "mint": mint, "ticker": ticker}, ensure_ascii=False)
-      }
-    
-    # Pass 1 + Pass 2: Extract and validate address (Solana or EVM)
-    # Preserves case, never truncates
-    detected_chain = card.get("chain")
-    if USE_EXTRACTED_MODULE:
-        # Use extracted module
-        solana_candidates = find_solana_candidates(bot_text or "", int(bot_mid))
-        evm_candidates = find_evm_candidates(bot_text or "", int(bot_mid))
-        # Filter by chain if known
-        chain_lower = (detected_chain or "").lower()
-        if chain_lower in ["evm", "ethereum", "eth", "base", "arbitrum", "arb", "bsc", "bnb", "polygon", "matic"]:
-            address_candidates = evm_candidates
-        elif chain_lower in ["solana", "sol"]:
-            address_candidates = solana_candidates
-        else:
-            address_candidates = solana_candidates + evm_candidates
-    else:
-        # Use inline function
-        address_candidates = find_address_candidates(bot_text or "", int(bot_mid), detected_chain)
-    
-    mint = None
-    mint_raw = None
-    mint_validation_status = None
-    mint_validation_reason = None
-    final_chain = normalize_chain(detected_chain)  # Normalize chain from card
-    
-    # Find first valid address (Pass 1 + Pass 2)
-    for candidate in address_candidates:
-      if candidate.status == MintValidationStatus.PASS1_ACCEPTED:
-        if candidate.address_type == "solana":
-          # Solana validation
-          is_valid, reason = validate_mint_pass2(candidate.normalized)
-          if is_valid:
-            mint = candidate.normalized  # Use normalized (preserves case, just cleaned)
-            mint_raw = candidate.raw  # Keep original for audit
-            mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
-            if not final_chain:
-              final_chain = normalize_chain("solana")  # Normalize to lowercase
-            break
-          else:
-            # Pass 1 passed but Pass 2 failed
-            mint_raw = candidate.raw
-            mint_validation_status = MintValidationStatus.PASS2_REJECTED.value
-            mint_validation_reason = reason
-        elif candidate.address_type == "evm":
-          # EVM validation
-          is_valid, reason, checksum_status = validate_evm_pass2(candidate.normalized)
-          if is_valid:
-            mint = candidate.normalized.lower()  # Store lowercase for EVM (canonical)
-            mint_raw = candidate.raw  # Keep original (preserves case for checksum)
-            mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
-            if not final_chain:
-              final_chain = normalize_chain("evm")  # Normalize to lowercase
-            break
-          else:
-            mint_raw = candidate.raw
-            mint_validation_status = MintValidationStatus.PASS2_REJECTED.value
-            mint_validation_reason = reason
-    
-    # Fallback: if no valid address found, try trigger text
-    if not mint and trig_text:
-      trigger_candidates = find_address_candidates(trig_text, int(trig_mid), detected_chain)
-      for candidate in trigger_candidates:
-        if candidate.status == MintValidationStatus.PASS1_ACCEPTED:
-          if candidate.address_type == "solana":
-            is_valid, reason = validate_mint_pass2(candidate.normalized)
-            if is_valid:
-              mint = candidate.normalized
-              mint_raw = candidate.raw
-              mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
-              if not final_chain:
-                final_chain = "solana"
-              break
-          elif candidate.address_type == "evm":
-            is_valid, reason, checksum_status = validate_evm_pass2(candidate.normalized)
-            if is_valid:
-              mint = candidate.normalized.lower()
-              mint_raw = candidate.raw
-              mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
-              if not final_chain:
-                final_chain = "evm"
-              break
-    
-    # If still no mint, try card.get("mint") as fallback (for backward compatibility)
-    if not mint:
-      mint = card.get("mint")
-      if mint:
-        # Try to determine type and validate
-        if mint.startswith("0x") and len(mint) == 42:
-          # EVM address
-          is_valid, reason, checksum_status = validate_evm_pass2(mint)
-          if is_valid:
-            mint = mint.lower()  # Normalize to lowercase
-            mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
-            if not final_chain:
-              final_chain = "evm"
-          else:
-            mint_validation_status = MintValidationStatus.PASS2_REJECTED.value
-            mint_validation_reason = reason
-        else:
-          # Assume Solana
-          is_valid, reason = validate_mint_pass2(mint)
-          if is_valid:
-            mint_validation_status = MintValidationStatus.PASS2_ACCEPTED.value
-            if not final_chain:
-              final_chain = "solana"
-          else:
-            mint_validation_status = MintValidationStatus.PASS2_REJECTED.value
-            mint_validation_reason = reason
-    
-    ticker = card.get("ticker")
-    token_name = card.get("token_name")
-    
-    # validation: mint present in trigger OR token name substring
-    validation = False
-    if mint and trig_text and mint in trig_text:
-      validation = True
-    elif token_name and trig_text and str(token_name).lower() in trig_text.lower():
-      validation = True
-
-    token_age_s = card.get("token_age_s")
-    token_created_ts_ms = None
-    if token_age_s is not None and bot_ts is not None:
-      try:
-        token_created_ts_ms = int(bot_ts) - int(token_age_s) * 1000
-      except Exception:
-        token_created_ts_ms = None
-    
-    # Check for zero liquidity
-    liquidity_usd = card.get("liquidity_usd")
-    zero_liquidity = False
-    if liquidity_usd is not None:
-      # Check for 0, 0x, LP 0, etc.
-      if liquidity_usd == 0:
-        zero_liquidity = True
-      # Also check if bot text mentions zero liquidity
-      if bot_text:
-        zero_liq_patterns = [
-          r"LP\s*[:\s]*0\b",
-          r"Liq[:\s]*\$?\s*0\b",
-          r"liquidity[:\s]*\$?\s*0\b",
-          r"0x\s*LP",
-        ]
-        for pattern in zero_liq_patterns:
-          if re.search(pattern, bot_text, re.IGNORECASE):
-            zero_liquidity = True
-            break
-
-    # Normalize chain before inserting
-    chain_to_insert = normalize_chain(final_chain or card.get("chain"))
-    
-    link_rows.append((
-      c_id, int(trig_mid), int(trig_ts), trig_from_id, trig_from_name, trig_text,
-      int(bot_mid), int(bot_ts), bot_from, card.get("bot_type"),
-      token_name, ticker, mint, mint_raw, mint_validation_status, mint_validation_reason,
-      chain_to_insert, card.get("platform"),
-      token_age_s, token_created_ts_ms, card.get("views"),
-      card.get("price_usd"), card.get("price_move_pct"), card.get("mcap_usd"), card.get("mcap_change_pct"),
-      card.get("vol_usd"), liquidity_usd, zero_liquidity,
-      card.get("chg_1h_pct"), card.get("buys_1h"), card.get("sells_1h"),
-      card.get("ath_mcap_usd"), card.get("ath_drawdown_pct"), card.get("ath_age_s"),
-      card.get("fresh_1d_pct"), card.get("fresh_7d_pct"), card.get("top10_pct"), card.get("holders_total"),
-      card.get("top5_holders_pct_json"), card.get("dev_sold"), card.get("dex_paid"),
-      card.get("card_json"), bool(validation),
-      run_id  # Add run_id
-    ))
-
-  # replace old links for this run (idempotent: only delete this run's data)
-  print(f"Inserting {len(link_rows)} caller links...", file=sys.stderr, flush=True)
   # Ensure run_id column exists in caller_links_d
   try:
     con.execute("SELECT run_id FROM caller_links_d LIMIT 1")
@@ -1835,71 +1905,27 @@ def _run_main_logic(args, con):
       has_run_id_links = True
     except Exception:
       has_run_id_links = False
-  
+
+  # replace old links for this run (idempotent: only delete this run's data)
   if has_run_id_links:
     con.execute("DELETE FROM caller_links_d WHERE trigger_chat_id = ? AND run_id = ?", [chat_id, run_id])
   else:
     # Legacy schema - delete by chat_id only (less precise but works)
     con.execute("DELETE FROM caller_links_d WHERE trigger_chat_id = ?", [chat_id])
-  if link_rows:
-    # Use INSERT OR IGNORE to prevent duplicates (if PRIMARY KEYs exist), otherwise use regular INSERT
-    try:
-      con.executemany("""
-        INSERT OR IGNORE INTO caller_links_d (
-          trigger_chat_id, trigger_message_id, trigger_ts_ms, trigger_from_id, trigger_from_name, trigger_text,
-          bot_message_id, bot_ts_ms, bot_from_name, bot_type,
-          token_name, ticker, mint, mint_raw, mint_validation_status, mint_validation_reason,
-          chain, platform,
-          token_age_s, token_created_ts_ms, views,
-          price_usd, price_move_pct, mcap_usd, mcap_change_pct,
-          vol_usd, liquidity_usd, zero_liquidity,
-          chg_1h_pct, buys_1h, sells_1h,
-          ath_mcap_usd, ath_drawdown_pct, ath_age_s,
-          fresh_1d_pct, fresh_7d_pct, top10_pct, holders_total,
-          top5_holders_pct_json, dev_sold, dex_paid,
-          card_json, validation_passed, run_id
-        ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-      """, link_rows)
-    except Exception:
-      # If INSERT OR IGNORE fails or run_id column doesn't exist, try without run_id
-      if has_run_id_links:
-        # run_id exists but INSERT OR IGNORE failed (no PRIMARY KEYs) - use regular INSERT
-        con.executemany("""
-          INSERT INTO caller_links_d (
-            trigger_chat_id, trigger_message_id, trigger_ts_ms, trigger_from_id, trigger_from_name, trigger_text,
-            bot_message_id, bot_ts_ms, bot_from_name, bot_type,
-            token_name, ticker, mint, mint_raw, mint_validation_status, mint_validation_reason,
-            chain, platform,
-            token_age_s, token_created_ts_ms, views,
-            price_usd, price_move_pct, mcap_usd, mcap_change_pct,
-            vol_usd, liquidity_usd, zero_liquidity,
-            chg_1h_pct, buys_1h, sells_1h,
-            ath_mcap_usd, ath_drawdown_pct, ath_age_s,
-            fresh_1d_pct, fresh_7d_pct, top10_pct, holders_total,
-            top5_holders_pct_json, dev_sold, dex_paid,
-            card_json, validation_passed, run_id
-          ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """, link_rows)
-      else:
-        # Legacy schema without run_id - remove run_id from batch
-        legacy_link_rows = [row[:-1] for row in link_rows]  # Remove last element (run_id)
-        con.executemany("""
-          INSERT INTO caller_links_d (
-            trigger_chat_id, trigger_message_id, trigger_ts_ms, trigger_from_id, trigger_from_name, trigger_text,
-            bot_message_id, bot_ts_ms, bot_from_name, bot_type,
-            token_name, ticker, mint, mint_raw, mint_validation_status, mint_validation_reason,
-            chain, platform,
-            token_age_s, token_created_ts_ms, views,
-            price_usd, price_move_pct, mcap_usd, mcap_change_pct,
-            vol_usd, liquidity_usd, zero_liquidity,
-            chg_1h_pct, buys_1h, sells_1h,
-            ath_mcap_usd, ath_drawdown_pct, ath_age_s,
-            fresh_1d_pct, fresh_7d_pct, top10_pct, holders_total,
-            top5_holders_pct_json, dev_sold, dex_paid,
-            card_json, validation_passed
-          ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """, legacy_link_rows)
-    row_counts['caller_links'] = len(link_rows)
+
+  # Candidates are streamed from a separate cursor so the writer can append
+  # to caller_links_d on the main connection while they are read
+  reader = con.cursor()
+  reader.execute(CALLER_LINK_CANDIDATES_SQL, [chat_id])
+  link_columns = CALLER_LINK_COLUMNS if has_run_id_links else CALLER_LINK_COLUMNS[:-1]
+  parse_chunk = partial(_build_caller_link_chunk, run_id=run_id, include_run_id=has_run_id_links)
+  for link_rows in run_pipelined(_fetch_chunks(reader, chunk_size), parse_chunk, workers):
+    if link_rows:
+      append_rows_arrow(con, "caller_links_d", link_columns, link_rows, or_ignore=has_run_id_links)
+      row_counts['caller_links'] += len(link_rows)
+      print(f"  Linked {row_counts['caller_links']} bot replies...", file=sys.stderr, flush=True)
+  reader.close()
+  print(f"Inserted {row_counts['caller_links']} caller links", file=sys.stderr, flush=True)
 
   # --- build user_calls_d from links (one row per trigger) ---
   # Delete only this run's data (idempotent)
@@ -2534,6 +2560,8 @@ def main():
   parser.add_argument('--export-parquet-run', dest='export_parquet_run', action='store_true', help='Export run data to Parquet')
   parser.add_argument('--output-dir', dest='output_dir', default='.', help='Output directory for exports')
   parser.add_argument('--compare-sqlite', dest='compare_sqlite', help='Compare with SQLite database')
+  parser.add_argument('--workers', type=int, default=DEFAULT_INGEST_WORKERS, help=f'Parser processes (0 = parse inline, default: {DEFAULT_INGEST_WORKERS})')
+  parser.add_argument('--chunk-size', dest='chunk_size', type=int, default=DEFAULT_INGEST_CHUNK, help=f'Messages per parse/insert chunk (default: {DEFAULT_INGEST_CHUNK})')
   
   args = parser.parse_args()
   
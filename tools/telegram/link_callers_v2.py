@@ -12,6 +12,7 @@ import argparse
 import json
 import re
 import sqlite3
+from collections import deque
 from typing import Optional, List, Dict, Any, Tuple, Set
 from datetime import datetime, timezone, timedelta
 
@@ -215,37 +216,365 @@ def calculate_ath_date(message_ts_ms: int, ath_age_days: Optional[int]) -> Optio
     return ath_dt
 
 
-def link_callers_v2(db_path: str, window_seconds: int = 60, quiet: bool = False):
-    """Main linking logic - retroactive approach"""
+DEFAULT_BATCH_SIZE = 500
+
+# Per-chat message stream; reply_to is pulled out of norm_json by SQLite for
+# bot messages only, so the JSON blob never leaves the database.
+CHAT_MESSAGES_SQL = """
+    SELECT
+        message_id,
+        chat_id,
+        ts_ms,
+        from_name,
+        from_id,
+        text,
+        is_service,
+        CASE WHEN from_name IN ('Rick', 'Phanes [Gold]')
+             THEN json_extract(norm_json, '$.reply_to_message_id')
+        END AS reply_to_message_id
+    FROM tg_norm
+    WHERE chat_id = ?
+    ORDER BY ts_ms, message_id
+"""
+
+MESSAGE_BY_ID_SQL = """
+    SELECT message_id, chat_id, ts_ms, from_name, from_id, text, is_service
+    FROM tg_norm
+    WHERE chat_id = ? AND message_id = ?
+"""
+
+INSERT_USER_CALL_SQL = """
+    INSERT OR REPLACE INTO user_calls (
+        caller_name, caller_id, call_datetime, call_ts_ms, message_id, chat_id,
+        bot_reply_id_1, bot_reply_id_2, mint, ticker, mcap_usd, price_usd,
+        first_caller, trigger_text
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_QUARANTINE_SQL = """
+    INSERT INTO token_quarantine (
+        mint, ticker, field_name, rick_value, phanes_value,
+        message_id_rick, message_id_phanes
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_TOKEN_METADATA_SQL = """
+    INSERT OR IGNORE INTO tokens_metadata (mint) VALUES (?)
+"""
+
+UPDATE_TOKEN_METADATA_SQL = """
+    UPDATE tokens_metadata SET
+        name = COALESCE(name, ?),
+        ticker = COALESCE(ticker, ?),
+        social_x = COALESCE(social_x, ?),
+        social_telegram = COALESCE(social_telegram, ?),
+        social_website = COALESCE(social_website, ?),
+        first_call_date = COALESCE(first_call_date, ?),
+        first_caller_name = COALESCE(first_caller_name, ?),
+        first_mcap = COALESCE(first_mcap, ?),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE mint = ?
+"""
+
+INSERT_BOT_OBSERVATION_SQL = """
+    INSERT OR IGNORE INTO bot_observations (
+        mint, ticker, bot_name, message_id, observed_at_ms, observed_at,
+        card_json, mcap_usd, price_usd, liquidity_usd, volume_usd,
+        ath_mcap_usd, ath_age_days,
+        top_holders_pct_1, top_holders_pct_2, top_holders_pct_3,
+        top_holders_pct_4, top_holders_pct_5, top_holders_sum_pct
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_TOKEN_DATA_SQL = """
+    INSERT OR REPLACE INTO tokens_data (
+        mint, ticker, mcap, current_mcap, last_update, price,
+        supply, ath_mcap, ath_date, liquidity, liquidity_x,
+        top_holders_pct_1, top_holders_pct_2, top_holders_pct_3,
+        top_holders_pct_4, top_holders_pct_5, top_holders_sum_pct
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Flush order. Each table keeps its own row order; the metadata INSERT OR
+# IGNOREs only have to land before the UPDATEs that fill them in.
+_WRITE_ORDER = (
+    INSERT_USER_CALL_SQL,
+    INSERT_QUARANTINE_SQL,
+    INSERT_TOKEN_METADATA_SQL,
+    UPDATE_TOKEN_METADATA_SQL,
+    INSERT_BOT_OBSERVATION_SQL,
+    INSERT_TOKEN_DATA_SQL,
+)
+
+
+class ChatMessageIndex:
+    """
+    (chat_id, message_id) lookup for one chat's message stream.
+
+    Holds only messages from the last `window_ms` of the stream; older
+    reply targets are fetched through the tg_norm primary key.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, window_ms: int):
+        self.conn = conn
+        self.window_ms = window_ms
+        self.recent: Dict[int, Dict] = {}
+        self.order: deque = deque()  # (ts_ms, message_id), oldest first
+
+    def add(self, msg: Dict) -> None:
+        ts_ms = msg["ts_ms"]
+        self.recent[msg["message_id"]] = msg
+        if ts_ms is None:
+            return
+        self.order.append((ts_ms, msg["message_id"]))
+        cutoff = ts_ms - self.window_ms
+        while self.order and self.order[0][0] < cutoff:
+            self.recent.pop(self.order.popleft()[1], None)
+
+    def get(self, key: Tuple[str, int]) -> Optional[Dict]:
+        chat_id, message_id = key
+        msg = self.recent.get(message_id)
+        if msg is not None:
+            return msg
+        row = self.conn.execute(MESSAGE_BY_ID_SQL, (chat_id, message_id)).fetchone()
+        return dict(row) if row else None
+
+
+class CallWriter:
+    """Buffers linker writes and applies them with executemany, one transaction per batch."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.rows: Dict[str, List[Tuple]] = {sql: [] for sql in _WRITE_ORDER}
+
+    def add(self, sql: str, params: Tuple) -> None:
+        self.rows[sql].append(params)
+
+    def flush(self) -> None:
+        cur = self.conn.cursor()
+        for sql in _WRITE_ORDER:
+            if self.rows[sql]:
+                cur.executemany(sql, self.rows[sql])
+                self.rows[sql] = []
+        self.conn.commit()
+
+
+def record_bot_pair(
+    pair: Dict,
+    writer: CallWriter,
+    first_callers: Dict[str, str],
+    first_call_ts: Dict[str, int],
+    user_token_calls: Set[Tuple[str, str]],
+) -> bool:
+    """Merge one trigger's Rick/Phanes replies and queue its rows. Returns True if linked."""
+    trigger = pair["trigger"]
+    rick_data = pair.get("rick")
+    phanes_data = pair.get("phanes")
+    
+    rick_card = rick_data["card"] if rick_data else None
+    phanes_card = phanes_data["card"] if phanes_data else None
+    
+    # Merge bot cards
+    merged_card, conflicts = merge_bot_cards(rick_card, phanes_card)
+    
+    mint = merged_card.get("mint")
+    ticker = merged_card.get("ticker")
+    caller_name = trigger["from_name"]
+    
+    # Extract mint/ticker from trigger text
+    # If bot replied directly to this message (via reply_to_message_id),
+    # we can trust the mint/address in the trigger text - ESPECIALLY for EVM addresses
+    trigger_text = trigger.get("text") or ""
+    trigger_mints, trigger_tickers = extract_mints_and_tickers(trigger_text)
+    
+    # ALWAYS prioritize EVM addresses (0x...) from trigger text if present
+    # The bot replied to this message, so the 0x address IS the mint address
+    evm_addresses = [m for m in trigger_mints if m.startswith('0x')]
+    if evm_addresses:
+        mint = evm_addresses[0]  # Use first EVM address from trigger
+    # Otherwise, use mint from bot cards if available
+    elif (mint is None or mint == "") and trigger_mints:
+        mint = trigger_mints[0]
+    
+    # Use trigger ticker if bot cards don't have one
+    if (ticker is None or ticker == "") and trigger_tickers:
+        ticker = trigger_tickers[0]
+    
+    # Still skip if we have absolutely no identifier
+    if not mint and not ticker:
+        return False
+    
+    # Check if this user already called this token
+    if mint and (caller_name, mint) in user_token_calls:
+        return False
+    
+    # Determine if first caller
+    is_first = False
+    if mint:
+        if mint not in first_callers:
+            first_callers[mint] = caller_name
+            first_call_ts[mint] = trigger["ts_ms"]
+            is_first = True
+        elif first_callers[mint] == caller_name:
+            is_first = True
+    
+    # Record user call
+    call_dt = datetime.fromtimestamp(trigger["ts_ms"] / 1000, tz=timezone.utc)
+    
+    writer.add(INSERT_USER_CALL_SQL, (
+        caller_name,
+        trigger.get("from_id"),
+        call_dt.isoformat(),
+        trigger["ts_ms"],
+        trigger["message_id"],
+        trigger["chat_id"],
+        rick_data["message_id"] if rick_data else None,
+        phanes_data["message_id"] if phanes_data else None,
+        mint,
+        ticker,
+        merged_card.get("mcap_usd"),
+        merged_card.get("price_usd"),
+        1 if is_first else 0,
+        trigger.get("text"),
+    ))
+    
+    # Record conflicts
+    for conflict in conflicts:
+        writer.add(INSERT_QUARANTINE_SQL, (
+            mint,
+            ticker,
+            conflict["field_name"],
+            str(conflict["rick_value"]),
+            str(conflict["phanes_value"]),
+            rick_data["message_id"] if rick_data else None,
+            phanes_data["message_id"] if phanes_data else None,
+        ))
+    
+    # Update tokens_metadata
+    if mint:
+        writer.add(INSERT_TOKEN_METADATA_SQL, (mint,))
+        writer.add(UPDATE_TOKEN_METADATA_SQL, (
+            merged_card.get("token_name"),
+            ticker,
+            "1" if merged_card.get("social_x") else None,
+            "1" if merged_card.get("social_telegram") else None,
+            "1" if merged_card.get("social_website") else None,
+            call_dt.isoformat() if is_first else None,
+            caller_name if is_first else None,
+            merged_card.get("mcap_usd") if is_first else None,
+            mint,
+        ))
+    
+    # Store bot observations (raw, before merging)
+    if rick_data:
+        rick_ts_ms = rick_data["ts_ms"]
+        rick_obs_dt = datetime.fromtimestamp(rick_ts_ms / 1000, tz=timezone.utc)
+        top_holders = rick_card.get("top_holders_pct") or [] if rick_card else []
+        writer.add(INSERT_BOT_OBSERVATION_SQL, (
+            mint, ticker, "rick", rick_data["message_id"],
+            rick_ts_ms, rick_obs_dt.isoformat(),
+            json.dumps(rick_card, ensure_ascii=False),
+            rick_card.get("mcap_usd") or rick_card.get("fdv_now_usd") if rick_card else None,
+            rick_card.get("price_usd") if rick_card else None,
+            rick_card.get("liquidity_usd") if rick_card else None,
+            rick_card.get("vol_usd") or rick_card.get("volume_usd") if rick_card else None,
+            rick_card.get("ath_mcap_usd") if rick_card else None,
+            rick_card.get("ath_age_days") if rick_card else None,
+            top_holders[0] if len(top_holders) > 0 else None,
+            top_holders[1] if len(top_holders) > 1 else None,
+            top_holders[2] if len(top_holders) > 2 else None,
+            top_holders[3] if len(top_holders) > 3 else None,
+            top_holders[4] if len(top_holders) > 4 else None,
+            rick_card.get("top_holders_sum_pct") if rick_card else None,
+        ))
+    
+    if phanes_data:
+        phanes_ts_ms = phanes_data["ts_ms"]
+        phanes_obs_dt = datetime.fromtimestamp(phanes_ts_ms / 1000, tz=timezone.utc)
+        # Phanes doesn't have holder data
+        writer.add(INSERT_BOT_OBSERVATION_SQL, (
+            mint, ticker, "phanes", phanes_data["message_id"],
+            phanes_ts_ms, phanes_obs_dt.isoformat(),
+            json.dumps(phanes_card, ensure_ascii=False),
+            phanes_card.get("mcap_usd") if phanes_card else None,
+            phanes_card.get("price_usd") if phanes_card else None,
+            phanes_card.get("liquidity_usd") if phanes_card else None,
+            phanes_card.get("vol_usd") if phanes_card else None,
+            phanes_card.get("ath_mcap_usd") if phanes_card else None,
+            phanes_card.get("ath_age_days") if phanes_card else None,
+            None, None, None, None, None, None,
+        ))
+    
+    # Update tokens_data
+    if mint:
+        ath_date = calculate_ath_date(
+            trigger["ts_ms"],
+            merged_card.get("ath_age_days")
+        )
+        
+        # Compute supply = mcap / price
+        supply = None
+        if merged_card.get("mcap_usd") and merged_card.get("price_usd") and merged_card["price_usd"] > 0:
+            supply = merged_card["mcap_usd"] / merged_card["price_usd"]
+        
+        liquidity_x = None
+        if merged_card.get("mcap_usd") and merged_card.get("liquidity_usd") and merged_card["liquidity_usd"] > 0:
+            liquidity_x = merged_card["mcap_usd"] / merged_card["liquidity_usd"]
+        
+        top_holders = merged_card.get("top_holders_pct") or []
+        
+        writer.add(INSERT_TOKEN_DATA_SQL, (
+            mint,
+            ticker,
+            merged_card.get("mcap_usd"),
+            merged_card.get("mcap_usd"),  # Initial = current
+            call_dt.isoformat(),
+            merged_card.get("price_usd"),
+            supply,
+            merged_card.get("ath_mcap_usd"),
+            ath_date.isoformat() if ath_date else None,
+            merged_card.get("liquidity_usd"),
+            liquidity_x,
+            top_holders[0] if len(top_holders) > 0 else None,
+            top_holders[1] if len(top_holders) > 1 else None,
+            top_holders[2] if len(top_holders) > 2 else None,
+            top_holders[3] if len(top_holders) > 3 else None,
+            top_holders[4] if len(top_holders) > 4 else None,
+            merged_card.get("top_holders_sum_pct"),
+        ))
+    
+    if mint:
+        user_token_calls.add((caller_name, mint))
+    
+    return True
+
+
+def link_callers_v2(
+    db_path: str,
+    window_seconds: int = 60,
+    quiet: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    """
+    Main linking logic - retroactive approach.
+
+    Chats are streamed one at a time in timestamp order. Bot replies are
+    grouped per (chat, trigger message) and a group is recorded once the
+    stream has moved `window_seconds` past its first reply, so memory holds
+    one window of messages rather than the whole archive. Rows are written
+    `batch_size` calls per transaction.
+    """
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     
     # Initialize schema
     schema_sql = open(os.path.join(os.path.dirname(__file__), "schema_calls.sql"), "r", encoding="utf-8").read()
     conn.executescript(schema_sql)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tg_norm_chat_ts ON tg_norm(chat_id, ts_ms)")
     conn.commit()
     
-    # Get all messages ordered by chat and timestamp
-    messages = conn.execute("""
-        SELECT 
-            message_id,
-            chat_id,
-            ts_ms,
-            from_name,
-            from_id,
-            text,
-            is_service,
-            norm_json
-        FROM tg_norm
-        ORDER BY chat_id, ts_ms
-    """).fetchall()
-    
-    # Convert to dicts and create lookup dict by (chat_id, message_id)
-    messages_list = [dict(msg) for msg in messages]
-    messages_dict: Dict[Tuple[str, int], Dict] = {}
-    for msg in messages_list:
-        key = (msg["chat_id"], msg["message_id"])
-        messages_dict[key] = msg
+    window_ms = window_seconds * 1000
+    writer = CallWriter(conn)
     
     # Track first caller per token
     first_callers: Dict[str, str] = {}  # mint -> first caller name
@@ -255,324 +584,94 @@ def link_callers_v2(db_path: str, window_seconds: int = 60, quiet: bool = False)
     user_token_calls: Set[Tuple[str, str]] = set()  # (caller_name, mint)
     
     linked_count = 0
-    bot_pairs: Dict[int, Dict] = {}  # message_id -> {rick: card, phanes: card}
-    
+    pair_count = 0
     bot_count = 0
     bot_with_reply = 0
     bot_with_trigger = 0
     
-    # First pass: find all bot replies and parse them
-    for msg in messages_list:
-        if not is_bot_message(msg):
-            continue
-        
-        bot_count += 1
-        
-        # Extract reply_to_message_id from norm_json first
-        norm_json = json.loads(msg.get("norm_json", "{}"))
-        reply_to_id = norm_json.get("reply_to_message_id")
-        
-        # Find trigger message using reply_to (even if card parsing fails)
-        if reply_to_id:
-            bot_with_reply += 1
-        
-        trigger = find_trigger_message_by_reply(
-            msg["message_id"],
-            reply_to_id,
-            msg["chat_id"],
-            messages_dict
-        )
-        
-        if not trigger:
-            continue
-        
-        bot_with_trigger += 1
-        
-        # Now try to parse the bot card using DuckDB parser (more lenient)
-        trigger_text = trigger.get("text") if trigger else None
-        # Use DuckDB parser if available, otherwise fallback to original
-        if HAS_DUCKDB_PARSER:
-            bot_card = parse_bot(msg["from_name"], msg["text"], trigger_text)
-        else:
-            bot_card = parse_any_bot_card(msg["text"])
-            if bot_card:
-                bot_card = bot_card.get("card") if isinstance(bot_card, dict) else bot_card
-        
-        if not bot_card:
-            # Still link it, but without card data
-            bot_name = msg["from_name"]
-            trigger_id = trigger["message_id"]
-            if trigger_id not in bot_pairs:
-                bot_pairs[trigger_id] = {"trigger": trigger, "rick": None, "phanes": None}
-            # Store with empty card
-            if bot_name == "Rick":
-                bot_pairs[trigger_id]["rick"] = {"card": None, "message_id": msg["message_id"]}
-            elif bot_name == "Phanes [Gold]":
-                bot_pairs[trigger_id]["phanes"] = {"card": None, "message_id": msg["message_id"]}
-            continue
-        
-        bot_name = msg["from_name"]
-        
-        # Group bot replies by trigger message
-        trigger_id = trigger["message_id"]
-        if trigger_id not in bot_pairs:
-            bot_pairs[trigger_id] = {"trigger": trigger, "rick": None, "phanes": None}
-        
-        if bot_name == "Rick":
-            bot_pairs[trigger_id]["rick"] = {"card": bot_card, "message_id": msg["message_id"]}
-        elif bot_name == "Phanes [Gold]":
-            bot_pairs[trigger_id]["phanes"] = {"card": bot_card, "message_id": msg["message_id"]}
-    
-    # Second pass: process bot pairs and create user_calls
-    cur = conn.cursor()
-    
-    if not quiet:
-        print(f"Bot messages: {bot_count}, with reply_to: {bot_with_reply}, with valid trigger: {bot_with_trigger}")
-        print(f"Found {len(bot_pairs)} trigger messages with bot replies")
-    
-    for trigger_id, pair in bot_pairs.items():
-        trigger = pair["trigger"]
-        rick_data = pair.get("rick")
-        phanes_data = pair.get("phanes")
-        
-        rick_card = rick_data["card"] if rick_data else None
-        phanes_card = phanes_data["card"] if phanes_data else None
-        
-        # Merge bot cards
-        merged_card, conflicts = merge_bot_cards(rick_card, phanes_card)
-        
-        mint = merged_card.get("mint")
-        ticker = merged_card.get("ticker")
-        caller_name = trigger["from_name"]
-        
-        # Extract mint/ticker from trigger text
-        # If bot replied directly to this message (via reply_to_message_id),
-        # we can trust the mint/address in the trigger text - ESPECIALLY for EVM addresses
-        trigger_text = trigger.get("text") or ""
-        trigger_mints, trigger_tickers = extract_mints_and_tickers(trigger_text)
-        
-        # ALWAYS prioritize EVM addresses (0x...) from trigger text if present
-        # The bot replied to this message, so the 0x address IS the mint address
-        evm_addresses = [m for m in trigger_mints if m.startswith('0x')]
-        if evm_addresses:
-            mint = evm_addresses[0]  # Use first EVM address from trigger
-        # Otherwise, use mint from bot cards if available
-        elif (mint is None or mint == "") and trigger_mints:
-            mint = trigger_mints[0]
-        
-        # Use trigger ticker if bot cards don't have one
-        if (ticker is None or ticker == "") and trigger_tickers:
-            ticker = trigger_tickers[0]
-        
-        # Still skip if we have absolutely no identifier
-        if not mint and not ticker:
-            continue
-        
-        # Check if this user already called this token
-        if mint and (caller_name, mint) in user_token_calls:
-            continue
-        if ticker and not mint:
-            # Can't track by ticker alone reliably, skip duplicates
-            pass
-        
-        # Determine if first caller
-        is_first = False
-        if mint:
-            if mint not in first_callers:
-                first_callers[mint] = caller_name
-                first_call_ts[mint] = trigger["ts_ms"]
-                is_first = True
-            elif first_callers[mint] == caller_name:
-                is_first = True
-        
-        # Record user call
-        call_dt = datetime.fromtimestamp(trigger["ts_ms"] / 1000, tz=timezone.utc)
-        
-        cur.execute("""
-            INSERT OR REPLACE INTO user_calls (
-                caller_name, caller_id, call_datetime, call_ts_ms, message_id, chat_id,
-                bot_reply_id_1, bot_reply_id_2, mint, ticker, mcap_usd, price_usd,
-                first_caller, trigger_text
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            caller_name,
-            trigger.get("from_id"),
-            call_dt.isoformat(),
-            trigger["ts_ms"],
-            trigger["message_id"],
-            trigger["chat_id"],
-            rick_data["message_id"] if rick_data else None,
-            phanes_data["message_id"] if phanes_data else None,
-            mint,
-            ticker,
-            merged_card.get("mcap_usd"),
-            merged_card.get("price_usd"),
-            1 if is_first else 0,
-            trigger.get("text"),
-        ))
-        
-        # Record conflicts
-        for conflict in conflicts:
-            cur.execute("""
-                INSERT INTO token_quarantine (
-                    mint, ticker, field_name, rick_value, phanes_value,
-                    message_id_rick, message_id_phanes
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                mint,
-                ticker,
-                conflict["field_name"],
-                str(conflict["rick_value"]),
-                str(conflict["phanes_value"]),
-                rick_data["message_id"] if rick_data else None,
-                phanes_data["message_id"] if phanes_data else None,
-            ))
+    def record(pair: Dict) -> None:
+        nonlocal linked_count
+        if not record_bot_pair(pair, writer, first_callers, first_call_ts, user_token_calls):
+            return
+        linked_count += 1
+        if linked_count % batch_size == 0:
+            writer.flush()
+            if not quiet:
+                print(f"Processed {linked_count} calls...")
+    
+    chat_ids = [row[0] for row in conn.execute("SELECT DISTINCT chat_id FROM tg_norm ORDER BY chat_id")]
+    for chat_id in chat_ids:
+        index = ChatMessageIndex(conn, window_ms)
+        # trigger message_id -> {trigger, rick, phanes, expires_ms}, in first-reply order
+        bot_pairs: Dict[int, Dict] = {}
         
-        # Update tokens_metadata
-        if mint:
-            cur.execute("""
-                INSERT OR IGNORE INTO tokens_metadata (mint) VALUES (?)
-            """, (mint,))
+        for row in conn.execute(CHAT_MESSAGES_SQL, (chat_id,)):
+            msg = dict(row)
+            ts_ms = msg["ts_ms"]
             
-            cur.execute("""
-                UPDATE tokens_metadata SET
-                    name = COALESCE(name, ?),
-                    ticker = COALESCE(ticker, ?),
-                    social_x = COALESCE(social_x, ?),
-                    social_telegram = COALESCE(social_telegram, ?),
-                    social_website = COALESCE(social_website, ?),
-                    first_call_date = COALESCE(first_call_date, ?),
-                    first_caller_name = COALESCE(first_caller_name, ?),
-                    first_mcap = COALESCE(first_mcap, ?),
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE mint = ?
-            """, (
-                merged_card.get("token_name"),
-                ticker,
-                "1" if merged_card.get("social_x") else None,
-                "1" if merged_card.get("social_telegram") else None,
-                "1" if merged_card.get("social_website") else None,
-                call_dt.isoformat() if is_first else None,
-                caller_name if is_first else None,
-                merged_card.get("mcap_usd") if is_first else None,
-                mint,
-            ))
-        
-        # Store bot observations (raw, before merging)
-        if rick_data:
-            # Get actual timestamp from message
-            rick_msg = next((m for m in messages_list if m["message_id"] == rick_data["message_id"]), None)
-            rick_ts_ms = rick_msg["ts_ms"] if rick_msg else trigger["ts_ms"]
-            rick_obs_dt = datetime.fromtimestamp(rick_ts_ms / 1000, tz=timezone.utc)
-            top_holders = rick_card.get("top_holders_pct") or [] if rick_card else []
-            cur.execute("""
-                INSERT OR IGNORE INTO bot_observations (
-                    mint, ticker, bot_name, message_id, observed_at_ms, observed_at,
-                    card_json, mcap_usd, price_usd, liquidity_usd, volume_usd,
-                    ath_mcap_usd, ath_age_days,
-                    top_holders_pct_1, top_holders_pct_2, top_holders_pct_3,
-                    top_holders_pct_4, top_holders_pct_5, top_holders_sum_pct
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                mint, ticker, "rick", rick_data["message_id"],
-                rick_ts_ms, rick_obs_dt.isoformat(),
-                json.dumps(rick_card, ensure_ascii=False),
-                rick_card.get("mcap_usd") or rick_card.get("fdv_now_usd") if rick_card else None,
-                rick_card.get("price_usd") if rick_card else None,
-                rick_card.get("liquidity_usd") if rick_card else None,
-                rick_card.get("vol_usd") or rick_card.get("volume_usd") if rick_card else None,
-                rick_card.get("ath_mcap_usd") if rick_card else None,
-                rick_card.get("ath_age_days") if rick_card else None,
-                top_holders[0] if len(top_holders) > 0 else None,
-                top_holders[1] if len(top_holders) > 1 else None,
-                top_holders[2] if len(top_holders) > 2 else None,
-                top_holders[3] if len(top_holders) > 3 else None,
-                top_holders[4] if len(top_holders) > 4 else None,
-                rick_card.get("top_holders_sum_pct") if rick_card else None,
-            ))
-        
-        if phanes_data:
-            # Get actual timestamp from message
-            phanes_msg = next((m for m in messages_list if m["message_id"] == phanes_data["message_id"]), None)
-            phanes_ts_ms = phanes_msg["ts_ms"] if phanes_msg else trigger["ts_ms"]
-            phanes_obs_dt = datetime.fromtimestamp(phanes_ts_ms / 1000, tz=timezone.utc)
-            top_holders = []  # Phanes doesn't have holder data
-            cur.execute("""
-                INSERT OR IGNORE INTO bot_observations (
-                    mint, ticker, bot_name, message_id, observed_at_ms, observed_at,
-                    card_json, mcap_usd, price_usd, liquidity_usd, volume_usd,
-                    ath_mcap_usd, ath_age_days,
-                    top_holders_pct_1, top_holders_pct_2, top_holders_pct_3,
-                    top_holders_pct_4, top_holders_pct_5, top_holders_sum_pct
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                mint, ticker, "phanes", phanes_data["message_id"],
-                phanes_ts_ms, phanes_obs_dt.isoformat(),
-                json.dumps(phanes_card, ensure_ascii=False),
-                phanes_card.get("mcap_usd") if phanes_card else None,
-                phanes_card.get("price_usd") if phanes_card else None,
-                phanes_card.get("liquidity_usd") if phanes_card else None,
-                phanes_card.get("vol_usd") if phanes_card else None,
-                phanes_card.get("ath_mcap_usd") if phanes_card else None,
-                phanes_card.get("ath_age_days") if phanes_card else None,
-                None, None, None, None, None, None,
-            ))
-        
-        # Update tokens_data
-        if mint:
-            ath_date = calculate_ath_date(
-                trigger["ts_ms"],
-                merged_card.get("ath_age_days")
+            # Close groups whose reply window has passed
+            while bot_pairs and ts_ms is not None:
+                trigger_id, pair = next(iter(bot_pairs.items()))
+                if pair["expires_ms"] is not None and pair["expires_ms"] >= ts_ms:
+                    break
+                del bot_pairs[trigger_id]
+                record(pair)
+            
+            reply_to_id = msg.pop("reply_to_message_id")
+            index.add(msg)
+            if not is_bot_message(msg):
+                continue
+            
+            bot_count += 1
+            
+            # Find trigger message using reply_to (even if card parsing fails)
+            if reply_to_id:
+                bot_with_reply += 1
+            
+            trigger = find_trigger_message_by_reply(
+                msg["message_id"],
+                reply_to_id,
+                chat_id,
+                index
             )
             
-            # Compute supply = mcap / price
-            supply = None
-            if merged_card.get("mcap_usd") and merged_card.get("price_usd") and merged_card["price_usd"] > 0:
-                supply = merged_card["mcap_usd"] / merged_card["price_usd"]
+            if not trigger:
+                continue
             
-            liquidity_x = None
-            if merged_card.get("mcap_usd") and merged_card.get("liquidity_usd") and merged_card["liquidity_usd"] > 0:
-                liquidity_x = merged_card["mcap_usd"] / merged_card["liquidity_usd"]
+            bot_with_trigger += 1
             
-            top_holders = merged_card.get("top_holders_pct") or []
+            # Now try to parse the bot card using DuckDB parser (more lenient)
+            trigger_text = trigger.get("text")
+            # Use DuckDB parser if available, otherwise fallback to original
+            if HAS_DUCKDB_PARSER:
+                bot_card = parse_bot(msg["from_name"], msg["text"], trigger_text)
+            else:
+                bot_card = parse_any_bot_card(msg["text"])
+                if bot_card:
+                    bot_card = bot_card.get("card") if isinstance(bot_card, dict) else bot_card
             
-            cur.execute("""
-                INSERT OR REPLACE INTO tokens_data (
-                    mint, ticker, mcap, current_mcap, last_update, price,
-                    supply, ath_mcap, ath_date, liquidity, liquidity_x,
-                    top_holders_pct_1, top_holders_pct_2, top_holders_pct_3,
-                    top_holders_pct_4, top_holders_pct_5, top_holders_sum_pct
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                mint,
-                ticker,
-                merged_card.get("mcap_usd"),
-                merged_card.get("mcap_usd"),  # Initial = current
-                call_dt.isoformat(),
-                merged_card.get("price_usd"),
-                supply,
-                merged_card.get("ath_mcap_usd"),
-                ath_date.isoformat() if ath_date else None,
-                merged_card.get("liquidity_usd"),
-                liquidity_x,
-                top_holders[0] if len(top_holders) > 0 else None,
-                top_holders[1] if len(top_holders) > 1 else None,
-                top_holders[2] if len(top_holders) > 2 else None,
-                top_holders[3] if len(top_holders) > 3 else None,
-                top_holders[4] if len(top_holders) > 4 else None,
-                merged_card.get("top_holders_sum_pct"),
-            ))
-        
-        if mint:
-            user_token_calls.add((caller_name, mint))
-        
-        linked_count += 1
+            # Group bot replies by trigger message (linked without card data if parsing failed)
+            trigger_id = trigger["message_id"]
+            if trigger_id not in bot_pairs:
+                expires_ms = ts_ms + window_ms if ts_ms is not None else None
+                bot_pairs[trigger_id] = {"trigger": trigger, "rick": None, "phanes": None, "expires_ms": expires_ms}
+                pair_count += 1
+            
+            reply = {"card": bot_card or None, "message_id": msg["message_id"], "ts_ms": ts_ms}
+            if msg["from_name"] == "Rick":
+                bot_pairs[trigger_id]["rick"] = reply
+            elif msg["from_name"] == "Phanes [Gold]":
+                bot_pairs[trigger_id]["phanes"] = reply
         
-        if linked_count % 100 == 0:
-            conn.commit()
-            print(f"Processed {linked_count} calls...")
+        for pair in bot_pairs.values():
+            record(pair)
+    
+    writer.flush()
+    
+    if not quiet:
+        print(f"Bot messages: {bot_count}, with reply_to: {bot_with_reply}, with valid trigger: {bot_with_trigger}")
+        print(f"Found {pair_count} trigger messages with bot replies")
     
-    conn.commit()
     conn.close()
     
     return linked_count
@@ -582,6 +681,8 @@ def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--db", default="tele.db", help="SQLite database path")
     ap.add_argument("--window", type=int, default=60, help="Time window in seconds (default: 60)")
+    ap.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                    help=f"Linked calls per write transaction (default: {DEFAULT_BATCH_SIZE})")
     ap.add_argument("--quiet", action="store_true")
     args = ap.parse_args()
     
@@ -589,7 +690,7 @@ def main():
         print(f"Linking callers (v2 - retroactive) in {args.db}...")
         print(f"Window: {args.window}s")
     
-    linked_count = link_callers_v2(args.db, args.window, quiet=args.quiet)
+    linked_count = link_callers_v2(args.db, args.window, quiet=args.quiet, batch_size=args.batch_size)
     
     if not args.quiet:
         print(f"\nDONE: {linked_count} calls linked")
@@ -5,12 +5,23 @@ Creates features for ML models and statistical analysis.
 
 import duckdb
 import json
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
 import logging
 
+import numpy as np
+import pandas as pd
+
+from .indicators import candle_feature_matrix
+
 logger = logging.getLogger(__name__)
 
+# Name of the temp relation holding the alerts of a batch
+BATCH_RELATION = '_feature_batch'
+
+# Default number of alerts per batch when materializing features
+DEFAULT_BATCH_SIZE = 20_000
+
 class FeatureEngine:
     """Engine for creating statistical features from alerts/calls"""
     
@@ -57,6 +68,310 @@ class FeatureEngine:
         
         return features
     
+    def create_alert_features_batch(
+        self,
+        alerts: Sequence[Tuple[str, datetime, Optional[str]]],
+        candle_window: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create features for many alerts at once.
+        
+        Same features (and defaults) as create_alert_features for each
+        (mint, alert_timestamp, caller_name), but each feature group is one
+        set-based query over the whole batch instead of one query per alert.
+        
+        If candle_window is set, the create_candle_features indicators over the
+        last candle_window candles at or before each alert are added too.
+        """
+        if not alerts:
+            return []
+        
+        mints = [a[0] for a in alerts]
+        ts_ms = [int(a[1].timestamp() * 1000) for a in alerts]
+        callers = [a[2] for a in alerts]
+        features = self._features_for_batch(mints, ts_ms, callers, candle_window)
+        
+        for feats, (_, alert_timestamp, _) in zip(features, alerts):
+            feats.update(self._get_time_features(alert_timestamp))
+        return features
+    
+    def materialize_alert_features(
+        self,
+        store,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        candle_window: Optional[int] = None,
+        feature_set_version: str = '1.0.0',
+        feature_spec_version: str = '1.0.0',
+        refresh: bool = False
+    ) -> int:
+        """
+        Compute features for every alert in user_calls_d and write them to
+        the FeatureStore's alert_features table.
+        
+        Incremental by default: alerts that already have features for this
+        feature_set_version are skipped. refresh=True recomputes everything.
+        Alert timestamps come from call_ts_ms and are interpreted as UTC.
+        
+        Returns:
+            Number of alerts written
+        """
+        pending = self._pending_alerts(feature_set_version, refresh)
+        written = 0
+        
+        for start in range(0, len(pending), batch_size):
+            chunk = pending.iloc[start:start + batch_size]
+            mints = chunk['mint'].tolist()
+            ts_ms = chunk['call_ts_ms'].astype('int64').tolist()
+            callers = [c if isinstance(c, str) else None for c in chunk['caller_name'].tolist()]
+            
+            features = self._features_for_batch(mints, ts_ms, callers, candle_window)
+            for feats, ms in zip(features, ts_ms):
+                feats.update(self._get_time_features(datetime.fromtimestamp(ms / 1000, tz=timezone.utc)))
+            
+            written += store.store_alert_features_batch(
+                mints, ts_ms, callers, features,
+                feature_set_version=feature_set_version,
+                feature_spec_version=feature_spec_version
+            )
+            logger.info(f"Materialized features for {written}/{len(pending)} alerts")
+        
+        return written
+    
+    def _pending_alerts(self, feature_set_version: str, refresh: bool) -> pd.DataFrame:
+        """Distinct alerts (one per feature_id) that still need features."""
+        has_store = self.con.execute("""
+            SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'alert_features'
+        """).fetchone()[0] > 0
+        
+        skip_existing = ''
+        params: List[Any] = []
+        if has_store and not refresh:
+            skip_existing = """
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM alert_features f
+                    WHERE f.feature_id = c.feature_id AND f.feature_set_version = ?
+                )
+            """
+            params.append(feature_set_version)
+        
+        return self.con.execute(f"""
+            WITH calls AS (
+                SELECT
+                    mint,
+                    call_ts_ms,
+                    caller_name,
+                    mint || '_' || CAST(call_ts_ms // 1000 AS VARCHAR) AS feature_id
+                FROM user_calls_d
+                WHERE mint IS NOT NULL AND call_ts_ms IS NOT NULL
+                QUALIFY ROW_NUMBER() OVER (
+                    PARTITION BY mint, call_ts_ms // 1000 ORDER BY call_ts_ms, caller_name
+                ) = 1
+            )
+            SELECT mint, call_ts_ms, caller_name
+            FROM calls c
+            {skip_existing}
+            ORDER BY call_ts_ms, mint
+        """, params).df()
+    
+    def _features_for_batch(
+        self,
+        mints: List[str],
+        ts_ms: List[int],
+        callers: List[Optional[str]],
+        candle_window: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """All non-time features for a batch, in input order."""
+        n = len(mints)
+        batch = pd.DataFrame({
+            'idx': np.arange(n, dtype=np.int64),
+            'mint': pd.Series(mints, dtype=object),
+            'alert_ts_ms': np.asarray(ts_ms, dtype=np.int64),
+            'alert_ts_s': np.asarray(ts_ms, dtype=np.int64) // 1000,
+            'caller_name': pd.Series(callers, dtype=object),
+        })
+        
+        self.con.register(BATCH_RELATION, batch)
+        try:
+            price = self._batch_price_market_features(n)
+            volume = self._batch_volume_features(n)
+            caller = self._batch_caller_features(n)
+            token = self._batch_token_features(n)
+            candles = self._batch_candle_features(n, candle_window) if candle_window else None
+        finally:
+            self.con.unregister(BATCH_RELATION)
+        
+        features = []
+        for i in range(n):
+            feats: Dict[str, Any] = {}
+            feats.update(price[i])
+            feats.update(volume[i])
+            if callers[i]:
+                feats.update(caller[i])
+            feats.update(token[i])
+            if candles is not None and candles[i]:
+                feats.update(candles[i])
+            features.append(feats)
+        return features
+    
+    def _batch_query(self, sql: str, what: str) -> Optional[List[tuple]]:
+        try:
+            return self.con.execute(sql).fetchall()
+        except Exception as e:
+            logger.warning(f"Failed to get {what} features: {e}")
+            return None
+    
+    def _batch_price_market_features(self, n: int) -> List[Dict[str, float]]:
+        """Price + market features (same user_calls_d row as the per-alert queries)"""
+        out = [
+            {'price_at_alert': 0.0, 'price_change_pct': 0.0, 'price_change_1h_pct': 0.0,
+             'mcap_at_alert': 0.0, 'liquidity_at_alert': 0.0}
+            for _ in range(n)
+        ]
+        rows = self._batch_query(f"""
+            SELECT b.idx, u.price_usd, u.price_move_pct, u.chg_1h_pct, u.mcap_usd, u.liquidity_usd
+            FROM {BATCH_RELATION} b
+            JOIN user_calls_d u ON u.mint = b.mint AND u.call_ts_ms = b.alert_ts_ms
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY b.idx) = 1
+        """, 'price/market')
+        for idx, price, move, chg_1h, mcap, liquidity in rows or []:
+            out[idx] = {
+                'price_at_alert': float(price) if price else 0.0,
+                'price_change_pct': float(move) if move else 0.0,
+                'price_change_1h_pct': float(chg_1h) if chg_1h else 0.0,
+                'mcap_at_alert': float(mcap) if mcap else 0.0,
+                'liquidity_at_alert': float(liquidity) if liquidity else 0.0,
+            }
+        return out
+    
+    def _batch_volume_features(self, n: int) -> List[Dict[str, float]]:
+        """Volume over the 24h / 1h before each alert (one range join)"""
+        out = [{'volume_24h': 0.0, 'volume_1h': 0.0, 'volume_ratio': 0.0} for _ in range(n)]
+        rows = self._batch_query(f"""
+            SELECT
+                b.idx,
+                SUM(c.volume) AS volume_24h,
+                SUM(CASE WHEN c.timestamp >= b.alert_ts_s - 3600 THEN c.volume ELSE 0 END) AS volume_1h
+            FROM {BATCH_RELATION} b
+            JOIN ohlcv_candles_d c
+              ON c.mint = b.mint
+             AND c.timestamp >= b.alert_ts_s - 86400
+             AND c.timestamp <= b.alert_ts_s
+            GROUP BY b.idx
+        """, 'volume')
+        for idx, volume_24h, volume_1h in rows or []:
+            out[idx] = {
+                'volume_24h': float(volume_24h) if volume_24h else 0.0,
+                'volume_1h': float(volume_1h) if volume_1h else 0.0,
+                'volume_ratio': float(volume_1h) / float(volume_24h) if volume_24h and volume_24h > 0 else 0.0
+            }
+        return out
+    
+    def _batch_caller_features(self, n: int) -> List[Dict[str, float]]:
+        """
+        Caller stats over calls strictly before each alert.
+        
+        Running totals per (caller, call_ts_ms) are computed once with a window
+        and each alert picks the latest earlier row with an ASOF join.
+        """
+        out = [{'caller_total_calls': 0, 'caller_win_rate': 0.0, 'caller_avg_multiple': 0.0} for _ in range(n)]
+        rows = self._batch_query(f"""
+            WITH joined AS (
+                SELECT
+                    u.caller_name,
+                    u.call_ts_ms,
+                    CASE WHEN a.ath_multiple > 1.0 THEN 1.0 ELSE 0.0 END AS win,
+                    a.ath_multiple
+                FROM user_calls_d u
+                LEFT JOIN alerts a ON u.mint = a.token_id AND u.call_ts_ms = a.alert_timestamp
+                WHERE u.caller_name IN (SELECT DISTINCT caller_name FROM {BATCH_RELATION})
+            ),
+            per_ts AS (
+                SELECT
+                    caller_name,
+                    call_ts_ms,
+                    COUNT(*) AS n_calls,
+                    SUM(win) AS wins,
+                    SUM(ath_multiple) AS ath_sum,
+                    COUNT(ath_multiple) AS ath_n
+                FROM joined
+                GROUP BY caller_name, call_ts_ms
+            ),
+            running AS (
+                SELECT
+                    caller_name,
+                    call_ts_ms,
+                    SUM(n_calls) OVER w AS total_calls,
+                    SUM(wins) OVER w AS wins,
+                    SUM(ath_sum) OVER w AS ath_sum,
+                    SUM(ath_n) OVER w AS ath_n
+                FROM per_ts
+                WINDOW w AS (PARTITION BY caller_name ORDER BY call_ts_ms ROWS UNBOUNDED PRECEDING)
+            )
+            SELECT
+                b.idx,
+                r.total_calls,
+                r.wins / r.total_calls AS win_rate,
+                CASE WHEN r.ath_n > 0 THEN r.ath_sum / r.ath_n END AS avg_multiple
+            FROM {BATCH_RELATION} b
+            ASOF JOIN running r
+              ON b.caller_name = r.caller_name
+             AND b.alert_ts_ms > r.call_ts_ms
+        """, 'caller')
+        for idx, total_calls, win_rate, avg_multiple in rows or []:
+            out[idx] = {
+                'caller_total_calls': int(total_calls) if total_calls else 0,
+                'caller_win_rate': float(win_rate) if win_rate else 0.0,
+                'caller_avg_multiple': float(avg_multiple) if avg_multiple else 0.0
+            }
+        return out
+    
+    def _batch_token_features(self, n: int) -> List[Dict[str, float]]:
+        """Token age from the latest caller link at or before each alert"""
+        out = [{'token_age_days': 0.0} for _ in range(n)]
+        rows = self._batch_query(f"""
+            SELECT b.idx, c.token_age_s
+            FROM {BATCH_RELATION} b
+            ASOF JOIN caller_links_d c
+              ON b.mint = c.mint
+             AND b.alert_ts_ms >= c.trigger_ts_ms
+        """, 'token')
+        for idx, age_seconds in rows or []:
+            out[idx] = {'token_age_days': age_seconds / 86400.0 if age_seconds else 0.0}
+        return out
+    
+    def _batch_candle_features(self, n: int, candle_window: int) -> List[Dict[str, float]]:
+        """create_candle_features over the last candle_window candles before each alert"""
+        out: List[Dict[str, float]] = [{} for _ in range(n)]
+        try:
+            df = self.con.execute(f"""
+                SELECT b.idx, c.close, c.volume
+                FROM {BATCH_RELATION} b
+                JOIN ohlcv_candles_d c ON c.mint = b.mint AND c.timestamp <= b.alert_ts_s
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY b.idx ORDER BY c.timestamp DESC) <= ?
+                ORDER BY b.idx, c.timestamp
+            """, [candle_window]).df()
+        except Exception as e:
+            logger.warning(f"Failed to get candle features: {e}")
+            return out
+        
+        if df.empty:
+            return out
+        
+        idx = df['idx'].to_numpy(dtype=np.int64)
+        counts = np.bincount(idx, minlength=n)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        matrix = candle_feature_matrix(
+            df['close'].to_numpy(dtype=np.float64),
+            df['volume'].fillna(0.0).to_numpy(dtype=np.float64),
+            offsets
+        )
+        
+        names = list(matrix.keys())
+        values = np.column_stack([matrix[name] for name in names])
+        for i in np.flatnonzero(counts >= 2):
+            out[i] = dict(zip(names, values[i].tolist()))
+        return out
+    
     def create_candle_features(self, candles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Create features from candle data.
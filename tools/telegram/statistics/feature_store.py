@@ -11,6 +11,8 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import logging
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 def get_git_commit_hash() -> str:
@@ -116,6 +118,60 @@ class FeatureStore:
             logger.error(f"Failed to store alert features: {e}")
             raise
     
+    def store_alert_features_batch(
+        self,
+        mints: List[str],
+        alert_ts_ms: List[int],
+        caller_names: List[Optional[str]],
+        features: List[Dict[str, Any]],
+        feature_set_version: str = '1.0.0',
+        feature_spec_version: str = '1.0.0'
+    ) -> int:
+        """
+        Store features for many alerts in one transaction.
+        
+        Rows are keyed like store_alert_features (mint + alert second) and
+        replace existing rows with the same feature_id. alert_timestamp is the
+        UTC timestamp of alert_ts_ms.
+        
+        Returns:
+            Number of rows written
+        """
+        if not mints:
+            return 0
+        
+        computed_at = datetime.now()
+        batch = pd.DataFrame({
+            'mint': pd.Series(mints, dtype=object),
+            'alert_ts_ms': pd.Series(alert_ts_ms, dtype='int64'),
+            'caller_name': pd.Series(caller_names, dtype=object),
+            'features': [json.dumps(f) for f in features],
+        })
+        
+        self.con.register('_alert_features_batch', batch)
+        try:
+            self.con.execute("BEGIN TRANSACTION")
+            self.con.execute("""
+                INSERT OR REPLACE INTO alert_features
+                (feature_id, mint, alert_timestamp, caller_name, features, feature_set_version, feature_spec_version, computed_at, computed_by, created_at)
+                SELECT
+                    mint || '_' || CAST(alert_ts_ms // 1000 AS VARCHAR),
+                    mint,
+                    make_timestamp(alert_ts_ms * 1000),
+                    caller_name,
+                    features,
+                    ?, ?, ?, ?, ?
+                FROM _alert_features_batch
+            """, [feature_set_version, feature_spec_version, computed_at, get_git_commit_hash(), computed_at])
+            self.con.execute("COMMIT")
+            return len(batch)
+        except Exception as e:
+            self.con.execute("ROLLBACK")
+            logger.error(f"Failed to store alert features batch: {e}")
+            raise
+        finally:
+            self.con.unregister('_alert_features_batch')
+    
     def get_features_for_training(
         self,
         target_col: str = 'ath_multiple',
@@ -0,0 +1,178 @@
+"""
+Vectorized technical indicator kernels.
+
+Candles for many alerts are passed as flat NumPy arrays plus segment offsets
+(segment i is close[offsets[i]:offsets[i+1]], oldest first). Each kernel
+returns one value per segment, matching the FeatureEngine._calculate_*
+definitions on that segment's candle list.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+def _segments(offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.asarray(offsets, dtype=np.int64)
+    return offsets[:-1], offsets[1:] - offsets[:-1]
+
+
+def _last_window(values: np.ndarray, ends: np.ndarray, period: int) -> np.ndarray:
+    """[n_segments, period] matrix of the last `period` values of each segment."""
+    idx = ends[:, None] - period + np.arange(period)[None, :]
+    return values[idx]
+
+
+def _last_value(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    out = np.zeros(len(starts), dtype=np.float64)
+    has = lengths > 0
+    out[has] = values[starts[has] + lengths[has] - 1]
+    return out
+
+
+def sma_last(close: np.ndarray, offsets: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average of the last `period` closes (last close if shorter)."""
+    starts, lengths = _segments(offsets)
+    out = _last_value(close, starts, lengths)
+    full = lengths >= period
+    if full.any():
+        out[full] = _last_window(close, (starts + lengths)[full], period).mean(axis=1)
+    return out
+
+
+def ema_last(close: np.ndarray, offsets: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA seeded with the first close and run over the whole segment
+    (last close if the segment is shorter than `period`).
+
+    The recursion ema = c*m + ema*(1-m) unrolls to a weighted sum:
+    weight (1-m)^(n-1) on the first close and m*(1-m)^(n-1-i) on close i.
+    """
+    starts, lengths = _segments(offsets)
+    out = _last_value(close, starts, lengths)
+    full = lengths >= period
+    if not full.any():
+        return out
+
+    m = 2.0 / (period + 1)
+    seg_id = np.repeat(np.arange(len(lengths)), lengths)
+    pos = np.arange(len(close)) - starts[seg_id]
+    from_end = lengths[seg_id] - 1 - pos
+    weights = m * (1.0 - m) ** from_end
+    first = pos == 0
+    weights[first] = (1.0 - m) ** from_end[first]
+
+    sums = np.zeros(len(lengths), dtype=np.float64)
+    np.add.at(sums, seg_id, close * weights)
+    out[full] = sums[full]
+    return out
+
+
+def volatility_last(close: np.ndarray, offsets: np.ndarray, period: int) -> np.ndarray:
+    """Population std of the last `period` closes (0 if shorter)."""
+    starts, lengths = _segments(offsets)
+    out = np.zeros(len(lengths), dtype=np.float64)
+    full = lengths >= period
+    if full.any():
+        out[full] = _last_window(close, (starts + lengths)[full], period).std(axis=1)
+    return out
+
+
+def bollinger_last(
+    close: np.ndarray,
+    offsets: np.ndarray,
+    period: int,
+    num_std: float = 2.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(upper, lower) Bollinger bands (last close for both if shorter than period)."""
+    starts, lengths = _segments(offsets)
+    upper = _last_value(close, starts, lengths)
+    lower = upper.copy()
+    full = lengths >= period
+    if full.any():
+        window = _last_window(close, (starts + lengths)[full], period)
+        sma = window.mean(axis=1)
+        std = window.std(axis=1)
+        upper[full] = sma + num_std * std
+        lower[full] = sma - num_std * std
+    return upper, lower
+
+
+def rsi_last(close: np.ndarray, offsets: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI over the last `period` close-to-close changes (simple averages).
+
+    50 if the segment has fewer than period+1 candles, 100 if there were no losses.
+    """
+    starts, lengths = _segments(offsets)
+    out = np.full(len(lengths), 50.0)
+    full = lengths >= period + 1
+    if not full.any():
+        return out
+
+    changes = np.diff(_last_window(close, (starts + lengths)[full], period + 1), axis=1)
+    avg_gain = np.where(changes > 0, changes, 0.0).sum(axis=1) / period
+    avg_loss = np.where(changes > 0, 0.0, -changes).sum(axis=1) / period
+
+    rsi = np.full(len(avg_gain), 100.0)
+    has_loss = avg_loss != 0
+    rs = avg_gain[has_loss] / avg_loss[has_loss]
+    rsi[has_loss] = 100 - (100 / (1 + rs))
+    out[full] = rsi
+    return out
+
+
+def momentum_last(values: np.ndarray, offsets: np.ndarray, period: int) -> np.ndarray:
+    """
+    Percent change between the last value and the value `period` candles
+    earlier (0 if shorter than period+1 or the earlier value is 0).
+    """
+    starts, lengths = _segments(offsets)
+    out = np.zeros(len(lengths), dtype=np.float64)
+    full = lengths >= period + 1
+    if full.any():
+        ends = (starts + lengths)[full]
+        current = values[ends - 1]
+        past = values[ends - 1 - period]
+        nonzero = past != 0
+        res = np.zeros(len(ends), dtype=np.float64)
+        res[nonzero] = (current[nonzero] - past[nonzero]) / past[nonzero] * 100
+        out[full] = res
+    return out
+
+
+def candle_feature_matrix(
+    close: np.ndarray,
+    volume: np.ndarray,
+    offsets: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    All FeatureEngine.create_candle_features columns for every segment.
+
+    Segments with fewer than 2 candles get NaN (create_candle_features
+    returns no features for them).
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    volume = np.ascontiguousarray(volume, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+
+    bb_upper, bb_lower = bollinger_last(close, offsets, 20)
+    features = {
+        'rsi_14': rsi_last(close, offsets, 14),
+        'rsi_30': rsi_last(close, offsets, 30),
+        'sma_20': sma_last(close, offsets, 20),
+        'sma_50': sma_last(close, offsets, 50),
+        'ema_12': ema_last(close, offsets, 12),
+        'ema_26': ema_last(close, offsets, 26),
+        'volatility_20': volatility_last(close, offsets, 20),
+        'bollinger_upper': bb_upper,
+        'bollinger_lower': bb_lower,
+        'price_momentum_5': momentum_last(close, offsets, 5),
+        'volume_momentum_5': momentum_last(volume, offsets, 5),
+    }
+
+    too_short = np.diff(offsets) < 2
+    if too_short.any():
+        for values in features.values():
+            values[too_short] = np.nan
+    return features
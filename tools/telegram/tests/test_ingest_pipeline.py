@@ -0,0 +1,168 @@
+"""
+Tests for the pipelined Telegram ingest in duckdb_punch_pipeline.
+
+Covers:
+- Inline and process-pool parsing produce identical tables
+- Chunk boundaries do not change results
+- Idempotent reruns and resume of interrupted runs
+- Arrow batch writer fallbacks
+"""
+
+import json
+import sys
+from argparse import Namespace
+from pathlib import Path
+
+import duckdb
+import pytest
+
+# duckdb_punch_pipeline imports tools.shared, so the repo root must be importable
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+_TELEGRAM_DIR = Path(__file__).resolve().parents[1]
+for _p in (_REPO_ROOT, _TELEGRAM_DIR):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+import duckdb_punch_pipeline as pipeline
+
+MINTS = [
+    "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr",
+    "EKpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm",
+    "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263",
+]
+
+
+def make_export(path: Path) -> None:
+    messages = []
+    mid = 1
+    ts = 1704067200
+    for i in range(30):
+        mint = MINTS[i % len(MINTS)]
+        trigger = mid
+        messages.append({
+            "id": mid, "type": "message", "date_unixtime": str(ts), "from": f"caller{i % 4}",
+            "from_id": f"user{100 + i % 4}", "text": f"aping {mint}" if i % 3 else ["$TKN", {"type": "code", "text": mint}],
+        })
+        mid += 1
+        messages.append({
+            "id": mid, "type": "message", "date_unixtime": str(ts + 2), "from": "Rick",
+            "from_id": "user6126376117", "reply_to_message_id": trigger,
+            "text": f"🟡 Token{i} [{100 + i}K/{i}%] $TKN{i}\n💰 USD: $0.000{i + 1}\n💦 Liq: ${i}K\n{mint}",
+        })
+        mid += 1
+        if i % 2 == 0:
+            messages.append({
+                "id": mid, "type": "message", "date_unixtime": str(ts + 3), "from": "Phanes [Gold]",
+                "from_id": "user7774196337", "reply_to_message_id": trigger,
+                "text": f"💊 Token{i} ($TKN{i})\n├ {mint}\n└ #SOL | 1h | 👁️ {i}",
+            })
+            mid += 1
+        if i % 7 == 0:
+            messages.append({"id": mid, "type": "service", "date_unixtime": str(ts + 4), "action": "join"})
+            mid += 1
+        ts += 60
+    path.write_text(json.dumps({"id": 99, "name": "Test Chat", "type": "public_supergroup", "messages": messages}))
+
+
+def run_ingest(in_path: Path, db_path: Path, **overrides) -> None:
+    args = Namespace(
+        in_path=str(in_path), duckdb=str(db_path), chat_id=None, rebuild=False, force=False,
+        run_id=None, export_csv=None, export_parquet=None, export_parquet_run=False,
+        output_dir=".", compare_sqlite=None, workers=0, chunk_size=16,
+    )
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    con = duckdb.connect(str(db_path))
+    try:
+        pipeline._run_main_logic(args, con)
+    finally:
+        con.close()
+
+
+def table_rows(db_path: Path):
+    con = duckdb.connect(str(db_path), read_only=True)
+    try:
+        out = {}
+        for table, key in [
+            ("tg_norm_d", "message_id"),
+            ("caller_links_d", "trigger_message_id, bot_message_id"),
+            ("user_calls_d", "message_id"),
+        ]:
+            cols = [c[0] for c in con.execute(f"DESCRIBE {table}").fetchall() if c[0] not in ("run_id", "inserted_at")]
+            out[table] = con.execute(f"SELECT {', '.join(cols)} FROM {table} ORDER BY {key}").fetchall()
+        return out
+    finally:
+        con.close()
+
+
+@pytest.fixture
+def export_path(tmp_path):
+    path = tmp_path / "result.json"
+    make_export(path)
+    return path
+
+
+@pytest.mark.integration
+def test_ingest_inline_populates_tables(export_path, tmp_path):
+    db_path = tmp_path / "inline.duckdb"
+    run_ingest(export_path, db_path, rebuild=True)
+    rows = table_rows(db_path)
+
+    assert len(rows["tg_norm_d"]) == 30 + 30 + 15 + 5
+    assert len(rows["caller_links_d"]) == 45
+    assert len(rows["user_calls_d"]) == 30
+
+    con = duckdb.connect(str(db_path), read_only=True)
+    status, tg, links, calls = con.execute("""
+        SELECT status, rows_inserted_tg_norm, rows_inserted_caller_links, rows_inserted_user_calls
+        FROM ingestion_runs
+    """).fetchone()
+    con.close()
+    assert (status, tg, links, calls) == ("completed", 80, 45, 30)
+
+
+@pytest.mark.integration
+def test_process_pool_matches_inline(export_path, tmp_path):
+    run_ingest(export_path, tmp_path / "inline.duckdb", rebuild=True, workers=0, chunk_size=1000)
+    run_ingest(export_path, tmp_path / "pool.duckdb", rebuild=True, workers=2, chunk_size=7)
+    assert table_rows(tmp_path / "pool.duckdb") == table_rows(tmp_path / "inline.duckdb")
+
+
+@pytest.mark.integration
+def test_rerun_is_idempotent_and_resume_reinserts(export_path, tmp_path, capsys):
+    db_path = tmp_path / "runs.duckdb"
+    run_ingest(export_path, db_path, rebuild=True)
+    expected = table_rows(db_path)
+
+    run_ingest(export_path, db_path)
+    assert '"status": "already_completed"' in capsys.readouterr().out
+    assert table_rows(db_path) == expected
+
+    # Simulate an interrupted run: resume deletes its rows and ingests again
+    con = duckdb.connect(str(db_path))
+    con.execute("UPDATE ingestion_runs SET status = 'running'")
+    con.close()
+    run_ingest(export_path, db_path, chunk_size=5)
+    assert table_rows(db_path) == expected
+
+
+@pytest.mark.unit
+def test_run_pipelined_keeps_order():
+    chunks = [[i, i + 1] for i in range(0, 40, 2)]
+    inline = list(pipeline.run_pipelined(iter(chunks), sum, workers=0))
+    pooled = list(pipeline.run_pipelined(iter(chunks), sum, workers=2, max_pending=3))
+    assert inline == pooled == [sum(c) for c in chunks]
+
+
+@pytest.mark.unit
+def test_append_rows_arrow_mixed_types_and_legacy_tables():
+    con = duckdb.connect(":memory:")
+    con.execute("CREATE TABLE t (k BIGINT PRIMARY KEY, views BIGINT, flag BOOLEAN)")
+    pipeline.append_rows_arrow(con, "t", ("k", "views", "flag"), [(1, 10, True), (2, "20", None)])
+    # Duplicate keys are ignored on tables with primary keys
+    pipeline.append_rows_arrow(con, "t", ("k", "views", "flag"), [(1, 99, False)])
+    assert con.execute("SELECT * FROM t ORDER BY k").fetchall() == [(1, 10, True), (2, 20, None)]
+
+    con.execute("CREATE TABLE legacy (k BIGINT, v TEXT)")
+    pipeline.append_rows_arrow(con, "legacy", ("k", "v"), [(1, "a"), (1, "a")], or_ignore=False)
+    assert con.execute("SELECT count(*) FROM legacy").fetchone()[0] == 2
@@ -0,0 +1,148 @@
+"""
+Tests for the streaming caller linker in link_callers_v2.
+
+Covers:
+- Rick and Phanes replies to one trigger merge into one call
+- Message ids reused across chats link independently
+- Reply targets older than the in-memory window are still found
+- Replies after the window start a new group
+- Batch size does not change results
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+_TELEGRAM_DIR = Path(__file__).resolve().parents[1]
+for _p in (_REPO_ROOT, _TELEGRAM_DIR):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from link_callers_v2 import link_callers_v2
+
+MINTS = [
+    "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr",
+    "EKpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm",
+]
+T0 = 1704067200000
+
+
+def rick_text(i: int, mint: str) -> str:
+    return f"🟡 Token{i} [{100 + i}K/{i}%] $TKN{i}\n💰 USD: $0.000{i + 1}\n💦 Liq: ${i}K\n{mint}"
+
+
+def phanes_text(i: int, mint: str) -> str:
+    return f"💊 Token{i} ($TKN{i})\n├ {mint}\n└ #SOL | 1h | 👁️ {i}"
+
+
+def make_db(path: Path, messages) -> str:
+    """messages: (chat_id, message_id, ts_ms, from_name, text, reply_to)"""
+    conn = sqlite3.connect(path)
+    conn.executescript((_TELEGRAM_DIR / "schema.sql").read_text(encoding="utf-8"))
+    for chat_id, message_id, ts_ms, from_name, text, reply_to in messages:
+        norm = {"id": message_id, "type": "message", "from": from_name, "text": text}
+        if reply_to is not None:
+            norm["reply_to_message_id"] = reply_to
+        conn.execute(
+            "INSERT INTO tg_norm (chat_id, message_id, ts_ms, from_name, from_id, type, is_service, text, norm_json) "
+            "VALUES (?, ?, ?, ?, ?, 'message', 0, ?, ?)",
+            (chat_id, message_id, ts_ms, from_name, f"id_{from_name}", text, json.dumps(norm)),
+        )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def fetch(db_path: str, sql: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+def test_rick_and_phanes_merge_into_one_call(tmp_path):
+    db = make_db(tmp_path / "tele.db", [
+        ("c1", 1, T0, "alice", f"aping {MINTS[0]}", None),
+        ("c1", 2, T0 + 2000, "Rick", rick_text(1, MINTS[0]), 1),
+        ("c1", 3, T0 + 3000, "Phanes [Gold]", phanes_text(1, MINTS[0]), 1),
+    ])
+
+    assert link_callers_v2(db, quiet=True) == 1
+    calls = fetch(db, "SELECT caller_name, message_id, bot_reply_id_1, bot_reply_id_2, mint, first_caller FROM user_calls")
+    assert calls == [("alice", 1, 2, 3, MINTS[0], 1)]
+    observations = fetch(db, "SELECT bot_name, message_id, observed_at_ms FROM bot_observations ORDER BY message_id")
+    assert observations == [("rick", 2, T0 + 2000), ("phanes", 3, T0 + 3000)]
+
+
+@pytest.mark.unit
+def test_message_ids_reused_across_chats(tmp_path):
+    db = make_db(tmp_path / "tele.db", [
+        ("c1", 1, T0, "alice", f"aping {MINTS[0]}", None),
+        ("c1", 2, T0 + 2000, "Rick", rick_text(1, MINTS[0]), 1),
+        ("c2", 1, T0 + 10000, "bob", f"look {MINTS[1]}", None),
+        ("c2", 2, T0 + 12000, "Rick", rick_text(2, MINTS[1]), 1),
+    ])
+
+    assert link_callers_v2(db, quiet=True) == 2
+    calls = fetch(db, "SELECT chat_id, caller_name, mint, call_ts_ms FROM user_calls ORDER BY chat_id")
+    assert calls == [("c1", "alice", MINTS[0], T0), ("c2", "bob", MINTS[1], T0 + 10000)]
+
+
+@pytest.mark.unit
+def test_trigger_older_than_window_is_found(tmp_path):
+    messages = [("c1", 1, T0, "alice", f"aping {MINTS[0]}", None)]
+    # Chatter pushes the trigger out of the in-memory window before Rick replies
+    messages += [("c1", 10 + i, T0 + 1000 * (i + 1), "carol", "gm", None) for i in range(20)]
+    messages.append(("c1", 50, T0 + 30000, "Rick", rick_text(1, MINTS[0]), 1))
+    db = make_db(tmp_path / "tele.db", messages)
+
+    assert link_callers_v2(db, window_seconds=5, quiet=True) == 1
+    assert fetch(db, "SELECT message_id, bot_reply_id_1 FROM user_calls") == [(1, 50)]
+
+
+@pytest.mark.unit
+def test_replies_after_window_start_new_group(tmp_path):
+    db = make_db(tmp_path / "tele.db", [
+        ("c1", 1, T0, "alice", f"aping {MINTS[0]}", None),
+        ("c1", 2, T0 + 2000, "Rick", rick_text(1, MINTS[0]), 1),
+        ("c1", 3, T0 + 120000, "Phanes [Gold]", phanes_text(1, MINTS[0]), 1),
+    ])
+
+    # The late Phanes reply is its own group; alice already called this mint
+    assert link_callers_v2(db, window_seconds=60, quiet=True) == 1
+    assert fetch(db, "SELECT bot_reply_id_1, bot_reply_id_2 FROM user_calls") == [(2, None)]
+
+
+@pytest.mark.unit
+def test_batch_size_does_not_change_results(tmp_path):
+    messages = []
+    mid = 1
+    for i in range(25):
+        chat_id = f"c{i % 2}"
+        mint = MINTS[i % 2]
+        ts = T0 + i * 10000
+        messages.append((chat_id, mid, ts, f"caller{i % 5}", f"aping {mint}", None))
+        messages.append((chat_id, mid + 1, ts + 1000, "Rick", rick_text(i, mint), mid))
+        if i % 3 == 0:
+            messages.append((chat_id, mid + 2, ts + 2000, "Phanes [Gold]", phanes_text(i, mint), mid))
+        mid += 3
+
+    results = []
+    for batch_size in (1, 500):
+        db = make_db(tmp_path / f"tele_{batch_size}.db", messages)
+        linked = link_callers_v2(db, quiet=True, batch_size=batch_size)
+        results.append((
+            linked,
+            fetch(db, "SELECT caller_name, chat_id, message_id, bot_reply_id_1, bot_reply_id_2, mint, first_caller "
+                     "FROM user_calls ORDER BY chat_id, message_id"),
+            fetch(db, "SELECT mint, ticker, first_call_date, first_caller_name FROM tokens_metadata ORDER BY mint"),
+            fetch(db, "SELECT mint, ticker, mcap, price FROM tokens_data ORDER BY mint"),
+        ))
+    assert results[0][0] == 10
+    assert results[0] == results[1]
@@ -2,6 +2,8 @@
 Tests for statistics and feature engineering modules.
 """
 
+import json
+
 import pytest
 import duckdb
 from datetime import datetime, timedelta
@@ -275,3 +277,142 @@ def test_correlation_analysis(test_db):
     
     assert isinstance(result, dict)
 
+
+def _insert_batch_fixture_rows(con):
+    """Add a second caller, more calls and caller links for batch tests."""
+    con.execute("""
+        INSERT INTO user_calls_d VALUES
+        ('So22222222222222222222222222222222222222223', 1704067300000, 'Alice', 2.0, 1.0, 0.5, 2000000.0, 70000.0),
+        ('So22222222222222222222222222222222222222223', 1704070000000, 'Brook', NULL, NULL, NULL, NULL, NULL),
+        ('So33333333333333333333333333333333333333334', 1704067400000, NULL, 3.0, 0.0, 0.0, 500000.0, 10000.0)
+    """)
+    con.execute("""
+        INSERT INTO caller_links_d VALUES
+        ('So11111111111111111111111111111111111111112', 1704060000000, 3600, 1704056400000),
+        ('So11111111111111111111111111111111111111112', 1704067230000, 7200, 1704060030000),
+        ('So22222222222222222222222222222222222222223', 1704067300000, 86400, 1703980900000)
+    """)
+    con.commit()
+
+
+def test_feature_engineering_batch_matches_per_alert(test_db):
+    """Batch features equal create_alert_features for every alert."""
+    _insert_batch_fixture_rows(test_db)
+    engine = FeatureEngine(test_db)
+    
+    alerts = [
+        (mint, datetime.fromtimestamp(ts_ms / 1000), caller)
+        for mint, ts_ms, caller in test_db.execute(
+            "SELECT mint, call_ts_ms, caller_name FROM user_calls_d ORDER BY call_ts_ms"
+        ).fetchall()
+    ]
+    alerts.append(('SoMissing', datetime.fromtimestamp(1704067200), 'Nobody'))
+    
+    batch = engine.create_alert_features_batch(alerts)
+    
+    assert len(batch) == len(alerts)
+    for (mint, ts, caller), features in zip(alerts, batch):
+        expected = engine.create_alert_features(mint, ts, caller_name=caller)
+        assert features.keys() == expected.keys()
+        for key, value in expected.items():
+            assert features[key] == pytest.approx(value), key
+
+
+def test_feature_engineering_batch_caller_features_with_ms_alerts(test_db):
+    """Caller running stats use only calls strictly before each alert."""
+    test_db.execute("DROP TABLE alerts")
+    test_db.execute("CREATE TABLE alerts (token_id TEXT, alert_timestamp BIGINT, ath_multiple DOUBLE)")
+    test_db.execute("""
+        INSERT INTO alerts VALUES
+        ('So11111111111111111111111111111111111111112', 1704067200000, 2.5),
+        ('So11111111111111111111111111111111111111112', 1704067260000, 0.5)
+    """)
+    _insert_batch_fixture_rows(test_db)
+    engine = FeatureEngine(test_db)
+    
+    alerts = [
+        ('So11111111111111111111111111111111111111112', datetime.fromtimestamp(1704067260), 'Brook'),
+        ('So22222222222222222222222222222222222222223', datetime.fromtimestamp(1704070000), 'Brook'),
+    ]
+    batch = engine.create_alert_features_batch(alerts)
+    
+    assert batch[0]['caller_total_calls'] == 1
+    assert batch[0]['caller_win_rate'] == pytest.approx(1.0)
+    assert batch[1]['caller_total_calls'] == 2
+    assert batch[1]['caller_avg_multiple'] == pytest.approx(1.5)
+    for (mint, ts, caller), features in zip(alerts, batch):
+        expected = engine.create_alert_features(mint, ts, caller_name=caller)
+        assert features['caller_win_rate'] == pytest.approx(expected['caller_win_rate'])
+        assert features['caller_avg_multiple'] == pytest.approx(expected['caller_avg_multiple'])
+
+
+def test_indicator_kernels_match_candle_features():
+    """Vectorized indicator kernels equal create_candle_features per segment."""
+    from statistics.indicators import candle_feature_matrix
+    import numpy as np
+    
+    rng = np.random.default_rng(7)
+    engine = FeatureEngine(None)
+    segments = []
+    for length in (1, 2, 6, 15, 16, 25, 31, 60):
+        closes = np.cumprod(1 + rng.normal(0, 0.05, length)) * rng.uniform(1e-6, 10)
+        volumes = rng.uniform(0, 1000, length)
+        volumes[0] = 0.0
+        segments.append([
+            {'timestamp': i, 'close': float(c), 'volume': float(v), 'open': 0, 'high': 0, 'low': 0}
+            for i, (c, v) in enumerate(zip(closes, volumes))
+        ])
+    
+    close = np.array([c['close'] for seg in segments for c in seg])
+    volume = np.array([c['volume'] for seg in segments for c in seg])
+    offsets = np.concatenate([[0], np.cumsum([len(seg) for seg in segments])])
+    matrix = candle_feature_matrix(close, volume, offsets)
+    
+    for i, seg in enumerate(segments):
+        expected = engine.create_candle_features(seg)
+        if not expected:
+            assert all(np.isnan(values[i]) for values in matrix.values())
+            continue
+        for key, value in expected.items():
+            assert matrix[key][i] == pytest.approx(value, rel=1e-9, abs=1e-12), (len(seg), key)
+
+
+def test_feature_engineering_batch_candle_window(test_db):
+    """candle_window adds indicator features from the candles before the alert."""
+    engine = FeatureEngine(test_db)
+    alert_time = datetime.fromtimestamp(1704067320)
+    
+    [features] = engine.create_alert_features_batch(
+        [('So11111111111111111111111111111111111111112', alert_time, None)],
+        candle_window=2
+    )
+    
+    # Last 2 candles: closes 1.15, 1.25
+    assert features['sma_20'] == pytest.approx(1.25)
+    assert 'caller_total_calls' not in features
+
+
+def test_feature_store_materialize_incremental(test_db):
+    """materialize_alert_features writes all alerts once, then only new ones."""
+    store = FeatureStore(test_db)
+    engine = FeatureEngine(test_db)
+    
+    assert engine.materialize_alert_features(store, batch_size=1) == 2
+    assert engine.materialize_alert_features(store) == 0
+    
+    _insert_batch_fixture_rows(test_db)
+    assert engine.materialize_alert_features(store) == 3
+    assert engine.materialize_alert_features(store, feature_set_version='2.0.0') == 5
+    assert engine.materialize_alert_features(store, refresh=True) == 5
+    
+    rows = test_db.execute("""
+        SELECT feature_id, alert_timestamp, features FROM alert_features ORDER BY feature_id
+    """).fetchall()
+    assert len(rows) == 5
+    
+    feature_id, alert_timestamp, features = rows[0]
+    assert feature_id == 'So11111111111111111111111111111111111111112_1704067200'
+    assert alert_timestamp == datetime(2024, 1, 1, 0, 0, 0)
+    features = json.loads(features)
+    assert features['price_at_alert'] == pytest.approx(1.0)
+    assert features['hour_of_day'] == 0